@@ -0,0 +1,147 @@
+"""
+MessageBroker throughput and AOL recovery time.
+
+Measures:
+
+- ``broker.pubsub``: publish→deliver throughput and median latency for
+  one topic with a subscriber. Pub/sub delivery is in-memory whatever the
+  storage backend, so it is measured once.
+- ``broker.queue.<backend>``: enqueue→worker→ack throughput of a task
+  queue on the memory, file and AOL backends.
+- ``broker.aol_recovery``: time for a fresh AOLBackend to rebuild its
+  index from a log holding ``recovery_messages`` messages.
+
+Usage:
+    python benchmarks/broker.py
+    python benchmarks/broker.py --queue-messages 5000 --json
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import harness
+from harness import metric, percentile, wait_until
+
+from message_queue.broker import MessageBroker
+from message_queue.storage.aol import AOLBackend
+from message_queue.storage.file import FileBackend
+from message_queue.storage.memory import InMemoryBackend
+
+PARAMS = {
+    "pubsub_messages": 20000,
+    "queue_messages": 2000,
+    "file_queue_messages": 500,
+    "recovery_messages": 20000,
+    "payload_bytes": 256,
+}
+
+QUICK = {
+    "pubsub_messages": 2000,
+    "queue_messages": 300,
+    "file_queue_messages": 100,
+    "recovery_messages": 2000,
+}
+
+
+def bench_pubsub(messages: int, payload_bytes: int) -> list:
+    broker = MessageBroker()
+    latencies = []
+    body = "x" * payload_bytes
+
+    def on_message(message):
+        latencies.append(time.perf_counter() - message.payload["sent"])
+
+    broker.subscribe("bench", on_message)
+    broker.start()
+    try:
+        start = time.perf_counter()
+        for _ in range(messages):
+            broker.publish("bench", {"sent": time.perf_counter(), "body": body})
+        wait_until(lambda: len(latencies) >= messages)
+        elapsed = time.perf_counter() - start
+    finally:
+        broker.stop()
+
+    return [
+        metric("broker.pubsub.throughput", messages / elapsed, "msg/s", messages=messages),
+        metric(
+            "broker.pubsub.p50_latency", percentile(latencies, 0.5) * 1000, "ms",
+            higher_is_better=False, messages=messages,
+        ),
+    ]
+
+
+def bench_queue(name: str, backend, messages: int, payload_bytes: int) -> dict:
+    broker = MessageBroker(storage_backend=backend)
+    broker.create_queue("bench")
+    processed = []
+    lock = threading.Lock()
+    body = "x" * payload_bytes
+
+    def worker(task):
+        with lock:
+            processed.append(task["i"])
+
+    broker.register_worker("bench", worker)
+    broker.start()
+    try:
+        start = time.perf_counter()
+        for i in range(messages):
+            broker.enqueue("bench", {"i": i, "body": body})
+        wait_until(lambda: len(processed) >= messages)
+        elapsed = time.perf_counter() - start
+    finally:
+        broker.stop()
+
+    return metric(f"broker.queue.{name}", messages / elapsed, "msg/s", messages=messages)
+
+
+def bench_aol_recovery(root: Path, messages: int, payload_bytes: int) -> dict:
+    broker = MessageBroker(storage_backend=AOLBackend(root_dir=str(root)))
+    broker.create_queue("bench")
+    body = "x" * payload_bytes
+    for i in range(messages):
+        broker.enqueue("bench", {"i": i, "body": body})
+    broker.stop()
+
+    backend = AOLBackend(root_dir=str(root))
+    start = time.perf_counter()
+    backend.initialize()
+    elapsed = time.perf_counter() - start
+    depth = backend.get_queue_depth("bench")
+    backend.close()
+    if depth != messages:
+        raise RuntimeError(f"AOL recovered {depth} of {messages} messages")
+
+    return metric(
+        "broker.aol_recovery", elapsed * 1000, "ms", higher_is_better=False, messages=messages
+    )
+
+
+def run(params: dict) -> list:
+    payload = params["payload_bytes"]
+    results = bench_pubsub(params["pubsub_messages"], payload)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        results.append(bench_queue("memory", InMemoryBackend(), params["queue_messages"], payload))
+        results.append(bench_queue(
+            "file", FileBackend(root_dir=str(tmp / "file")), params["file_queue_messages"], payload
+        ))
+        results.append(bench_queue(
+            "aol", AOLBackend(root_dir=str(tmp / "aol")), params["queue_messages"], payload
+        ))
+        results.append(bench_aol_recovery(tmp / "recovery", params["recovery_messages"], payload))
+
+    return results
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
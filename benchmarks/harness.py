@@ -0,0 +1,213 @@
+"""
+Shared helpers for the benchmark suites.
+
+Each suite module defines:
+
+- ``PARAMS``: default sizes, one entry per command-line option
+- ``QUICK``: smaller overrides used by ``--quick``
+- ``run(params) -> list``: metrics built with :func:`metric`
+
+and calls :func:`suite_main` from its ``main()``. Metrics are plain dicts
+so results can be written as JSON and compared against a stored baseline
+(see ``run_all.py``).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+
+def metric(
+    name: str,
+    value: float,
+    unit: str,
+    higher_is_better: bool = True,
+    **params: Any,
+) -> Dict[str, Any]:
+    """Build one result entry."""
+    return {
+        "name": name,
+        "value": round(value, 4),
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+        "params": params,
+    }
+
+
+def best_of(fn: Callable[[], Any], rounds: int) -> float:
+    """Return the fastest wall time of ``rounds`` calls to ``fn``."""
+    best = float("inf")
+    for _ in range(max(1, rounds)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 60.0, interval: float = 0.0005) -> None:
+    """Spin until ``predicate`` is true, raising TimeoutError after ``timeout``."""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark did not complete in time")
+        time.sleep(interval)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine the results were measured on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(metrics: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "metrics": list(metrics),
+    }
+
+
+def compare(
+    metrics: Iterable[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """
+    Compare metrics against a baseline report.
+
+    A metric regresses when it is worse than the baseline by more than
+    ``tolerance`` (a fraction). Metrics missing from the baseline, or
+    measured with different parameters, are reported but never regress.
+
+    Returns:
+        One row per metric with baseline, change and status
+    """
+    base_by_name = {m["name"]: m for m in baseline.get("metrics", [])}
+    rows = []
+    for current in metrics:
+        base = base_by_name.get(current["name"])
+        row = {"name": current["name"], "value": current["value"], "unit": current["unit"]}
+        if base is None:
+            row.update(baseline=None, change=None, status="new")
+        elif base.get("params") != current.get("params"):
+            row.update(baseline=base["value"], change=None, status="params differ")
+        else:
+            change = (current["value"] - base["value"]) / base["value"] if base["value"] else 0.0
+            worse = -change if current["higher_is_better"] else change
+            if worse > tolerance:
+                status = "REGRESSION"
+            elif worse < -tolerance:
+                status = "improved"
+            else:
+                status = "ok"
+            row.update(baseline=base["value"], change=round(change, 4), status=status)
+        rows.append(row)
+    return rows
+
+
+def print_metrics(metrics: Iterable[Dict[str, Any]]) -> None:
+    metrics = list(metrics)
+    width = max([len(m["name"]) for m in metrics] + [6])
+    print(f"{'metric':<{width}} {'value':>14} unit")
+    for m in metrics:
+        print(f"{m['name']:<{width}} {m['value']:>14.2f} {m['unit']}")
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    width = max([len(r["name"]) for r in rows] + [6])
+    print(f"{'metric':<{width}} {'value':>14} {'baseline':>14} {'change':>8} status")
+    for r in rows:
+        baseline = f"{r['baseline']:.2f}" if r["baseline"] is not None else "-"
+        change = f"{r['change']:+.1%}" if r["change"] is not None else "-"
+        print(f"{r['name']:<{width}} {r['value']:>14.2f} {baseline:>14} {change:>8} {r['status']}")
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--quick", action="store_true", help="Use small sizes (smoke run)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+    parser.add_argument(
+        "--baseline", type=Path, nargs="?", const=DEFAULT_BASELINE,
+        help=f"Compare against a baseline report (default: {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown before a metric counts as a regression (fraction)",
+    )
+
+
+def report(metrics: List[Dict[str, Any]], args: argparse.Namespace) -> int:
+    """
+    Print and store results and compare them with the baseline.
+
+    Returns:
+        Process exit code: 1 if any metric regressed, else 0
+    """
+    result = build_report(metrics)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+
+    rows: Optional[List[Dict[str, Any]]] = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        rows = compare(metrics, baseline, args.tolerance)
+        result["comparison"] = rows
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif rows is not None:
+        print_comparison(rows)
+    else:
+        print_metrics(metrics)
+
+    if rows and any(r["status"] == "REGRESSION" for r in rows):
+        return 1
+    return 0
+
+
+def resolve_params(module: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    """Merge a suite's defaults, its quick sizes and explicit options."""
+    params = dict(module.PARAMS)
+    if args.quick:
+        params.update(module.QUICK)
+    for key in module.PARAMS:
+        value = getattr(args, key, None)
+        if value is not None:
+            params[key] = value
+    return params
+
+
+def suite_main(module: Any) -> None:
+    """Command-line entry point shared by the suite modules."""
+    parser = argparse.ArgumentParser(description=module.__doc__.strip().split("\n\n")[0])
+    for key, default in module.PARAMS.items():
+        parser.add_argument(
+            f"--{key.replace('_', '-')}", dest=key, type=type(default),
+            help=f"default: {default}",
+        )
+    add_report_arguments(parser)
+    args = parser.parse_args()
+    sys.exit(report(module.run(resolve_params(module, args)), args))
@@ -0,0 +1,151 @@
+"""
+HistoryManager cost at realistic conversation sizes.
+
+For each size in ``sizes`` (1k and 10k messages by default) a history of
+repeating user → tool call → tool result → assistant turns is built and
+measured:
+
+- ``history.add.<n>``: ms per ``add()`` on a history already holding n
+  messages (compaction disabled, message cleaners enabled as in
+  production)
+- ``history.to_llm_format.<n>``: ms to format the history after one new
+  message, i.e. the per-LLM-call cost
+- ``history.to_llm_format_cached.<n>``: microseconds per repeated call
+  with nothing added in between (the cached path)
+- ``history.compact.<n>``: ms for one compaction with SimpleSummarizer
+
+Usage:
+    python benchmarks/history.py
+    python benchmarks/history.py --sizes 1000,50000 --json
+"""
+
+import logging
+import sys
+import time
+
+import harness
+from harness import best_of, metric
+
+from agent_framework.memory.history import HistoryManager
+from agent_framework.memory.message_cleaner import TODOCleaner
+from agent_framework.memory.summarizer import SimpleSummarizer
+from agent_framework.messages.types import (
+    LLMRespondMessage,
+    SystemMessage,
+    ToolCall,
+    ToolCallMessage,
+    ToolResultObservation,
+    UserMessage,
+)
+
+PARAMS = {
+    "sizes": "1000,10000",
+    "adds": 50,
+    "rounds": 5,
+}
+
+QUICK = {
+    "sizes": "500,2000",
+    "adds": 10,
+    "rounds": 2,
+}
+
+
+def make_message(i: int):
+    """Return the i-th message of a repeating four-message turn."""
+    kind = i % 4
+    if kind == 0:
+        return UserMessage(content=f"Please update module {i} " * 8, session_id="bench", sequence=i)
+    if kind == 1:
+        return ToolCallMessage(
+            thought="Reading the file first.",
+            tool_calls=[ToolCall(id=f"call_{i}", tool_name="read", arguments={"file_path": f"src/m{i}.py"})],
+            session_id="bench",
+            sequence=i,
+        )
+    if kind == 2:
+        return ToolResultObservation(
+            call_id=f"call_{i - 1}",
+            content="def handler(event):\n    return process(event)\n" * 10,
+            session_id="bench",
+            sequence=i,
+        )
+    return LLMRespondMessage(content=f"Updated module {i}. " * 6, session_id="bench", sequence=i)
+
+
+def build_history(messages: list) -> HistoryManager:
+    """History holding ``messages``, with compaction disabled."""
+    history = HistoryManager(
+        summarizer=SimpleSummarizer(),
+        max_tokens=10 ** 12,
+        retention_window=20,
+        proactive_threshold=1.0,
+        message_cleaners=[],
+    )
+    history.add(SystemMessage(content="You are a coding agent.", session_id="bench", sequence=0))
+    # Fill without cleaners, which rescan the whole history on every add
+    for message in messages:
+        history.add(message)
+    history.message_cleaners = [TODOCleaner()]
+    return history
+
+
+def bench_size(size: int, adds: int, rounds: int) -> list:
+    messages = [make_message(i) for i in range(1, size + 1)]
+    extra = iter(make_message(i) for i in range(size + 1, size + 1 + adds + rounds))
+
+    history = build_history(messages)
+    start = time.perf_counter()
+    for _ in range(adds):
+        history.add(next(extra))
+    add_seconds = (time.perf_counter() - start) / adds
+
+    def format_after_add():
+        history.add(next(extra))
+        history.to_llm_format()
+
+    format_seconds = best_of(format_after_add, rounds)
+    cached_calls = 1000
+
+    def format_cached():
+        for _ in range(cached_calls):
+            history.to_llm_format()
+
+    cached_seconds = best_of(format_cached, rounds) / cached_calls
+
+    def compact():
+        target = build_history(messages)
+        # Budget of half the history so compaction has work to do
+        target.max_tokens = max(1, target.get_token_estimate() // 2)
+        start = time.perf_counter()
+        target.compact()
+        return time.perf_counter() - start
+
+    compact_seconds = min(compact() for _ in range(max(1, rounds // 2)))
+
+    return [
+        metric(f"history.add.{size}", add_seconds * 1000, "ms",
+               higher_is_better=False, messages=size),
+        metric(f"history.to_llm_format.{size}", format_seconds * 1000, "ms",
+               higher_is_better=False, messages=size),
+        metric(f"history.to_llm_format_cached.{size}", cached_seconds * 1e6, "us",
+               higher_is_better=False, messages=size),
+        metric(f"history.compact.{size}", compact_seconds * 1000, "ms",
+               higher_is_better=False, messages=size),
+    ]
+
+
+def run(params: dict) -> list:
+    logging.getLogger("agent_framework").setLevel(logging.WARNING)
+    results = []
+    for size in (int(s) for s in str(params["sizes"]).split(",") if s.strip()):
+        results.extend(bench_size(size, params["adds"], params["rounds"]))
+    return results
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+MCP tool calls pipelined over one stdio connection.
+
+Starts the fake MCP server used by the tests
+(``tests/agent_framework/runtime/fake_mcp_server.py``), which handles each
+tools/call on its own thread, and drives it through MCPRuntime:
+
+- ``mcp.pipelined.throughput``: calls/second with up to ``concurrency``
+  calls to ``sleep(work_ms)`` in flight on the one connection
+- ``mcp.serial.throughput``: the same calls awaited one at a time, i.e.
+  what a client that waits for each response before sending the next gets
+- ``mcp.echo.p50_latency``: median round trip of an ``echo`` call
+  (JSON-RPC framing, pipe I/O and result adaptation)
+
+Usage:
+    python benchmarks/mcp_pipeline.py
+    python benchmarks/mcp_pipeline.py --concurrency 100 --json
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import harness
+from harness import REPO_ROOT, metric, percentile
+
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.mcp.config import MCPServerConfig
+from agent_framework.runtime.mcp.runtime import MCPRuntime
+
+PARAMS = {
+    "calls": 400,
+    "serial_calls": 50,
+    "concurrency": 50,
+    "work_ms": 20,
+    "echo_calls": 500,
+}
+
+QUICK = {
+    "calls": 100,
+    "serial_calls": 10,
+    "echo_calls": 100,
+}
+
+FAKE_SERVER = REPO_ROOT / "tests" / "agent_framework" / "runtime" / "fake_mcp_server.py"
+
+
+async def timed_calls(runtime: MCPRuntime, calls: int, concurrency: int, work_ms: int) -> float:
+    """Run ``calls`` sleep calls with at most ``concurrency`` in flight; returns seconds."""
+    tool = runtime.tool_registry.get("fake.sleep")
+    context = ExecutionContext(session_id="bench-mcp", timeout=60)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with slots:
+            result = await runtime.execute(tool, {"seconds": work_ms / 1000}, context)
+        if not result.success:
+            raise RuntimeError(f"MCP call failed: {result.error}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call() for _ in range(calls)])
+    return time.perf_counter() - start
+
+
+async def echo_latencies(runtime: MCPRuntime, calls: int) -> list:
+    tool = runtime.tool_registry.get("fake.echo")
+    context = ExecutionContext(session_id="bench-mcp", timeout=60)
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await runtime.execute(tool, {"text": "ping"}, context)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_mcp(params: dict) -> list:
+    config = MCPServerConfig(name="fake", command=sys.executable, args=[str(FAKE_SERVER)])
+    runtime = MCPRuntime(server_configs=[config])
+    await runtime.initialize()
+    try:
+        # Warm up the connection and the server's thread start-up path
+        await timed_calls(runtime, 10, 10, 0)
+
+        work = {"work_ms": params["work_ms"]}
+        pipelined = await timed_calls(runtime, params["calls"], params["concurrency"], params["work_ms"])
+        serial = await timed_calls(runtime, params["serial_calls"], 1, params["work_ms"])
+        latencies = await echo_latencies(runtime, params["echo_calls"])
+    finally:
+        await runtime.cleanup()
+
+    return [
+        metric("mcp.pipelined.throughput", params["calls"] / pipelined, "call/s",
+               calls=params["calls"], concurrency=params["concurrency"], **work),
+        metric("mcp.serial.throughput", params["serial_calls"] / serial, "call/s",
+               calls=params["serial_calls"], **work),
+        metric("mcp.echo.p50_latency", percentile(latencies, 0.5) * 1000, "ms",
+               higher_is_better=False, calls=params["echo_calls"]),
+    ]
+
+
+def run(params: dict) -> list:
+    logging.disable(logging.INFO)
+    try:
+        return asyncio.run(bench_mcp(params))
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
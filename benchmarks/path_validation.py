@@ -0,0 +1,112 @@
+"""
+Validations/second of PathValidator with and without its prefix cache.
+
+Builds a workspace with a few nested directories, then validates a mix of
+plain relative paths (the common case for file tools) through:
+
+- ``uncached``: the full resolve() check for every call, as before the cache
+- ``cached``: the default validator, whose safe-directory cache lets
+  siblings of an already-validated path skip the filesystem
+- ``batch``: ``validate_many`` over the whole path list at once
+
+Usage:
+    python benchmarks/path_validation.py --paths 2000 --rounds 5
+    python benchmarks/path_validation.py --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from agent_framework.runtime.validation import PathValidator  # noqa: E402
+
+
+def build_workspace(root: Path, dirs: int, depth: int) -> list:
+    """Create nested directories and return their relative paths."""
+    relative_dirs = []
+    for i in range(dirs):
+        parts = [f"pkg{i}"] + [f"level{d}" for d in range(depth)]
+        (root.joinpath(*parts)).mkdir(parents=True, exist_ok=True)
+        relative_dirs.append("/".join(parts))
+    return relative_dirs
+
+
+def make_paths(relative_dirs: list, count: int) -> list:
+    return [f"{relative_dirs[i % len(relative_dirs)]}/file{i}.py" for i in range(count)]
+
+
+def measure(name: str, fn, paths: list, rounds: int) -> dict:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(paths)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "mode": name,
+        "validations": len(paths),
+        "seconds": round(best, 4),
+        "validations_per_second": round(len(paths) / best),
+    }
+
+
+def run(args) -> list:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace = Path(tmpdir)
+        paths = make_paths(build_workspace(workspace, args.dirs, args.depth), args.paths)
+
+        def uncached(paths):
+            validator = PathValidator(workspace)
+            for path in paths:
+                validator._resolve(path)
+
+        def cached(paths):
+            validator = PathValidator(workspace)
+            for path in paths:
+                validator.validate(path)
+
+        def batch(paths):
+            PathValidator(workspace).validate_many(paths)
+
+        rows = [
+            measure("uncached", uncached, paths, args.rounds),
+            measure("cached", cached, paths, args.rounds),
+            measure("batch", batch, paths, args.rounds),
+        ]
+
+    base = rows[0]["validations_per_second"]
+    for row in rows:
+        row["speedup"] = round(row["validations_per_second"] / base, 1)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paths", type=int, default=2000)
+    parser.add_argument("--dirs", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'mode':>9} {'validations/s':>14} {'seconds':>8} {'speedup':>8}")
+    for row in rows:
+        print(
+            f"{row['mode']:>9} {row['validations_per_second']:>14} "
+            f"{row['seconds']:>8} {row['speedup']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Throughput of RemoteRuntime against 1..N localhost worker daemons.
+
+Starts real worker processes (``agent_framework.runtime.remote.server``)
+hosting a benchmark tool, drives them through RemoteRuntime over the
+multiplexed protocol, and reports calls/second per worker count.
+
+The default tool waits for ``--work-ms`` (an I/O-bound tool), so each
+worker's ``--max-concurrent`` limit is what bounds throughput and adding
+workers scales it even on a single core. ``--cpu`` switches to a
+CPU-bound tool, which scales with worker count up to the number of cores.
+
+Usage:
+    python benchmarks/remote_workers.py --workers 1 2 4 --calls 400
+    python benchmarks/remote_workers.py --json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from agent_framework.runtime.context import ExecutionContext  # noqa: E402
+from agent_framework.runtime.remote.pool_manager import WorkerPoolManager  # noqa: E402
+from agent_framework.runtime.remote.runtime import RemoteRuntime  # noqa: E402
+from agent_framework.runtime.remote.worker import WorkerNode  # noqa: E402
+
+
+class BenchWaitTool:
+    """I/O-bound benchmark tool."""
+    name = "bench_wait"
+
+    async def execute(self, work_ms: int = 20):
+        await asyncio.sleep(work_ms / 1000)
+        return "ok"
+
+
+class BenchCPUTool:
+    """CPU-bound benchmark tool."""
+    name = "bench_cpu"
+
+    def execute(self, work_ms: int = 20):
+        deadline = time.process_time() + work_ms / 1000
+        digest = b""
+        while time.process_time() < deadline:
+            digest = hashlib.sha256(digest).digest()
+        return digest.hex()[:8]
+
+
+class _Tool:
+    """Client-side stand-in; only the name is sent to the worker."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+async def start_worker(index: int, tool_spec: str, max_concurrent: int):
+    """Launch a worker daemon and wait for its ready line."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(REPO_ROOT / "src"), str(REPO_ROOT / "benchmarks"), env.get("PYTHONPATH", "")]
+    )
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "agent_framework.runtime.remote.server",
+        "--port", "0",
+        "--worker-id", f"bench-{index}",
+        "--max-concurrent", str(max_concurrent),
+        "--no-default-tools",
+        "--tool", tool_spec,
+        stdout=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    while True:
+        line = (await asyncio.wait_for(process.stdout.readline(), timeout=30)).decode()
+        if not line:
+            raise RuntimeError(f"Worker {index} exited before becoming ready")
+        if line.startswith("WORKER_READY"):
+            _, worker_id, address = line.split()
+            host, port = address.rsplit(":", 1)
+            return process, WorkerNode(
+                id=worker_id, host=host, port=int(port), max_concurrent=max_concurrent
+            )
+
+
+async def run_round(worker_count: int, args) -> dict:
+    """Measure throughput with a given number of workers."""
+    tool_name, tool_spec = (
+        ("bench_cpu", "remote_workers:BenchCPUTool") if args.cpu
+        else ("bench_wait", "remote_workers:BenchWaitTool")
+    )
+    started = await asyncio.gather(*[
+        start_worker(i, tool_spec, args.max_concurrent) for i in range(worker_count)
+    ])
+    processes = [p for p, _ in started]
+
+    pool = WorkerPoolManager(load_balancing_strategy="least_loaded")
+    for _, node in started:
+        await pool.register_worker(node)
+    runtime = RemoteRuntime(pool, timeout=60)
+    context = ExecutionContext(session_id="bench", timeout=60)
+    tool = _Tool(tool_name)
+
+    try:
+        await runtime.connect_workers()
+        # Keep in flight exactly what the workers can take
+        slots = asyncio.Semaphore(worker_count * args.max_concurrent)
+
+        async def one_call():
+            async with slots:
+                return await runtime.execute(tool, {"work_ms": args.work_ms}, context)
+
+        await asyncio.gather(*[one_call() for _ in range(worker_count * args.max_concurrent)])
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[one_call() for _ in range(args.calls)])
+        elapsed = time.perf_counter() - start
+    finally:
+        await runtime.cleanup()
+        for process in processes:
+            process.terminate()
+        await asyncio.gather(*[p.wait() for p in processes])
+
+    failures = sum(1 for r in results if not r.success)
+    per_worker = {}
+    for r in results:
+        worker_id = r.metadata.get("worker_id", "none")
+        per_worker[worker_id] = per_worker.get(worker_id, 0) + 1
+
+    return {
+        "workers": worker_count,
+        "calls": args.calls,
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(args.calls / elapsed, 1),
+        "distribution": per_worker,
+    }
+
+
+async def main_async(args) -> list:
+    rows = []
+    for count in args.workers:
+        rows.append(await run_round(count, args))
+    base = rows[0]["calls_per_second"] / rows[0]["workers"]
+    for row in rows:
+        row["scaling_efficiency"] = round(row["calls_per_second"] / (base * row["workers"]), 2)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--max-concurrent", type=int, default=4)
+    parser.add_argument("--work-ms", type=int, default=20)
+    parser.add_argument("--cpu", action="store_true", help="Use the CPU-bound tool")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = asyncio.run(main_async(args))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'workers':>7} {'calls/s':>9} {'seconds':>8} {'fail':>5} {'scaling':>8}  distribution")
+    for row in rows:
+        print(
+            f"{row['workers']:>7} {row['calls_per_second']:>9} {row['seconds']:>8} "
+            f"{row['failures']:>5} {row['scaling_efficiency']:>8}  {row['distribution']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Run every benchmark suite and compare the results with the baseline.
+
+Writes a JSON report (``benchmarks/results/latest.json`` by default) and,
+unless ``--no-compare`` is given, compares each metric with
+``benchmarks/baseline.json``. Exits with status 1 if any metric is worse
+than the baseline by more than ``--tolerance``. ``--repeat`` runs each
+suite several times and keeps the best value of every metric, which
+smooths out noise on shared machines.
+
+Baselines are machine specific: regenerate one with ``--update-baseline``
+on the machine that runs the comparison.
+
+Usage:
+    python benchmarks/run_all.py
+    python benchmarks/run_all.py --quick --suite broker --suite history
+    python benchmarks/run_all.py --repeat 3 --update-baseline
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import harness
+
+SUITES = ["broker", "history", "mcp_pipeline", "runtime", "search", "websocket_fanout"]
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "latest.json"
+
+
+def best_values(runs: list) -> list:
+    """Merge repeated runs of a suite, keeping each metric's best value."""
+    best = {}
+    for metrics in runs:
+        for m in metrics:
+            kept = best.get(m["name"])
+            if kept is None:
+                best[m["name"]] = m
+            elif m["higher_is_better"] and m["value"] > kept["value"]:
+                best[m["name"]] = m
+            elif not m["higher_is_better"] and m["value"] < kept["value"]:
+                best[m["name"]] = m
+    return list(best.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument(
+        "--suite", action="append", choices=SUITES,
+        help="Run only this suite (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1,
+        help="Run each suite this many times and keep the best values",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="Write the results as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--no-compare", action="store_true", help="Skip the baseline comparison",
+    )
+    harness.add_report_arguments(parser)
+    parser.set_defaults(output=DEFAULT_OUTPUT, baseline=harness.DEFAULT_BASELINE)
+    args = parser.parse_args()
+
+    metrics = []
+    for name in args.suite or SUITES:
+        module = importlib.import_module(name)
+        start = time.perf_counter()
+        params = harness.resolve_params(module, args)
+        metrics.extend(best_values([module.run(params) for _ in range(max(1, args.repeat))]))
+        print(f"[{name}] done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(harness.build_report(metrics), indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        args.baseline = None
+    elif args.no_compare or not args.baseline.exists():
+        args.baseline = None
+
+    sys.exit(harness.report(metrics, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Tool execution through RuntimeExecutor and end-to-end turn latency.
+
+Measures:
+
+- ``runtime.executor.batch``: BatchToolCallRequests/second published to
+  a RuntimeExecutor over the broker, each with ``batch_size`` calls to an
+  in-process echo tool, plus the median request→observation latency
+- ``runtime.turn``: median latency of a full agent turn with the mock LLM:
+  user message → agent.step (tool call) → RuntimeExecutor → agent.step
+  (final answer) → WAIT_FOR_USER_INPUT on the client topic
+
+Usage:
+    python benchmarks/runtime.py
+    python benchmarks/runtime.py --batches 1000 --json
+"""
+
+import logging
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import harness
+from harness import metric, percentile, wait_until
+
+from agent_framework.agent_controller import AgentController
+from agent_framework.agents.base import SimpleAgent
+from agent_framework.context import TopicContext
+from agent_framework.llm.mock import MockProvider
+from agent_framework.llm.provider import FinishReason, LLMResponse, ToolCallRequest as LLMToolCall
+from agent_framework.messages.types import UserMessage
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.executor import RuntimeExecutor
+from agent_framework.runtime.local import LocalRuntime
+from agent_framework.runtime.manager import RuntimeManager
+from agent_framework.runtime.messages import BatchToolCallRequest, ToolCallRequest
+from agent_framework.tools.tool_base import FunctionTool, ToolRegistry
+from message_queue.broker import MessageBroker
+
+PARAMS = {
+    "batches": 300,
+    "batch_size": 4,
+    "turns": 100,
+}
+
+QUICK = {
+    "batches": 50,
+    "turns": 20,
+}
+
+TOOL_NAME = "bench_echo"
+
+
+def echo_tool() -> FunctionTool:
+    return FunctionTool(
+        name=TOOL_NAME,
+        description="Echo the text back.",
+        parameters={
+            "type": "object",
+            "properties": {"text": {"type": "string"}},
+            "required": ["text"],
+        },
+        func=lambda text: text,
+    )
+
+
+def make_registry() -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.register(echo_tool())
+    return registry
+
+
+def make_runtime_manager() -> RuntimeManager:
+    manager = RuntimeManager()
+    manager.register_runtime("local", LocalRuntime())
+    return manager
+
+
+def bench_executor(batches: int, batch_size: int) -> list:
+    broker = MessageBroker()
+    context = TopicContext.default("bench-executor")
+    executor = RuntimeExecutor(broker, make_runtime_manager(), make_registry(), context)
+    sent = {}
+    latencies = []
+
+    def on_observation(message):
+        if message.payload.get("type") == "BatchToolResultObservation":
+            latencies.append(time.perf_counter() - sent[message.payload["batch_id"]])
+
+    broker.subscribe(context.agent_topic, on_observation)
+    executor.start()
+    broker.start()
+    exec_context = ExecutionContext(session_id="bench-executor", timeout=30)
+    try:
+        start = time.perf_counter()
+        for _ in range(batches):
+            batch_id = str(uuid.uuid4())
+            calls = [
+                ToolCallRequest.create(
+                    call_id=str(uuid.uuid4()),
+                    session_id="bench-executor",
+                    tool_name=TOOL_NAME,
+                    parameters={"text": "ping"},
+                    context=exec_context,
+                    reply_topic=context.agent_topic,
+                )
+                for _ in range(batch_size)
+            ]
+            request = BatchToolCallRequest.create(
+                batch_id=batch_id,
+                session_id="bench-executor",
+                tool_calls=calls,
+                context=exec_context,
+                reply_topic=context.agent_topic,
+            )
+            sent[batch_id] = time.perf_counter()
+            broker.publish(context.runtime_topic, request.to_dict())
+        wait_until(lambda: len(latencies) >= batches)
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.stop()
+        broker.stop()
+
+    return [
+        metric("runtime.executor.batch.throughput", batches / elapsed, "batch/s",
+               batches=batches, batch_size=batch_size),
+        metric("runtime.executor.batch.p50_latency", percentile(latencies, 0.5) * 1000, "ms",
+               higher_is_better=False, batches=batches, batch_size=batch_size),
+    ]
+
+
+def turn_responses(turns: int) -> list:
+    """Mock LLM script: each turn makes one tool call, then answers."""
+    responses = []
+    for i in range(turns):
+        responses.append(LLMResponse(
+            tool_calls=[LLMToolCall(id=f"call_{i}", name=TOOL_NAME, arguments='{"text": "ping"}')],
+            finish_reason=FinishReason.TOOL_CALLS,
+            usage={"prompt_tokens": 100, "completion_tokens": 10},
+        ))
+        responses.append(LLMResponse(
+            content=f"Done with turn {i}.",
+            finish_reason=FinishReason.STOP,
+            usage={"prompt_tokens": 120, "completion_tokens": 5},
+        ))
+    return responses
+
+
+def bench_turns(turns: int, working_dir: Path) -> dict:
+    broker = MessageBroker()
+    session_id = "bench-turn"
+    context = TopicContext.default(session_id)
+
+    llm = MockProvider(model="mock-model")
+    llm.set_responses(turn_responses(turns))
+    registry = make_registry()
+    agent = SimpleAgent(session_id=session_id, llm=llm, tools=registry, working_dir=working_dir)
+    controller = AgentController(
+        agent, broker, context,
+        working_dir=working_dir,
+        auto_refine_enabled_callback=lambda: False,
+    )
+    executor = RuntimeExecutor(broker, make_runtime_manager(), registry, context)
+
+    turn_done = threading.Event()
+
+    def on_client(message):
+        if message.payload.get("type") == "WAIT_FOR_USER_INPUT":
+            turn_done.set()
+
+    broker.subscribe(context.agent_topic, controller.on_event)
+    broker.subscribe(context.client_topic, on_client)
+    executor.start()
+    broker.start()
+    latencies = []
+    try:
+        for i in range(turns):
+            turn_done.clear()
+            user = UserMessage(session_id=session_id, sequence=i, content=f"Turn {i}")
+            start = time.perf_counter()
+            broker.publish(context.agent_topic, user.to_dict())
+            if not turn_done.wait(30):
+                raise TimeoutError(f"turn {i} did not finish")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        executor.stop()
+        broker.stop()
+
+    return metric("runtime.turn.p50_latency", percentile(latencies, 0.5) * 1000, "ms",
+                  higher_is_better=False, turns=turns)
+
+
+def run(params: dict) -> list:
+    logging.disable(logging.INFO)
+    try:
+        results = bench_executor(params["batches"], params["batch_size"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            results.append(bench_turns(params["turns"], Path(tmpdir)))
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+GrepTool and GlobTool over a large generated source tree.
+
+Builds a fixture workspace of ``files`` Python/TypeScript/Markdown files
+spread over nested packages, then measures the best-of-``rounds`` wall
+time of:
+
+- ``search.grep.<files>``: a regex matching a small fraction of files
+- ``search.grep_include.<files>``: the same search restricted to ``*.py``
+- ``search.glob.<files>``: a recursive ``**/*.py`` glob
+
+Usage:
+    python benchmarks/search.py
+    python benchmarks/search.py --files 20000 --json
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+import harness
+from harness import best_of, metric
+
+from agent_framework.tools.glob_tool import GlobTool
+from agent_framework.tools.grep_tool import GrepTool
+
+PARAMS = {
+    "files": 5000,
+    "files_per_dir": 25,
+    "rounds": 3,
+}
+
+QUICK = {
+    "files": 500,
+    "rounds": 1,
+}
+
+EXTENSIONS = (".py", ".py", ".ts", ".md")
+
+
+def build_tree(root: Path, files: int, files_per_dir: int) -> None:
+    """Create ``files`` source files, one in 50 containing ``needle_marker``."""
+    for i in range(files):
+        package = i // files_per_dir
+        directory = root / f"pkg{package % 10}" / f"mod{package}"
+        directory.mkdir(parents=True, exist_ok=True)
+        marker = "needle_marker = True\n" if i % 50 == 0 else ""
+        body = f"def function_{i}(value):\n    return value * {i}\n" * 20
+        (directory / f"file{i}{EXTENSIONS[i % len(EXTENSIONS)]}").write_text(marker + body)
+
+
+def run_tool(tool, **kwargs):
+    result = asyncio.run(tool.execute(**kwargs))
+    if result.error:
+        raise RuntimeError(result.error)
+    return result
+
+
+def run(params: dict) -> list:
+    files = params["files"]
+    rounds = params["rounds"]
+    grep = GrepTool()
+    glob = GlobTool()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        build_tree(root, files, params["files_per_dir"])
+        path = str(root)
+
+        grep_seconds = best_of(lambda: run_tool(grep, pattern=r"needle_\w+", path=path), rounds)
+        include_seconds = best_of(
+            lambda: run_tool(grep, pattern=r"needle_\w+", path=path, include="*.py"), rounds
+        )
+        glob_seconds = best_of(lambda: run_tool(glob, pattern="**/*.py", path=path), rounds)
+
+    return [
+        metric(f"search.grep.{files}", grep_seconds * 1000, "ms", higher_is_better=False, files=files),
+        metric(f"search.grep_include.{files}", include_seconds * 1000, "ms",
+               higher_is_better=False, files=files),
+        metric(f"search.glob.{files}", glob_seconds * 1000, "ms", higher_is_better=False, files=files),
+    ]
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Web backend websocket fan-out: events from one session to many clients.
+
+Registers ``clients`` fake Socket.IO clients in the room of one session
+directly with the server's manager, replaces the Engine.IO transport
+write with a counter, and pushes ``events`` agent events through
+``SessionEmitter.emit_event`` (the WebSessionBroker callback). This
+measures the backend's own cost: event mapping, JSON encoding and room
+fan-out, without network I/O.
+
+- ``websocket.fanout.events``: events/second emitted to the session
+- ``websocket.fanout.deliveries``: packets/second written to clients
+
+Usage:
+    python benchmarks/websocket_fanout.py
+    python benchmarks/websocket_fanout.py --clients 100 --json
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import harness
+from harness import metric
+
+from web_backend.websocket.server import sio
+from web_backend.websocket.session_emitter import SessionEmitter
+
+PARAMS = {
+    "clients": 20,
+    "events": 2000,
+}
+
+QUICK = {
+    "clients": 5,
+    "events": 200,
+}
+
+SESSION_ID = "bench-session"
+
+
+def make_event(i: int) -> dict:
+    """Cycle through the event types a coding turn produces."""
+    kind = i % 4
+    if kind == 0:
+        return {"type": "agent_message", "sequence": i, "content": f"Working on step {i}. " * 5}
+    if kind == 1:
+        return {"type": "tool_call", "sequence": i, "tool_name": "read",
+                "arguments": {"file_path": f"src/m{i}.py"}}
+    if kind == 2:
+        return {"type": "tool_result", "sequence": i, "tool_name": "read",
+                "result": "def handler(event):\n    return process(event)\n" * 10, "success": True}
+    return {"type": "agent_thought", "sequence": i, "content": "Thinking about the next edit."}
+
+
+async def bench_fanout(clients: int, events: int) -> list:
+    delivered = 0
+
+    async def send_packet(eio_sid, packet):
+        nonlocal delivered
+        # Encode as the transport would, so JSON serialisation is included
+        packet.encode()
+        delivered += 1
+
+    original_send = sio._send_eio_packet
+    sio._send_eio_packet = send_packet
+    room = f"session:{SESSION_ID}"
+    sids = []
+    try:
+        for i in range(clients):
+            sid = await sio.manager.connect(f"eio-{i}", "/")
+            await sio.enter_room(sid, room)
+            sids.append(sid)
+
+        emitter = SessionEmitter(SESSION_ID)
+        payloads = [make_event(i) for i in range(events)]
+        start = time.perf_counter()
+        for event in payloads:
+            await emitter.emit_event(event)
+        elapsed = time.perf_counter() - start
+    finally:
+        for sid in sids:
+            await sio.leave_room(sid, room)
+            await sio.manager.disconnect(sid, "/")
+        sio._send_eio_packet = original_send
+
+    if delivered < events * clients:
+        raise RuntimeError(f"delivered {delivered} of {events * clients} packets")
+
+    return [
+        metric("websocket.fanout.events", events / elapsed, "event/s", clients=clients, events=events),
+        metric("websocket.fanout.deliveries", delivered / elapsed, "packet/s",
+               clients=clients, events=events),
+    ]
+
+
+def run(params: dict) -> list:
+    logging.getLogger("web_backend").setLevel(logging.WARNING)
+    return asyncio.run(bench_fanout(params["clients"], params["events"]))
+
+
+def main():
+    harness.suite_main(sys.modules[__name__])
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 import sys
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, patch, Mock
 import httpx
 
@@ -91,12 +92,18 @@ async def test_web_fetch_with_mock():
         print(f"\nTest: {test_case['name']}")
         print("-" * 40)
 
-        # Mock httpx.AsyncClient
-        with patch('httpx.AsyncClient') as mock_client:
-            # Setup mock
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get.return_value = test_case["mock_response"]
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        # Start from an empty response cache so each case hits the mock
+        tool.clear_cache()
+
+        # Mock the pooled HTTP client
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get.return_value = test_case["mock_response"]
+
+        @asynccontextmanager
+        async def mock_host_slot(url, client=mock_client_instance):
+            yield client
+
+        with patch('agent_framework.tools.web_fetch_tool.host_slot', mock_host_slot):
 
             # Test _fetch_url method
             content, error = await tool._fetch_url("https://example.com")
@@ -187,7 +194,7 @@ def test_cache_functionality():
 
     # Clear cache
     tool.clear_cache()
-    print(f"Cache cleared. Size: {len(tool._cache)}")
+    print(f"Cache cleared. Size: {len(tool._get_cache())}")
 
     # Test cache miss
     result = tool._get_from_cache("https://example.com")
@@ -196,7 +203,7 @@ def test_cache_functionality():
     # Test add to cache
     test_content = "This is test content for caching."
     tool._add_to_cache("https://example.com", test_content)
-    print(f"Added to cache. Size: {len(tool._cache)}")
+    print(f"Added to cache. Size: {len(tool._get_cache())}")
 
     # Test cache hit
     result = tool._get_from_cache("https://example.com")
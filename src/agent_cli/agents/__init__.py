@@ -9,6 +9,7 @@ from agent_cli.agents.factory import (
     create_coding_agent,
     create_llm_provider,
     create_simple_agent,
+    resume_agent,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "create_coding_agent",
     "create_simple_agent",
     "create_llm_provider",
+    "resume_agent",
 ]
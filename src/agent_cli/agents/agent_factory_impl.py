@@ -5,47 +5,75 @@ This module provides a cleaner, more extensible way to create agents
 without relying on multiple if-elif statements.
 """
 
+import logging
 import os
 import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, Type, Callable, Optional, Any
+from typing import TYPE_CHECKING, Dict, Type, Callable, Optional, Any, Union
 
 from agent_framework.agents.base import BaseAgent, SimpleAgent
-from agent_framework.agents.simple_agent_v2 import SimpleAgent as SimpleAgentV2
-from agent_framework.agents.coding_agent import CodingAgent
-from agent_framework.agents.coding_agent_v2 import CodingAgentV2
-from agent_framework.agents.codebase_analyzer_agent import CodebaseAnalyzerAgent
-from agent_framework.agents.code_review_agent import CodeReviewAgent
-from agent_framework.agents.product_manager_agent import ProductManagerAgent
-from agent_framework.agents.tech_lead_agent import TechLeadAgent
-from agent_framework.agents.ppt_agent import PPTAgent
-from agent_framework.agents.research_agent import ResearchAgent
-from agent_framework.agents.coding_agent_v3 import CodingAgentV3
-from agent_framework.agents.prompt_refiner_agent import PromptRefinerAgent
-from agent_framework.agents.comic_agent import ComicAgent
+from agent_framework.lazy import LazyRef
 from agent_framework.llm.provider import LLMProvider
+from agent_framework.memory.session_log import attach_session_log, get_session_store
 
 from .exceptions import AgentFactoryError
 from .llm_provider_factory import create_llm_provider
 
+if TYPE_CHECKING:
+    from agent_framework.agents.simple_agent_v2 import SimpleAgent as SimpleAgentV2
+    from agent_framework.agents.coding_agent import CodingAgent
+    from agent_framework.agents.coding_agent_v2 import CodingAgentV2
+    from agent_framework.agents.codebase_analyzer_agent import CodebaseAnalyzerAgent
+    from agent_framework.agents.code_review_agent import CodeReviewAgent
+    from agent_framework.agents.product_manager_agent import ProductManagerAgent
+    from agent_framework.agents.tech_lead_agent import TechLeadAgent
+    from agent_framework.agents.ppt_agent import PPTAgent
+    from agent_framework.agents.research_agent import ResearchAgent
+    from agent_framework.agents.coding_agent_v3 import CodingAgentV3
+    from agent_framework.agents.prompt_refiner_agent import PromptRefinerAgent
+    from agent_framework.agents.comic_agent import ComicAgent
+
+logger = logging.getLogger(__name__)
+
 
 class AgentConfig:
-    """Configuration class for agent types."""
+    """
+    Configuration class for agent types.
+
+    The agent class may be given as an import path
+    (``"package.module:ClassName"``); it is imported on first use so that
+    registering an agent does not load its tools and SDKs.
+    """
 
     def __init__(
         self,
-        agent_class: Type[BaseAgent],
+        agent_class: Union[Type[BaseAgent], str],
         session_prefix: str,
         requires_project_dir: bool = False,
         default_debug_log_name: Optional[str] = None,
         creator_func: Optional[Callable] = None
     ):
-        self.agent_class = agent_class
+        self._agent_class = LazyRef(agent_class) if isinstance(agent_class, str) else agent_class
         self.session_prefix = session_prefix
         self.requires_project_dir = requires_project_dir
         self.default_debug_log_name = default_debug_log_name
         self.creator_func = creator_func
 
+    @property
+    def agent_class(self) -> Type[BaseAgent]:
+        """The agent class, imported now if it was registered by path."""
+        if isinstance(self._agent_class, LazyRef):
+            return self._agent_class.load()
+        return self._agent_class
+
+    @property
+    def class_name(self) -> str:
+        """Name of the agent class, without importing it."""
+        if isinstance(self._agent_class, LazyRef):
+            return self._agent_class.name
+        return self._agent_class.__name__
+
 
 class AgentFactory:
     """
@@ -73,7 +101,7 @@ class AgentFactory:
         # Register SimpleAgent v2 (enhanced with profiles)
         self.register_agent(
             name="simplev2",
-            agent_class=SimpleAgentV2,
+            agent_class="agent_framework.agents.simple_agent_v2:SimpleAgent",
             session_prefix="simplev2",
             requires_project_dir=False,
             creator_func=self._create_simple_agent_v2
@@ -82,7 +110,7 @@ class AgentFactory:
         # Register CodingAgent
         self.register_agent(
             name="coding",
-            agent_class=CodingAgent,
+            agent_class="agent_framework.agents.coding_agent:CodingAgent",
             session_prefix="coding",
             requires_project_dir=True,
             default_debug_log_name="coding_agent.log",
@@ -92,7 +120,7 @@ class AgentFactory:
         # Register CodingAgentV2 (Claude Code based)
         self.register_agent(
             name="codingv2",
-            agent_class=CodingAgentV2,
+            agent_class="agent_framework.agents.coding_agent_v2:CodingAgentV2",
             session_prefix="codingv2",
             requires_project_dir=True,
             default_debug_log_name="coding_agent_v2.log",
@@ -102,7 +130,7 @@ class AgentFactory:
         # Register CodebaseAnalyzerAgent
         self.register_agent(
             name="analyzer",
-            agent_class=CodebaseAnalyzerAgent,
+            agent_class="agent_framework.agents.codebase_analyzer_agent:CodebaseAnalyzerAgent",
             session_prefix="analyzer",
             requires_project_dir=True,
             default_debug_log_name="analyzer_agent.log",
@@ -112,7 +140,7 @@ class AgentFactory:
         # Register CodeReviewAgent
         self.register_agent(
             name="reviewer",
-            agent_class=CodeReviewAgent,
+            agent_class="agent_framework.agents.code_review_agent:CodeReviewAgent",
             session_prefix="reviewer",
             requires_project_dir=True,
             default_debug_log_name="review_agent.log",
@@ -122,7 +150,7 @@ class AgentFactory:
         # Register ProductManagerAgent
         self.register_agent(
             name="product",
-            agent_class=ProductManagerAgent,
+            agent_class="agent_framework.agents.product_manager_agent:ProductManagerAgent",
             session_prefix="product",
             requires_project_dir=True,
             default_debug_log_name="product_agent.log",
@@ -132,7 +160,7 @@ class AgentFactory:
         # Register TechLeadAgent
         self.register_agent(
             name="architect",
-            agent_class=TechLeadAgent,
+            agent_class="agent_framework.agents.tech_lead_agent:TechLeadAgent",
             session_prefix="architect",
             requires_project_dir=True,
             default_debug_log_name="architect_agent.log",
@@ -142,7 +170,7 @@ class AgentFactory:
         # Register PPTAgent
         self.register_agent(
             name="ppt",
-            agent_class=PPTAgent,
+            agent_class="agent_framework.agents.ppt_agent:PPTAgent",
             session_prefix="ppt",
             requires_project_dir=True,
             default_debug_log_name="ppt_agent.log",
@@ -152,7 +180,7 @@ class AgentFactory:
         # Register ResearchAgent
         self.register_agent(
             name="research",
-            agent_class=ResearchAgent,
+            agent_class="agent_framework.agents.research_agent:ResearchAgent",
             session_prefix="research",
             requires_project_dir=True,
             default_debug_log_name="research_agent.log",
@@ -162,7 +190,7 @@ class AgentFactory:
         # Register CodingAgentV3
         self.register_agent(
             name="codingv3",
-            agent_class=CodingAgentV3,
+            agent_class="agent_framework.agents.coding_agent_v3:CodingAgentV3",
             session_prefix="codingv3",
             requires_project_dir=True,
             default_debug_log_name="coding_agent_v3.log",
@@ -172,7 +200,7 @@ class AgentFactory:
         # Register PromptRefinerAgent
         self.register_agent(
             name="prompt_refiner",
-            agent_class=PromptRefinerAgent,
+            agent_class="agent_framework.agents.prompt_refiner_agent:PromptRefinerAgent",
             session_prefix="refiner",
             requires_project_dir=False,
             default_debug_log_name="prompt_refiner_agent.log",
@@ -182,7 +210,7 @@ class AgentFactory:
         # Register ComicAgent
         self.register_agent(
             name="comic",
-            agent_class=ComicAgent,
+            agent_class="agent_framework.agents.comic_agent:ComicAgent",
             session_prefix="comic",
             requires_project_dir=False,  # Creates its own session directory
             default_debug_log_name="comic_agent.log",
@@ -192,7 +220,7 @@ class AgentFactory:
     def register_agent(
         self,
         name: str,
-        agent_class: Type[BaseAgent],
+        agent_class: Union[Type[BaseAgent], str],
         session_prefix: str,
         requires_project_dir: bool = False,
         default_debug_log_name: Optional[str] = None,
@@ -203,7 +231,8 @@ class AgentFactory:
 
         Args:
             name: Agent type name (e.g., "coding", "simple")
-            agent_class: The agent class
+            agent_class: The agent class, or its import path
+                ("package.module:ClassName") to import it on first use
             session_prefix: Prefix for auto-generated session IDs
             requires_project_dir: Whether agent requires a project directory
             default_debug_log_name: Default debug log file name
@@ -222,15 +251,22 @@ class AgentFactory:
         agent_type: str,
         session_id: str | None = None,
         llm_provider: LLMProvider | None = None,
+        persist: bool = True,
         **kwargs: Any,
     ) -> BaseAgent:
         """
         Create an agent instance.
 
+        If the session store is enabled (see memory.session_log), the agent's
+        history is saved as it runs, and an agent created with the ID of a
+        saved session resumes it. Without a session ID a new, unique one is
+        generated, so the agent always starts fresh.
+
         Args:
             agent_type: Type of agent to create
             session_id: Optional session ID
             llm_provider: Optional LLM provider (creates default if not provided)
+            persist: Save and resume the session through the session store
             **kwargs: Additional arguments for agent creation
 
         Returns:
@@ -260,14 +296,18 @@ class AgentFactory:
                     "Make sure appropriate API key is set."
                 ) from e
 
-        # Generate session_id if not provided
+        # Generate session_id if not provided; only an explicit ID resumes
+        resume = session_id is not None
         if session_id is None:
-            session_id = f"{config.session_prefix}_{int(time.time())}"
+            session_id = f"{config.session_prefix}_{uuid.uuid4().hex}"
 
         # Handle project directory for agents that require it
         if config.requires_project_dir and "project_directory" not in kwargs:
             kwargs["project_directory"] = os.getcwd()
 
+        # Creation options, saved so the session can be resumed
+        options = dict(kwargs)
+
         # Set debug log path if not provided and default exists
         if (config.default_debug_log_name and "debug_log_path" not in kwargs
                 and "project_directory" in kwargs):
@@ -275,7 +315,7 @@ class AgentFactory:
 
         # Use custom creator function if available
         if config.creator_func:
-            return config.creator_func(
+            agent = config.creator_func(
                 session_id=session_id,
                 llm_provider=llm_provider,
                 **kwargs
@@ -313,11 +353,90 @@ class AgentFactory:
                     for tool in agent.tools.list_tools():
                         tool.execution_context = agent.execution_context
 
-                return agent
-
             except Exception as e:
                 raise AgentFactoryError(f"Failed to create {agent_type} agent: {e}") from e
 
+        if persist:
+            self._attach_session_log(agent, agent_type, session_id, options, resume)
+        return agent
+
+    def _attach_session_log(
+        self,
+        agent: BaseAgent,
+        agent_type: str,
+        session_id: str,
+        options: Dict[str, Any],
+        resume: bool = True,
+    ) -> None:
+        """Save the agent's session as it runs, resuming it if it was saved before (and ``resume``)."""
+        store = get_session_store()
+        if store is None or getattr(agent, "history", None) is None:
+            return
+
+        try:
+            log = store.open(session_id)
+        except ValueError as e:
+            logger.warning(f"Session {session_id!r} will not be saved: {e}")
+            return
+
+        metadata = {
+            "agent_type": agent_type,
+            "created_at": time.time(),
+            # Plain options only; credentials are never written to disk
+            "options": {
+                key: value for key, value in options.items()
+                if isinstance(value, (str, int, float, bool))
+                and not any(secret in key.lower() for secret in ("key", "token", "secret", "password"))
+            },
+        }
+        try:
+            resumed = attach_session_log(agent, log, metadata, resume=resume)
+        except ValueError as e:
+            logger.warning(f"Session {session_id!r} will not be saved: {e}")
+            return
+        if resumed:
+            logger.info(f"Resumed {agent_type} session {session_id} from {log.directory}")
+
+    def resume_agent(
+        self,
+        session_id: str,
+        llm_provider: LLMProvider | None = None,
+        **kwargs: Any,
+    ) -> BaseAgent:
+        """
+        Re-create the agent of a saved session and restore its state.
+
+        Args:
+            session_id: ID of a session in the session store
+            llm_provider: Optional LLM provider (creates default if not provided)
+            **kwargs: Creation options overriding the saved ones
+
+        Returns:
+            Agent with the session's history, environment state and sequence counter
+
+        Raises:
+            AgentFactoryError: If the store is disabled or the session was not saved
+        """
+        store = get_session_store()
+        if store is None:
+            raise AgentFactoryError("Session store is disabled (ARCHIFLOW_SESSION_STORE=off)")
+        try:
+            log = store.open(session_id)
+        except ValueError as e:
+            raise AgentFactoryError(str(e)) from e
+
+        metadata = log.metadata()
+        if not log.exists() or "agent_type" not in metadata:
+            raise AgentFactoryError(f"No saved session: {session_id}")
+
+        options = {**metadata.get("options", {}), **kwargs}
+        return self.create_agent(
+            agent_type=metadata["agent_type"],
+            session_id=session_id,
+            llm_provider=llm_provider,
+            **options
+        )
+
     def get_supported_agent_types(self) -> list[str]:
         """Get list of supported agent type names."""
         return list(self._agents.keys())
@@ -338,15 +457,17 @@ class AgentFactory:
         config = self._agents[agent_type]
         return {
             "name": agent_type,
-            "class": config.agent_class.__name__,
+            "class": config.class_name,
             "session_prefix": config.session_prefix,
             "requires_project_dir": config.requires_project_dir,
             "debug_log_name": config.default_debug_log_name
         }
 
     # Custom creator functions for complex agents
-    def _create_coding_agent(self, session_id, llm_provider, **kwargs) -> CodingAgent:
+    def _create_coding_agent(self, session_id, llm_provider, **kwargs) -> "CodingAgent":
         """Create a CodingAgent with proper configuration."""
+        from agent_framework.agents.coding_agent import CodingAgent
+
         agent = CodingAgent(
             llm=llm_provider,
             session_id=session_id,
@@ -359,8 +480,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_coding_agent_v2(self, session_id, llm_provider, **kwargs) -> CodingAgentV2:
+    def _create_coding_agent_v2(self, session_id, llm_provider, **kwargs) -> "CodingAgentV2":
         """Create a CodingAgentV2 (Claude Code based) with proper configuration."""
+        from agent_framework.agents.coding_agent_v2 import CodingAgentV2
+
         agent = CodingAgentV2(
             llm=llm_provider,
             session_id=session_id,
@@ -373,8 +496,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_analyzer_agent(self, session_id, llm_provider, **kwargs) -> CodebaseAnalyzerAgent:
+    def _create_analyzer_agent(self, session_id, llm_provider, **kwargs) -> "CodebaseAnalyzerAgent":
         """Create a CodebaseAnalyzerAgent with proper configuration."""
+        from agent_framework.agents.codebase_analyzer_agent import CodebaseAnalyzerAgent
+
         # Set defaults
         if "report_format" not in kwargs:
             kwargs["report_format"] = "markdown"
@@ -393,8 +518,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_review_agent(self, session_id, llm_provider, **kwargs) -> CodeReviewAgent:
+    def _create_review_agent(self, session_id, llm_provider, **kwargs) -> "CodeReviewAgent":
         """Create a CodeReviewAgent with proper configuration."""
+        from agent_framework.agents.code_review_agent import CodeReviewAgent
+
         # Set defaults
         if "review_depth" not in kwargs:
             kwargs["review_depth"] = "standard"
@@ -411,8 +538,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_product_manager_agent(self, session_id, llm_provider, **kwargs) -> ProductManagerAgent:
+    def _create_product_manager_agent(self, session_id, llm_provider, **kwargs) -> "ProductManagerAgent":
         """Create a ProductManagerAgent with proper configuration."""
+        from agent_framework.agents.product_manager_agent import ProductManagerAgent
+
         agent = ProductManagerAgent(
             llm=llm_provider,
             session_id=session_id,
@@ -425,8 +554,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_tech_lead_agent(self, session_id, llm_provider, **kwargs) -> TechLeadAgent:
+    def _create_tech_lead_agent(self, session_id, llm_provider, **kwargs) -> "TechLeadAgent":
         """Create a TechLeadAgent with proper configuration."""
+        from agent_framework.agents.tech_lead_agent import TechLeadAgent
+
         agent = TechLeadAgent(
             llm=llm_provider,
             session_id=session_id,
@@ -439,8 +570,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_simple_agent_v2(self, session_id, llm_provider, **kwargs) -> SimpleAgentV2:
+    def _create_simple_agent_v2(self, session_id, llm_provider, **kwargs) -> "SimpleAgentV2":
         """Create a SimpleAgent v2 with profile configuration."""
+        from agent_framework.agents.simple_agent_v2 import SimpleAgent as SimpleAgentV2
+
         # Extract profile from kwargs
         profile = kwargs.pop("profile", "general")
         custom_prompt = kwargs.pop("custom_prompt", None)
@@ -460,8 +593,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_ppt_agent(self, session_id, llm_provider, **kwargs) -> PPTAgent:
+    def _create_ppt_agent(self, session_id, llm_provider, **kwargs) -> "PPTAgent":
         """Create a PPTAgent with proper configuration."""
+        from agent_framework.agents.ppt_agent import PPTAgent
+
         import os
 
         # Get Google API key from environment
@@ -490,8 +625,10 @@ class AgentFactory:
 
         return agent
 
-    def _create_research_agent(self, session_id, llm_provider, **kwargs) -> ResearchAgent:
+    def _create_research_agent(self, session_id, llm_provider, **kwargs) -> "ResearchAgent":
         """Create a ResearchAgent with proper configuration."""
+        from agent_framework.agents.research_agent import ResearchAgent
+
         agent = ResearchAgent(
             session_id=session_id,
             llm=llm_provider,
@@ -505,17 +642,21 @@ class AgentFactory:
 
         return agent
 
-    def _create_coding_agent_v3(self, session_id, llm_provider, **kwargs) -> CodingAgentV3:
+    def _create_coding_agent_v3(self, session_id, llm_provider, **kwargs) -> "CodingAgentV3":
         """Create a CodingAgentV3 with proper configuration."""
+        from agent_framework.agents.coding_agent_v3 import CodingAgentV3
+
         agent = CodingAgentV3(
             session_id=session_id,
             llm=llm_provider,
             **kwargs
         )
 
-        # Set execution context on all tools if available
-        if hasattr(agent, 'execution_context'):
-            for tool in agent.tools.list_tools():
+        # Set execution context on the tools the agent uses; looking them up
+        # by name leaves the rest of the registry unimported
+        for name in agent.allowed_tools:
+            tool = agent.tools.get(name)
+            if tool is not None:
                 tool.execution_context = agent.execution_context
 
         return agent
@@ -556,8 +697,10 @@ Don't keep trying the same tool repeatedly if it's clearly not working."""
 
         return agent
 
-    def _create_prompt_refiner_agent(self, session_id, llm_provider, **kwargs) -> PromptRefinerAgent:
+    def _create_prompt_refiner_agent(self, session_id, llm_provider, **kwargs) -> "PromptRefinerAgent":
         """Create a PromptRefinerAgent with proper configuration."""
+        from agent_framework.agents.prompt_refiner_agent import PromptRefinerAgent
+
         # Extract initial_prompt from kwargs if provided
         initial_prompt = kwargs.get("initial_prompt")
 
@@ -570,8 +713,10 @@ Don't keep trying the same tool repeatedly if it's clearly not working."""
 
         return agent
 
-    def _create_comic_agent(self, session_id, llm_provider, **kwargs) -> ComicAgent:
+    def _create_comic_agent(self, session_id, llm_provider, **kwargs) -> "ComicAgent":
         """Create a ComicAgent with proper configuration."""
+        from agent_framework.agents.comic_agent import ComicAgent
+
         import os
         from pathlib import Path
 
@@ -642,6 +787,31 @@ def create_agent(
     )
 
 
+def resume_agent(
+    session_id: str,
+    llm_provider: LLMProvider | None = None,
+    **kwargs: Any,
+) -> BaseAgent:
+    """
+    Re-create the agent of a saved session with its state restored.
+
+    This is a convenience function that delegates to the global factory.
+
+    Args:
+        session_id: ID of a saved session
+        llm_provider: Optional LLM provider (creates default if not provided)
+        **kwargs: Creation options overriding the saved ones
+
+    Returns:
+        Agent instance
+    """
+    return _agent_factory.resume_agent(
+        session_id=session_id,
+        llm_provider=llm_provider,
+        **kwargs
+    )
+
+
 def get_supported_agent_types() -> list[str]:
     """Get list of supported agent type names."""
     return _agent_factory.get_supported_agent_types()
\ No newline at end of file
@@ -14,27 +14,50 @@ Supports creating:
 """
 
 import os
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from agent_framework.agents.base import BaseAgent, SimpleAgent
-from agent_framework.agents.coding_agent import CodingAgent
-from agent_framework.agents.coding_agent_v2 import CodingAgentV2
-from agent_framework.agents.codebase_analyzer_agent import CodebaseAnalyzerAgent
-from agent_framework.agents.code_review_agent import CodeReviewAgent
-from agent_framework.agents.product_manager_agent import ProductManagerAgent
-from agent_framework.agents.tech_lead_agent import TechLeadAgent
-from agent_framework.agents.ppt_agent import PPTAgent
-from agent_framework.agents.research_agent import ResearchAgent
-from agent_framework.agents.coding_agent_v3 import CodingAgentV3
 from agent_framework.llm.provider import LLMProvider
 
+if TYPE_CHECKING:
+    from agent_framework.agents.coding_agent import CodingAgent
+    from agent_framework.agents.coding_agent_v2 import CodingAgentV2
+    from agent_framework.agents.codebase_analyzer_agent import CodebaseAnalyzerAgent
+    from agent_framework.agents.code_review_agent import CodeReviewAgent
+    from agent_framework.agents.product_manager_agent import ProductManagerAgent
+    from agent_framework.agents.tech_lead_agent import TechLeadAgent
+    from agent_framework.agents.ppt_agent import PPTAgent
+    from agent_framework.agents.research_agent import ResearchAgent
+    from agent_framework.agents.coding_agent_v3 import CodingAgentV3
+
 # Import the refactored factories
 from .llm_provider_factory import create_llm_provider, get_supported_providers
-from .agent_factory_impl import create_agent as _create_agent, get_supported_agent_types
+from .agent_factory_impl import create_agent as _create_agent, get_supported_agent_types, resume_agent
 from .exceptions import AgentFactoryError
 
 AgentType = Literal["coding", "codingv2", "codingv3", "simple", "simplev2", "analyzer", "reviewer", "product", "architect", "ppt", "research", "prompt_refiner", "comic"]
 
+__all__ = [
+    "AgentFactoryError",
+    "AgentType",
+    "create_agent",
+    "create_analyzer_agent",
+    "create_coding_agent",
+    "create_coding_agent_v2",
+    "create_coding_agent_v3",
+    "create_comic_agent",
+    "create_llm_provider",
+    "create_product_manager_agent",
+    "create_prompt_refiner_agent",
+    "create_research_agent",
+    "create_review_agent",
+    "create_simple_agent",
+    "create_tech_lead_agent",
+    "get_supported_agent_types",
+    "get_supported_providers",
+    "resume_agent",
+]
+
 
 def create_agent(
     agent_type: AgentType,
@@ -71,7 +94,7 @@ def create_coding_agent(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> CodingAgent:
+) -> "CodingAgent":
     """
     Create a CodingAgent instance.
 
@@ -105,7 +128,7 @@ def create_coding_agent_v2(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> CodingAgentV2:
+) -> "CodingAgentV2":
     """
     Create a CodingAgentV2 instance (Claude Code based).
 
@@ -168,7 +191,7 @@ def create_analyzer_agent(
     report_format: str = "markdown",
     analysis_depth: str = "standard",
     **kwargs: object,
-) -> CodebaseAnalyzerAgent:
+) -> "CodebaseAnalyzerAgent":
     """
     Create a CodebaseAnalyzerAgent instance.
 
@@ -210,7 +233,7 @@ def create_review_agent(
     review_depth: str = "standard",
     focus_areas: list[str] | None = None,
     **kwargs: object,
-) -> CodeReviewAgent:
+) -> "CodeReviewAgent":
     """
     Create a CodeReviewAgent instance.
 
@@ -252,7 +275,7 @@ def create_product_manager_agent(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> ProductManagerAgent:
+) -> "ProductManagerAgent":
     """
     Create a ProductManagerAgent instance.
 
@@ -286,7 +309,7 @@ def create_tech_lead_agent(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> TechLeadAgent:
+) -> "TechLeadAgent":
     """
     Create a TechLeadAgent instance.
 
@@ -320,7 +343,7 @@ def create_coding_agent_v3(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> CodingAgentV3:
+) -> "CodingAgentV3":
     """
     Create a CodingAgentV3 instance.
 
@@ -350,7 +373,7 @@ def create_research_agent(
     llm_provider: LLMProvider | None = None,
     project_directory: str | None = None,
     **kwargs: object,
-) -> ResearchAgent:
+) -> "ResearchAgent":
     """
     Create a ResearchAgent instance.
 
@@ -7,34 +7,42 @@ without relying on multiple if-elif statements.
 
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, Type, Optional
+from typing import Dict, Type, Optional, Union
 
-from agent_framework.llm.openai_provider import OpenAIProvider
+from agent_framework.lazy import LazyRef
 from agent_framework.llm.provider import LLMProvider
-from agent_framework.llm.anthropic_provider import AnthropicProvider
-from agent_framework.llm.mock import MockLLMProvider
-
-# Import will be done lazily to avoid circular imports
-GLMProvider = None
 
 
 class ProviderConfig:
-    """Configuration class for LLM providers."""
+    """
+    Configuration class for LLM providers.
+
+    The provider class may be given as an import path
+    (``"package.module:ClassName"``) so its SDK is only imported when a
+    provider of that type is created.
+    """
 
     def __init__(
         self,
-        provider_class: Type[LLMProvider],
+        provider_class: Union[Type[LLMProvider], str],
         default_model: str,
         api_key_env: str,
         api_key_name: str,
         base_url_env: Optional[str] = None
     ):
-        self.provider_class = provider_class
+        self._provider_class = LazyRef(provider_class) if isinstance(provider_class, str) else provider_class
         self.default_model = default_model
         self.api_key_env = api_key_env
         self.api_key_name = api_key_name
         self.base_url_env = base_url_env
 
+    @property
+    def provider_class(self) -> Type[LLMProvider]:
+        """The provider class, imported now if it was registered by path."""
+        if isinstance(self._provider_class, LazyRef):
+            return self._provider_class.load()
+        return self._provider_class
+
 
 class LLMProviderFactory:
     """
@@ -53,7 +61,7 @@ class LLMProviderFactory:
         # Register OpenAI provider
         self.register_provider(
             name="openai",
-            provider_class=OpenAIProvider,
+            provider_class="agent_framework.llm.openai_provider:OpenAIProvider",
             default_model="gpt-5",
             api_key_env="OPENAI_API_KEY",
             api_key_name="OpenAI",
@@ -63,7 +71,7 @@ class LLMProviderFactory:
         # Register Anthropic provider
         self.register_provider(
             name="anthropic",
-            provider_class=AnthropicProvider,
+            provider_class="agent_framework.llm.anthropic_provider:AnthropicProvider",
             default_model="claude-3-5-sonnet-20241022",
             api_key_env="ANTHROPIC_API_KEY",
             api_key_name="Anthropic",
@@ -73,34 +81,26 @@ class LLMProviderFactory:
         # Register Mock provider
         self.register_provider(
             name="mock",
-            provider_class=MockLLMProvider,
+            provider_class="agent_framework.llm.mock:MockLLMProvider",
             default_model="mock-model",
             api_key_env=None,  # Mock doesn't need API key
             api_key_name="Mock"
         )
 
-        # Register GLM provider (lazy loading to avoid circular imports)
+        # Register GLM provider
         self.register_provider(
             name="glm",
-            provider_class=self._get_glm_provider_class,
+            provider_class="agent_framework.llm.glm_provider:GLMProvider",
             default_model="glm-4.6",
             api_key_env="ZAI_API_KEY",
             api_key_name="Z.ai",
             base_url_env="GLM_BASE_URL"
         )
 
-    def _get_glm_provider_class(self):
-        """Lazy import of GLMProvider to avoid circular imports."""
-        global GLMProvider
-        if GLMProvider is None:
-            from agent_framework.llm.glm_provider import GLMProvider as _GLMProvider
-            GLMProvider = _GLMProvider
-        return GLMProvider
-
     def register_provider(
         self,
         name: str,
-        provider_class: Type[LLMProvider],
+        provider_class: Union[Type[LLMProvider], str],
         default_model: str,
         api_key_env: Optional[str],
         api_key_name: str,
@@ -111,7 +111,8 @@ class LLMProviderFactory:
 
         Args:
             name: Provider name (e.g., "openai", "anthropic")
-            provider_class: The provider class or callable that returns the class
+            provider_class: The provider class, a callable that returns the class,
+                or its import path ("package.module:ClassName")
             default_model: Default model for this provider
             api_key_env: Environment variable name for API key
             api_key_name: Human-readable name for the provider
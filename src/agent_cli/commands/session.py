@@ -2,13 +2,15 @@
 Session management commands.
 """
 
+import time
 from typing import get_args
 from rich.console import Console
 
-from agent_cli.agents.factory import AgentFactoryError, AgentType, create_agent
+from agent_cli.agents.factory import AgentFactoryError, AgentType, create_agent, resume_agent
 from agent_cli.commands.router import CommandRouter
 from agent_cli.session.manager import SessionManager
 from agent_framework.agents.profiles import AGENT_PROFILES, list_profiles
+from agent_framework.memory.session_log import get_session_store
 
 console = Console()
 
@@ -225,6 +227,71 @@ async def switch_command(*args: str, **context: object) -> None:
     console.print(f"[green]✓[/green] Switched to session: {session_id}")
 
 
+async def resume_command(*args: str, **context: object) -> None:
+    """
+    Resume a saved agent session, e.g. after the CLI was restarted.
+
+    Usage:
+        /resume              # list saved sessions
+        /resume <session-id>
+
+    Args:
+        *args: Command arguments (session ID)
+        **context: Context (expects 'session_manager' and 'repl_engine')
+    """
+    session_manager = context.get("session_manager")
+    if not isinstance(session_manager, SessionManager):
+        console.print("[red]Error: Session manager not available[/red]")
+        return
+
+    repl_engine = context.get("repl_engine")
+    if repl_engine is None:
+        console.print("[red]Error: REPL engine not available[/red]")
+        return
+
+    store = get_session_store()
+    if store is None:
+        console.print("[yellow]Session saving is disabled (ARCHIFLOW_SESSION_STORE=off)[/yellow]")
+        return
+
+    if not args:
+        saved = store.list_sessions()
+        if not saved:
+            console.print("[yellow]No saved sessions[/yellow]")
+            return
+        console.print(f"[bold cyan]Saved Sessions ({len(saved)})[/bold cyan]\n")
+        for entry in saved[:20]:
+            updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["updated_at"]))
+            console.print(
+                f"○ [bold]{entry['session_id']}[/bold]\n"
+                f"  Agent: {entry.get('agent_type', 'unknown')}\n"
+                f"  Last saved: {updated}\n"
+            )
+        console.print("Use [bold]/resume <session-id>[/bold] to continue one")
+        return
+
+    session_id = args[0]
+    if session_manager.get_session(session_id):
+        console.print(f"[yellow]Session '{session_id}' is already open; use /switch[/yellow]")
+        return
+
+    try:
+        console.print(f"[cyan]Resuming session {session_id}...[/cyan]")
+        agent = resume_agent(session_id)
+        session = session_manager.create_session(agent=agent, session_id=session_id)
+        repl_engine.subscribe_to_output(session.session_id)
+
+        console.print(
+            f"[green]✓[/green] Resumed {agent.__class__.__name__} session\n"
+            f"[dim]Session ID:[/dim] {session.session_id}\n"
+            f"[dim]Messages restored:[/dim] {len(agent.history.get_messages())}"
+        )
+    except AgentFactoryError as e:
+        console.print(f"[red]Error resuming session:[/red] {e}")
+    except Exception as e:
+        console.print(f"[red]Unexpected error:[/red] {e}")
+
+
 async def brainstorm_command(*args: str, **context: object) -> None:
     """
     Create a ProductManagerAgent session and start brainstorming.
@@ -986,6 +1053,13 @@ def register_session_commands(router: CommandRouter) -> None:
         usage="switch <session-id>",
     )
 
+    router.register(
+        name="resume",
+        handler=resume_command,
+        description="Resume a saved session (lists saved sessions without an ID)",
+        usage="resume [session-id]",
+    )
+
     router.register(
         name="code",
         handler=code_command,
@@ -699,6 +699,72 @@ async def setup_font_command(*args: str, **context: object) -> None:
     console.print()
 
 
+async def trace_command(*args: str, **context: object) -> None:
+    """
+    Show recorded traces of agent turns.
+
+    Usage:
+        /trace                     # List recent turns
+        /trace last                # Flame view of the latest turn
+        /trace <trace-id>          # Flame view of a turn (ID prefix is enough)
+        /trace ... --file PATH     # Read spans from a JSONL/OTLP trace file
+
+    Args:
+        *args: Command arguments (last|trace-id, --file PATH)
+        **context: Context passed from router (unused)
+    """
+    from rich.markup import escape
+
+    from agent_framework.tracing import find_trace, get_tracer, load_spans, render_flame, summarize_traces
+
+    args = list(args)
+    trace_file = None
+    if "--file" in args:
+        index = args.index("--file")
+        if index + 1 >= len(args):
+            console.print("[red]Error: --file requires a path[/red]")
+            return
+        trace_file = args[index + 1]
+        del args[index:index + 2]
+
+    if trace_file:
+        try:
+            spans = load_spans(trace_file)
+        except OSError as e:
+            console.print(f"[red]Error reading trace file:[/red] {e}")
+            return
+    else:
+        spans = get_tracer().spans()
+
+    if not spans:
+        console.print("[yellow]No traces recorded yet.[/yellow]")
+        console.print("[dim]Tracing is controlled by ARCHIFLOW_TRACE_SAMPLE_RATE (0 disables it).[/dim]")
+        return
+
+    if not args:
+        console.print("\n[bold]Recent turns[/bold]\n")
+        for summary in summarize_traces(spans)[-20:]:
+            errors = f" [red]{summary['error_count']} errors[/red]" if summary["error_count"] else ""
+            console.print(
+                f"  [cyan]{summary['trace_id'][:12]}[/cyan]  {summary['root']:<16} "
+                f"{summary['duration_ms']:>10.1f}ms  {summary['span_count']:>3} spans{errors}"
+            )
+        console.print("\n[dim]Use /trace <trace-id> or /trace last for a flame view.[/dim]\n")
+        return
+
+    trace_id = None if args[0] == "last" else args[0]
+    try:
+        trace_spans = find_trace(spans, trace_id)
+    except KeyError as e:
+        console.print(f"[red]Error:[/red] {e.args[0]}")
+        return
+
+    console.print(f"\n[bold]Trace[/bold] [cyan]{trace_spans[0].trace_id}[/cyan]\n")
+    for line in render_flame(trace_spans, width=40):
+        console.print(escape(line), highlight=False)
+    console.print()
+
+
 def register_utility_commands(router: CommandRouter) -> None:
     """
     Register all utility commands with the router.
@@ -781,3 +847,10 @@ def register_utility_commands(router: CommandRouter) -> None:
         description="Setup terminal font configuration for VS Code",
         usage="setup-font [font-name] [--check|--list]",
     )
+
+    router.register(
+        name="trace",
+        handler=trace_command,
+        description="Show per-turn timing traces (flame view)",
+        usage="trace [last|trace-id] [--file PATH]",
+    )
@@ -386,6 +386,9 @@ class OutputRenderer:
                 f"Tool: {tool_name}\n"
                 "========================================="
             )
+        elif message_type == "ToolProgress":
+            tool_name = message.get("tool_name", "unknown")
+            self.console.print(f"[dim]⏳ {tool_name}: {content}[/dim]")
         elif message_type == "Error":
             self.error(content)
         elif message_type == "UserMessage":
@@ -401,6 +404,8 @@ class OutputRenderer:
                 self.console.print()
             else:
                 self.success("Agent has completed the task.", title="Finished")
+        elif message_type == "AgentInterrupted":
+            self.console.print(f"[yellow]⏹ Agent interrupted ({content})[/yellow]")
         elif message_type == "WAIT_FOR_USER_INPUT":
              self.warning(content or "The agent is waiting for your input.", title="Waiting for Input")
         else:
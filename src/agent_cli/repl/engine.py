@@ -5,6 +5,7 @@ REPL Engine - Interactive prompt for ArchiFlow.
 import asyncio
 import logging
 import os
+import signal
 from pathlib import Path
 from typing import Any
 
@@ -471,7 +472,7 @@ Type your message and press Enter to begin.
                     if not self.agent_idle.is_set():
                         logger.debug("Starting spinner, waiting for agent to finish...")
                         with console.status("[bold green]Thinking...[/bold green]", spinner="dots") as status:
-                            await self.agent_idle.wait()
+                            await self._wait_for_agent()
                             # Explicitly stop to ensure it updates
                             status.stop()
                         logger.debug("Spinner stopped, agent is idle")
@@ -498,6 +499,36 @@ Type your message and press Enter to begin.
             except asyncio.CancelledError:
                 pass
 
+    async def _wait_for_agent(self) -> None:
+        """
+        Wait until the agent is idle.
+
+        Ctrl+C while waiting interrupts the agent's turn - the running LLM
+        call and tools are aborted - instead of leaving the REPL.
+        """
+        loop = asyncio.get_running_loop()
+        interrupted = asyncio.Event()
+        try:
+            loop.add_signal_handler(signal.SIGINT, interrupted.set)
+            handling_sigint = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            # No loop signal handlers (Windows, or not the main thread)
+            handling_sigint = False
+
+        idle = asyncio.ensure_future(self.agent_idle.wait())
+        interrupt = asyncio.ensure_future(interrupted.wait())
+        try:
+            await asyncio.wait({idle, interrupt}, return_when=asyncio.FIRST_COMPLETED)
+            if interrupted.is_set() and not self.agent_idle.is_set():
+                self.session_manager.interrupt()
+                console.print("[yellow]Interrupted[/yellow]")
+                self.agent_idle.set()
+        finally:
+            idle.cancel()
+            interrupt.cancel()
+            if handling_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
+
     async def _handle_vague_prompt(self, user_input: str, vagueness: 'VaguenessScore') -> tuple[bool, str]:
         """
         Handle a vague prompt by showing warning and offering improvements.
@@ -69,9 +69,15 @@ class CLISession:
     def close(self) -> None:
         """Close the session and cleanup resources."""
         self.active = False
+        # Drop queued agent steps and abort the one in flight
+        self.controller.close()
         # Stop the broker
         if self.broker:
             self.broker.stop()
+        # Release the session log (the saved state stays for /resume)
+        session_log = getattr(self.agent, "session_log", None)
+        if session_log is not None:
+            session_log.close()
 
 
 class SessionManager:
@@ -253,6 +259,21 @@ class SessionManager:
 
         return True
 
+    def interrupt(self, session_id: str | None = None) -> bool:
+        """
+        Abort the agent's current turn (LLM call and running tools).
+
+        Args:
+            session_id: Optional session ID (uses active session if not provided)
+
+        Returns:
+            True if a turn was interrupted, False otherwise
+        """
+        session = self.get_session(session_id) if session_id else self.get_active_session()
+        if not session or not session.active:
+            return False
+        return session.controller.interrupt()
+
     def close_session(self, session_id: str) -> bool:
         """
         Close a session and cleanup resources.
@@ -1,3 +1,5 @@
+import asyncio
+import concurrent.futures
 import json
 import logging
 import os
@@ -19,6 +21,9 @@ from .runtime.prompt_preprocessor import (
     _set_last_refinement_action,
 )
 from .config.hierarchy import ConfigHierarchy
+from .agent_engine import AgentExecutionEngine, get_execution_engine
+from .cancellation import OperationCancelledError, cancellation_scope, get_cancellation_registry
+from .tracing import get_tracer
 
 logger = logging.getLogger("agent_controller")
 
@@ -40,6 +45,7 @@ class AgentController:
         context: TopicContext,
         working_dir: Optional[Path] = None,
         auto_refine_enabled_callback: Optional[callable] = None,
+        engine: Optional[AgentExecutionEngine] = None,
     ):
         """
         Initialize the agent controller.
@@ -53,25 +59,27 @@ class AgentController:
             auto_refine_enabled_callback: Optional callable that returns bool indicating
                                          if auto-refinement is enabled. If provided,
                                          allows runtime toggling via session config.
+            engine: Execution engine that runs the agent steps.
+                    Defaults to the process-wide engine.
         """
         self.agent = agent
         self.broker = broker
         self.context = context
         self.working_dir = working_dir or Path(os.getcwd())
+        self.engine = engine or get_execution_engine()
 
         # Initialize ConfigHierarchy for configuration management
-        # This loads settings from all hierarchy levels with proper precedence
-        self.config_hierarchy = ConfigHierarchy(working_dir=self.working_dir)
-        self._config_snapshot = None  # Cached snapshot
+        # This loads settings from all hierarchy levels with proper precedence.
+        # The watcher keeps the snapshot current, so per-message loads are free.
+        self.config_hierarchy = ConfigHierarchy(working_dir=self.working_dir, watch=True)
+        self._config_snapshot = None  # Snapshot the preprocessor was built from
+        self._auto_refine_enabled_callback = auto_refine_enabled_callback
 
         # Initialize prompt pre-processor for auto-refinement (Option 3)
         # This runs BEFORE the agent sees any UserMessage, ensuring
         # zero contamination of system prompt and conversation history
-        self.prompt_preprocessor = PromptPreprocessor(
-            llm=agent.llm,
-            config_snapshot=self._get_config_snapshot(),
-            enabled_callback=auto_refine_enabled_callback
-        )
+        self._config_snapshot = self._get_config_snapshot()
+        self.prompt_preprocessor = self._create_prompt_preprocessor(self._config_snapshot)
 
         logger.info(
             f"AgentController initialized: working_dir={self.working_dir}, "
@@ -79,29 +87,48 @@ class AgentController:
         )
 
     def _get_config_snapshot(self):
-        """Get or load the configuration snapshot."""
-        if self._config_snapshot is None:
-            self._config_snapshot = self.config_hierarchy.load()
-        return self._config_snapshot
+        """Get the current configuration snapshot (cached by the hierarchy)."""
+        return self.config_hierarchy.load()
+
+    def _create_prompt_preprocessor(self, snapshot) -> PromptPreprocessor:
+        return PromptPreprocessor(
+            llm=self.agent.llm,
+            config_snapshot=snapshot,
+            enabled_callback=self._auto_refine_enabled_callback
+        )
+
+    def _refresh_prompt_preprocessor(self) -> None:
+        """Rebuild the preprocessor if the watcher pushed a new snapshot."""
+        snapshot = self._get_config_snapshot()
+        if snapshot is not self._config_snapshot:
+            self._config_snapshot = snapshot
+            self.prompt_preprocessor = self._create_prompt_preprocessor(snapshot)
+            logger.info("Configuration changed, prompt preprocessor updated")
 
     def reload_config(self):
         """Force reload the configuration hierarchy."""
         self._config_snapshot = self.config_hierarchy.reload()
         # Reinitialize prompt preprocessor with new config
-        self.prompt_preprocessor = PromptPreprocessor(
-            llm=self.agent.llm,
-            config_snapshot=self._config_snapshot
-        )
+        self.prompt_preprocessor = self._create_prompt_preprocessor(self._config_snapshot)
         logger.info("Configuration reloaded")
 
-    def on_event(self, message: Any):
-        """Callback for new messages from the broker (User input)."""
+    def on_event(self, message: Any) -> Optional[concurrent.futures.Future]:
+        """
+        Callback for new messages from the broker (User input).
+
+        Deserializes the message and queues the agent step on the execution
+        engine, so the broker's delivery thread is not held for the LLM call.
+        Messages of one session are still processed one at a time, in order.
+
+        Returns:
+            Future for the queued step, or None if the message was rejected
+        """
         try:
             payload = message.payload
 
             if not isinstance(payload, dict):
                 logger.warning("Received non-dict payload")
-                return
+                return None
 
             msg_type = payload.get('type')
 
@@ -122,77 +149,172 @@ class AgentController:
             from .messages.types import deserialize_message
             try:
                 base_message = deserialize_message(payload)
+            except ValueError as e:
+                self._log_value_error(e, payload)
+                return None
 
-                # Pre-process UserMessages for auto-refinement (Option 3)
-                # This runs BEFORE the agent sees the message, ensuring
-                # zero contamination of system prompt and conversation history
-                if isinstance(base_message, UserMessage):
-                    original_content = base_message.content
-                    import asyncio
-
-                    async def run_preprocessor():
-                        try:
-                            return await self.prompt_preprocessor.process(base_message)
-                        except Exception as preprocessor_error:
-                            logger.error(f"Prompt preprocessor error: {preprocessor_error}", exc_info=True)
-                            # Return original message on error
-                            return base_message
+            return self.engine.submit(self.context.agent_topic, self._process, base_message, payload)
 
-                    try:
-                        # Try to get running loop, fall back to asyncio.run()
-                        try:
-                            loop = asyncio.get_running_loop()
-                            # Already in async context - this shouldn't happen in sync on_event
-                            # but if it does, skip the preprocessor to avoid issues
-                            logger.warning("on_event called from async context, skipping prompt preprocessor")
-                        except RuntimeError:
-                            # No running loop, safe to use asyncio.run
-                            base_message = asyncio.run(run_preprocessor())
-                    except Exception as outer_error:
-                        logger.error(f"Failed to run prompt preprocessor: {outer_error}", exc_info=True)
-                        base_message.content = original_content
-
-                    # If refinement was applied, publish notification
-                    if base_message.content != original_content:
-                        self._publish_refinement_notification(original_content, base_message.content)
-
-                # Step the agent
-                logger.info(f"[AgentController] Stepping agent with message type: {type(base_message).__name__}")
-                logger.info(f"[AgentController] Message sequence: {base_message.sequence}")
-
-                # Log content safely (not all message types have 'content' attribute)
-                if hasattr(base_message, 'content'):
-                    logger.info(f"[AgentController] Message content (first 200 chars): {str(base_message.content)[:200]}")
-                elif hasattr(base_message, 'tool_results'):
-                    logger.info(f"[AgentController] Batch tool results count: {len(base_message.tool_results)}")
-                elif hasattr(base_message, 'result'):
-                    logger.info(f"[AgentController] Tool result: {base_message.result}")
-                else:
-                    logger.info(f"[AgentController] Message attributes: {vars(base_message).keys()}")
-
-                response = self.agent.step(base_message)
-                self._handle_agent_response(response)
-            except ValueError as e:
-                logger.error(f"[AgentController] ValueError during agent step: {e}")
-                logger.error(f"[AgentController] Payload type: {payload.get('type')}")
-                logger.error(f"[AgentController] Payload keys: {list(payload.keys())}")
-                logger.error(f"[AgentController] Exception type: {type(e).__name__}")
-                logger.error(f"[AgentController] Exception message: {str(e)}")
-                import traceback
-                logger.error(f"[AgentController] Traceback:\n{traceback.format_exc()}")
-
-                try:
-                    payload_str = json.dumps(payload, indent=2, default=str)
-                    logger.error(f"[AgentController] Full payload:\n{payload_str}")
-                except Exception as dump_error:
-                    logger.error(f"[AgentController] Failed to dump payload: {dump_error}")
-                    logger.error(f"[AgentController] Raw payload: {payload}")
-                # Log payload length and character at error position if available
-                if 'column' in str(e) or 'char' in str(e):
-                    logger.error(f"[AgentController] Error indicates JSON parsing issue at specific position")
+        except Exception as e:
+            logger.error(f"Error in on_event: {e}", exc_info=True)
+            return None
+
+    def close(self) -> int:
+        """
+        Stop this session's work: drop queued steps and cancel the running one.
 
+        Returns:
+            Number of queued steps dropped
+        """
+        dropped = self.engine.cancel_session(self.context.agent_topic)
+        cancellations = get_cancellation_registry()
+        cancellations.cancel(self.session_id, "session closed")
+        cancellations.discard(self.session_id)
+        return dropped
+
+    @property
+    def session_id(self) -> str:
+        """Session whose turns this controller runs (key for cancellation)."""
+        return getattr(self.agent, "session_id", None) or self.context.agent_topic
+
+    def interrupt(self, reason: str = "interrupted by user") -> bool:
+        """
+        Abort the current turn: cancel the running step and its tools.
+
+        The in-flight LLM call is closed and running tools are stopped.
+        Steps already queued still run: they see the cancelled turn and
+        only record their message (e.g. a tool result) in the agent's
+        history, so every tool call keeps its result. The next user
+        message starts a new turn. Control goes back to the client right away.
+
+        Returns:
+            True if the turn was not already interrupted
+        """
+        interrupted = get_cancellation_registry().cancel(self.session_id, reason)
+        logger.info(f"[AgentController] Interrupted session {self.session_id}: {reason}")
+        if interrupted:
+            self.broker.publish(self.context.client_topic, {
+                "type": "AgentInterrupted",
+                "session_id": self.session_id,
+                "content": reason,
+            })
+            self.broker.publish(self.context.client_topic, {
+                "type": "WAIT_FOR_USER_INPUT",
+                "session_id": self.session_id,
+                "sequence": getattr(self.agent, "sequence_counter", 0),
+            })
+        return interrupted
+
+    async def _process(self, base_message: BaseMessage, payload: Dict[str, Any]) -> None:
+        """Pre-process and step the agent with one message (runs on the engine)."""
+        cancellations = get_cancellation_registry()
+        # A user message starts a turn; everything else continues the current one
+        if isinstance(base_message, UserMessage):
+            token = cancellations.begin(self.session_id)
+        else:
+            token = cancellations.token(self.session_id)
+
+        if token.cancelled:
+            self._record_interrupted(base_message)
+            return
+
+        try:
+            with cancellation_scope(token):
+                await self._step(base_message)
+        except OperationCancelledError as e:
+            logger.info(f"[AgentController] Step of session {self.session_id} cancelled: {e.reason}")
+        except ValueError as e:
+            self._log_value_error(e, payload)
+            self._publish_step_failed(e)
         except Exception as e:
             logger.error(f"Error in on_event: {e}", exc_info=True)
+            self._publish_step_failed(e)
+
+    def _publish_step_failed(self, error: Exception) -> None:
+        """Report a failed step and hand control back to the client, so the turn ends."""
+        self.broker.publish(self.context.client_topic, {
+            "type": "Error",
+            "session_id": self.session_id,
+            "content": f"Agent step failed: {error}",
+        })
+        self.broker.publish(self.context.client_topic, {
+            "type": "WAIT_FOR_USER_INPUT",
+            "session_id": self.session_id,
+            "sequence": getattr(self.agent, "sequence_counter", 0),
+        })
+
+    async def _step(self, base_message: BaseMessage) -> None:
+        # Pre-process UserMessages for auto-refinement (Option 3)
+        # This runs BEFORE the agent sees the message, ensuring
+        # zero contamination of system prompt and conversation history
+        if isinstance(base_message, UserMessage):
+            self._refresh_prompt_preprocessor()
+            original_content = base_message.content
+
+            try:
+                # The refiner calls the LLM synchronously, so it runs
+                # on an engine worker under the LLM concurrency limit
+                base_message = await self.engine.run_blocking_async(
+                    self.prompt_preprocessor.process, base_message
+                )
+            except OperationCancelledError:
+                raise
+            except Exception as preprocessor_error:
+                logger.error(f"Prompt preprocessor error: {preprocessor_error}", exc_info=True)
+                base_message.content = original_content
+
+            # If refinement was applied, publish notification
+            if base_message.content != original_content:
+                self._publish_refinement_notification(original_content, base_message.content)
+
+        # Step the agent
+        logger.debug(
+            f"[AgentController] Stepping agent with {type(base_message).__name__} "
+            f"(sequence {base_message.sequence})"
+        )
+
+        with get_tracer().span(
+            "agent.step",
+            agent=type(self.agent).__name__,
+            message_type=type(base_message).__name__,
+            session_id=getattr(base_message, "session_id", None),
+        ) as span:
+            if asyncio.iscoroutinefunction(self.agent.step):
+                response = await self.engine.run_blocking_async(self.agent.step, base_message)
+            else:
+                response = await self.engine.run_blocking(self.agent.step, base_message)
+            if span is not None and response is not None:
+                span.set_attribute("response_type", type(response).__name__)
+            self._handle_agent_response(response)
+
+    def _record_interrupted(self, message: BaseMessage) -> None:
+        """Keep a late result of an interrupted turn in history without stepping."""
+        update_memory = getattr(self.agent, "_update_memory", None)
+        if update_memory is None:
+            return
+        try:
+            update_memory(message)
+        except Exception as e:
+            logger.warning(f"[AgentController] Could not record {type(message).__name__} of interrupted turn: {e}")
+
+    def _log_value_error(self, e: ValueError, payload: Dict[str, Any]) -> None:
+        logger.error(f"[AgentController] ValueError during agent step: {e}")
+        logger.error(f"[AgentController] Payload type: {payload.get('type')}")
+        logger.error(f"[AgentController] Payload keys: {list(payload.keys())}")
+        logger.error(f"[AgentController] Exception type: {type(e).__name__}")
+        logger.error(f"[AgentController] Exception message: {str(e)}")
+        import traceback
+        logger.error(f"[AgentController] Traceback:\n{traceback.format_exc()}")
+
+        try:
+            payload_str = json.dumps(payload, indent=2, default=str)
+            logger.error(f"[AgentController] Full payload:\n{payload_str}")
+        except Exception as dump_error:
+            logger.error(f"[AgentController] Failed to dump payload: {dump_error}")
+            logger.error(f"[AgentController] Raw payload: {payload}")
+        # Log payload length and character at error position if available
+        if 'column' in str(e) or 'char' in str(e):
+            logger.error(f"[AgentController] Error indicates JSON parsing issue at specific position")
 
     def _publish_refinement_notification(self, original: str, refined: str):
         """Publish a notification about applied refinement to the client."""
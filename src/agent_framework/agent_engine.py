@@ -0,0 +1,395 @@
+"""
+Execution engine for agent steps.
+
+The broker delivers each topic's messages on a single thread, and an
+agent step blocks for the whole LLM call. AgentController therefore hands
+every message to the engine instead of stepping the agent on the
+delivery thread:
+
+- Jobs are serialized per session: a session's messages are processed
+  one at a time and in order, while different sessions run concurrently.
+- Jobs are coroutines running on one persistent event loop (a daemon
+  thread), so async work such as prompt pre-processing does not need a
+  new event loop per message.
+- Blocking calls (agent.step) go through run_blocking(), which runs them
+  on the engine's thread pool. At most ``max_concurrent_llm_calls`` of
+  them run at once (ARCHIFLOW_MAX_CONCURRENT_LLM_CALLS, default 8).
+- Coroutines that block inside (prompt refinement calls llm.generate
+  from async code) go through run_blocking_async(): they run on a
+  persistent event loop owned by a pool thread, under the same limit.
+- Work fanned out from a blocking call (e.g. concurrent review calls)
+  takes extra slots with acquire_llm_slot(), so it counts against the
+  same limit.
+- Queued jobs of a session can be cancelled; a job that already started
+  runs to completion.
+
+stats() separates the time jobs spend waiting (in the session queue and
+for an LLM slot) from the time spent in the blocking call itself.
+
+Usage:
+    engine = get_execution_engine()
+
+    async def job(message):
+        response = await engine.run_blocking(agent.step, message)
+        ...
+
+    future = engine.submit(session_id, job, message)  # concurrent.futures.Future
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_LLM_CALLS = 8
+
+
+def configured_llm_concurrency() -> int:
+    """Blocking LLM calls allowed at once (``ARCHIFLOW_MAX_CONCURRENT_LLM_CALLS``)."""
+    try:
+        value = int(os.environ.get("ARCHIFLOW_MAX_CONCURRENT_LLM_CALLS", DEFAULT_MAX_CONCURRENT_LLM_CALLS))
+    except ValueError:
+        value = DEFAULT_MAX_CONCURRENT_LLM_CALLS
+    return max(1, value)
+
+
+class LatencyStats:
+    """Count, mean, max and recent percentiles of a duration."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Milliseconds; percentiles cover the most recent samples."""
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, maximum = self.count, self.total, self.max
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000
+
+        return {
+            "count": count,
+            "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(percentile(0.50), 3),
+            "p95_ms": round(percentile(0.95), 3),
+            "max_ms": round(maximum * 1000, 3),
+        }
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future", "submitted", "context")
+
+    def __init__(self, fn: Callable[..., Awaitable[Any]], args: tuple, future: concurrent.futures.Future):
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.submitted = time.monotonic()
+        # The submitter's context, so trace spans nest under its span
+        self.context = contextvars.copy_context()
+
+
+class AgentExecutionEngine:
+    """
+    Per-session serialized job queues on a shared event loop.
+
+    Thread-safe: submit() and cancel_session() may be called from any
+    thread. run_blocking() must be awaited from a job.
+    """
+
+    def __init__(self, max_concurrent_llm_calls: Optional[int] = None):
+        """
+        Initialize the engine. Its loop thread starts on first use.
+
+        Args:
+            max_concurrent_llm_calls: Blocking calls allowed at once
+                (default ARCHIFLOW_MAX_CONCURRENT_LLM_CALLS, 8)
+        """
+        if max_concurrent_llm_calls is None:
+            max_concurrent_llm_calls = configured_llm_concurrency()
+        self.max_concurrent_llm_calls = max(1, max_concurrent_llm_calls)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_llm_calls, thread_name_prefix="agent-step"
+        )
+        self._llm_slots = asyncio.Semaphore(self.max_concurrent_llm_calls)
+        self._worker = threading.local()
+
+        # Touched only on the loop thread
+        self._queues: Dict[str, Deque[_Job]] = {}
+
+        # Futures not yet done, per session, for cancel_session()
+        self._futures: Dict[str, Set[concurrent.futures.Future]] = {}
+        self._futures_lock = threading.Lock()
+
+        self.queue_delay = LatencyStats()
+        self.llm_wait = LatencyStats()
+        self.llm_time = LatencyStats()
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.in_flight = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The engine's event loop, started on first access."""
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    self._start()
+        return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True, name="agent-engine")
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def submit(
+        self,
+        session_id: str,
+        job: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> concurrent.futures.Future:
+        """
+        Queue a job behind the session's earlier jobs.
+
+        Args:
+            session_id: Queue to run the job on
+            job: Coroutine function, called on the engine loop
+            *args: Arguments for the job
+
+        Returns:
+            Future for the job's result
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        item = _Job(job, args, future)
+        with self._futures_lock:
+            self._futures.setdefault(session_id, set()).add(future)
+        future.add_done_callback(lambda f: self._forget(session_id, f))
+        self.loop.call_soon_threadsafe(self._enqueue, session_id, item)
+        return future
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the engine loop from another thread and wait for it.
+
+        Raises:
+            RuntimeError: If called from the engine loop itself
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AgentExecutionEngine.run() called from the engine loop")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking call (an agent step) on the engine's thread pool.
+
+        Waits for one of the ``max_concurrent_llm_calls`` slots first.
+        """
+        waiting = time.monotonic()
+        async with self._llm_slots:
+            started = time.monotonic()
+            self.llm_wait.add(started - waiting)
+            self.in_flight += 1
+            try:
+                context = contextvars.copy_context()
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._call_with_slot, context, fn, *args
+                )
+            finally:
+                self.in_flight -= 1
+                self.llm_time.add(time.monotonic() - started)
+
+    def _call_with_slot(self, context: contextvars.Context, fn: Callable[..., Any], *args: Any) -> Any:
+        self._worker.holds_slot = True
+        try:
+            return context.run(fn, *args)
+        finally:
+            self._worker.holds_slot = False
+
+    def holds_llm_slot(self) -> bool:
+        """Whether the calling thread is running a blocking call under an LLM slot."""
+        return getattr(self._worker, "holds_slot", False)
+
+    def acquire_llm_slot(self, blocking: bool = True) -> bool:
+        """
+        Take an LLM slot for a call made outside run_blocking().
+
+        Must not be called from the engine loop. A thread that already
+        holds a slot (see holds_llm_slot) should pass ``blocking=False``:
+        if every slot were held by a call waiting for another one, none
+        would ever be released.
+
+        Args:
+            blocking: Wait for a slot instead of giving up when none is free
+
+        Returns:
+            True if a slot was taken; give it back with release_llm_slot()
+        """
+        async def take() -> bool:
+            if not blocking and self._llm_slots.locked():
+                return False
+            await self._llm_slots.acquire()
+            self.in_flight += 1
+            return True
+
+        return self.run(take())
+
+    def release_llm_slot(self) -> None:
+        """Give back a slot taken with acquire_llm_slot()."""
+        def give() -> None:
+            self.in_flight -= 1
+            self._llm_slots.release()
+
+        self.loop.call_soon_threadsafe(give)
+
+    async def run_blocking_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Run a coroutine that blocks inside on the thread pool, under the LLM limit.
+
+        Each pool thread keeps its own event loop, so this does not create a
+        loop per call the way asyncio.run() would.
+        """
+        return await self.run_blocking(self._run_on_worker_loop, fn, *args)
+
+    def _run_on_worker_loop(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        loop = getattr(self._worker, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = self._worker.loop = asyncio.new_event_loop()
+        return loop.run_until_complete(fn(*args))
+
+    def cancel_session(self, session_id: str) -> int:
+        """
+        Cancel a session's queued jobs. A job already running finishes.
+
+        Returns:
+            Number of jobs cancelled
+        """
+        with self._futures_lock:
+            futures = list(self._futures.get(session_id, ()))
+        return sum(1 for future in futures if future.cancel())
+
+    def pending(self, session_id: Optional[str] = None) -> int:
+        """Jobs queued or running (for one session, or in total)."""
+        with self._futures_lock:
+            if session_id is not None:
+                return len(self._futures.get(session_id, ()))
+            return sum(len(futures) for futures in self._futures.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and latencies for monitoring."""
+        with self._futures_lock:
+            sessions = sum(1 for futures in self._futures.values() if futures)
+        return {
+            "max_concurrent_llm_calls": self.max_concurrent_llm_calls,
+            "in_flight": self.in_flight,
+            "pending": self.pending(),
+            "busy_sessions": sessions,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            # Waiting behind the session's earlier jobs
+            "queue_delay": self.queue_delay.summary(),
+            # Waiting for an LLM slot
+            "llm_wait": self.llm_wait.summary(),
+            # Inside the blocking call
+            "llm_time": self.llm_time.summary(),
+        }
+
+    def shutdown(self) -> None:
+        """Cancel all queued jobs and stop the loop and thread pool."""
+        with self._futures_lock:
+            futures = [f for fs in self._futures.values() for f in fs]
+        for future in futures:
+            future.cancel()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=5.0)
+            self._loop = None
+            self._thread = None
+        self._executor.shutdown(wait=False)
+
+    def _forget(self, session_id: str, future: concurrent.futures.Future) -> None:
+        with self._futures_lock:
+            futures = self._futures.get(session_id)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._futures[session_id]
+
+    def _enqueue(self, session_id: str, item: _Job) -> None:
+        queue = self._queues.get(session_id)
+        if queue is None:
+            queue = self._queues[session_id] = deque()
+            self._loop.create_task(self._drain(session_id, queue))
+        queue.append(item)
+
+    async def _drain(self, session_id: str, queue: Deque[_Job]) -> None:
+        """Run a session's jobs in order until its queue is empty."""
+        try:
+            while queue:
+                item = queue.popleft()
+                if not item.future.set_running_or_notify_cancel():
+                    self.cancelled += 1
+                    continue
+                self.queue_delay.add(time.monotonic() - item.submitted)
+                task = item.context.run(self._loop.create_task, item.fn(*item.args))
+                try:
+                    result = await task
+                except BaseException as e:
+                    self.failed += 1
+                    item.future.set_exception(e)
+                    if not isinstance(e, Exception):
+                        raise
+                else:
+                    self.completed += 1
+                    item.future.set_result(result)
+        finally:
+            if self._queues.get(session_id) is queue:
+                del self._queues[session_id]
+
+
+_engine: Optional[AgentExecutionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_execution_engine() -> AgentExecutionEngine:
+    """Get the process-wide AgentExecutionEngine."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AgentExecutionEngine()
+        return _engine
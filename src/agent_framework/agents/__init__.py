@@ -1,9 +1,14 @@
 """Agent implementations."""
 
+from ..lazy import lazy_exports
 from .base import BaseAgent, SimpleAgent
-from .mock_agent import MockAgent
-from .ppt_agent import PPTAgent
-from .research_agent import ResearchAgent
-from .coding_agent_v3 import CodingAgentV3
+
+# Concrete agents pull in their tools and SDKs, so load them on first access
+__getattr__ = lazy_exports(__name__, {
+    "MockAgent": ".mock_agent",
+    "PPTAgent": ".ppt_agent",
+    "ResearchAgent": ".research_agent",
+    "CodingAgentV3": ".coding_agent_v3",
+})
 
 __all__ = ['BaseAgent', 'SimpleAgent', 'MockAgent', 'PPTAgent', 'ResearchAgent', 'CodingAgentV3']
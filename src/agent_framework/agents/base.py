@@ -140,7 +140,9 @@ class BaseAgent(ABC):
         # Count tokens in tools (if available)
         tools_tokens = 0
         if tools is not None:
-            tools_schema = tools.to_llm_schema()
+            # Agents that declare allowed_tools only send those to the LLM;
+            # counting just them also leaves other lazily registered tools unloaded
+            tools_schema = tools.to_llm_schema(getattr(self, "allowed_tools", None))
             tools_tokens = llm.count_tools_tokens(tools_schema)
 
         # Get retention window from config
@@ -161,6 +163,9 @@ class BaseAgent(ABC):
         self.tracker = EnvironmentTracker()
         self.persistent_memory = PersistentMemory()
 
+        # Durable session log (memory.session_log), set by attach_session_log
+        self.session_log = None
+
         self.context_injector = ContextInjector(
             tracker=self.tracker,
             memory=self.persistent_memory,
@@ -191,7 +196,10 @@ class BaseAgent(ABC):
         if self.include_project_context and not self._context_injected:
             self._inject_context_if_needed()
 
-        # Update tracker if it's a tool result
+        self._track_tool_result(message)
+
+    def _track_tool_result(self, message: BaseMessage) -> None:
+        """Update the environment tracker from a tool result."""
         if isinstance(message, ToolResultObservation):
             # We need the tool name and args to update the tracker properly.
             # Ideally, ToolResultObservation should contain this info or we look it up.
@@ -280,7 +288,7 @@ class BaseAgent(ABC):
                 insert_position = 0
                 logger.debug("Detected dynamic system message pattern (no SystemMessage in history)")
 
-            self.history._messages.insert(insert_position, self._project_context_msg)
+            self.history.insert(insert_position, self._project_context_msg)
             self._context_injected = True
             logger.info(
                 f"Project context injected at position {insert_position} "
@@ -17,6 +17,10 @@ import json
 import subprocess
 import re
 
+from ..cancellation import OperationCancelledError
+from ..diff_review import (
+    CHARS_PER_TOKEN, ChunkedReviewResult, DiffReviewer, ReviewCache, parse_diff, rank_files
+)
 from ..messages.types import BaseMessage, AgentFinishedMessage
 from ..llm.provider import LLMProvider
 from ..tools.tool_base import ToolRegistry
@@ -351,7 +355,8 @@ Bad comment example:
         pr_description_file: Optional[str] = None,
         review_depth: str = "standard",
         focus_areas: Optional[List[str]] = None,
-        debug_log_path: Optional[str] = None
+        debug_log_path: Optional[str] = None,
+        chunked_review: Optional[bool] = None
     ):
         """
         Initialize the Code Review Agent.
@@ -368,12 +373,18 @@ Bad comment example:
             focus_areas: Optional list of areas to focus on 
                         (e.g., ['security', 'performance']).
             debug_log_path: Optional path for debug logging.
+            chunked_review: Pre-review the diff in concurrent per-chunk LLM
+                        calls before the main loop (see diff_review.py).
+                        None runs it only for diffs too big for one chunk.
         """
         # Store review-specific configuration
         self.diff_file = diff_file
         self.pr_description_file = pr_description_file
         self.review_depth = review_depth
         self.focus_areas = focus_areas or ['all']
+        self.chunked_review = chunked_review
+        self.chunk_review: Optional[ChunkedReviewResult] = None
+        self._chunked_review_checked = False
         
         # Define allowed tools (read-only + tracking + write + finish)
         self.allowed_tools = [
@@ -570,7 +581,8 @@ Bad comment example:
             "file": "auto_generated.diff",
             "created_at": datetime.now().isoformat(),
             "source": source,
-            "stats": stats
+            "stats": stats,
+            "index": self._write_diff_index(diff_content)
         }
         self._save_metadata(metadata)
         
@@ -610,6 +622,33 @@ Bad comment example:
             "deletions": deletions
         }
 
+    def _write_diff_index(self, diff_content: str) -> Optional[str]:
+        """
+        Write the per-file index of a diff to diff_index.json.
+
+        Lists every changed file with its stats, blob hashes and risk,
+        riskiest first, so the review can start from an overview instead
+        of the whole diff.
+
+        Args:
+            diff_content: Raw diff text.
+
+        Returns:
+            Index file name (relative to the review directory), or None on error.
+        """
+        try:
+            files = rank_files(parse_diff(diff_content))
+            index_file = self.review_dir / "diff_index.json"
+            with open(index_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "created_at": datetime.now().isoformat(),
+                    "files": [diff.summary() for diff in files]
+                }, f, indent=2)
+            return index_file.name
+        except Exception as e:
+            logger.warning(f"Could not write diff index: {e}")
+            return None
+
     def handle_user_provided_files(
         self, diff_file: Optional[str] = None, pr_description_file: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -684,7 +723,8 @@ Bad comment example:
                     "created_at": datetime.now().isoformat(),
                     "source": "user_provided",
                     "original_path": str(diff_path),
-                    "stats": stats
+                    "stats": stats,
+                    "index": self._write_diff_index(diff_content)
                 }
                 self._save_metadata(metadata)
 
@@ -817,6 +857,29 @@ Bad comment example:
         """
         # Include both reason and full review result
         return f"{reason}\n\n{result}"
+
+    def _format_system_prompt(self) -> str:
+        """Add the chunked pre-review's findings, if any, to the prompt."""
+        prompt = super()._format_system_prompt()
+        if self.chunk_review is not None:
+            # Appended after formatting: comments may contain braces
+            prompt += "\n" + self._format_chunk_review_context()
+        return prompt
+
+    def step(self, message: BaseMessage) -> Optional[BaseMessage]:
+        """
+        Process a message, running the chunked pre-review before the first turn.
+
+        Args:
+            message: Incoming message.
+
+        Returns:
+            Response message from ProjectAgent.step.
+        """
+        if self.is_running and not self._chunked_review_checked:
+            self._chunked_review_checked = True
+            self._maybe_run_chunked_review()
+        return super().step(message)
     
     def _locate_pr_description(self) -> Optional[str]:
         """
@@ -884,6 +947,193 @@ Bad comment example:
         logger.info(f"Review context prepared: diff={bool(context['diff_file'])}, pr_desc={bool(context['pr_description'])}")
         return context
 
+    # ========================================================================
+    # Chunked diff review
+    # ========================================================================
+
+    def _resolve_diff_file(self) -> Optional[str]:
+        """
+        Find the diff to review, generating one from git if there is none.
+
+        Returns:
+            Path to the diff file, or None if there are no changes.
+        """
+        if self.diff_file and Path(self.diff_file).exists():
+            return str(self.diff_file)
+        for name in ("user_provided.diff", "auto_generated.diff"):
+            candidate = self.review_dir / name
+            if candidate.exists():
+                return str(candidate)
+        try:
+            return self._auto_generate_diff()
+        except ValueError as e:
+            logger.warning(f"Could not auto-generate diff: {e}")
+            return None
+
+    def run_chunked_review(self, diff_file: Optional[str] = None) -> Optional[ChunkedReviewResult]:
+        """
+        Review the diff in concurrent per-chunk LLM calls.
+
+        Files are ranked by risk and packed into chunks; each chunk is one
+        independent LLM call (see diff_review.py). Files whose change was
+        already reviewed with the same depth and focus areas come from
+        .agent/review/cache.json. The comments are saved to
+        results/chunks.json and merged into the final review when the
+        agent finishes.
+
+        Args:
+            diff_file: Diff to review (resolved like the main review if not given).
+
+        Returns:
+            The chunked review result, or None if there is no diff.
+
+        Raises:
+            OperationCancelledError: If the review was interrupted.
+        """
+        diff_path = diff_file or self._resolve_diff_file()
+        if not diff_path:
+            return None
+
+        with open(diff_path, 'r', encoding='utf-8', errors='replace') as f:
+            files = rank_files(parse_diff(f))
+
+        pr_description = ""
+        pr_file = self._locate_pr_description()
+        if pr_file:
+            try:
+                pr_description = Path(pr_file).read_text(encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"Could not read PR description: {e}")
+
+        cache = ReviewCache(
+            self.review_dir / "cache.json",
+            scope=f"{self.review_depth}:{','.join(sorted(self.focus_areas))}"
+        )
+        reviewer = DiffReviewer(self.llm, cache=cache)
+        result = reviewer.review(files, pr_description=pr_description, focus_areas=self.focus_areas)
+        self.chunk_review = result
+
+        chunks_file = self.review_dir / "results" / "chunks.json"
+        with open(chunks_file, 'w', encoding='utf-8') as f:
+            json.dump(result.to_dict(), f, indent=2)
+
+        metadata = self._load_metadata()
+        metadata["chunked_review"] = {
+            "timestamp": datetime.now().isoformat(),
+            "session_id": self.session_id,
+            "diff_file": str(diff_path),
+            **result.stats()
+        }
+        self._save_metadata(metadata)
+
+        logger.info(
+            f"Chunked review: {len(result.comments)} comments from "
+            f"{result.chunks_reviewed}/{result.chunks} chunks, {result.tokens_used} tokens"
+        )
+        return result
+
+    def _maybe_run_chunked_review(self) -> None:
+        """Run the chunked pre-review if enabled, or if the diff needs more than one chunk."""
+        if self.chunked_review is False:
+            return
+        diff_path = self._resolve_diff_file()
+        if not diff_path:
+            return
+        if self.chunked_review is None:
+            chunk_tokens = DiffReviewer(self.llm).chunk_tokens
+            if Path(diff_path).stat().st_size // CHARS_PER_TOKEN <= chunk_tokens:
+                return
+        try:
+            self.run_chunked_review(diff_path)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Chunked review failed, continuing with the regular review: {e}")
+
+    def _format_chunk_review_context(self, max_comments: int = 60) -> str:
+        """
+        Describe the chunked pre-review for the system prompt.
+
+        Args:
+            max_comments: Comments listed at most (riskiest files first).
+
+        Returns:
+            Prompt section with the file statuses and the comments found.
+        """
+        result = self.chunk_review
+        lines = [
+            "",
+            "## PRE-REVIEW FINDINGS",
+            "",
+            f"The diff was pre-reviewed in {result.chunks} chunks, riskiest files first "
+            f"({result.tokens_used} tokens). Do not read the whole diff: use `read` on the "
+            "files below (or on parts of the diff file) where you need context.",
+            "",
+            "Files (riskiest first):",
+        ]
+        lines += [f"- {path}: {status}" for path, status in result.files.items()]
+        lines += [
+            "",
+            "Comments found (they are merged into results/latest.json automatically when you "
+            "finish - do not copy them; list false positives as "
+            '{"file": ..., "line": ...} entries under "dismissed_findings" in latest.json):',
+        ]
+        for comment in result.comments[:max_comments]:
+            lines.append(
+                f"- {comment['file']}:{comment['line']} [{comment['severity']}/{comment['category']}] "
+                f"{comment['issue']}"
+            )
+        if len(result.comments) > max_comments:
+            lines.append(f"- ... {len(result.comments) - max_comments} more in results/chunks.json")
+        if not result.comments:
+            lines.append("- None")
+        lines += [
+            "",
+            "Verify the important findings, review files marked skipped or failed yourself, "
+            "and focus on cross-file issues a per-chunk review cannot see.",
+        ]
+        return "\n".join(lines)
+
+    def _merge_chunk_comments(self, review_data: Dict[str, Any]) -> int:
+        """
+        Merge the chunked pre-review's comments into a review result.
+
+        Comments already in the review (same file, line and category) and
+        those the agent listed under "dismissed_findings" are left out. An
+        APPROVE verdict becomes REQUEST_CHANGES if a merged comment is
+        CRITICAL or MAJOR.
+
+        Args:
+            review_data: Review result dictionary (modified in place).
+
+        Returns:
+            Number of comments added.
+        """
+        if self.chunk_review is None:
+            return 0
+
+        dismissed = {
+            (item.get("file"), item.get("line"))
+            for item in review_data.get("dismissed_findings", [])
+            if isinstance(item, dict)
+        }
+        comments = review_data.setdefault("comments", [])
+        seen = {(c.get("file"), c.get("line"), c.get("category")) for c in comments}
+        added = [
+            comment for comment in self.chunk_review.comments
+            if (comment["file"], comment["line"], comment["category"]) not in seen
+            and (comment["file"], comment["line"]) not in dismissed
+        ]
+        comments.extend(added)
+        review_data["chunked_review"] = self.chunk_review.stats()
+
+        if review_data.get("verdict") == "APPROVE" and any(
+            comment["severity"] in ("CRITICAL", "MAJOR") for comment in added
+        ):
+            review_data["verdict"] = "REQUEST_CHANGES"
+            logger.info("Verdict changed to REQUEST_CHANGES by merged pre-review comments")
+        return len(added)
+
     # ========================================================================
     # PHASE 2.1: JSON Review Output Format
     # ========================================================================
@@ -942,6 +1192,8 @@ Bad comment example:
         Returns:
             Path to the saved latest.json file.
         """
+        self._merge_chunk_comments(review_data)
+
         # Validate structure
         if not self._validate_review_result(review_data):
             logger.warning("Review result validation failed, saving anyway")
@@ -1642,16 +1894,23 @@ Bad comment example:
                     with open(latest_json, 'r', encoding='utf-8') as f:
                         review_data = json.load(f)
 
+                    # Merge comments from the chunked pre-review
+                    merged = self._merge_chunk_comments(review_data)
+                    if merged:
+                        logger.info(f"Merged {merged} pre-review comments into the review")
+
                     # Validate and fix generic summaries
                     summary = review_data.get("summary", "")
-                    if self._is_generic_summary(summary):
+                    generic = self._is_generic_summary(summary)
+                    if generic:
                         original_summary = summary
                         review_data["summary"] = self._generate_summary_from_review(review_data)
                         logger.warning(f"Generic summary detected and replaced")
                         logger.warning(f"  Original: {original_summary}")
                         logger.warning(f"  Generated: {review_data['summary']}")
 
-                        # Update the JSON file with fixed summary
+                    if generic or merged:
+                        # Update the JSON file with merged comments and fixed summary
                         with open(latest_json, 'w', encoding='utf-8') as f:
                             json.dump(review_data, f, indent=2)
 
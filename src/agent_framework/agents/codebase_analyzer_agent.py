@@ -10,6 +10,7 @@ from typing import Optional, Callable, List, Dict, Any
 from ..messages.types import BaseMessage
 from ..tools.tool_base import ToolRegistry
 from ..llm.provider import LLMProvider
+from ..subagents import SubAgentPool
 from .project_agent import ProjectAgent, get_environment_context
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,9 @@ Follow this systematic 5-phase analysis workflow:
         - Code organization principles
         - Naming conventions
         - Abstraction levels
+    *   For several independent modules or packages, use the `spawn_subagents` tool to analyze
+        them in parallel: one self-contained task per module (its path and what to report).
+        Each sub-agent returns a condensed report; merge them into your analysis
 
 4.  **MEASURE**: Calculate quantitative metrics
     *   Count total lines of code (LOC)
@@ -251,7 +255,8 @@ Remember: Your value is in providing INSIGHTS, not just data. Explain what the m
         # Define allowed tools (read-only subset + write for report generation)
         self.allowed_tools = [
             "glob", "grep", "read", "list",
-            "todo_write", "todo_read", "finish_task", "write"
+            "todo_write", "todo_read", "finish_task", "write",
+            "spawn_subagents"
         ]
 
         # Call parent constructor - handles all common initialization
@@ -266,6 +271,15 @@ Remember: Your value is in providing INSIGHTS, not just data. Explain what the m
             agent_version="1.0.0"
         )
 
+        # Sub-agents for analyzing independent modules in parallel (spawn_subagents)
+        self.subagents = SubAgentPool(
+            session_id,
+            llm,
+            self.project_directory,
+            tools=["glob", "grep", "read", "list"],
+            role="codebase analyzer agent",
+        )
+
     def get_system_message(self) -> str:
         """Return the system prompt for the analyzer agent."""
         # Format the system prompt with project directory
@@ -714,8 +714,9 @@ Would you like me to make any adjustments or help with next steps?" """
             working_directory=str(project_path.resolve())
         )
 
-        # Set execution context on all tools
-        for tool in self.tools.list_tools():
+        # Set execution context on the tools this agent uses. Looking them up
+        # by name leaves unrelated tools (image, PPTX, comic) unimported.
+        for tool in self._allowed_tool_instances():
             if hasattr(tool, 'execution_context'):
                 tool.execution_context = self.execution_context
 
@@ -956,16 +957,12 @@ Would you like me to make any adjustments or help with next steps?" """
         Returns:
             List of tool schemas for allowed coding tools
         """
-        # Get all available tools but filter to allowed ones
-        all_tools = self.tools.to_llm_schema()
-        filtered_tools = []
+        return self.tools.to_llm_schema(tool_names=self.allowed_tools)
 
-        for tool_schema in all_tools:
-            tool_name = tool_schema.get("function", {}).get("name", "")
-            if tool_name in self.allowed_tools:
-                filtered_tools.append(tool_schema)
-
-        return filtered_tools
+    def _allowed_tool_instances(self) -> list:
+        """Return the registered tools named in allowed_tools."""
+        tools = (self.tools.get(name) for name in self.allowed_tools)
+        return [tool for tool in tools if tool is not None]
 
     def _format_finish_message(self, reason: str, result: str) -> str:
         """
@@ -52,6 +52,7 @@ class ComicAgent(BaseAgent):
         "bash",                       # Shell commands
         "web_search", "web_fetch",    # Web research
         "generate_comic_panel",       # Comic panel image generation
+        "generate_comic_panels",      # Several panels/references in one call
         "generate_comic_page",        # Comic page composition (multiple panels)
         "export_comic_pdf",           # PDF export
         "finish_task"                 # Completion signal
@@ -898,6 +899,8 @@ User approved the spec. Generate images in TWO phases:
    - Form variants: "planetary", "ethereal", "human", "datastream"
 
    - Progress: "[1/N] Generating character reference: [Character Name] (variant)..."
+   - Faster: pass all reference sheets to ONE generate_comic_panels call
+     (each entry of `panels` takes the generate_comic_panel fields); they are generated concurrently
 
 3. **Verify Character References**
    - Use list("character_refs") to verify all were created
@@ -1208,6 +1211,7 @@ Always:
 - **write** - Save files (script.md, comic_spec.md)
 - **list** - Check directory contents
 - **generate_comic_panel** - Generate SINGLE panel (character refs ONLY)
+- **generate_comic_panels** - Generate SEVERAL panels/character refs in one call (runs concurrently)
 - **generate_comic_page** - Generate COMPLETE PAGE with your constructed prompt
 - **finish_task** - Mark task complete
 
@@ -1457,10 +1461,11 @@ Would you like me to make any adjustments?"""
         from ..llm.google_image_provider import GoogleImageProvider
         image_provider = GoogleImageProvider(api_key=self.google_api_key)
 
-        # Configure the generate_comic_panel tool with the provider
-        tool = self.tools.get("generate_comic_panel")
-        if tool:
-            tool.image_provider = image_provider
+        # Configure the panel tools with the provider
+        for name in ("generate_comic_panel", "generate_comic_panels"):
+            tool = self.tools.get(name)
+            if tool:
+                tool.image_provider = image_provider
 
         logger.info(f"ComicAgent configured {len(self.ALLOWED_TOOLS)} tools")
 
@@ -386,6 +386,7 @@ Always:
 - **web_search**: Search the web for information to include in presentations
 - **web_fetch**: Fetch content from URLs (images, reference material)
 - **generate_image**: Create slide images
+- **generate_slide_images**: Create images for several slides in one call (runs concurrently)
 - **export_pptx**: Create PowerPoint presentation
 - **export_pdf**: Create PDF version
 
@@ -414,6 +415,8 @@ NOTE: All file tools (read, write, list) resolve relative paths from the session
    - slide_type: "title", "content", or "conclusion"
    - slide_number: Slide number (1-based)
    - session_id: Session ID for organizing images
+   - Faster: pass all slides to ONE generate_slide_images call
+     (each entry of `slides` takes the fields above); slide 1 is generated first as the style reference
 3. Track generated image paths
 4. Call export_pptx(session_id=session_id)
 5. Call export_pdf(session_id=session_id)
@@ -801,6 +804,7 @@ Would you like me to open the presentation or make any adjustments?"""
             "bash",                      # Shell commands (rename/remove files)
             "web_search", "web_fetch",   # Web research capabilities
             "generate_image",            # Image generation
+            "generate_slide_images",     # Several slide images in one call
             "export_pptx", "export_pdf", # Presentation export
             "finish_task"                # Completion signal
         ]
@@ -924,9 +928,10 @@ Would you like me to open the presentation or make any adjustments?"""
         from ..llm.google_image_provider import GoogleImageProvider
         image_provider = GoogleImageProvider(api_key=self.google_api_key)
 
-        # Configure the generate_image tool with the provider
-        if "generate_image" in self.tools:
-            self.tools["generate_image"].image_provider = image_provider
+        # Configure the image tools with the provider
+        for name in ("generate_image", "generate_slide_images"):
+            if name in self.tools:
+                self.tools[name].image_provider = image_provider
 
         logger.info(f"PPTAgent configured {len(self.allowed_tools)} tools")
 
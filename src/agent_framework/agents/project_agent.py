@@ -22,6 +22,7 @@ from ..messages.types import (
 )
 from ..tools.tool_base import ToolRegistry
 from ..llm.provider import LLMProvider
+from ..llm.debug_trace import DebugTrace
 from .base import BaseAgent, get_environment_context
 from ..runtime.context import ExecutionContext
 
@@ -108,6 +109,7 @@ class ProjectAgent(BaseAgent):
         self.sequence_counter = 0
         self.is_running = True
         self.debug_log_path = debug_log_path
+        self._debug_trace: Optional[DebugTrace] = None
 
         # Store additional kwargs for subclass access
         self._kwargs = kwargs
@@ -281,7 +283,9 @@ class ProjectAgent(BaseAgent):
         """
         Log debug information about LLM interactions to file.
 
-        Only logs if debug_log_path is set.
+        Only logs if debug_log_path is set. Requests are written as deltas
+        against the previous one (see llm/debug_trace.py); use
+        load_request() there to get a step's full request back.
 
         Args:
             messages: Messages sent to LLM
@@ -292,35 +296,11 @@ class ProjectAgent(BaseAgent):
             return
 
         try:
-            # Prepare log entry
-            log_entry = {
-                "step": self.sequence_counter,
-                "timestamp": __import__('datetime').datetime.now().isoformat(),
-                "session_id": self.session_id,
-                "messages": messages,
-                "response": {
-                    "content": getattr(response, 'content', None),
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "name": tc.name,
-                            "arguments": tc.arguments
-                        } for tc in response.tool_calls
-                    ] if hasattr(response, 'tool_calls') and response.tool_calls else [],
-                    "stop_reason": getattr(response, 'stop_reason', None),
-                    "usage": getattr(response, 'usage', None)
-                }
-            }
-
-            # Ensure directory exists
-            log_path = Path(self.debug_log_path)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Append to log file
-            with open(log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, indent=2, ensure_ascii=False))
-                f.write('\n' + '='*80 + '\n')
-
+            if self._debug_trace is None or str(self._debug_trace.path) != str(self.debug_log_path):
+                self._debug_trace = DebugTrace(self.debug_log_path)
+            self._debug_trace.record(
+                self.session_id, self.sequence_counter, messages, tools_schema, response
+            )
             logger.debug(f"Debug info logged to {self.debug_log_path}")
 
         except Exception as e:
@@ -20,6 +20,7 @@ from ..messages.types import (
 from ..tools.tool_base import ToolRegistry
 from ..llm.provider import LLMProvider
 from ..runtime.context import ExecutionContext
+from ..subagents import SubAgentPool
 from .base import BaseAgent, get_environment_context
 
 logger = logging.getLogger(__name__)
@@ -395,6 +396,11 @@ Exit condition: When user is satisfied with the final report"""
 - **list**: Check session directory contents
   - Verify files are saved properly
 
+- **spawn_subagents**: Research independent questions in parallel
+  - Give each sub-agent one self-contained question or search theme
+  - Sub-agents search and fetch on their own and return condensed findings with sources
+  - Use it when the plan has several independent questions; merge their findings yourself
+
 ### Search Strategy Patterns
 1. **Initial Broad Searches**:
    - Topic overview
@@ -482,6 +488,7 @@ Would you like me to make any adjustments or help you use this research further?
             "web_search", "web_fetch",     # Research capabilities
             "read", "write",              # File operations
             "list",                      # Directory operations
+            "spawn_subagents",           # Parallel research branches
             "finish_task"                # Completion signal
         ]
 
@@ -522,6 +529,15 @@ Would you like me to make any adjustments or help you use this research further?
             if hasattr(tool, 'execution_context'):
                 tool.execution_context = self.execution_context
 
+        # Sub-agents for independent research branches (spawn_subagents)
+        self.subagents = SubAgentPool(
+            session_id,
+            llm,
+            project_path.resolve(),
+            tools=["web_search", "web_fetch", "read", "list"],
+            role="research agent",
+        )
+
         # Call parent constructor
         super().__init__(
             llm=llm,
@@ -0,0 +1,230 @@
+"""
+Sub-Agent Implementation.
+
+A lightweight, non-interactive agent spawned by a parent agent (see
+agent_framework/subagents.py) to work on one independent branch of its
+plan - a search query, a module to analyze - with a scoped set of tools
+and a token budget. It ends with a condensed result for the parent.
+"""
+import logging
+from typing import Optional, List, Dict, Any
+
+from ..cancellation import OperationCancelledError
+from ..messages.types import BaseMessage, AgentFinishedMessage, LLMRespondMessage
+from ..tools.tool_base import ToolRegistry
+from ..llm.provider import LLMProvider
+from .project_agent import ProjectAgent, get_environment_context
+
+logger = logging.getLogger(__name__)
+
+
+class SubAgent(ProjectAgent):
+    """
+    A child agent that works on one task and reports back to its parent.
+
+    Differences from a regular ProjectAgent:
+    - Never waits for the user: a text reply or finish_task ends it
+    - Only sees the tools the parent scoped for it
+    - Stops when its token budget or turn limit runs out, returning
+      what it has so far
+    - Checks its parent session's shared budget before every LLM call
+    """
+
+    SYSTEM_PROMPT = """You are a focused sub-agent working for a {role}. You handle ONE task and report back; nobody will answer questions.
+
+## PROJECT WORKSPACE
+*   Your project directory is: {project_directory}
+
+## YOUR TASK
+{task}
+
+## RULES
+*   Stay strictly on your task; other sub-agents are covering the other branches.
+*   Be economical: you have a limited token budget ({token_budget} tokens) and at most {max_turns} turns.
+*   When you are done, call `finish_task` with `result` set to a condensed report for the parent agent:
+    - The key findings, as short bullet points (at most ~300 words)
+    - Sources (URLs) or file paths backing each finding
+    - Anything you could not resolve
+*   Do not write files unless your task says so."""
+
+    WRAP_UP_NOTE = (
+        "Budget nearly exhausted. Stop exploring and call finish_task now "
+        "with a condensed report of what you have found."
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        llm: LLMProvider,
+        task: str,
+        project_directory: Optional[str] = None,
+        tools: Optional[ToolRegistry] = None,
+        allowed_tools: Optional[List[str]] = None,
+        role: str = "parent agent",
+        token_budget: int = 60000,
+        max_turns: int = 15,
+        session_budget: Optional[Any] = None,
+    ):
+        """
+        Initialize the sub-agent.
+
+        Args:
+            session_id: Session identifier of this child
+            llm: LLM provider (shared with the parent)
+            task: What this child should find out or analyze
+            project_directory: Directory the child's tools work in
+            tools: Tool registry (uses global if None)
+            allowed_tools: Tool names the child may use; finish_task is always added
+            role: Description of the parent, for the system prompt
+            token_budget: Tokens this child may spend
+            max_turns: LLM calls this child may make
+            session_budget: The parent session's SubAgentBudget (charged
+                for every call; the child stops when it is spent)
+        """
+        self.task = task
+        self.role = role
+        self.token_budget = token_budget
+        self.max_turns = max_turns
+        self.session_budget = session_budget
+        self.allowed_tools = list(allowed_tools or [])
+        if "finish_task" not in self.allowed_tools:
+            self.allowed_tools.append("finish_task")
+
+        self.tokens_used = 0
+        self.turns = 0
+        self.status = "running"
+        self.result = ""
+        self._last_thought = ""
+
+        super().__init__(
+            session_id=session_id,
+            llm=llm,
+            project_directory=project_directory,
+            tools=tools,
+            agent_name="SubAgent",
+            agent_version="1.0.0",
+            include_project_context=False,
+        )
+
+    def get_system_message(self) -> str:
+        """Return the system prompt for this child's task."""
+        prompt = self.SYSTEM_PROMPT.format(
+            role=self.role,
+            task=self.task,
+            token_budget=self.token_budget,
+            max_turns=self.max_turns,
+            project_directory=self.project_directory,
+        )
+        return prompt + "\n\n" + get_environment_context(working_directory=str(self.project_directory))
+
+    def _format_system_prompt(self) -> str:
+        # The task text may contain braces, so the prompt is not a template
+        return self.get_system_message()
+
+    def _setup_tools(self):
+        """Drop scoped tool names the registry does not have."""
+        available = [name for name in self.allowed_tools if self.tools.get(name)]
+        missing = set(self.allowed_tools) - set(available)
+        if missing:
+            logger.warning(f"SubAgent {self.session_id}: tools not available: {', '.join(sorted(missing))}")
+        self.allowed_tools = available
+
+    def _get_tools_schema(self) -> List[Dict[str, Any]]:
+        """Only the tools the parent scoped for this child."""
+        return self.tools.to_llm_schema(tool_names=self.allowed_tools)
+
+    def _format_finish_message(self, reason: str, result: str) -> str:
+        """The condensed result is what the parent gets back."""
+        self.result = result or reason
+        if self.status == "running":
+            self.status = "completed"
+        return self.result
+
+    def _budget_exhausted(self) -> Optional[str]:
+        """Why the child must stop before its next call, or None."""
+        if self.turns >= self.max_turns:
+            return f"turn limit reached ({self.max_turns} turns)"
+        if self.tokens_used >= self.token_budget:
+            return f"token budget exhausted ({self.tokens_used}/{self.token_budget} tokens)"
+        if self.session_budget is not None and self.session_budget.remaining <= 0:
+            return "the session's sub-agent token budget is exhausted"
+        return None
+
+    def _nearly_exhausted(self) -> bool:
+        if self.turns >= self.max_turns - 1:
+            return True
+        if self.tokens_used >= 0.8 * self.token_budget:
+            return True
+        return self.session_budget is not None and self.session_budget.remaining < 0.1 * self.token_budget
+
+    def _finish(self, status: str, result: str) -> AgentFinishedMessage:
+        """Stop the child with the given outcome."""
+        self.status = status
+        self.result = result
+        self.is_running = False
+        finished = AgentFinishedMessage(
+            session_id=self.session_id,
+            sequence=self._next_sequence(),
+            reason=result
+        )
+        self._update_memory(finished)
+        return finished
+
+    def partial_result(self, reason: str) -> str:
+        """Report for a child stopped before it finished: its last notes."""
+        notes = self._last_thought.strip() or "No findings were reported before stopping."
+        return f"{notes}\n\n(Stopped early: {reason}.)"
+
+    def step(self, message: BaseMessage) -> Optional[BaseMessage]:
+        """
+        Process a message: one LLM turn within the budgets.
+
+        Returns:
+            ToolCallMessage to continue, or AgentFinishedMessage when done
+        """
+        if not self.is_running:
+            return None
+
+        self._update_memory(message)
+
+        exhausted = self._budget_exhausted()
+        if exhausted:
+            logger.info(f"SubAgent {self.session_id} stopping: {exhausted}")
+            return self._finish("budget_exhausted", self.partial_result(exhausted))
+
+        messages = [{"role": "system", "content": self._format_system_prompt()}]
+        messages += self.history.to_llm_format()
+        if self._nearly_exhausted():
+            messages.append({"role": "user", "content": self.WRAP_UP_NOTE})
+
+        tools_schema = self._get_tools_schema()
+        self.turns += 1
+        try:
+            response = self.llm.generate(messages, tools=tools_schema)
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"SubAgent {self.session_id} LLM call failed: {e}")
+            return self._finish("failed", self.partial_result(f"LLM call failed: {e}"))
+
+        used = response.usage.get("total_tokens") or (
+            response.usage.get("prompt_tokens", 0) + response.usage.get("completion_tokens", 0)
+        )
+        self.tokens_used += used
+        if self.session_budget is not None:
+            self.session_budget.charge(used)
+
+        if response.content:
+            self._last_thought = response.content
+
+        if response.tool_calls:
+            return self._process_tool_calls(response)
+
+        # Nobody answers a sub-agent: a text reply is its final report
+        reply = LLMRespondMessage(
+            session_id=self.session_id,
+            sequence=self._next_sequence(),
+            content=response.content or ""
+        )
+        self._update_memory(reply)
+        return self._finish("completed", response.content or "The sub-agent returned no findings.")
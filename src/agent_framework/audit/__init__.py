@@ -4,13 +4,19 @@ Audit trail interfaces and implementations for logging security events.
 This package provides interfaces and implementations for audit logging.
 """
 
-from .trail import AuditTrail, AuditSeverity
+from .trail import AuditTrail, AuditSeverity, redact_params
 from .null import NullAuditTrail
 from .logger import LoggerAuditTrail
+from .file import FileAuditTrail
+from .writer import AuditWriter, get_audit_writer
 
 __all__ = [
     "AuditTrail",
     "AuditSeverity",
+    "redact_params",
     "NullAuditTrail",
     "LoggerAuditTrail",
+    "FileAuditTrail",
+    "AuditWriter",
+    "get_audit_writer",
 ]
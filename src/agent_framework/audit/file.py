@@ -0,0 +1,158 @@
+"""
+File-based audit trail implementation.
+
+Appends JSONL records through the batched AuditWriter, so logging from
+tool execution never waits for disk I/O.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .trail import AuditTrail, AuditSeverity, redact_params
+from .writer import AuditWriter, get_audit_writer
+
+
+class FileAuditTrail(AuditTrail):
+    """
+    Audit trail that writes JSONL records to a log file.
+
+    Every record has ``timestamp``, ``event_type`` and ``severity``.
+    Event types are ``tool_execution``, the security event type as given
+    (e.g. ``path_violation``), and ``session_<event>`` for session events.
+    The file rotates and is indexed as described in ``audit.writer``.
+
+    Usage:
+        audit = FileAuditTrail(workspace / ".archiflow" / "audit.jsonl")
+
+        await audit.log_execution("read", {"file_path": "test.txt"}, True)
+
+        violations = audit.query(event_type="path_violation", limit=20)
+    """
+
+    def __init__(self, path: Path, writer: Optional[AuditWriter] = None):
+        """
+        Initialize file audit trail.
+
+        Args:
+            path: Log file (rotated segments are kept next to it)
+            writer: AuditWriter to queue records on (defaults to the shared one)
+        """
+        self.path = Path(path)
+        self.writer = writer or get_audit_writer()
+
+    def _append(self, event_type: str, severity: str, fields: Dict[str, Any]) -> None:
+        now = datetime.now(timezone.utc)
+        record = {
+            "timestamp": now.isoformat(),
+            "event_type": event_type,
+            "severity": severity,
+            **fields,
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        self.writer.append(self.path, line, event_type=event_type, timestamp=now.timestamp())
+
+    async def log_execution(
+        self,
+        tool_name: str,
+        params: Dict[str, Any],
+        success: bool,
+        error: Optional[str] = None,
+        **metadata,
+    ) -> None:
+        """
+        Log a tool execution.
+
+        Args:
+            tool_name: Name of the tool
+            params: Tool parameters (sensitive values are redacted)
+            success: Whether execution succeeded
+            error: Error message if failed
+            **metadata: Additional metadata
+        """
+        self._append(
+            "tool_execution",
+            AuditSeverity.INFO if success else AuditSeverity.WARNING,
+            {
+                "tool_name": tool_name,
+                "params": redact_params(params or {}, max_length=200),
+                "success": success,
+                "error": error,
+                **metadata,
+            },
+        )
+
+    async def log_security_event(
+        self,
+        event_type: str,
+        severity: str,
+        message: str,
+        **context,
+    ) -> None:
+        """
+        Log a security event.
+
+        Args:
+            event_type: Type of security event
+            severity: Severity level
+            message: Event message
+            **context: Additional context
+        """
+        self._append(event_type, severity, {"message": message, **context})
+
+    async def log_session_event(
+        self,
+        session_id: str,
+        event_type: str,
+        **details,
+    ) -> None:
+        """
+        Log a session lifecycle event.
+
+        Args:
+            session_id: Session identifier
+            event_type: Event type
+            **details: Event details
+        """
+        self._append(
+            f"session_{event_type}",
+            AuditSeverity.INFO,
+            {"session_id": session_id, **details},
+        )
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read records, oldest first, using the log's index to filter.
+
+        Args:
+            event_type: Only records of this type
+            since: Only records at or after this time
+            until: Only records before this time
+            limit: Maximum records to return
+
+        Returns:
+            List of record dicts
+        """
+        lines = self.writer.query(
+            self.path,
+            event_type=event_type,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            limit=limit,
+        )
+        records = [json.loads(line) for line in lines]
+        if event_type is not None:
+            # The index matches types by checksum; confirm the real type
+            records = [r for r in records if r.get("event_type") == event_type]
+        return records
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until all logged records are on disk."""
+        return self.writer.flush(timeout)
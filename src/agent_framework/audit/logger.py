@@ -8,7 +8,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
-from .trail import AuditTrail, AuditSeverity
+from .trail import AuditTrail, AuditSeverity, redact_params
 
 # Dedicated audit logger
 _audit_logger = logging.getLogger("archiflow.audit")
@@ -157,29 +157,7 @@ class LoggerAuditTrail(AuditTrail):
         if not params:
             return "{}"
 
-        # Sensitive parameter names to redact
-        SENSITIVE_KEYS = {
-            "password", "passwd", "pwd",
-            "api_key", "apikey", "api-key",
-            "secret", "token", "auth",
-            "credential", "credentials",
-            "private_key", "privatekey",
-        }
-
-        # Truncate long values and redact sensitive data
-        formatted = {}
-        for key, value in params.items():
-            # Check if this is a sensitive key (case-insensitive)
-            is_sensitive = key.lower() in SENSITIVE_KEYS
-
-            if is_sensitive:
-                formatted[key] = "[REDACTED]"
-            elif isinstance(value, str) and len(value) > 100:
-                formatted[key] = f"{value[:100]}...[truncated {len(value)} chars]"
-            else:
-                formatted[key] = value
-
-        return str(formatted)
+        return str(redact_params(params, max_length=100))
 
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format context dict for logging."""
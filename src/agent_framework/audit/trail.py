@@ -8,6 +8,38 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+# Parameter names whose values are never written to audit logs
+SENSITIVE_KEYS = {
+    "password", "passwd", "pwd",
+    "api_key", "apikey", "api-key",
+    "secret", "token", "auth",
+    "credential", "credentials",
+    "private_key", "privatekey",
+}
+
+
+def redact_params(params: Dict[str, Any], max_length: int = 100) -> Dict[str, Any]:
+    """
+    Redact sensitive values and truncate long strings in tool parameters.
+
+    Args:
+        params: Raw parameters
+        max_length: Strings longer than this are truncated
+
+    Returns:
+        New dict safe to write to an audit log
+    """
+    redacted = {}
+    for key, value in params.items():
+        # Check if this is a sensitive key (case-insensitive)
+        if isinstance(key, str) and key.lower() in SENSITIVE_KEYS:
+            redacted[key] = "[REDACTED]"
+        elif isinstance(value, str) and len(value) > max_length:
+            redacted[key] = f"{value[:max_length]}...[truncated {len(value)} chars]"
+        else:
+            redacted[key] = value
+    return redacted
+
 
 class AuditSeverity:
     """Audit event severity levels."""
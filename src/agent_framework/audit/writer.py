@@ -0,0 +1,495 @@
+"""
+Batched, indexed writer for JSONL audit logs.
+
+Audit calls happen on hot paths (every tool call, from the event loop),
+so AuditWriter.append() only enqueues the record. A background thread
+drains the queue in batches, writes each file's records with a single
+write() through file handles it keeps open, and rotates files that grow
+past ``max_bytes``.
+
+Each segment has a sidecar index (``<segment>.idx``) of fixed-size
+records: byte offset, length, timestamp and a CRC of the event type.
+query() filters on the index and reads only the matching lines, so
+filtering by event type or time range never parses a whole log.
+
+Layout for ``audit.jsonl``:
+    audit.jsonl              active segment (plain JSONL)
+    audit.jsonl.idx          its index
+    audit.000001.jsonl[.gz]  rotated segments, oldest first, optionally gzipped
+    audit.000001.jsonl.idx   their indexes (offsets into the uncompressed data)
+
+Usage:
+    writer = get_audit_writer()
+    writer.append(path, json_line, event_type="tool_call", timestamp=time.time())
+
+    writer.flush()  # wait until everything queued so far is on disk
+    lines = writer.query(path, event_type="tool_call", since=start)
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+GZIP_SUFFIX = ".gz"
+
+# offset, length, timestamp (epoch seconds), crc32 of the event type
+INDEX_RECORD = struct.Struct("<QIdI")
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+
+def type_code(event_type: str) -> int:
+    """Index code for an event type."""
+    return zlib.crc32(event_type.encode("utf-8"))
+
+
+def parse_timestamp(value: str) -> float:
+    """Epoch seconds for an ISO-8601 timestamp (0.0 if unparseable)."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Record:
+    __slots__ = ("path", "data", "code", "timestamp")
+
+    def __init__(self, path: Path, data: bytes, code: int, timestamp: float):
+        self.path = path
+        self.data = data
+        self.code = code
+        self.timestamp = timestamp
+
+
+class _OpenSegment:
+    """Append handles for the active segment of one log and its index."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.data = open(path, "ab")
+        self.size = self.data.tell()
+        index_path = _index_path(path)
+        if _index_covers(index_path, self.size):
+            self.index = open(index_path, "ab")
+        else:
+            # Written by an older version, or the process died mid-batch
+            _rebuild_index(path, index_path)
+            self.index = open(index_path, "ab")
+
+    def write(self, records: List[_Record], fsync: bool) -> None:
+        offset = self.size
+        entries = []
+        for record in records:
+            entries.append(INDEX_RECORD.pack(offset, len(record.data), record.timestamp, record.code))
+            offset += len(record.data)
+        # Data first: an index entry never points past the data on disk
+        self.data.write(b"".join(r.data for r in records))
+        self.data.flush()
+        self.index.write(b"".join(entries))
+        self.index.flush()
+        if fsync:
+            os.fsync(self.data.fileno())
+            os.fsync(self.index.fileno())
+        self.size = offset
+
+    def close(self) -> None:
+        self.data.close()
+        self.index.close()
+
+
+def _index_path(segment: Path) -> Path:
+    name = segment.name[:-len(GZIP_SUFFIX)] if segment.name.endswith(GZIP_SUFFIX) else segment.name
+    return segment.with_name(name + INDEX_SUFFIX)
+
+
+def _index_covers(index_path: Path, data_size: int) -> bool:
+    """Whether an index ends exactly at the end of its data file."""
+    try:
+        index_size = index_path.stat().st_size
+    except OSError:
+        return data_size == 0
+    if index_size % INDEX_RECORD.size:
+        return False
+    if index_size == 0:
+        return data_size == 0
+    with open(index_path, "rb") as f:
+        f.seek(index_size - INDEX_RECORD.size)
+        offset, length, _, _ = INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+    return offset + length == data_size
+
+
+def _rebuild_index(segment: Path, index_path: Path) -> None:
+    """Recreate a segment's index by scanning it once."""
+    entries = []
+    offset = 0
+    with open(segment, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Torn write at the end; leave it out of the index
+                break
+            try:
+                data = json.loads(line)
+                code = type_code(str(data.get("event_type", "")))
+                timestamp = parse_timestamp(data.get("timestamp"))
+            except (ValueError, AttributeError):
+                code, timestamp = 0, 0.0
+            entries.append(INDEX_RECORD.pack(offset, len(line), timestamp, code))
+            offset += len(line)
+    with open(index_path, "wb") as f:
+        f.write(b"".join(entries))
+    logger.info(f"Rebuilt audit index {index_path} ({len(entries)} entries)")
+
+
+def _read_index(index_path: Path) -> List[Tuple[int, int, float, int]]:
+    try:
+        raw = index_path.read_bytes()
+    except OSError:
+        return []
+    usable = len(raw) - len(raw) % INDEX_RECORD.size
+    return list(INDEX_RECORD.iter_unpack(raw[:usable]))
+
+
+def segments(path: Path) -> List[Path]:
+    """All segments of a log, oldest first (rotated, then the active one)."""
+    prefix = path.name[:-len(path.suffix)] + "."
+    rotated = []
+    if path.parent.is_dir():
+        for candidate in path.parent.iterdir():
+            name = candidate.name
+            if not name.startswith(prefix) or name.endswith(INDEX_SUFFIX):
+                continue
+            number = name[len(prefix):].split(".", 1)[0]
+            if number.isdigit():
+                rotated.append((int(number), candidate))
+    result = [p for _, p in sorted(rotated)]
+    if path.exists():
+        result.append(path)
+    return result
+
+
+class AuditWriter:
+    """
+    Background writer for append-only JSONL audit logs.
+
+    Thread-safe. append() never blocks on disk I/O; it only waits if
+    ``max_pending`` records are already queued.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress_rotated: bool = False,
+        max_open_files: int = 64,
+        max_pending: int = 100_000,
+        linger: float = 0.01,
+        fsync: bool = False,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            max_bytes: Rotate a log once its active segment would exceed this size
+            compress_rotated: Gzip segments when they are rotated out
+            max_open_files: Open segments to keep; the least recently used are closed
+            max_pending: Queued records at which append() starts to wait
+            linger: Seconds the writer waits for more records before writing a batch
+            fsync: fsync every batch (slower; survives power loss)
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self.max_bytes = max_bytes
+        self.compress_rotated = compress_rotated
+        self.max_open_files = max_open_files
+        self.max_pending = max_pending
+        self.linger = linger
+        self.fsync = fsync
+
+        self._pending: List[_Record] = []
+        self._enqueued = 0
+        self._written = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Guards the files themselves: batch writes, rotation and queries
+        self._io_lock = threading.Lock()
+        self._open: "OrderedDict[Path, _OpenSegment]" = OrderedDict()
+
+        self.batches = 0
+        self.rotations = 0
+        self.errors = 0
+
+        _writers.add(self)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Records queued but not yet written."""
+        with self._cond:
+            return self._enqueued - self._written
+
+    def append(self, path: Path, line: str, event_type: str = "", timestamp: Optional[float] = None) -> None:
+        """
+        Queue one JSON line for a log file.
+
+        Args:
+            path: Log file (its active segment)
+            line: Serialized record, without trailing newline
+            event_type: Event type recorded in the index
+            timestamp: Event time in epoch seconds (defaults to now)
+        """
+        record = _Record(
+            Path(path),
+            (line + "\n").encode("utf-8"),
+            type_code(event_type),
+            time.time() if timestamp is None else timestamp,
+        )
+        with self._cond:
+            if self._closing:
+                # Late events (e.g. from shutdown handlers) are written directly
+                self._write_batch([record])
+                return
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            self._pending.append(record)
+            self._enqueued += 1
+            self._cond.notify_all()
+            if not self.is_running:
+                self._start()
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until every record queued so far has been written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._cond:
+            target = self._enqueued
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write what is queued, stop the thread and close all files."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._io_lock:
+            for segment in self._open.values():
+                segment.close()
+            self._open.clear()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closing)
+                if not self._pending and self._closing:
+                    return
+                if self.linger and not self._closing:
+                    # Let concurrent callers add to this batch
+                    self._cond.wait_for(
+                        lambda: len(self._pending) >= self.max_pending or self._closing,
+                        self.linger,
+                    )
+                batch, self._pending = self._pending, []
+                self._cond.notify_all()
+
+            self._write_batch(batch)
+
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[_Record]) -> None:
+        by_path: Dict[Path, List[_Record]] = {}
+        for record in batch:
+            by_path.setdefault(record.path, []).append(record)
+
+        with self._io_lock:
+            for path, records in by_path.items():
+                try:
+                    segment = self._segment(path)
+                    incoming = sum(len(r.data) for r in records)
+                    if segment.size and segment.size + incoming > self.max_bytes:
+                        self._rotate(path)
+                        segment = self._segment(path)
+                    segment.write(records, self.fsync)
+                except Exception as e:
+                    # Never fail silently on audit writes - log to Python logger
+                    self.errors += 1
+                    logger.error(f"Failed to write {len(records)} audit event(s) to {path}: {e}")
+                    self._close_segment(path)
+            self.batches += 1
+
+    def _segment(self, path: Path) -> _OpenSegment:
+        segment = self._open.get(path)
+        if segment is not None:
+            self._open.move_to_end(path)
+            return segment
+        segment = _OpenSegment(path)
+        self._open[path] = segment
+        while len(self._open) > self.max_open_files:
+            _, oldest = self._open.popitem(last=False)
+            oldest.close()
+        return segment
+
+    def _close_segment(self, path: Path) -> None:
+        segment = self._open.pop(path, None)
+        if segment is not None:
+            try:
+                segment.close()
+            except OSError:
+                pass
+
+    def _rotate(self, path: Path) -> None:
+        """Move the active segment aside under the next sequence number."""
+        self._close_segment(path)
+        existing = segments(path)[:-1]
+        number = 1
+        if existing:
+            number = int(existing[-1].name[len(path.stem) + 1:].split(".", 1)[0]) + 1
+        rotated = path.with_name(f"{path.stem}.{number:06d}{path.suffix}")
+
+        os.replace(_index_path(path), _index_path(rotated))
+        os.replace(path, rotated)
+        if self.compress_rotated:
+            compressed = rotated.with_name(rotated.name + GZIP_SUFFIX)
+            with open(rotated, "rb") as src, gzip.open(compressed, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            rotated.unlink()
+        self.rotations += 1
+        logger.info(f"Rotated audit log {path} to segment {number}")
+
+    def query(
+        self,
+        path: Path,
+        event_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Read lines of a log in write order, using the indexes to skip
+        records that do not match.
+
+        Queued records are flushed first, so a query sees every append
+        made before it. Matching is by index code, so callers that need
+        exact event types should re-check parsed records.
+
+        Args:
+            path: Log file (its active segment)
+            event_type: Only records of this type
+            since: Only records at or after this epoch time
+            until: Only records before this epoch time
+            limit: Maximum lines to yield
+        """
+        self.flush()
+        code = type_code(event_type) if event_type is not None else None
+        remaining = limit
+        path = Path(path)
+        lines: List[str] = []
+
+        with self._io_lock:
+            for segment in segments(path):
+                if remaining is not None and remaining <= 0:
+                    break
+                matches = [
+                    (offset, length)
+                    for offset, length, timestamp, record_code in _read_index(_index_path(segment))
+                    if (code is None or record_code == code)
+                    and (since is None or timestamp >= since)
+                    and (until is None or timestamp < until)
+                ]
+                if remaining is not None:
+                    matches = matches[:remaining]
+                if not matches:
+                    continue
+                lines.extend(_read_lines(segment, matches))
+                if remaining is not None:
+                    remaining -= len(matches)
+        return lines
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            "pending": self.pending,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "errors": self.errors,
+            "open_files": len(self._open),
+        }
+
+
+def _read_lines(segment: Path, matches: List[Tuple[int, int]]) -> List[str]:
+    if segment.name.endswith(GZIP_SUFFIX):
+        with gzip.open(segment, "rb") as f:
+            data = f.read()
+        return [data[o:o + n].decode("utf-8").rstrip("\n") for o, n in matches]
+
+    lines = []
+    with open(segment, "rb") as f:
+        for offset, length in matches:
+            f.seek(offset)
+            lines.append(f.read(length).decode("utf-8").rstrip("\n"))
+    return lines
+
+
+_writers: "weakref.WeakSet[AuditWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers() -> None:
+    for writer in list(_writers):
+        try:
+            writer.close(timeout=5.0)
+        except Exception:
+            pass
+
+
+_audit_writer: Optional[AuditWriter] = None
+_audit_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """
+    Get the process-wide AuditWriter.
+
+    Configured from ARCHIFLOW_AUDIT_MAX_SEGMENT_MB (default 10) and
+    ARCHIFLOW_AUDIT_COMPRESS ("true" to gzip rotated segments).
+    """
+    global _audit_writer
+    with _audit_writer_lock:
+        if _audit_writer is None:
+            max_mb = float(os.environ.get("ARCHIFLOW_AUDIT_MAX_SEGMENT_MB", "10"))
+            compress = os.environ.get("ARCHIFLOW_AUDIT_COMPRESS", "false").lower() == "true"
+            _audit_writer = AuditWriter(
+                max_bytes=int(max_mb * 1024 * 1024), compress_rotated=compress
+            )
+        return _audit_writer
@@ -0,0 +1,212 @@
+"""
+Cancellation tokens for interrupting an agent turn.
+
+An interrupt from the web or CLI cancels the session's current token.
+Everything running for that turn watches the token:
+
+- AgentController makes the token current (cancellation_scope) while it
+  pre-processes and steps the agent, so LLM providers pick it up with
+  current_token() and close the HTTP response mid-stream.
+- RuntimeExecutor puts the token in the tool's ExecutionContext; the
+  local runtime abandons the call and BashTool kills the command's
+  process group.
+
+Tokens belong to turns, not sessions: a cancelled token stays cancelled
+(late tool results of the interrupted turn are recorded, not acted on)
+until the next user message begins a new turn with a fresh token.
+
+Usage:
+    registry = get_cancellation_registry()
+    token = registry.begin(session_id)      # new user message
+
+    with cancellation_scope(token):
+        response = agent.step(message)      # providers see the token
+
+    registry.cancel(session_id, "interrupted by user")   # from another thread
+"""
+
+import contextlib
+import contextvars
+import logging
+import os
+import signal
+import subprocess
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OperationCancelledError(Exception):
+    """Raised when work is abandoned because its cancellation token was cancelled."""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    """
+    Thread-safe one-shot cancellation flag with callbacks.
+
+    Callbacks run once, on the thread that calls cancel() (or immediately
+    on registration if the token is already cancelled). They should only
+    trigger the abort - close a stream, kill a process - and return.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """
+        Cancel the token and run its callbacks.
+
+        Returns:
+            True if this call cancelled it, False if it already was
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {e}")
+        return True
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback for cancellation.
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelledError if the token was cancelled."""
+        if self._event.is_set():
+            raise OperationCancelledError(self.reason or "cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled (or timeout). Returns whether it was cancelled."""
+        return self._event.wait(timeout)
+
+
+_current_token: contextvars.ContextVar[Optional[CancellationToken]] = contextvars.ContextVar(
+    "archiflow_cancellation_token", default=None
+)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """The token of the turn running in this context, if any."""
+    return _current_token.get()
+
+
+@contextlib.contextmanager
+def cancellation_scope(token: Optional[CancellationToken]) -> Iterator[Optional[CancellationToken]]:
+    """Make ``token`` current for the enclosed code (and contexts copied from it)."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def raise_if_cancelled() -> None:
+    """Raise OperationCancelledError if the current token was cancelled."""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+class CancellationRegistry:
+    """Current-turn cancellation token of each session."""
+
+    def __init__(self):
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._lock = threading.Lock()
+
+    def token(self, session_id: str) -> CancellationToken:
+        """The session's current token (created if the session has none)."""
+        with self._lock:
+            token = self._tokens.get(session_id)
+            if token is None:
+                token = self._tokens[session_id] = CancellationToken()
+            return token
+
+    def begin(self, session_id: str) -> CancellationToken:
+        """Start a new turn: replace the session's token if it was cancelled."""
+        with self._lock:
+            token = self._tokens.get(session_id)
+            if token is None or token.cancelled:
+                token = self._tokens[session_id] = CancellationToken()
+            return token
+
+    def cancel(self, session_id: str, reason: str = "cancelled") -> bool:
+        """
+        Cancel the session's current turn.
+
+        Returns:
+            True if the turn was not already cancelled
+        """
+        return self.token(session_id).cancel(reason)
+
+    def discard(self, session_id: str) -> None:
+        """Forget a closed session."""
+        with self._lock:
+            self._tokens.pop(session_id, None)
+
+
+_registry: Optional[CancellationRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_cancellation_registry() -> CancellationRegistry:
+    """Get the process-wide CancellationRegistry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CancellationRegistry()
+        return _registry
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """
+    Kill a process and everything it spawned.
+
+    The process must have been started with ``start_new_session=True`` on
+    POSIX so that it leads its own process group; elsewhere only the
+    process itself is killed.
+    """
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
@@ -43,6 +43,13 @@ from .hierarchy import (
     ConfigSnapshot,
     ConfigHierarchy,
     create_global_config,
+    clear_snapshot_memo,
+)
+
+# Change notifications
+from .watcher import (
+    ConfigWatcher,
+    get_config_watcher,
 )
 
 __all__ = [
@@ -79,4 +86,8 @@ __all__ = [
     "ConfigSnapshot",
     "ConfigHierarchy",
     "create_global_config",
+    "clear_snapshot_memo",
+    # Change notifications
+    "ConfigWatcher",
+    "get_config_watcher",
 ]
@@ -11,19 +11,31 @@ Hierarchy Levels (highest to lowest precedence):
 4. Project settings (.archiflow/settings.json)
 5. Global user settings (~/.archiflow/settings.json)
 6. Framework defaults (embedded in code)
+
+Caching:
+Merged snapshots are memoized per source set: a hash of the working
+directory and the (mtime, size) of every candidate settings and context
+file. Hierarchies for the same project share results, and a file that is
+changed and then restored does not trigger a re-parse. With ``watch=True``
+the hierarchy subscribes to the process-wide ConfigWatcher and load()
+returns the cached snapshot without touching the filesystem; the watcher
+swaps in a new snapshot when a file changes.
 """
+import hashlib
 import json
 import logging
 import os
+import threading
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .paths import (
     get_global_archiflow_dir,
     get_project_archiflow_dir,
     get_framework_config_dir,
-    resolve_config_paths,
     resolve_context_paths,
 )
 from .loader import (
@@ -37,15 +49,46 @@ from .merger import (
     merge_settings_configs,
     merge_context_files,
 )
+from .watcher import get_config_watcher, stat_file
 
 logger = logging.getLogger(__name__)
 
+# Merged snapshots shared by all hierarchies, keyed by source-set hash
+SNAPSHOT_MEMO_SIZE = 64
+_snapshot_memo: "OrderedDict[str, ConfigSnapshot]" = OrderedDict()
+_snapshot_memo_lock = threading.Lock()
+
+
+def _memo_get(source_hash: str) -> Optional["ConfigSnapshot"]:
+    with _snapshot_memo_lock:
+        snapshot = _snapshot_memo.get(source_hash)
+        if snapshot is not None:
+            _snapshot_memo.move_to_end(source_hash)
+        return snapshot
+
 
-@dataclass
+def _memo_put(source_hash: str, snapshot: "ConfigSnapshot") -> None:
+    with _snapshot_memo_lock:
+        _snapshot_memo[source_hash] = snapshot
+        _snapshot_memo.move_to_end(source_hash)
+        while len(_snapshot_memo) > SNAPSHOT_MEMO_SIZE:
+            _snapshot_memo.popitem(last=False)
+
+
+def clear_snapshot_memo() -> None:
+    """Drop all memoized snapshots (e.g. after editing files within one mtime tick)."""
+    with _snapshot_memo_lock:
+        _snapshot_memo.clear()
+
+
+@dataclass(frozen=True)
 class ConfigSnapshot:
     """
     A snapshot of loaded configuration at a specific point in time.
 
+    Snapshots are immutable and shared between hierarchies with the same
+    sources, so treat ``settings`` and ``metadata`` as read-only.
+
     Attributes:
         settings: The merged settings dictionary
         context: The concatenated context content
@@ -94,7 +137,8 @@ class ConfigHierarchy:
         working_dir: Optional[Path] = None,
         config_type: str = "settings",
         context_file: str = "ARCHIFLOW.md",
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        watch: bool = False,
     ):
         """
         Initialize the ConfigHierarchy.
@@ -104,18 +148,24 @@ class ConfigHierarchy:
             config_type: Type of config file (e.g., "settings")
             context_file: Name of the context file
             enable_cache: Whether to enable caching
+            watch: Invalidate the cache from file change notifications
+                   instead of checking files on every load
         """
         self.working_dir = working_dir or Path(os.getcwd())
         self.config_type = config_type
         self.context_file = context_file
         self.enable_cache = enable_cache
 
-        # Cache for loaded configurations
+        # Cache for loaded configurations, keyed by source-set hash
         self._cache: Optional[ConfigSnapshot] = None
         self._cache_key: Optional[str] = None
+        self._lock = threading.RLock()
 
-        # Track last modification times for cache invalidation
-        self._mtimes: Dict[Path, float] = {}
+        # Change notifications
+        self._listeners: List[Callable[[ConfigSnapshot], None]] = []
+        self._unwatch: Optional[weakref.finalize] = None
+        if watch and enable_cache:
+            self.start_watching()
 
         logger.debug(
             f"ConfigHierarchy initialized: working_dir={self.working_dir}, "
@@ -137,81 +187,127 @@ class ConfigHierarchy:
         """Get the framework configuration directory."""
         return get_framework_config_dir()
 
-    def _get_cache_key(self) -> str:
+    def _source_names(self) -> List[str]:
+        """File names read from each .archiflow directory."""
+        return [
+            f"{self.config_type}.json",
+            f"{self.config_type}.local.json",
+            self.context_file,
+            self.context_file.replace(".md", ".local.md"),
+        ]
+
+    def _candidate_paths(self) -> List[Path]:
+        """Every file that could contribute to a snapshot, existing or not."""
+        paths = [
+            self.framework_dir / f"{self.config_type}.json",
+            self.framework_dir / self.context_file,
+        ]
+        for directory in (self.global_dir, self.working_dir / ".archiflow"):
+            paths.extend(directory / name for name in self._source_names())
+        return paths
+
+    def _watch_targets(self) -> Dict[Path, List[str]]:
         """
-        Generate a cache key based on current state.
+        Directories that can hold configuration, with the file names of interest.
 
-        Returns:
-            A string key for caching
+        Parents are included with the name of their .archiflow directory so
+        a directory created later is noticed.
         """
-        # Include working dir and config type in key
-        parts = [str(self.working_dir), self.config_type, self.context_file]
+        global_dir = self.global_dir
+        return {
+            self.framework_dir: [f"{self.config_type}.json", self.context_file],
+            global_dir.parent: [global_dir.name],
+            global_dir: self._source_names(),
+            self.working_dir: [".archiflow"],
+            self.working_dir / ".archiflow": self._source_names(),
+        }
 
-        # Include project dir existence
-        if self.project_dir:
-            parts.append("with_project")
+    def _source_hash(self) -> str:
+        """
+        Hash the current source set: every candidate file's (mtime, size).
 
-        return ":".join(parts)
+        Equal hashes mean loading would read exactly the same files.
+        """
+        parts = [
+            str(self.working_dir),
+            self.config_type,
+            self.context_file,
+            str(self.project_dir is not None),
+        ]
+        parts.extend(f"{path}={stat_file(path)}" for path in self._candidate_paths())
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def is_watching(self) -> bool:
+        """Whether the cache is invalidated by file change notifications."""
+        return self._unwatch is not None and self._unwatch.alive
 
-    def _has_files_changed(self) -> bool:
+    def start_watching(self) -> bool:
         """
-        Check if any configuration files have changed since last load.
+        Subscribe to the process-wide ConfigWatcher.
 
         Returns:
-            True if files have changed, False otherwise
+            False if watching is disabled (ARCHIFLOW_CONFIG_WATCHER=off)
         """
-        if not self._mtimes:
+        if self.is_watching:
             return True
+        watcher = get_config_watcher()
+        if watcher is None:
+            return False
 
-        # Get all config paths
-        config_paths = resolve_config_paths(
-            self.config_type,
-            working_dir=self.working_dir,
-            include_local=True
-        )
+        # The watcher must not keep the hierarchy alive
+        ref = weakref.ref(self)
 
-        # Check if any files have changed
-        for path in config_paths:
-            if not path.exists():
-                continue
+        def on_change() -> None:
+            hierarchy = ref()
+            if hierarchy is not None:
+                hierarchy._on_files_changed()
 
-            try:
-                current_mtime = path.stat().st_mtime
-                if path not in self._mtimes:
-                    return True
-                if current_mtime != self._mtimes[path]:
-                    return True
-            except OSError:
-                return True
-
-        # Check if any files that were tracked are now gone
-        for path in self._mtimes:
-            if not path.exists():
-                return True
-
-        return False
-
-    def _update_mtimes(self, paths: List[Path]) -> None:
-        """
-        Update modification time tracking for files.
+        sub_id = watcher.subscribe(self._watch_targets(), on_change)
+        self._unwatch = weakref.finalize(self, watcher.unsubscribe, sub_id)
+        return True
 
-        Args:
-            paths: List of file paths to track
+    def stop_watching(self) -> None:
+        """Unsubscribe from the ConfigWatcher; loads check files again."""
+        if self._unwatch is not None:
+            self._unwatch()
+            self._unwatch = None
+
+    def subscribe(self, callback: Callable[["ConfigSnapshot"], None]) -> None:
         """
-        self._mtimes.clear()
+        Register a callback for new snapshots pushed by the watcher.
 
-        for path in paths:
-            if path.exists():
-                try:
-                    self._mtimes[path] = path.stat().st_mtime
-                except OSError:
-                    pass
+        Callbacks run on the watcher thread.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[["ConfigSnapshot"], None]) -> None:
+        """Remove a callback registered with subscribe()."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _on_files_changed(self) -> None:
+        """Watcher callback: swap in a new snapshot if the sources changed."""
+        previous = self._cache
+        if previous is None:
+            # Nothing loaded yet; the next load() reads the files
+            return
+        snapshot = self._refresh(force_reload=False)
+        if snapshot is previous:
+            return
+
+        logger.info(f"Configuration changed, reloaded from {len(snapshot.sources)} source(s)")
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"Config change listener failed: {e}")
 
     def clear_cache(self) -> None:
         """Clear the configuration cache."""
-        self._cache = None
-        self._cache_key = None
-        self._mtimes.clear()
+        with self._lock:
+            self._cache = None
+            self._cache_key = None
         logger.debug("Config cache cleared")
 
     def load_settings(self, force_reload: bool = False) -> Tuple[Dict[str, Any], List[Path]]:
@@ -323,27 +419,39 @@ class ConfigHierarchy:
         Returns:
             ConfigSnapshot with loaded configuration
         """
-        # Check cache
-        if self.enable_cache and not force_reload:
-            cache_key = self._get_cache_key()
+        if not self.enable_cache:
+            return self._build_snapshot(self._source_hash())
+
+        # Watched: the watcher replaces the cache when a file changes
+        snapshot = self._cache
+        if snapshot is not None and not force_reload and self.is_watching:
+            return snapshot
 
-            if self._cache is not None and self._cache_key == cache_key:
-                if not self._has_files_changed():
-                    logger.debug("Returning cached configuration")
-                    return self._cache
+        return self._refresh(force_reload)
 
-        # Load settings
-        settings, settings_paths = self.load_settings(force_reload)
+    def _refresh(self, force_reload: bool) -> ConfigSnapshot:
+        """Return the cached snapshot if the sources are unchanged, else rebuild it."""
+        with self._lock:
+            source_hash = self._source_hash()
+            if not force_reload and self._cache is not None and self._cache_key == source_hash:
+                logger.debug("Returning cached configuration")
+                return self._cache
 
-        # Load context
-        context, context_paths = self.load_context(force_reload)
+            snapshot = None if force_reload else _memo_get(source_hash)
+            if snapshot is None:
+                snapshot = self._build_snapshot(source_hash)
+                _memo_put(source_hash, snapshot)
+
+            self._cache = snapshot
+            self._cache_key = source_hash
+            return snapshot
 
-        # Update mtimes for cache invalidation
-        all_paths = settings_paths + context_paths
-        self._update_mtimes(all_paths)
+    def _build_snapshot(self, source_hash: str) -> ConfigSnapshot:
+        """Read, merge and concatenate all hierarchy levels."""
+        settings, settings_paths = self.load_settings()
+        context, context_paths = self.load_context()
 
-        # Create snapshot
-        snapshot = ConfigSnapshot(
+        return ConfigSnapshot(
             settings=settings,
             context=context,
             sources=settings_paths + context_paths,
@@ -353,16 +461,10 @@ class ConfigHierarchy:
                 "has_project_dir": self.project_dir is not None,
                 "settings_sources": [str(p) for p in settings_paths],
                 "context_sources": [str(p) for p in context_paths],
+                "source_hash": source_hash,
             }
         )
 
-        # Update cache
-        if self.enable_cache:
-            self._cache = snapshot
-            self._cache_key = self._get_cache_key()
-
-        return snapshot
-
     def get_setting(self, key_path: str, default: Any = None) -> Any:
         """
         Get a specific setting value using dot notation.
@@ -424,6 +526,7 @@ class ConfigHierarchy:
             "project_dir_exists": self.project_dir is not None,
             "cache_enabled": self.enable_cache,
             "cache_valid": self._cache is not None,
+            "watching": self.is_watching,
             "sources_count": len(snapshot.sources),
             "settings_keys": len(snapshot.settings),
             "has_context": snapshot.has_context,
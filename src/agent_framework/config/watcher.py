@@ -0,0 +1,442 @@
+"""
+File watching for the configuration hierarchy.
+
+ConfigWatcher notifies subscribers when configuration files appear, change
+or disappear, so ConfigHierarchy can serve its cached snapshot without
+touching the filesystem on every load. A subscription names directories
+and the file names of interest in each; events for other files in the
+same directories (e.g. the agent editing project sources) are ignored.
+
+Backends:
+- inotify (Linux, via libc): one inotify instance and one thread for the
+  whole process, however many hierarchies subscribe
+- polling: a thread that stats the subscribed files every poll interval;
+  used where inotify is unavailable or when forced
+
+The backend is chosen with ARCHIFLOW_CONFIG_WATCHER ("auto", "inotify",
+"polling" or "off") and the polling interval with
+ARCHIFLOW_CONFIG_POLL_INTERVAL (seconds).
+
+Usage:
+    watcher = get_config_watcher()
+    sub_id = watcher.subscribe({Path.home() / ".archiflow": ["settings.json"]}, on_change)
+    ...
+    watcher.unsubscribe(sub_id)
+"""
+
+import ctypes
+import ctypes.util
+import itertools
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+# Events that concern the watched directory itself rather than an entry
+DIRECTORY_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# A file's (mtime_ns, size), or None if it does not exist
+FileStat = Optional[Tuple[int, int]]
+
+
+def _load_libc_inotify():
+    """Return libc if it provides inotify, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def stat_file(path: Path) -> FileStat:
+    """Return ``(mtime_ns, size)`` for a path, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _Subscription:
+    __slots__ = ("targets", "callback", "signature")
+
+    def __init__(self, targets: Dict[str, frozenset], callback: Callable[[], None]):
+        self.targets = targets
+        self.callback = callback
+        self.signature = self.current_signature()
+
+    def current_signature(self) -> Tuple[FileStat, ...]:
+        return tuple(
+            stat_file(Path(directory) / name)
+            for directory, names in sorted(self.targets.items())
+            for name in sorted(names)
+        )
+
+
+class ConfigWatcher:
+    """
+    Background watcher that calls subscribers back when their files change.
+
+    Callbacks run on the watcher thread after ``debounce`` seconds without
+    further events, so an editor's write-rename-chmod sequence produces one
+    notification. Subscribers should re-check what they care about rather
+    than assume a particular change happened.
+
+    Thread-safe. Use get_config_watcher() rather than constructing watchers
+    directly, so the process shares one thread and one inotify instance.
+    """
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        debounce: float = 0.05,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            backend: "inotify", "polling", or "auto" (inotify when available)
+            poll_interval: Seconds between scans in polling mode
+            debounce: Seconds to wait for further events before notifying
+
+        Raises:
+            ValueError: If the backend is unknown or inotify is unavailable
+        """
+        if backend not in ("auto", "inotify", "polling"):
+            raise ValueError(f"Unknown watcher backend: {backend!r}")
+        if poll_interval <= 0:
+            raise ValueError(f"poll_interval must be positive, got {poll_interval}")
+
+        self._libc = _load_libc_inotify() if backend != "polling" else None
+        if backend == "inotify" and self._libc is None:
+            raise ValueError("inotify is not available on this platform")
+
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._wakeup = threading.Event()
+
+        # inotify state
+        self._fd = -1
+        self._wake_r = self._wake_w = -1
+        self._dir_to_wd: Dict[str, int] = {}
+        self._wd_to_dirs: Dict[int, Set[str]] = {}
+
+    @property
+    def backend(self) -> str:
+        """The backend in use: "inotify" or "polling"."""
+        return "inotify" if self._libc is not None else "polling"
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread (idempotent)."""
+        with self._lock:
+            if self.is_running:
+                return
+            self._stopping = False
+            if self._libc is not None:
+                self._open_inotify()
+            self._thread = threading.Thread(
+                target=self._run_inotify if self._libc is not None else self._run_polling,
+                name=f"config-watcher-{self.backend}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread and release the inotify instance."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._wake_w >= 0:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            self._close_inotify()
+
+    def subscribe(
+        self,
+        targets: Dict[Path, Iterable[str]],
+        callback: Callable[[], None],
+    ) -> int:
+        """
+        Watch files and call ``callback`` when any of them changes.
+
+        Directories that do not exist yet are picked up once they are
+        created, provided their parent is also a target (with the
+        directory's name among the parent's names).
+
+        Args:
+            targets: Mapping of directory to the file names to watch in it
+            callback: Called with no arguments from the watcher thread
+
+        Returns:
+            Subscription id for unsubscribe()
+        """
+        normalized = {str(directory): frozenset(names) for directory, names in targets.items()}
+        with self._lock:
+            sub_id = next(self._ids)
+            self._subscriptions[sub_id] = _Subscription(normalized, callback)
+            self.start()
+            self._sync_watches()
+        return sub_id
+
+    def unsubscribe(self, sub_id: int) -> None:
+        """Stop watching a subscription's files (unknown ids are ignored)."""
+        with self._lock:
+            if self._subscriptions.pop(sub_id, None) is not None:
+                self._sync_watches()
+
+    @property
+    def subscription_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _notify(self, sub_ids: Iterable[int]) -> None:
+        with self._lock:
+            callbacks = [
+                self._subscriptions[sub_id].callback
+                for sub_id in sub_ids if sub_id in self._subscriptions
+            ]
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Config watcher callback failed: {e}")
+
+    # Polling backend
+
+    def _run_polling(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(timeout=self.poll_interval)
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            self._notify(self.poll_once())
+
+    def poll_once(self) -> List[int]:
+        """
+        Re-stat every subscription's files.
+
+        Returns:
+            Ids of subscriptions whose files changed since the last check
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.items())
+        changed = []
+        for sub_id, subscription in subscriptions:
+            signature = subscription.current_signature()
+            if signature != subscription.signature:
+                subscription.signature = signature
+                changed.append(sub_id)
+        return changed
+
+    # inotify backend
+
+    def _open_inotify(self) -> None:
+        if self._fd >= 0:
+            return
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            logger.warning(f"inotify_init1 failed ({os.strerror(err)}), falling back to polling")
+            self._libc = None
+            return
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._dir_to_wd.clear()
+        self._wd_to_dirs.clear()
+
+    def _close_inotify(self) -> None:
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._fd = self._wake_r = self._wake_w = -1
+        self._dir_to_wd.clear()
+        self._wd_to_dirs.clear()
+
+    def _sync_watches(self) -> None:
+        """Add watches for target directories that exist, drop unused ones."""
+        if self._libc is None or self._fd < 0:
+            return
+        wanted = set()
+        for subscription in self._subscriptions.values():
+            wanted.update(subscription.targets)
+
+        for directory in list(self._dir_to_wd):
+            if directory not in wanted:
+                self._remove_watch(directory)
+
+        for directory in wanted - self._dir_to_wd.keys():
+            if not os.path.isdir(directory):
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                logger.debug(f"Cannot watch {directory}: {os.strerror(err)}")
+                continue
+            self._dir_to_wd[directory] = wd
+            self._wd_to_dirs.setdefault(wd, set()).add(directory)
+
+    def _remove_watch(self, directory: str) -> None:
+        wd = self._dir_to_wd.pop(directory)
+        dirs = self._wd_to_dirs.get(wd, set())
+        dirs.discard(directory)
+        if not dirs:
+            self._wd_to_dirs.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _read_events(self) -> Set[int]:
+        """
+        Drain pending inotify events.
+
+        Returns:
+            Ids of subscriptions affected by the events
+        """
+        affected: Set[int] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return affected
+            except OSError:
+                return affected
+            if not data:
+                return affected
+
+            offset = 0
+            with self._lock:
+                while offset + EVENT_HEADER.size <= len(data):
+                    wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                    offset += EVENT_HEADER.size
+                    name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                    offset += length
+                    affected.update(self._affected_by(wd, mask, name))
+
+    def _affected_by(self, wd: int, mask: int, name: str) -> Iterable[int]:
+        if mask & IN_Q_OVERFLOW:
+            return list(self._subscriptions)
+
+        directories = self._wd_to_dirs.get(wd, set())
+        if mask & IN_IGNORED:
+            # The directory was deleted or unmounted; the kernel dropped the watch
+            self._wd_to_dirs.pop(wd, None)
+            for directory in directories:
+                self._dir_to_wd.pop(directory, None)
+
+        return [
+            sub_id for sub_id, subscription in self._subscriptions.items()
+            if any(
+                directory in subscription.targets
+                and (mask & DIRECTORY_EVENTS or name in subscription.targets[directory])
+                for directory in directories
+            )
+        ]
+
+    def _wait_readable(self, timeout: Optional[float]) -> bool:
+        """Wait for inotify events; False if woken up to stop."""
+        readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable or self._stopping:
+            return False
+        return bool(readable)
+
+    def _run_inotify(self) -> None:
+        while not self._stopping:
+            try:
+                if not self._wait_readable(None):
+                    continue
+                affected = self._read_events()
+                if not affected:
+                    continue
+
+                # Coalesce bursts of events into one notification
+                while self._wait_readable(self.debounce):
+                    affected.update(self._read_events())
+                if self._stopping:
+                    break
+
+                with self._lock:
+                    # Start watching directories created since the last sync
+                    self._sync_watches()
+                self._notify(affected)
+            except (OSError, ValueError) as e:
+                if self._stopping:
+                    break
+                logger.warning(f"Config watcher error: {e}")
+                time.sleep(self.poll_interval)
+
+
+_watcher: Optional[ConfigWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_config_watcher() -> Optional[ConfigWatcher]:
+    """
+    Get the process-wide ConfigWatcher.
+
+    Returns:
+        The shared watcher, or None if watching is disabled with
+        ARCHIFLOW_CONFIG_WATCHER=off
+    """
+    global _watcher
+    backend = os.environ.get("ARCHIFLOW_CONFIG_WATCHER", "auto").strip().lower()
+    if backend in ("off", "0", "false", "none"):
+        return None
+
+    with _watcher_lock:
+        if _watcher is None:
+            poll_interval = float(os.environ.get("ARCHIFLOW_CONFIG_POLL_INTERVAL", "1.0"))
+            try:
+                _watcher = ConfigWatcher(backend=backend, poll_interval=poll_interval)
+            except ValueError as e:
+                logger.warning(f"{e}; using the polling config watcher")
+                _watcher = ConfigWatcher(backend="polling", poll_interval=poll_interval)
+        return _watcher
@@ -0,0 +1,821 @@
+"""
+Chunked diff review.
+
+CodeReviewAgent used to hand the model one diff file and let it read the
+whole thing into context. On big PRs that overflows the context window,
+and the files are reviewed one turn at a time. This module adds a
+pipeline that runs before the agent's main loop:
+
+- parse_diff() splits a unified diff (``git diff`` output) into per-file
+  FileDiff objects. Each one has its hunks, +/- stats and the blob hashes
+  from the ``index`` line.
+- rank_files() orders files by risk: security-sensitive paths, data and
+  build files, dangerous calls in added lines, and churn. Tests, docs and
+  lockfiles rank last.
+- build_chunks() packs the ranked files into chunks of at most
+  ``chunk_tokens`` (ARCHIFLOW_REVIEW_CHUNK_TOKENS, default 12000).
+  Files larger than that are split at hunk boundaries.
+- DiffReviewer reviews the chunks as independent LLM calls.
+  - At most ``max_concurrent`` calls run at once
+    (ARCHIFLOW_REVIEW_MAX_CONCURRENT, default 4).
+  - The calls count against the execution engine's LLM limit
+    (ARCHIFLOW_MAX_CONCURRENT_LLM_CALLS). One runs on the slot of the
+    agent step doing the review; the others start only while the engine
+    has a free slot.
+  - All calls share a token budget (ARCHIFLOW_REVIEW_TOKEN_BUDGET,
+    default 200000). Chunks are started in risk order, so when the
+    budget runs out it is the low-risk files that are skipped.
+- ReviewCache keeps each file's comments, keyed by its blob hashes. On a
+  re-review, files whose change is the same as last time are not sent to
+  the model again.
+
+The per-chunk comments use the same shape as the ``comments`` of the
+review JSON. The agent merges them into results/latest.json, which is
+what the Reviewdog and SARIF exporters read.
+
+Usage:
+    files = rank_files(parse_diff(diff_text))
+    reviewer = DiffReviewer(llm, cache=ReviewCache(review_dir / "cache.json"))
+    result = reviewer.review(files, pr_description=description)
+    result.comments  # [{"file", "line", "severity", "category", "issue", ...}]
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .agent_engine import AgentExecutionEngine, get_execution_engine
+from .cancellation import CancellationToken, OperationCancelledError, cancellation_scope, current_token
+from .llm.provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_TOKEN_BUDGET = 200_000
+DEFAULT_CHUNK_TOKENS = 12_000
+
+# Tokens reserved per call for the prompt around the chunk and the reply
+CALL_OVERHEAD_TOKENS = 2_500
+
+# Rough characters-per-token ratio used for estimates
+CHARS_PER_TOKEN = 4
+
+VALID_SEVERITIES = ("CRITICAL", "MAJOR", "MINOR", "NIT")
+VALID_CATEGORIES = ("security", "performance", "code_quality", "correctness", "testing", "architecture")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+_INDEX_LINE = re.compile(r"^index ([0-9a-f]+)\.\.([0-9a-f]+)(?: \d+)?$")
+_DIFF_GIT = re.compile(r"^diff --git a/(.+) b/(.+)$")
+
+
+@dataclass
+class DiffHunk:
+    """One ``@@`` hunk of a file diff."""
+
+    header: str
+    old_start: int
+    new_start: int
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def insertions(self) -> int:
+        return sum(1 for line in self.lines if line.startswith("+"))
+
+    @property
+    def deletions(self) -> int:
+        return sum(1 for line in self.lines if line.startswith("-"))
+
+    def render(self) -> str:
+        """The hunk with new-file line numbers in front of kept and added lines."""
+        out = [self.header]
+        new_line = self.new_start
+        for line in self.lines:
+            if line.startswith(("-", "\\")):
+                out.append(f"{'':>6} {line}")
+            else:
+                out.append(f"{new_line:>6} {line}")
+                new_line += 1
+        return "\n".join(out)
+
+
+@dataclass
+class FileDiff:
+    """The changes to one file."""
+
+    path: str
+    old_path: Optional[str] = None
+    status: str = "modified"
+    """One of added, deleted, modified, renamed."""
+
+    old_blob: Optional[str] = None
+    new_blob: Optional[str] = None
+    binary: bool = False
+    hunks: List[DiffHunk] = field(default_factory=list)
+    header: List[str] = field(default_factory=list)
+    risk: float = 0.0
+    risk_reasons: List[str] = field(default_factory=list)
+
+    @property
+    def insertions(self) -> int:
+        return sum(h.insertions for h in self.hunks)
+
+    @property
+    def deletions(self) -> int:
+        return sum(h.deletions for h in self.hunks)
+
+    @property
+    def added_lines(self) -> List[str]:
+        return [line[1:] for h in self.hunks for line in h.lines if line.startswith("+")]
+
+    @property
+    def cache_key(self) -> str:
+        """Identifies this exact change: the path and the blobs before and after.
+
+        Diffs without an ``index`` line (some hand-made patches) are keyed
+        by a hash of their hunks instead.
+        """
+        if self.old_blob and self.new_blob:
+            return f"{self.path}@{self.old_blob}..{self.new_blob}"
+        body = "\n".join(line for h in self.hunks for line in [h.header, *h.lines])
+        return f"{self.path}@sha1:{hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]}"
+
+    @property
+    def tokens(self) -> int:
+        return sum(estimate_tokens(h.render()) for h in self.hunks) + 20
+
+    def render_heading(self) -> str:
+        moved = f" (from {self.old_path})" if self.old_path and self.old_path != self.path else ""
+        risk = f", risk: {', '.join(self.risk_reasons)}" if self.risk_reasons else ""
+        return f"### {self.path}{moved} [{self.status}, +{self.insertions}/-{self.deletions}{risk}]"
+
+    def summary(self) -> Dict[str, Any]:
+        """Index entry for this file (see CodeReviewAgent's diff_index.json)."""
+        return {
+            "path": self.path,
+            "old_path": self.old_path,
+            "status": self.status,
+            "binary": self.binary,
+            "insertions": self.insertions,
+            "deletions": self.deletions,
+            "hunks": len(self.hunks),
+            "old_blob": self.old_blob,
+            "new_blob": self.new_blob,
+            "risk": round(self.risk, 2),
+            "risk_reasons": self.risk_reasons,
+        }
+
+
+def parse_diff(diff: Union[str, Iterable[str]]) -> List[FileDiff]:
+    """
+    Split a unified diff into per-file changes.
+
+    Accepts the diff text or an iterable of lines, so ``git diff`` output
+    can be parsed as it is read.
+
+    Args:
+        diff: ``git diff`` output (plain unified diffs also work)
+
+    Returns:
+        One FileDiff per file, in diff order
+    """
+    lines = diff.splitlines() if isinstance(diff, str) else (line.rstrip("\n") for line in diff)
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    hunk: Optional[DiffHunk] = None
+    # Lines of the current hunk still to come, per its header
+    old_left = new_left = 0
+
+    for line in lines:
+        if hunk is not None and (old_left > 0 or new_left > 0):
+            if line.startswith("\\"):
+                hunk.lines.append(line)
+                continue
+            if line == "":
+                line = " "  # Some tools strip the trailing space of empty context lines
+            kind = line[:1]
+            if kind in (" ", "-", "+"):
+                hunk.lines.append(line)
+                if kind != "+":
+                    old_left -= 1
+                if kind != "-":
+                    new_left -= 1
+                continue
+        if hunk is not None and line.startswith("\\"):
+            hunk.lines.append(line)
+            continue
+
+        match = _DIFF_GIT.match(line)
+        if match or (line.startswith("--- ") and (current is None or current.hunks)):
+            current = FileDiff(path=match.group(2) if match else "", old_path=match.group(1) if match else None)
+            files.append(current)
+            hunk = None
+            if match:
+                current.header.append(line)
+                continue
+
+        if current is None:
+            continue
+
+        header = _HUNK_HEADER.match(line)
+        if header:
+            hunk = DiffHunk(header=line, old_start=int(header.group(1)), new_start=int(header.group(3)))
+            old_left = int(header.group(2)) if header.group(2) is not None else 1
+            new_left = int(header.group(4)) if header.group(4) is not None else 1
+            current.hunks.append(hunk)
+            continue
+
+        hunk = None
+        current.header.append(line)
+        index = _INDEX_LINE.match(line)
+        if index:
+            current.old_blob, current.new_blob = index.group(1), index.group(2)
+        elif line.startswith("new file mode"):
+            current.status = "added"
+        elif line.startswith("deleted file mode"):
+            current.status = "deleted"
+        elif line.startswith("rename from "):
+            current.old_path = line[len("rename from "):]
+            current.status = "renamed"
+        elif line.startswith("rename to "):
+            current.path = line[len("rename to "):]
+        elif line.startswith("Binary files") or line == "GIT binary patch":
+            current.binary = True
+        elif line.startswith("--- "):
+            old = line[4:].split("\t")[0]
+            if old == "/dev/null":
+                current.status = "added"
+            elif not current.path:
+                current.old_path = old[2:] if old.startswith("a/") else old
+        elif line.startswith("+++ "):
+            new = line[4:].split("\t")[0]
+            if new == "/dev/null":
+                current.status = "deleted"
+                current.path = current.path or current.old_path or ""
+            else:
+                current.path = new[2:] if new.startswith("b/") else new
+
+    for item in files:
+        if not item.path:
+            item.path = item.old_path or ""
+        if item.old_path == item.path and item.status != "renamed":
+            item.old_path = None
+    return [item for item in files if item.path]
+
+
+# ============================================================================
+# Risk ranking
+# ============================================================================
+
+# (path pattern, weight, reason)
+_PATH_RISKS: List[Tuple[re.Pattern, float, str]] = [
+    (re.compile(r"auth|login|passw|secret|token|credential|crypt|permission|oauth|jwt|sanitiz", re.I),
+     3.0, "security-sensitive path"),
+    (re.compile(r"migration|schema|\.sql$|(^|/)models?(/|\.py$)|(^|/)db/|database", re.I),
+     2.0, "data layer"),
+    (re.compile(r"(^|/)(dockerfile|\.github/workflows/|setup\.py$|pyproject\.toml$|requirements[^/]*\.txt$|package\.json$)",
+                re.I),
+     1.5, "build or deploy"),
+    (re.compile(r"config|settings|(^|/)\.env", re.I), 1.0, "configuration"),
+]
+
+# Patterns in added lines that deserve a closer look
+_CODE_RISKS = re.compile(
+    r"\beval\(|\bexec\(|shell\s*=\s*True|os\.system\(|subprocess\.|pickle\.loads?\(|yaml\.load\(|"
+    r"\bexecute\(\s*f?[\"'].*(%|\{|\+)|innerHTML|dangerouslySetInnerHTML|verify\s*=\s*False|"
+    r"\bmd5\(|\bsha1\(|chmod\(.*7[0-7]{2}|\bSELECT\b.*\+|random\.random\(",
+    re.I,
+)
+
+_TEST_PATH = re.compile(r"(^|/)(tests?|__tests__|spec)/|(^|/)test_[^/]*$|_test\.\w+$|\.(spec|test)\.\w+$", re.I)
+_DOC_PATH = re.compile(r"\.(md|rst|txt|adoc)$|(^|/)docs?/", re.I)
+_GENERATED_PATH = re.compile(
+    r"(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Pipfile\.lock|uv\.lock|Cargo\.lock|go\.sum)$"
+    r"|\.min\.(js|css)$|(^|/)(dist|build|vendor)/|_pb2\.py$",
+    re.I,
+)
+
+
+def score_file(diff: FileDiff) -> float:
+    """Compute and store the risk score of one file's change."""
+    reasons: List[str] = []
+    score = 0.0
+
+    if diff.binary:
+        diff.risk, diff.risk_reasons = 0.0, ["binary"]
+        return 0.0
+
+    for pattern, weight, reason in _PATH_RISKS:
+        if pattern.search(diff.path):
+            score += weight
+            reasons.append(reason)
+
+    risky = sum(1 for line in diff.added_lines if _CODE_RISKS.search(line))
+    if risky:
+        score += min(3.0, 1.0 + 0.5 * risky)
+        reasons.append("risky calls")
+
+    # Churn raises the score, with diminishing returns
+    score += math.log2(1 + diff.insertions + 0.5 * diff.deletions)
+    if diff.status == "deleted":
+        score *= 0.5
+
+    if _GENERATED_PATH.search(diff.path):
+        score *= 0.05
+        reasons = ["generated or lockfile"]
+    elif _TEST_PATH.search(diff.path):
+        score *= 0.5
+    elif _DOC_PATH.search(diff.path):
+        score *= 0.3
+
+    diff.risk, diff.risk_reasons = score, reasons
+    return score
+
+
+def rank_files(files: List[FileDiff]) -> List[FileDiff]:
+    """Score the files and return them riskiest first."""
+    for item in files:
+        score_file(item)
+    return sorted(files, key=lambda item: (-item.risk, item.path))
+
+
+# ============================================================================
+# Chunking
+# ============================================================================
+
+@dataclass
+class ReviewChunk:
+    """A group of (parts of) file diffs reviewed in one LLM call."""
+
+    index: int
+    parts: List[Tuple[FileDiff, List[DiffHunk]]] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def paths(self) -> List[str]:
+        return [diff.path for diff, _ in self.parts]
+
+    @property
+    def risk(self) -> float:
+        return max((diff.risk for diff, _ in self.parts), default=0.0)
+
+    def add(self, diff: FileDiff, hunks: List[DiffHunk], tokens: int) -> None:
+        self.parts.append((diff, hunks))
+        self.tokens += tokens
+
+    def render(self) -> str:
+        sections = []
+        for diff, hunks in self.parts:
+            partial = len(hunks) < len(diff.hunks)
+            heading = diff.render_heading() + (" (part of the file's hunks)" if partial else "")
+            sections.append("\n".join([heading, *(h.render() for h in hunks)]))
+        return "\n\n".join(sections)
+
+
+def _truncate_hunk(hunk: DiffHunk, max_tokens: int) -> DiffHunk:
+    """Cut a hunk that alone exceeds the chunk size."""
+    kept: List[str] = []
+    used = estimate_tokens(hunk.header)
+    for line in hunk.lines:
+        used += estimate_tokens(line) + 2
+        if used > max_tokens:
+            kept.append(f"\\ ... {len(hunk.lines) - len(kept)} more lines not shown")
+            break
+        kept.append(line)
+    return DiffHunk(header=hunk.header, old_start=hunk.old_start, new_start=hunk.new_start, lines=kept)
+
+
+def build_chunks(files: List[FileDiff], chunk_tokens: int) -> List[ReviewChunk]:
+    """
+    Pack files into chunks of at most ``chunk_tokens``, keeping their order.
+
+    Small files share a chunk. A file larger than a chunk is split at hunk
+    boundaries; a single hunk larger than a chunk is truncated.
+
+    Args:
+        files: Ranked files (binary files are left out)
+        chunk_tokens: Maximum estimated tokens of diff text per chunk
+
+    Returns:
+        Chunks in the order of their riskiest file
+    """
+    chunks: List[ReviewChunk] = []
+    current = ReviewChunk(index=0)
+
+    def flush():
+        nonlocal current
+        if current.parts:
+            chunks.append(current)
+            current = ReviewChunk(index=len(chunks))
+
+    for diff in files:
+        if diff.binary or not diff.hunks:
+            continue
+        if diff.tokens <= chunk_tokens:
+            if current.tokens + diff.tokens > chunk_tokens:
+                flush()
+            current.add(diff, diff.hunks, diff.tokens)
+            continue
+
+        # Too big for one chunk: give it chunks of its own, split by hunks
+        flush()
+        hunks: List[DiffHunk] = []
+        used = 20
+        for hunk in diff.hunks:
+            tokens = estimate_tokens(hunk.render())
+            if tokens > chunk_tokens:
+                hunk = _truncate_hunk(hunk, chunk_tokens - 20)
+                tokens = estimate_tokens(hunk.render())
+            if hunks and used + tokens > chunk_tokens:
+                current.add(diff, hunks, used)
+                flush()
+                hunks, used = [], 20
+            hunks.append(hunk)
+            used += tokens
+        if hunks:
+            current.add(diff, hunks, used)
+            flush()
+    flush()
+    return chunks
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ReviewCache:
+    """
+    Comments of already reviewed file changes, keyed by FileDiff.cache_key.
+
+    Stored as a JSON file. ``scope`` (review depth and focus areas) is
+    part of every key, so changing the review settings reviews again.
+    """
+
+    def __init__(self, path: Union[str, Path], scope: str = ""):
+        self.path = Path(path)
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable review cache {self.path}: {e}")
+
+    def _key(self, diff: FileDiff) -> str:
+        return f"{self.scope}|{diff.cache_key}" if self.scope else diff.cache_key
+
+    def get(self, diff: FileDiff) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(self._key(diff))
+        return list(entry["comments"]) if entry else None
+
+    def put(self, diff: FileDiff, comments: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[self._key(diff)] = {
+                "file": diff.path,
+                "comments": comments,
+                "reviewed_at": datetime.now().isoformat(),
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(self._entries, indent=2)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(data, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save review cache {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ============================================================================
+# Review
+# ============================================================================
+
+CHUNK_PROMPT = """You are reviewing one part of a larger code change. Other reviewers cover the other files; report only issues in the files below.
+
+{context}Each diff line starts with its line number in the new file (removed lines have none). Use those numbers for "line".
+
+Reply with JSON only, no prose:
+{{"comments": [{{"file": "path/as/shown", "line": 42, "severity": "CRITICAL | MAJOR | MINOR | NIT", "category": "security | performance | code_quality | correctness | testing | architecture", "issue": "What is wrong and why", "suggestion": "How to fix it"}}]}}
+
+Report real problems only (an empty list is fine). Severity: CRITICAL must be fixed before merge (security holes, data loss), MAJOR should be (bugs, crashes, serious performance problems), MINOR worth considering, NIT optional.
+
+## CHANGES
+
+{diff}"""
+
+
+@dataclass
+class ChunkedReviewResult:
+    """Outcome of a DiffReviewer run."""
+
+    comments: List[Dict[str, Any]] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+    """File path -> reviewed, cached, skipped, failed, binary or cancelled."""
+
+    chunks: int = 0
+    chunks_reviewed: int = 0
+    tokens_used: int = 0
+    duration: float = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for status in self.files.values():
+            counts[status] = counts.get(status, 0) + 1
+        return {
+            "files": counts,
+            "chunks": self.chunks,
+            "chunks_reviewed": self.chunks_reviewed,
+            "comments": len(self.comments),
+            "tokens_used": self.tokens_used,
+            "duration": round(self.duration, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"comments": self.comments, "files": self.files, "stats": self.stats()}
+
+
+def parse_chunk_comments(content: str, paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Extract review comments from a chunk reply.
+
+    Accepts bare JSON or JSON in a code fence. Comments on files outside
+    the chunk are dropped; severities and categories are normalized.
+
+    Raises:
+        ValueError: If the reply holds no JSON object
+    """
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("reply contains no JSON object")
+    data = json.loads(content[start:end + 1])
+    raw = data.get("comments", []) if isinstance(data, dict) else []
+
+    known = set(paths)
+    comments = []
+    for item in raw:
+        if not isinstance(item, dict) or not item.get("issue"):
+            continue
+        path = str(item.get("file", "")).strip()
+        if path.startswith(("a/", "b/")) and path[2:] in known:
+            path = path[2:]
+        if path not in known:
+            if len(known) != 1:
+                continue
+            path = next(iter(known))
+        try:
+            line = max(1, int(item.get("line") or 1))
+        except (TypeError, ValueError):
+            line = 1
+        severity = str(item.get("severity", "MINOR")).upper()
+        category = str(item.get("category", "code_quality")).lower()
+        comment = {
+            "file": path,
+            "line": line,
+            "severity": severity if severity in VALID_SEVERITIES else "MINOR",
+            "category": category if category in VALID_CATEGORIES else "code_quality",
+            "issue": str(item["issue"]),
+            "suggestion": str(item.get("suggestion", "")),
+        }
+        if item.get("code_example"):
+            comment["code_example"] = str(item["code_example"])
+        comments.append(comment)
+    return comments
+
+
+class DiffReviewer:
+    """Reviews ranked file diffs as concurrent, independent LLM calls."""
+
+    def __init__(
+        self,
+        llm: LLMProvider,
+        max_concurrent: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        chunk_tokens: Optional[int] = None,
+        cache: Optional[ReviewCache] = None,
+        engine: Optional[AgentExecutionEngine] = None,
+    ):
+        """
+        Args:
+            llm: LLM provider for the chunk calls
+            max_concurrent: Calls running at once
+                (default ARCHIFLOW_REVIEW_MAX_CONCURRENT, 4)
+            token_budget: Tokens all calls may spend together
+                (default ARCHIFLOW_REVIEW_TOKEN_BUDGET, 200000)
+            chunk_tokens: Maximum estimated diff tokens per call
+                (default ARCHIFLOW_REVIEW_CHUNK_TOKENS, 12000)
+            cache: Comments of earlier reviews; unchanged files are not
+                reviewed again
+            engine: Execution engine whose LLM slots the calls take.
+                    Defaults to the process-wide engine.
+        """
+        self.llm = llm
+        self.max_concurrent = max_concurrent or _env_int("ARCHIFLOW_REVIEW_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)
+        self.token_budget = token_budget or _env_int("ARCHIFLOW_REVIEW_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+        self.chunk_tokens = chunk_tokens or _env_int("ARCHIFLOW_REVIEW_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS)
+        self.cache = cache
+        self.engine = engine or get_execution_engine()
+
+    def review(
+        self,
+        files: List[FileDiff],
+        pr_description: str = "",
+        focus_areas: Optional[List[str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> ChunkedReviewResult:
+        """
+        Review the files and collect the comments.
+
+        Args:
+            files: Ranked file diffs (see rank_files)
+            pr_description: What the change is meant to do (trimmed to ~1000 tokens)
+            focus_areas: Review dimensions to emphasize (``["all"]`` for none)
+            cancel_token: Stops starting new chunks and aborts running calls
+                (defaults to the current cancellation scope)
+
+        Returns:
+            ChunkedReviewResult with the merged comments, riskiest files first
+
+        Raises:
+            OperationCancelledError: If the review was cancelled
+        """
+        started = time.monotonic()
+        token = cancel_token or current_token()
+        result = ChunkedReviewResult()
+
+        pending: List[FileDiff] = []
+        for diff in files:
+            if diff.binary or not diff.hunks:
+                result.files[diff.path] = "binary" if diff.binary else "skipped"
+                continue
+            cached = self.cache.get(diff) if self.cache is not None else None
+            if cached is not None:
+                result.files[diff.path] = "cached"
+                result.comments.extend(cached)
+            else:
+                pending.append(diff)
+
+        chunks = build_chunks(pending, self.chunk_tokens)
+        result.chunks = len(chunks)
+        prompt_context = self._prompt_context(pr_description, focus_areas)
+
+        # A file split over several chunks is cached once all its parts are reviewed
+        parts_left: Dict[str, int] = {}
+        for chunk in chunks:
+            for path in chunk.paths:
+                parts_left[path] = parts_left.get(path, 0) + 1
+        file_comments: Dict[str, List[Dict[str, Any]]] = {path: [] for path in parts_left}
+        by_path = {diff.path: diff for diff in pending}
+
+        # One call at a time runs on the LLM slot of the agent step doing the
+        # review (or on one taken here); more only on slots that are free now,
+        # so a review never waits for slots while holding one
+        engine = self.engine
+        own_slot = not engine.holds_llm_slot() and engine.acquire_llm_slot()
+        own_slot_free = True
+
+        reserved = 0
+        queue = list(chunks)
+        running: Dict[Any, Tuple[ReviewChunk, int, bool]] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="diff-review")
+        try:
+            while queue or running:
+                if token is not None:
+                    token.raise_if_cancelled()
+
+                # Start chunks in risk order while the budget covers their estimate
+                while queue and len(running) < self.max_concurrent:
+                    chunk = queue[0]
+                    estimate = chunk.tokens + CALL_OVERHEAD_TOKENS
+                    if result.tokens_used + reserved + estimate > self.token_budget:
+                        if running:
+                            break  # Running calls may come in under their estimate
+                        for skipped in queue:
+                            for path in skipped.paths:
+                                result.files.setdefault(path, "skipped")
+                        logger.info(f"Review token budget exhausted: skipped {len(queue)} of {len(chunks)} chunks")
+                        queue = []
+                        break
+                    on_own_slot = own_slot_free
+                    if not on_own_slot and not engine.acquire_llm_slot(blocking=False):
+                        break  # No free LLM slot; wait for a running call
+                    queue.pop(0)
+                    reserved += estimate
+                    prompt = CHUNK_PROMPT.format(context=prompt_context, diff=chunk.render())
+                    ctx = contextvars.copy_context()
+                    future = executor.submit(ctx.run, self._review_chunk, chunk, prompt, token)
+                    if on_own_slot:
+                        own_slot_free = False
+                    else:
+                        future.add_done_callback(lambda _: engine.release_llm_slot())
+                    running[future] = (chunk, estimate, on_own_slot)
+
+                if not running:
+                    break
+                done, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk, estimate, on_own_slot = running.pop(future)
+                    reserved -= estimate
+                    if on_own_slot:
+                        own_slot_free = True
+                    try:
+                        comments, used = future.result()
+                    except OperationCancelledError:
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Review of chunk {chunk.index} ({', '.join(chunk.paths)}) failed: {e}")
+                        for path in chunk.paths:
+                            result.files[path] = "failed"
+                        continue
+
+                    result.tokens_used += used
+                    result.chunks_reviewed += 1
+                    for comment in comments:
+                        file_comments[comment["file"]].append(comment)
+                    for path in chunk.paths:
+                        parts_left[path] -= 1
+                        if parts_left[path] == 0 and result.files.get(path) != "failed":
+                            result.files[path] = "reviewed"
+                            if self.cache is not None:
+                                self.cache.put(by_path[path], file_comments[path])
+        except OperationCancelledError:
+            for path in parts_left:
+                result.files.setdefault(path, "cancelled")
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if own_slot:
+                # A call still running on it keeps the slot until it returns
+                holder = next((f for f, (_, _, mine) in running.items() if mine), None)
+                if holder is not None:
+                    holder.add_done_callback(lambda _: engine.release_llm_slot())
+                else:
+                    engine.release_llm_slot()
+            if self.cache is not None:
+                self.cache.save()
+            result.duration = time.monotonic() - started
+
+        for diff in pending:
+            if result.files.get(diff.path) in ("reviewed", "failed"):
+                result.comments.extend(file_comments.get(diff.path, []))
+
+        # Riskiest files first, then by line
+        order = {diff.path: i for i, diff in enumerate(files)}
+        result.comments.sort(key=lambda c: (order.get(c["file"], len(order)), c["line"]))
+        logger.info(f"Chunked review finished: {result.stats()}")
+        return result
+
+    def _prompt_context(self, pr_description: str, focus_areas: Optional[List[str]]) -> str:
+        context = ""
+        description = (pr_description or "").strip()
+        if description:
+            limit = 1000 * CHARS_PER_TOKEN
+            if len(description) > limit:
+                description = description[:limit] + "\n... (truncated)"
+            context += f"## PR DESCRIPTION\n\n{description}\n\n"
+        areas = [area for area in focus_areas or [] if area != "all"]
+        if areas:
+            context += f"Focus especially on: {', '.join(areas)}.\n\n"
+        return context
+
+    def _review_chunk(
+        self, chunk: ReviewChunk, prompt: str, token: Optional[CancellationToken]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """One LLM call; returns the chunk's comments and the tokens spent."""
+        with cancellation_scope(token):
+            response = self.llm.generate([{"role": "user", "content": prompt}])
+        used = response.usage.get("total_tokens") or (
+            response.usage.get("prompt_tokens", 0) + response.usage.get("completion_tokens", 0)
+        )
+        return parse_chunk_comments(response.content or "", chunk.paths), used
@@ -0,0 +1,85 @@
+"""
+Import-path references for lazily loaded classes.
+
+Agent classes, LLM providers and optional tools pull in heavy third-party
+SDKs (openai, anthropic, google-genai, PIL, pptx, ...). Registries refer
+to them by ``"package.module:Attribute"`` path instead and import them on
+first use, so starting the CLI only pays for what a session actually uses.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Union
+
+
+def import_from_path(path: str) -> Any:
+    """
+    Import and return the object named by ``"package.module:Attribute"``.
+
+    Raises:
+        ImportError: If the module cannot be imported
+        AttributeError: If the module has no such attribute
+    """
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Import path must look like 'package.module:Attribute', got {path!r}")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute)
+
+
+class LazyRef:
+    """A class or object referenced by import path and loaded on first use."""
+
+    __slots__ = ("path", "_target")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._target = None
+
+    @property
+    def name(self) -> str:
+        """Attribute name, available without importing."""
+        return self.path.partition(":")[2]
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def load(self) -> Any:
+        if self._target is None:
+            self._target = import_from_path(self.path)
+        return self._target
+
+    def __repr__(self) -> str:
+        return f"LazyRef({self.path!r})"
+
+
+def resolve(target: Union[str, LazyRef, Any]) -> Any:
+    """Return ``target`` itself, or the object an import path refers to."""
+    if isinstance(target, LazyRef):
+        return target.load()
+    if isinstance(target, str):
+        return import_from_path(target)
+    return target
+
+
+def lazy_exports(module_name: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module ``__getattr__`` that imports ``exports`` on first access.
+
+    Usage in a package ``__init__``::
+
+        __getattr__ = lazy_exports(__name__, {"OpenAIProvider": ".openai_provider"})
+
+    Values are module paths, relative to ``module_name`` when they start
+    with a dot. Loaded attributes are cached in the module namespace.
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        module = importlib.import_module(exports[name], module_name)
+        value = getattr(module, name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
@@ -1,9 +1,14 @@
 """LLM providers package."""
+from ..lazy import lazy_exports
 from .provider import LLMProvider, LLMResponse, LLMResponseChunk, FinishReason, ToolCallRequest
 from .model_config import ModelConfig, ModelRegistry
-from .usage_tracker import UsageTracker, UsageRecord
-from .openai_provider import OpenAIProvider
-from .mock import MockLLMProvider
+from .usage_tracker import UsageTracker, UsageRecord, UsageAggregate, get_usage_tracker
+
+# Concrete providers import their vendor SDKs, so load them on first access
+__getattr__ = lazy_exports(__name__, {
+    "OpenAIProvider": ".openai_provider",
+    "MockLLMProvider": ".mock",
+})
 
 __all__ = [
     "LLMProvider",
@@ -15,6 +20,8 @@ __all__ = [
     "ModelRegistry",
     "UsageTracker",
     "UsageRecord",
+    "UsageAggregate",
+    "get_usage_tracker",
     "OpenAIProvider",
     "MockLLMProvider",
 ]
@@ -7,6 +7,7 @@ import os
 import logging
 from typing import List, Dict, Any, Optional, Iterator
 from .provider import LLMProvider, LLMResponse, LLMResponseChunk, FinishReason, ToolCallRequest
+from ..cancellation import CancellationToken, OperationCancelledError, current_token
 from ..config.env_loader import load_env
 
 # Import anthropic
@@ -81,8 +82,15 @@ class AnthropicProvider(LLMProvider):
         if "temperature" in kwargs:
             create_kwargs["temperature"] = kwargs["temperature"]
 
+        token = current_token()
         try:
-            response = self.client.messages.create(**create_kwargs)
+            if token is None:
+                response = self.client.messages.create(**create_kwargs)
+            else:
+                # Inside an agent turn: stream, so an interrupt can abort the call
+                response = self._create_cancellable(create_kwargs, token)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             raise e
@@ -123,6 +131,24 @@ class AnthropicProvider(LLMProvider):
 
         return llm_response
 
+    def _create_cancellable(self, create_kwargs: Dict[str, Any], token: CancellationToken) -> Any:
+        """
+        Create a message over a stream that the token can close mid-reply.
+
+        Returns the final message, the same object messages.create returns.
+        """
+        token.raise_if_cancelled()
+        with self.client.messages.stream(**create_kwargs) as stream:
+            unregister = token.on_cancel(stream.close)
+            try:
+                return stream.get_final_message()
+            except Exception:
+                if token.cancelled:
+                    raise OperationCancelledError(token.reason or "cancelled") from None
+                raise
+            finally:
+                unregister()
+
     def stream(
         self,
         messages: List[Dict[str, Any]],
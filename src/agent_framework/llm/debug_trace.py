@@ -0,0 +1,450 @@
+"""
+Compact trace of LLM requests for debugging agent sessions.
+
+Agents send nearly the same message list on every step: the previous
+request plus one or two new messages. Writing the whole list each time
+makes a long session's debug log grow quadratically. DebugTrace writes
+one compact JSON line per request instead:
+
+    {"session_id": "s1", "step": 41, "timestamp": "...", "keyframe": false,
+     "count": 40, "tokens": 9120,
+     "messages": [{"copy": [1, 38], "hash": "...", "tokens": 8900},
+                  {"hash": "...", "tokens": 210, "message": {...}}],
+     "tools": "<hash>", "response": {...}}
+
+Each ``messages`` entry is either a run copied from the same session's
+previous request (with the run's hash and token count, so a reader can
+verify it), or a message written in full. The tool schema is written
+only when it changes. The first request a DebugTrace writes to a file is
+a keyframe with every message in full, so each segment can be read on
+its own.
+
+The active file is plain JSONL. It is rotated once it grows past
+``max_bytes``; rotated segments are gzipped and only the newest
+``keep_segments`` are kept. Segment naming follows the audit log
+(``coding_agent.000001.log.gz``).
+
+Reading:
+    request = load_request("logs/debug/coding_agent.log", step=41)
+    request.messages  # the exact list sent to the LLM
+
+or from the command line:
+    python -m agent_framework.llm.debug_trace logs/debug/coding_agent.log --step 41
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..audit.writer import GZIP_SUFFIX, segments
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_KEEP_SEGMENTS = 5
+
+# Rotation and writes for one file must not interleave across agents
+_file_lock = threading.Lock()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str, sort_keys=True)
+
+
+def content_hash(text: str) -> str:
+    """Short hash identifying a serialized message or tool schema."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def run_hash(hashes: List[str]) -> str:
+    """Hash of a run of messages, from their individual hashes."""
+    return content_hash(",".join(hashes))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (1 token ~= 4 characters), as LLMProvider.count_tokens."""
+    return len(text) // 4
+
+
+def response_to_dict(response: Any) -> Dict[str, Any]:
+    """The parts of an LLMResponse worth keeping in a debug trace."""
+    tool_calls = getattr(response, "tool_calls", None) or []
+    finish_reason = getattr(response, "finish_reason", None)
+    return {
+        "content": getattr(response, "content", None),
+        "tool_calls": [
+            {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+            for tc in tool_calls
+        ],
+        "stop_reason": getattr(response, "stop_reason", None),
+        "finish_reason": getattr(finish_reason, "value", finish_reason),
+        "usage": getattr(response, "usage", None),
+    }
+
+
+class DebugTrace:
+    """
+    Writer for one agent's LLM request trace.
+
+    Not thread-safe per instance (an agent makes one request at a time);
+    several instances may share a file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        keep_segments: Optional[int] = None,
+    ):
+        """
+        Initialize the trace.
+
+        Args:
+            path: Trace file (its active segment)
+            max_bytes: Rotate once the active segment would exceed this size
+                (default ARCHIFLOW_DEBUG_LOG_MAX_MB, 50)
+            keep_segments: Rotated segments to keep
+                (default ARCHIFLOW_DEBUG_LOG_KEEP, 5)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("ARCHIFLOW_DEBUG_LOG_MAX_MB", "50")) * 1024 * 1024)
+        if keep_segments is None:
+            keep_segments = int(os.environ.get("ARCHIFLOW_DEBUG_LOG_KEEP", str(DEFAULT_KEEP_SEGMENTS)))
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.keep_segments = keep_segments
+
+        # Previous request: message dicts with their hashes and token counts
+        self._messages: List[Dict[str, Any]] = []
+        self._hashes: List[str] = []
+        self._tokens: List[int] = []
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._tools_hash: Optional[str] = None
+        # Identity of the file the previous request went to
+        self._file_id: Optional[Tuple[int, int]] = None
+
+    def reset(self) -> None:
+        """Forget the previous request; the next one is written in full."""
+        self._messages, self._hashes, self._tokens = [], [], []
+        self._tools = None
+        self._tools_hash = None
+
+    def record(
+        self,
+        session_id: str,
+        step: int,
+        messages: List[Dict[str, Any]],
+        tools_schema: Optional[List[Dict[str, Any]]],
+        response: Any,
+    ) -> None:
+        """
+        Append one request and its response to the trace.
+
+        Args:
+            session_id: Session the request belongs to
+            step: Agent sequence number at the time of the request
+            messages: Messages sent to the LLM
+            tools_schema: Tool schema sent to the LLM
+            response: Response from the LLM
+        """
+        with _file_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._current_file_id() != self._file_id:
+                # New file, rotated by us or by another writer
+                self.reset()
+
+            entry = self._build_entry(session_id, step, messages, tools_schema, response)
+            line = (_dumps(entry) + "\n").encode("utf-8")
+
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+                self.reset()
+                entry = self._build_entry(session_id, step, messages, tools_schema, response)
+                line = (_dumps(entry) + "\n").encode("utf-8")
+
+            with open(self.path, "ab") as f:
+                f.write(line)
+            self._file_id = self._current_file_id()
+
+    def _build_entry(
+        self,
+        session_id: str,
+        step: int,
+        messages: List[Dict[str, Any]],
+        tools_schema: Optional[List[Dict[str, Any]]],
+        response: Any,
+    ) -> Dict[str, Any]:
+        keyframe = not self._hashes and self._tools_hash is None
+        entries, hashes, tokens = self._diff(messages)
+
+        entry: Dict[str, Any] = {
+            "session_id": session_id,
+            "step": step,
+            "timestamp": datetime.now().isoformat(),
+            "keyframe": keyframe,
+            "count": len(messages),
+            "tokens": sum(tokens),
+            "messages": entries,
+        }
+
+        if self._tools_hash is None or tools_schema != self._tools:
+            text = _dumps(tools_schema)
+            self._tools_hash = content_hash(text)
+            entry["tool_schema"] = tools_schema
+        entry["tools"] = self._tools_hash
+        entry["response"] = response_to_dict(response)
+
+        self._messages, self._hashes, self._tokens = list(messages), hashes, tokens
+        self._tools = tools_schema
+        return entry
+
+    def _diff(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str], List[int]]:
+        """
+        Encode messages against the previous request.
+
+        Messages are first compared by equality with the previous request
+        at the expected position (cheap: unchanged messages share their
+        strings), and only hashed when that fails. A hash found elsewhere
+        in the previous request restarts a copied run there.
+        """
+        previous, previous_hashes, previous_tokens = self._messages, self._hashes, self._tokens
+        positions: Dict[str, int] = {}
+        for index, value in enumerate(previous_hashes):
+            positions.setdefault(value, index)
+
+        entries: List[Dict[str, Any]] = []
+        hashes: List[str] = []
+        tokens: List[int] = []
+        run_start = run_length = 0
+        expected = 0
+
+        def close_run() -> None:
+            if run_length:
+                run = previous_hashes[run_start:run_start + run_length]
+                entries.append({
+                    "copy": [run_start, run_length],
+                    "hash": run_hash(run),
+                    "tokens": sum(previous_tokens[run_start:run_start + run_length]),
+                })
+
+        for message in messages:
+            if expected < len(previous) and message == previous[expected]:
+                source = expected
+                message_hash = previous_hashes[source]
+            else:
+                text = _dumps(message)
+                message_hash = content_hash(text)
+                source = positions.get(message_hash, -1)
+                if source < 0:
+                    close_run()
+                    run_length = 0
+                    count = estimate_tokens(text)
+                    entries.append({"hash": message_hash, "tokens": count, "message": message})
+                    hashes.append(message_hash)
+                    tokens.append(count)
+                    # Assume the message replaced the one at this position
+                    expected += 1
+                    continue
+
+            if run_length and source == run_start + run_length:
+                run_length += 1
+            else:
+                close_run()
+                run_start, run_length = source, 1
+            hashes.append(message_hash)
+            tokens.append(previous_tokens[source])
+            expected = source + 1
+
+        close_run()
+        return entries, hashes, tokens
+
+    def _current_file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _rotate(self) -> None:
+        """Gzip the active segment under the next number and drop old segments."""
+        existing = segments(self.path)[:-1]
+        number = 1
+        if existing:
+            number = _segment_number(self.path, existing[-1]) + 1
+        rotated = self.path.with_name(f"{self.path.stem}.{number:06d}{self.path.suffix}{GZIP_SUFFIX}")
+        with open(self.path, "rb") as src, gzip.open(rotated, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        self.path.unlink()
+
+        existing.append(rotated)
+        for old in existing[:max(0, len(existing) - self.keep_segments)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        logger.info(f"Rotated debug trace {self.path} to segment {number}")
+
+
+def _segment_number(path: Path, segment: Path) -> int:
+    return int(segment.name[len(path.stem) + 1:].split(".", 1)[0])
+
+
+@dataclass
+class TracedRequest:
+    """One LLM request reconstructed from a trace."""
+
+    session_id: str
+    step: int
+    timestamp: str
+    messages: List[Dict[str, Any]]
+    tools: Optional[List[Dict[str, Any]]]
+    response: Dict[str, Any] = field(default_factory=dict)
+    tokens: int = 0
+
+
+class _SessionState:
+    __slots__ = ("messages", "hashes", "tokens", "tools", "tools_hash")
+
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+        self.hashes: List[str] = []
+        self.tokens: List[int] = []
+        self.tools: Optional[List[Dict[str, Any]]] = None
+        self.tools_hash: Optional[str] = None
+
+
+def _read_segment(segment: Path) -> Iterator[Dict[str, Any]]:
+    opener = gzip.open if segment.name.endswith(GZIP_SUFFIX) else open
+    with opener(segment, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Torn write at the end
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Lines of the old pretty-printed format
+                continue
+            if isinstance(entry, dict) and "messages" in entry and "session_id" in entry:
+                yield entry
+
+
+def iter_requests(path: str, session_id: Optional[str] = None) -> Iterator[TracedRequest]:
+    """
+    Reconstruct every request in a trace, oldest first.
+
+    Args:
+        path: Trace file (its active segment); rotated segments are read too
+        session_id: Only requests of this session
+
+    Raises:
+        ValueError: If a copied run does not match its recorded hash
+    """
+    states: Dict[str, _SessionState] = {}
+    for segment in segments(Path(path)):
+        for entry in _read_segment(segment):
+            sid = entry["session_id"]
+            state = states.get(sid)
+            if state is None or entry.get("keyframe"):
+                state = states[sid] = _SessionState()
+
+            messages: List[Dict[str, Any]] = []
+            hashes: List[str] = []
+            tokens: List[int] = []
+            for item in entry["messages"]:
+                if "copy" in item:
+                    start, length = item["copy"]
+                    run = state.hashes[start:start + length]
+                    if len(run) != length or run_hash(run) != item["hash"]:
+                        raise ValueError(
+                            f"{segment}: step {entry['step']} of session {sid} "
+                            f"copies messages missing from the previous request"
+                        )
+                    messages.extend(state.messages[start:start + length])
+                    hashes.extend(run)
+                    tokens.extend(state.tokens[start:start + length])
+                else:
+                    messages.append(item["message"])
+                    hashes.append(item["hash"])
+                    tokens.append(item["tokens"])
+
+            if "tool_schema" in entry:
+                state.tools = entry["tool_schema"]
+            state.tools_hash = entry.get("tools")
+            state.messages, state.hashes, state.tokens = messages, hashes, tokens
+
+            if session_id is None or sid == session_id:
+                yield TracedRequest(
+                    session_id=sid,
+                    step=entry["step"],
+                    timestamp=entry.get("timestamp", ""),
+                    messages=messages,
+                    tools=state.tools,
+                    response=entry.get("response", {}),
+                    tokens=entry.get("tokens", sum(tokens)),
+                )
+
+
+def load_request(path: str, step: int, session_id: Optional[str] = None) -> Optional[TracedRequest]:
+    """
+    Reconstruct the request made at one step.
+
+    Args:
+        path: Trace file
+        step: Step number as recorded (the agent's sequence number)
+        session_id: Session to look in (the last match wins if omitted)
+
+    Returns:
+        The request, or None if the trace has no such step
+    """
+    found = None
+    for request in iter_requests(path, session_id):
+        if request.step == step:
+            found = request
+            if session_id is not None:
+                break
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Inspect an ArchiFlow LLM debug trace")
+    parser.add_argument("path", help="Debug log file (e.g. logs/debug/coding_agent.log)")
+    parser.add_argument("--step", type=int, default=None, help="Print the full request made at this step")
+    parser.add_argument("--session", default=None, help="Only this session")
+    args = parser.parse_args(argv)
+
+    if args.step is None:
+        for request in iter_requests(args.path, args.session):
+            print(f"{request.session_id}\tstep {request.step}\t{request.timestamp}\t"
+                  f"{len(request.messages)} messages\t~{request.tokens} tokens")
+        return
+
+    request = load_request(args.path, args.step, args.session)
+    if request is None:
+        sys.exit(f"No step {args.step} in {args.path}")
+    json.dump({
+        "session_id": request.session_id,
+        "step": request.step,
+        "timestamp": request.timestamp,
+        "messages": request.messages,
+        "tools": request.tools,
+        "response": request.response,
+    }, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == "__main__":
+    main()
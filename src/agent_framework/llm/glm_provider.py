@@ -8,7 +8,9 @@ import os
 import logging
 from typing import List, Dict, Any, Optional, Iterator
 from openai import OpenAI
+from .openai_provider import create_cancellable_completion
 from .provider import LLMProvider, LLMResponse, LLMResponseChunk, FinishReason, ToolCallRequest
+from ..cancellation import OperationCancelledError, current_token
 from ..config.env_loader import load_env
 
 # Optional: tiktoken for accurate token counting
@@ -133,8 +135,17 @@ class GLMProvider(LLMProvider):
         # Remove provider-specific args that shouldn't be passed to create
         # (none for now, assuming kwargs are clean)
 
+        token = current_token()
         try:
-            response = self.client.chat.completions.create(**create_kwargs)
+            if token is None:
+                response = self.client.chat.completions.create(**create_kwargs)
+            else:
+                # Inside an agent turn: stream, so an interrupt can abort the call
+                response = create_cancellable_completion(
+                    self.client, create_kwargs, token, include_usage=False
+                )
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logger.error(f"GLM API error: {e}")
             logger.error(f"Request kwargs: {create_kwargs}")
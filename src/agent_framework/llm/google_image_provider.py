@@ -117,6 +117,9 @@ load_env()
 class GoogleImageProvider(ImageProvider):
     """Google GenAI image provider for MVP with reference image support."""
 
+    # Paid-tier image preview quota; override with ARCHIFLOW_IMAGE_RPM
+    requests_per_minute = 20
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -0,0 +1,370 @@
+"""
+Concurrent, rate-limited image generation.
+
+Image provider SDK calls block for tens of seconds each, so a comic page
+or slide deck generated one call at a time is fully serial and stalls the
+event loop while it runs. ImageBatchRunner moves each call onto a worker
+thread and runs a batch with bounded concurrency, returning results in
+request order. Every call first takes a token from a per-provider token
+bucket, and calls rejected with 429 or a 5xx are retried with exponential
+backoff (honouring ``Retry-After`` when the error carries one).
+
+Providers declare their request quota with ``requests_per_minute``; the
+environment overrides it:
+    ARCHIFLOW_IMAGE_CONCURRENCY   calls in flight per batch (default: 4)
+    ARCHIFLOW_IMAGE_RPM           requests per minute per provider/model
+                                  (default: the provider's, else unlimited)
+    ARCHIFLOW_IMAGE_MAX_RETRIES   retries per call (default: 3)
+
+Usage:
+    runner = ImageBatchRunner(provider)
+    jobs = [partial(runner.generate, provider.generate_image, prompt=p) for p in prompts]
+    results = await runner.run(jobs)   # values or exceptions, in order
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+if TYPE_CHECKING:
+    from .image_cache import ImageCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+
+# Longest single backoff, whatever the attempt count or Retry-After says
+MAX_RETRY_DELAY = 60.0
+
+# Fallback markers for errors that lost their status code when wrapped
+_RETRYABLE_MARKERS = (
+    "resource_exhausted",
+    "rate limit",
+    "rate_limit",
+    "too many requests",
+    "unavailable",
+    "overloaded",
+    "deadline_exceeded",
+)
+# A 429/5xx only counts in status context ("status 503", "HTTP 502",
+# "Error code: 429", "503 UNAVAILABLE"), so sizes like "512x512" don't
+_STATUS_IN_MESSAGE = re.compile(
+    r"(?i:\bstatus(?:[ _]?code)?|\bhttp(?:/[\d.]+)?|\berror code|\bcode)[\s:=\"']*(?:429|5\d\d)\b"
+    r"|(?:^|[\s:])(?:429|5\d\d) [A-Z][A-Z_]{2,}\b"
+)
+
+
+def _env_number(name: str, default: float) -> float:
+    configured = os.environ.get(name)
+    if configured:
+        try:
+            return float(configured)
+        except ValueError:
+            logger.warning(f"Invalid {name}={configured!r}, using default")
+    return default
+
+
+def image_concurrency() -> int:
+    """Calls in flight per batch (``ARCHIFLOW_IMAGE_CONCURRENCY``)."""
+    return max(1, int(_env_number("ARCHIFLOW_IMAGE_CONCURRENCY", DEFAULT_CONCURRENCY)))
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every caller of one provider.
+
+    Holds up to ``burst`` tokens and refills at ``rate`` tokens per second.
+    State is guarded by a thread lock and waiting is done with
+    ``asyncio.sleep``, so one bucket can serve several event loops.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds`` (after the provider pushed back)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+_limiters: Dict[str, Optional[TokenBucket]] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: Any) -> Optional[TokenBucket]:
+    """
+    Get the shared token bucket for a provider and model.
+
+    The rate is ``ARCHIFLOW_IMAGE_RPM`` when set, otherwise the provider's
+    ``requests_per_minute``. Burst equals the batch concurrency.
+
+    Returns:
+        The bucket, or None when no rate is configured (calls are not limited)
+    """
+    key = f"{getattr(provider, 'provider_name', type(provider).__name__)}:{getattr(provider, 'model_name', '')}"
+    with _limiters_lock:
+        if key not in _limiters:
+            rpm = _env_number("ARCHIFLOW_IMAGE_RPM", 0.0)
+            if rpm <= 0:
+                rpm = getattr(provider, "requests_per_minute", None)
+            if isinstance(rpm, (int, float)) and rpm > 0:
+                _limiters[key] = TokenBucket(rate=rpm / 60.0, burst=image_concurrency())
+            else:
+                _limiters[key] = None
+        return _limiters[key]
+
+
+def reset_rate_limiters() -> None:
+    """Forget all provider buckets (they are recreated with current settings)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    if isinstance(value, int):
+        return value
+    return None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _exception_chain(exc: BaseException) -> List[BaseException]:
+    chain = []
+    while exc is not None and exc not in chain:
+        chain.append(exc)
+        exc = exc.__cause__ or exc.__context__
+    return chain
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Whether an image generation error is worth retrying.
+
+    Providers wrap SDK errors in plain exceptions, so the whole
+    ``__cause__`` chain is searched for a 429/5xx status code, falling
+    back to well-known rate-limit and overload messages.
+    """
+    chain = _exception_chain(exc)
+    for error in chain:
+        status = _status_code(error)
+        if status is not None:
+            return status == 429 or status >= 500
+    for error in chain:
+        message = str(error)
+        if _STATUS_IN_MESSAGE.search(message):
+            return True
+        lowered = message.lower()
+        if any(marker in lowered for marker in _RETRYABLE_MARKERS):
+            return True
+    return False
+
+
+def retry_delay(exc: BaseException, attempt: int, base_delay: float) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (1-based).
+
+    Uses the error's ``Retry-After`` header when present, otherwise
+    exponential backoff with jitter.
+    """
+    for error in _exception_chain(exc):
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(MAX_RETRY_DELAY, max(0.0, retry_after))
+    delay = base_delay * (2 ** (attempt - 1))
+    return min(MAX_RETRY_DELAY, delay * (1 + random.random() * 0.25))
+
+
+class ImageBatchRunner:
+    """
+    Runs blocking image generation calls concurrently for one provider.
+
+    ``generate`` makes a single rate-limited, retried call on a worker
+    thread; ``run`` executes a batch of such jobs with bounded concurrency
+    and returns their results in order.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        base_delay: float = 2.0,
+        limiter: Optional[TokenBucket] = None,
+        cache: Optional["ImageCache"] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            provider: Image provider the calls go to (selects the rate limiter)
+            concurrency: Calls in flight per batch (default: ARCHIFLOW_IMAGE_CONCURRENCY)
+            max_retries: Retries per call (default: ARCHIFLOW_IMAGE_MAX_RETRIES)
+            base_delay: First backoff delay in seconds
+            limiter: Token bucket to use instead of the provider's shared one
+            cache: Generated-image cache used by ``generate_cached``
+        """
+        self.provider = provider
+        self.concurrency = max(1, concurrency or image_concurrency())
+        if max_retries is None:
+            max_retries = int(_env_number("ARCHIFLOW_IMAGE_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.limiter = limiter or get_rate_limiter(provider)
+        self.cache = cache
+
+    async def generate(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call a blocking generation function off the event loop.
+
+        Args:
+            fn: Provider method, e.g. ``provider.generate_image``
+            *args, **kwargs: Passed to ``fn``
+
+        Returns:
+            Whatever ``fn`` returns
+
+        Raises:
+            The last error once retries are exhausted, or any non-retryable error
+        """
+        attempt = 0
+        while True:
+            if self.limiter:
+                await self.limiter.acquire()
+            try:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_delay(e, attempt, self.base_delay)
+                logger.warning(
+                    f"Image generation rejected ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                if self.limiter:
+                    # Every caller of this provider backs off, not just this one
+                    self.limiter.penalize(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    async def generate_cached(
+        self,
+        key: Optional[str],
+        fn: Callable[..., T],
+        *args,
+        refresh: bool = False,
+        **kwargs,
+    ) -> Tuple[T, bool]:
+        """
+        Like ``generate``, but serve and store results through the image cache.
+
+        Args:
+            key: Key from ``image_cache.cache_key`` (None skips the cache)
+            fn: Provider method, e.g. ``provider.generate_image``
+            refresh: Generate even if cached, replacing the entry
+            *args, **kwargs: Passed to ``fn``
+
+        Returns:
+            (image, whether it came from the cache)
+        """
+        if self.cache is None or key is None:
+            return await self.generate(fn, *args, **kwargs), False
+        if not refresh:
+            image = await asyncio.to_thread(self.cache.get, key)
+            if image is not None:
+                return image, True
+        image = await self.generate(fn, *args, **kwargs)
+        if image is not None:
+            # Some providers return a wrapper around the PIL image
+            pil_image = getattr(image, "_pil_image", image)
+            if hasattr(pil_image, "save"):
+                await asyncio.to_thread(self.cache.put, key, pil_image)
+        return image, False
+
+    async def run(
+        self,
+        jobs: Sequence[Callable[[], Awaitable[T]]],
+        on_done: Optional[Callable[[int, Union[T, Exception]], None]] = None,
+    ) -> List[Union[T, Exception]]:
+        """
+        Run jobs with at most ``concurrency`` in flight.
+
+        Args:
+            jobs: Zero-argument coroutine functions, typically wrapping ``generate``
+            on_done: Called with (index, result) as each job finishes
+
+        Returns:
+            One entry per job, in job order: its result, or the exception it raised
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(index: int, job: Callable[[], Awaitable[T]]) -> Union[T, Exception]:
+            async with semaphore:
+                try:
+                    result = await job()
+                except Exception as e:
+                    result = e
+            if on_done:
+                on_done(index, result)
+            return result
+
+        return list(await asyncio.gather(*(run_one(i, job) for i, job in enumerate(jobs))))
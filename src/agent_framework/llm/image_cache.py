@@ -0,0 +1,425 @@
+"""
+Caches for image generation.
+
+ImageCache is a content-addressed disk store of generated images. The key
+is a hash of everything that determines the request - provider, model,
+prompt, the pixels of each reference image, aspect ratio and resolution -
+so re-running a comic or deck after a small script edit only regenerates
+the images whose inputs changed. Entries are evicted least recently used
+first once the store grows past its size limit; a hit refreshes the file's
+mtime, so the order survives restarts.
+
+ReferenceImageCache keeps the character/style references of one session
+directory decoded, downscaled and hashed in memory. File names are looked
+up in an index of the directory (rebuilt only when the directory changes),
+so resolving and loading a reference costs a couple of stats instead of
+probing and decoding files for every panel.
+
+Settings:
+    ARCHIFLOW_IMAGE_CACHE            "off" disables the generated-image cache
+    ARCHIFLOW_IMAGE_CACHE_DIR        cache location (default: ~/.archiflow/image_cache)
+    ARCHIFLOW_IMAGE_CACHE_MB         size limit in MB (default: 1024)
+    ARCHIFLOW_REFERENCE_MAX_SIDE     longest side of cached references in px (default: 1024, 0 keeps full size)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from PIL import Image
+
+from ..config.paths import get_global_archiflow_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_REFERENCE_MAX_SIDE = 1024
+
+# Session directories whose reference caches are kept in memory
+MAX_REFERENCE_CACHES = 16
+
+
+def image_digest(image: Image.Image) -> str:
+    """Hash of an image's pixels (and mode/size), independent of file format."""
+    digest = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(
+    provider: Any,
+    prompt: str,
+    ref_digests: Iterable[str] = (),
+    aspect_ratio: Optional[str] = None,
+    resolution: Optional[str] = None,
+    **extra: Any,
+) -> str:
+    """
+    Content address of an image generation request.
+
+    Args:
+        provider: Image provider (its provider and model names are part of the key)
+        prompt: Final prompt sent to the provider
+        ref_digests: ``image_digest`` of each reference image, in order
+        aspect_ratio: Requested aspect ratio
+        resolution: Requested resolution
+        **extra: Anything else that changes the output (e.g. the provider method)
+
+    Returns:
+        Hex SHA-256 key
+    """
+    request = {
+        "provider": str(getattr(provider, "provider_name", type(provider).__name__)),
+        "model": str(getattr(provider, "model_name", "")),
+        "prompt": prompt,
+        "refs": list(ref_digests),
+        "aspect_ratio": aspect_ratio,
+        "resolution": resolution,
+        "extra": extra,
+    }
+    payload = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """Thread-safe content-addressed image store with LRU eviction by bytes."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache, indexing any entries already on disk.
+
+        Args:
+            directory: Where cached images are stored
+            max_bytes: Total size above which the oldest entries are evicted
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._load_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return self._file_name(key) in self._index
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        """
+        Load a cached image.
+
+        Args:
+            key: Key from ``cache_key``
+
+        Returns:
+            The decoded image, or None on a miss
+        """
+        name = self._file_name(key)
+        path = self.directory / name
+        with self._lock:
+            if name not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(name)
+        try:
+            with Image.open(path) as stored:
+                image = stored.copy()
+            os.utime(path)
+        except OSError as e:
+            logger.debug(f"Dropping unreadable image cache entry {name}: {e}")
+            self._forget(name)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return image
+
+    def put(self, key: str, image: Image.Image) -> None:
+        """
+        Store an image (as PNG), evicting old entries if over the size limit.
+
+        Args:
+            key: Key from ``cache_key``
+            image: Generated image
+        """
+        name = self._file_name(key)
+        path = self.directory / name
+        tmp_path = path.with_name(f"{name}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Fast compression: entries are written far more often than
+            # they need to be small
+            image.save(tmp_path, "PNG", compress_level=1)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except (OSError, ValueError) as e:
+            logger.debug(f"Failed to cache generated image: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+
+        stale = []
+        with self._lock:
+            self._bytes -= self._index.pop(name, 0)
+            self._index[name] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._index) > 1:
+                old_name, old_size = self._index.popitem(last=False)
+                self._bytes -= old_size
+                stale.append(old_name)
+
+        for old_name in stale:
+            try:
+                (self.directory / old_name).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Delete every cached image."""
+        with self._lock:
+            names = list(self._index)
+            self._index.clear()
+            self._bytes = 0
+        for name in names:
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return f"{key}.png"
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            self._bytes -= self._index.pop(name, 0)
+
+    def _load_index(self) -> None:
+        try:
+            files = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")),
+                key=lambda e: e.stat().st_mtime,
+            )
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Image cache directory unreadable, starting empty: {e}")
+            return
+
+        for f in files:
+            size = f.stat().st_size
+            self._index[f.name] = size
+            self._bytes += size
+
+
+_image_cache: Optional[ImageCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """
+    Get the process-wide generated-image cache.
+
+    Returns:
+        The cache, or None when disabled with ``ARCHIFLOW_IMAGE_CACHE=off``
+    """
+    global _image_cache
+    if os.environ.get("ARCHIFLOW_IMAGE_CACHE", "").lower() in ("off", "0", "false", "no"):
+        return None
+    with _image_cache_lock:
+        if _image_cache is None:
+            directory = os.environ.get("ARCHIFLOW_IMAGE_CACHE_DIR") or get_global_archiflow_dir() / "image_cache"
+            max_bytes = DEFAULT_MAX_BYTES
+            configured = os.environ.get("ARCHIFLOW_IMAGE_CACHE_MB")
+            if configured:
+                try:
+                    max_bytes = int(float(configured) * 1024 * 1024)
+                except ValueError:
+                    logger.warning(f"Invalid ARCHIFLOW_IMAGE_CACHE_MB={configured!r}, using default")
+            _image_cache = ImageCache(directory, max_bytes=max_bytes)
+        return _image_cache
+
+
+@dataclass(frozen=True)
+class ReferenceImage:
+    """A decoded reference image and the digest used in cache keys."""
+
+    path: str
+    image: Image.Image
+    digest: str
+
+
+class ReferenceImageCache:
+    """
+    Decoded, downscaled reference images of one directory.
+
+    ``find`` resolves a file name through an index of the directory that
+    is rebuilt only when the directory's mtime changes. ``load`` returns
+    the cached image as long as the file's size and mtime are unchanged.
+    Loaded images are fully decoded, so they can be shared between
+    concurrent generations.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_side: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the reference images
+            max_side: Longest side to downscale to (default: ARCHIFLOW_REFERENCE_MAX_SIDE)
+        """
+        self.directory = str(directory)
+        if max_side is None:
+            max_side = DEFAULT_REFERENCE_MAX_SIDE
+            configured = os.environ.get("ARCHIFLOW_REFERENCE_MAX_SIDE")
+            if configured:
+                try:
+                    max_side = int(configured)
+                except ValueError:
+                    logger.warning(f"Invalid ARCHIFLOW_REFERENCE_MAX_SIDE={configured!r}, using default")
+        self.max_side = max_side
+        self._lock = threading.Lock()
+        self._files: Dict[str, str] = {}
+        self._files_mtime: Optional[int] = None
+        self._images: Dict[str, Tuple[Tuple[int, int], ReferenceImage]] = {}
+
+    def files(self) -> Dict[str, str]:
+        """Map of file name to path for every file in the directory."""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._files, self._files_mtime = {}, None
+            return {}
+        with self._lock:
+            if mtime != self._files_mtime:
+                try:
+                    self._files = {
+                        entry.name: entry.path for entry in os.scandir(self.directory) if entry.is_file()
+                    }
+                except OSError:
+                    self._files = {}
+                self._files_mtime = mtime
+            return self._files
+
+    def find(self, filename: str) -> Optional[str]:
+        """Path of ``filename`` in the directory, or None."""
+        return self.files().get(filename)
+
+    def load(self, path: str) -> Optional[ReferenceImage]:
+        """
+        Get a reference image, decoding it only if the file changed.
+
+        Args:
+            path: Image file (normally from ``find``)
+
+        Returns:
+            The reference, or None if the file cannot be read
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._images.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        try:
+            with Image.open(path) as stored:
+                if self.max_side:
+                    # JPEG references decode straight at a reduced size
+                    stored.draft("RGB", (self.max_side, self.max_side))
+                if stored.mode in ("RGB", "RGBA", "L"):
+                    image = stored.copy()
+                else:
+                    image = stored.convert("RGBA" if stored.mode in ("P", "LA", "PA") else "RGB")
+        except OSError as e:
+            logger.warning(f"Failed to load reference image {path}: {e}")
+            return None
+        if self.max_side and max(image.size) > self.max_side:
+            image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+
+        reference = ReferenceImage(path=path, image=image, digest=image_digest(image))
+        with self._lock:
+            self._images[path] = (signature, reference)
+        return reference
+
+    def put(self, path: str, image: Image.Image) -> Optional[ReferenceImage]:
+        """
+        Register an image just written to ``path`` without reading it back.
+
+        Args:
+            path: File the image was saved to
+            image: The saved image
+
+        Returns:
+            The cached reference, or None if the file does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if self.max_side and max(image.size) > self.max_side:
+            image = image.copy()
+            image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+        reference = ReferenceImage(path=path, image=image, digest=image_digest(image))
+        with self._lock:
+            self._images[path] = ((stat.st_mtime_ns, stat.st_size), reference)
+        return reference
+
+    def clear(self) -> None:
+        """Drop all decoded images and the directory index."""
+        with self._lock:
+            self._images.clear()
+            self._files, self._files_mtime = {}, None
+
+
+_reference_caches: "OrderedDict[str, ReferenceImageCache]" = OrderedDict()
+_reference_caches_lock = threading.Lock()
+
+
+def get_reference_cache(directory: Union[str, Path]) -> ReferenceImageCache:
+    """
+    Get the reference cache for a session's reference directory.
+
+    The most recently used ``MAX_REFERENCE_CACHES`` directories are kept.
+    """
+    key = os.path.abspath(directory)
+    with _reference_caches_lock:
+        cache = _reference_caches.get(key)
+        if cache is None:
+            cache = ReferenceImageCache(key)
+            _reference_caches[key] = cache
+            while len(_reference_caches) > MAX_REFERENCE_CACHES:
+                _reference_caches.popitem(last=False)
+        else:
+            _reference_caches.move_to_end(key)
+        return cache
@@ -6,6 +6,7 @@ It provides a consistent API for generating images regardless of the underlying
 """
 
 from abc import ABC, abstractmethod
+from functools import partial
 from typing import Optional, Dict, Any, AsyncGenerator, List
 from PIL import Image
 import logging
@@ -14,6 +15,10 @@ import logging
 class ImageProvider(ABC):
     """Abstract base class for all image providers."""
 
+    # Requests per minute allowed by the provider's API; None uses
+    # ARCHIFLOW_IMAGE_RPM (see llm.image_batch)
+    requests_per_minute: Optional[float] = None
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the image provider.
@@ -68,35 +73,61 @@ class ImageProvider(ABC):
         *,
         ref_images: Optional[list[Image.Image]] = None,
         aspect_ratio: str = "1:1",
-        resolution: str = "1K"
+        resolution: str = "1K",
+        concurrency: Optional[int] = None
     ) -> list[Image.Image]:
         """
         Generate multiple images from prompts.
 
-        Default implementation generates images sequentially.
-        Providers can override for parallel generation.
+        Calls run concurrently on worker threads through ImageBatchRunner,
+        sharing this provider's rate limit and retrying 429/5xx errors.
+        Images are returned in prompt order; prompts that fail are logged
+        and left out.
 
         Args:
             prompts: List of text descriptions
             ref_images: Optional list of reference images for all generations
             aspect_ratio: Image aspect ratio for all images
             resolution: Image resolution for all images
+            concurrency: Calls in flight (default: ARCHIFLOW_IMAGE_CONCURRENCY)
 
         Returns:
             List of generated images
         """
-        images = []
-        for prompt in prompts:
-            image = self.generate_image(
+        from .image_batch import ImageBatchRunner
+
+        runner = ImageBatchRunner(self, concurrency=concurrency)
+        jobs = [
+            partial(
+                runner.generate,
+                self.generate_image,
                 prompt=prompt,
                 ref_images=ref_images,
                 aspect_ratio=aspect_ratio,
                 resolution=resolution
             )
-            if image:
-                images.append(image)
+            for prompt in prompts
+        ]
+        images = []
+        for index, result in enumerate(await runner.run(jobs)):
+            if isinstance(result, Exception):
+                self.logger.error(f"Image {index + 1}/{len(prompts)} failed: {result}")
+            elif result:
+                images.append(result)
         return images
 
+    def set_reference(self, image: Image.Image) -> None:
+        """
+        Adopt an image as the style reference for subsequent slides.
+
+        Sets the state generate_first_slide() leaves behind, for a first
+        slide that was served from the image cache without calling the provider.
+
+        Args:
+            image: First slide image
+        """
+        self.reference_image = image
+
     @abstractmethod
     def validate_connection(self) -> bool:
         """
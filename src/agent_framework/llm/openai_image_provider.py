@@ -41,6 +41,9 @@ class OpenAIImageProvider(ImageProvider):
     - DALL-E 3: Optimized for creative image generation from text
     """
 
+    # Tier-1 images-per-minute quota; override with ARCHIFLOW_IMAGE_RPM
+    requests_per_minute = 5
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -112,7 +115,8 @@ class OpenAIImageProvider(ImageProvider):
         prompt: str,
         ref_images: Optional[List[Image.Image]] = None,
         aspect_ratio: str = "16:9",
-        resolution: str = "1024x1024"
+        resolution: str = "1024x1024",
+        slide_number: Optional[int] = None
     ) -> Optional[Image.Image]:
         """
         Generate image using OpenAI API (gpt-image-1.5 or DALL-E models)
@@ -122,6 +126,7 @@ class OpenAIImageProvider(ImageProvider):
             ref_images: Optional list of reference images (gpt-image-1.5 supports image references)
             aspect_ratio: Image aspect ratio (e.g., "16:9", "1:1", "9:16")
             resolution: Image resolution (e.g., "1024x1024", "1792x1024", "1024x1792")
+            slide_number: Position in the presentation, named in style-matched prompts
 
         Returns:
             Generated PIL Image object, or None if failed
@@ -132,7 +137,7 @@ class OpenAIImageProvider(ImageProvider):
                 return self._generate_with_gpt_image(prompt, ref_images, aspect_ratio, resolution)
             else:
                 # Fallback to DALL-E style generation for other models
-                return self._generate_with_dalle_style(prompt, ref_images, aspect_ratio, resolution)
+                return self._generate_with_dalle_style(prompt, ref_images, aspect_ratio, resolution, slide_number)
 
         except Exception as e:
             error_detail = f"Error generating image with OpenAI: {type(e).__name__}: {str(e)}"
@@ -209,13 +214,14 @@ class OpenAIImageProvider(ImageProvider):
         prompt: str,
         ref_images: Optional[List[Image.Image]],
         aspect_ratio: str,
-        resolution: str
+        resolution: str,
+        slide_number: Optional[int] = None
     ) -> Optional[Image.Image]:
         """
         Generate image using DALL-E style API (for backward compatibility).
         """
         # Enhanced prompt with style guidance if we have a reference
-        enhanced_prompt = self._enhance_prompt_with_reference(prompt, ref_images)
+        enhanced_prompt = self._enhance_prompt_with_reference(prompt, ref_images, slide_number)
 
         # Map aspect ratio to OpenAI size
         size = self._map_resolution_to_size(resolution, aspect_ratio)
@@ -255,15 +261,23 @@ class OpenAIImageProvider(ImageProvider):
     def _enhance_prompt_with_reference(
         self,
         prompt: str,
-        ref_images: Optional[List[Image.Image]] = None
+        ref_images: Optional[List[Image.Image]] = None,
+        slide_number: Optional[int] = None
     ) -> str:
         """
         Enhance the prompt with reference style information.
 
         Since DALL-E 3 doesn't directly accept image references, we enhance the prompt
-        with textual descriptions of the desired style.
+        with textual descriptions of the desired style. The slide number is
+        passed in rather than kept on the provider, since slides of one
+        presentation are generated concurrently.
         """
         if self.reference_description and (ref_images or self.reference_image):
+            if slide_number is not None:
+                position = f"This is slide #{slide_number} in a consistent presentation series"
+            else:
+                position = "This slide is part of a consistent presentation series"
+
             # We have a reference style to maintain
             enhanced = f"""
 Create a professional presentation slide image with the following exact style specifications:
@@ -277,10 +291,8 @@ CRITICAL REQUIREMENTS:
 - Maintain consistent composition approach and artistic treatment
 - Use identical design language and visual elements
 - Only change the subject matter as specified in CONTENT TO CREATE
-- This is slide #{getattr(self, '_slide_counter', 1)} in a consistent presentation series
+- {position}
 """
-            # Increment slide counter for tracking
-            self._slide_counter = getattr(self, '_slide_counter', 1) + 1
             return enhanced.strip()
 
         # No reference style, use standard presentation enhancement
@@ -436,10 +448,17 @@ This slide will define the visual style for all subsequent slides in the present
 
         if image:
             # Store as reference for all subsequent slides
-            self.reference_image = image
+            self.set_reference(image)
+            logger.info("First slide generated and stored as reference")
+
+        return image
+
+    def set_reference(self, image: Image.Image) -> None:
+        """Adopt an image as the style reference, with the matching style guide."""
+        self.reference_image = image
 
-            # Also store a textual description for style consistency
-            self.reference_description = """
+        # Also store a textual description for style consistency
+        self.reference_description = """
 VISUAL STYLE GUIDE:
 - Clean, modern business presentation aesthetic
 - Professional color palette with harmonious 2-3 color scheme
@@ -451,10 +470,6 @@ VISUAL STYLE GUIDE:
 - Consistent spacing and alignment
 - Professional, polished appearance
 """
-            self._slide_counter = 1
-            logger.info("First slide generated and stored as reference")
-
-        return image
 
     def generate_subsequent_slide(
         self,
@@ -485,9 +500,6 @@ VISUAL STYLE GUIDE:
                 resolution=resolution
             )
 
-        # Set the slide counter for the enhanced prompt
-        self._slide_counter = slide_number
-
         # Pass reference image to maintain consistency
         ref_images = [self.reference_image] if self.reference_image else None
 
@@ -495,7 +507,8 @@ VISUAL STYLE GUIDE:
             prompt=prompt,
             ref_images=ref_images,
             aspect_ratio=aspect_ratio,
-            resolution=resolution
+            resolution=resolution,
+            slide_number=slide_number
         )
 
         return image
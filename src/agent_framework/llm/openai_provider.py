@@ -1,8 +1,10 @@
 import os
 import logging
+from types import SimpleNamespace
 from typing import List, Dict, Any, Optional, Iterator
 from openai import OpenAI
 from .provider import LLMProvider, LLMResponse, LLMResponseChunk, FinishReason, ToolCallRequest
+from ..cancellation import CancellationToken, OperationCancelledError, current_token
 from ..config.env_loader import load_env
 
 # Optional: tiktoken for accurate token counting
@@ -17,6 +19,83 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_env()
 
+
+def create_cancellable_completion(
+    client: Any,
+    create_kwargs: Dict[str, Any],
+    token: CancellationToken,
+    include_usage: bool = True,
+) -> Any:
+    """
+    Run a chat completion as a stream that a cancellation token can abort.
+
+    Cancelling the token closes the stream, which closes the HTTP response,
+    so the server stops generating (and billing) mid-reply instead of the
+    turn waiting for the full response. The chunks are collected into an
+    object shaped like the non-streaming response, so callers parse it the
+    same way.
+
+    Args:
+        client: OpenAI-compatible client
+        create_kwargs: Arguments for chat.completions.create (without stream)
+        token: Token of the running turn
+        include_usage: Ask for token usage in the last chunk
+
+    Raises:
+        OperationCancelledError: If the token is cancelled
+    """
+    kwargs = dict(create_kwargs, stream=True)
+    if include_usage:
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
+    token.raise_if_cancelled()
+    stream = client.chat.completions.create(**kwargs)
+    unregister = token.on_cancel(stream.close)
+
+    content: List[str] = []
+    calls: Dict[int, Dict[str, Any]] = {}
+    finish_reason = None
+    usage = None
+    try:
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content.append(delta.content)
+            for tc in delta.tool_calls or []:
+                call = calls.setdefault(tc.index, {"id": None, "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+    except Exception:
+        if token.cancelled:
+            raise OperationCancelledError(token.reason or "cancelled") from None
+        raise
+    finally:
+        unregister()
+        stream.close()
+    # A stream closed between chunks can end without an error
+    token.raise_if_cancelled()
+
+    tool_calls = [
+        SimpleNamespace(id=call["id"], function=SimpleNamespace(name=call["name"], arguments=call["arguments"]))
+        for _, call in sorted(calls.items())
+    ]
+    message = SimpleNamespace(content="".join(content) or None, tool_calls=tool_calls or None)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM Provider with accurate token counting."""
 
@@ -74,8 +153,15 @@ class OpenAIProvider(LLMProvider):
         
         # Remove provider-specific args if they shouldn't be passed to create
         # (none for now, assuming kwargs are clean)
+        token = current_token()
         try:
-            response = self.client.chat.completions.create(**create_kwargs)
+            if token is None:
+                response = self.client.chat.completions.create(**create_kwargs)
+            else:
+                # Inside an agent turn: stream, so an interrupt can abort the call
+                response = create_cancellable_completion(self.client, create_kwargs, token)
+        except OperationCancelledError:
+            raise
         except Exception as e:
             print(f"LLM complete error: {e} \n kwargs: {create_kwargs}")
             raise e
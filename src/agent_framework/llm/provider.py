@@ -8,11 +8,16 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Iterator
 from enum import Enum
 import asyncio
+import contextvars
+import copy
+import functools
 import json
 import logging
 
 from .model_config import ModelRegistry, ModelConfig
 from .usage_tracker import UsageTracker
+from ..cancellation import current_token
+from ..tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -62,14 +67,70 @@ class LLMResponseChunk:
     finish_reason: Optional[FinishReason] = None
 
 
+def _traced_generate(generate):
+    """
+    Wrap a provider's generate() in an ``llm.generate`` span.
+
+    Also checks the current cancellation token before and after the call,
+    so an interrupted turn makes no further calls and drops the reply of
+    a provider that cannot abort mid-request.
+    """
+
+    @functools.wraps(generate)
+    def wrapper(self, *args, **kwargs):
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+        messages = args[0] if args else kwargs.get("messages")
+        with get_tracer().span(
+            "llm.generate",
+            provider=type(self).__name__,
+            model=getattr(self, "model", None),
+            messages=len(messages) if isinstance(messages, list) else None,
+        ) as span:
+            response = generate(self, *args, **kwargs)
+            if span is not None:
+                usage = getattr(response, "usage", None)
+                if isinstance(usage, dict):
+                    span.set_attributes(
+                        input_tokens=usage.get("prompt_tokens", usage.get("input_tokens", 0)),
+                        output_tokens=usage.get("completion_tokens", usage.get("output_tokens", 0)),
+                    )
+                finish_reason = getattr(response, "finish_reason", None)
+                if isinstance(finish_reason, FinishReason):
+                    span.set_attribute("finish_reason", finish_reason.value)
+                tool_calls = getattr(response, "tool_calls", None)
+                if isinstance(tool_calls, list):
+                    span.set_attribute("tool_calls", len(tool_calls))
+        if token is not None:
+            token.raise_if_cancelled()
+        return response
+
+    wrapper._traced = True
+    return wrapper
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every concrete generate() is traced, whichever agent calls it
+        generate = cls.__dict__.get("generate")
+        if (
+            generate is not None
+            and not getattr(generate, "__isabstractmethod__", False)
+            and not getattr(generate, "_traced", False)
+        ):
+            cls.generate = _traced_generate(generate)
+
     def __init__(self, model: str, usage_tracker: Optional[UsageTracker] = None, **kwargs):
         self.model = model
         self.config = kwargs
         self.model_config = ModelRegistry.get(model)
         self.usage_tracker = usage_tracker
+        # Session that usage is attributed to when a call does not name one
+        self.usage_session_id: Optional[str] = None
 
         logger.info(
             f"Initialized {self.__class__.__name__} with model={model}, "
@@ -77,6 +138,32 @@ class LLMProvider(ABC):
             f"usage_tracking={'enabled' if usage_tracker else 'disabled'}"
         )
     
+    def for_session(
+        self,
+        session_id: str,
+        usage_tracker: Optional[UsageTracker] = None,
+    ) -> "LLMProvider":
+        """
+        Get a copy of this provider that attributes usage to one session.
+
+        The copy shares this provider's SDK client (and its connection
+        pool), token encoders and model config, so a server can keep one
+        warm provider and hand each session a copy instead of building a
+        new client per session.
+
+        Args:
+            session_id: Session usage is attributed to
+            usage_tracker: Tracker for the copy (defaults to this provider's)
+
+        Returns:
+            Shallow copy of this provider
+        """
+        provider = copy.copy(self)
+        provider.usage_session_id = session_id
+        if usage_tracker is not None:
+            provider.usage_tracker = usage_tracker
+        return provider
+
     @abstractmethod
     def generate(
         self,
@@ -138,8 +225,10 @@ class LLMProvider(ABC):
             LLMResponse with content or tool calls
         """
         loop = asyncio.get_event_loop()
+        # Carry the trace context into the worker thread
+        context = contextvars.copy_context()
         return await loop.run_in_executor(
-            None, lambda: self.generate(messages, tools, **kwargs)
+            None, lambda: context.run(self.generate, messages, tools, **kwargs)
         )
 
     def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
@@ -199,7 +288,7 @@ class LLMProvider(ABC):
                 model_config=self.model_config,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
-                session_id=session_id
+                session_id=session_id or getattr(self, "usage_session_id", None)
             )
 
 
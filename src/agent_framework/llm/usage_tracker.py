@@ -2,8 +2,11 @@
 Token usage and cost tracking for LLM calls.
 """
 import logging
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 from datetime import datetime
 
 from .model_config import ModelConfig
@@ -28,20 +31,93 @@ class UsageRecord:
         return self.input_tokens + self.output_tokens
 
 
+@dataclass
+class UsageAggregate:
+    """Running totals for a group of LLM calls."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        """Total tokens (input + output)."""
+        return self.input_tokens + self.output_tokens
+
+    def add(self, input_tokens: int, output_tokens: int, cost: float, calls: int = 1) -> None:
+        """Add calls to the totals."""
+        self.calls += calls
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost += cost
+
+    def merge(self, other: "UsageAggregate") -> None:
+        """Add another aggregate's totals."""
+        self.add(other.input_tokens, other.output_tokens, other.cost, other.calls)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (the per-model format of get_summary())."""
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": self.cost,
+            "calls": self.calls,
+        }
+
+
+# (bucket start in epoch seconds, session_id, model)
+RollupKey = Tuple[int, Optional[str], str]
+
+
 class UsageTracker:
     """
     Tracks token usage and costs across LLM API calls.
 
+    Totals are kept as running aggregates overall, per model and per
+    (session, model), so summaries cost O(1) however many calls were
+    made. Only the most recent ``max_records`` raw records are kept.
+
+    With ``collect_rollups`` enabled the tracker also accumulates usage
+    per time bucket, session and model; a persistence layer drains these
+    with drain_rollups() (the web backend writes them to its database).
+
+    Thread-safe.
+
     Usage:
         tracker = UsageTracker()
         tracker.record(model_config, input_tokens=100, output_tokens=50)
         print(tracker.get_summary())
     """
 
-    def __init__(self):
-        """Initialize the usage tracker."""
-        self.records: List[UsageRecord] = []
-        self._totals_by_model: Dict[str, Dict[str, float]] = {}
+    DEFAULT_MAX_RECORDS = 1000
+
+    def __init__(
+        self,
+        max_records: Optional[int] = DEFAULT_MAX_RECORDS,
+        bucket_seconds: int = 60,
+        collect_rollups: bool = False,
+    ):
+        """
+        Initialize the usage tracker.
+
+        Args:
+            max_records: Raw records to keep (None keeps all)
+            bucket_seconds: Width of rollup time buckets
+            collect_rollups: Accumulate time-bucketed rollups for drain_rollups()
+        """
+        if bucket_seconds <= 0:
+            raise ValueError(f"bucket_seconds must be positive, got {bucket_seconds}")
+
+        self.records: Deque[UsageRecord] = deque(maxlen=max_records)
+        self.bucket_seconds = bucket_seconds
+        self.collect_rollups = collect_rollups
+
+        self._totals = UsageAggregate()
+        self._totals_by_model: Dict[str, UsageAggregate] = {}
+        self._by_session: Dict[str, Dict[str, UsageAggregate]] = {}
+        self._rollups: Dict[RollupKey, UsageAggregate] = {}
+        self._lock = threading.Lock()
 
     def record(
         self,
@@ -63,35 +139,33 @@ class UsageTracker:
             UsageRecord for this call
         """
         cost = model_config.calculate_cost(input_tokens, output_tokens)
+        model = model_config.model_name
 
         record = UsageRecord(
             timestamp=datetime.now(),
-            model=model_config.model_name,
+            model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             cost=cost,
             session_id=session_id
         )
 
-        self.records.append(record)
-
-        # Update totals
-        if model_config.model_name not in self._totals_by_model:
-            self._totals_by_model[model_config.model_name] = {
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cost": 0.0,
-                "calls": 0
-            }
+        with self._lock:
+            self.records.append(record)
 
-        totals = self._totals_by_model[model_config.model_name]
-        totals["input_tokens"] += input_tokens
-        totals["output_tokens"] += output_tokens
-        totals["cost"] += cost
-        totals["calls"] += 1
+            # Update totals
+            self._totals.add(input_tokens, output_tokens, cost)
+            self._totals_by_model.setdefault(model, UsageAggregate()).add(input_tokens, output_tokens, cost)
+            if session_id is not None:
+                session_models = self._by_session.setdefault(session_id, {})
+                session_models.setdefault(model, UsageAggregate()).add(input_tokens, output_tokens, cost)
+            if self.collect_rollups:
+                bucket = int(time.time() // self.bucket_seconds * self.bucket_seconds)
+                key = (bucket, session_id, model)
+                self._rollups.setdefault(key, UsageAggregate()).add(input_tokens, output_tokens, cost)
 
         logger.debug(
-            f"Usage recorded: {model_config.model_name} - "
+            f"Usage recorded: {model} - "
             f"in={input_tokens}, out={output_tokens}, cost=${cost:.4f}"
         )
 
@@ -104,18 +178,15 @@ class UsageTracker:
         Returns:
             Dictionary with usage statistics
         """
-        total_cost = sum(r.cost for r in self.records)
-        total_input_tokens = sum(r.input_tokens for r in self.records)
-        total_output_tokens = sum(r.output_tokens for r in self.records)
-
-        return {
-            "total_calls": len(self.records),
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "total_tokens": total_input_tokens + total_output_tokens,
-            "total_cost": total_cost,
-            "by_model": dict(self._totals_by_model)
-        }
+        with self._lock:
+            return {
+                "total_calls": self._totals.calls,
+                "total_input_tokens": self._totals.input_tokens,
+                "total_output_tokens": self._totals.output_tokens,
+                "total_tokens": self._totals.total_tokens,
+                "total_cost": self._totals.cost,
+                "by_model": {model: agg.to_dict() for model, agg in self._totals_by_model.items()},
+            }
 
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
         """
@@ -127,31 +198,45 @@ class UsageTracker:
         Returns:
             Dictionary with session statistics
         """
-        session_records = [r for r in self.records if r.session_id == session_id]
-
-        if not session_records:
-            return {
-                "session_id": session_id,
-                "total_calls": 0,
-                "total_input_tokens": 0,
-                "total_output_tokens": 0,
-                "total_tokens": 0,
-                "total_cost": 0.0
-            }
-
-        total_cost = sum(r.cost for r in session_records)
-        total_input = sum(r.input_tokens for r in session_records)
-        total_output = sum(r.output_tokens for r in session_records)
+        total = UsageAggregate()
+        with self._lock:
+            session_models = dict(self._by_session.get(session_id, {}))
+            for agg in session_models.values():
+                total.merge(agg)
+            by_model = {model: agg.to_dict() for model, agg in session_models.items()}
 
         return {
             "session_id": session_id,
-            "total_calls": len(session_records),
-            "total_input_tokens": total_input,
-            "total_output_tokens": total_output,
-            "total_tokens": total_input + total_output,
-            "total_cost": total_cost
+            "total_calls": total.calls,
+            "total_input_tokens": total.input_tokens,
+            "total_output_tokens": total.output_tokens,
+            "total_tokens": total.total_tokens,
+            "total_cost": total.cost,
+            "by_model": by_model,
         }
 
+    def forget_session(self, session_id: str) -> None:
+        """Drop a finished session's aggregates (overall totals are kept)."""
+        with self._lock:
+            self._by_session.pop(session_id, None)
+
+    def drain_rollups(self) -> Dict[RollupKey, UsageAggregate]:
+        """
+        Take the rollups accumulated since the last drain.
+
+        Returns:
+            Mapping of (bucket start epoch seconds, session_id, model) to totals
+        """
+        with self._lock:
+            rollups, self._rollups = self._rollups, {}
+        return rollups
+
+    def restore_rollups(self, rollups: Dict[RollupKey, UsageAggregate]) -> None:
+        """Put back drained rollups that could not be persisted."""
+        with self._lock:
+            for key, agg in rollups.items():
+                self._rollups.setdefault(key, UsageAggregate()).merge(agg)
+
     def print_summary(self):
         """Print a formatted summary of usage to the console."""
         summary = self.get_summary()
@@ -177,7 +262,24 @@ class UsageTracker:
         print("="*60 + "\n")
 
     def reset(self):
-        """Clear all usage records."""
-        self.records.clear()
-        self._totals_by_model.clear()
+        """Clear all usage records and totals."""
+        with self._lock:
+            self.records.clear()
+            self._totals = UsageAggregate()
+            self._totals_by_model.clear()
+            self._by_session.clear()
+            self._rollups.clear()
         logger.info("Usage tracker reset")
+
+
+_usage_tracker: Optional[UsageTracker] = None
+_usage_tracker_lock = threading.Lock()
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Get the process-wide UsageTracker shared by long-running services."""
+    global _usage_tracker
+    with _usage_tracker_lock:
+        if _usage_tracker is None:
+            _usage_tracker = UsageTracker()
+        return _usage_tracker
@@ -148,6 +148,10 @@ class HistoryManager:
         # Message formatter for converting to LLM format (Task 3.1)
         self._formatter = MessageFormatter()
 
+        # Optional durable log of history changes (memory.session_log.SessionLog);
+        # receives append/insert/clear records and rewritten() after compaction
+        self.journal = None
+
     @property
     def compaction_lock(self) -> asyncio.Lock:
         """Lazy initialization of compaction lock."""
@@ -161,29 +165,9 @@ class HistoryManager:
 
     def add(self, message: BaseMessage) -> None:
         """Add a message to history and trigger compaction if needed."""
-        self._messages.append(message)
-
-        # Apply message cleaners (Task 3.1.3: MessageCleaner)
-        if self.message_cleaners:
-            messages_before = len(self._messages)
-            for cleaner in self.message_cleaners:
-                self._messages = cleaner.clean(self._messages, self.retention_window)
-
-            # Invalidate caches if messages were removed
-            if len(self._messages) < messages_before:
-                self._cache_valid = False
-                self._llm_format_cache = None
-
-        # Invalidate LLM format cache (messages changed)
-        self._llm_format_cache = None
-
-        # Incremental token update (O(1) instead of O(n))
-        if self._cache_valid:
-            msg_tokens = self._count_message_tokens(message)
-            self._token_cache += msg_tokens
-        else:
-            # Cache was invalidated, will recalculate on next get_token_estimate()
-            pass
+        self._append(message)
+        if self.journal is not None:
+            self.journal.append(message)
 
         # Check compaction with proactive threshold
         current_tokens = self.get_token_estimate()
@@ -214,6 +198,53 @@ class HistoryManager:
             )
             self.compact()  # Block until complete in emergency
 
+    def _append(self, message: BaseMessage) -> None:
+        """Append a message and apply the message cleaners (no compaction)."""
+        self._messages.append(message)
+
+        # Apply message cleaners (Task 3.1.3: MessageCleaner)
+        if self.message_cleaners:
+            messages_before = len(self._messages)
+            for cleaner in self.message_cleaners:
+                self._messages = cleaner.clean(self._messages, self.retention_window)
+
+            # Invalidate caches if messages were removed
+            if len(self._messages) < messages_before:
+                self._cache_valid = False
+                self._llm_format_cache = None
+
+        # Invalidate LLM format cache (messages changed)
+        self._llm_format_cache = None
+
+        # Incremental token update (O(1) instead of O(n))
+        if self._cache_valid:
+            msg_tokens = self._count_message_tokens(message)
+            self._token_cache += msg_tokens
+
+    def replay(self, message: BaseMessage) -> None:
+        """
+        Re-apply a message recorded by the journal when resuming a session.
+
+        Runs the message cleaners like add() but never compacts or journals:
+        compaction results are restored from snapshots instead.
+        """
+        self._append(message)
+
+    def insert(self, position: int, message: BaseMessage) -> None:
+        """Insert a message at ``position`` (e.g. project context after the system prompt)."""
+        self._messages.insert(position, message)
+        self._cache_valid = False
+        self._llm_format_cache = None
+        if self.journal is not None:
+            self.journal.insert(position, message)
+
+    def restore(self, messages: list[BaseMessage]) -> None:
+        """Replace the history with saved messages (not journaled)."""
+        self._messages = list(messages)
+        self.summary_message = None
+        self._cache_valid = False
+        self._llm_format_cache = None
+
     def get_messages(self) -> list[BaseMessage]:
         """Get the current effective list of messages."""
         return self.messages
@@ -284,6 +315,9 @@ class HistoryManager:
         self._cache_valid = True
         self._llm_format_cache = None
 
+        if self.journal is not None:
+            self.journal.clear()
+
         logger.info("History cleared - all messages removed")
 
     def compact(self) -> None:
@@ -345,6 +379,10 @@ class HistoryManager:
         self._cache_valid = False
         self._llm_format_cache = None
 
+        # The summary cannot be replayed from the journal; snapshot instead
+        if self.journal is not None:
+            self.journal.rewritten()
+
         # Publish compaction complete notification (Task 2.5)
         messages_after = len(self._messages)
         tokens_after = self.get_token_estimate()
@@ -432,6 +470,10 @@ class HistoryManager:
             self._cache_valid = False
             self._llm_format_cache = None
 
+            # The summary cannot be replayed from the journal; snapshot instead
+            if self.journal is not None:
+                self.journal.rewritten()
+
             # Publish compaction complete notification (Task 2.5)
             messages_after = len(self._messages)
             tokens_after = self.get_token_estimate()
@@ -483,26 +525,9 @@ class HistoryManager:
         Args:
             message: Message to add to history
         """
-        self._messages.append(message)
-
-        # Apply message cleaners (Task 3.1.3: MessageCleaner)
-        if self.message_cleaners:
-            messages_before = len(self._messages)
-            for cleaner in self.message_cleaners:
-                self._messages = cleaner.clean(self._messages, self.retention_window)
-
-            # Invalidate caches if messages were removed
-            if len(self._messages) < messages_before:
-                self._cache_valid = False
-                self._llm_format_cache = None
-
-        # Invalidate LLM format cache (messages changed)
-        self._llm_format_cache = None
-
-        # Incremental token update (O(1) instead of O(n))
-        if self._cache_valid:
-            msg_tokens = self._count_message_tokens(message)
-            self._token_cache += msg_tokens
+        self._append(message)
+        if self.journal is not None:
+            self.journal.append(message)
 
         # Check compaction with proactive threshold
         current_tokens = self.get_token_estimate()
@@ -138,44 +138,21 @@ class TODOCleaner(MessageCleaner):
             List of indices for TODO tool calls and results
         """
         todo_indices = []
+        # IDs of todo_write calls seen so far; a result is TODO-related if
+        # an earlier message made the call it answers
+        todo_call_ids: Set[str] = set()
 
         for i, msg in enumerate(messages):
-            if self._is_todo_related_message(msg, messages, i):
+            if isinstance(msg, ToolCallMessage):
+                ids = [tc.id for tc in msg.tool_calls if tc.tool_name == "todo_write"]
+                if ids:
+                    todo_call_ids.update(ids)
+                    todo_indices.append(i)
+            elif isinstance(msg, ToolResultObservation) and msg.call_id in todo_call_ids:
                 todo_indices.append(i)
 
         return todo_indices
 
-    def _is_todo_related_message(
-        self,
-        msg: BaseMessage,
-        messages: List[BaseMessage],
-        idx: int
-    ) -> bool:
-        """Check if a message is related to TODO (either a tool_call or tool_result).
-
-        Args:
-            msg: Message to check
-            messages: Full message list (for searching backwards)
-            idx: Index of the message in the list
-
-        Returns:
-            True if the message is a todo_write call or its result
-        """
-        # Check if it's a ToolCallMessage with todo_write
-        if isinstance(msg, ToolCallMessage):
-            return any(tc.tool_name == "todo_write" for tc in msg.tool_calls)
-
-        # Check if it's a ToolResultObservation for a todo_write call
-        if isinstance(msg, ToolResultObservation):
-            # Search backwards for the corresponding tool_call
-            for i in range(idx - 1, -1, -1):
-                if isinstance(messages[i], ToolCallMessage):
-                    for tc in messages[i].tool_calls:
-                        if tc.id == msg.call_id and tc.tool_name == "todo_write":
-                            return True
-
-        return False
-
 
 class DuplicateCleaner(MessageCleaner):
     """Removes duplicate messages from history.
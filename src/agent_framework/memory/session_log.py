@@ -0,0 +1,573 @@
+"""
+Durable, resumable agent sessions.
+
+An agent's working state - its HistoryManager messages, EnvironmentTracker
+and sequence counter - otherwise lives only in memory, so a restarted CLI
+or web worker loses the whole session. SessionLog keeps it on disk:
+
+- Every change to the history is appended to a per-session log as soon as
+  it happens, one record per message, in the message queue's append-only
+  segment format (see message_queue.storage.aol.LogRecord: magic byte,
+  CRC32, length, type, timestamp, payload). Payloads are the messages'
+  to_dict() JSON.
+- Every ``snapshot_every`` records, and whenever the history is rewritten
+  (compaction replaces the middle with an LLM summary, which cannot be
+  replayed), the whole state is written to snapshot.json and the segments
+  it covers are deleted.
+
+Loading reads the snapshot and replays only the records written after it,
+so resuming costs O(snapshot + tail) however long the session has run.
+
+Layout:
+    <root>/<session_id>/meta.json      # agent type and creation options
+    <root>/<session_id>/snapshot.json  # state up to the start of segment N
+    <root>/<session_id>/000N.log       # records since the snapshot
+
+Usage:
+    store = get_session_store()
+    log = store.open(agent.session_id)
+    restored = attach_session_log(agent, log, {"agent_type": "coding"})
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from message_queue.storage.aol import LogRecord
+
+from ..config.paths import get_global_archiflow_dir
+from ..messages.types import BaseMessage, ProjectContextMessage, deserialize_message
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Record types
+RECORD_APPEND = 0
+RECORD_INSERT = 1
+RECORD_CLEAR = 2
+
+# Records between snapshots (ARCHIFLOW_SESSION_SNAPSHOT_EVERY)
+DEFAULT_SNAPSHOT_EVERY = 200
+
+# A segment this large also triggers a snapshot
+DEFAULT_SEGMENT_SIZE_BYTES = 8 * 1024 * 1024
+
+# Days an untouched session is kept (ARCHIFLOW_SESSION_RETENTION_DAYS, 0 = forever)
+DEFAULT_RETENTION_DAYS = 30
+
+_SESSION_ID_PATTERN = re.compile(r"[\w.-]+")
+
+# (record type, insert position, message)
+TailRecord = Tuple[int, Optional[int], Optional[BaseMessage]]
+
+
+def snapshot_interval() -> int:
+    """Records between snapshots: ``ARCHIFLOW_SESSION_SNAPSHOT_EVERY`` (default 200)."""
+    configured = os.environ.get("ARCHIFLOW_SESSION_SNAPSHOT_EVERY")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning(f"Invalid ARCHIFLOW_SESSION_SNAPSHOT_EVERY={configured!r}, using default")
+    return DEFAULT_SNAPSHOT_EVERY
+
+
+def retention_days() -> float:
+    """Days an untouched session is kept: ``ARCHIFLOW_SESSION_RETENTION_DAYS`` (default 30, 0 = forever)."""
+    configured = os.environ.get("ARCHIFLOW_SESSION_RETENTION_DAYS")
+    if configured:
+        try:
+            return max(0.0, float(configured))
+        except ValueError:
+            logger.warning(f"Invalid ARCHIFLOW_SESSION_RETENTION_DAYS={configured!r}, using default")
+    return DEFAULT_RETENTION_DAYS
+
+
+@dataclass
+class SessionState:
+    """A session as loaded from disk: the last snapshot plus the records after it."""
+
+    messages: List[BaseMessage] = field(default_factory=list)
+    """History messages at the time of the snapshot."""
+
+    sequence_counter: int = 0
+    tracker: Dict[str, Any] = field(default_factory=dict)
+    """EnvironmentTracker.to_dict() at the time of the snapshot."""
+
+    tail: List[TailRecord] = field(default_factory=list)
+    """History changes made after the snapshot, in order."""
+
+    saved_at: float = 0.0
+
+
+class SessionLog:
+    """
+    Append-only history log and snapshots of one agent session.
+
+    Writes never raise: a failing disk is logged and the agent carries on
+    with its in-memory state.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    META_FILE = "meta.json"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        snapshot_every: Optional[int] = None,
+        segment_size_bytes: int = DEFAULT_SEGMENT_SIZE_BYTES,
+    ):
+        """
+        Args:
+            directory: Session directory (created on first write)
+            snapshot_every: Records between snapshots (default: snapshot_interval())
+            segment_size_bytes: Segment size that also triggers a snapshot
+        """
+        self.directory = Path(directory)
+        self.snapshot_every = snapshot_every or snapshot_interval()
+        self.segment_size_bytes = segment_size_bytes
+
+        self.capture: Optional[Callable[[], Dict[str, Any]]] = None
+        """Returns the state to snapshot (set by attach_session_log)."""
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._segment: Optional[int] = None
+        self._valid_end: Optional[int] = None
+        self._records_since_snapshot = 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """Whether anything has been saved for this session."""
+        return (self.directory / self.SNAPSHOT_FILE).exists() or bool(self._segments())
+
+    def metadata(self) -> Dict[str, Any]:
+        """Agent type and creation options saved with set_metadata()."""
+        try:
+            return json.loads((self.directory / self.META_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def load(self) -> Optional[SessionState]:
+        """
+        Read the snapshot and the records after it.
+
+        A torn record at the end of the log (the process died mid-write)
+        ends the replay; the next write overwrites it.
+
+        Returns:
+            SessionState, or None if nothing was saved
+        """
+        with self._lock:
+            snapshot = self._read_snapshot()
+            segments = self._segments()
+            if snapshot is None and not segments:
+                self._segment, self._valid_end = 0, 0
+                return None
+
+            state = SessionState()
+            start = 0
+            if snapshot is not None:
+                start = snapshot.get("segment", 0)
+                state.messages = [deserialize_message(data) for data in snapshot.get("messages", [])]
+                state.sequence_counter = snapshot.get("sequence_counter", 0)
+                state.tracker = snapshot.get("tracker", {})
+                state.saved_at = snapshot.get("saved_at", 0.0)
+
+            tail_segments = [segment for segment in segments if segment >= start]
+            for segment in tail_segments:
+                records, valid_end = self._read_segment(segment)
+                state.tail.extend(records)
+                self._segment, self._valid_end = segment, valid_end
+            if not tail_segments:
+                self._segment, self._valid_end = start, 0
+
+            self._records_since_snapshot = len(state.tail)
+            return state
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        path = self.directory / self.SNAPSHOT_FILE
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.error(f"Unreadable session snapshot {path}: {e}")
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring session snapshot {path} with version {snapshot.get('version')}")
+            return None
+        return snapshot
+
+    def _read_segment(self, segment: int) -> Tuple[List[TailRecord], int]:
+        """Decode one segment; returns its records and the end of the last whole record."""
+        records: List[TailRecord] = []
+        path = self._segment_path(segment)
+        with open(path, "rb") as f:
+            while True:
+                offset = f.tell()
+                try:
+                    header = LogRecord.read_header(f)
+                except ValueError as e:
+                    logger.warning(f"Corrupt session log {path} at offset {offset}: {e}")
+                    return records, offset
+                if header is None:
+                    return records, offset
+
+                crc, length, record_type, _ = header
+                payload = f.read(length)
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    logger.warning(f"Torn record in session log {path} at offset {offset}; replay stops here")
+                    return records, offset
+
+                try:
+                    body = json.loads(payload)
+                    message = deserialize_message(body["message"]) if "message" in body else None
+                except (ValueError, KeyError, TypeError) as e:
+                    # The record is intact but its message can no longer be
+                    # read (e.g. a message type that was since removed)
+                    logger.warning(f"Skipping unreadable record in session log {path} at offset {offset}: {e}")
+                    continue
+                records.append((record_type, body.get("position"), message))
+
+    def _segments(self) -> List[int]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[:-4]) for name in names if name.endswith(".log") and name[:-4].isdigit())
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:04d}.log"
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def set_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Save how the agent was created, so it can be created again to resume."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _write_json(self.directory / self.META_FILE, metadata)
+        except OSError as e:
+            logger.error(f"Could not save session metadata in {self.directory}: {e}")
+
+    def append(self, message: BaseMessage) -> None:
+        """Record a message added to the history."""
+        self._write(RECORD_APPEND, {"message": message.to_dict()})
+
+    def insert(self, position: int, message: BaseMessage) -> None:
+        """Record a message inserted into the history."""
+        self._write(RECORD_INSERT, {"position": position, "message": message.to_dict()})
+
+    def clear(self) -> None:
+        """Record that the history was cleared."""
+        self._write(RECORD_CLEAR, {})
+
+    def rewritten(self) -> None:
+        """The history was rewritten in a way records cannot express; snapshot it."""
+        self.snapshot()
+
+    def _write(self, record_type: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, default=str).encode("utf-8")
+        with self._lock:
+            try:
+                f = self._open_segment()
+                f.write(LogRecord.serialize(record_type, payload))
+                f.flush()
+            except OSError as e:
+                logger.error(f"Could not append to session log in {self.directory}: {e}")
+                return
+            self._records_since_snapshot += 1
+            due = (
+                self._records_since_snapshot >= self.snapshot_every
+                or f.tell() >= self.segment_size_bytes
+            )
+        if due and self.capture is not None:
+            self.snapshot()
+
+    def _open_segment(self):
+        if self._file is None:
+            if self._segment is None:
+                self.load()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._segment_path(self._segment)
+            self._file = open(path, "r+b" if path.exists() else "w+b")
+            # Drop a torn record left by a crash
+            self._file.truncate(self._valid_end or 0)
+            self._file.seek(0, os.SEEK_END)
+        return self._file
+
+    def snapshot(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Write the whole session state and drop the segments it covers.
+
+        Args:
+            state: State to save (default: from ``capture``); a dict with
+                ``messages`` (BaseMessage list), ``sequence_counter`` and ``tracker``
+        """
+        if state is None:
+            if self.capture is None:
+                return
+            state = self.capture()
+
+        with self._lock:
+            try:
+                if self._segment is None:
+                    self.load()
+                self.directory.mkdir(parents=True, exist_ok=True)
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+
+                # Records from here on go to a new segment; the snapshot
+                # covers everything before it
+                segment = self._segment + 1
+                self._segment, self._valid_end = segment, 0
+                self._open_segment()
+
+                _write_json(self.directory / self.SNAPSHOT_FILE, {
+                    "version": SNAPSHOT_VERSION,
+                    "segment": segment,
+                    "saved_at": time.time(),
+                    "messages": [message.to_dict() for message in state.get("messages", [])],
+                    "sequence_counter": state.get("sequence_counter", 0),
+                    "tracker": state.get("tracker", {}),
+                })
+                self._records_since_snapshot = 0
+
+                for old in self._segments():
+                    if old < segment:
+                        self._segment_path(old).unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Could not snapshot session in {self.directory}: {e}")
+
+    def close(self) -> None:
+        """Close the open segment."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def delete(self) -> None:
+        """Close the log and remove everything saved for the session."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON atomically (temp file + rename)."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Agent integration
+# ---------------------------------------------------------------------------
+
+def capture_agent_state(agent: Any) -> Dict[str, Any]:
+    """Everything needed to resume ``agent``: history, tracker and sequence counter."""
+    return {
+        "messages": list(agent.history.get_messages()),
+        "sequence_counter": getattr(agent, "sequence_counter", 0),
+        "tracker": agent.tracker.to_dict() if getattr(agent, "tracker", None) else {},
+    }
+
+
+def restore_agent_state(agent: Any, state: SessionState) -> None:
+    """
+    Put a loaded session back into a freshly created agent.
+
+    The snapshot replaces the agent's history; the tail is replayed through
+    the history (so message cleaners run as they did originally) without
+    triggering compaction.
+    """
+    history = agent.history
+    history.restore(state.messages)
+    if getattr(agent, "tracker", None) is not None and state.tracker:
+        agent.tracker.load_dict(state.tracker)
+
+    sequence = state.sequence_counter
+    for record_type, position, message in state.tail:
+        if record_type == RECORD_APPEND:
+            history.replay(message)
+            if hasattr(agent, "_track_tool_result"):
+                agent._track_tool_result(message)
+        elif record_type == RECORD_INSERT:
+            history.insert(position, message)
+        elif record_type == RECORD_CLEAR:
+            history.clear()
+        if message is not None:
+            sequence = max(sequence, message.sequence + 1)
+
+    if hasattr(agent, "sequence_counter"):
+        agent.sequence_counter = max(agent.sequence_counter, sequence)
+    if any(isinstance(message, ProjectContextMessage) for message in history.get_messages()):
+        agent._context_injected = True
+
+
+def attach_session_log(
+    agent: Any,
+    log: SessionLog,
+    metadata: Optional[Dict[str, Any]] = None,
+    resume: bool = True,
+) -> bool:
+    """
+    Make ``agent`` durable, resuming it from ``log`` if the session was saved before.
+
+    Args:
+        agent: Agent with a ``history`` (HistoryManager)
+        log: The session's log
+        metadata: How the agent was created (saved for new sessions)
+        resume: Restore earlier state; when False the session must be new
+
+    Returns:
+        True if earlier state was restored
+
+    Raises:
+        ValueError: If ``resume`` is False and the session was saved before
+    """
+    if not resume and log.exists():
+        raise ValueError(f"Session {log.directory.name!r} already exists")
+
+    state = log.load()
+    if state is not None:
+        restore_agent_state(agent, state)
+        logger.info(
+            f"Resumed session from {log.directory}: {len(state.messages)} snapshot messages, "
+            f"{len(state.tail)} replayed records"
+        )
+
+    log.capture = lambda: capture_agent_state(agent)
+    if state is None:
+        if metadata:
+            log.set_metadata(metadata)
+        # The constructor may already have added messages (e.g. a system prompt)
+        log.snapshot()
+
+    agent.history.journal = log
+    agent.session_log = log
+    return state is not None
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class SessionStore:
+    """Directory of session logs, one subdirectory per session ID."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _directory(self, session_id: str) -> Path:
+        if not _SESSION_ID_PATTERN.fullmatch(session_id) or session_id in (".", ".."):
+            raise ValueError(f"Invalid session ID for the session store: {session_id!r}")
+        return self.root / session_id
+
+    def open(self, session_id: str) -> SessionLog:
+        """Log of one session (nothing is written until the agent changes)."""
+        return SessionLog(self._directory(session_id))
+
+    def exists(self, session_id: str) -> bool:
+        """Whether the session has saved state."""
+        return self.open(session_id).exists()
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session's saved state."""
+        shutil.rmtree(self._directory(session_id), ignore_errors=True)
+
+    def prune(self, max_age_days: float) -> int:
+        """
+        Remove sessions unchanged for more than ``max_age_days``.
+
+        Returns:
+            Number of sessions removed
+        """
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if entry.is_dir() and _updated_at(entry.path) < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"Pruned {removed} sessions older than {max_age_days:g} days from {self.root}")
+        return removed
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Saved sessions, most recently changed first, with their metadata."""
+        sessions = []
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            log = SessionLog(entry.path)
+            if not log.exists():
+                continue
+            sessions.append({
+                "session_id": entry.name,
+                "updated_at": _updated_at(entry.path),
+                **log.metadata(),
+            })
+        sessions.sort(key=lambda session: session["updated_at"], reverse=True)
+        return sessions
+
+
+def _updated_at(directory: Union[str, Path]) -> float:
+    """Last change to a session directory: the newest mtime of its files."""
+    try:
+        return max((p.stat().st_mtime for p in Path(directory).iterdir()), default=os.stat(directory).st_mtime)
+    except OSError:
+        return time.time()
+
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """
+    Get the process-wide session store.
+
+    Reads ``ARCHIFLOW_SESSION_STORE_DIR`` (default ~/.archiflow/agent_sessions).
+    Sessions older than retention_days() are pruned when the store is first opened.
+
+    Returns:
+        The store, or None when disabled with ``ARCHIFLOW_SESSION_STORE=off``
+    """
+    global _session_store
+    if os.environ.get("ARCHIFLOW_SESSION_STORE", "").lower() in ("off", "0", "false", "no"):
+        return None
+    with _session_store_lock:
+        if _session_store is None:
+            root = os.environ.get("ARCHIFLOW_SESSION_STORE_DIR") or get_global_archiflow_dir() / "agent_sessions"
+            _session_store = SessionStore(root)
+            max_age = retention_days()
+            if max_age:
+                _session_store.prune(max_age)
+        return _session_store
@@ -51,6 +51,15 @@ class EnvironmentTracker:
             # Ideally we'd use an OrderedDict or list for LRU
             self.recent_files.pop()
             
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the tracked state (for session snapshots)."""
+        return {"cwd": self.cwd, "recent_files": sorted(self.recent_files)}
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Restore state saved with to_dict()."""
+        self.cwd = data.get("cwd", self.cwd)
+        self.recent_files = set(data.get("recent_files", []))
+
     def get_summary(self) -> str:
         """Get a formatted summary of the environment state."""
         summary = [
@@ -3,6 +3,7 @@ Runtime system for executing tools in different environments.
 
 This package provides a pluggable runtime system that supports:
 - Local execution (current process or subprocess)
+- Process-pool execution for CPU-heavy tools
 - Sandbox execution (with workspace isolation)
 - MCP server integration
 - Remote execution (distributed workers)
@@ -21,6 +22,8 @@ from .exceptions import (
 from .security import SecurityPolicy
 from .manager import RuntimeManager
 from .local import LocalRuntime
+from .process_pool import ProcessPoolRuntime, ProcessPoolConfig, SharedPayload
+from .result_processor import ResultPostProcessor, ResultProcessorConfig
 
 # New sandbox components
 from .sandbox import SandboxRuntime, SandboxConfig, SandboxMode
@@ -42,10 +45,16 @@ __all__ = [
     "SecurityPolicy",
     # Runtimes
     "LocalRuntime",
+    "ProcessPoolRuntime",
+    "ProcessPoolConfig",
+    "SharedPayload",
     "SandboxRuntime",
     "SessionRuntimeManager",
     # Managers
     "RuntimeManager",
+    # Result post-processing
+    "ResultPostProcessor",
+    "ResultProcessorConfig",
     # Config
     "SandboxConfig",
     "SandboxMode",
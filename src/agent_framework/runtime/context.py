@@ -8,6 +8,18 @@ metadata and constraints for tool execution.
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+# Key in ExecutionContext.metadata holding a callable(str) that streams
+# live output (progress) from the running tool to the client
+OUTPUT_CALLBACK_KEY = "on_output"
+
+# Key in ExecutionContext.metadata holding the CancellationToken of the
+# agent turn that requested the tool call
+CANCEL_TOKEN_KEY = "cancel_token"
+
+# Key in ExecutionContext.metadata holding the RuntimeExecutor running the
+# call, for tools that start agents on the same broker (sub-agent fan-out)
+RUNTIME_EXECUTOR_KEY = "runtime_executor"
+
 
 @dataclass
 class ExecutionContext:
@@ -9,7 +9,7 @@ import asyncio
 import logging
 import time
 import uuid
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from message_queue.broker import MessageBroker
 from message_queue.message import Message
@@ -17,11 +17,16 @@ from message_queue.message import Message
 # Special logger for tool results
 tool_result_logger = logging.getLogger("tool_results")
 
-from agent_framework.runtime.context import ExecutionContext
+from agent_framework.cancellation import get_cancellation_registry
+from agent_framework.runtime.context import (
+    CANCEL_TOKEN_KEY, OUTPUT_CALLBACK_KEY, RUNTIME_EXECUTOR_KEY, ExecutionContext,
+)
 from agent_framework.runtime.exceptions import ToolNotFoundError
 from agent_framework.runtime.manager import RuntimeManager
 from agent_framework.runtime.messages import ToolCallRequest, ToolCallResult
 from agent_framework.runtime.result import ToolResult
+from agent_framework.runtime.result_processor import ResultPostProcessor
+from agent_framework.runtime.session_manager import SessionRuntimeManager
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +45,7 @@ class RuntimeExecutor:
         runtime_manager: RuntimeManager,
         tool_registry: Optional["ToolRegistry"] = None,
         context: Optional["TopicContext"] = None,
+        result_processor: Optional[ResultPostProcessor] = None,
     ):
         """
         Initialize the runtime executor.
@@ -49,11 +55,14 @@ class RuntimeExecutor:
             runtime_manager: Runtime manager for tool execution
             tool_registry: Optional tool registry for tool lookup
             context: Optional topic context for agent communication
+            result_processor: Post-processor that keeps oversized results
+                within the token budget (default config if None)
         """
         self.broker = broker
         self.runtime_manager = runtime_manager
         self.tool_registry = tool_registry
         self.context = context
+        self.result_processor = result_processor or ResultPostProcessor()
         self._running = False
         
         logger.info("RuntimeExecutor initialized")
@@ -90,6 +99,22 @@ class RuntimeExecutor:
         self._running = False
         logger.info("RuntimeExecutor stopped")
     
+    def _progress_callback(self, request: ToolCallRequest) -> Callable[[str], None]:
+        """Build the callback tools use (via report_progress) to stream progress to the client."""
+        def on_output(data: str) -> None:
+            self.broker.publish(self.context.client_topic, {
+                "type": "ToolProgress",
+                "tool_name": request.tool_name,
+                "call_id": request.call_id,
+                "session_id": request.session_id,
+                "content": str(data),
+            })
+        return on_output
+
+    def _cancel_token(self, request: ToolCallRequest):
+        """Token of the agent turn that requested the call (cancelled by an interrupt)."""
+        return get_cancellation_registry().token(request.session_id)
+
     async def _on_tool_call_request(self, message: Message) -> None:
         """
         Handle incoming tool call request (Single or Batch).
@@ -134,6 +159,9 @@ class RuntimeExecutor:
             
             # Parse execution context
             context = ExecutionContext(**request.context)
+            context.metadata.setdefault(OUTPUT_CALLBACK_KEY, self._progress_callback(request))
+            context.metadata.setdefault(CANCEL_TOKEN_KEY, self._cancel_token(request))
+            context.metadata.setdefault(RUNTIME_EXECUTOR_KEY, self)
             
             # Execute via runtime manager
             start_time = time.time()
@@ -156,6 +184,15 @@ class RuntimeExecutor:
                     execution_time=time.time() - start_time
                 )
             
+            # Keep oversized output out of the conversation (spilled to an artifact)
+            content = self.result_processor.process(
+                tool_result.output if tool_result.success else f"Error: {tool_result.error}",
+                tool_name=request.tool_name,
+                call_id=request.call_id,
+                session_id=request.session_id,
+                working_directory=context.working_directory,
+            )
+
             # Publish result
             # Use ToolResultObservation directly for agent topics
             from agent_framework.messages.types import ToolResultObservation
@@ -164,7 +201,7 @@ class RuntimeExecutor:
                 session_id=request.session_id,
                 sequence=0,
                 call_id=request.call_id,
-                content=tool_result.output if tool_result.success else f"Error: {tool_result.error}",
+                content=content,
                 status="success" if tool_result.success else "error"
             )
             
@@ -176,7 +213,7 @@ class RuntimeExecutor:
                 "type": "ToolResult",
                 "tool_name": request.tool_name,
                 "session_id": request.session_id,
-                "result": tool_result.output if tool_result.success else f"Error: {tool_result.error}",
+                "result": content,
                 "status": "success" if tool_result.success else "error"
             }
 
@@ -193,17 +230,17 @@ class RuntimeExecutor:
             )
 
             # Log a preview of the result
-            result_preview = (tool_result.output if tool_result.success else tool_result.error)[:100]
+            result_preview = (content or "")[:100]
             logger.debug(f"ToolResult preview: {result_preview}...")
 
-            # Detailed log to dedicated tool result logger
+            # Detailed log to dedicated tool result logger (post-processed, so bounded)
             tool_result_logger.info(
                 "=== SINGLE TOOL RESULT ===\n"
                 f"Tool: {request.tool_name}\n"
                 f"Call ID: {request.call_id}\n"
                 f"Success: {tool_result.success}\n"
                 f"Result Length: {len(tool_result.output if tool_result.success else tool_result.error)}\n"
-                f"Result: {tool_result.output if tool_result.success else tool_result.error}\n"
+                f"Result: {content}\n"
                 "=========================="
             )
 
@@ -248,6 +285,11 @@ class RuntimeExecutor:
             
             # For now, we assume all tools are independent and run them in parallel
             # Future: Build DAG for dependencies
+
+            # Vet every sandboxed path in the batch before anything runs
+            violations = {}
+            if isinstance(self.runtime_manager, SessionRuntimeManager):
+                violations = self.runtime_manager.validate_batch(request)
             
             async def execute_single(tool_req: ToolCallRequest):
                 tool = self._get_tool(tool_req.tool_name)
@@ -261,15 +303,34 @@ class RuntimeExecutor:
                         content=f"Error: Tool not found: {tool_req.tool_name}",
                         status="error"
                     )
+
+                if tool_req.call_id in violations:
+                    return ToolResultObservation(
+                        session_id=tool_req.session_id,
+                        sequence=0,
+                        call_id=tool_req.call_id,
+                        content=f"Error: Execution failed: {violations[tool_req.call_id]}",
+                        status="error"
+                    )
                 
                 context = ExecutionContext(**tool_req.context)
+                context.metadata.setdefault(OUTPUT_CALLBACK_KEY, self._progress_callback(tool_req))
+                context.metadata.setdefault(CANCEL_TOKEN_KEY, self._cancel_token(tool_req))
+                context.metadata.setdefault(RUNTIME_EXECUTOR_KEY, self)
                 try:
                     res = await self.runtime_manager.execute_tool(tool, tool_req.parameters, context)
+                    content = self.result_processor.process(
+                        res.output if res.success else f"Error: {res.error}",
+                        tool_name=tool_req.tool_name,
+                        call_id=tool_req.call_id,
+                        session_id=tool_req.session_id,
+                        working_directory=context.working_directory,
+                    )
                     return ToolResultObservation(
                         session_id=tool_req.session_id,
                         sequence=0,
                         call_id=tool_req.call_id,
-                        content=res.output if res.success else f"Error: {res.error}",
+                        content=content,
                         status="success" if res.success else "error"
                     )
                 except Exception as e:
@@ -10,10 +10,11 @@ import asyncio
 import logging
 import psutil
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Dict, Optional
 
+from agent_framework.cancellation import CancellationToken, OperationCancelledError
 from agent_framework.runtime.base import ToolRuntime
-from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.context import CANCEL_TOKEN_KEY, ExecutionContext
 from agent_framework.runtime.exceptions import (
     ExecutionError,
     ResourceLimitError,
@@ -31,6 +32,7 @@ class LocalRuntime(ToolRuntime):
     Features:
     - Direct tool invocation (async or sync)
     - Timeout enforcement
+    - Cancellation (the turn's token in context.metadata abandons the call)
     - Memory monitoring
     - Execution time tracking
     - Resource limit enforcement
@@ -98,9 +100,12 @@ class LocalRuntime(ToolRuntime):
             )
         
         try:
-            # Execute with timeout
+            # Execute with timeout, abandoning the call if the turn is cancelled
             result = await asyncio.wait_for(
-                self._execute_tool(tool, params, context),
+                self._run_cancellable(
+                    self._execute_tool(tool, params, context),
+                    context.metadata.get(CANCEL_TOKEN_KEY),
+                ),
                 timeout=context.timeout
             )
             
@@ -129,6 +134,22 @@ class LocalRuntime(ToolRuntime):
             
             raise RuntimeTimeoutError(error_msg, timeout=context.timeout)
             
+        except OperationCancelledError as e:
+            execution_time = time.time() - start_time
+            logger.info(
+                "Tool '%s' cancelled after %.3fs: %s",
+                tool_name,
+                execution_time,
+                e.reason
+            )
+
+            return ToolResult.error_result(
+                error=f"Tool '{tool_name}' was cancelled: {e.reason}",
+                execution_time=execution_time,
+                runtime="local",
+                exception_type=type(e).__name__
+            )
+
         except ResourceLimitError:
             # Re-raise resource limit errors
             raise
@@ -155,6 +176,38 @@ class LocalRuntime(ToolRuntime):
                 except asyncio.CancelledError:
                     pass
     
+    async def _run_cancellable(
+        self,
+        coro: Awaitable[Any],
+        token: Optional[CancellationToken],
+    ) -> Any:
+        """
+        Await a tool call, cancelling it when the token is cancelled.
+
+        Tools that block in a subprocess watch the token themselves and
+        kill the process, so the call stops instead of running on unseen.
+
+        Raises:
+            OperationCancelledError: If the token is cancelled
+        """
+        if token is None:
+            return await coro
+        if token.cancelled:
+            coro.close()
+            token.raise_if_cancelled()
+
+        task = asyncio.ensure_future(coro)
+        loop = asyncio.get_running_loop()
+        unregister = token.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if token.cancelled:
+                raise OperationCancelledError(token.reason or "cancelled") from None
+            raise
+        finally:
+            unregister()
+
     async def _execute_tool(
         self,
         tool: "BaseTool",
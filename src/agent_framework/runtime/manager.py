@@ -19,6 +19,7 @@ from agent_framework.runtime.exceptions import (
 )
 from agent_framework.runtime.result import ToolResult
 from agent_framework.runtime.security import SecurityPolicy
+from agent_framework.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -136,12 +137,20 @@ class RuntimeManager:
         
         # Execute
         try:
-            result = await runtime.execute(tool, params, context)
+            with get_tracer().span(
+                "tool.execute",
+                tool=tool_name,
+                runtime=self.last_runtime_used,
+                session_id=context.session_id,
+            ) as span:
+                result = await runtime.execute(tool, params, context)
+                if span is not None:
+                    span.set_attribute("success", result.success)
             
             # Add runtime metadata
             result.metadata['runtime'] = self.last_runtime_used
             
-            logger.info(
+            logger.debug(
                 "Tool '%s' execution %s in %.3fs",
                 tool_name,
                 "succeeded" if result.success else "failed",
@@ -7,8 +7,16 @@ allowing the agent to discover and execute tools from external MCP-compliant ser
 
 from agent_framework.runtime.mcp.runtime import MCPRuntime
 from agent_framework.runtime.mcp.config import MCPServerConfig
+from agent_framework.runtime.mcp.client import (
+    MCPClient,
+    MCPConnectionError,
+    MCPProtocolError,
+)
 
 __all__ = [
     "MCPRuntime",
     "MCPServerConfig",
+    "MCPClient",
+    "MCPConnectionError",
+    "MCPProtocolError",
 ]
@@ -0,0 +1,301 @@
+"""
+JSON-RPC client for MCP servers over stdio.
+
+Implements the MCP stdio transport: newline-delimited JSON-RPC 2.0
+messages on the server process's stdin/stdout. Every request carries an
+ID and is resolved by a background reader task, so any number of requests
+can be in flight concurrently on one connection. Server notifications are
+dispatched to registered handlers.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from agent_framework.runtime.exceptions import RuntimeException
+
+logger = logging.getLogger(__name__)
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "archiflow", "version": "0.1.0"}
+
+# Per-line limit for the stdout reader; tool results can be large
+STREAM_LIMIT = 16 * 1024 * 1024
+
+NotificationHandler = Callable[[Dict[str, Any]], Optional[Awaitable[None]]]
+
+
+class MCPConnectionError(RuntimeException):
+    """Raised when the connection to an MCP server is lost or unusable."""
+
+
+class MCPProtocolError(RuntimeException):
+    """Raised when an MCP server returns a JSON-RPC error response."""
+
+    def __init__(self, message: str, code: int = 0, data: Any = None):
+        """
+        Initialize protocol error.
+
+        Args:
+            message: Error message from the server
+            code: JSON-RPC error code
+            data: Optional error data
+        """
+        self.code = code
+        self.data = data
+        super().__init__(f"MCP error {code}: {message}")
+
+
+class MCPClient:
+    """
+    Pipelined JSON-RPC client bound to one server process.
+
+    Usage:
+        client = MCPClient("filesystem", process)
+        await client.start()
+        tools = await client.request("tools/list")
+        await client.close()
+    """
+
+    def __init__(self, server_name: str, process: asyncio.subprocess.Process):
+        """
+        Initialize the client.
+
+        Args:
+            server_name: Name of the server (for logging)
+            process: Server process with piped stdin/stdout/stderr
+        """
+        self.server_name = server_name
+        self.process = process
+        self.server_info: Dict[str, Any] = {}
+        self.server_capabilities: Dict[str, Any] = {}
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._notification_handlers: Dict[str, NotificationHandler] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection is open and the process is alive."""
+        return (
+            not self._closed
+            and self._reader_task is not None
+            and not self._reader_task.done()
+            and self.process.returncode is None
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._pending)
+
+    def on_notification(self, method: str, handler: NotificationHandler) -> None:
+        """Register a handler for a server notification method."""
+        self._notification_handlers[method] = handler
+
+    async def start(self, timeout: float = 30.0) -> None:
+        """
+        Start the reader and perform the MCP initialize handshake.
+
+        Args:
+            timeout: Handshake timeout in seconds
+
+        Raises:
+            MCPConnectionError: If the server does not complete the handshake
+        """
+        self._reader_task = asyncio.create_task(self._read_loop())
+        if self.process.stderr is not None:
+            self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+        result = await self.request(
+            "initialize",
+            {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO,
+            },
+            timeout=timeout,
+        )
+        self.server_info = result.get("serverInfo", {})
+        self.server_capabilities = result.get("capabilities", {})
+        await self.notify("notifications/initialized")
+
+        logger.info(
+            f"MCP handshake complete for {self.server_name}: "
+            f"{self.server_info.get('name', 'unknown')} "
+            f"(protocol {result.get('protocolVersion', 'unknown')})"
+        )
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        On timeout or cancellation the server is sent a cancellation
+        notification; other in-flight requests are unaffected.
+
+        Args:
+            method: JSON-RPC method
+            params: Method parameters
+            timeout: Optional timeout in seconds
+
+        Returns:
+            The response's result object
+
+        Raises:
+            MCPConnectionError: If the connection is closed
+            MCPProtocolError: If the server returns an error
+            asyncio.TimeoutError: If the timeout expires
+        """
+        if self._closed:
+            raise MCPConnectionError(f"Connection to {self.server_name} is closed")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(future, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if self.is_connected:
+                try:
+                    await self.notify(
+                        "notifications/cancelled",
+                        {"requestId": request_id, "reason": "client timeout or cancellation"},
+                    )
+                except MCPConnectionError:
+                    pass
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def close(self) -> None:
+        """Close the connection and fail any pending requests."""
+        self._closed = True
+        if self.process.stdin is not None and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._fail_pending(MCPConnectionError(f"Connection to {self.server_name} closed"))
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        stdin = self.process.stdin
+        if stdin is None or stdin.is_closing():
+            raise MCPConnectionError(f"Connection to {self.server_name} is closed")
+
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        async with self._write_lock:
+            try:
+                stdin.write(data)
+                await stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise MCPConnectionError(
+                    f"Failed to write to {self.server_name}: {e}"
+                ) from e
+
+    async def _read_loop(self) -> None:
+        stdout = self.process.stdout
+        try:
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.debug(f"[{self.server_name}] ignoring non-JSON output: {line[:200]!r}")
+                    continue
+                await self._dispatch(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"MCP reader for {self.server_name} failed: {e}", exc_info=True)
+        finally:
+            self._fail_pending(
+                MCPConnectionError(f"MCP server {self.server_name} closed the connection")
+            )
+
+    async def _dispatch(self, message: Dict[str, Any]) -> None:
+        if "id" in message and ("result" in message or "error" in message):
+            future = self._pending.get(message["id"])
+            if future is None or future.done():
+                return
+            if "error" in message:
+                error = message["error"] or {}
+                future.set_exception(MCPProtocolError(
+                    error.get("message", "Unknown error"),
+                    code=error.get("code", 0),
+                    data=error.get("data"),
+                ))
+            else:
+                future.set_result(message.get("result") or {})
+            return
+
+        if "id" in message and "method" in message:
+            # Server-initiated requests (sampling, roots) are not supported
+            await self._send({
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Method not found: {message['method']}"},
+            })
+            return
+
+        handler = self._notification_handlers.get(message.get("method", ""))
+        if handler is not None:
+            try:
+                outcome = handler(message.get("params") or {})
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+            except Exception as e:
+                logger.error(
+                    f"Notification handler for {message.get('method')} failed: {e}",
+                    exc_info=True,
+                )
+
+    async def _drain_stderr(self) -> None:
+        """Keep the stderr pipe from filling up and log server diagnostics."""
+        try:
+            while True:
+                line = await self.process.stderr.readline()
+                if not line:
+                    break
+                logger.debug(f"[{self.server_name} stderr] {line.decode(errors='replace').rstrip()}")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
@@ -8,16 +8,21 @@ external MCP servers to discover and execute tools.
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from agent_framework.runtime.base import ToolRuntime
 from agent_framework.runtime.context import ExecutionContext
 from agent_framework.runtime.exceptions import ExecutionError
 from agent_framework.runtime.mcp.adapter import MCPToolAdapter, MCPToolRegistry
+from agent_framework.runtime.mcp.client import MCPConnectionError
 from agent_framework.runtime.mcp.config import MCPServerConfig
 from agent_framework.runtime.mcp.server_manager import MCPServerManager
 from agent_framework.runtime.result import ToolResult
 
+if TYPE_CHECKING:
+    from agent_framework.runtime.mcp.server_manager import MCPSession
+    from agent_framework.tools.tool_base import BaseTool
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +34,8 @@ class MCPRuntime(ToolRuntime):
     - Automatic tool discovery from MCP servers
     - Tool execution via MCP protocol
     - Server lifecycle management
-    - Retry logic with server restart
+    - Concurrent (pipelined) tool calls per server connection
+    - Automatic server restart with warm reconnection
     - Tool registry for discovered tools
     """
     
@@ -44,7 +50,8 @@ class MCPRuntime(ToolRuntime):
         
         Args:
             server_configs: List of MCP server configurations
-            retry_attempts: Number of retry attempts on failure
+            retry_attempts: Attempts for tool discovery (tools/list) on
+                connection loss; tools/call is never retried
             retry_delay: Delay between retries in seconds
         """
         self.server_configs = server_configs
@@ -99,24 +106,18 @@ class MCPRuntime(ToolRuntime):
         for server_name, session in self.server_manager.sessions.items():
             try:
                 # List available tools
-                tools_result = await session.list_tools()
+                tools_result = await self._list_tools(session)
                 
                 logger.info(
                     f"Discovering tools from server: {server_name}"
                 )
                 
-                for tool_info in tools_result.tools:
-                    # Create tool adapter
-                    adapter = MCPToolAdapter(
-                        server_name=server_name,
-                        tool_name=tool_info.name,
-                        description=tool_info.description,
-                        input_schema=tool_info.inputSchema,
-                        session=session
-                    )
-                    
-                    # Register tool
-                    self.tool_registry.register(adapter)
+                self._register_tools(server_name, session, tools_result.tools)
+                
+                # Re-discover when the server announces a changed tool list
+                session.on_tools_changed = (
+                    lambda name=server_name, s=session: self._refresh_server_tools(name, s)
+                )
                 
                 logger.info(
                     f"Discovered {len(tools_result.tools)} tool(s) from {server_name}"
@@ -128,6 +129,51 @@ class MCPRuntime(ToolRuntime):
                     exc_info=True
                 )
     
+    def _register_tools(self, server_name: str, session: "MCPSession", tools: List[Any]) -> None:
+        """Create and register adapters for a server's tools."""
+        for tool_info in tools:
+            adapter = MCPToolAdapter(
+                server_name=server_name,
+                tool_name=tool_info.name,
+                description=tool_info.description,
+                input_schema=tool_info.inputSchema,
+                session=session
+            )
+            self.tool_registry.register(adapter)
+    
+    async def _refresh_server_tools(self, server_name: str, session: "MCPSession") -> None:
+        """Replace a server's registered tools after tools/list_changed."""
+        try:
+            tools_result = await self._list_tools(session, refresh=True)
+        except Exception as e:
+            logger.error(f"Failed to refresh tools from {server_name}: {e}")
+            return
+        
+        self.tool_registry.unregister_server_tools(server_name)
+        self._register_tools(server_name, session, tools_result.tools)
+        logger.info(f"Refreshed {len(tools_result.tools)} tool(s) from {server_name}")
+    
+    async def _list_tools(self, session: "MCPSession", refresh: bool = False) -> Any:
+        """
+        List a server's tools, retrying on connection loss.
+        
+        tools/list (and the initialize handshake the session redoes when it
+        respawns the server) is idempotent, so it is safe to retry.
+        """
+        for attempt in range(self.retry_attempts):
+            try:
+                return await session.list_tools(refresh=refresh)
+            except MCPConnectionError as e:
+                if attempt == self.retry_attempts - 1:
+                    raise
+                logger.warning(
+                    f"tools/list on {session.server_name} lost its connection: {e} "
+                    f"(attempt {attempt + 1}/{self.retry_attempts})"
+                )
+                # First retry reconnects immediately; back off if the server keeps dying
+                if attempt > 0:
+                    await asyncio.sleep(self.retry_delay * (2 ** (attempt - 1)))
+    
     async def execute(
         self,
         tool: "BaseTool",
@@ -161,80 +207,58 @@ class MCPRuntime(ToolRuntime):
             f"Executing MCP tool '{tool_name}' from server '{tool.server_name}'"
         )
         
-        # Execute with retry logic
-        for attempt in range(self.retry_attempts):
-            try:
-                start_time = time.time()
-                
-                # Execute via MCP with timeout
-                result = await asyncio.wait_for(
-                    tool.execute_mcp(params),
-                    timeout=context.timeout
-                )
-                
-                execution_time = time.time() - start_time
-                
-                # Convert to ToolResult
-                tool_result = ToolResult(
-                    success=not result.isError,
-                    output=result.content[0].text if result.content else "",
-                    error=result.content[0].text if result.isError else None,
-                    execution_time=execution_time,
-                    metadata={
-                        'runtime': 'mcp',
-                        'mcp_server': tool.server_name,
-                        'mcp_tool': tool._mcp_tool_name,
-                        'attempt': attempt + 1
-                    }
-                )
-                
-                logger.info(
-                    f"MCP tool '{tool_name}' completed in {execution_time:.3f}s "
-                    f"(attempt {attempt + 1}/{self.retry_attempts})"
-                )
-                
-                return tool_result
-                
-            except asyncio.TimeoutError:
-                error_msg = (
-                    f"MCP tool '{tool_name}' timed out after {context.timeout}s "
-                    f"(attempt {attempt + 1}/{self.retry_attempts})"
-                )
-                logger.warning(error_msg)
-                
-                if attempt < self.retry_attempts - 1:
-                    # Try restarting the server
-                    try:
-                        await self.server_manager.restart_server(tool.server_name)
-                        await asyncio.sleep(self.retry_delay)
-                    except Exception as e:
-                        logger.error(f"Failed to restart server: {e}")
-                else:
-                    return ToolResult.error_result(
-                        error=error_msg,
-                        runtime="mcp"
-                    )
-                    
-            except Exception as e:
-                error_msg = f"MCP tool '{tool_name}' failed: {str(e)}"
-                logger.error(
-                    f"{error_msg} (attempt {attempt + 1}/{self.retry_attempts})",
-                    exc_info=True
-                )
-                
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (2 ** attempt))
-                else:
-                    return ToolResult.error_result(
-                        error=error_msg,
-                        runtime="mcp",
-                        exception_type=type(e).__name__
-                    )
+        # Requests are pipelined on the server's connection, so a timeout only
+        # abandons this call. A lost connection is not retried: tools/call is
+        # not idempotent and the server may already have acted on it. The
+        # session respawns the server on the next request (warm reconnection).
+        start_time = time.time()
+        try:
+            result = await asyncio.wait_for(
+                tool.execute_mcp(params),
+                timeout=context.timeout
+            )
+            
+        except asyncio.TimeoutError:
+            error_msg = f"MCP tool '{tool_name}' timed out after {context.timeout}s"
+            logger.warning(error_msg)
+            return ToolResult.error_result(
+                error=error_msg,
+                runtime="mcp"
+            )
+            
+        except MCPConnectionError as e:
+            error_msg = f"MCP tool '{tool_name}' lost its server connection: {str(e)}"
+            logger.warning(error_msg)
+            return ToolResult.error_result(
+                error=error_msg,
+                runtime="mcp",
+                exception_type=type(e).__name__
+            )
+            
+        except Exception as e:
+            error_msg = f"MCP tool '{tool_name}' failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return ToolResult.error_result(
+                error=error_msg,
+                runtime="mcp",
+                exception_type=type(e).__name__
+            )
+        
+        execution_time = time.time() - start_time
+        
+        logger.info(f"MCP tool '{tool_name}' completed in {execution_time:.3f}s")
         
-        # Should not reach here
-        return ToolResult.error_result(
-            error=f"MCP tool '{tool_name}' failed after {self.retry_attempts} attempts",
-            runtime="mcp"
+        return ToolResult(
+            success=not result.isError,
+            output=result.content[0].text if result.content else "",
+            error=(result.content[0].text if result.content else "Unknown MCP error")
+            if result.isError else None,
+            execution_time=execution_time,
+            metadata={
+                'runtime': 'mcp',
+                'mcp_server': tool.server_name,
+                'mcp_tool': tool._mcp_tool_name,
+            }
         )
     
     async def health_check(self) -> bool:
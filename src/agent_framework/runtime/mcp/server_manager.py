@@ -2,18 +2,19 @@
 MCP server manager for lifecycle management.
 
 This module provides the MCPServerManager class that handles starting,
-stopping, and managing connections to MCP servers.
-
-Note: This is a simplified implementation that doesn't require the actual
-MCP SDK. For production use, integrate with the official MCP Python SDK.
+stopping, and managing connections to MCP servers, and MCPSession, which
+speaks the MCP protocol to one server over stdio via MCPClient.
 """
 
 import asyncio
+import json
 import logging
+import os
 from contextlib import AsyncExitStack
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
 
 from agent_framework.runtime.exceptions import RuntimeInitializationError
+from agent_framework.runtime.mcp.client import STREAM_LIMIT, MCPClient, MCPConnectionError
 from agent_framework.runtime.mcp.config import MCPServerConfig
 
 logger = logging.getLogger(__name__)
@@ -24,7 +25,7 @@ class MCPServerManager:
     Manages MCP server connections and lifecycle.
     
     Handles starting/stopping MCP servers and maintaining connections.
-    This is a simplified implementation for demonstration purposes.
+    Sessions respawn their server process on demand if it dies.
     """
     
     def __init__(self):
@@ -68,19 +69,40 @@ class MCPServerManager:
     
     async def _start_stdio_server(self, config: MCPServerConfig) -> None:
         """
-        Start server using stdio transport.
-        
-        This is a simplified implementation that starts the process
-        but doesn't establish full MCP protocol communication.
-        For production, use the official MCP SDK.
+        Start server using stdio transport and complete the MCP handshake.
         
         Args:
             config: Server configuration
         """
-        # Build environment
-        env = {**config.env}
+        async def spawn() -> asyncio.subprocess.Process:
+            return await self._spawn_process(config)
+
+        process = await spawn()
+        session = MCPSession(config.name, process, spawn=spawn)
+        try:
+            await session.connect()
+        except Exception:
+            await session.close()
+            await self._terminate(process)
+            self.processes.pop(config.name, None)
+            raise
+
+        self.sessions[config.name] = session
+        logger.info(f"Started stdio server process for {config.name} (PID: {process.pid})")
+
+    async def _spawn_process(self, config: MCPServerConfig) -> asyncio.subprocess.Process:
+        """
+        Spawn the server process for a config and track it.
         
-        # Start the server process
+        Args:
+            config: Server configuration
+            
+        Returns:
+            The started process
+        """
+        # Server env extends ours so PATH etc. are still available
+        env = {**os.environ, **config.env}
+
         try:
             process = await asyncio.create_subprocess_exec(
                 config.command,
@@ -88,23 +110,34 @@ class MCPServerManager:
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env=env if env else None
+                env=env,
+                limit=STREAM_LIMIT,
             )
-            
-            self.processes[config.name] = process
-            
-            # Create a mock session for demonstration
-            # In production, this would use the MCP SDK's ClientSession
-            session = MCPSession(config.name, process)
-            self.sessions[config.name] = session
-            
-            logger.info(f"Started stdio server process for {config.name} (PID: {process.pid})")
-            
         except FileNotFoundError as e:
             raise RuntimeInitializationError(
                 f"Command not found: {config.command}. "
                 f"Make sure the MCP server is installed."
             ) from e
+
+        previous = self.processes.get(config.name)
+        if previous is not None and previous is not process:
+            await self._terminate(previous)
+        self.processes[config.name] = process
+        return process
+
+    @staticmethod
+    async def _terminate(process: asyncio.subprocess.Process) -> None:
+        """Terminate a server process, killing it if it does not exit."""
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
     
     async def stop_server(self, server_name: str) -> None:
         """
@@ -121,14 +154,7 @@ class MCPServerManager:
         
         # Terminate process
         if server_name in self.processes:
-            process = self.processes[server_name]
-            try:
-                process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=5.0)
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-            del self.processes[server_name]
+            await self._terminate(self.processes.pop(server_name))
         
         # Clean up exit stack
         if server_name in self.exit_stacks:
@@ -190,68 +216,177 @@ class MCPServerManager:
 
 class MCPSession:
     """
-    Mock MCP session for demonstration.
+    MCP protocol session with one server.
     
-    In production, this would be replaced with the official MCP SDK's
-    ClientSession class.
+    Wraps an MCPClient over the server's stdio. Many call_tool requests can
+    be in flight concurrently on the one connection. The tool list is cached
+    until the server sends notifications/tools/list_changed. If the server
+    process dies and a spawn function was provided, the next request
+    transparently respawns it and redoes the handshake; the session object,
+    the tool adapters pointing at it and the cached tool list all survive
+    (warm reconnection).
     """
     
-    def __init__(self, server_name: str, process: asyncio.subprocess.Process):
+    def __init__(
+        self,
+        server_name: str,
+        process: asyncio.subprocess.Process,
+        spawn: Optional[Callable[[], Awaitable[asyncio.subprocess.Process]]] = None,
+    ):
         """
         Initialize session.
         
         Args:
             server_name: Name of the server
             process: Server process
+            spawn: Optional coroutine function starting a replacement process
         """
         self.server_name = server_name
         self.process = process
         self.tools: Dict[str, "MCPToolInfo"] = {}
+        self.client: Optional[MCPClient] = None
+        self.restarts = 0
+        self.on_tools_changed: Optional[Callable[[], Awaitable[None]]] = None
+        self._spawn = spawn
+        self._tools_cached = False
+        self._reconnect_lock = asyncio.Lock()
+        # Strong references to running on_tools_changed tasks
+        self._background_tasks: Set[asyncio.Task] = set()
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether the session has a live connection."""
+        return self.client is not None and self.client.is_connected
+    
+    async def connect(self) -> None:
+        """Open the protocol connection on the current process."""
+        client = MCPClient(self.server_name, self.process)
+        client.on_notification("notifications/tools/list_changed", self._handle_tools_changed)
+        await client.start()
+        self.client = client
+    
+    async def _ensure_connected(self) -> MCPClient:
+        """Return a live client, respawning the server if it died."""
+        if self.is_connected:
+            return self.client
+
+        async with self._reconnect_lock:
+            if self.is_connected:
+                return self.client
+            if self._spawn is None:
+                raise MCPConnectionError(f"MCP server {self.server_name} is not connected")
+
+            if self.client is not None:
+                await self.client.close()
+            logger.warning(f"MCP server {self.server_name} is down, restarting")
+            self.process = await self._spawn()
+            self.restarts += 1
+            await self.connect()
+            return self.client
+    
+    async def _handle_tools_changed(self, params: Dict[str, Any]) -> None:
+        """Invalidate the cached tool list and notify the owner."""
+        logger.info(f"Tool list changed on MCP server {self.server_name}")
+        self._tools_cached = False
+        if self.on_tools_changed is not None:
+            # Run outside the reader task: the callback issues requests itself
+            task = asyncio.create_task(self.on_tools_changed())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._on_background_task_done)
+    
+    def _on_background_task_done(self, task: asyncio.Task) -> None:
+        """Drop a finished background task and log its failure, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"tools/list_changed handler failed for {self.server_name}",
+                exc_info=task.exception(),
+            )
     
-    async def list_tools(self) -> "ToolsListResult":
+    async def list_tools(self, refresh: bool = False) -> "ToolsListResult":
         """
         List available tools from the server.
         
-        This is a mock implementation. In production, this would
-        use the MCP protocol to query available tools.
-        
+        Args:
+            refresh: Bypass the cached list
+            
         Returns:
             ToolsListResult with available tools
         """
-        # Mock implementation - return empty list
-        # In production, this would communicate with the server
-        return ToolsListResult(tools=[])
+        if self._tools_cached and not refresh:
+            return ToolsListResult(tools=list(self.tools.values()))
+
+        client = await self._ensure_connected()
+        tools: Dict[str, MCPToolInfo] = {}
+        cursor = None
+        while True:
+            result = await client.request("tools/list", {"cursor": cursor} if cursor else None)
+            for item in result.get("tools", []):
+                tools[item["name"]] = MCPToolInfo(
+                    name=item["name"],
+                    description=item.get("description", ""),
+                    inputSchema=item.get("inputSchema", {}),
+                )
+            cursor = result.get("nextCursor")
+            if not cursor:
+                break
+
+        self.tools = tools
+        self._tools_cached = True
+        return ToolsListResult(tools=list(tools.values()))
     
-    async def call_tool(self, name: str, arguments: dict) -> "CallToolResult":
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict,
+        timeout: Optional[float] = None,
+    ) -> "CallToolResult":
         """
         Call a tool on the server.
         
-        This is a mock implementation. In production, this would
-        use the MCP protocol to execute the tool.
-        
         Args:
             name: Tool name
             arguments: Tool arguments
+            timeout: Optional timeout in seconds
             
         Returns:
             CallToolResult with execution result
         """
-        # Mock implementation
+        client = await self._ensure_connected()
+        result = await client.request(
+            "tools/call",
+            {"name": name, "arguments": arguments},
+            timeout=timeout,
+        )
         return CallToolResult(
-            content=[TextContent(text=f"Mock result for {name}")],
-            isError=False
+            content=[_to_text_content(item) for item in result.get("content", [])],
+            isError=bool(result.get("isError", False)),
         )
     
     async def close(self) -> None:
         """Close the session."""
         logger.debug(f"Closing session for {self.server_name}")
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self.client is not None:
+            await self.client.close()
+
+
+def _to_text_content(item: Dict[str, Any]) -> "TextContent":
+    """Convert an MCP content item to TextContent."""
+    if item.get("type") == "text":
+        return TextContent(text=item.get("text", ""))
+    if item.get("type") == "resource" and "text" in item.get("resource", {}):
+        return TextContent(text=item["resource"]["text"])
+    if item.get("type") == "image":
+        return TextContent(text=f"[image: {item.get('mimeType', 'unknown')}]")
+    return TextContent(text=json.dumps(item))
 
 
-# Mock MCP protocol types for demonstration
-# In production, these would come from the MCP SDK
+# MCP protocol types (the subset of the MCP SDK types used by the runtime)
 
 class MCPToolInfo:
-    """Mock tool info."""
+    """Tool description from tools/list."""
     def __init__(self, name: str, description: str, inputSchema: dict):
         self.name = name
         self.description = description
@@ -259,19 +394,19 @@ class MCPToolInfo:
 
 
 class ToolsListResult:
-    """Mock tools list result."""
+    """Result of tools/list."""
     def __init__(self, tools: list):
         self.tools = tools
 
 
 class TextContent:
-    """Mock text content."""
+    """Text content item of a tool result."""
     def __init__(self, text: str):
         self.text = text
 
 
 class CallToolResult:
-    """Mock call tool result."""
+    """Result of tools/call."""
     def __init__(self, content: list, isError: bool):
         self.content = content
         self.isError = isError
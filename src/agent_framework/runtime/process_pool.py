@@ -0,0 +1,672 @@
+"""
+Process-pool runtime for CPU-heavy tools.
+
+LocalRuntime runs sync tools on threads, so image compositing, notebook
+parsing and large diffs hold the GIL and stall the event loop serving
+everything else. ProcessPoolRuntime runs selected tools in warm worker
+processes instead:
+
+- Workers are started once (optionally preloading heavy modules) and reused
+  for many calls, then recycled after ``max_tasks_per_worker`` calls.
+- Each call runs under per-call rlimits: RLIMIT_AS bounds the memory the
+  call may allocate on top of the worker's baseline, RLIMIT_CPU bounds the
+  CPU seconds it may burn. A breach surfaces as ResourceLimitError and the
+  worker is replaced.
+- Large bytes results are handed back through shared memory rather than
+  being pickled through the pipe. The parent maps the segment and exposes
+  it as a SharedPayload (zero-copy memoryview) in the result metadata.
+- Progress a tool reports through the context's output callback is sent
+  back over the pipe while the call runs and passed to the caller's
+  callback.
+
+Tools are routed here via SecurityPolicy.tool_runtime_map, e.g.
+``{"render_diagram": "process_pool"}`` with the runtime registered as
+``"process_pool"`` in RuntimeManager.
+"""
+
+import asyncio
+import copy
+import dataclasses
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from agent_framework.runtime.base import ToolRuntime
+from agent_framework.runtime.context import (
+    CANCEL_TOKEN_KEY, OUTPUT_CALLBACK_KEY, RUNTIME_EXECUTOR_KEY, ExecutionContext,
+)
+from agent_framework.runtime.exceptions import (
+    ResourceLimitError,
+    TimeoutError as RuntimeTimeoutError,
+)
+from agent_framework.runtime.result import ToolResult
+
+if TYPE_CHECKING:
+    from agent_framework.tools.tool_base import BaseTool
+
+logger = logging.getLogger(__name__)
+
+# Tools routed to worker processes by default. The export tools are not
+# listed: they prepare pages in their own process pool off the event loop
+# (image_export.export_worker_count), which daemonic workers cannot start.
+CPU_HEAVY_TOOLS: Tuple[str, ...] = ()
+
+
+def _default_max_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass
+class ProcessPoolConfig:
+    """Configuration for ProcessPoolRuntime."""
+
+    max_workers: int = field(default_factory=_default_max_workers)
+    """Maximum number of worker processes (and concurrent calls)."""
+
+    warm_workers: int = 1
+    """Workers started by start() so the first call skips process startup."""
+
+    max_tasks_per_worker: int = 100
+    """Calls a worker serves before it is recycled (bounds leaks)."""
+
+    shared_memory_threshold: int = 1024 * 1024
+    """Bytes results at least this large are returned via shared memory."""
+
+    enforce_rlimits: bool = True
+    """Apply per-call RLIMIT_AS/RLIMIT_CPU in the worker (POSIX only)."""
+
+    preload_modules: List[str] = field(default_factory=list)
+    """Modules imported when a worker starts, e.g. ["PIL.Image"]."""
+
+    start_method: str = "spawn"
+    """multiprocessing start method. Fork is unsafe with the server's threads."""
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if self.max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if not 0 <= self.warm_workers <= self.max_workers:
+            raise ValueError("warm_workers must be between 0 and max_workers")
+        if self.max_tasks_per_worker <= 0:
+            raise ValueError("max_tasks_per_worker must be positive")
+        if self.shared_memory_threshold <= 0:
+            raise ValueError("shared_memory_threshold must be positive")
+
+
+class SharedPayload:
+    """
+    A bytes result living in a shared memory segment.
+
+    The parent owns the segment: call release() (or use as a context
+    manager) once the data has been consumed.
+
+    Usage:
+        with result.metadata["payload"] as payload:
+            out.write(payload.view())
+    """
+
+    def __init__(self, name: str, size: int):
+        """
+        Attach to a segment created by a worker.
+
+        Args:
+            name: Shared memory segment name
+            size: Payload size in bytes (the segment may be page-rounded)
+        """
+        self.name = name
+        self.size = size
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(name=name)
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the payload."""
+        if self._shm is None:
+            raise ValueError("Shared payload has been released")
+        return self._shm.buf[:self.size]
+
+    def tobytes(self) -> bytes:
+        """Copy the payload into a bytes object."""
+        view = self.view()
+        try:
+            return view.tobytes()
+        finally:
+            view.release()
+
+    def release(self) -> None:
+        """Close and unlink the segment. Outstanding views must be released first."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        try:
+            shm.close()
+        finally:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "SharedPayload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+class _CPULimitExceeded(BaseException):
+    """Raised inside a worker when SIGXCPU arrives (BaseException so tools can't swallow it)."""
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CPULimitExceeded()
+
+
+def _apply_rlimits(max_memory_mb: int, cpu_seconds: int) -> List[Tuple[int, Tuple[int, int]]]:
+    """Set per-call soft limits on top of current usage; return previous limits."""
+    previous = []
+
+    if hasattr(resource, "RLIMIT_AS"):
+        old = resource.getrlimit(resource.RLIMIT_AS)
+        baseline = _current_vm_bytes()
+        soft = baseline + max_memory_mb * 1024 * 1024
+        if old[1] != resource.RLIM_INFINITY:
+            soft = min(soft, old[1])
+        resource.setrlimit(resource.RLIMIT_AS, (soft, old[1]))
+        previous.append((resource.RLIMIT_AS, old))
+
+    old = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + 1 + cpu_seconds
+    if old[1] != resource.RLIM_INFINITY:
+        soft = min(soft, old[1])
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, old[1]))
+    previous.append((resource.RLIMIT_CPU, old))
+
+    return previous
+
+
+def _restore_rlimits(previous: List[Tuple[int, Tuple[int, int]]]) -> None:
+    for limit, values in previous:
+        resource.setrlimit(limit, values)
+
+
+def _current_vm_bytes() -> int:
+    """Virtual memory size of this process (what RLIMIT_AS counts)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _bytes_payload(result: Any) -> Optional[Any]:
+    """Return the bytes-like payload of a tool result, if it has one."""
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        return result
+    output = getattr(result, "output", None)
+    if isinstance(output, (bytes, bytearray, memoryview)):
+        return output
+    return None
+
+
+def _run_call(
+    loop,
+    request: Dict[str, Any],
+    threshold: int,
+    enforce_rlimits: bool,
+    send_progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Run one tool call inside the worker and build the reply."""
+    tool = request["tool"]
+    params = request["params"]
+    context: ExecutionContext = request["context"]
+
+    if request.get("progress") and send_progress is not None:
+        context.metadata[OUTPUT_CALLBACK_KEY] = send_progress
+
+    if hasattr(tool, "execution_context"):
+        tool.execution_context = context
+
+    cpu_seconds = max(1, int(context.timeout * context.max_cpu_percent / 100))
+    previous = None
+    if enforce_rlimits and resource is not None:
+        previous = _apply_rlimits(context.max_memory_mb, cpu_seconds)
+
+    try:
+        execute_method = tool.execute
+        if asyncio.iscoroutinefunction(execute_method):
+            result = loop.run_until_complete(execute_method(**params))
+        else:
+            result = execute_method(**params)
+    except MemoryError:
+        return {"status": "limit", "resource": "memory", "limit": context.max_memory_mb}
+    except _CPULimitExceeded:
+        return {"status": "limit", "resource": "cpu", "limit": cpu_seconds}
+    except Exception as e:
+        return {"status": "error", "error": str(e), "exception_type": type(e).__name__}
+    finally:
+        if previous is not None:
+            _restore_rlimits(previous)
+
+    payload = _bytes_payload(result)
+    if payload is not None:
+        size = memoryview(payload).nbytes
+        if size >= threshold:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            shm.buf[:size] = memoryview(payload).cast("B")
+            shm.close()
+            return {
+                "status": "ok",
+                "output": f"[{size} bytes returned via shared memory]",
+                "shm": (shm.name, size),
+            }
+        return {"status": "ok", "output": str(result), "payload": bytes(payload)}
+
+    return {"status": "ok", "output": str(result)}
+
+
+def _worker_main(conn, preload_modules: List[str], threshold: int, enforce_rlimits: bool) -> None:
+    """Worker process entry point: serve calls until told to stop."""
+    import importlib
+
+    # The parent owns shutdown; don't die on the terminal's Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Worker could not preload {module}: {e}")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    # Tools may report progress from their own threads
+    send_lock = threading.Lock()
+
+    def send(message: Dict[str, Any]) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def send_progress(data: str) -> None:
+        send({"status": "progress", "data": str(data)})
+
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        if not data:
+            break
+
+        try:
+            request = pickle.loads(data)
+        except Exception as e:
+            reply = {"status": "error", "error": f"Failed to load tool call: {e}",
+                     "exception_type": type(e).__name__}
+        else:
+            reply = _run_call(loop, request, threshold, enforce_rlimits, send_progress)
+
+        try:
+            send(reply)
+        except Exception as e:
+            send({"status": "error", "error": f"Tool result could not be returned: {e}",
+                  "exception_type": type(e).__name__})
+
+    # Lets pooled resources tied to the loop (e.g. http_pool clients) close
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+# Metadata that only works in this process (callables, cancellation tokens)
+_PARENT_ONLY_KEYS = (OUTPUT_CALLBACK_KEY, CANCEL_TOKEN_KEY, RUNTIME_EXECUTOR_KEY)
+
+
+def _sendable_context(context: ExecutionContext) -> ExecutionContext:
+    """Copy of the context without the metadata that only works in this process."""
+    if not any(key in context.metadata for key in _PARENT_ONLY_KEYS):
+        return context
+    metadata = {k: v for k, v in context.metadata.items() if k not in _PARENT_ONLY_KEYS}
+    return dataclasses.replace(context, metadata=metadata)
+
+
+def _without_execution_context(tool: Any) -> Any:
+    """Shallow copy of the tool with no execution context attached.
+
+    The context a tool carries from earlier calls (output callbacks, a web
+    context holding managers and locks) generally cannot be pickled, and the
+    worker installs the call's own context anyway.
+    """
+    if getattr(tool, "execution_context", None) is None:
+        return tool
+    tool = copy.copy(tool)
+    tool.execution_context = None
+    return tool
+
+
+class _Worker:
+    """Handle on one worker process and its pipe."""
+
+    def __init__(self, mp_context, config: ProcessPoolConfig):
+        self.conn, child_conn = mp_context.Pipe(duplex=True)
+        self.process = mp_context.Process(
+            target=_worker_main,
+            args=(child_conn, config.preload_modules, config.shared_memory_threshold,
+                  config.enforce_rlimits),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def call(self, data: bytes, on_output: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+        """Send a pickled request and block for the reply (run in a thread)."""
+        self.conn.send_bytes(data)
+        while True:
+            reply = self.conn.recv()
+            if reply.get("status") != "progress":
+                return reply
+            if on_output is not None:
+                try:
+                    on_output(reply["data"])
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {e}")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Ask the worker to exit, killing it if it doesn't."""
+        try:
+            self.conn.send_bytes(b"")
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1.0)
+        self.conn.close()
+
+
+class ProcessPoolRuntime(ToolRuntime):
+    """
+    Runtime executing tools in a pool of warm worker processes.
+
+    Usage:
+        runtime = ProcessPoolRuntime(ProcessPoolConfig(max_workers=2))
+        await runtime.start()
+        manager.register_runtime("process_pool", runtime)
+    """
+
+    def __init__(self, config: Optional[ProcessPoolConfig] = None):
+        """
+        Initialize the runtime. Workers start lazily or via start().
+
+        Args:
+            config: Pool configuration (defaults if None)
+        """
+        self.config = config or ProcessPoolConfig()
+        self._mp_context = multiprocessing.get_context(self.config.start_method)
+        self._idle: List[_Worker] = []
+        self._busy: List[_Worker] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._closed = False
+
+        self.tasks_completed = 0
+        self.workers_started = 0
+        self.workers_recycled = 0
+
+        logger.info(
+            "ProcessPoolRuntime initialized (max_workers=%d, rlimits=%s)",
+            self.config.max_workers,
+            self.config.enforce_rlimits and resource is not None,
+        )
+
+    async def start(self) -> None:
+        """Start the warm workers."""
+        while len(self._idle) + len(self._busy) < self.config.warm_workers:
+            self._idle.append(await self._spawn_worker())
+
+    async def execute(
+        self,
+        tool: "BaseTool",
+        params: Dict[str, Any],
+        context: ExecutionContext,
+    ) -> ToolResult:
+        """
+        Execute a tool in a worker process.
+
+        Args:
+            tool: Tool to execute (must be picklable and importable by the worker)
+            params: Parameters for the tool
+            context: Execution context with timeout and limits
+
+        Returns:
+            ToolResult; large bytes results carry a SharedPayload in
+            metadata["payload"]
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+            ResourceLimitError: If the call exceeds its memory or CPU limit
+        """
+        tool_name = tool.name if hasattr(tool, 'name') else str(tool)
+
+        if self._closed:
+            return ToolResult.error_result(
+                error="ProcessPoolRuntime has been shut down",
+                runtime="process_pool",
+            )
+
+        # The output callback cannot cross the process boundary; the
+        # worker sends progress back over the pipe instead
+        on_output = context.metadata.get(OUTPUT_CALLBACK_KEY)
+        try:
+            data = pickle.dumps({
+                "tool": _without_execution_context(tool),
+                "params": params,
+                "context": _sendable_context(context),
+                "progress": on_output is not None,
+            })
+        except Exception as e:
+            return ToolResult.error_result(
+                error=f"Tool '{tool_name}' cannot be sent to a worker process: {e}",
+                runtime="process_pool",
+                exception_type=type(e).__name__,
+            )
+
+        logger.info(
+            "Executing tool '%s' in process pool (timeout=%ds, max_memory=%dMB)",
+            tool_name,
+            context.timeout,
+            context.max_memory_mb,
+        )
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.config.max_workers)
+
+        async with self._slots:
+            worker = await self._acquire_worker()
+            start_time = time.time()
+            # An interrupted turn kills the worker, which ends the call
+            token = context.metadata.get(CANCEL_TOKEN_KEY)
+            unregister = token.on_cancel(worker.kill) if token is not None else (lambda: None)
+            try:
+                reply = await asyncio.wait_for(
+                    asyncio.to_thread(worker.call, data, on_output),
+                    timeout=context.timeout,
+                )
+            except asyncio.TimeoutError:
+                # The worker is still busy with the call; kill it
+                self._release_worker(worker, healthy=False)
+                execution_time = time.time() - start_time
+                error_msg = (
+                    f"Tool '{tool_name}' exceeded timeout of {context.timeout}s "
+                    f"(ran for {execution_time:.1f}s)"
+                )
+                logger.warning(error_msg)
+                raise RuntimeTimeoutError(error_msg, timeout=context.timeout) from None
+            except (EOFError, OSError) as e:
+                self._release_worker(worker, healthy=False)
+                if token is not None and token.cancelled:
+                    return ToolResult.error_result(
+                        error=f"Tool '{tool_name}' was cancelled: {token.reason}",
+                        execution_time=time.time() - start_time,
+                        runtime="process_pool",
+                        exception_type="OperationCancelledError",
+                    )
+                return ToolResult.error_result(
+                    error=f"Worker process for '{tool_name}' died: {e or 'connection closed'}",
+                    execution_time=time.time() - start_time,
+                    runtime="process_pool",
+                    exception_type=type(e).__name__,
+                )
+            except BaseException:
+                self._release_worker(worker, healthy=False)
+                raise
+            finally:
+                unregister()
+
+            # A worker that hit a limit may be left fragmented; replace it
+            self._release_worker(worker, healthy=reply.get("status") != "limit")
+
+        execution_time = time.time() - start_time
+        self.tasks_completed += 1
+        return self._build_result(tool_name, reply, execution_time)
+
+    def _build_result(self, tool_name: str, reply: Dict[str, Any], execution_time: float) -> ToolResult:
+        status = reply.get("status")
+
+        if status == "limit":
+            error_msg = (
+                f"Tool '{tool_name}' exceeded {reply['resource']} limit "
+                f"({reply['limit']}{'MB' if reply['resource'] == 'memory' else 's CPU'})"
+            )
+            logger.warning(error_msg)
+            raise ResourceLimitError(
+                error_msg,
+                resource_type=reply["resource"],
+                limit=reply["limit"],
+            )
+
+        if status == "error":
+            error_msg = f"Tool '{tool_name}' execution failed: {reply['error']}"
+            logger.error(error_msg)
+            return ToolResult.error_result(
+                error=error_msg,
+                execution_time=execution_time,
+                runtime="process_pool",
+                exception_type=reply.get("exception_type"),
+            )
+
+        metadata: Dict[str, Any] = {"runtime": "process_pool"}
+        if "shm" in reply:
+            name, size = reply["shm"]
+            metadata["payload"] = SharedPayload(name, size)
+        elif "payload" in reply:
+            metadata["payload"] = reply["payload"]
+
+        logger.info("Tool '%s' completed in worker in %.3fs", tool_name, execution_time)
+        return ToolResult.success_result(
+            output=reply["output"],
+            execution_time=execution_time,
+            **metadata,
+        )
+
+    async def _spawn_worker(self) -> _Worker:
+        worker = await asyncio.to_thread(_Worker, self._mp_context, self.config)
+        self.workers_started += 1
+        logger.debug(f"Started pool worker (PID: {worker.process.pid})")
+        return worker
+
+    async def _acquire_worker(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                self._busy.append(worker)
+                return worker
+            worker.kill()
+        worker = await self._spawn_worker()
+        self._busy.append(worker)
+        return worker
+
+    def _release_worker(self, worker: _Worker, healthy: bool) -> None:
+        if worker in self._busy:
+            self._busy.remove(worker)
+        worker.tasks += 1
+
+        if self._closed or not healthy or not worker.alive:
+            worker.kill()
+            self.workers_recycled += 1
+        elif worker.tasks >= self.config.max_tasks_per_worker:
+            asyncio.get_running_loop().run_in_executor(None, worker.stop)
+            self.workers_recycled += 1
+        else:
+            self._idle.append(worker)
+
+    async def health_check(self) -> bool:
+        """
+        Check if the pool can run tools.
+
+        Returns:
+            True unless the pool has been shut down
+        """
+        return not self._closed
+
+    async def cleanup(self) -> None:
+        """Stop all worker processes."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(asyncio.to_thread(w.stop) for w in idle))
+        for worker in list(self._busy):
+            worker.kill()
+        logger.info("ProcessPoolRuntime cleanup complete")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with worker and task counts
+        """
+        return {
+            "max_workers": self.config.max_workers,
+            "idle_workers": len(self._idle),
+            "busy_workers": len(self._busy),
+            "workers_started": self.workers_started,
+            "workers_recycled": self.workers_recycled,
+            "tasks_completed": self.tasks_completed,
+            "rlimits_enforced": self.config.enforce_rlimits and resource is not None,
+        }
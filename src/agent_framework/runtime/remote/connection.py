@@ -0,0 +1,235 @@
+"""
+Multiplexed client connection to a worker daemon.
+
+One WebSocket per worker carries any number of concurrent executions.
+Each execution gets a client-side ID; a background reader assembles
+streamed output chunks and resolves the matching future when the result
+frame arrives. Load frames from the worker are forwarded to a callback so
+the pool sees the worker's real load.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+from agent_framework.runtime.exceptions import ExecutionError
+from agent_framework.runtime.remote import protocol
+from agent_framework.runtime.remote.worker import WorkerNode
+
+logger = logging.getLogger(__name__)
+
+LoadCallback = Callable[[WorkerNode, Dict[str, Any]], Awaitable[None]]
+OutputCallback = Callable[[str], Any]
+
+
+class _PendingCall:
+    """State of one in-flight execution."""
+
+    def __init__(self, future: asyncio.Future, on_output: Optional[OutputCallback]):
+        self.future = future
+        self.on_output = on_output
+        self.chunks: List[str] = []
+
+
+class WorkerConnection:
+    """
+    WebSocket connection to one worker with pipelined executions.
+
+    Usage:
+        conn = WorkerConnection(worker, session, on_load=pool_update)
+        await conn.connect()
+        result = await conn.execute("bash", {"command": "ls"}, context_dict, timeout=30)
+    """
+
+    def __init__(
+        self,
+        worker: WorkerNode,
+        session: aiohttp.ClientSession,
+        on_load: Optional[LoadCallback] = None,
+    ):
+        """
+        Initialize the connection.
+
+        Args:
+            worker: Worker to connect to
+            session: Shared aiohttp session
+            on_load: Coroutine called with each hello/load frame
+        """
+        self.worker = worker
+        self.session = session
+        self.on_load = on_load
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, _PendingCall] = {}
+        self._send_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the WebSocket is open."""
+        return self.ws is not None and not self.ws.closed
+
+    @property
+    def in_flight(self) -> int:
+        """Executions awaiting a result on this connection."""
+        return len(self._pending)
+
+    async def connect(self, timeout: float = 10.0) -> None:
+        """
+        Open the WebSocket and start the reader.
+
+        Raises:
+            ExecutionError: If the worker cannot be reached
+        """
+        try:
+            self.ws = await asyncio.wait_for(
+                self.session.ws_connect(
+                    f"{self.worker.endpoint}/ws",
+                    heartbeat=30.0,
+                    max_msg_size=protocol.MAX_MESSAGE_SIZE,
+                ),
+                timeout=timeout,
+            )
+            # The worker opens with a hello frame advertising its capacity
+            msg = await self.ws.receive(timeout=timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            raise ExecutionError(f"Cannot connect to worker {self.worker.id}: {e}") from e
+        if msg.type == aiohttp.WSMsgType.TEXT:
+            await self._dispatch(json.loads(msg.data))
+        self._reader_task = asyncio.create_task(self._read_loop())
+        logger.debug(f"Connected to worker {self.worker.id} at {self.worker.endpoint}")
+
+    async def execute(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        context: Dict[str, Any],
+        timeout: float,
+        on_output: Optional[OutputCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a tool on the worker.
+
+        Args:
+            tool_name: Tool to run
+            parameters: Tool parameters
+            context: Serialized execution context
+            timeout: Seconds to wait for the result
+            on_output: Optional callback for live output from the tool
+
+        Returns:
+            The result frame, with the assembled ``output``
+
+        Raises:
+            ExecutionError: If the connection fails or the call times out
+        """
+        if not self.is_connected:
+            raise ExecutionError(f"Not connected to worker {self.worker.id}")
+
+        call_id = str(next(self._ids))
+        call = _PendingCall(asyncio.get_running_loop().create_future(), on_output)
+        self._pending[call_id] = call
+
+        try:
+            await self._send({
+                "type": protocol.EXECUTE,
+                "id": call_id,
+                "tool_name": tool_name,
+                "parameters": parameters,
+                "context": context,
+            })
+            result = await asyncio.wait_for(call.future, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            await self._cancel(call_id)
+            if isinstance(e, asyncio.TimeoutError):
+                raise ExecutionError(
+                    f"Worker {self.worker.id} timed out after {timeout}s"
+                ) from e
+            raise
+        finally:
+            self._pending.pop(call_id, None)
+
+        result["output"] = "".join(call.chunks) if call.chunks else None
+        return result
+
+    async def close(self) -> None:
+        """Close the connection and fail in-flight executions."""
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending(ExecutionError(f"Connection to worker {self.worker.id} closed"))
+
+    async def _send(self, frame: Dict[str, Any]) -> None:
+        try:
+            async with self._send_lock:
+                await self.ws.send_str(json.dumps(frame))
+        except (ConnectionResetError, aiohttp.ClientError) as e:
+            raise ExecutionError(f"Failed to send to worker {self.worker.id}: {e}") from e
+
+    async def _cancel(self, call_id: str) -> None:
+        if not self.is_connected:
+            return
+        try:
+            await self._send({"type": protocol.CANCEL, "id": call_id})
+        except ExecutionError:
+            pass
+
+    async def _read_loop(self) -> None:
+        try:
+            async for msg in self.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+                    continue
+                await self._dispatch(json.loads(msg.data))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Reader for worker {self.worker.id} failed: {e}", exc_info=True)
+        finally:
+            self._fail_pending(
+                ExecutionError(f"Worker {self.worker.id} closed the connection")
+            )
+
+    async def _dispatch(self, frame: Dict[str, Any]) -> None:
+        frame_type = frame.get("type")
+
+        if frame_type in (protocol.LOAD, protocol.HELLO):
+            if self.on_load is not None:
+                await self.on_load(self.worker, frame)
+            return
+
+        call = self._pending.get(frame.get("id"))
+        if call is None:
+            return
+
+        if frame_type == protocol.OUTPUT:
+            call.chunks.append(frame["data"])
+        elif frame_type == protocol.PROGRESS:
+            if call.on_output is not None:
+                try:
+                    outcome = call.on_output(frame["data"])
+                    if asyncio.iscoroutine(outcome):
+                        await outcome
+                except Exception as e:
+                    logger.warning(f"Output callback failed: {e}")
+        elif frame_type == protocol.RESULT:
+            if not call.future.done():
+                call.future.set_result(frame)
+            if self.on_load is not None and "load" in frame:
+                await self.on_load(self.worker, {"current_load": frame["load"]})
+
+    def _fail_pending(self, error: Exception) -> None:
+        for call in list(self._pending.values()):
+            if not call.future.done():
+                call.future.set_exception(error)
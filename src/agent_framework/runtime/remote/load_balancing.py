@@ -62,7 +62,7 @@ class LeastLoadedStrategy(LoadBalancingStrategy):
         if not workers:
             return None
         
-        return min(workers, key=lambda w: w.current_load)
+        return min(workers, key=lambda w: w.effective_load)
 
 
 class CapabilityAwareStrategy(LoadBalancingStrategy):
@@ -80,7 +80,7 @@ class CapabilityAwareStrategy(LoadBalancingStrategy):
         # Sort by number of capabilities (descending), then by load (ascending)
         return min(
             workers,
-            key=lambda w: (-len(w.capabilities), w.current_load)
+            key=lambda w: (-len(w.capabilities), w.effective_load)
         )
 
 
@@ -114,7 +114,7 @@ class WeightedLoadStrategy(LoadBalancingStrategy):
         
         # Calculate available capacity for each worker
         def available_capacity(worker: WorkerNode) -> int:
-            return worker.max_concurrent - worker.current_load
+            return worker.max_concurrent - worker.effective_load
         
         return max(workers, key=available_capacity)
 
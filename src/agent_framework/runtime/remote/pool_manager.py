@@ -136,7 +136,7 @@ class WorkerPoolManager:
                 selected.current_load += 1
                 logger.debug(
                     f"Selected worker {selected.id} "
-                    f"(load: {selected.current_load}/{selected.max_concurrent})"
+                    f"(load: {selected.effective_load}/{selected.max_concurrent})"
                 )
             
             return selected
@@ -173,17 +173,32 @@ class WorkerPoolManager:
                 
                 logger.warning(f"Marked worker as offline: {worker_id}")
     
-    async def update_heartbeat(self, worker_id: str) -> None:
+    async def update_heartbeat(
+        self,
+        worker_id: str,
+        reported_load: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        cpu_percent: Optional[float] = None,
+    ) -> None:
         """
-        Update worker heartbeat timestamp.
+        Update worker heartbeat timestamp and reported load.
         
         Args:
             worker_id: ID of worker
+            reported_load: Executions in flight on the worker (all clients)
+            max_concurrent: Worker's advertised capacity
+            cpu_percent: Worker's CPU usage
         """
         async with self._lock:
             if worker_id in self.workers:
                 worker = self.workers[worker_id]
                 worker.last_heartbeat = time.time()
+                if reported_load is not None:
+                    worker.reported_load = reported_load
+                if max_concurrent is not None:
+                    worker.max_concurrent = max_concurrent
+                if cpu_percent is not None:
+                    worker.cpu_percent = cpu_percent
                 
                 # Restore to available if was offline
                 if worker.status == WorkerStatus.OFFLINE:
@@ -263,7 +278,7 @@ class WorkerPoolManager:
             'available': available,
             'busy': busy,
             'offline': offline,
-            'total_load': sum(w.current_load for w in self.workers.values()),
+            'total_load': sum(w.effective_load for w in self.workers.values()),
             'total_executions': sum(w.total_executions for w in self.workers.values()),
             'total_failures': sum(w.failed_executions for w in self.workers.values())
         }
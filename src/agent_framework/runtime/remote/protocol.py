@@ -0,0 +1,100 @@
+"""
+Wire protocol between RemoteRuntime and worker daemons.
+
+Workers serve three endpoints:
+
+- ``POST /execute``: one JSON request, one JSON response (the original API)
+- ``GET /health``: current load and capacity
+- ``GET /ws``: multiplexed WebSocket carrying many concurrent executions
+
+WebSocket frames are JSON objects with a ``type`` field. Every frame about
+an execution carries the client-chosen execution ``id``, so results may
+arrive in any order and large outputs from one call never block another.
+
+Client -> worker:
+    {"type": "execute", "id", "tool_name", "parameters", "context"}
+    {"type": "cancel", "id"}
+
+Worker -> client:
+    {"type": "hello", "worker_id", "max_concurrent", "capabilities"}
+    {"type": "progress", "id", "data"}   live output emitted by the tool
+    {"type": "output", "id", "data"}     chunk of the final output
+    {"type": "result", "id", "success", "error", "execution_time", "metadata"}
+    {"type": "load", "current_load", "max_concurrent", "cpu_percent"}
+
+The ``output`` chunks of a call are sent before its ``result`` frame. The
+``load`` frame doubles as the worker heartbeat.
+
+Every request, including the WebSocket upgrade, must carry the shared worker
+token in the ``X-ArchiFlow-Worker-Token`` header when the worker has one.
+Both sides read it from ``ARCHIFLOW_WORKER_TOKEN`` by default.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from agent_framework.runtime.context import ExecutionContext
+
+EXECUTE = "execute"
+CANCEL = "cancel"
+HELLO = "hello"
+PROGRESS = "progress"
+OUTPUT = "output"
+RESULT = "result"
+LOAD = "load"
+
+# Final outputs are split into chunks of this many characters
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+# Largest WebSocket message either side accepts
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+# Shared secret authenticating clients to workers
+TOKEN_ENV = "ARCHIFLOW_WORKER_TOKEN"
+AUTH_HEADER = "X-ArchiFlow-Worker-Token"
+
+
+def auth_headers(token: Optional[str]) -> Dict[str, str]:
+    """Request headers carrying the worker token, if any."""
+    return {AUTH_HEADER: token} if token else {}
+
+
+def context_to_dict(context: ExecutionContext) -> Dict[str, Any]:
+    """Serialize the parts of an ExecutionContext a worker needs."""
+    return {
+        'session_id': context.session_id,
+        'timeout': context.timeout,
+        'max_memory_mb': context.max_memory_mb,
+        'max_cpu_percent': context.max_cpu_percent,
+        'allowed_network': context.allowed_network,
+        'working_directory': context.working_directory,
+        'environment': context.environment,
+    }
+
+
+def context_from_dict(data: Dict[str, Any]) -> ExecutionContext:
+    """Rebuild an ExecutionContext from a request payload."""
+    fields = ("timeout", "max_memory_mb", "max_cpu_percent", "allowed_network",
+              "working_directory", "environment")
+    return ExecutionContext(
+        session_id=data.get("session_id", "remote"),
+        **{name: data[name] for name in fields if data.get(name) is not None},
+    )
+
+
+def json_safe(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop metadata values that cannot be sent as JSON."""
+    safe = {}
+    for key, value in metadata.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        safe[key] = value
+    return safe
+
+
+def split_output(output: str, chunk_size: int = OUTPUT_CHUNK_SIZE):
+    """Yield an output string in chunks."""
+    for start in range(0, len(output), chunk_size):
+        yield output[start:start + chunk_size]
@@ -7,8 +7,9 @@ tool execution across remote workers with load balancing and failover.
 
 import asyncio
 import logging
+import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 # Note: aiohttp is optional, will use a simplified HTTP client if not available
 try:
@@ -18,12 +19,17 @@ except ImportError:
     HAS_AIOHTTP = False
 
 from agent_framework.runtime.base import ToolRuntime
-from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.context import OUTPUT_CALLBACK_KEY, ExecutionContext
 from agent_framework.runtime.exceptions import ExecutionError, RuntimeInitializationError
+from agent_framework.runtime.remote import protocol
 from agent_framework.runtime.remote.pool_manager import WorkerPoolManager
 from agent_framework.runtime.remote.worker import WorkerNode
 from agent_framework.runtime.result import ToolResult
 
+if TYPE_CHECKING:
+    from agent_framework.runtime.remote.connection import WorkerConnection
+    from agent_framework.tools.tool_base import BaseTool
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,13 +43,17 @@ class RemoteRuntime(ToolRuntime):
     - Automatic failover on worker failures
     - Retry logic with different workers
     - Health monitoring
+    - One multiplexed WebSocket per worker carrying concurrent executions,
+      streamed output and load heartbeats (see ``protocol.py``)
     """
     
     def __init__(
         self,
         worker_pool: WorkerPoolManager,
         timeout: int = 60,
-        retry_attempts: int = 3
+        retry_attempts: int = 3,
+        multiplexed: bool = True,
+        token: Optional[str] = None,
     ):
         """
         Initialize the remote runtime.
@@ -52,6 +62,10 @@ class RemoteRuntime(ToolRuntime):
             worker_pool: Worker pool manager
             timeout: Default timeout for HTTP requests
             retry_attempts: Number of retry attempts on failure
+            multiplexed: Use the WebSocket protocol; False uses one
+                POST /execute request per call
+            token: Shared worker token sent with every request
+                (ARCHIFLOW_WORKER_TOKEN if None)
         """
         if not HAS_AIOHTTP:
             raise RuntimeInitializationError(
@@ -62,7 +76,11 @@ class RemoteRuntime(ToolRuntime):
         self.worker_pool = worker_pool
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        self.multiplexed = multiplexed
+        self.token = token or os.getenv(protocol.TOKEN_ENV) or None
         self.session: Optional[aiohttp.ClientSession] = None
+        self._connections: Dict[str, "WorkerConnection"] = {}
+        self._connect_lock = asyncio.Lock()
         
         logger.info(
             "RemoteRuntime initialized (timeout=%ds, retries=%d)",
@@ -73,7 +91,8 @@ class RemoteRuntime(ToolRuntime):
     async def _ensure_session(self) -> aiohttp.ClientSession:
         """Ensure HTTP session is created."""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            # Default headers also apply to the WebSocket upgrade
+            self.session = aiohttp.ClientSession(headers=protocol.auth_headers(self.token))
         return self.session
     
     async def execute(
@@ -181,6 +200,98 @@ class RemoteRuntime(ToolRuntime):
         """
         Execute tool on specific worker.
         
+        Args:
+            worker: Worker to execute on
+            tool: Tool to execute
+            params: Tool parameters
+            context: Execution context
+            
+        Returns:
+            ToolResult from execution
+        """
+        if not self.multiplexed:
+            return await self._execute_http(worker, tool, params, context)
+        
+        tool_name = tool.name if hasattr(tool, 'name') else str(tool)
+        context_data = protocol.context_to_dict(context)
+        context_data['timeout'] = context.timeout or self.timeout
+        
+        start_time = time.time()
+        connection = await self._get_connection(worker)
+        result_data = await connection.execute(
+            tool_name,
+            params,
+            context_data,
+            timeout=context_data['timeout'],
+            on_output=context.metadata.get(OUTPUT_CALLBACK_KEY),
+        )
+        
+        return ToolResult(
+            success=result_data['success'],
+            output=result_data.get('output'),
+            error=result_data.get('error'),
+            execution_time=time.time() - start_time,
+            metadata={
+                'runtime': 'remote',
+                'worker_id': worker.id,
+                'worker_endpoint': worker.endpoint,
+                'worker_execution_time': result_data.get('execution_time'),
+            }
+        )
+    
+    async def _get_connection(self, worker: WorkerNode) -> "WorkerConnection":
+        """Get the open connection to a worker, connecting if needed."""
+        connection = self._connections.get(worker.id)
+        if connection is not None and connection.is_connected:
+            return connection
+        
+        async with self._connect_lock:
+            connection = self._connections.get(worker.id)
+            if connection is not None and connection.is_connected:
+                return connection
+            
+            from agent_framework.runtime.remote.connection import WorkerConnection
+            
+            session = await self._ensure_session()
+            connection = WorkerConnection(worker, session, on_load=self._on_worker_load)
+            await connection.connect()
+            self._connections[worker.id] = connection
+            return connection
+    
+    async def _on_worker_load(self, worker: WorkerNode, frame: Dict[str, Any]) -> None:
+        """Feed load reported by a worker into the pool (counts as a heartbeat)."""
+        await self.worker_pool.update_heartbeat(
+            worker.id,
+            reported_load=frame.get('current_load'),
+            max_concurrent=frame.get('max_concurrent'),
+            cpu_percent=frame.get('cpu_percent'),
+        )
+    
+    async def connect_workers(self) -> None:
+        """
+        Open connections to all registered workers.
+        
+        Workers push load frames over their connection, so connecting
+        up front keeps the pool's load picture current before the first
+        execution. Unreachable workers are marked failed.
+        """
+        for worker in self.worker_pool.get_workers():
+            try:
+                await self._get_connection(worker)
+            except ExecutionError as e:
+                logger.warning(str(e))
+                await self.worker_pool.mark_worker_failed(worker.id)
+    
+    async def _execute_http(
+        self,
+        worker: WorkerNode,
+        tool: "BaseTool",
+        params: Dict[str, Any],
+        context: ExecutionContext
+    ) -> ToolResult:
+        """
+        Execute tool on a worker with a single POST /execute request.
+        
         Args:
             worker: Worker to execute on
             tool: Tool to execute
@@ -198,16 +309,9 @@ class RemoteRuntime(ToolRuntime):
         payload = {
             'tool_name': tool_name,
             'parameters': params,
-            'context': {
-                'session_id': context.session_id,
-                'timeout': context.timeout or self.timeout,
-                'max_memory_mb': context.max_memory_mb,
-                'max_cpu_percent': context.max_cpu_percent,
-                'allowed_network': context.allowed_network,
-                'working_directory': context.working_directory,
-                'environment': context.environment
-            }
+            'context': protocol.context_to_dict(context),
         }
+        payload['context']['timeout'] = context.timeout or self.timeout
         
         start_time = time.time()
         
@@ -285,6 +389,10 @@ class RemoteRuntime(ToolRuntime):
     
     async def cleanup(self) -> None:
         """Cleanup resources."""
+        for connection in list(self._connections.values()):
+            await connection.close()
+        self._connections.clear()
+        
         if self.session:
             await self.session.close()
             self.session = None
@@ -302,5 +410,7 @@ class RemoteRuntime(ToolRuntime):
             'runtime': 'remote',
             'timeout': self.timeout,
             'retry_attempts': self.retry_attempts,
+            'multiplexed': self.multiplexed,
+            'open_connections': sum(1 for c in self._connections.values() if c.is_connected),
             'worker_pool': self.worker_pool.get_worker_stats()
         }
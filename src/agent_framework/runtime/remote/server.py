@@ -0,0 +1,418 @@
+"""
+Worker daemon serving RemoteRuntime requests.
+
+Hosts the regular ToolRuntimes (via a RuntimeManager) behind the API that
+RemoteRuntime talks to: ``POST /execute``, ``GET /health`` and the
+multiplexed ``GET /ws`` protocol described in ``protocol.py``.
+
+Run a worker:
+    python -m agent_framework.runtime.remote.server --port 9001 --max-concurrent 8
+
+Extra tools can be loaded with ``--tool module:ClassName`` (repeatable).
+
+Clients authenticate with the shared token from ``ARCHIFLOW_WORKER_TOKEN``.
+Without a token the worker only binds to a loopback address.
+"""
+
+import argparse
+import asyncio
+import hmac
+import importlib
+import ipaddress
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import psutil
+from aiohttp import WSMsgType, web
+
+from agent_framework.runtime.context import OUTPUT_CALLBACK_KEY, ExecutionContext
+from agent_framework.runtime.local import LocalRuntime
+from agent_framework.runtime.manager import RuntimeManager
+from agent_framework.runtime.remote import protocol
+from agent_framework.runtime.result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a bind address only accepts local connections."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class WorkerServer:
+    """
+    Worker daemon executing tools for remote clients.
+
+    Executions from all connections share one concurrency limit. Calls
+    beyond it wait for a slot and count toward the reported load, so
+    LeastLoadedStrategy/WeightedLoadStrategy see real queue depth.
+
+    Usage:
+        server = WorkerServer("worker-1", tools={"echo": EchoTool()})
+        await server.start("127.0.0.1", 9001)
+        ...
+        await server.stop()
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        tools: Optional[Dict[str, Any]] = None,
+        runtime_manager: Optional[RuntimeManager] = None,
+        max_concurrent: int = 8,
+        capabilities: Optional[List[str]] = None,
+        heartbeat_interval: float = 1.0,
+        token: Optional[str] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            worker_id: Worker identifier (random if None)
+            tools: Tools by name this worker can run
+            runtime_manager: Runtime manager executing the tools
+                (LocalRuntime only if None)
+            max_concurrent: Maximum concurrent executions
+            capabilities: Capabilities advertised to clients
+            heartbeat_interval: Seconds between load frames on each connection
+            token: Shared secret clients must send (ARCHIFLOW_WORKER_TOKEN
+                if None); without one only loopback addresses can be bound
+        """
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be positive")
+
+        self.worker_id = worker_id or f"worker-{uuid.uuid4().hex[:8]}"
+        self.tools: Dict[str, Any] = dict(tools or {})
+        if runtime_manager is None:
+            runtime_manager = RuntimeManager()
+            runtime_manager.register_runtime("local", LocalRuntime(enable_resource_monitoring=False))
+        self.runtime_manager = runtime_manager
+        self.max_concurrent = max_concurrent
+        self.capabilities = capabilities or []
+        self.heartbeat_interval = heartbeat_interval
+        self.token = token or os.getenv(protocol.TOKEN_ENV) or None
+
+        self.current_load = 0
+        self.total_executions = 0
+        self.failed_executions = 0
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._process = psutil.Process()
+        self._runner: Optional[web.AppRunner] = None
+        self._connections: set = set()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def run_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        context: ExecutionContext,
+    ) -> ToolResult:
+        """
+        Execute a tool, waiting for a free slot if the worker is full.
+
+        Args:
+            tool_name: Name of a hosted tool
+            parameters: Tool parameters
+            context: Execution context
+
+        Returns:
+            ToolResult (runtime errors are returned, not raised)
+        """
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            self.failed_executions += 1
+            return ToolResult.error_result(
+                error=f"Tool '{tool_name}' is not available on worker {self.worker_id}",
+                exception_type="ToolNotFoundError",
+            )
+
+        self.current_load += 1
+        try:
+            async with self._slots:
+                try:
+                    result = await self.runtime_manager.execute_tool(tool, parameters, context)
+                except Exception as e:
+                    result = ToolResult.error_result(
+                        error=str(e),
+                        exception_type=type(e).__name__,
+                    )
+        finally:
+            self.current_load -= 1
+
+        self.total_executions += 1
+        if not result.success:
+            self.failed_executions += 1
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current load and capacity, as served by /health and load frames."""
+        return {
+            "worker_id": self.worker_id,
+            "current_load": self.current_load,
+            "max_concurrent": self.max_concurrent,
+            "capabilities": self.capabilities,
+            "cpu_percent": self._process.cpu_percent(),
+            "memory_mb": self._process.memory_info().rss / (1024 * 1024),
+            "total_executions": self.total_executions,
+            "failed_executions": self.failed_executions,
+            "connections": len(self._connections),
+            "tools": sorted(self.tools),
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP API
+    # ------------------------------------------------------------------
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        @web.middleware
+        async def check_token(request: web.Request, handler):
+            if self.token is not None:
+                supplied = request.headers.get(protocol.AUTH_HEADER, "")
+                if not hmac.compare_digest(supplied.encode(), self.token.encode()):
+                    return web.json_response({"error": "Unauthorized"}, status=401)
+            return await handler(request)
+
+        app = web.Application(
+            client_max_size=protocol.MAX_MESSAGE_SIZE,
+            middlewares=[check_token],
+        )
+        app.router.add_post("/execute", self._handle_execute)
+        app.router.add_get("/health", self._handle_health)
+        app.router.add_get("/ws", self._handle_ws)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 9001) -> int:
+        """
+        Start serving.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+
+        Returns:
+            The bound port
+
+        Raises:
+            ValueError: If host is not a loopback address and no token is set
+        """
+        if self.token is None and not is_loopback(host):
+            raise ValueError(
+                f"Refusing to bind {host!r} without a worker token; "
+                f"set {protocol.TOKEN_ENV}"
+            )
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Worker {self.worker_id} listening on {host}:{bound_port}")
+        return bound_port
+
+    async def stop(self) -> None:
+        """Stop serving and close client connections."""
+        for ws in list(self._connections):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        await self.runtime_manager.cleanup_all()
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_status())
+
+    async def _handle_execute(self, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+            context = protocol.context_from_dict(payload.get("context", {}))
+        except (ValueError, TypeError) as e:
+            return web.json_response({"error": f"Invalid request: {e}"}, status=400)
+
+        result = await self.run_tool(payload.get("tool_name", ""), payload.get("parameters", {}), context)
+        return web.json_response({
+            "success": result.success,
+            "output": result.output,
+            "error": result.error,
+            "execution_time": result.execution_time,
+            "metadata": protocol.json_safe(result.metadata),
+        })
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30.0, max_msg_size=protocol.MAX_MESSAGE_SIZE)
+        await ws.prepare(request)
+        self._connections.add(ws)
+
+        send_lock = asyncio.Lock()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def send(frame: Dict[str, Any]) -> None:
+            if ws.closed:
+                return
+            async with send_lock:
+                await ws.send_str(json.dumps(frame))
+
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(self.heartbeat_interval)
+                await send(self._load_frame())
+
+        await send({
+            "type": protocol.HELLO,
+            "worker_id": self.worker_id,
+            "max_concurrent": self.max_concurrent,
+            "capabilities": self.capabilities,
+        })
+        heartbeat_task = asyncio.create_task(heartbeat())
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    frame = json.loads(msg.data)
+                except ValueError:
+                    logger.warning(f"Worker {self.worker_id} ignoring invalid frame")
+                    continue
+
+                if frame.get("type") == protocol.EXECUTE:
+                    call_id = frame["id"]
+                    task = asyncio.create_task(self._ws_execute(frame, send))
+                    tasks[call_id] = task
+                    task.add_done_callback(lambda t, call_id=call_id: tasks.pop(call_id, None))
+                elif frame.get("type") == protocol.CANCEL:
+                    task = tasks.get(frame.get("id"))
+                    if task is not None:
+                        task.cancel()
+        finally:
+            heartbeat_task.cancel()
+            for task in list(tasks.values()):
+                task.cancel()
+            self._connections.discard(ws)
+
+        return ws
+
+    async def _ws_execute(self, frame: Dict[str, Any], send) -> None:
+        call_id = frame["id"]
+        loop = asyncio.get_running_loop()
+
+        def on_output(data: str) -> None:
+            # Tools may run on executor threads; hop back to the loop
+            loop.call_soon_threadsafe(
+                asyncio.ensure_future,
+                send({"type": protocol.PROGRESS, "id": call_id, "data": str(data)}),
+            )
+
+        try:
+            context = protocol.context_from_dict(frame.get("context", {}))
+            context.metadata[OUTPUT_CALLBACK_KEY] = on_output
+            result = await self.run_tool(frame.get("tool_name", ""), frame.get("parameters", {}), context)
+        except asyncio.CancelledError:
+            return
+        except (ValueError, TypeError) as e:
+            result = ToolResult.error_result(error=f"Invalid request: {e}")
+
+        try:
+            for chunk in protocol.split_output(result.output or ""):
+                await send({"type": protocol.OUTPUT, "id": call_id, "data": chunk})
+            await send({
+                "type": protocol.RESULT,
+                "id": call_id,
+                "success": result.success,
+                "error": result.error,
+                "execution_time": result.execution_time,
+                "metadata": protocol.json_safe(result.metadata),
+                "load": self.current_load,
+            })
+        except ConnectionResetError:
+            logger.debug(f"Client went away before result of {call_id} was sent")
+
+    def _load_frame(self) -> Dict[str, Any]:
+        return {
+            "type": protocol.LOAD,
+            "current_load": self.current_load,
+            "max_concurrent": self.max_concurrent,
+            "cpu_percent": self._process.cpu_percent(),
+            "timestamp": time.time(),
+        }
+
+
+def load_tool(spec: str) -> Any:
+    """
+    Instantiate a tool from a ``module:ClassName`` spec.
+
+    Args:
+        spec: Import spec of a tool class
+
+    Returns:
+        Tool instance
+    """
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Tool spec must be module:ClassName, got {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    tools: Dict[str, Any] = {}
+    if not args.no_default_tools:
+        from agent_framework.tools.all_tools import registry
+        tools.update({tool.name: tool for tool in registry.list_tools()})
+    for spec in args.tool:
+        tool = load_tool(spec)
+        tools[tool.name] = tool
+
+    server = WorkerServer(
+        worker_id=args.worker_id,
+        tools=tools,
+        max_concurrent=args.max_concurrent,
+        capabilities=args.capabilities,
+    )
+    port = await server.start(args.host, args.port)
+    # Machine-readable line for supervisors and benchmarks
+    print(f"WORKER_READY {server.worker_id} {args.host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="ArchiFlow remote tool worker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--capabilities", nargs="*", default=[])
+    parser.add_argument("--tool", action="append", default=[],
+                        help="Extra tool to host, as module:ClassName (repeatable)")
+    parser.add_argument("--no-default-tools", action="store_true",
+                        help="Only host tools given with --tool")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    if not os.getenv(protocol.TOKEN_ENV) and not is_loopback(args.host):
+        parser.error(f"--host {args.host} is not loopback; set {protocol.TOKEN_ENV} first")
+
+    logging.basicConfig(level=args.log_level)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,12 @@ class WorkerNode:
     current_load: int = 0
     """Number of currently executing tools."""
     
+    reported_load: int = 0
+    """Executions in flight as reported by the worker itself (all clients)."""
+    
+    cpu_percent: float = 0.0
+    """CPU usage reported by the worker's last heartbeat."""
+    
     last_heartbeat: float = field(default_factory=time.time)
     """Timestamp of last heartbeat."""
     
@@ -62,12 +68,18 @@ class WorkerNode:
         """Get the HTTP endpoint URL."""
         return f"http://{self.host}:{self.port}"
     
+    @property
+    def effective_load(self) -> int:
+        """Load used for scheduling: our own in-flight calls or the worker's
+        reported load, whichever is higher (other clients share the worker)."""
+        return max(self.current_load, self.reported_load)
+    
     @property
     def is_available(self) -> bool:
         """Check if worker is available for new work."""
         return (
             self.status == WorkerStatus.AVAILABLE and
-            self.current_load < self.max_concurrent
+            self.effective_load < self.max_concurrent
         )
     
     @property
@@ -75,7 +87,7 @@ class WorkerNode:
         """Get current load as percentage."""
         if self.max_concurrent == 0:
             return 100.0
-        return (self.current_load / self.max_concurrent) * 100.0
+        return (self.effective_load / self.max_concurrent) * 100.0
     
     def has_capability(self, capability: str) -> bool:
         """
@@ -105,5 +117,5 @@ class WorkerNode:
         """String representation."""
         return (
             f"WorkerNode(id={self.id!r}, endpoint={self.endpoint!r}, "
-            f"status={self.status.value}, load={self.current_load}/{self.max_concurrent})"
+            f"status={self.status.value}, load={self.effective_load}/{self.max_concurrent})"
         )
@@ -0,0 +1,217 @@
+"""
+Post-processing of tool results before they enter the conversation.
+
+Large tool outputs (grep hits, bash logs, web pages) would otherwise be
+copied verbatim into the ToolResultObservation, through the broker, into
+the agent history and into every subsequent LLM request. The
+ResultPostProcessor keeps outputs within a token budget: anything larger
+is spilled to an artifact file in the session workspace and replaced by a
+head/tail excerpt plus the artifact path, which the agent can page through
+with the ``read`` tool (offset/limit). Results of ``read`` itself are never
+spilled: it already pages, and spilling it would leave the agent no way
+to read a large file (or a spilled artifact).
+"""
+
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Spilled outputs live under the workspace's hidden session metadata directory
+ARTIFACT_SUBDIR = os.path.join(".archiflow", "tool_outputs")
+
+# Characters the read tool adds to each line ("{n:>6}→")
+READ_LINE_PREFIX = 7
+
+
+@dataclass
+class ResultProcessorConfig:
+    """Configuration for tool result post-processing."""
+
+    max_result_tokens: int = 8000
+    """Token budget for a single tool result kept in the conversation."""
+
+    chars_per_token: int = 4
+    """Heuristic used to estimate tokens without a tokenizer."""
+
+    head_lines: int = 60
+    """Lines kept from the start of an oversized output."""
+
+    tail_lines: int = 20
+    """Lines kept from the end of an oversized output."""
+
+    artifact_dir: Optional[str] = None
+    """Directory for spilled outputs when the context has no working directory.
+    Defaults to a temp directory."""
+
+    enabled: bool = True
+    """Whether oversized results are spilled at all."""
+
+    paged_tools: Tuple[str, ...] = ("read",)
+    """Tools that page their own output with offset/limit; never spilled."""
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if self.max_result_tokens <= 0:
+            raise ValueError("max_result_tokens must be positive")
+        if self.chars_per_token <= 0:
+            raise ValueError("chars_per_token must be positive")
+
+
+class ResultPostProcessor:
+    """
+    Keeps tool results within a token budget by spilling to artifacts.
+
+    Usage:
+        processor = ResultPostProcessor(ResultProcessorConfig(max_result_tokens=4000))
+        content = processor.process(
+            content=output,
+            tool_name="bash",
+            call_id="call_123",
+            session_id="session_1",
+            working_directory="/workspaces/session_1",
+        )
+    """
+
+    def __init__(self, config: Optional[ResultProcessorConfig] = None):
+        """
+        Initialize the processor.
+
+        Args:
+            config: Processing configuration (defaults if None)
+        """
+        self.config = config or ResultProcessorConfig()
+
+    @property
+    def max_chars(self) -> int:
+        """Character budget derived from the token budget."""
+        return self.config.max_result_tokens * self.config.chars_per_token
+
+    def estimate_tokens(self, content: str) -> int:
+        """Estimate token count of a string."""
+        return len(content) // self.config.chars_per_token
+
+    def process(
+        self,
+        content: Optional[str],
+        tool_name: str,
+        call_id: str,
+        session_id: str,
+        working_directory: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return the content to place in the conversation for a tool result.
+
+        Args:
+            content: Full tool output (or error message)
+            tool_name: Name of the tool that produced it
+            call_id: Tool call ID, used to name the artifact
+            session_id: Session ID, used to scope artifacts outside a workspace
+            working_directory: Session working directory, if any
+
+        Returns:
+            The original content if within budget, otherwise an excerpt with
+            a pointer to the spilled artifact
+        """
+        if not self.config.enabled or not content or len(content) <= self.max_chars:
+            return content
+        if tool_name in self.config.paged_tools:
+            return content
+
+        try:
+            artifact_path, handle = self._spill(
+                content, tool_name, call_id, session_id, working_directory
+            )
+        except OSError as e:
+            logger.warning(f"Failed to spill {tool_name} output for {call_id}: {e}")
+            return self._excerpt(content) + (
+                f"\n\n[Output truncated: ~{self.estimate_tokens(content)} tokens exceeded the "
+                f"{self.config.max_result_tokens}-token budget and could not be saved]"
+            )
+
+        total_lines = content.count("\n") + 1
+        # Lines per read that stay within the budget at the output's average
+        # line length, plus the line number the read tool puts before each line
+        page_lines = max(1, self.max_chars * total_lines // (len(content) + READ_LINE_PREFIX * total_lines))
+        logger.info(
+            f"Spilled {tool_name} output ({len(content)} chars, ~{self.estimate_tokens(content)} "
+            f"tokens) for {call_id} to {artifact_path}"
+        )
+        return self._excerpt(content) + (
+            f"\n\n[Output truncated: ~{self.estimate_tokens(content)} tokens exceeded the "
+            f"{self.config.max_result_tokens}-token budget. Full output ({total_lines} lines) "
+            f"saved to: {handle}\n"
+            f"Use the read tool with offset/limit to page through it "
+            f"(e.g. offset=1, limit={page_lines}).]"
+        )
+
+    def _excerpt(self, content: str) -> str:
+        """Build a head/tail excerpt that fits within the budget."""
+        lines = content.split("\n")
+        head_count = self.config.head_lines
+        tail_count = self.config.tail_lines
+
+        if len(lines) > head_count + tail_count:
+            head = "\n".join(lines[:head_count])
+            tail = "\n".join(lines[-tail_count:])
+            omitted = len(lines) - head_count - tail_count
+        else:
+            head, tail, omitted = content, "", 0
+
+        # Long lines can still blow the budget; clamp by characters too
+        head_budget = self.max_chars * 3 // 4
+        tail_budget = self.max_chars - head_budget
+        if len(head) > head_budget:
+            head = head[:head_budget]
+        if len(tail) > tail_budget:
+            tail = tail[-tail_budget:]
+
+        if not tail:
+            return f"{head}\n... [remaining output omitted] ..."
+        return f"{head}\n... [{omitted} lines omitted] ...\n{tail}"
+
+    def _spill(
+        self,
+        content: str,
+        tool_name: str,
+        call_id: str,
+        session_id: str,
+        working_directory: Optional[str],
+    ) -> tuple:
+        """Write the full output to an artifact file.
+
+        Returns:
+            Tuple of (absolute artifact path, handle shown to the agent). The
+            handle is workspace-relative when a working directory is known so
+            it passes sandbox path validation.
+        """
+        file_name = f"{_safe_name(call_id)}_{_safe_name(tool_name)}.txt"
+
+        if working_directory:
+            artifact_dir = Path(working_directory) / ARTIFACT_SUBDIR
+        else:
+            base = self.config.artifact_dir or os.path.join(
+                tempfile.gettempdir(), "archiflow_tool_outputs"
+            )
+            artifact_dir = Path(base) / _safe_name(session_id)
+
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        artifact_path = artifact_dir / file_name
+        with open(artifact_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+        if working_directory:
+            handle = os.path.join(ARTIFACT_SUBDIR, file_name)
+        else:
+            handle = str(artifact_path)
+        return artifact_path, handle
+
+
+def _safe_name(value: str) -> str:
+    """Make a string safe for use in a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value)[:100] or "unknown"
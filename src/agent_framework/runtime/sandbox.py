@@ -8,7 +8,7 @@ and storage quotas.
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from .base import ToolRuntime
 from .context import ExecutionContext
@@ -17,6 +17,7 @@ from .local import LocalRuntime
 from .validation.path_validator import PathValidator, PathValidationError
 from .validation.command_validator import CommandValidator, CommandValidationError
 from .exceptions import SecurityViolation, ResourceLimitError
+from ..storage.ledger import file_size
 
 # Import framework interfaces
 try:
@@ -27,6 +28,9 @@ except ImportError:
     StorageQuota = None  # type: ignore
     AuditTrail = None  # type: ignore
 
+if TYPE_CHECKING:
+    from .messages import BatchToolCallRequest
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,15 +180,11 @@ class SandboxRuntime(ToolRuntime):
             ResourceLimitError: If storage quota exceeded
         """
         tool_name = getattr(tool, "name", str(tool))
-
-        logger.info(f"🛡️  [SandboxRuntime] Executing tool '{tool_name}' with sandbox enforcement")
-        logger.info(f"   Workspace: {self.config.workspace_path}")
-        logger.info(f"   Mode: {self.config.mode}")
+        logger.debug(f"SandboxRuntime executing '{tool_name}' (mode={self.config.mode})")
 
         # Phase 1: Pre-execution validation
         try:
             validated_params = await self._validate_execution(tool, params)
-            logger.info(f"✅ [SandboxRuntime] Validation passed for '{tool_name}'")
         except PathValidationError as e:
             # Convert to SecurityViolation
             raise SecurityViolation(str(e), "path_violation") from e
@@ -213,8 +213,21 @@ class SandboxRuntime(ToolRuntime):
         is_write = self._is_write_operation(tool_name, validated_params)
         estimated_size = self._estimate_size(tool_name, validated_params) if is_write else 0
 
+        # Remember target file sizes so the real delta can be recorded
+        write_targets = {}
+        if is_write and self.storage_quota and self._is_file_tool(tool_name):
+            write_targets = {
+                path: file_size(path)
+                for path in self._target_paths(validated_params)
+            }
+
         # Phase 2: Execute via local runtime
-        result = await self._local_runtime.execute(tool, validated_params, context)
+        try:
+            result = await self._local_runtime.execute(tool, validated_params, context)
+        finally:
+            # Only file tools are known not to create symlinks
+            if not self._is_file_tool(tool_name):
+                self.invalidate_path_cache()
 
         # Phase 3: Post-execution quota update (for successful write operations)
         if result.success and is_write and self.storage_quota and estimated_size > 0:
@@ -223,6 +236,8 @@ class SandboxRuntime(ToolRuntime):
                 workspace_path=self.config.workspace_path,
                 bytes_to_reserve=estimated_size,
             )
+        if self.storage_quota:
+            self._record_usage(tool_name, write_targets)
 
         # Phase 4: Post-execution audit
         await self._audit_execution(
@@ -256,21 +271,16 @@ class SandboxRuntime(ToolRuntime):
         tool_name = getattr(tool, "name", str(tool))
         validated_params = params.copy()
 
-        logger.debug(f"   Validating {len(params)} parameters for tool '{tool_name}'")
-
         # Path validation for file tools
         if self._is_file_tool(tool_name):
-            logger.debug(f"   Tool '{tool_name}' is a file tool - checking path parameters")
             for param_name, param_value in params.items():
                 if self._is_path_param(param_name) and isinstance(param_value, str):
                     # Validate and rewrite path
-                    logger.debug(f"   Validating path parameter '{param_name}': '{param_value}'")
                     validated_path = self._path_validator.validate(param_value)
                     # Store as relative path for consistency
                     validated_params[param_name] = str(
-                        validated_path.relative_to(self.config.workspace_path)
+                        validated_path.relative_to(self._path_validator.workspace)
                     )
-                    logger.debug(f"   Rewritten to relative path: '{validated_params[param_name]}'")
 
         # Command validation for bash tools
         if self._is_bash_tool(tool_name):
@@ -301,6 +311,69 @@ class SandboxRuntime(ToolRuntime):
 
         return validated_params
 
+    def invalidate_path_cache(self, relative_dir: Optional[str] = None) -> None:
+        """
+        Forget cached path resolutions after the workspace changed.
+
+        Call this after anything other than the sandbox's file tools
+        modifies the workspace (for example a bash command).
+
+        Args:
+            relative_dir: Changed directory, or None for the whole workspace
+        """
+        self._path_validator.invalidate(relative_dir)
+
+    def validate_batch(self, request: "BatchToolCallRequest") -> Dict[str, str]:
+        """
+        Check the paths of every call in a batch before any of them runs.
+
+        Distinct paths are validated once, and calls touching the same
+        directories share its cached resolution.
+
+        Args:
+            request: Batch of tool calls
+
+        Returns:
+            Mapping of call_id to error message for calls that would be
+            rejected (calls missing from the mapping passed)
+        """
+        calls = [
+            (call, [
+                value for name, value in call.parameters.items()
+                if self._is_path_param(name) and isinstance(value, str)
+            ])
+            for call in request.tool_calls
+            if self._is_file_tool(call.tool_name)
+        ]
+        results = self._path_validator.validate_many(
+            path for _, paths in calls for path in paths
+        )
+
+        errors = {}
+        for call, paths in calls:
+            for path in paths:
+                if isinstance(results[path], PathValidationError):
+                    errors[call.call_id] = str(results[path])
+                    break
+        return errors
+
+    def _target_paths(self, params: Dict[str, Any]) -> list:
+        """Absolute paths of a file tool's validated path parameters."""
+        return [
+            self.config.workspace_path / value
+            for name, value in params.items()
+            if self._is_path_param(name) and isinstance(value, str)
+        ]
+
+    def _record_usage(self, tool_name: str, write_targets: Dict[Path, int]) -> None:
+        """Report the measured size change of a write to the quota."""
+        if write_targets:
+            delta = sum(file_size(path) - old for path, old in write_targets.items())
+            self.storage_quota.apply_delta(self.config.workspace_path, delta)
+        elif self._is_bash_tool(tool_name):
+            # Commands can change anything; let the quota rescan in the background
+            self.storage_quota.mark_stale(self.config.workspace_path)
+
     def _is_file_tool(self, tool_name: str) -> bool:
         """Check if tool operates on files."""
         return tool_name.lower() in self.FILE_TOOLS
@@ -397,7 +470,7 @@ class SandboxRuntime(ToolRuntime):
     async def cleanup(self) -> None:
         """Cleanup sandbox runtime resources."""
         await self._local_runtime.cleanup()
-        logger.info("SandboxRuntime cleaned up")
+        logger.debug("SandboxRuntime cleaned up")
 
     def get_workspace_path(self) -> Path:
         """Get the workspace path for this runtime."""
@@ -86,7 +86,10 @@ class SecurityPolicy:
         Returns:
             ToolPolicy if exists, None otherwise
         """
-        return self.tool_specific_policies.get(tool_name)
+        policy = self.tool_specific_policies.get(tool_name)
+        if policy is None:
+            policy = DEFAULT_TOOL_POLICIES.get(tool_name)
+        return policy
 
 
 @dataclass
@@ -111,3 +114,10 @@ class ToolPolicy:
     
     allowed_paths: Optional[List[str]] = None
     """Override allowed paths."""
+
+
+# Built-in overrides for tools that need them; tool_specific_policies wins.
+# spawn_subagents waits for whole sub-agent runs, far beyond the default limit.
+DEFAULT_TOOL_POLICIES: Dict[str, ToolPolicy] = {
+    "spawn_subagents": ToolPolicy(max_execution_time=900),
+}
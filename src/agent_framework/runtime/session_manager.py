@@ -6,13 +6,15 @@ Creates and manages per-session runtime instances with workspace isolation.
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from .base import ToolRuntime
 from .manager import RuntimeManager
 from .context import ExecutionContext
 from .result import ToolResult
 from .sandbox import SandboxRuntime, SandboxConfig, SandboxMode
+from ..tools.file_cache import release_file_cache
+from ..tracing import get_tracer
 
 # Import framework interfaces
 try:
@@ -22,6 +24,9 @@ except ImportError:
     StorageQuota = None  # type: ignore
     AuditTrail = None  # type: ignore
 
+if TYPE_CHECKING:
+    from .messages import BatchToolCallRequest
+
 logger = logging.getLogger(__name__)
 
 
@@ -146,18 +151,44 @@ class SessionRuntimeManager:
         original_wd = context.working_directory
         context.working_directory = str(self.workspace_path)
 
-        logger.info(f"🔄 [SessionRuntimeManager] Session {self.session_id}: Executing tool '{tool_name}'")
-        logger.info(f"   Workspace: {self.workspace_path}")
-        logger.info(f"   Working directory: {original_wd} → {context.working_directory}")
-        logger.info(f"   Runtime: {'SANDBOX 🛡️' if use_sandbox else 'GLOBAL 🌐'}")
+        logger.debug(
+            f"Session {self.session_id}: executing '{tool_name}' in "
+            f"{'sandbox' if use_sandbox else 'global'} runtime "
+            f"(working directory {original_wd} -> {context.working_directory})"
+        )
 
         # Execute
         if use_sandbox:
             # Use session's sandbox runtime
-            return await self._sandbox_runtime.execute(tool, params, context)
-        else:
-            # Delegate to global manager
+            with get_tracer().span(
+                "tool.execute",
+                tool=tool_name,
+                runtime="sandbox",
+                session_id=self.session_id,
+            ) as span:
+                result = await self._sandbox_runtime.execute(tool, params, context)
+                if span is not None:
+                    span.set_attribute("success", result.success)
+            return result
+
+        # Delegate to global manager
+        try:
             return await self.global_manager.execute_tool(tool, params, context)
+        finally:
+            # The tool may have changed the workspace behind the sandbox's back
+            self._sandbox_runtime.invalidate_path_cache()
+
+    def validate_batch(self, request: "BatchToolCallRequest") -> Dict[str, str]:
+        """
+        Check the paths of all sandboxed calls in a batch up front.
+
+        Args:
+            request: Batch of tool calls
+
+        Returns:
+            Mapping of call_id to error message for rejected calls
+        """
+        return self._sandbox_runtime.validate_batch(request)
 
     def _should_use_sandbox(self, tool_name: str) -> bool:
         """
@@ -209,4 +240,5 @@ class SessionRuntimeManager:
         """Cleanup session runtime resources."""
         if self._sandbox_runtime:
             await self._sandbox_runtime.cleanup()
+        release_file_cache(self.session_id)
         logger.info(f"SessionRuntimeManager cleaned up: session={self.session_id}")
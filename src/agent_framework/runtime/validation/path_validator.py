@@ -7,7 +7,7 @@ Validates that file paths stay within workspace boundaries.
 import logging
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,13 @@ class PathValidator:
     - Absolute paths (/etc/passwd)
     - Symlink escapes
 
+    Plain relative paths (no ``..``, ``.`` or empty components) are
+    validated lexically once their parent directory is in the safe-directory
+    cache: a directory is cached after it resolved to its own lexical
+    location inside the workspace and contained no symlinks. Sandbox tools
+    that can only create regular files keep the cache valid; anything else
+    (e.g. bash) must call invalidate() afterwards.
+
     Usage:
         validator = PathValidator(
             workspace_path=Path("/workspaces/session_123"),
@@ -59,12 +66,8 @@ class PathValidator:
             pass
     """
 
-    # Paths that are known to be safe (relative, no traversal)
-    SAFE_PATTERN = {
-        # Alphanumeric names, extensions, no special chars
-        # Allows: a.txt, file.json, subdir/data.csv
-        # Blocks: ../, /, ./, etc.
-    }
+    # Upper bound on cached directories; the cache is dropped when full
+    MAX_CACHED_DIRS = 4096
 
     def __init__(
         self,
@@ -87,7 +90,12 @@ class PathValidator:
         if not self.workspace.exists():
             raise ValueError(f"Workspace path does not exist: {self.workspace}")
 
-        logger.info(
+        # Relative directory ("" is the workspace root) -> resolved path
+        self._safe_dirs: Dict[str, Path] = {}
+        self.fast_hits = 0
+        self.slow_checks = 0
+
+        logger.debug(
             f"PathValidator initialized: workspace={self.workspace}, mode={mode}"
         )
 
@@ -104,17 +112,74 @@ class PathValidator:
         Raises:
             PathValidationError: If path escapes workspace
         """
-        logger.info(f"🔒 [PathValidator] Validating path: '{requested_path}' (mode={self.mode})")
-
         if self.mode == "disabled":
             # No validation, just resolve
-            resolved = Path(requested_path).resolve()
-            logger.warning(f"⚠️  [PathValidator] Validation DISABLED, resolved to: {resolved}")
-            return resolved
+            return Path(requested_path).resolve()
+
+        parts = self._plain_parts(requested_path)
+        if parts is not None:
+            parent = self._safe_dirs.get("/".join(parts[:-1]))
+            if parent is not None:
+                self.fast_hits += 1
+                return parent / parts[-1]
+
+        self.slow_checks += 1
+        full_path = self._resolve(requested_path)
+        if parts is not None:
+            self._remember(parts, full_path)
+        return full_path
+
+    def validate_many(
+        self, requested_paths: Iterable[str]
+    ) -> Dict[str, Union[Path, PathValidationError]]:
+        """
+        Validate several paths, e.g. every path in a batch of tool calls.
+
+        Each distinct path is checked once; paths in the same directory
+        share one resolution through the safe-directory cache.
+
+        Args:
+            requested_paths: Paths to validate
+
+        Returns:
+            Mapping of each path to its resolved Path or the
+            PathValidationError it failed with
+        """
+        results: Dict[str, Union[Path, PathValidationError]] = {}
+        for requested in requested_paths:
+            if requested in results:
+                continue
+            try:
+                results[requested] = self.validate(requested)
+            except PathValidationError as e:
+                results[requested] = e
+        return results
 
+    def invalidate(self, relative_dir: Optional[str] = None) -> None:
+        """
+        Drop cached directories after the workspace changed.
+
+        Args:
+            relative_dir: Directory whose entries (and subdirectories) may
+                have changed; None drops the whole cache
+        """
+        if relative_dir is None:
+            self._safe_dirs.clear()
+            return
+
+        parts = self._plain_parts(relative_dir)
+        if parts is None:
+            self._safe_dirs.clear()
+            return
+        prefix = "/".join(parts)
+        for key in [k for k in self._safe_dirs if k == prefix or k.startswith(prefix + "/")]:
+            del self._safe_dirs[key]
+
+    def _resolve(self, requested_path: str) -> Path:
+        """Full validation with resolve() (follows symlinks)."""
         # Block absolute paths
         if os.path.isabs(requested_path):
-            logger.error(f"❌ [PathValidator] BLOCKED absolute path: '{requested_path}'")
+            logger.warning(f"PathValidator blocked absolute path: '{requested_path}'")
             raise PathValidationError(
                 "Absolute paths are not allowed in sandbox",
                 requested_path=requested_path,
@@ -123,45 +188,68 @@ class PathValidator:
         # Join with workspace and resolve
         try:
             full_path = (self.workspace / requested_path).resolve()
-            logger.debug(f"   Resolved to: {full_path}")
         except Exception as e:
-            logger.error(f"❌ [PathValidator] Failed to resolve path: {e}")
+            logger.warning(f"PathValidator failed to resolve '{requested_path}': {e}")
             raise PathValidationError(
                 f"Failed to resolve path: {e}",
                 requested_path=requested_path,
             )
 
-        # Verify still within workspace (path traversal check)
+        # Verify still within workspace (path traversal and symlink escapes;
+        # resolve() has already followed any symlinks)
         try:
-            relative = full_path.relative_to(self.workspace)
-            logger.info(f"✅ [PathValidator] Path validated: '{requested_path}' -> '{relative}' (within {self.workspace})")
+            full_path.relative_to(self.workspace)
         except ValueError:
-            # Path escapes workspace via ../
-            logger.error(f"❌ [PathValidator] BLOCKED path traversal: '{requested_path}' -> '{full_path}' (escapes {self.workspace})")
+            logger.warning(
+                f"PathValidator blocked path escaping workspace: "
+                f"'{requested_path}' -> '{full_path}'"
+            )
             raise PathValidationError(
                 "Path escapes workspace (path traversal detected)",
                 requested_path=requested_path,
                 resolved_path=str(full_path),
             )
 
-        # Check for symlink escapes
-        if full_path.exists() and full_path.is_symlink():
-            real_path = full_path.resolve()
-            logger.debug(f"   Checking symlink: {full_path} -> {real_path}")
-            try:
-                real_path.relative_to(self.workspace)
-                logger.info(f"   Symlink is safe (points within workspace)")
-            except ValueError:
-                # Symlink points outside workspace
-                logger.error(f"❌ [PathValidator] BLOCKED symlink escape: '{requested_path}' -> symlink -> '{real_path}' (escapes {self.workspace})")
-                raise PathValidationError(
-                    "Symlink escapes workspace",
-                    requested_path=requested_path,
-                    resolved_path=str(real_path),
-                )
-
+        logger.debug(f"Path validated: '{requested_path}' -> '{full_path}'")
         return full_path
 
+    def _remember(self, parts: Tuple[str, ...], full_path: Path) -> None:
+        """Cache the parent directory of a validated plain path if it is safe."""
+        # A symlink anywhere on the chain would make the resolved path differ
+        if self.workspace.joinpath(*parts) != full_path:
+            return
+
+        key = "/".join(parts[:-1])
+        if key in self._safe_dirs:
+            return
+        parent = full_path.parent
+        if _contains_symlink(parent):
+            return
+
+        if len(self._safe_dirs) >= self.MAX_CACHED_DIRS:
+            self._safe_dirs.clear()
+        self._safe_dirs[key] = parent
+
+    @staticmethod
+    def _plain_parts(requested_path: str) -> Optional[Tuple[str, ...]]:
+        """
+        Split a path that can be checked lexically.
+
+        Returns None for absolute paths and paths with ``..``, ``.`` or
+        empty components, which always take the full resolve() path.
+        """
+        if not requested_path or "\0" in requested_path or os.path.isabs(requested_path):
+            return None
+        if os.altsep:
+            requested_path = requested_path.replace(os.altsep, os.sep)
+        parts = tuple(requested_path.split(os.sep))
+        for part in parts:
+            if part in ("", ".", ".."):
+                return None
+        if os.name == "nt" and ":" in requested_path:
+            return None
+        return parts
+
     def is_safe(self, path: str) -> bool:
         """
         Check if a path is safe without raising exception.
@@ -202,3 +290,12 @@ class PathValidator:
     def get_workspace_path(self) -> Path:
         """Get the workspace boundary path."""
         return self.workspace
+
+
+def _contains_symlink(directory: Path) -> bool:
+    """Whether a directory has symlink entries (True if it can't be read)."""
+    try:
+        with os.scandir(directory) as entries:
+            return any(entry.is_symlink() for entry in entries)
+    except OSError:
+        return True
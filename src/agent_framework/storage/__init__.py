@@ -8,9 +8,14 @@ storage limits on tool execution.
 from .quota import StorageQuota
 from .memory import InMemoryQuota
 from .filesystem import FileSystemQuota
+from .ledger import UsageLedger, UsageReconciler, get_usage_ledger, get_usage_reconciler
 
 __all__ = [
     "StorageQuota",
     "InMemoryQuota",
     "FileSystemQuota",
+    "UsageLedger",
+    "UsageReconciler",
+    "get_usage_ledger",
+    "get_usage_reconciler",
 ]
@@ -1,13 +1,16 @@
 """
 Filesystem-based storage quota implementation.
 
-Calculates quota based on actual filesystem usage.
+Calculates quota based on actual filesystem usage, tracked incrementally
+by a per-workspace UsageLedger.
 """
 
 import logging
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict
 
+from .ledger import UsageLedger, get_usage_ledger, get_usage_reconciler
 from .quota import StorageQuota
 
 logger = logging.getLogger(__name__)
@@ -17,8 +20,10 @@ class FileSystemQuota(StorageQuota):
     """
     Quota based on actual filesystem usage.
 
-    Calculates usage by scanning directory size.
-    More accurate than InMemoryQuota but slower for large directories.
+    Usage comes from the workspace's persisted UsageLedger, so checks are
+    O(1). Writes through SandboxRuntime apply exact size deltas; other
+    changes are picked up by the background UsageReconciler. Only the
+    first check of a workspace without a ledger scans the directory.
 
     Usage:
         quota = FileSystemQuota(limit_bytes=1024*1024*1024)  # 1GB
@@ -26,20 +31,21 @@ class FileSystemQuota(StorageQuota):
         usage = quota.get_usage(Path("/workspace/session_123"))
     """
 
-    def __init__(self, limit_bytes: int, cache_ttl_seconds: float = 5.0):
+    def __init__(self, limit_bytes: int, cache_ttl_seconds: float = 60.0):
         """
         Initialize filesystem quota.
 
         Args:
             limit_bytes: Total quota limit in bytes
-            cache_ttl_seconds: How long to cache usage calculations (default 5s)
+            cache_ttl_seconds: Age of a workspace's last full scan after which
+                a background rescan is requested (default 60s)
         """
         if limit_bytes <= 0:
             raise ValueError(f"Limit must be positive, got {limit_bytes}")
 
         self.limit = limit_bytes
         self.cache_ttl = cache_ttl_seconds
-        self._cache: Optional[dict] = None
+        self._ledgers: Dict[str, UsageLedger] = {}
 
         logger.info(
             f"FileSystemQuota initialized: limit={limit_bytes} bytes, "
@@ -71,7 +77,7 @@ class FileSystemQuota(StorageQuota):
 
     def get_usage(self, workspace_path: Path) -> int:
         """
-        Calculate actual filesystem usage.
+        Get filesystem usage from the workspace ledger.
 
         Args:
             workspace_path: Path to workspace directory
@@ -82,27 +88,11 @@ class FileSystemQuota(StorageQuota):
         if not workspace_path.exists():
             return 0
 
-        # Check cache
-        if self._cache:
-            key = str(workspace_path.resolve())
-            if key in self._cache:
-                cached_usage, timestamp = self._cache[key]
-                # Import here to avoid circular dependency
-                import time
-                if time.time() - timestamp < self.cache_ttl:
-                    return cached_usage
-
-        # Calculate actual usage
-        total = self._calculate_size(workspace_path)
-
-        # Update cache
-        if self._cache is None:
-            self._cache = {}
-        key = str(workspace_path.resolve())
-        import time
-        self._cache[key] = (total, time.time())
-
-        return total
+        ledger = self._get_ledger(workspace_path)
+        usage = ledger.usage
+        if time.time() - ledger.scanned_at >= self.cache_ttl:
+            get_usage_reconciler().request(ledger)
+        return usage
 
     def get_limit(self) -> int:
         """Get quota limit."""
@@ -130,33 +120,37 @@ class FileSystemQuota(StorageQuota):
         """
         return await self.check_quota(session_id, workspace_path, bytes_to_reserve)
 
-    def _calculate_size(self, path: Path) -> int:
+    def apply_delta(self, workspace_path: Path, delta_bytes: int) -> None:
         """
-        Calculate total size of directory in bytes.
+        Record a known size change in the workspace ledger.
 
         Args:
-            path: Path to calculate
+            workspace_path: Path to workspace
+            delta_bytes: Bytes added (positive) or freed (negative)
+        """
+        if workspace_path.exists():
+            self._get_ledger(workspace_path).apply_delta(delta_bytes)
 
-        Returns:
-            Total size in bytes
+    def mark_stale(self, workspace_path: Path) -> None:
         """
-        total = 0
-
-        try:
-            for item in path.rglob("*"):
-                if item.is_file() and not item.is_symlink():
-                    try:
-                        total += item.stat().st_size
-                    except (OSError, PermissionError):
-                        # File inaccessible, skip
-                        logger.debug(f"Skipping inaccessible file: {item}")
-                        pass
-        except Exception as e:
-            logger.warning(f"Error calculating size for {path}: {e}")
-
-        return total
+        Request a background rescan after changes of unknown size.
+
+        Args:
+            workspace_path: Path to workspace
+        """
+        if workspace_path.exists():
+            self._get_ledger(workspace_path).mark_stale()
 
     def clear_cache(self) -> None:
-        """Clear the usage cache."""
-        self._cache = None
+        """Forget ledger totals so the next check rescans."""
+        for ledger in self._ledgers.values():
+            ledger.invalidate()
         logger.debug("Cleared usage cache")
+
+    def _get_ledger(self, workspace_path: Path) -> UsageLedger:
+        key = str(workspace_path)
+        ledger = self._ledgers.get(key)
+        if ledger is None:
+            ledger = get_usage_ledger(workspace_path)
+            self._ledgers[key] = ledger
+        return ledger
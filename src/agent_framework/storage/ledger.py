@@ -0,0 +1,422 @@
+"""
+Incremental storage usage accounting for workspaces.
+
+A UsageLedger keeps the running byte total of one workspace so quota
+checks don't have to walk the directory tree. Writers that know what
+they changed (the sandbox write path, artifact uploads) apply size
+deltas; everything else (bash commands, external edits) is caught by
+UsageReconciler, a low-priority background thread that periodically
+rescans workspaces and corrects the total.
+
+The ledger is persisted at ``{workspace}/.archiflow/usage.json`` so the
+total survives restarts. Only the very first read of a workspace without
+a ledger file pays for a full scan.
+
+Usage:
+    ledger = get_usage_ledger(Path("/workspace/session_123"))
+    ledger.usage                      # O(1)
+
+    old_size = file_size(target)
+    target.write_text(content)
+    ledger.record_file_change(target, old_size)
+"""
+
+import json
+import logging
+import os
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LEDGER_DIRNAME = ".archiflow"
+LEDGER_FILENAME = "usage.json"
+LEDGER_VERSION = 1
+
+
+def file_size(path: Path) -> int:
+    """
+    Size of a regular file, or 0 if it is missing, a symlink or a directory.
+
+    Args:
+        path: File path
+
+    Returns:
+        Size in bytes
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISREG(st.st_mode):
+        return 0
+    return st.st_size
+
+
+def scan_usage(root: Path, exclude: tuple = (), yield_every: int = 0) -> int:
+    """
+    Sum the sizes of all regular files under a directory.
+
+    Symlinks are not followed or counted.
+
+    Args:
+        root: Directory to scan
+        exclude: Absolute file paths (as strings) to leave out
+        yield_every: If positive, sleep briefly after this many entries so
+            a background scan gives way to request handling threads
+
+    Returns:
+        Total size in bytes
+    """
+    total = 0
+    seen = 0
+    stack = [str(root)]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    seen += 1
+                    if yield_every and seen % yield_every == 0:
+                        time.sleep(0.001)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if entry.path not in exclude:
+                                total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        logger.debug(f"Skipping inaccessible entry: {entry.path}")
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+
+    return total
+
+
+class UsageLedger:
+    """
+    Persistent running total of the bytes used by one workspace.
+
+    Thread-safe. Use get_usage_ledger() rather than constructing ledgers
+    directly so every component in the process shares one instance per
+    workspace.
+    """
+
+    def __init__(self, workspace_path: Path):
+        """
+        Initialize the ledger, loading the persisted total if present.
+
+        Args:
+            workspace_path: Workspace directory
+        """
+        self.workspace_path = Path(workspace_path)
+        self.ledger_path = self.workspace_path / LEDGER_DIRNAME / LEDGER_FILENAME
+        self._tmp_path = self.ledger_path.with_name(LEDGER_FILENAME + ".tmp")
+
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+        self.scanned_at = 0.0
+        self.stale = False
+
+        self._load()
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a total is known without scanning."""
+        return self._total is not None
+
+    @property
+    def usage(self) -> int:
+        """
+        Current usage in bytes.
+
+        Scans the workspace synchronously if no total is known yet.
+        """
+        if self._total is None:
+            return self.reconcile()
+        return self._total
+
+    def apply_delta(self, delta_bytes: int) -> None:
+        """
+        Adjust the total by a known size change.
+
+        Args:
+            delta_bytes: Bytes added (positive) or freed (negative)
+        """
+        if delta_bytes == 0:
+            return
+        with self._lock:
+            if self._total is None:
+                # The first read scans anyway, which will include this change
+                return
+            self._total = max(0, self._total + delta_bytes)
+            self._save()
+
+    def record_file_change(self, path: Path, old_size: int) -> int:
+        """
+        Apply the delta of a file that was just written or removed.
+
+        Args:
+            path: File that changed
+            old_size: Its size before the change (see file_size())
+
+        Returns:
+            The applied delta in bytes
+        """
+        delta = file_size(path) - old_size
+        self.apply_delta(delta)
+        return delta
+
+    def mark_stale(self) -> None:
+        """Ask the background reconciler to rescan this workspace soon."""
+        self.stale = True
+        get_usage_reconciler().request(self)
+
+    def reconcile(self, yield_every: int = 0) -> int:
+        """
+        Rescan the workspace and replace the running total.
+
+        Args:
+            yield_every: Passed to scan_usage() to throttle background scans
+
+        Returns:
+            The scanned usage in bytes
+        """
+        if not self.workspace_path.exists():
+            # Nothing to remember until the workspace is created
+            self.invalidate()
+            return 0
+
+        size = scan_usage(
+            self.workspace_path,
+            exclude=(str(self.ledger_path), str(self._tmp_path)),
+            yield_every=yield_every,
+        )
+        with self._lock:
+            if self._total is not None and self._total != size:
+                logger.debug(
+                    f"Reconciled usage of {self.workspace_path}: "
+                    f"{self._total} -> {size} bytes"
+                )
+            self._total = size
+            self.scanned_at = time.time()
+            self.stale = False
+            self._save()
+        return size
+
+    def invalidate(self) -> None:
+        """Forget the total so the next read rescans."""
+        with self._lock:
+            self._total = None
+            self.scanned_at = 0.0
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.ledger_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable usage ledger {self.ledger_path}: {e}")
+            return
+
+        if data.get("version") != LEDGER_VERSION or not isinstance(data.get("total_bytes"), int):
+            logger.warning(f"Ignoring usage ledger with unknown format: {self.ledger_path}")
+            return
+        self._total = max(0, data["total_bytes"])
+        self.scanned_at = float(data.get("scanned_at", 0.0))
+
+    def _save(self) -> None:
+        """Write the ledger atomically. Caller holds the lock."""
+        if not self.workspace_path.exists():
+            return
+        data = {
+            "version": LEDGER_VERSION,
+            "total_bytes": self._total,
+            "scanned_at": self.scanned_at,
+            "updated_at": time.time(),
+        }
+        try:
+            self.ledger_path.parent.mkdir(exist_ok=True)
+            self._tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(self._tmp_path, self.ledger_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist usage ledger {self.ledger_path}: {e}")
+
+
+class UsageReconciler:
+    """
+    Low-priority background thread correcting drift in usage ledgers.
+
+    Rescans ledgers that were marked stale as soon as possible and every
+    tracked ledger once per ``interval_seconds``. On Linux the thread
+    lowers its own scheduling priority, and scans pause briefly every few
+    hundred entries so they never compete with request handling.
+    """
+
+    def __init__(self, interval_seconds: float = 300.0, yield_every: int = 256):
+        """
+        Initialize the reconciler.
+
+        Args:
+            interval_seconds: Maximum age of a ledger's last scan
+            yield_every: Directory entries between pauses during a scan
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"interval_seconds must be positive, got {interval_seconds}")
+
+        self.interval = interval_seconds
+        self.yield_every = yield_every
+        self.reconciled = 0
+
+        self._ledgers: Dict[str, UsageLedger] = {}
+        self._requested: Dict[str, UsageLedger] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread (idempotent)."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="usage-reconciler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def track(self, ledger: UsageLedger) -> None:
+        """Include a ledger in periodic reconciliation."""
+        with self._lock:
+            self._ledgers[str(ledger.workspace_path)] = ledger
+
+    def untrack(self, workspace_path: Path) -> None:
+        """Stop reconciling a workspace."""
+        key = str(workspace_path)
+        with self._lock:
+            self._ledgers.pop(key, None)
+            self._requested.pop(key, None)
+
+    def request(self, ledger: UsageLedger) -> None:
+        """Reconcile a ledger as soon as possible."""
+        with self._lock:
+            self._requested[str(ledger.workspace_path)] = ledger
+        self.start()
+        self._wakeup.set()
+
+    def run_once(self) -> int:
+        """
+        Reconcile requested ledgers and those due for a periodic scan.
+
+        Returns:
+            Number of ledgers reconciled
+        """
+        now = time.time()
+        with self._lock:
+            due = dict(self._requested)
+            self._requested.clear()
+            for key, ledger in self._ledgers.items():
+                # A ledger nobody has read yet has nothing to correct
+                if ledger.is_loaded and now - ledger.scanned_at >= self.interval:
+                    due.setdefault(key, ledger)
+
+        for ledger in due.values():
+            if self._stopping:
+                break
+            try:
+                ledger.reconcile(yield_every=self.yield_every)
+                self.reconciled += 1
+            except Exception as e:
+                logger.warning(f"Failed to reconcile {ledger.workspace_path}: {e}")
+        return len(due)
+
+    def _run(self) -> None:
+        _lower_thread_priority()
+        while not self._stopping:
+            self.run_once()
+            self._wakeup.wait(timeout=min(self.interval, 60.0))
+            self._wakeup.clear()
+
+
+def _lower_thread_priority() -> None:
+    """Renice the calling thread (Linux schedules threads individually)."""
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+_ledgers: Dict[str, UsageLedger] = {}
+_ledgers_lock = threading.Lock()
+_reconciler: Optional[UsageReconciler] = None
+
+
+def get_usage_reconciler() -> UsageReconciler:
+    """Get the process-wide UsageReconciler."""
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = UsageReconciler()
+    return _reconciler
+
+
+def get_usage_ledger(workspace_path: Path) -> UsageLedger:
+    """
+    Get the shared ledger for a workspace.
+
+    Ledgers loaded from disk are queued for a background rescan, since
+    files may have changed while the process was down.
+
+    Args:
+        workspace_path: Workspace directory
+
+    Returns:
+        The workspace's UsageLedger
+    """
+    key = str(Path(workspace_path).resolve())
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is not None:
+            return ledger
+        ledger = UsageLedger(Path(key))
+        _ledgers[key] = ledger
+
+    reconciler = get_usage_reconciler()
+    reconciler.track(ledger)
+    if ledger.is_loaded:
+        reconciler.request(ledger)
+    else:
+        reconciler.start()
+    return ledger
+
+
+def forget_usage_ledger(workspace_path: Path) -> None:
+    """
+    Drop the shared ledger of a workspace (e.g. after deleting it).
+
+    Args:
+        workspace_path: Workspace directory
+    """
+    key = str(Path(workspace_path).resolve())
+    with _ledgers_lock:
+        _ledgers.pop(key, None)
+    get_usage_reconciler().untrack(Path(key))
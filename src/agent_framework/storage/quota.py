@@ -109,6 +109,32 @@ class StorageQuota(ABC):
         """
         pass
 
+    def apply_delta(self, workspace_path: Path, delta_bytes: int) -> None:  # noqa: B027
+        """
+        Record the actual size change of a completed write.
+
+        Optional hook, intentionally a no-op by default: implementations
+        that track usage incrementally override it.
+
+        Args:
+            workspace_path: Path to workspace directory
+            delta_bytes: Bytes added (positive) or freed (negative)
+        """
+        pass
+
+    def mark_stale(self, workspace_path: Path) -> None:  # noqa: B027
+        """
+        Signal that the workspace changed by an unknown amount.
+
+        Called after operations such as bash commands whose effect on disk
+        usage can't be measured. Optional hook, intentionally a no-op by
+        default.
+
+        Args:
+            workspace_path: Path to workspace directory
+        """
+        pass
+
 
 class QuotaExceededError(Exception):
     """Raised when storage quota is exceeded."""
@@ -0,0 +1,446 @@
+"""
+Sub-agent fan-out.
+
+Research and analysis agents explore one LLM turn at a time, even when
+their plan has independent branches (several search queries, several
+modules to analyze). With fan-out, a parent agent hands such branches to
+lightweight child agents (agents/sub_agent.py) that run concurrently:
+
+- The parent calls the ``spawn_subagents`` tool with a list of
+  self-contained tasks.
+- Each child gets its own topics on the parent's broker, an
+  AgentController stepping it on the shared execution engine (so the
+  global LLM concurrency limit applies), and a RuntimeExecutor limited
+  to the tools the parent scoped for it.
+- Children end with a condensed report; the tool returns the reports,
+  which the parent gets as one tool result in its history.
+
+Caps are enforced per parent session by its SubAgentPool:
+
+- At most ``max_concurrent`` children run at once
+  (ARCHIFLOW_SUBAGENT_MAX_CONCURRENT, default 3); further tasks wait
+- All children of the session share a token budget
+  (ARCHIFLOW_SUBAGENT_SESSION_TOKENS, default 300000); tasks that find
+  it spent are skipped and running children stop at their next turn
+- Each child has its own token budget (ARCHIFLOW_SUBAGENT_TOKENS,
+  default 60000) and turn limit (ARCHIFLOW_SUBAGENT_MAX_TURNS, default 15)
+
+Interrupting the parent's turn cancels its children.
+
+Usage (in a parent agent's __init__):
+    self.subagents = SubAgentPool(
+        session_id, llm, project_directory,
+        tools=["web_search", "web_fetch", "read"], role="research agent",
+    )
+    self.allowed_tools.append("spawn_subagents")
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cancellation import CancellationToken, get_cancellation_registry
+from .llm.provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_SESSION_TOKEN_BUDGET = 300_000
+DEFAULT_CHILD_TOKEN_BUDGET = 60_000
+DEFAULT_CHILD_MAX_TURNS = 15
+
+# Tasks accepted per spawn_subagents call
+MAX_TASKS_PER_CALL = 8
+
+# Characters of each child's report passed back to the parent
+RESULT_CHARS = 3000
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+@dataclass
+class SubAgentTask:
+    """One independent branch of the parent's plan."""
+
+    task: str
+    """Self-contained instructions; the child does not see the parent's history."""
+
+    tools: Optional[List[str]] = None
+    """Narrower tool scope than the pool's (None = the pool's tools)."""
+
+    @property
+    def title(self) -> str:
+        first_line = self.task.strip().splitlines()[0] if self.task.strip() else "(empty task)"
+        return first_line if len(first_line) <= 80 else first_line[:77] + "..."
+
+
+@dataclass
+class SubAgentResult:
+    """Outcome of one child."""
+
+    task: SubAgentTask
+    status: str
+    """completed, budget_exhausted, timeout, cancelled, failed or skipped."""
+
+    summary: str
+    tokens_used: int = 0
+    turns: int = 0
+    duration: float = 0.0
+
+    def condensed(self, max_chars: int = RESULT_CHARS) -> str:
+        summary = self.summary.strip()
+        if len(summary) > max_chars:
+            summary = summary[:max_chars].rstrip() + "\n... (truncated)"
+        return summary
+
+
+def format_results(results: List[SubAgentResult]) -> str:
+    """Render children's reports as one tool result for the parent."""
+    total = sum(r.tokens_used for r in results)
+    lines = [f"Sub-agent results ({len(results)} tasks, {total:,} tokens):"]
+    for i, result in enumerate(results, 1):
+        lines.append("")
+        lines.append(
+            f"## {i}. {result.task.title} "
+            f"[{result.status}, {result.tokens_used:,} tokens, {result.turns} turns]"
+        )
+        lines.append(result.condensed())
+    return "\n".join(lines)
+
+
+class ScopedToolRegistry:
+    """Read-only view of a tool registry limited to some tool names."""
+
+    def __init__(self, registry: Any, tool_names: List[str]):
+        self._registry = registry
+        self.tool_names = list(tool_names)
+
+    def get(self, name: str) -> Optional[Any]:
+        if name not in self.tool_names:
+            return None
+        return self._registry.get(name)
+
+    def list_tools(self) -> List[Any]:
+        return [tool for tool in (self.get(name) for name in self.tool_names) if tool]
+
+    def to_llm_schema(self, tool_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        names = [n for n in (tool_names or self.tool_names) if n in self.tool_names]
+        return self._registry.to_llm_schema(tool_names=names)
+
+
+class SubAgentBudget:
+    """
+    Concurrency slots and token ledger shared by one session's children.
+
+    Thread-safe. acquire() works from any event loop: the broker may run
+    successive tool calls of a session on different loops.
+    """
+
+    def __init__(self, max_concurrent: int, token_budget: int):
+        self.max_concurrent = max_concurrent
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self.running = 0
+        self.spawned = 0
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def remaining(self) -> int:
+        return self.token_budget - self.tokens_used
+
+    def charge(self, tokens: int) -> None:
+        with self._lock:
+            self.tokens_used += tokens
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.running < self.max_concurrent:
+                    self.running += 1
+                    self.spawned += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def release(self) -> None:
+        with self._lock:
+            self.running -= 1
+            waiters, self._waiters = self._waiters, []
+        # Wake everyone; they re-check for a slot
+        for loop, waiter in waiters:
+            _call_soon(loop, _wake, waiter)
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable, *args: Any) -> None:
+    """call_soon_threadsafe that ignores loops which have closed meanwhile."""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
+
+
+class SubAgentPool:
+    """
+    A parent session's sub-agent settings and caps.
+
+    Created by the parent agent and looked up by session ID from the
+    spawn_subagents tool. It lives as long as the parent agent holds it.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        llm: LLMProvider,
+        project_directory: Any,
+        tools: List[str],
+        role: str = "parent agent",
+        max_concurrent: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        child_token_budget: Optional[int] = None,
+        child_max_turns: Optional[int] = None,
+    ):
+        """
+        Create the pool and register it for the session.
+
+        Args:
+            session_id: Parent session
+            llm: Provider the children use
+            project_directory: Directory the children's tools work in
+            tools: Tools children may use (finish_task is always added)
+            role: Description of the parent, for the children's prompts
+            max_concurrent: Children running at once per session
+                (default ARCHIFLOW_SUBAGENT_MAX_CONCURRENT, 3)
+            token_budget: Tokens all children of the session may spend
+                (default ARCHIFLOW_SUBAGENT_SESSION_TOKENS, 300000)
+            child_token_budget: Tokens one child may spend
+                (default ARCHIFLOW_SUBAGENT_TOKENS, 60000)
+            child_max_turns: LLM calls one child may make
+                (default ARCHIFLOW_SUBAGENT_MAX_TURNS, 15)
+        """
+        self.session_id = session_id
+        self.llm = llm
+        self.project_directory = Path(project_directory)
+        self.tools = [name for name in tools if name != "spawn_subagents"]
+        self.role = role
+        self.child_token_budget = child_token_budget or _env_int(
+            "ARCHIFLOW_SUBAGENT_TOKENS", DEFAULT_CHILD_TOKEN_BUDGET
+        )
+        self.child_max_turns = child_max_turns or _env_int(
+            "ARCHIFLOW_SUBAGENT_MAX_TURNS", DEFAULT_CHILD_MAX_TURNS
+        )
+        self.budget = SubAgentBudget(
+            max_concurrent=max_concurrent or _env_int("ARCHIFLOW_SUBAGENT_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT),
+            token_budget=token_budget or _env_int("ARCHIFLOW_SUBAGENT_SESSION_TOKENS", DEFAULT_SESSION_TOKEN_BUDGET),
+        )
+        self._ids = itertools.count(1)
+        register_subagent_pool(self)
+
+    async def fan_out(
+        self,
+        tasks: List[SubAgentTask],
+        executor: Any,
+        cancel_token: Optional[CancellationToken] = None,
+        on_progress: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> List[SubAgentResult]:
+        """
+        Run children for the tasks concurrently, within the session's caps.
+
+        Args:
+            tasks: Independent tasks (at most MAX_TASKS_PER_CALL are run)
+            executor: The parent's RuntimeExecutor; children use its
+                broker, runtime manager and tool registry
+            cancel_token: Parent turn's token; cancelling it cancels the children
+            on_progress: Called with a line as each child finishes
+            timeout: Seconds until running children are stopped
+
+        Returns:
+            One result per task, in task order
+        """
+        tasks = tasks[:MAX_TASKS_PER_CALL]
+        deadline = time.monotonic() + timeout if timeout else None
+        finished = 0
+
+        async def run(task: SubAgentTask) -> SubAgentResult:
+            nonlocal finished
+            result = await self._run_child(task, executor, cancel_token, deadline)
+            finished += 1
+            if on_progress is not None:
+                on_progress(f"[{finished}/{len(tasks)}] Sub-agent {result.status}: {result.task.title}")
+            return result
+
+        return list(await asyncio.gather(*(run(task) for task in tasks)))
+
+    async def _run_child(
+        self,
+        task: SubAgentTask,
+        executor: Any,
+        cancel_token: Optional[CancellationToken],
+        deadline: Optional[float],
+    ) -> SubAgentResult:
+        await self.budget.acquire()
+        try:
+            return await self._run_child_in_slot(task, executor, cancel_token, deadline)
+        finally:
+            self.budget.release()
+
+    async def _run_child_in_slot(
+        self,
+        task: SubAgentTask,
+        executor: Any,
+        cancel_token: Optional[CancellationToken],
+        deadline: Optional[float],
+    ) -> SubAgentResult:
+        from .agent_controller import AgentController
+        from .agents.sub_agent import SubAgent
+        from .context import TopicContext
+        from .runtime.executor import RuntimeExecutor
+
+        if cancel_token is not None and cancel_token.cancelled:
+            return SubAgentResult(task, "cancelled", "Not started: the turn was interrupted.")
+        if self.budget.remaining <= 0:
+            return SubAgentResult(task, "skipped", "Not started: the session's sub-agent token budget is exhausted.")
+
+        started = time.monotonic()
+        child_id = f"{self.session_id}.sub-{next(self._ids)}"
+        tool_names = [name for name in (task.tools or self.tools) if name in self.tools]
+        tools = ScopedToolRegistry(executor.tool_registry, tool_names + ["finish_task"])
+        try:
+            agent = SubAgent(
+                session_id=child_id,
+                llm=self.llm,
+                task=task.task,
+                project_directory=str(self.project_directory),
+                tools=tools,
+                allowed_tools=tool_names,
+                role=self.role,
+                token_budget=min(self.child_token_budget, self.budget.remaining),
+                max_turns=self.child_max_turns,
+                session_budget=self.budget,
+            )
+        except Exception as e:
+            logger.error(f"Could not create sub-agent for {task.title!r}: {e}", exc_info=True)
+            return SubAgentResult(task, "failed", f"Could not start the sub-agent: {e}")
+
+        broker = executor.broker
+        context = TopicContext.default(child_id)
+        controller = AgentController(
+            agent, broker, context,
+            working_dir=self.project_directory,
+            auto_refine_enabled_callback=lambda: False,
+        )
+        child_executor = RuntimeExecutor(
+            broker=broker,
+            runtime_manager=executor.runtime_manager,
+            tool_registry=tools,
+            context=context,
+            result_processor=executor.result_processor,
+        )
+
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+
+        def on_client(message: Any) -> None:
+            payload = message.payload
+            if isinstance(payload, dict) and payload.get("type") in ("AGENT_FINISHED", "WAIT_FOR_USER_INPUT"):
+                _call_soon(loop, done.set)
+
+        def on_parent_cancelled() -> None:
+            get_cancellation_registry().cancel(child_id, "parent turn interrupted")
+            _call_soon(loop, done.set)
+
+        broker.subscribe(context.client_topic, on_client)
+        broker.subscribe(context.agent_topic, controller.on_event)
+        child_executor.start()
+        unregister = cancel_token.on_cancel(on_parent_cancelled) if cancel_token is not None else None
+        logger.info(f"Sub-agent {child_id} started: {task.title}")
+        try:
+            broker.publish(context.agent_topic, {
+                "type": "UserMessage",
+                "session_id": child_id,
+                "sequence": 0,
+                "content": task.task,
+            })
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                await asyncio.wait_for(done.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            if unregister is not None:
+                unregister()
+            broker.unsubscribe(context.client_topic, on_client)
+            broker.unsubscribe(context.agent_topic, controller.on_event)
+            child_executor.stop()
+            controller.close()
+
+        if agent.status != "running":
+            status, summary = agent.status, agent.result
+        elif cancel_token is not None and cancel_token.cancelled:
+            status, summary = "cancelled", agent.partial_result("the turn was interrupted")
+        else:
+            status, summary = "timeout", agent.partial_result("time limit reached")
+        logger.info(
+            f"Sub-agent {child_id} {status}: {agent.tokens_used} tokens, {agent.turns} turns"
+        )
+        return SubAgentResult(
+            task=task,
+            status=status,
+            summary=summary,
+            tokens_used=agent.tokens_used,
+            turns=agent.turns,
+            duration=time.monotonic() - started,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "max_concurrent": self.budget.max_concurrent,
+            "running": self.budget.running,
+            "spawned": self.budget.spawned,
+            "tokens_used": self.budget.tokens_used,
+            "token_budget": self.budget.token_budget,
+        }
+
+
+# Pools by parent session; an entry goes away with its parent agent
+_pools: "weakref.WeakValueDictionary[str, SubAgentPool]" = weakref.WeakValueDictionary()
+_pools_lock = threading.Lock()
+
+
+def register_subagent_pool(pool: SubAgentPool) -> None:
+    """Make a pool available to its session's spawn_subagents calls."""
+    with _pools_lock:
+        _pools[pool.session_id] = pool
+
+
+def get_subagent_pool(session_id: str) -> Optional[SubAgentPool]:
+    """The session's pool, or None if its agent does not fan out."""
+    with _pools_lock:
+        return _pools.get(session_id)
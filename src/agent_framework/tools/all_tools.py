@@ -13,122 +13,37 @@ from .write_tool import WriteTool
 from .list_tool import ListTool
 from .bash_tool import BashTool, RestrictedBashTool
 
-# Tools with potential dependencies - import with try/except
-_optional_tools = []
-
-try:
-    from .edit_tool import EditTool
-    _optional_tools.append(('EditTool', EditTool))
-except ImportError:
-    pass
-
-try:
-    from .multi_edit_tool import MultiEditTool
-    _optional_tools.append(('MultiEditTool', MultiEditTool))
-except ImportError:
-    pass
-
-try:
-    from .glob_tool import GlobTool
-    _optional_tools.append(('GlobTool', GlobTool))
-except ImportError:
-    pass
-
-try:
-    from .grep_tool import GrepTool
-    _optional_tools.append(('GrepTool', GrepTool))
-except ImportError:
-    pass
-
-try:
-    from .notebook_read_tool import NotebookReadTool
-    from .notebook_edit_tool import NotebookEditTool
-    _optional_tools.extend([('NotebookReadTool', NotebookReadTool), ('NotebookEditTool', NotebookEditTool)])
-except ImportError:
-    pass
-
-try:
-    from .todo_read_tool import TodoReadTool
-    from .todo_write_tool import TodoWriteTool
-    _optional_tools.extend([('TodoReadTool', TodoReadTool), ('TodoWriteTool', TodoWriteTool)])
-except ImportError:
-    pass
-
-try:
-    from .todo_read_v2_tool import TodoReadV2Tool
-    from .todo_write_v2_tool import TodoWriteV2Tool
-    _optional_tools.extend([('TodoReadV2Tool', TodoReadV2Tool), ('TodoWriteV2Tool', TodoWriteV2Tool)])
-except ImportError:
-    pass
-
-try:
-    from .web_fetch_tool import WebFetchTool
-    _optional_tools.append(('WebFetchTool', WebFetchTool))
-except ImportError:
-    pass
-
-try:
-    from .web_search_tool import WebSearchTool
-    _optional_tools.append(('WebSearchTool', WebSearchTool))
-except ImportError:
-    pass
-
-try:
-    from .finish_tool import FinishAction
-    _optional_tools.append(('FinishAction', FinishAction))
-except ImportError:
-    pass
-
-try:
-    from .process_manager_tool import ProcessManagerTool
-    _optional_tools.append(('ProcessManagerTool', ProcessManagerTool))
-except ImportError:
-    pass
-
-try:
-    from .prompt_refiner_tool import PromptRefinerTool
-    # Note: PromptRefinerTool requires explicit LLM provider, skip auto-registration
-    # It will be instantiated when needed (e.g., by PromptRefinerAgent)
-except ImportError:
-    pass
-
-# PPT Tools
-try:
-    from .ppt.generate_image_tool import GenerateImageTool
-    _optional_tools.append(('GenerateImageTool', GenerateImageTool))
-except ImportError:
-    pass
-
-try:
-    from .ppt.export_pptx_tool import ExportPPTXTool
-    _optional_tools.append(('ExportPPTXTool', ExportPPTXTool))
-except ImportError:
-    pass
-
-try:
-    from .ppt.export_pdf_tool import ExportPDFTool
-    _optional_tools.append(('ExportPDFTool', ExportPDFTool))
-except ImportError:
-    pass
-
-# Comic Tools
-try:
-    from .comic.generate_comic_panel_tool import GenerateComicPanelTool
-    _optional_tools.append(('GenerateComicPanelTool', GenerateComicPanelTool))
-except ImportError:
-    pass
-
-try:
-    from .comic.export_comic_pdf_tool import ExportComicPDFTool
-    _optional_tools.append(('ExportComicPDFTool', ExportComicPDFTool))
-except ImportError:
-    pass
-
-try:
-    from .comic.generate_comic_page_tool import GenerateComicPageTool
-    _optional_tools.append(('GenerateComicPageTool', GenerateComicPageTool))
-except ImportError:
-    pass
+# Tools with potential dependencies, as (tool name, import path). They are
+# registered lazily: each is imported on first lookup, and skipped if its
+# dependencies are missing. PromptRefinerTool is not listed: it requires an
+# explicit LLM provider and is instantiated by PromptRefinerAgent.
+_OPTIONAL_TOOLS = [
+    ("edit", "agent_framework.tools.edit_tool:EditTool"),
+    ("multi_edit", "agent_framework.tools.multi_edit_tool:MultiEditTool"),
+    ("glob", "agent_framework.tools.glob_tool:GlobTool"),
+    ("grep", "agent_framework.tools.grep_tool:GrepTool"),
+    ("notebook_read", "agent_framework.tools.notebook_read_tool:NotebookReadTool"),
+    ("notebook_edit", "agent_framework.tools.notebook_edit_tool:NotebookEditTool"),
+    ("todo_read", "agent_framework.tools.todo_read_tool:TodoReadTool"),
+    ("todo_write", "agent_framework.tools.todo_write_tool:TodoWriteTool"),
+    ("todo_read_v2", "agent_framework.tools.todo_read_v2_tool:TodoReadV2Tool"),
+    ("todo_write_v2", "agent_framework.tools.todo_write_v2_tool:TodoWriteV2Tool"),
+    ("web_fetch", "agent_framework.tools.web_fetch_tool:WebFetchTool"),
+    ("web_search", "agent_framework.tools.web_search_tool:WebSearchTool"),
+    ("finish_task", "agent_framework.tools.finish_tool:FinishAction"),
+    ("process_manager", "agent_framework.tools.process_manager_tool:ProcessManagerTool"),
+    ("spawn_subagents", "agent_framework.tools.spawn_subagents_tool:SpawnSubAgentsTool"),
+    # PPT Tools
+    ("generate_image", "agent_framework.tools.ppt.generate_image_tool:GenerateImageTool"),
+    ("generate_slide_images", "agent_framework.tools.ppt.generate_slide_images_tool:GenerateSlideImagesTool"),
+    ("export_pptx", "agent_framework.tools.ppt.export_pptx_tool:ExportPPTXTool"),
+    ("export_pdf", "agent_framework.tools.ppt.export_pdf_tool:ExportPDFTool"),
+    # Comic Tools
+    ("generate_comic_panel", "agent_framework.tools.comic.generate_comic_panel_tool:GenerateComicPanelTool"),
+    ("generate_comic_panels", "agent_framework.tools.comic.generate_comic_panels_tool:GenerateComicPanelsTool"),
+    ("export_comic_pdf", "agent_framework.tools.comic.export_comic_pdf_tool:ExportComicPDFTool"),
+    ("generate_comic_page", "agent_framework.tools.comic.generate_comic_page_tool:GenerateComicPageTool"),
+]
 
 
 def register_all_tools():
@@ -144,13 +59,9 @@ def register_all_tools():
     for tool in core_tools:
         registry.register(tool)
     
-    # Optional tools (only if dependencies are available)
-    for name, tool_class in _optional_tools:
-        try:
-            tool = tool_class()
-            registry.register(tool)
-        except Exception as e:
-            print(f"Warning: Could not register {name}: {e}")
+    # Optional tools (imported on first use, if dependencies are available)
+    for name, import_path in _OPTIONAL_TOOLS:
+        registry.register_lazy(name, import_path)
     
     return registry
 
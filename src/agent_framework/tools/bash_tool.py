@@ -1,4 +1,5 @@
 """Bash command execution tool for agents."""
+import asyncio
 import subprocess
 import os
 import re
@@ -6,6 +7,7 @@ import threading
 import queue
 from typing import Dict, Optional, List, ClassVar
 from pydantic import Field
+from ..cancellation import CancellationToken, kill_process_group
 from .tool_base import BaseTool, ToolResult
 
 # Global registry of background processes
@@ -180,16 +182,18 @@ class BashTool(BaseTool):
                 return self._execute_background(command, working_directory)
 
             # FOREGROUND EXECUTION
-            # Execute the command
-            result = subprocess.run(
+            # Execute the command off the event loop; an interrupt of the
+            # agent turn kills the command and everything it started
+            result = await asyncio.to_thread(
+                self._run_foreground,
                 command,
-                shell=shell,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=working_directory,
-                env=os.environ.copy()
+                shell,
+                timeout,
+                working_directory,
+                self.get_cancellation_token(),
             )
+            if result is None:
+                return ToolResult(error="Command was cancelled")
 
             # Prepare output
             output_parts = []
@@ -231,6 +235,44 @@ class BashTool(BaseTool):
                 error=f"Error executing command: {type(e).__name__}: {str(e)}"
             )
 
+    def _run_foreground(
+        self,
+        command: str,
+        shell: bool,
+        timeout: int,
+        working_directory: Optional[str],
+        token: Optional[CancellationToken],
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Run a command in its own process group; None if the token cancelled it.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command outlives the timeout
+                (its process group is killed first)
+        """
+        process = subprocess.Popen(
+            command,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=working_directory,
+            env=os.environ.copy(),
+            start_new_session=(os.name == "posix"),
+        )
+        unregister = token.on_cancel(lambda: kill_process_group(process)) if token is not None else None
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(process)
+            process.communicate()
+            raise
+        finally:
+            if unregister is not None:
+                unregister()
+        if token is not None and token.cancelled:
+            return None
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
     def _execute_background(self, command: str, working_directory: str = None) -> ToolResult:
         """Execute command in background and return immediately with PID.
 
@@ -3,6 +3,7 @@ Comic tools for ArchiFlow.
 """
 
 from .generate_comic_panel_tool import GenerateComicPanelTool
+from .generate_comic_panels_tool import GenerateComicPanelsTool
 from .export_comic_pdf_tool import ExportComicPDFTool
 
-__all__ = ["GenerateComicPanelTool", "ExportComicPDFTool"]
+__all__ = ["GenerateComicPanelTool", "GenerateComicPanelsTool", "ExportComicPDFTool"]
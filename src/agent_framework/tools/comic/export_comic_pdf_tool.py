@@ -3,16 +3,31 @@ Export Comic PDF Tool.
 
 This tool exports comic panels to PDF format, compositing multiple panels
 per page and adding optional cover and credits pages.
+
+Each story page is decoded, resized and composited in the export worker
+processes (see tools.image_export) as soon as it is submitted, and pages
+are streamed into the PDF in order, so only a few pages are in memory.
+Preview exports render at a lower DPI and keep the resized panels, so
+exporting again after editing a panel only re-renders that panel.
 """
 
+import asyncio
 import os
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, ClassVar, Tuple
 from pathlib import Path
 from pydantic import Field
 
 from ..tool_base import BaseTool, ToolResult
+from ..image_export import (
+    CompositeJob,
+    PanelPlacement,
+    StreamingPDFWriter,
+    encode_image,
+    iter_encoded_pages,
+    paste_centered,
+)
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -79,11 +94,22 @@ class ExportComicPDFTool(BaseTool):
                 "minimum": 72,
                 "maximum": 600,
                 "default": 300
+            },
+            "preview": {
+                "type": "boolean",
+                "description": "Quick low-resolution proof (at most 100 DPI); re-exports only re-render changed panels (default: false)",
+                "default": False
             }
         },
         "required": ["session_id"]
     }
 
+    # Preview exports: resolution cap, JPEG quality and the resized-panel
+    # cache directory (inside comic_exports/)
+    PREVIEW_DPI: ClassVar[int] = 100
+    PREVIEW_QUALITY: ClassVar[int] = 80
+    PREVIEW_CACHE_DIR: ClassVar[str] = ".preview_cache"
+
     def __init__(self, **data):
         """Initialize the ExportComicPDFTool."""
         super().__init__(**data)
@@ -98,6 +124,7 @@ class ExportComicPDFTool(BaseTool):
         include_cover: bool = True,
         include_credits: bool = True,
         dpi: int = 300,
+        preview: bool = False,
         **kwargs
     ) -> ToolResult:
         """
@@ -112,6 +139,8 @@ class ExportComicPDFTool(BaseTool):
             include_cover: Add cover page
             include_credits: Add credits page
             dpi: Resolution
+            preview: Quick low-resolution export (at most PREVIEW_DPI) that
+                reuses panels resized by earlier previews
 
         Returns:
             ToolResult with PDF path or error
@@ -181,110 +210,45 @@ class ExportComicPDFTool(BaseTool):
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '_')).strip()
                 safe_title = safe_title.replace(' ', '_')
-                output_path = exports_dir / f"{safe_title}_{timestamp}.pdf"
+                suffix = "_preview" if preview else ""
+                output_path = exports_dir / f"{safe_title}_{timestamp}{suffix}.pdf"
             else:
                 output_path = Path(output_path)
 
-            # 6. Create composite page images
-            page_images = []
-
-            # Add cover page
-            if include_cover:
-                cover_img = self._create_cover_page(title, page_size, dpi)
-                page_images.append(cover_img)
-
-            # Add story pages
-            for page_num in sorted(page_panels.keys()):
-                panels = page_panels[page_num]
-
-                if use_page_mode:
-                    # Pages are already composited - just load and optionally resize
-                    for page_file in panels:
-                        try:
-                            img = Image.open(page_file)
-                            # Optionally resize to match PDF page size
-                            target_width, target_height = self._get_page_dimensions(page_size, dpi)
-                            if img.size != (target_width, target_height):
-                                # Resize while maintaining aspect ratio
-                                img.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
-                                # Center on page
-                                page_img = Image.new('RGB', (target_width, target_height), (255, 255, 255))
-                                x = (target_width - img.width) // 2
-                                y = (target_height - img.height) // 2
-                                if img.mode == 'RGBA':
-                                    page_img.paste(img, (x, y), mask=img.split()[3])
-                                else:
-                                    page_img.paste(img, (x, y))
-                                page_images.append(page_img)
-                            else:
-                                page_images.append(img)
-                        except Exception as e:
-                            logger.warning(f"Failed to load {page_file}: {e}")
-                else:
-                    # Load individual panel images and composite
-                    panel_imgs = []
-                    for panel_file in panels:
-                        try:
-                            img = Image.open(panel_file)
-                            panel_imgs.append(img)
-                        except Exception as e:
-                            logger.warning(f"Failed to load {panel_file}: {e}")
-
-                    # Composite page
-                    if panel_imgs:
-                        page_img = self._composite_page(
-                            panel_imgs, panels_per_page, page_size, dpi
-                        )
-                        page_images.append(page_img)
-
-            # Add credits page
-            if include_credits:
-                credits_img = self._create_credits_page(title, page_size, dpi)
-                page_images.append(credits_img)
-
-            # 7. Save as PDF
-            if page_images:
-                # Convert all images to RGB (PDF doesn't support RGBA)
-                rgb_images = []
-                for img in page_images:
-                    if img.mode == 'RGBA':
-                        # Create white background
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])  # Use alpha as mask
-                        rgb_images.append(background)
-                    elif img.mode != 'RGB':
-                        rgb_images.append(img.convert('RGB'))
-                    else:
-                        rgb_images.append(img)
-
-                # Save first image and append the rest
-                first_img = rgb_images[0]
-                other_imgs = rgb_images[1:] if len(rgb_images) > 1 else []
-
-                first_img.save(
-                    output_path,
-                    "PDF",
-                    resolution=dpi,
-                    save_all=True,
-                    append_images=other_imgs
-                )
+            # 6. Composite the story pages in export workers and stream
+            # them, with the cover and credits, into the PDF in order
+            if preview:
+                dpi = min(dpi, self.PREVIEW_DPI)
+            quality = self.PREVIEW_QUALITY if preview else 95
+            cache_dir = str(exports_dir / self.PREVIEW_CACHE_DIR) if preview else None
+            jobs = self._build_page_jobs(
+                page_panels, use_page_mode, panels_per_page, page_size, dpi, quality, cache_dir
+            )
 
-                logger.info(f"PDF saved to {output_path}")
-            else:
+            page_count, skipped = await asyncio.to_thread(
+                self._write_pdf, jobs, output_path, title, page_size, dpi, quality,
+                include_cover, include_credits
+            )
+            if page_count == 0:
                 return self.fail_response("No pages to export")
 
-            # 8. Get file size
+            logger.info(f"PDF saved to {output_path}")
+
+            # 7. Get file size
             file_size = output_path.stat().st_size / (1024 * 1024)  # MB
 
-            # 9. Return success
+            # 8. Return success
             result = {
                 "success": True,
                 "pdf_path": str(output_path),
                 "file_size_mb": round(file_size, 2),
-                "page_count": len(page_images),
+                "page_count": page_count,
                 "image_count": len(page_files) if use_page_mode else len(panel_files),
                 "mode": "pages" if use_page_mode else "panels",
-                "title": title
+                "title": title,
+                "dpi": dpi,
+                "preview": preview,
+                "skipped_pages": skipped
             }
 
             return self.success_response(result)
@@ -293,6 +257,92 @@ class ExportComicPDFTool(BaseTool):
             logger.error(f"PDF export failed: {e}", exc_info=True)
             return self.fail_response(f"PDF export failed: {str(e)}")
 
+    def _build_page_jobs(
+        self,
+        page_panels: Dict[int, List[Path]],
+        use_page_mode: bool,
+        panels_per_page: int,
+        page_size: str,
+        dpi: int,
+        quality: int,
+        cache_dir: Optional[str] = None
+    ) -> List[CompositeJob]:
+        """
+        Describe each story page for the export workers, in page order.
+
+        A story page with more panels than the layout has cells continues
+        on the following PDF page(s), so no panel is dropped.
+        """
+        size = self._get_page_dimensions(page_size, dpi)
+        if use_page_mode:
+            # Pre-composited pages fill the whole page
+            cells = [(0, 0, size[0], size[1])]
+        else:
+            cells = self._panel_cells(panels_per_page, page_size, dpi)
+
+        jobs = []
+        for page_num in sorted(page_panels.keys()):
+            files = page_panels[page_num]
+            if use_page_mode:
+                groups = [[page_file] for page_file in files]
+            else:
+                groups = [files[i:i + len(cells)] for i in range(0, len(files), len(cells))]
+            for group in groups:
+                placements = tuple(
+                    PanelPlacement(str(panel_file), cell)
+                    for panel_file, cell in zip(group, cells[:len(group)], strict=True)
+                )
+                jobs.append(CompositeJob(size, placements, quality, cache_dir))
+        return jobs
+
+    def _write_pdf(
+        self,
+        jobs: List[CompositeJob],
+        output_path: Path,
+        title: str,
+        page_size: str,
+        dpi: int,
+        quality: int,
+        include_cover: bool,
+        include_credits: bool
+    ) -> Tuple[int, List[str]]:
+        """
+        Stream the cover, story pages and credits into the PDF.
+
+        Runs in a worker thread. Story pages that cannot be composited are
+        skipped; if no page at all is written, no file is left behind.
+
+        Returns:
+            (pages written, names of the skipped pages' first images)
+        """
+        skipped = []
+        writer = StreamingPDFWriter(output_path, resolution=dpi, title=title)
+        try:
+            # Start compositing story pages before the cover is drawn
+            pages = iter_encoded_pages(jobs)
+            if include_cover:
+                writer.add_page(encode_image(self._create_cover_page(title, page_size, dpi), quality))
+
+            for done, (job, page) in enumerate(pages, start=1):
+                if isinstance(page, Exception):
+                    logger.warning(f"Failed to export page starting with {job.path}: {page}")
+                    skipped.append(Path(job.path).name)
+                else:
+                    writer.add_page(page)
+                self.report_progress(f"[{done}/{len(jobs)}] Exported story page {done}")
+
+            if include_credits:
+                writer.add_page(encode_image(self._create_credits_page(title, page_size, dpi), quality))
+        except BaseException:
+            writer.abort()
+            raise
+
+        if writer.page_count == 0:
+            writer.abort()
+            return 0, skipped
+        writer.close()
+        return writer.page_count, skipped
+
     def _extract_title_from_script(self, script_path: Path) -> str:
         """Extract title from script.md."""
         try:
@@ -416,7 +466,30 @@ class ExportComicPDFTool(BaseTool):
         page_size: str,
         dpi: int
     ) -> Image.Image:
-        """Composite panel images into a single page."""
+        """
+        Composite panel images into a single page.
+
+        Raises:
+            ValueError: If there are more panels than the layout has cells
+        """
+        page_width, page_height = self._get_page_dimensions(page_size, dpi)
+        cells = self._panel_cells(panels_per_page, page_size, dpi)
+        if len(panel_images) > len(cells):
+            raise ValueError(
+                f"{len(panel_images)} panels do not fit a {len(cells)}-panel page"
+            )
+        page_img = Image.new('RGB', (page_width, page_height), color=(255, 255, 255))
+
+        for panel, cell in zip(panel_images, cells[:len(panel_images)], strict=True):
+            # Resize panel to fit and center it in its cell
+            panel_resized = panel.copy()
+            panel_resized.thumbnail(cell[2:], Image.Resampling.LANCZOS)
+            paste_centered(page_img, panel_resized, cell)
+
+        return page_img
+
+    def _panel_cells(self, panels_per_page: int, page_size: str, dpi: int) -> List[Tuple[int, int, int, int]]:
+        """Grid cells (left, top, width, height) for the panels of a page, in reading order."""
         # Get page dimensions
         page_width, page_height = self._get_page_dimensions(page_size, dpi)
 
@@ -437,29 +510,17 @@ class ExportComicPDFTool(BaseTool):
         panel_width = (page_width - margin * (cols + 1)) // cols
         panel_height = (page_height - margin * (rows + 1)) // rows
 
-        # Create blank page
-        page_img = Image.new('RGB', (page_width, page_height), color=(255, 255, 255))
-
-        # Place panels
-        for idx, panel in enumerate(panel_images[:panels_per_page]):
+        cells = []
+        for idx in range(panels_per_page):
             row = idx // cols
             col = idx % cols
-
-            # Resize panel to fit
-            panel_resized = panel.copy()
-            panel_resized.thumbnail((panel_width, panel_height), Image.Resampling.LANCZOS)
-
-            # Calculate position (centered in cell)
-            x = margin + col * (panel_width + margin) + (panel_width - panel_resized.width) // 2
-            y = margin + row * (panel_height + margin) + (panel_height - panel_resized.height) // 2
-
-            # Paste panel
-            if panel_resized.mode == 'RGBA':
-                page_img.paste(panel_resized, (x, y), mask=panel_resized.split()[3])
-            else:
-                page_img.paste(panel_resized, (x, y))
-
-        return page_img
+            cells.append((
+                margin + col * (panel_width + margin),
+                margin + row * (panel_height + margin),
+                panel_width,
+                panel_height,
+            ))
+        return cells
 
     def _get_page_dimensions(self, page_size: str, dpi: int) -> tuple:
         """Get page dimensions in pixels."""
@@ -18,9 +18,11 @@ from pathlib import Path
 from pydantic import Field
 
 from ..tool_base import BaseTool, ToolResult
+from ...llm.image_batch import ImageBatchRunner
+from ...llm.image_cache import cache_key, get_image_cache, get_reference_cache
 
 try:
-    from PIL import Image, ImageDraw
+    from PIL import ImageDraw  # noqa: F401 (availability check)
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -64,6 +66,11 @@ class GenerateComicPageTool(BaseTool):
                 "type": "string",
                 "description": "Aspect ratio for the page (default: '3:4' for portrait comic page)",
                 "default": "3:4"
+            },
+            "regenerate": {
+                "type": "boolean",
+                "description": "Generate a new image even if this exact page was generated before (default: false, reuse it)",
+                "default": False
             }
         },
         "required": ["session_id", "page_number", "page_prompt"]
@@ -95,6 +102,7 @@ class GenerateComicPageTool(BaseTool):
         page_prompt: str,
         characters: Optional[List[str]] = None,
         aspect_ratio: str = "3:4",
+        regenerate: bool = False,
         **kwargs
     ) -> ToolResult:
         """
@@ -106,6 +114,7 @@ class GenerateComicPageTool(BaseTool):
             page_prompt: Complete image generation prompt (constructed by agent)
             characters: List of character names for loading reference images
             aspect_ratio: Aspect ratio (default '3:4' for portrait comic)
+            regenerate: Generate a new image even if an identical request is cached
 
         Returns:
             ToolResult with page image path or error
@@ -137,22 +146,24 @@ class GenerateComicPageTool(BaseTool):
             page_filename = f"page_{page_number:02d}.png"
             page_path = os.path.join(pages_dir, page_filename)
 
-            # Collect character reference images
+            # Collect character reference images (decoded once per session
+            # and reused until the file changes)
             ref_images = []
+            ref_digests = []
             loaded_refs = []
             if characters:
                 ref_dir = os.path.join(base_dir, "character_refs")
-                if os.path.exists(ref_dir):
-                    for char_name in characters:
-                        found_refs = self._find_character_references(ref_dir, char_name)
-                        for ref_path in found_refs:
-                            try:
-                                img = Image.open(ref_path)
-                                ref_images.append(img)
-                                loaded_refs.append(os.path.basename(ref_path))
-                                logger.info(f"Loaded reference: {os.path.basename(ref_path)}")
-                            except Exception as e:
-                                logger.warning(f"Failed to load ref {ref_path}: {e}")
+                references = get_reference_cache(ref_dir)
+                for char_name in characters:
+                    found_refs = self._find_character_references(ref_dir, char_name)
+                    for ref_path in found_refs:
+                        reference = references.load(ref_path)
+                        if reference is None:
+                            continue
+                        ref_images.append(reference.image)
+                        ref_digests.append(reference.digest)
+                        loaded_refs.append(os.path.basename(ref_path))
+                        logger.info(f"Loaded reference: {os.path.basename(ref_path)}")
 
             # Enhance prompt with reference instructions if we have references
             final_prompt = page_prompt
@@ -182,8 +193,13 @@ class GenerateComicPageTool(BaseTool):
             logger.info(f"Generating page {page_number} with aspect ratio {aspect_ratio}")
             logger.debug(f"Prompt preview: {final_prompt[:200]}...")
 
-            # Generate the page image
-            image = self.image_provider.generate_image(
+            # Generate the page image (off the event loop, rate-limited and
+            # retried). Unchanged pages are served from the image cache.
+            runner = ImageBatchRunner(self.image_provider, cache=get_image_cache())
+            image, cached = await runner.generate_cached(
+                cache_key(self.image_provider, final_prompt, ref_digests, aspect_ratio, "2K"),
+                self.image_provider.generate_image,
+                refresh=regenerate,
                 prompt=final_prompt,
                 aspect_ratio=aspect_ratio,
                 resolution="2K",
@@ -212,7 +228,8 @@ class GenerateComicPageTool(BaseTool):
                 "file_size_mb": round(file_size, 2),
                 "log_path": log_path,
                 "loaded_references": loaded_refs,
-                "reference_count": len(ref_images)
+                "reference_count": len(ref_images),
+                "cached": cached
             })
 
         except Exception as e:
@@ -236,8 +253,11 @@ class GenerateComicPageTool(BaseTool):
             List of matching file paths
         """
         import re
-        from glob import glob
+        from fnmatch import fnmatchcase
 
+        # Match against an index of the directory instead of probing the
+        # filesystem for every candidate name
+        files = get_reference_cache(ref_dir).files()
         results = []
 
         # Check for wildcard mode (ends with *)
@@ -248,15 +268,14 @@ class GenerateComicPageTool(BaseTool):
 
             # Find all files matching the pattern
             patterns = [
-                os.path.join(ref_dir, f"{safe_name.upper()}*.png"),
-                os.path.join(ref_dir, f"{safe_name.upper()}*.jpg"),
-                os.path.join(ref_dir, f"{safe_name.lower()}*.png"),
+                f"{safe_name.upper()}*.png",
+                f"{safe_name.upper()}*.jpg",
+                f"{safe_name.lower()}*.png",
             ]
 
             for pattern in patterns:
-                matches = glob(pattern)
-                for match in matches:
-                    if match not in results:
+                for filename, match in files.items():
+                    if fnmatchcase(filename, pattern) and match not in results:
                         results.append(match)
 
             logger.info(f"Wildcard search for '{char_spec}' found {len(results)} references")
@@ -278,8 +297,8 @@ class GenerateComicPageTool(BaseTool):
 
         for name in names_to_check:
             for ext in ['.png', '.jpg', '.jpeg']:
-                path = os.path.join(ref_dir, f"{name}{ext}")
-                if os.path.exists(path) and path not in results:
+                path = files.get(f"{name}{ext}")
+                if path and path not in results:
                     results.append(path)
                     return results  # Return first match for exact mode
 
@@ -288,8 +307,8 @@ class GenerateComicPageTool(BaseTool):
             base_name = safe_name.rsplit('_', 1)[0]
             for name in [base_name.upper(), base_name.lower()]:
                 for ext in ['.png', '.jpg', '.jpeg']:
-                    path = os.path.join(ref_dir, f"{name}{ext}")
-                    if os.path.exists(path):
+                    path = files.get(f"{name}{ext}")
+                    if path:
                         logger.info(f"Variant not found, falling back to base: {path}")
                         results.append(path)
                         return results
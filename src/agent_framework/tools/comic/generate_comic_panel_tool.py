@@ -15,6 +15,8 @@ from pydantic import Field
 
 from ..tool_base import BaseTool, ToolResult
 from ...llm.image_provider_base import ImageProvider
+from ...llm.image_batch import ImageBatchRunner
+from ...llm.image_cache import cache_key, get_image_cache, get_reference_cache, image_digest
 from ...llm.google_image_provider import GoogleImageProvider
 
 # Set up logger for this module
@@ -152,6 +154,11 @@ class GenerateComicPanelTool(BaseTool):
                 "description": "Image resolution",
                 "enum": ["1K", "2K", "4K"],
                 "default": "2K"
+            },
+            "regenerate": {
+                "type": "boolean",
+                "description": "Generate a new image even if this exact panel was generated before (default: false, reuse it)",
+                "default": False
             }
         },
         "required": ["prompt", "panel_type", "session_id"]
@@ -159,6 +166,8 @@ class GenerateComicPanelTool(BaseTool):
 
     image_provider: Optional[ImageProvider] = Field(default=None, exclude=True)
     character_references: Dict[str, Image.Image] = Field(default_factory=dict, exclude=True)
+    # image_digest of each entry in character_references, for cache keys
+    reference_digests: Dict[str, str] = Field(default_factory=dict, exclude=True)
 
     def __init__(self, image_provider: Optional[ImageProvider] = None, **data):
         """
@@ -420,6 +429,7 @@ class GenerateComicPanelTool(BaseTool):
         output_dir: Optional[str] = None,
         aspect_ratio: str = "4:3",
         resolution: str = "2K",
+        regenerate: bool = False,
         **kwargs
     ) -> ToolResult:
         """
@@ -450,6 +460,7 @@ class GenerateComicPanelTool(BaseTool):
             output_dir: Output directory (default: auto-determined)
             aspect_ratio: Image aspect ratio (default: "4:3")
             resolution: Image resolution (default: "2K")
+            regenerate: Generate a new image even if an identical request is cached
 
         Returns:
             ToolResult containing the image path or error message
@@ -488,49 +499,19 @@ class GenerateComicPanelTool(BaseTool):
 
             # Load character reference if specified
             ref_images = []
-            
+            ref_digests = []
+
             # Logic to find reference images
             # 1. Check if specific reference requested
             if character_reference:
-                # Check in-memory first
-                if character_reference in self.character_references:
-                    ref_images.append(self.character_references[character_reference])
-                    logger.info(f"Using in-memory character reference: {character_reference}")
-                else:
-                    # Check on disk
-                    ref_path = self._find_reference_on_disk(session_id, character_reference)
-                    if ref_path:
-                        try:
-                            img = Image.open(ref_path)
-                            ref_images.append(img)
-                            # Cache it
-                            self.character_references[character_reference] = img
-                            logger.info(f"Loaded character reference from disk: {character_reference}")
-                        except Exception as e:
-                            logger.warning(f"Failed to load reference image for {character_reference}: {e}")
+                if self._add_reference(session_id, character_reference, ref_images, ref_digests):
+                    logger.info(f"Using character reference: {character_reference}")
 
             # 2. Check if any characters in 'character_names' have references
             if not ref_images and character_names:
                 for char_name in character_names:
-                    # Check in-memory
-                    if char_name in self.character_references:
-                        ref_images.append(self.character_references[char_name])
-                        logger.info(f"Using auto-detected in-memory reference: {char_name}")
-                        continue
-                        
-                    # Check on disk
-                    ref_path = self._find_reference_on_disk(session_id, char_name)
-                    if ref_path:
-                        try:
-                            img = Image.open(ref_path)
-                            ref_images.append(img)
-                            # Cache it
-                            self.character_references[char_name] = img
-                            logger.info(f"Loaded auto-detected reference from disk: {char_name}")
-                        except Exception as e:
-                            logger.warning(f"Failed to load reference image for {char_name}: {e}")
-
-                            logger.warning(f"Failed to load reference image for {char_name}: {e}")
+                    if self._add_reference(session_id, char_name, ref_images, ref_digests):
+                        logger.info(f"Using auto-detected reference: {char_name}")
 
             # Enhance prompt with reference instructions if we have references
             if ref_images:
@@ -559,7 +540,13 @@ class GenerateComicPanelTool(BaseTool):
             os.makedirs(output_dir, exist_ok=True)
 
             # Generate image with session_id and output_dir for logging
-            image = self.image_provider.generate_image(
+            # (off the event loop, rate-limited and retried). Unchanged
+            # panels are served from the generated-image cache.
+            runner = ImageBatchRunner(self.image_provider, cache=get_image_cache())
+            image, cached = await runner.generate_cached(
+                cache_key(self.image_provider, enhanced_prompt, ref_digests, aspect_ratio, resolution),
+                self.image_provider.generate_image,
+                refresh=regenerate,
                 prompt=enhanced_prompt,
                 aspect_ratio=aspect_ratio,
                 resolution=resolution,
@@ -609,11 +596,19 @@ class GenerateComicPanelTool(BaseTool):
             # Store character reference if it's a reference sheet
             if panel_type == "character_reference" and character_names:
                 # Use variant-aware key for in-memory cache
-                cache_key = character_names[0]
+                reference_key = character_names[0]
                 if variant:
-                    cache_key = f"{character_names[0]}_{variant}"
-                self.character_references[cache_key] = pil_image
-                logger.info(f"Stored character reference: {cache_key}")
+                    reference_key = f"{character_names[0]}_{variant}"
+                # Cache it the way it will be loaded from disk later, so
+                # panels get the same pixels (and cache keys) either way
+                reference = get_reference_cache(output_dir).put(filepath, pil_image)
+                if reference:
+                    self.character_references[reference_key] = reference.image
+                    self.reference_digests[reference_key] = reference.digest
+                else:
+                    self.character_references[reference_key] = pil_image
+                    self.reference_digests.pop(reference_key, None)
+                logger.info(f"Stored character reference: {reference_key}")
 
             # Return success
             result = {
@@ -623,7 +618,8 @@ class GenerateComicPanelTool(BaseTool):
                 "panel_type": panel_type,
                 "session_id": session_id,
                 "output_dir": output_dir,
-                "image_size": pil_image.size
+                "image_size": pil_image.size,
+                "cached": cached
             }
 
             if panel_type == "character_reference":
@@ -694,6 +690,43 @@ class GenerateComicPanelTool(BaseTool):
         logger.info(f"Generated reference filename: {filename}")
         return filename
 
+    def _add_reference(
+        self,
+        session_id: str,
+        name: str,
+        ref_images: List[Image.Image],
+        ref_digests: List[str]
+    ) -> bool:
+        """
+        Append a character's reference image (and its digest) if one exists.
+
+        Checks references held in memory first, then the session's
+        character_refs directory through the session reference cache.
+
+        Returns:
+            True if a reference was added
+        """
+        image = self.character_references.get(name)
+        if image is not None:
+            digest = self.reference_digests.get(name)
+            if digest is None:
+                digest = self.reference_digests[name] = image_digest(image)
+            ref_images.append(image)
+            ref_digests.append(digest)
+            return True
+
+        ref_path = self._find_reference_on_disk(session_id, name)
+        if not ref_path:
+            return False
+        reference = get_reference_cache(os.path.dirname(ref_path)).load(ref_path)
+        if reference is None:
+            return False
+        ref_images.append(reference.image)
+        ref_digests.append(reference.digest)
+        self.character_references[name] = reference.image
+        self.reference_digests[name] = reference.digest
+        return True
+
     def get_character_reference(self, character_name: str) -> Optional[Image.Image]:
         """
         Get stored character reference image.
@@ -733,10 +766,9 @@ class GenerateComicPanelTool(BaseTool):
                 # Legacy fallback for CLI sessions
                 base_dir = os.path.join("data", "sessions", session_id)
 
-            ref_dir = os.path.join(base_dir, "character_refs")
-
-            if not os.path.exists(ref_dir):
-                return None
+            # Names are checked against an index of the directory instead
+            # of probing the filesystem for every candidate
+            references = get_reference_cache(os.path.join(base_dir, "character_refs"))
 
             # Sanitize input for filesystem matching
             safe_name = re.sub(r'[^\w\s_-]', '', character_name).strip().replace(' ', '_')
@@ -753,8 +785,8 @@ class GenerateComicPanelTool(BaseTool):
 
             for name in names_to_check:
                 for ext in ['.png', '.jpg', '.jpeg']:
-                    path = os.path.join(ref_dir, f"{name}{ext}")
-                    if os.path.exists(path):
+                    path = references.find(f"{name}{ext}")
+                    if path:
                         logger.debug(f"Found reference on disk: {path}")
                         return path
 
@@ -774,8 +806,8 @@ class GenerateComicPanelTool(BaseTool):
 
                 for name in base_names_to_check:
                     for ext in ['.png', '.jpg', '.jpeg']:
-                        path = os.path.join(ref_dir, f"{name}{ext}")
-                        if os.path.exists(path):
+                        path = references.find(f"{name}{ext}")
+                        if path:
                             logger.info(f"Variant not found, falling back to base character: {path}")
                             return path
 
@@ -788,6 +820,7 @@ class GenerateComicPanelTool(BaseTool):
     def clear_references(self):
         """Clear all stored character references."""
         self.character_references.clear()
+        self.reference_digests.clear()
         logger.info("Character references cleared")
 
     def __repr__(self):
@@ -0,0 +1,177 @@
+"""
+Generate Comic Panels Tool - batch version of generate_comic_panel.
+
+Generates every panel of a page (or a whole cast of character reference
+sheets) in one call. Panels are generated concurrently through
+ImageBatchRunner, which bounds the number of calls in flight, applies the
+provider's rate limit and retries rate-limit and server errors.
+"""
+
+import json
+import logging
+from functools import partial
+from typing import Optional, Dict, Any, List
+
+from ..tool_base import ToolResult
+from ...llm.image_batch import ImageBatchRunner
+from .generate_comic_panel_tool import GenerateComicPanelTool
+
+logger = logging.getLogger(__name__)
+
+# Per-panel fields: everything generate_comic_panel takes except the
+# shared session/output settings
+_PANEL_PROPERTIES = {
+    key: value
+    for key, value in GenerateComicPanelTool.model_fields["parameters"].default["properties"].items()
+    if key not in ("session_id", "output_dir", "aspect_ratio", "resolution")
+}
+
+
+class GenerateComicPanelsTool(GenerateComicPanelTool):
+    """
+    Tool for generating several comic panels in one call.
+
+    Each entry of ``panels`` takes the same fields as generate_comic_panel.
+    Character reference sheets in the batch are generated first, so the
+    story panels that follow can use them as references. Results are
+    returned in the order the panels were given.
+    """
+
+    name: str = "generate_comic_panels"
+    description: str = (
+        "Generate several comic panels or character reference sheets in one call "
+        "(e.g. all panels of a page). Panels are generated concurrently."
+    )
+
+    parameters: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "session_id": {
+                "type": "string",
+                "description": "Session ID for organizing images"
+            },
+            "panels": {
+                "type": "array",
+                "description": "Panels to generate; each takes the same fields as generate_comic_panel",
+                "items": {
+                    "type": "object",
+                    "properties": _PANEL_PROPERTIES,
+                    "required": ["prompt", "panel_type"]
+                },
+                "minItems": 1
+            },
+            "aspect_ratio": {
+                "type": "string",
+                "description": "Image aspect ratio for every panel (default: '4:3')",
+                "default": "4:3"
+            },
+            "resolution": {
+                "type": "string",
+                "description": "Image resolution for every panel (default: '2K')",
+                "enum": ["1K", "2K", "4K"],
+                "default": "2K"
+            },
+            "output_dir": {
+                "type": "string",
+                "description": "Output directory (default: auto-determined per panel type)"
+            }
+        },
+        "required": ["session_id", "panels"]
+    }
+
+    async def execute(
+        self,
+        session_id: str,
+        panels: List[Dict[str, Any]],
+        aspect_ratio: str = "4:3",
+        resolution: str = "2K",
+        output_dir: Optional[str] = None,
+        **kwargs
+    ) -> ToolResult:
+        """
+        Generate a batch of comic panels.
+
+        Args:
+            session_id: Session ID for organizing images
+            panels: Panel specifications (generate_comic_panel arguments)
+            aspect_ratio: Image aspect ratio for every panel
+            resolution: Image resolution for every panel
+            output_dir: Output directory (default: auto-determined)
+
+        Returns:
+            ToolResult with one entry per panel, in order, and any failures
+        """
+        if not self.image_provider:
+            return self.fail_response(
+                "No image provider available. Please configure GOOGLE_API_KEY."
+            )
+        if not panels:
+            return self.fail_response("panels must contain at least one panel")
+
+        for index, panel in enumerate(panels):
+            if not isinstance(panel, dict) or not panel.get("prompt") or not panel.get("panel_type"):
+                return self.fail_response(
+                    f"Panel {index + 1} needs at least 'prompt' and 'panel_type'"
+                )
+
+        runner = ImageBatchRunner(self.image_provider)
+        generate_panel = super().execute
+        results: List[Optional[ToolResult]] = [None] * len(panels)
+        done = 0
+
+        def on_done(order: List[int], position: int, result: Any) -> None:
+            nonlocal done
+            done += 1
+            index = order[position]
+            results[index] = result if isinstance(result, ToolResult) else self.fail_response(str(result))
+            status = "failed" if results[index].error else "done"
+            self.report_progress(f"[{done}/{len(panels)}] Panel {index + 1} {status}")
+
+        # Reference sheets first, so story panels in the same batch find them
+        references = [i for i, panel in enumerate(panels) if panel["panel_type"] == "character_reference"]
+        story = [i for i, panel in enumerate(panels) if panel["panel_type"] != "character_reference"]
+
+        for order in (references, story):
+            if not order:
+                continue
+            jobs = [
+                partial(
+                    generate_panel,
+                    **{
+                        **panels[index],
+                        "session_id": session_id,
+                        "aspect_ratio": aspect_ratio,
+                        "resolution": resolution,
+                        "output_dir": output_dir,
+                    }
+                )
+                for index in order
+            ]
+            await runner.run(jobs, on_done=partial(on_done, order))
+
+        generated = []
+        failed = []
+        for index, result in enumerate(results):
+            if result.error:
+                failed.append({"index": index + 1, "error": result.error})
+            else:
+                generated.append(json.loads(result.output))
+
+        if not generated:
+            return self.fail_response(
+                "Failed to generate any panels: " + "; ".join(f["error"] for f in failed)
+            )
+
+        logger.info(f"Generated {len(generated)}/{len(panels)} panels for session {session_id}")
+        return self.success_response({
+            "success": not failed,
+            "session_id": session_id,
+            "generated": generated,
+            "failed": failed,
+            "message": f"Generated {len(generated)} of {len(panels)} panels"
+                       + (f"; {len(failed)} failed" if failed else "")
+        })
+
+    def __repr__(self):
+        """String representation of the tool."""
+        return f"GenerateComicPanelsTool(provider={self.image_provider.__class__.__name__ if self.image_provider else None})"
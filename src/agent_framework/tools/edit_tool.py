@@ -82,10 +82,10 @@ class EditTool(BaseTool):
                     error="old_string and new_string must be different"
                 )
 
-            # Read the file contents
+            # Read the file contents (served from the session cache when unchanged)
+            cache = self.get_file_cache()
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    original_content = f.read()
+                original_content = cache.get(file_path).content
             except UnicodeDecodeError:
                 return ToolResult(
                     error=f"File appears to be binary or not UTF-8 encoded: {file_path}"
@@ -117,10 +117,9 @@ class EditTool(BaseTool):
                 new_content = original_content.replace(old_string, new_string, 1)
                 replacements_made = 1
 
-            # Write the modified content back to the file
+            # Write the modified content back to the file and the cache
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                cache.write(file_path, new_content)
             except PermissionError:
                 return ToolResult(
                     error=f"Permission denied: Cannot write to {file_path}"
@@ -192,8 +191,7 @@ class SafeEditTool(EditTool):
             # Create backup
             backup_path = file_path + ".bak"
             try:
-                with open(file_path, 'r', encoding='utf-8') as source:
-                    content = source.read()
+                content = self.get_file_cache().get(file_path).content
                 with open(backup_path, 'w', encoding='utf-8') as backup:
                     backup.write(content)
             except Exception as e:
@@ -0,0 +1,236 @@
+"""
+Session-scoped file content cache for the file tools.
+
+ReadTool, EditTool, MultiEditTool and WriteTool share one FileCache per
+session. Entries are keyed by (path, mtime_ns, size) so any out-of-band
+modification is picked up by a single stat() call, and they are evicted in
+LRU order once the cache exceeds its byte budget. Each entry lazily builds
+a line-offset index so offset/limit slicing does not rescan the file.
+Files larger than the whole budget are never cached; read_lines() streams
+just the requested range of those instead of loading them.
+
+The cache also owns the per-session read-before-write state that used to
+live in a class-level set on WriteTool.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
+
+# Default per-session byte budget for cached file contents
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Session key used by tools that run without an execution context
+DEFAULT_SESSION = "__default__"
+
+
+def _normalize(file_path: str) -> str:
+    return os.path.normpath(os.path.abspath(file_path))
+
+
+@dataclass
+class CachedFile:
+    """Decoded contents of a file together with its stat signature."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    content: str
+    _line_offsets: Optional[List[int]] = field(default=None, repr=False)
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Character offsets of the start of every line (built on first use)."""
+        if self._line_offsets is None:
+            content = self.content
+            offsets = [0]
+            pos = content.find('\n')
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = content.find('\n', pos + 1)
+            # A trailing newline (or an empty file) does not start a new line
+            if offsets[-1] == len(content):
+                offsets.pop()
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the file."""
+        return len(self.line_offsets)
+
+    def get_lines(self, start: int, count: int) -> List[str]:
+        """Return up to ``count`` lines starting at 0-indexed line ``start``.
+
+        Lines are returned without their trailing newline.
+        """
+        offsets = self.line_offsets
+        total = len(offsets)
+        end = min(start + count, total)
+        content = self.content
+        lines = []
+        for i in range(start, end):
+            stop = offsets[i + 1] if i + 1 < total else len(content)
+            lines.append(content[offsets[i]:stop].rstrip('\n'))
+        return lines
+
+
+class FileCache:
+    """LRU cache of decoded file contents bounded by total bytes.
+
+    Thread-safe; tools may be executed from worker threads by the runtimes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._total_bytes = 0
+        self._read_files: Set[str] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held by cached entries."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_path: str) -> CachedFile:
+        """Return the cached contents of a file, reading it if stale or absent.
+
+        Raises:
+            OSError: If the file cannot be stat'ed or opened
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        path = _normalize(file_path)
+        st = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        entry = CachedFile(path=path, mtime_ns=st.st_mtime_ns, size=st.st_size, content=content)
+        self._store(entry)
+        return entry
+
+    def read_lines(self, file_path: str, start: int, count: int) -> Tuple[List[str], Optional[int]]:
+        """Return up to ``count`` lines starting at 0-indexed line ``start``.
+
+        Files that fit the cache are served from it. Larger ones are streamed,
+        so paging through a big log reads only up to the requested range.
+
+        Returns:
+            Tuple of (lines without trailing newlines, total line count). The
+            count is None when a streamed range ended before the end of the file.
+
+        Raises:
+            OSError: If the file cannot be stat'ed or opened
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        path = _normalize(file_path)
+        if os.stat(path).st_size <= self.max_bytes:
+            entry = self.get(path)
+            return entry.get_lines(start, count), entry.line_count
+
+        with open(path, 'r', encoding='utf-8') as f:
+            skipped = sum(1 for _ in islice(f, start))
+            lines = [line.rstrip('\n') for line in islice(f, count)]
+            if len(lines) < count:
+                return lines, skipped + len(lines)
+            return lines, None
+
+    def write(self, file_path: str, content: str) -> CachedFile:
+        """Write content to a file and update the cache with the new contents.
+
+        The file is also marked as read, since the caller now knows its contents.
+        """
+        path = _normalize(file_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        st = os.stat(path)
+
+        entry = CachedFile(path=path, mtime_ns=st.st_mtime_ns, size=st.st_size, content=content)
+        self._store(entry)
+        self.mark_read(path)
+        return entry
+
+    def invalidate(self, file_path: str) -> None:
+        """Drop a file from the cache (read-before-write state is kept)."""
+        path = _normalize(file_path)
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def mark_read(self, file_path: str) -> None:
+        """Record that the agent has seen the contents of a file."""
+        with self._lock:
+            self._read_files.add(_normalize(file_path))
+
+    def was_read(self, file_path: str) -> bool:
+        """Check whether a file was read (or written) in this session."""
+        with self._lock:
+            return _normalize(file_path) in self._read_files
+
+    def clear(self) -> None:
+        """Drop all cached contents and read-before-write state."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._read_files.clear()
+
+    def _store(self, entry: CachedFile) -> None:
+        with self._lock:
+            old = self._entries.pop(entry.path, None)
+            if old is not None:
+                self._total_bytes -= old.size
+
+            # Files larger than the whole budget are served but never cached
+            if entry.size > self.max_bytes:
+                return
+
+            self._entries[entry.path] = entry
+            self._total_bytes += entry.size
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+
+
+# Global registry of per-session caches
+_session_caches: Dict[str, FileCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_file_cache(session_id: Optional[str] = None) -> FileCache:
+    """Get (or create) the file cache for a session.
+
+    Args:
+        session_id: Session identifier. None selects the shared default cache
+            used by tools running without an execution context.
+    """
+    key = session_id or DEFAULT_SESSION
+    with _registry_lock:
+        cache = _session_caches.get(key)
+        if cache is None:
+            cache = FileCache()
+            _session_caches[key] = cache
+        return cache
+
+
+def release_file_cache(session_id: Optional[str] = None) -> None:
+    """Discard the file cache of a session, freeing its memory."""
+    with _registry_lock:
+        _session_caches.pop(session_id or DEFAULT_SESSION, None)
@@ -0,0 +1,115 @@
+"""
+Process-wide pooled HTTP client for the web tools.
+
+WebFetchTool and the WebSearchTool backends used to create an
+httpx.AsyncClient per call and pay TCP+TLS setup every time. This module
+keeps one pooled client per event loop (httpx clients cannot be shared
+across loops) with keep-alive, HTTP/2 when the optional ``h2`` package is
+installed, and a per-host concurrency limit so a burst of fetches to one
+site cannot monopolize the pool. A loop's client is closed when the loop
+shuts down its async generators (asyncio.run does this before closing).
+"""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+# Pool settings
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0
+MAX_CONNECTIONS_PER_HOST = 6
+DEFAULT_TIMEOUT = 30.0
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _LoopPool:
+    """Client and per-host semaphores bound to one event loop."""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # Started in the pool's loop, which finalizes it on shutdown
+        self.closer = _close_on_shutdown(self.client)
+
+
+async def _close_on_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """Suspends until its loop calls shutdown_asyncgens(), then closes ``client``."""
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+# One pool per running event loop; entries vanish with their loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pool() -> _LoopPool:
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool.client.is_closed:
+        pool = _LoopPool()
+        _pools[loop] = pool
+        # Run to the first yield: this registers the generator with the
+        # loop (and never awaits, so it completes synchronously)
+        try:
+            pool.closer.asend(None).send(None)
+        except StopIteration:
+            pass
+    return pool
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient for the running event loop.
+
+    The client must not be closed by callers; use ``close_http_client``.
+    """
+    return _get_pool().client
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Acquire a per-host concurrency slot and yield the shared client.
+
+    Usage:
+        async with host_slot(url) as client:
+            response = await client.get(url)
+    """
+    pool = _get_pool()
+    host = urlparse(url).netloc.lower()
+    semaphore = pool.host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+        pool.host_semaphores[host] = semaphore
+
+    async with semaphore:
+        yield pool.client
+
+
+async def close_http_client(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """Close the shared client of a loop (the running loop by default)."""
+    loop = loop or asyncio.get_running_loop()
+    pool = _pools.pop(loop, None)
+    if pool is not None:
+        await pool.closer.aclose()
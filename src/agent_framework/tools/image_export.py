@@ -0,0 +1,604 @@
+"""
+Streaming image-to-PDF export shared by the slide and comic export tools.
+
+Building a PDF with PIL's ``save_all`` needs every page decoded, converted
+and resized up front, so a 60-slide 2K deck holds hundreds of MB of
+bitmaps before the first byte is written. Here each page is prepared on
+its own - decoded, flattened onto white, resized and JPEG encoded - and
+StreamingPDFWriter appends it to the file straight away, embedding the
+JPEG as-is (DCTDecode) so it is not decoded again. Only a small window
+of encoded pages is in memory at any time.
+
+A page is either one image scaled to fit (PageJob) or several images
+composited onto a blank page (CompositeJob, used for comic pages). Page
+preparation runs in a pool of worker processes when more than one core is
+available (``ARCHIFLOW_EXPORT_WORKERS`` overrides the count); pages are
+still written in order.
+
+Usage:
+    jobs = [PageJob(path, box=(2232, 1674)) for path in slide_files]
+    pages, failures = write_pdf(jobs, "deck.pdf", resolution=300.0)
+"""
+
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Encoded pages waiting to be written, per worker process
+_PREFETCH_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class PageJob:
+    """One image to place on a PDF page."""
+
+    path: str
+    """Source image file."""
+
+    box: Tuple[int, int]
+    """Target size in pixels; the image is scaled to fit it, keeping its aspect ratio."""
+
+    quality: int = 95
+    """JPEG quality (1-100)."""
+
+    shrink_only: bool = False
+    """Only scale down (like Image.thumbnail); smaller images keep their size."""
+
+
+@dataclass(frozen=True)
+class EncodedPage:
+    """A page image ready to embed in a PDF."""
+
+    data: bytes
+    """JPEG data."""
+
+    width: int
+    height: int
+
+    grayscale: bool = False
+    """True for single-channel (DeviceGray) JPEGs."""
+
+
+@dataclass(frozen=True)
+class PanelPlacement:
+    """One image placed in a cell of a composited page."""
+
+    path: str
+    """Source image file."""
+
+    cell: Tuple[int, int, int, int]
+    """(left, top, width, height) in page pixels; the image is shrunk to fit and centred."""
+
+
+@dataclass(frozen=True)
+class CompositeJob:
+    """Several images composited onto one white page."""
+
+    size: Tuple[int, int]
+    """Page size in pixels."""
+
+    panels: Tuple[PanelPlacement, ...]
+    """Images to place, in drawing order."""
+
+    quality: int = 95
+    """JPEG quality (1-100)."""
+
+    cache_dir: Optional[str] = None
+    """Directory of already resized panels to reuse (and fill), e.g. for previews."""
+
+    @property
+    def path(self) -> str:
+        """Source of the first panel, used to identify the page in progress and errors."""
+        return self.panels[0].path if self.panels else ""
+
+
+ExportJob = Union[PageJob, CompositeJob]
+
+
+def fit_size(size: Tuple[int, int], box: Tuple[int, int], shrink_only: bool = False) -> Tuple[int, int]:
+    """
+    Size that fits ``size`` into ``box`` keeping the aspect ratio.
+
+    Args:
+        size: Image (width, height)
+        box: Bounding (width, height)
+        shrink_only: Return ``size`` unchanged if it already fits
+
+    Returns:
+        (width, height) touching the box on the constraining side
+    """
+    width, height = size
+    box_width, box_height = box
+    if shrink_only and width <= box_width and height <= box_height:
+        return size
+
+    aspect = width / height
+    if aspect > box_width / box_height:
+        new_width = box_width
+        new_height = int(new_width / aspect)
+    else:
+        new_height = box_height
+        new_width = int(new_height * aspect)
+    return max(1, new_width), max(1, new_height)
+
+
+def flatten(img: Image.Image) -> Image.Image:
+    """Convert an image to RGB or L, compositing any transparency onto white."""
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode == "P" and "transparency" in img.info:
+        img = img.convert("RGBA")
+    if img.mode in ("RGBA", "LA", "PA"):
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img.convert("RGBA"), mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def encode_page(job: PageJob) -> EncodedPage:
+    """
+    Decode, flatten, resize and JPEG-encode one page.
+
+    Runs in export worker processes, so it only takes and returns
+    picklable values.
+
+    Args:
+        job: Page to prepare
+
+    Returns:
+        EncodedPage with the JPEG data and its pixel size
+    """
+    with Image.open(job.path) as img:
+        target = fit_size(img.size, job.box, job.shrink_only)
+        # JPEG sources can decode straight at a reduced scale
+        img.draft(img.mode, target)
+        page = flatten(img)
+        if page.size != target:
+            page = page.resize(target, Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        page.save(buffer, "JPEG", quality=job.quality)
+        return EncodedPage(
+            data=buffer.getvalue(),
+            width=page.width,
+            height=page.height,
+            grayscale=page.mode == "L",
+        )
+
+
+def paste_centered(page: Image.Image, img: Image.Image, cell: Tuple[int, int, int, int]) -> None:
+    """Paste ``img`` centred in ``cell`` of ``page``, using its alpha channel as the mask."""
+    left, top, width, height = cell
+    x = left + (width - img.width) // 2
+    y = top + (height - img.height) // 2
+    if img.mode == "RGBA":
+        page.paste(img, (x, y), mask=img.getchannel("A"))
+    else:
+        page.paste(img, (x, y))
+
+
+def _load_fitted(path: str, box: Tuple[int, int], cache_dir: Optional[str]) -> Image.Image:
+    """
+    Decode an image shrunk to fit ``box``, going through ``cache_dir`` if given.
+
+    Cache entries are named after the source file, the box and the source's
+    mtime and size, so an edited panel misses and its stale entries are
+    removed.
+    """
+    cached = None
+    if cache_dir:
+        stat = os.stat(path)
+        stem = Path(path).stem
+        cached = os.path.join(
+            cache_dir, f"{stem}.{box[0]}x{box[1]}.{stat.st_mtime_ns:x}-{stat.st_size:x}.png"
+        )
+        try:
+            img = Image.open(cached)
+            img.load()
+            return img
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached panel {cached}: {e}")
+
+    with Image.open(path) as img:
+        target = fit_size(img.size, box, shrink_only=True)
+        img.draft(img.mode, target)
+        fitted = flatten(img)
+        if fitted.size != target:
+            fitted = fitted.resize(target, Image.Resampling.LANCZOS)
+        elif fitted is img:
+            fitted = img.copy()
+
+    if cached:
+        prefix = f"{stem}."
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name != os.path.basename(cached):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        try:
+            fitted.save(tmp, "PNG", compress_level=1)
+            os.replace(tmp, cached)
+        except OSError as e:
+            logger.warning(f"Could not cache resized panel {cached}: {e}")
+            Path(tmp).unlink(missing_ok=True)
+    return fitted
+
+
+def encode_composite(job: CompositeJob) -> EncodedPage:
+    """
+    Decode, resize and composite a page's panels, then JPEG-encode the page.
+
+    Panels that cannot be read are left blank; the page only fails if none
+    of them can be read. Runs in export worker processes like encode_page.
+
+    Args:
+        job: Page to composite
+
+    Returns:
+        EncodedPage of ``job.size``
+    """
+    if job.cache_dir:
+        os.makedirs(job.cache_dir, exist_ok=True)
+
+    page = Image.new("RGB", job.size, (255, 255, 255))
+    placed = 0
+    errors = []
+    for panel in job.panels:
+        left, top, width, height = panel.cell
+        try:
+            img = _load_fitted(panel.path, (width, height), job.cache_dir)
+        except Exception as e:
+            logger.warning(f"Failed to load {panel.path}: {e}")
+            errors.append(f"{Path(panel.path).name}: {e}")
+            continue
+        paste_centered(page, img, panel.cell)
+        placed += 1
+
+    if job.panels and not placed:
+        raise ValueError("No panel could be read (" + "; ".join(errors) + ")")
+    return encode_image(page, job.quality)
+
+
+def prepare_page(job: ExportJob) -> EncodedPage:
+    """Prepare any export job (the function run by the worker processes)."""
+    if isinstance(job, CompositeJob):
+        return encode_composite(job)
+    return encode_page(job)
+
+
+def encode_image(img: Image.Image, quality: int = 95) -> EncodedPage:
+    """JPEG-encode an already composed page image."""
+    page = flatten(img)
+    buffer = io.BytesIO()
+    page.save(buffer, "JPEG", quality=quality)
+    return EncodedPage(
+        data=buffer.getvalue(),
+        width=page.width,
+        height=page.height,
+        grayscale=page.mode == "L",
+    )
+
+
+class StreamingPDFWriter:
+    """
+    Writes a PDF one JPEG page at a time.
+
+    Each page is written to disk as soon as it is added; only the byte
+    offsets of the PDF objects are kept until close() writes the page tree
+    and cross-reference table. Pages are sized so that the image has the
+    given resolution, like PIL's PDF writer.
+
+    Usage:
+        with StreamingPDFWriter("out.pdf", resolution=300.0) as pdf:
+            for page in pages:
+                pdf.add_page(page)
+    """
+
+    _CATALOG = 1
+    _PAGES = 2
+    _INFO = 3
+
+    def __init__(self, path: Union[str, Path], resolution: float = 300.0, title: Optional[str] = None):
+        """
+        Open the output file and write the PDF header.
+
+        Args:
+            path: Output PDF path
+            resolution: Image pixels per inch (sets the page size)
+            title: Document title stored in the PDF info dictionary
+        """
+        if resolution <= 0:
+            raise ValueError(f"resolution must be positive, got {resolution}")
+
+        self.path = Path(path)
+        self.resolution = resolution
+        self.title = title
+        self._file = open(self.path, "wb")
+        self._offsets = {}
+        self._next_id = self._INFO + 1
+        self._page_ids: List[int] = []
+
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages written so far."""
+        return len(self._page_ids)
+
+    def _allocate(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id: int, body: bytes, stream: Optional[bytes] = None) -> None:
+        self._offsets[obj_id] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % obj_id)
+        self._file.write(body)
+        if stream is not None:
+            self._file.write(b"\nstream\n")
+            self._file.write(stream)
+            self._file.write(b"\nendstream")
+        self._file.write(b"\nendobj\n")
+
+    def add_page(self, page: EncodedPage) -> None:
+        """
+        Append a page showing one JPEG image.
+
+        Args:
+            page: Encoded page image
+        """
+        image_id = self._allocate()
+        contents_id = self._allocate()
+        page_id = self._allocate()
+
+        width = page.width * 72.0 / self.resolution
+        height = page.height * 72.0 / self.resolution
+        color_space = b"/DeviceGray" if page.grayscale else b"/DeviceRGB"
+
+        self._write_object(
+            image_id,
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s "
+            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>"
+            % (page.width, page.height, color_space, len(page.data)),
+            page.data,
+        )
+        contents = b"q %.4f 0 0 %.4f 0 0 cm /Im0 Do Q" % (width, height)
+        self._write_object(contents_id, b"<< /Length %d >>" % len(contents), contents)
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.4f %.4f] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._PAGES, width, height, image_id, contents_id),
+        )
+        self._page_ids.append(page_id)
+
+    def close(self) -> None:
+        """Write the page tree, info dictionary and cross-reference table."""
+        if self._file.closed:
+            return
+
+        try:
+            kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+            self._write_object(
+                self._PAGES,
+                b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)),
+            )
+            self._write_object(self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES)
+            info = b"<< /Producer (ArchiFlow)"
+            if self.title:
+                info += b" /Title " + _pdf_text(self.title)
+            self._write_object(self._INFO, info + b" >>")
+
+            xref_offset = self._file.tell()
+            self._file.write(b"xref\n0 %d\n" % self._next_id)
+            self._file.write(b"0000000000 65535 f \n")
+            for obj_id in range(1, self._next_id):
+                self._file.write(b"%010d 00000 n \n" % self._offsets[obj_id])
+            self._file.write(
+                b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                % (self._next_id, self._CATALOG, self._INFO, xref_offset)
+            )
+        finally:
+            self._file.close()
+
+    def abort(self) -> None:
+        """Close and delete the partially written file."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "StreamingPDFWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _pdf_text(text: str) -> bytes:
+    """Encode a PDF text string (UTF-16 with BOM, hex form)."""
+    return b"<FEFF" + text.encode("utf-16-be").hex().upper().encode("ascii") + b">"
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def export_worker_count() -> int:
+    """
+    Number of processes to prepare pages in.
+
+    Reads ``ARCHIFLOW_EXPORT_WORKERS`` (default: up to 4, one per core).
+    Always 1 inside daemonic processes (e.g. ProcessPoolRuntime workers),
+    which may not start children.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    configured = os.environ.get("ARCHIFLOW_EXPORT_WORKERS")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning(f"Invalid ARCHIFLOW_EXPORT_WORKERS={configured!r}, using default")
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            # Spawn: forking the server's threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_export_workers() -> None:
+    """Stop the page preparation processes (started again on demand)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_export_workers)
+
+
+def iter_encoded_pages(
+    jobs: Iterable[ExportJob],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[ExportJob, Union[EncodedPage, Exception]]]:
+    """
+    Prepare pages, yielding them in job order.
+
+    With more than one worker, up to two pages per worker are prepared
+    ahead of the consumer; memory stays bounded however many jobs there are.
+
+    Args:
+        jobs: Pages to prepare
+        max_workers: Worker processes (default: export_worker_count())
+
+    Yields:
+        (job, EncodedPage) or (job, exception) if the page failed
+    """
+    workers = max_workers or export_worker_count()
+    jobs = iter(jobs)
+
+    if workers > 1:
+        executor = _get_executor(workers)
+        pending: Deque[Tuple[ExportJob, Future]] = deque()
+        try:
+            while True:
+                while len(pending) < workers * _PREFETCH_PER_WORKER:
+                    job = next(jobs, None)
+                    if job is None:
+                        break
+                    pending.append((job, executor.submit(prepare_page, job)))
+                if not pending:
+                    return
+
+                job, future = pending.popleft()
+                try:
+                    yield job, future.result()
+                except BrokenProcessPool:
+                    logger.warning("Export worker pool broke; preparing remaining pages in-process")
+                    shutdown_export_workers()
+                    jobs = _chain([job], [queued for queued, _ in pending], jobs)
+                    pending.clear()
+                    break
+                except Exception as e:
+                    yield job, e
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    for job in jobs:
+        try:
+            yield job, prepare_page(job)
+        except Exception as e:
+            yield job, e
+
+
+def _chain(*iterables: Iterable[ExportJob]) -> Iterator[ExportJob]:
+    for iterable in iterables:
+        yield from iterable
+
+
+ProgressCallback = Callable[[int, int, ExportJob], None]
+
+
+def write_pdf(
+    jobs: List[ExportJob],
+    path: Union[str, Path],
+    resolution: float = 300.0,
+    title: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Prepare pages and stream them into a PDF.
+
+    Pages that cannot be read are skipped. If none can, no file is left
+    behind.
+
+    Args:
+        jobs: Pages in document order
+        path: Output PDF path
+        resolution: Image pixels per inch
+        title: Document title
+        max_workers: Worker processes (default: export_worker_count())
+        on_progress: Called with (pages done, total, job) after each page
+
+    Returns:
+        (pages written, [(source path, error message)] for skipped pages)
+    """
+    failures: List[Tuple[str, str]] = []
+    writer = StreamingPDFWriter(path, resolution=resolution, title=title)
+    try:
+        for done, (job, page) in enumerate(iter_encoded_pages(jobs, max_workers), start=1):
+            if isinstance(page, Exception):
+                logger.error(f"Error processing page {job.path}: {page}")
+                failures.append((job.path, str(page)))
+            else:
+                writer.add_page(page)
+            if on_progress is not None:
+                on_progress(done, len(jobs), job)
+    except BaseException:
+        writer.abort()
+        raise
+
+    if writer.page_count == 0:
+        writer.abort()
+        return 0, failures
+
+    writer.close()
+    return writer.page_count, failures
@@ -162,6 +162,8 @@ class MultiEditTool(BaseTool):
                         error=f"Invalid edit operation {i + 1}: {str(e)}"
                     )
 
+            cache = self.get_file_cache()
+
             # Check if this is a file creation (first edit has empty old_string)
             is_creation = (len(edit_operations) > 0 and
                           edit_operations[0].old_string == "" and
@@ -206,19 +208,14 @@ class MultiEditTool(BaseTool):
                     )
 
                 # Check if file was read first (for existing files)
-                try:
-                    from .write_tool import WriteTool
-                    if not WriteTool.was_file_read(file_path):
-                        return ToolResult(
-                            error=f"File must be read first before editing. Use Read tool on {file_path}"
-                        )
-                except ImportError:
-                    pass  # WriteTool not available
+                if not cache.was_read(file_path):
+                    return ToolResult(
+                        error=f"File must be read first before editing. Use Read tool on {file_path}"
+                    )
 
-                # Read original content
+                # Read original content (served from the session cache when unchanged)
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        original_content = f.read()
+                    original_content = cache.get(file_path).content
                 except UnicodeDecodeError:
                     return ToolResult(
                         error=f"File appears to be binary or not UTF-8 encoded: {file_path}"
@@ -269,10 +266,9 @@ class MultiEditTool(BaseTool):
                 )
                 edits_applied += 1
 
-            # Write the final content
+            # Write the final content (write-through also marks the file as read)
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(final_content)
+                cache.write(file_path, final_content)
             except PermissionError:
                 return ToolResult(
                     error=f"Permission denied: Cannot write to {file_path}"
@@ -296,13 +292,6 @@ class MultiEditTool(BaseTool):
                 change_type = "added" if final_lines > original_lines else "removed"
                 success_msg += f"{lines_changed} line(s) {change_type}"
 
-            # Mark file as read for future write operations
-            try:
-                from .write_tool import WriteTool
-                WriteTool.mark_as_read(file_path)
-            except ImportError:
-                pass
-
             return ToolResult(output=success_msg)
 
         except Exception as e:
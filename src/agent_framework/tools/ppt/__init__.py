@@ -6,11 +6,13 @@ including image generation, PPTX export, and PDF export functionality.
 """
 
 from .generate_image_tool import GenerateImageTool
+from .generate_slide_images_tool import GenerateSlideImagesTool
 from .export_pptx_tool import ExportPPTXTool
 from .export_pdf_tool import ExportPDFTool
 
 __all__ = [
     "GenerateImageTool",
+    "GenerateSlideImagesTool",
     "ExportPPTXTool",
     "ExportPDFTool",
 ]
\ No newline at end of file
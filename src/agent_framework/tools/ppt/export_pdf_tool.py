@@ -2,9 +2,12 @@
 Export PDF Tool for PPT Agent MVP.
 
 This tool converts generated slide images into PDF format.
-It uses PIL to create high-quality PDF files from slide images.
+Slides are resized and JPEG-encoded one at a time and streamed into
+the PDF (see tools.image_export), so memory does not grow with the
+number of slides.
 """
 
+import asyncio
 import os
 import logging
 from datetime import datetime
@@ -12,7 +15,7 @@ from typing import Optional, Dict, Any, List, ClassVar
 from pathlib import Path
 
 from ..tool_base import BaseTool, ToolResult
-from PIL import Image
+from ..image_export import PageJob, write_pdf
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -169,72 +172,21 @@ class ExportPDFTool(BaseTool):
             if orientation == "portrait":
                 page_width, page_height = page_height, page_width
 
-            # Convert images and create PDF
-            pdf_images = []
-            for slide_file in slide_files:
-                try:
-                    img_path = Path(slide_file)
-                    if not img_path.exists():
-                        logger.warning(f"Slide file not found: {slide_file}")
-                        continue
-
-                    # Open and convert image
-                    with Image.open(img_path) as img:
-                        # Convert to RGB if necessary (PDF requires RGB)
-                        if img.mode not in ('RGB', 'L'):
-                            if img.mode == 'RGBA':
-                                # Create white background for transparency
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[-1])
-                                img = background
-                            elif img.mode == 'LA':
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[-1])
-                                img = background
-                            elif img.mode == 'P':
-                                img = img.convert('RGB')
-                            else:
-                                img = img.convert('RGB')
-
-                        # Calculate scaling to fit page
-                        img_width, img_height = img.size
-                        page_aspect = page_width / page_height
-                        img_aspect = img_width / img_height
-
-                        if img_aspect > page_aspect:
-                            # Image is wider than page - scale to width
-                            new_width = int(page_width * 0.9)  # 90% of page width
-                            new_height = int(new_width / img_aspect)
-                        else:
-                            # Image is taller than page - scale to height
-                            new_height = int(page_height * 0.9)  # 90% of page height
-                            new_width = int(new_height * img_aspect)
-
-                        # Resize image while maintaining aspect ratio
-                        img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        pdf_images.append(img_resized)
-
-                except Exception as e:
-                    logger.error(f"Error processing slide {slide_file}: {e}")
-                    continue
-
-            if not pdf_images:
-                return self.fail_response("No valid images could be processed for PDF creation")
+            # Prepare each slide (in worker processes when cores are free)
+            # and stream it into the PDF, so only a few pages are in memory
+            box = (int(page_width * 0.9), int(page_height * 0.9))  # 90% of the page
+            jobs = [PageJob(str(slide_file), box, quality) for slide_file in slide_files]
+
+            def on_progress(done: int, total: int, job: PageJob) -> None:
+                self.report_progress(f"[{done}/{total}] Exported {Path(job.path).name}")
 
-            # Save images as PDF
-            if pdf_images[0].mode != 'RGB':
-                pdf_images[0] = pdf_images[0].convert('RGB')
-
-            # Save first image as PDF with additional images
-            pdf_images[0].save(
-                str(filepath),
-                "PDF",
-                resolution=300.0,
-                quality=quality,
-                save_all=True,
-                append_images=pdf_images[1:]
+            page_count, failures = await asyncio.to_thread(
+                write_pdf, jobs, filepath, 300.0, title, None, on_progress
             )
 
+            if page_count == 0:
+                return self.fail_response("No valid images could be processed for PDF creation")
+
             logger.info(f"PDF saved to: {filepath}")
 
             # Return success with file information
@@ -244,7 +196,8 @@ class ExportPDFTool(BaseTool):
                 "filename": filename,
                 "title": title,
                 "session_id": session_id,
-                "page_count": len(pdf_images),
+                "page_count": page_count,
+                "skipped_slides": [Path(path).name for path, _ in failures],
                 "input_dir": str(input_path.absolute()),
                 "output_dir": str(output_path.absolute()),
                 "page_size": page_size,
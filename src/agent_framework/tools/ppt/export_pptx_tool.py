@@ -6,6 +6,7 @@ It finds all slide_*.png files in the current directory and creates a PPTX
 with proper 16:9 aspect ratio (10" x 5.625").
 """
 
+import asyncio
 import os
 import logging
 import glob
@@ -154,68 +155,12 @@ class ExportPPTXTool(BaseTool):
             filename = f"{safe_title}_{timestamp}.pptx"
             filepath = output_path / filename
 
-            # Create PowerPoint presentation
-            prs = Presentation()
-
-            # Set slide size to 16:9
-            prs.slide_width = Inches(self.SLIDE_WIDTH_INCHES)
-            prs.slide_height = Inches(self.SLIDE_HEIGHT_INCHES)
-
-            # Add slides
-            slide_count = 0
-            for slide_file in slide_files:
-                try:
-                    # Load the image to get dimensions
-                    img_path = Path(slide_file)
-                    if not img_path.exists():
-                        logger.warning(f"Slide file not found: {slide_file}")
-                        continue
-
-                    with Image.open(img_path) as img:
-                        img_width, img_height = img.size
-
-                    # Add a blank slide
-                    slide_layout = prs.slide_layouts[6]  # Blank layout
-                    slide = prs.slides.add_slide(slide_layout)
-
-                    # Calculate image dimensions to fit slide
-                    slide_width_emu = prs.slide_width
-                    slide_height_emu = prs.slide_height
-
-                    # Determine scaling to fit
-                    width_scale = slide_width_emu / (img_width * 9525)  # Convert pixels to EMU
-                    height_scale = slide_height_emu / (img_height * 9525)
-                    scale = min(width_scale, height_scale)
-
-                    # Calculate final dimensions
-                    final_width = img_width * 9525 * scale
-                    final_height = img_height * 9525 * scale
-
-                    # Center the image on the slide
-                    left = (slide_width_emu - final_width) / 2
-                    top = (slide_height_emu - final_height) / 2
-
-                    # Add image to slide
-                    slide.shapes.add_picture(
-                        str(img_path.absolute()),
-                        left=left,
-                        top=top,
-                        width=final_width,
-                        height=final_height
-                    )
-
-                    slide_count += 1
-                    logger.info(f"Added slide {slide_count}: {img_path.name}")
-
-                except Exception as e:
-                    logger.error(f"Error adding slide {slide_file}: {e}")
-                    continue
+            # Build and save off the event loop; slides are added one by one
+            slide_count = await asyncio.to_thread(self._build_presentation, slide_files, filepath)
 
             if slide_count == 0:
                 return self.fail_response("No slides were successfully added to the presentation")
 
-            # Save the presentation
-            prs.save(str(filepath))
             logger.info(f"Presentation saved to: {filepath}")
 
             # Return success with file information
@@ -239,6 +184,84 @@ class ExportPPTXTool(BaseTool):
             logger.error(error_msg, exc_info=True)
             return self.fail_response(error_msg)
 
+    def _build_presentation(self, slide_files: List[str], filepath: Path) -> int:
+        """
+        Create the presentation and save it.
+
+        Only image headers are decoded (for the slide geometry); python-pptx
+        embeds the files as they are. Runs in a worker thread.
+
+        Args:
+            slide_files: Slide images in order
+            filepath: Output PPTX path
+
+        Returns:
+            Number of slides added (nothing is saved if 0)
+        """
+        # Create PowerPoint presentation
+        prs = Presentation()
+
+        # Set slide size to 16:9
+        prs.slide_width = Inches(self.SLIDE_WIDTH_INCHES)
+        prs.slide_height = Inches(self.SLIDE_HEIGHT_INCHES)
+
+        # Add slides
+        slide_count = 0
+        for index, slide_file in enumerate(slide_files, start=1):
+            try:
+                # Load the image to get dimensions
+                img_path = Path(slide_file)
+                if not img_path.exists():
+                    logger.warning(f"Slide file not found: {slide_file}")
+                    continue
+
+                with Image.open(img_path) as img:
+                    img_width, img_height = img.size
+
+                # Add a blank slide
+                slide_layout = prs.slide_layouts[6]  # Blank layout
+                slide = prs.slides.add_slide(slide_layout)
+
+                # Calculate image dimensions to fit slide
+                slide_width_emu = prs.slide_width
+                slide_height_emu = prs.slide_height
+
+                # Determine scaling to fit
+                width_scale = slide_width_emu / (img_width * 9525)  # Convert pixels to EMU
+                height_scale = slide_height_emu / (img_height * 9525)
+                scale = min(width_scale, height_scale)
+
+                # Calculate final dimensions
+                final_width = img_width * 9525 * scale
+                final_height = img_height * 9525 * scale
+
+                # Center the image on the slide
+                left = (slide_width_emu - final_width) / 2
+                top = (slide_height_emu - final_height) / 2
+
+                # Add image to slide
+                slide.shapes.add_picture(
+                    str(img_path.absolute()),
+                    left=left,
+                    top=top,
+                    width=final_width,
+                    height=final_height
+                )
+
+                slide_count += 1
+                logger.info(f"Added slide {slide_count}: {img_path.name}")
+
+            except Exception as e:
+                logger.error(f"Error adding slide {slide_file}: {e}")
+                continue
+            finally:
+                self.report_progress(f"[{index}/{len(slide_files)}] Added {Path(slide_file).name}")
+
+        if slide_count > 0:
+            # Save the presentation
+            prs.save(str(filepath))
+        return slide_count
+
     def _find_slide_files(self, pattern: str, input_dir: Path = None) -> List[str]:
         """
         Find slide files matching the pattern.
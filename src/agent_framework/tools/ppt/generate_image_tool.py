@@ -6,6 +6,7 @@ image provider (Google Image Provider by default). It handles slide numbering
 and establishes reference images for consistent styling across slides.
 """
 
+import asyncio
 import os
 import logging
 from typing import Optional, Dict, Any
@@ -13,6 +14,8 @@ from PIL import Image
 
 from ..tool_base import BaseTool, ToolResult
 from ...llm.image_provider_base import ImageProvider
+from ...llm.image_batch import ImageBatchRunner
+from ...llm.image_cache import cache_key, get_image_cache, image_digest
 from ...llm.google_image_provider import GoogleImageProvider
 
 # Set up logger for this module
@@ -84,6 +87,11 @@ class GenerateImageTool(BaseTool):
                 "description": "Image resolution",
                 "enum": ["1K", "2K", "4K"],
                 "default": "2K"
+            },
+            "regenerate": {
+                "type": "boolean",
+                "description": "Generate a new image even if this exact slide was generated before (default: false, reuse it)",
+                "default": False
             }
         },
         "required": ["prompt", "slide_number"]
@@ -190,6 +198,7 @@ class GenerateImageTool(BaseTool):
         image_prompt: Optional[str] = None,
         visual_style: Optional[str] = None,
         slide_type: Optional[str] = None,
+        regenerate: bool = False,
         **kwargs
     ) -> ToolResult:
         """
@@ -207,6 +216,7 @@ class GenerateImageTool(BaseTool):
             image_prompt: Detailed visual description of what to show
             visual_style: Style and aesthetic approach
             slide_type: Type of slide (title, content, conclusion)
+            regenerate: Generate a new image even if an identical request is cached
 
         Returns:
             ToolResult containing the image path or error message
@@ -231,23 +241,54 @@ class GenerateImageTool(BaseTool):
             logger.info(f"Generating image for slide {slide_number}")
             logger.debug(f"Enhanced prompt length: {len(enhanced_prompt)} characters")
 
+            # Provider calls block, so run them on a worker thread
+            # (rate-limited and retried). Unchanged slides are served from
+            # the generated-image cache.
+            runner = ImageBatchRunner(self.image_provider, cache=get_image_cache())
+
             # Generate image based on slide number
             if slide_number == 1:
                 # First slide - establishes reference style
                 logger.info("Generating first slide (reference image)")
-                image = self.image_provider.generate_first_slide(
+                image, cached = await runner.generate_cached(
+                    cache_key(self.image_provider, enhanced_prompt, (), aspect_ratio, resolution,
+                              method="first_slide"),
+                    self.image_provider.generate_first_slide,
+                    refresh=regenerate,
                     prompt=enhanced_prompt,
                     aspect_ratio=aspect_ratio,
                     resolution=resolution
                 )
                 if image:
                     self.reference_image = image
+                    if cached and hasattr(self.image_provider, 'set_reference'):
+                        # The provider did not run, so hand it the reference
+                        # (and whatever style state goes with it)
+                        self.image_provider.set_reference(image)
+                    elif cached and hasattr(self.image_provider, 'reference_image'):
+                        self.image_provider.reference_image = image
                     logger.info("First slide generated and stored as reference")
             else:
+                # The style reference is an input, so it is part of the key
+                reference = self.get_reference_image()
+                reference = getattr(reference, '_pil_image', reference)
+                if reference is None:
+                    key = cache_key(self.image_provider, enhanced_prompt, (), aspect_ratio, resolution,
+                                    method="subsequent_slide", slide_number=slide_number)
+                elif isinstance(reference, Image.Image):
+                    digest = await asyncio.to_thread(image_digest, reference)
+                    key = cache_key(self.image_provider, enhanced_prompt, [digest], aspect_ratio, resolution,
+                                    method="subsequent_slide", slide_number=slide_number)
+                else:
+                    key = None
+
                 # Subsequent slides - use reference for consistency
                 if hasattr(self.image_provider, 'generate_subsequent_slide'):
                     logger.info(f"Generating slide {slide_number} using reference style")
-                    image = self.image_provider.generate_subsequent_slide(
+                    image, cached = await runner.generate_cached(
+                        key,
+                        self.image_provider.generate_subsequent_slide,
+                        refresh=regenerate,
                         prompt=enhanced_prompt,
                         slide_number=slide_number,
                         aspect_ratio=aspect_ratio,
@@ -256,7 +297,10 @@ class GenerateImageTool(BaseTool):
                 else:
                     # Fallback for providers without reference support
                     logger.warning(f"Image provider doesn't support reference images, generating standalone image")
-                    image = self.image_provider.generate_image(
+                    image, cached = await runner.generate_cached(
+                        key,
+                        self.image_provider.generate_image,
+                        refresh=regenerate,
                         prompt=enhanced_prompt,
                         aspect_ratio=aspect_ratio,
                         resolution=resolution,
@@ -310,7 +354,8 @@ class GenerateImageTool(BaseTool):
                 "session_id": session_id,
                 "output_dir": output_dir,
                 "image_size": pil_image.size,
-                "has_reference": self.reference_image is not None
+                "has_reference": self.reference_image is not None,
+                "cached": cached
             }
 
             if slide_number == 1:
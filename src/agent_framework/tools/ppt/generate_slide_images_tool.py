@@ -0,0 +1,185 @@
+"""
+Generate Slide Images Tool - batch version of generate_image.
+
+Generates the images for many slides in one call. Slides are generated
+concurrently through ImageBatchRunner, which bounds the number of calls in
+flight, applies the provider's rate limit and retries rate-limit and
+server errors.
+"""
+
+import json
+import logging
+from functools import partial
+from typing import Optional, Dict, Any, List
+
+from ..tool_base import ToolResult
+from ...llm.image_batch import ImageBatchRunner
+from .generate_image_tool import GenerateImageTool
+
+logger = logging.getLogger(__name__)
+
+# Per-slide fields: everything generate_image takes except the shared
+# session/output settings
+_SLIDE_PROPERTIES = {
+    key: value
+    for key, value in GenerateImageTool.model_fields["parameters"].default["properties"].items()
+    if key not in ("session_id", "output_dir", "aspect_ratio", "resolution")
+}
+
+
+class GenerateSlideImagesTool(GenerateImageTool):
+    """
+    Tool for generating images for several slides in one call.
+
+    Each entry of ``slides`` takes the same fields as generate_image.
+    Slide 1 establishes the style reference, so when the batch contains it
+    (or no reference exists yet) the lowest-numbered slide is generated on
+    its own before the rest run concurrently. Results are returned in slide
+    order.
+    """
+
+    name: str = "generate_slide_images"
+    description: str = (
+        "Generate images for several presentation slides in one call. "
+        "Slides are generated concurrently, after the style-reference slide."
+    )
+
+    parameters: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "slides": {
+                "type": "array",
+                "description": "Slides to generate; each takes the same fields as generate_image",
+                "items": {
+                    "type": "object",
+                    "properties": _SLIDE_PROPERTIES,
+                    "required": ["prompt", "slide_number"]
+                },
+                "minItems": 1
+            },
+            "session_id": {
+                "type": "string",
+                "description": "Session ID for organizing images (default: 'default')"
+            },
+            "output_dir": {
+                "type": "string",
+                "description": "Output directory for images (default: data/sessions/{session_id}/images)"
+            },
+            "aspect_ratio": {
+                "type": "string",
+                "description": "Image aspect ratio for every slide",
+                "enum": ["1:1", "16:9", "9:16"],
+                "default": "16:9"
+            },
+            "resolution": {
+                "type": "string",
+                "description": "Image resolution for every slide",
+                "enum": ["1K", "2K", "4K"],
+                "default": "2K"
+            }
+        },
+        "required": ["slides"]
+    }
+
+    async def execute(
+        self,
+        slides: List[Dict[str, Any]],
+        session_id: str = "default",
+        output_dir: Optional[str] = None,
+        aspect_ratio: str = "16:9",
+        resolution: str = "2K",
+        **kwargs
+    ) -> ToolResult:
+        """
+        Generate images for a batch of slides.
+
+        Args:
+            slides: Slide specifications (generate_image arguments)
+            session_id: Session ID for organizing images
+            output_dir: Output directory for images
+            aspect_ratio: Image aspect ratio for every slide
+            resolution: Image resolution for every slide
+
+        Returns:
+            ToolResult with one entry per slide, in slide order, and any failures
+        """
+        if not self.image_provider:
+            return self.fail_response(
+                "No image provider available. Please configure GOOGLE_API_KEY or provide an image provider."
+            )
+        if not slides:
+            return self.fail_response("slides must contain at least one slide")
+
+        for index, slide in enumerate(slides):
+            if not isinstance(slide, dict) or not slide.get("prompt") or not isinstance(slide.get("slide_number"), int):
+                return self.fail_response(
+                    f"Slide entry {index + 1} needs at least 'prompt' and an integer 'slide_number'"
+                )
+
+        slides = sorted(slides, key=lambda slide: slide["slide_number"])
+        runner = ImageBatchRunner(self.image_provider)
+        generate_slide = super().execute
+        results: List[Optional[ToolResult]] = [None] * len(slides)
+        done = 0
+
+        def on_done(order: List[int], position: int, result: Any) -> None:
+            nonlocal done
+            done += 1
+            index = order[position]
+            results[index] = result if isinstance(result, ToolResult) else self.fail_response(str(result))
+            status = "failed" if results[index].error else "done"
+            self.report_progress(
+                f"[{done}/{len(slides)}] Slide {slides[index]['slide_number']} {status}"
+            )
+
+        # The style reference must exist before the other slides use it
+        indices = list(range(len(slides)))
+        if slides[0]["slide_number"] == 1 or self.get_reference_image() is None:
+            phases = [indices[:1], indices[1:]]
+        else:
+            phases = [indices]
+
+        for order in phases:
+            if not order:
+                continue
+            jobs = [
+                partial(
+                    generate_slide,
+                    **{
+                        **slides[index],
+                        "session_id": session_id,
+                        "output_dir": output_dir,
+                        "aspect_ratio": aspect_ratio,
+                        "resolution": resolution,
+                    }
+                )
+                for index in order
+            ]
+            await runner.run(jobs, on_done=partial(on_done, order))
+
+        generated = []
+        failed = []
+        for slide, result in zip(slides, results, strict=True):
+            if result.error:
+                failed.append({"slide_number": slide["slide_number"], "error": result.error})
+            else:
+                generated.append(json.loads(result.output))
+
+        if not generated:
+            return self.fail_response(
+                "Failed to generate any slides: " + "; ".join(f["error"] for f in failed)
+            )
+
+        logger.info(f"Generated {len(generated)}/{len(slides)} slide images for session {session_id}")
+        return self.success_response({
+            "success": not failed,
+            "session_id": session_id,
+            "generated": generated,
+            "failed": failed,
+            "message": f"Generated {len(generated)} of {len(slides)} slides"
+                       + (f"; {len(failed)} failed" if failed else "")
+        })
+
+    def __repr__(self):
+        """String representation of the tool."""
+        return f"GenerateSlideImagesTool(provider={self.image_provider.__class__.__name__ if self.image_provider else None})"
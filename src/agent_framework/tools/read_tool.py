@@ -85,53 +85,33 @@ class ReadTool(BaseTool):
                     error=f"Offset must be >= 1, got: {offset}"
                 )
 
-            # Read file
-            lines = []
-            line_count = 0
-
+            # Read through the session cache (line-indexed for O(1) slicing);
+            # files too large for it are streamed up to the requested range
+            cache = self.get_file_cache()
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    # Skip lines until we reach offset
-                    for _ in range(offset - 1):
-                        next(f, None)
-                        line_count += 1
-
-                    # Read lines up to limit
-                    for i, line in enumerate(f):
-                        if i >= limit:
-                            break
-
-                        # Remove trailing newline for consistent formatting
-                        line = line.rstrip('\n')
-
-                        # Truncate long lines (>2000 chars)
-                        if len(line) > 2000:
-                            line = line[:2000] + "... (truncated)"
-
-                        # Format with line number (cat -n style with arrow)
-                        line_num = offset + i
-                        lines.append(f"{line_num:>6}→{line}")
-                        line_count += 1
-
+                page, total_lines = cache.read_lines(file_path, offset - 1, limit)
             except UnicodeDecodeError:
-                # Try reading as binary if UTF-8 fails
                 return ToolResult(
                     error=f"File appears to be binary or not UTF-8 encoded: {file_path}"
                 )
 
+            # Mark file as read for WriteTool's read-before-write check
+            cache.mark_read(file_path)
+
+            lines = []
+            for i, line in enumerate(page):
+                # Truncate long lines (>2000 chars)
+                if len(line) > 2000:
+                    line = line[:2000] + "... (truncated)"
+
+                # Format with line number (cat -n style with arrow)
+                line_num = offset + i
+                lines.append(f"{line_num:>6}→{line}")
+
             # Handle empty file
             if not lines:
                 # Check if file is truly empty or we just read past the end
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    total_lines = sum(1 for _ in f)
-
-                # Mark file as read for WriteTool tracking
-                try:
-                    from .write_tool import WriteTool
-                    WriteTool.mark_as_read(file_path)
-                except ImportError:
-                    pass
-
+                # (an empty page always comes with the total line count)
                 if total_lines == 0:
                     return ToolResult(
                         output="(empty file)",
@@ -152,13 +132,6 @@ class ReadTool(BaseTool):
             if offset > 1 or limit != 2000:
                 metadata += f" (lines {offset}-{offset + len(lines) - 1})"
 
-            # Mark file as read for WriteTool tracking (lazy import to avoid circular dependency)
-            try:
-                from .write_tool import WriteTool
-                WriteTool.mark_as_read(file_path)
-            except ImportError:
-                pass  # WriteTool not available yet
-
             return ToolResult(output=output + metadata)
 
         except PermissionError:
@@ -0,0 +1,93 @@
+"""Tool for fanning out independent sub-tasks to parallel sub-agents."""
+from typing import Any, Dict, List, Union
+
+from .tool_base import BaseTool, ToolResult
+from ..runtime.context import CANCEL_TOKEN_KEY, OUTPUT_CALLBACK_KEY, RUNTIME_EXECUTOR_KEY
+
+
+class SpawnSubAgentsTool(BaseTool):
+    """Run independent sub-tasks concurrently in lightweight sub-agents.
+
+    Works for agents that set up a SubAgentPool (see agent_framework/subagents.py)
+    and only when called through a RuntimeExecutor, whose broker the
+    sub-agents run on. The result holds each sub-agent's condensed report.
+    """
+
+    name: str = "spawn_subagents"
+    description: str = (
+        "Runs several independent sub-tasks in parallel, each in a lightweight sub-agent "
+        "with its own tools and token budget, and returns their condensed findings. "
+        "Use it when your plan has independent branches (several search queries, "
+        "several modules to analyze). Sub-agents cannot see this conversation: make "
+        "each task self-contained, with all the context it needs."
+    )
+
+    parameters: Dict = {
+        "type": "object",
+        "properties": {
+            "tasks": {
+                "type": "array",
+                "description": "Independent, self-contained tasks (at most 8).",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "task": {
+                            "type": "string",
+                            "description": "What the sub-agent should find out or analyze, and what to report."
+                        },
+                        "tools": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Optional: restrict the sub-agent to these of your sub-agent tools."
+                        }
+                    },
+                    "required": ["task"]
+                }
+            }
+        },
+        "required": ["tasks"]
+    }
+
+    # Stop children this long before the runtime's timeout, to report partial results
+    timeout_margin: int = 15
+
+    async def execute(self, tasks: List[Union[str, Dict[str, Any]]]) -> ToolResult:
+        """Run the tasks and return the sub-agents' reports.
+
+        Args:
+            tasks: Task dicts ({"task": ..., "tools": [...]}) or plain strings.
+
+        Returns:
+            ToolResult: The condensed reports, one section per task.
+        """
+        from ..subagents import SubAgentTask, format_results, get_subagent_pool
+
+        context = self.execution_context
+        if context is None:
+            return ToolResult(error="spawn_subagents needs an execution context")
+        pool = get_subagent_pool(context.session_id)
+        if pool is None:
+            return ToolResult(error="Sub-agents are not available for this agent")
+        executor = context.metadata.get(RUNTIME_EXECUTOR_KEY)
+        if executor is None:
+            return ToolResult(error="Sub-agents can only be spawned through the runtime executor")
+
+        parsed = []
+        for item in tasks or []:
+            if isinstance(item, str):
+                parsed.append(SubAgentTask(task=item))
+            elif isinstance(item, dict) and item.get("task"):
+                parsed.append(SubAgentTask(task=item["task"], tools=item.get("tools") or None))
+        if not parsed:
+            return ToolResult(error="No tasks given")
+
+        # Read from this call's context: the shared tool instance gets
+        # another context if the tool is called again meanwhile
+        results = await pool.fan_out(
+            parsed,
+            executor,
+            cancel_token=context.metadata.get(CANCEL_TOKEN_KEY),
+            on_progress=context.metadata.get(OUTPUT_CALLBACK_KEY),
+            timeout=max(context.timeout - self.timeout_margin, context.timeout / 2),
+        )
+        return ToolResult(output=format_results(results))
@@ -2,14 +2,19 @@ import json
 import inspect
 import functools
 import asyncio
+import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Union, List, Callable, Type
 
 from pydantic import BaseModel, Field
 
 # Import ExecutionContext and path_utils
-from ..runtime.context import ExecutionContext
+from ..cancellation import CancellationToken
+from ..runtime.context import CANCEL_TOKEN_KEY, OUTPUT_CALLBACK_KEY, ExecutionContext
 from .path_utils import resolve_path
+from .file_cache import FileCache, get_file_cache
+
+logger = logging.getLogger(__name__)
 
 
 class ToolResult(BaseModel):
@@ -136,6 +141,52 @@ class BaseTool(ABC, BaseModel):
             return self.execution_context.working_directory
         return None
 
+    def get_file_cache(self) -> FileCache:
+        """
+        Get the file content cache for this tool's session.
+
+        Tools without an execution context share a default cache.
+
+        Returns:
+            Session-scoped FileCache
+        """
+        session_id = self.execution_context.session_id if self.execution_context else None
+        return get_file_cache(session_id)
+
+    def get_cancellation_token(self) -> Optional[CancellationToken]:
+        """
+        Get the cancellation token of the agent turn this call belongs to.
+
+        Tools that block (subprocesses, long downloads) register an abort
+        with ``token.on_cancel`` so an interrupt stops them mid-call.
+
+        Returns:
+            CancellationToken or None if the call is not part of a turn
+        """
+        if not self.execution_context:
+            return None
+        return self.execution_context.metadata.get(CANCEL_TOKEN_KEY)
+
+    def report_progress(self, message: str) -> None:
+        """
+        Send a progress update for the running call to the client.
+
+        Does nothing unless the runtime installed an output callback in the
+        execution context. May be called from worker threads.
+
+        Args:
+            message: Short progress text, e.g. "[3/12] Exported slide_003.png"
+        """
+        if not self.execution_context:
+            return
+        callback = self.execution_context.metadata.get(OUTPUT_CALLBACK_KEY)
+        if callback is None:
+            return
+        try:
+            callback(message)
+        except Exception as e:
+            logger.debug(f"Progress callback for '{self.name}' failed: {e}")
+
 
 class FunctionTool(BaseTool):
     """Tool wrapper for callable functions."""
@@ -157,7 +208,14 @@ class FunctionTool(BaseTool):
 
 
 class ToolRegistry:
-    """Singleton registry for tools."""
+    """
+    Singleton registry for tools.
+
+    Tools can also be registered by import path with :meth:`register_lazy`.
+    Such a tool is imported and instantiated the first time it is looked up
+    by name or listed, so registering tools with heavy dependencies (image
+    SDKs, PPTX/PDF libraries) costs nothing until an agent uses them.
+    """
     
     _instance = None
     
@@ -165,18 +223,57 @@ class ToolRegistry:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.tools = {}
+            cls._instance._pending = {}
         return cls._instance
     
     def register(self, tool: BaseTool) -> None:
         """Register a tool."""
+        self._pending.pop(tool.name, None)
         self.tools[tool.name] = tool
+
+    def register_lazy(self, name: str, import_path: str) -> None:
+        """
+        Register a tool class by import path, loaded on first use.
+
+        Args:
+            name: The tool's name (must match the class's ``name``)
+            import_path: ``"package.module:ToolClass"``; the class is
+                instantiated without arguments
+        """
+        if name not in self.tools:
+            self._pending[name] = import_path
+
+    def _load_pending(self, name: str) -> Optional[BaseTool]:
+        """Import and register a pending tool; None if it cannot be loaded."""
+        import_path = self._pending.pop(name, None)
+        if import_path is None:
+            return None
+        from ..lazy import import_from_path
+        try:
+            tool = import_from_path(import_path)()
+        except ImportError as e:
+            logger.debug(f"Tool {name} unavailable: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Could not register {name}: {e}")
+            return None
+        self.tools[tool.name] = tool
+        return tool
+
+    def _load_all_pending(self) -> None:
+        for name in list(self._pending):
+            self._load_pending(name)
     
     def get(self, name: str) -> Optional[BaseTool]:
         """Get a tool by name."""
-        return self.tools.get(name)
+        tool = self.tools.get(name)
+        if tool is None and name in self._pending:
+            tool = self._load_pending(name)
+        return tool
     
     def list_tools(self) -> List[BaseTool]:
         """Get all registered tools."""
+        self._load_all_pending()
         return list(self.tools.values())
     
     def to_llm_schema(self, tool_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -187,15 +284,17 @@ class ToolRegistry:
             tool_names: Optional list of specific tools to include. If None, all tools.
         """
         if tool_names is None:
+            self._load_all_pending()
             tools_to_convert = self.tools.values()
         else:
-            tools_to_convert = [self.tools[name] for name in tool_names if name in self.tools]
+            tools_to_convert = [tool for tool in (self.get(name) for name in tool_names) if tool]
         
         return [tool.to_param() for tool in tools_to_convert]
     
     def clear(self) -> None:
         """Clear all tools (useful for testing)."""
         self.tools = {}
+        self._pending = {}
 
 
 # Global registry instance
@@ -0,0 +1,325 @@
+"""
+Bounded response caches for the web tools.
+
+WebCache is a TTL + byte-size LRU cache. Expired entries are not dropped
+immediately: WebFetchTool keeps them around so it can revalidate with
+If-None-Match / If-Modified-Since and reuse the stored body on a 304.
+When a persist directory is configured (``WEB_CACHE_DIR``), entries are
+also written to disk and reloaded on a memory miss, so the cache survives
+process restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 900  # 15 minutes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """A cached value together with HTTP validators."""
+
+    value: Any
+    size: int
+    stored_at: float = field(default_factory=time.time)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        """Seconds since the entry was stored or last revalidated."""
+        return time.time() - self.stored_at
+
+    def validation_headers(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+class WebCache:
+    """Thread-safe TTL cache with LRU eviction by bytes and optional disk tier."""
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        persist_dir: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        # Disk index: file name -> size, least recently used first
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        if self.persist_dir:
+            self._load_disk_index()
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held in memory."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """Look up an entry.
+
+        Args:
+            key: Cache key
+            allow_stale: Return expired entries too (for revalidation)
+
+        Returns:
+            The entry, or None if absent (or expired and allow_stale is False)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.persist_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._store(key, entry)
+
+        if entry is None:
+            return None
+        if not allow_stale and entry.age() > self.ttl:
+            return None
+        return entry
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        """Store a value, evicting least recently used entries if over budget."""
+        entry = CacheEntry(
+            value=value,
+            size=_estimate_size(value),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._store(key, entry)
+        if self.persist_dir:
+            self._write_disk(key, entry)
+        return entry
+
+    def touch(self, key: str) -> Optional[CacheEntry]:
+        """Mark an entry as freshly validated (e.g. after a 304 response)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.stored_at = time.time()
+            self._entries.move_to_end(key)
+        if self.persist_dir:
+            self._write_disk(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        """Drop all in-memory and persisted entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            names = list(self._disk_index)
+            self._disk_index.clear()
+            self._disk_bytes = 0
+        if self.persist_dir:
+            for name in names:
+                try:
+                    (self.persist_dir / name).unlink()
+                except OSError:
+                    pass
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+
+    def _load_disk_index(self) -> None:
+        try:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (entry for entry in os.scandir(self.persist_dir) if entry.name.endswith(".json")),
+                key=lambda e: e.stat().st_mtime,
+            )
+        except OSError as e:
+            logger.warning(f"Web cache directory unavailable, persistence disabled: {e}")
+            self.persist_dir = None
+            return
+
+        for f in files:
+            size = f.stat().st_size
+            self._disk_index[f.name] = size
+            self._disk_bytes += size
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        name = self._file_name(key)
+        if name not in self._disk_index:
+            return None
+        try:
+            with open(self.persist_dir / name, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.pop("key", None) != key:
+                return None
+            entry = CacheEntry(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        # A disk hit counts as a use: move it to the back of the eviction
+        # order and bump the mtime so the order survives a reload.
+        with self._lock:
+            if name in self._disk_index:
+                self._disk_index.move_to_end(name)
+        try:
+            os.utime(self.persist_dir / name)
+        except OSError:
+            pass
+        return entry
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        name = self._file_name(key)
+        path = self.persist_dir / name
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, **asdict(entry)}, f)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to persist web cache entry: {e}")
+            return
+
+        stale = []
+        with self._lock:
+            self._disk_bytes -= self._disk_index.pop(name, 0)
+            self._disk_index[name] = size
+            self._disk_bytes += size
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk_index) > 1:
+                old_name, old_size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= old_size
+                stale.append(old_name)
+
+        for old_name in stale:
+            try:
+                (self.persist_dir / old_name).unlink()
+            except OSError:
+                pass
+
+
+# Process-wide caches shared by all web tool instances
+_caches: Dict[str, WebCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_web_cache(name: str, ttl: int = DEFAULT_TTL) -> WebCache:
+    """Get (or create) a named process-wide cache.
+
+    If ``WEB_CACHE_DIR`` is set, the cache persists to a subdirectory of it.
+
+    Args:
+        name: Cache name, e.g. "fetch" or "search"
+        ttl: Freshness lifetime in seconds for a newly created cache
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            base_dir = os.getenv("WEB_CACHE_DIR")
+            persist_dir = os.path.join(base_dir, name) if base_dir else None
+            cache = WebCache(ttl=ttl, persist_dir=persist_dir)
+            _caches[name] = cache
+        return cache
+
+
+def search_cache_key(engine: str, query: str) -> str:
+    """Cache key for search results: (engine, whitespace/case-normalized query)."""
+    return f"{engine.lower()}\x00{' '.join(query.lower().split())}"
+
+
+async def cached_search(
+    engine: str,
+    query: str,
+    num_results: int,
+    search_func: Callable[[str, int], Awaitable[Tuple[Optional[list], Optional[str]]]],
+    result_cls: Callable[..., Any],
+) -> Tuple[Optional[list], Optional[str]]:
+    """Run a search backend through the shared "search" cache.
+
+    A cached result set is reused when it was fetched for at least
+    ``num_results`` results. Only non-empty, successful results are cached.
+
+    Args:
+        engine: Search engine name, part of the cache key
+        query: The search query
+        num_results: Number of results requested
+        search_func: Backend coroutine returning (results, error)
+        result_cls: Result class rebuilt from cached title/url/snippet/source
+
+    Returns:
+        Tuple of (results_list, error_message)
+    """
+    cache = get_web_cache("search")
+    key = search_cache_key(engine, query)
+
+    entry = cache.get(key)
+    if entry is not None and entry.value["num_results"] >= num_results:
+        return [result_cls(**item) for item in entry.value["results"][:num_results]], None
+
+    results, error = await search_func(query, num_results)
+    if results:
+        cache.put(key, {
+            "num_results": num_results,
+            "results": [
+                {"title": r.title, "url": r.url, "snippet": r.snippet, "source": r.source}
+                for r in results
+            ],
+        })
+    return results, error
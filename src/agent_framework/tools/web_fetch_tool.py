@@ -1,11 +1,12 @@
 """Web fetching tool for agents."""
 import os
-import time
 from typing import Dict, Optional, ClassVar
 from urllib.parse import urlparse, urlunparse
 import httpx
 import html2text
 from .tool_base import BaseTool, ToolResult
+from .http_pool import host_slot
+from .web_cache import WebCache, get_web_cache
 from ..config.env_loader import load_env
 
 
@@ -14,7 +15,8 @@ class WebFetchTool(BaseTool):
 
     This tool fetches content from URLs, converts HTML to markdown,
     and processes it using an AI model with a custom prompt.
-    Includes a 15-minute cache for efficiency.
+    Uses the shared HTTP connection pool and a 15-minute response cache
+    with ETag/Last-Modified revalidation.
     """
 
     name: str = "web_fetch"
@@ -35,8 +37,7 @@ class WebFetchTool(BaseTool):
         "required": ["url", "prompt"]
     }
 
-    # Class-level cache: {url: (content, timestamp)}
-    _cache: ClassVar[Dict[str, tuple[str, float]]] = {}
+    # Responses are cached in the process-wide "fetch" WebCache
     _cache_ttl: ClassVar[int] = 900  # 15 minutes in seconds
 
     # HTTP client settings
@@ -46,22 +47,9 @@ class WebFetchTool(BaseTool):
     user_agent: str = "GPT-Agent-Framework/1.0 (WebFetch Tool)"
 
     @classmethod
-    def _clean_cache(cls) -> int:
-        """Remove expired cache entries.
-
-        Returns:
-            Number of entries removed
-        """
-        current_time = time.time()
-        expired_keys = [
-            url for url, (_, timestamp) in cls._cache.items()
-            if current_time - timestamp > cls._cache_ttl
-        ]
-
-        for key in expired_keys:
-            del cls._cache[key]
-
-        return len(expired_keys)
+    def _get_cache(cls) -> WebCache:
+        """Get the shared response cache."""
+        return get_web_cache("fetch", ttl=cls._cache_ttl)
 
     @classmethod
     def _get_from_cache(cls, url: str) -> Optional[str]:
@@ -73,30 +61,31 @@ class WebFetchTool(BaseTool):
         Returns:
             Cached content if available and not expired, None otherwise
         """
-        # Clean expired entries
-        cls._clean_cache()
-
-        if url in cls._cache:
-            content, timestamp = cls._cache[url]
-            if time.time() - timestamp <= cls._cache_ttl:
-                return content
-
-        return None
+        entry = cls._get_cache().get(url)
+        return entry.value if entry else None
 
     @classmethod
-    def _add_to_cache(cls, url: str, content: str) -> None:
+    def _add_to_cache(
+        cls,
+        url: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
         """Add content to cache.
 
         Args:
             url: The URL to cache
             content: The content to cache
+            etag: ETag response header, used for revalidation
+            last_modified: Last-Modified response header, used for revalidation
         """
-        cls._cache[url] = (content, time.time())
+        cls._get_cache().put(url, content, etag=etag, last_modified=last_modified)
 
     @classmethod
     def clear_cache(cls) -> None:
         """Clear all cached content."""
-        cls._cache.clear()
+        cls._get_cache().clear()
 
     def _normalize_url(self, url: str) -> tuple[str, Optional[str]]:
         """Normalize and validate URL.
@@ -167,48 +156,64 @@ class WebFetchTool(BaseTool):
         Returns:
             Tuple of (content, error_message)
         """
+        # An expired entry can still be revalidated instead of refetched
+        stale = self._get_cache().get(url, allow_stale=True)
+
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=self.follow_redirects,
-                timeout=self.timeout
-            ) as client:
-                headers = {
-                    "User-Agent": self.user_agent,
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.9",
-                }
-
-                response = await client.get(url, headers=headers)
-
-                # Check response status
-                if response.status_code == 404:
-                    return None, "Page not found (404)"
-                elif response.status_code == 403:
-                    return None, "Access forbidden (403)"
-                elif response.status_code == 401:
-                    return None, "Authentication required (401)"
-                elif response.status_code >= 400:
-                    return None, f"HTTP error {response.status_code}"
-
-                # Check content length
-                content_length = len(response.content)
-                if content_length > self.max_content_length:
-                    return None, f"Content too large: {content_length} bytes (max: {self.max_content_length})"
-
-                # Get content type
-                content_type = response.headers.get("content-type", "").lower()
-
-                # Check if content is HTML
-                if "text/html" in content_type or "application/xhtml" in content_type:
-                    html_content = response.text
-                    markdown_content = self._html_to_markdown(html_content)
-                    return markdown_content, None
-                elif "text/plain" in content_type:
-                    return response.text, None
-                elif "application/json" in content_type:
-                    return response.text, None
-                else:
-                    return None, f"Unsupported content type: {content_type}"
+            headers = {
+                "User-Agent": self.user_agent,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            }
+            if stale:
+                headers.update(stale.validation_headers())
+
+            async with host_slot(url) as client:
+                response = await client.get(
+                    url,
+                    headers=headers,
+                    follow_redirects=self.follow_redirects,
+                    timeout=self.timeout,
+                )
+
+            # Not modified: the cached body is still current
+            if response.status_code == 304 and stale:
+                self._get_cache().touch(url)
+                return stale.value, None
+
+            # Check response status
+            if response.status_code == 404:
+                return None, "Page not found (404)"
+            elif response.status_code == 403:
+                return None, "Access forbidden (403)"
+            elif response.status_code == 401:
+                return None, "Authentication required (401)"
+            elif response.status_code >= 400:
+                return None, f"HTTP error {response.status_code}"
+
+            # Check content length
+            content_length = len(response.content)
+            if content_length > self.max_content_length:
+                return None, f"Content too large: {content_length} bytes (max: {self.max_content_length})"
+
+            # Get content type
+            content_type = response.headers.get("content-type", "").lower()
+
+            # Check if content is HTML
+            if "text/html" in content_type or "application/xhtml" in content_type:
+                content = self._html_to_markdown(response.text)
+            elif "text/plain" in content_type or "application/json" in content_type:
+                content = response.text
+            else:
+                return None, f"Unsupported content type: {content_type}"
+
+            self._add_to_cache(
+                url,
+                content,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+            return content, None
 
         except httpx.TimeoutException:
             return None, f"Request timed out after {self.timeout} seconds"
@@ -337,14 +342,11 @@ class WebFetchTool(BaseTool):
                     system="Content retrieved from cache (less than 15 minutes old)"
                 )
 
-            # Fetch content
+            # Fetch content (revalidates and caches the response)
             content, error = await self._fetch_url(normalized_url)
             if error:
                 return ToolResult(error=error)
 
-            # Add to cache
-            self._add_to_cache(normalized_url, content)
-
             # Process with LLM
             response, error = await self._process_with_llm(content, prompt)
             if error:
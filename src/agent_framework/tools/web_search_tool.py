@@ -3,6 +3,8 @@ import os
 from typing import Dict, List, Optional
 import httpx
 from .tool_base import BaseTool, ToolResult
+from .http_pool import host_slot
+from .web_cache import cached_search
 
 # Load environment variables from .env file
 from ..config.env_loader import load_env
@@ -137,8 +139,8 @@ class WebSearchTool(BaseTool):
                 "num": min(num_results, 10)  # Google allows max 10 per request
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
+            async with host_slot(url) as client:
+                response = await client.get(url, params=params, timeout=self.timeout)
 
                 if response.status_code != 200:
                     return None, f"Google Search API error: HTTP {response.status_code}"
@@ -202,8 +204,11 @@ class WebSearchTool(BaseTool):
                 if attempt > 0:
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
-                async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                    response = await client.get(url, params=params, headers=headers)
+                async with host_slot(url) as client:
+                    response = await client.get(
+                        url, params=params, headers=headers,
+                        timeout=self.timeout, follow_redirects=True
+                    )
 
                     # Handle HTTP 202 and other non-200 responses
                     if response.status_code == 202:
@@ -280,11 +285,11 @@ class WebSearchTool(BaseTool):
         """Fallback method using DuckDuckGo API with better error handling."""
         try:
             # Use the vqd endpoint for more reliable results
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with host_slot("https://duckduckgo.com/") as client:
                 # First, get a VQD token
                 vqd_url = "https://duckduckgo.com/"
                 params = {"q": query}
-                response = await client.get(vqd_url, params=params)
+                response = await client.get(vqd_url, params=params, timeout=self.timeout)
 
                 if response.status_code != 200:
                     return None, f"DuckDuckGo vqd token error: HTTP {response.status_code}"
@@ -308,7 +313,9 @@ class WebSearchTool(BaseTool):
                     "kl": "us-en"
                 }
 
-                response = await client.get(search_url, params=params, headers=headers)
+                response = await client.get(
+                    search_url, params=params, headers=headers, timeout=self.timeout
+                )
 
                 if response.status_code != 200:
                     return None, f"DuckDuckGo search error: HTTP {response.status_code}"
@@ -355,16 +362,14 @@ class WebSearchTool(BaseTool):
             Tuple of (results_list, error_message)
         """
         try:
-            import httpx
-
             # Search Wikipedia
             url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + query.replace(" ", "_")
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+            async with host_slot(url) as client:
+                response = await client.get(url, headers=headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -400,11 +405,15 @@ class WebSearchTool(BaseTool):
 
         # Try primary provider first
         if provider == "google":
-            results, error = await self._search_google(query, num_results)
+            results, error = await cached_search(
+                "google", query, num_results, self._search_google, SearchResult
+            )
             if results or not error:
                 return results, error
         elif provider == "duckduckgo":
-            results, error = await self._search_duckduckgo(query, num_results)
+            results, error = await cached_search(
+                "duckduckgo", query, num_results, self._search_duckduckgo, SearchResult
+            )
             if results or not error:
                 return results, error
         else:
@@ -412,12 +421,16 @@ class WebSearchTool(BaseTool):
 
         # If primary provider failed, try DuckDuckGo if not already tried
         if provider != "duckduckgo":
-            results, error = await self._search_duckduckgo(query, num_results)
+            results, error = await cached_search(
+                "duckduckgo", query, num_results, self._search_duckduckgo, SearchResult
+            )
             if results:
                 return results, None
 
         # Final fallback to Wikipedia
-        results, error = await self._search_wikipedia_fallback(query, num_results)
+        results, error = await cached_search(
+            "wikipedia", query, num_results, self._search_wikipedia_fallback, SearchResult
+        )
         if results:
             return results, None
 
@@ -5,8 +5,9 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 import json
 import urllib.parse
-import httpx
 from .tool_base import BaseTool, ToolResult
+from .http_pool import host_slot
+from .web_cache import cached_search
 
 # Fallback search result when real search fails
 FALLBACK_RESULTS = {
@@ -96,8 +97,10 @@ class WebSearchToolV2(BaseTool):
                 "time_range": ""
             }
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers, params=params)
+            async with host_slot(url) as client:
+                response = await client.get(
+                    url, headers=headers, params=params, timeout=self.timeout
+                )
 
                 if response.status_code != 200:
                     return None, f"Brave Search API error: HTTP {response.status_code}"
@@ -142,8 +145,10 @@ class WebSearchToolV2(BaseTool):
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
                 }
 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url, params=params, headers=headers)
+                async with host_slot(url) as client:
+                    response = await client.get(
+                        url, params=params, headers=headers, timeout=self.timeout
+                    )
 
                     if response.status_code == 200:
                         data = response.json()
@@ -227,7 +232,9 @@ class WebSearchToolV2(BaseTool):
 
         for method_name, method_func in search_methods:
             try:
-                method_results, error = await method_func(query, num_results)
+                method_results, error = await cached_search(
+                    method_name, query, num_results, method_func, SearchResult
+                )
 
                 if method_results:
                     results = method_results
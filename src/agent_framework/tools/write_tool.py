@@ -1,7 +1,8 @@
 """File writing tool for agents."""
 import os
-from typing import Dict, Set, ClassVar
+from typing import Dict, Optional
 from .tool_base import BaseTool, ToolResult
+from .file_cache import get_file_cache
 
 
 class WriteTool(BaseTool):
@@ -29,41 +30,43 @@ class WriteTool(BaseTool):
         "required": ["file_path", "content"]
     }
 
-    # Class-level tracking of read files to enforce read-before-write policy
-    _read_files: ClassVar[Set[str]] = set()
+    # Read-before-write state lives in the session's FileCache. These
+    # classmethods address a session's cache directly for callers that do not
+    # hold a tool instance (None selects the default, context-less cache).
 
     @classmethod
-    def mark_as_read(cls, file_path: str) -> None:
+    def mark_as_read(cls, file_path: str, session_id: Optional[str] = None) -> None:
         """Mark a file as having been read.
 
-        This should be called by the ReadTool when a file is successfully read.
+        ReadTool records reads in the session cache itself; this is for callers
+        that need to mark a file outside of a tool call.
 
         Args:
             file_path: The absolute path to the file that was read
+            session_id: Session whose read history to update
         """
-        normalized_path = os.path.normpath(os.path.abspath(file_path))
-        cls._read_files.add(normalized_path)
+        get_file_cache(session_id).mark_read(file_path)
 
     @classmethod
-    def clear_read_history(cls) -> None:
-        """Clear the read file history.
+    def clear_read_history(cls, session_id: Optional[str] = None) -> None:
+        """Clear the read file history (and cached contents) of a session.
 
         This can be used to reset the tracking between sessions or tests.
         """
-        cls._read_files.clear()
+        get_file_cache(session_id).clear()
 
     @classmethod
-    def was_file_read(cls, file_path: str) -> bool:
+    def was_file_read(cls, file_path: str, session_id: Optional[str] = None) -> bool:
         """Check if a file was previously read.
 
         Args:
             file_path: The absolute path to check
+            session_id: Session whose read history to consult
 
         Returns:
             True if the file was marked as read, False otherwise
         """
-        normalized_path = os.path.normpath(os.path.abspath(file_path))
-        return normalized_path in cls._read_files
+        return get_file_cache(session_id).was_read(file_path)
 
     async def execute(
         self,
@@ -86,6 +89,8 @@ class WriteTool(BaseTool):
             # Normalize path for cross-platform compatibility
             file_path = os.path.normpath(file_path)
 
+            cache = self.get_file_cache()
+
             # Check if this is an existing file
             file_exists = os.path.exists(file_path)
 
@@ -97,7 +102,7 @@ class WriteTool(BaseTool):
                     )
 
                 # Check if file was read first
-                if not self.was_file_read(file_path):
+                if not cache.was_read(file_path):
                     return ToolResult(
                         error=f"Cannot overwrite existing file without reading it first. "
                         f"Use the Read tool to read {file_path} before writing to it."
@@ -118,10 +123,9 @@ class WriteTool(BaseTool):
             is_readme = os.path.basename(file_path).upper().startswith('README')
             is_doc_file = file_ext in ['.md', '.markdown', '.rst', '.txt'] or is_readme
 
-            # Write the content to the file
+            # Write the content to the file (write-through to the session cache)
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                cache.write(file_path, content)
             except PermissionError:
                 return ToolResult(
                     error=f"Permission denied: Cannot write to {file_path}"
@@ -196,7 +200,7 @@ class SafeWriteTool(WriteTool):
 
             # Use parent class logic for creating new files
             # Temporarily mark as "read" to bypass the check since we know it's new
-            self.mark_as_read(file_path)
+            self.get_file_cache().mark_read(file_path)
             result = await super().execute(file_path, content)
 
             return result
@@ -0,0 +1,55 @@
+"""
+Structured tracing for agent turns.
+
+This package records spans for agent steps, broker hops, LLM calls and
+tool executions, propagates trace context through message metadata and
+exports finished spans to JSONL or OTLP files. Importing it installs the
+broker trace propagator, unless another propagator is already installed.
+"""
+
+from message_queue.propagation import TracePropagator, get_trace_propagator, set_trace_propagator
+
+from .tracer import (
+    TRACE_METADATA_KEY,
+    Span,
+    SpanContext,
+    Tracer,
+    attach_context,
+    current_context,
+    extract_context,
+    get_tracer,
+    inject_context,
+    set_tracer,
+    tracer_from_env,
+)
+from .sinks import JsonlSpanSink, OtlpFileSpanSink, SpanSink, create_sink, load_spans
+from .flame import find_trace, render_flame, summarize_traces
+from .propagation import BrokerTracePropagator
+
+# Keep a propagator installed earlier, e.g. by the application or by this
+# package imported under a second name (src.agent_framework)
+if type(get_trace_propagator()) is TracePropagator:
+    set_trace_propagator(BrokerTracePropagator())
+
+__all__ = [
+    "TRACE_METADATA_KEY",
+    "Span",
+    "SpanContext",
+    "Tracer",
+    "attach_context",
+    "current_context",
+    "extract_context",
+    "get_tracer",
+    "inject_context",
+    "set_tracer",
+    "tracer_from_env",
+    "BrokerTracePropagator",
+    "SpanSink",
+    "JsonlSpanSink",
+    "OtlpFileSpanSink",
+    "create_sink",
+    "load_spans",
+    "find_trace",
+    "render_flame",
+    "summarize_traces",
+]
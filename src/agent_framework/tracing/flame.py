@@ -0,0 +1,143 @@
+"""
+Text rendering of traces.
+
+``summarize_traces`` lists recorded turns; ``render_flame`` draws one turn
+as an indented span tree with a timeline bar per span, so it is easy to
+see whether a turn's latency went to the LLM, a tool or a broker hop.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .tracer import Span
+
+# Attributes worth showing next to a span in the flame view
+SUMMARY_ATTRIBUTES = (
+    "topic", "agent", "message_type", "model", "input_tokens", "output_tokens",
+    "tool", "runtime", "success", "error",
+)
+
+
+def group_traces(spans: Sequence[Span]) -> Dict[str, List[Span]]:
+    """Group spans by trace ID, each group sorted by start time."""
+    traces: Dict[str, List[Span]] = {}
+    for span in spans:
+        traces.setdefault(span.trace_id, []).append(span)
+    for trace_spans in traces.values():
+        trace_spans.sort(key=lambda s: s.start_time)
+    return traces
+
+
+def summarize_traces(spans: Sequence[Span]) -> List[Dict[str, Any]]:
+    """
+    Summarize each trace, oldest first.
+
+    Returns:
+        One dict per trace with trace_id, root name, start_time,
+        duration_ms, span_count and error_count
+    """
+    summaries = []
+    for trace_id, trace_spans in group_traces(spans).items():
+        start = trace_spans[0].start_time
+        end = max(s.end_time if s.end_time is not None else s.start_time for s in trace_spans)
+        summaries.append({
+            "trace_id": trace_id,
+            "root": _roots(trace_spans)[0].name,
+            "start_time": start,
+            "duration_ms": round((end - start) * 1000, 3),
+            "span_count": len(trace_spans),
+            "error_count": sum(1 for s in trace_spans if s.status == "error"),
+        })
+    summaries.sort(key=lambda s: s["start_time"])
+    return summaries
+
+
+def find_trace(spans: Sequence[Span], trace_id: Optional[str] = None) -> List[Span]:
+    """
+    Select the spans of one trace.
+
+    Args:
+        spans: Spans to search
+        trace_id: Full ID or unique prefix; None selects the latest trace
+
+    Raises:
+        KeyError: If no trace (or more than one) matches
+    """
+    traces = group_traces(spans)
+    if trace_id is None:
+        if not traces:
+            raise KeyError("No traces recorded")
+        return max(traces.values(), key=lambda t: t[0].start_time)
+
+    matches = [tid for tid in traces if tid.startswith(trace_id)]
+    if len(matches) != 1:
+        reason = "No trace" if not matches else f"{len(matches)} traces"
+        raise KeyError(f"{reason} matching '{trace_id}'")
+    return traces[matches[0]]
+
+
+def render_flame(spans: Sequence[Span], width: int = 40) -> List[str]:
+    """
+    Render one trace as lines of text.
+
+    Each line shows the span name indented by depth, a bar placed on the
+    trace's timeline, the span duration and a few key attributes.
+
+    Args:
+        spans: Spans of a single trace
+        width: Width of the timeline bar in characters
+    """
+    if not spans:
+        return []
+
+    start = min(s.start_time for s in spans)
+    end = max(s.end_time if s.end_time is not None else s.start_time for s in spans)
+    total = max(end - start, 1e-9)
+
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in sorted(spans, key=lambda s: s.start_time):
+        children.setdefault(span.parent_id, []).append(span)
+
+    rows = []
+
+    def visit(span: Span, depth: int) -> None:
+        rows.append((depth, span))
+        for child in children.get(span.span_id, []):
+            visit(child, depth + 1)
+
+    for root in _roots(spans):
+        visit(root, 0)
+
+    label_width = max(2 * depth + len(span.name) for depth, span in rows)
+    lines = []
+    for depth, span in rows:
+        span_end = span.end_time if span.end_time is not None else span.start_time
+        offset = int((span.start_time - start) / total * width)
+        length = max(1, int(round((span_end - span.start_time) / total * width)))
+        length = min(length, width - min(offset, width - 1))
+        bar = (" " * min(offset, width - 1) + "█" * length).ljust(width)
+        label = ("  " * depth + span.name).ljust(label_width)
+        marker = " !" if span.status == "error" else ""
+        line = f"{label}  |{bar}| {span.duration_ms:9.1f}ms{marker}"
+        details = _format_attributes(span)
+        if details:
+            line += f"  {details}"
+        lines.append(line)
+    return lines
+
+
+def _roots(spans: Sequence[Span]) -> List[Span]:
+    """Spans whose parent is not part of the given set, by start time."""
+    ids = {s.span_id for s in spans}
+    roots = [s for s in spans if s.parent_id not in ids]
+    return sorted(roots, key=lambda s: s.start_time)
+
+
+def _format_attributes(span: Span) -> str:
+    parts = []
+    for key in SUMMARY_ATTRIBUTES:
+        if key in span.attributes:
+            value = str(span.attributes[key])
+            if len(value) > 40:
+                value = value[:37] + "..."
+            parts.append(f"{key}={value}")
+    return " ".join(parts)
@@ -0,0 +1,53 @@
+"""
+Broker trace propagation.
+
+Implements message_queue's TracePropagator on top of the tracer: published
+messages carry the current trace context in their metadata, and delivery
+records the enqueue→deliver hop and runs handlers under it. Importing
+agent_framework.tracing installs it.
+"""
+
+from contextlib import nullcontext
+from typing import Any, ContextManager, Coroutine, Dict, Optional
+
+from message_queue.message import Message
+from message_queue.propagation import TracePropagator
+
+from .tracer import attach_context, current_context, extract_context, get_tracer, inject_context
+
+
+class BrokerTracePropagator(TracePropagator):
+    """Propagates trace context through MessageBroker messages."""
+
+    def inject(self, metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return inject_context(metadata)
+
+    def delivery(self, message: Message) -> ContextManager[Any]:
+        """
+        Record the enqueue→deliver hop of a traced message.
+
+        Returns a context manager that makes the hop the parent of any
+        spans opened by subscribers or workers handling the message.
+        """
+        parent = extract_context(message.metadata)
+        if parent is None:
+            return nullcontext()
+        hop = get_tracer().record_span(
+            "broker.deliver",
+            start_time=message.timestamp,
+            parent=parent,
+            topic=message.topic,
+            retry_count=message.retry_count,
+        )
+        return attach_context(hop.context if hop is not None else parent)
+
+    def bind(self, coro: Coroutine) -> Coroutine:
+        context = current_context()
+        if context is None:
+            return coro
+
+        async def run_attached():
+            with attach_context(context):
+                return await coro
+
+        return run_attached()
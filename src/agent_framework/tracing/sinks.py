@@ -0,0 +1,193 @@
+"""
+File sinks for finished spans.
+
+Two formats are supported:
+
+- ``jsonl``: one span per line, as produced by ``Span.to_dict()``
+- ``otlp``: one OTLP/JSON ``ExportTraceServiceRequest`` per line, the
+  layout written by the OpenTelemetry collector's file exporter, so the
+  file can be replayed into any OTLP-compatible backend
+"""
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+from .tracer import Span
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "archiflow"
+
+# OTLP status codes
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+class SpanSink(ABC):
+    """Destination for batches of finished spans."""
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """
+        Write a batch of finished spans.
+
+        Args:
+            spans: Spans to write, in completion order
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
+
+
+class _FileSink(SpanSink):
+    """Appends one line per record to a file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def _write_lines(self, lines: List[str]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+
+    def close(self) -> None:
+        # Each batch opens and closes the file, so nothing stays open
+        pass
+
+
+class JsonlSpanSink(_FileSink):
+    """Writes each span as a JSON object on its own line."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self._write_lines([json.dumps(span.to_dict(), default=str) for span in spans])
+
+
+class OtlpFileSpanSink(_FileSink):
+    """Writes each batch as an OTLP/JSON ExportTraceServiceRequest line."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{
+                    "scope": {"name": "agent_framework.tracing"},
+                    "spans": [_to_otlp_span(span) for span in spans],
+                }],
+            }]
+        }
+        self._write_lines([json.dumps(request, default=str)])
+
+
+def create_sink(path: Union[str, Path], format: str = "jsonl") -> SpanSink:
+    """
+    Create a file sink.
+
+    Args:
+        path: Output file
+        format: "jsonl" or "otlp"
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    format = format.lower()
+    if format == "jsonl":
+        return JsonlSpanSink(path)
+    if format == "otlp":
+        return OtlpFileSpanSink(path)
+    raise ValueError(f"Unknown trace format: {format} (expected 'jsonl' or 'otlp')")
+
+
+def load_spans(path: Union[str, Path]) -> List[Span]:
+    """
+    Read spans back from a file written by either sink.
+
+    Unparseable lines are skipped.
+    """
+    spans: List[Span] = []
+    with open(Path(path).expanduser(), encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+                if "resourceSpans" in data:
+                    spans.extend(_spans_from_otlp(data))
+                else:
+                    spans.append(Span.from_dict(data))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.debug("Skipping malformed trace line %d in %s: %s", line_number, path, e)
+    return spans
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _to_otlp_span(span: Span) -> Dict[str, Any]:
+    end_time = span.end_time if span.end_time is not None else span.start_time
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int(end_time * 1e9)),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": _STATUS_ERROR if span.status == "error" else _STATUS_OK},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+def _from_otlp_value(value: Dict[str, Any]) -> Any:
+    if "boolValue" in value:
+        return value["boolValue"]
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "doubleValue" in value:
+        return value["doubleValue"]
+    return value.get("stringValue")
+
+
+def _spans_from_otlp(request: Dict[str, Any]) -> List[Span]:
+    spans = []
+    for resource_spans in request.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for otlp in scope_spans.get("spans", []):
+                spans.append(Span(
+                    name=otlp["name"],
+                    trace_id=otlp["traceId"],
+                    span_id=otlp["spanId"],
+                    parent_id=otlp.get("parentSpanId") or None,
+                    start_time=int(otlp["startTimeUnixNano"]) / 1e9,
+                    end_time=int(otlp["endTimeUnixNano"]) / 1e9,
+                    attributes={
+                        attr["key"]: _from_otlp_value(attr.get("value", {}))
+                        for attr in otlp.get("attributes", [])
+                    },
+                    status="error" if otlp.get("status", {}).get("code") == _STATUS_ERROR else "ok",
+                ))
+    return spans
@@ -0,0 +1,437 @@
+"""
+Span-based tracing for agent turns.
+
+A trace follows one user turn across threads and broker hops: the trace
+context lives in a context variable while a span is open and travels
+between components in ``Message.metadata["trace"]``. Finished spans of
+sampled traces go into an in-memory ring buffer and, optionally, to a
+file sink in batches.
+
+The sampling decision is made once, when a trace starts, and travels
+with the context so a trace is either recorded completely or not at all.
+"""
+
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .sinks import SpanSink
+
+logger = logging.getLogger(__name__)
+
+TRACE_METADATA_KEY = "trace"
+
+_current_context: ContextVar[Optional["SpanContext"]] = ContextVar(
+    "archiflow_trace_context", default=None
+)
+
+
+def _new_trace_id() -> str:
+    return "%032x" % random.getrandbits(128)
+
+
+def _new_span_id() -> str:
+    return "%016x" % random.getrandbits(64)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies a span and carries the trace's sampling decision."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"trace_id": self.trace_id, "span_id": self.span_id, "sampled": self.sampled}
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["SpanContext"]:
+        """Parse a propagated context, returning None if it is malformed."""
+        if not isinstance(data, dict):
+            return None
+        trace_id = data.get("trace_id")
+        span_id = data.get("span_id")
+        if not isinstance(trace_id, str) or not isinstance(span_id, str):
+            return None
+        return cls(trace_id=trace_id, span_id=span_id, sampled=bool(data.get("sampled", True)))
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+        name: Operation name (e.g. "agent.step", "llm.generate")
+        trace_id: Trace this span belongs to
+        span_id: Unique span identifier
+        parent_id: Parent span ID, or None for a trace root
+        start_time: Start as Unix time
+        end_time: End as Unix time (None while the span is open)
+        attributes: Key/value details such as tool name or token counts
+        status: "ok" or "error"
+        sampled: Whether the span is recorded when it ends
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    sampled: bool = True
+    _start_perf: float = field(default=0.0, repr=False, compare=False)
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time if self.end_time is not None else time.time()
+        return max(0.0, (end - self.start_time) * 1000)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def set_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        return cls(
+            name=data["name"],
+            trace_id=data["trace_id"],
+            span_id=data["span_id"],
+            parent_id=data.get("parent_id"),
+            start_time=data["start_time"],
+            end_time=data.get("end_time"),
+            attributes=dict(data.get("attributes") or {}),
+            status=data.get("status", "ok"),
+        )
+
+
+def current_context() -> Optional[SpanContext]:
+    """Return the trace context of the innermost open span, if any."""
+    return _current_context.get()
+
+
+@contextmanager
+def attach_context(context: Optional[SpanContext]) -> Iterator[None]:
+    """Make ``context`` current for the duration of the block."""
+    token = _current_context.set(context)
+    try:
+        yield
+    finally:
+        _current_context.reset(token)
+
+
+def inject_context(metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Add the current trace context to message metadata.
+
+    Returns ``metadata`` unchanged when no trace is active, otherwise a copy
+    with the context under ``TRACE_METADATA_KEY``.
+    """
+    context = _current_context.get()
+    if context is None:
+        return metadata
+    injected = dict(metadata) if metadata else {}
+    injected[TRACE_METADATA_KEY] = context.to_dict()
+    return injected
+
+
+def extract_context(metadata: Optional[Dict[str, Any]]) -> Optional[SpanContext]:
+    """Read a propagated trace context from message metadata."""
+    if not metadata:
+        return None
+    return SpanContext.from_dict(metadata.get(TRACE_METADATA_KEY))
+
+
+class Tracer:
+    """
+    Creates spans and keeps the most recent finished ones.
+
+    Usage:
+        tracer = Tracer(sample_rate=0.1, sink=JsonlSpanSink("traces.jsonl"))
+        with tracer.span("agent.step", agent="CodingAgent") as span:
+            ...
+            if span:
+                span.set_attribute("tool_calls", 2)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        capacity: int = 4096,
+        sink: Optional["SpanSink"] = None,
+        flush_every: int = 256,
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of traces to record (0 disables tracing)
+            capacity: Number of finished spans kept in memory
+            sink: Optional sink that finished spans are exported to
+            flush_every: Pending span count that triggers an export
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if flush_every <= 0:
+            raise ValueError("flush_every must be positive")
+
+        self.sample_rate = sample_rate
+        self.capacity = capacity
+        self.sink = sink
+        self.flush_every = flush_every
+
+        self._spans: deque = deque(maxlen=capacity)
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        start_time: Optional[float] = None,
+        **attributes: Any,
+    ) -> Optional[Span]:
+        """
+        Open a span without making it current.
+
+        Args:
+            name: Operation name
+            parent: Parent context (defaults to the current context)
+            start_time: Unix start time (defaults to now)
+            **attributes: Initial span attributes
+
+        Returns:
+            The new span, or None when tracing is disabled and no trace
+            is active
+        """
+        if parent is None:
+            parent = _current_context.get()
+        if parent is None:
+            if not self.enabled:
+                return None
+            trace_id, parent_id = _new_trace_id(), None
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        else:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=_new_span_id(),
+            parent_id=parent_id,
+            start_time=start_time if start_time is not None else time.time(),
+            attributes=attributes,
+            sampled=sampled,
+            _start_perf=time.perf_counter(),
+        )
+
+    def end_span(self, span: Span, end_time: Optional[float] = None) -> None:
+        """Close a span and record it if its trace is sampled."""
+        if span.end_time is None:
+            if end_time is None:
+                end_time = span.start_time + (time.perf_counter() - span._start_perf)
+            span.end_time = end_time
+        if not span.sampled:
+            return
+
+        self._spans.append(span)
+        if self.sink is None:
+            return
+        with self._lock:
+            self._pending.append(span)
+            should_flush = span.parent_id is None or len(self._pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        **attributes: Any,
+    ) -> Iterator[Optional[Span]]:
+        """
+        Open a span, make it current for the block and close it afterwards.
+
+        Yields None when tracing is disabled. Exceptions mark the span as
+        failed and propagate.
+        """
+        span = self.start_span(name, parent=parent, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_context.set(span.context)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_error(exc)
+            raise
+        finally:
+            _current_context.reset(token)
+            self.end_span(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: Optional[float] = None,
+        parent: Optional[SpanContext] = None,
+        **attributes: Any,
+    ) -> Optional[Span]:
+        """
+        Record a span whose start was observed elsewhere (e.g. a queue wait).
+
+        Returns:
+            The recorded span, or None when tracing is disabled
+        """
+        span = self.start_span(name, parent=parent, start_time=start_time, **attributes)
+        if span is None:
+            return None
+        self.end_span(span, end_time=end_time if end_time is not None else time.time())
+        return span
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Return buffered spans, optionally only those of one trace."""
+        spans = list(self._spans)
+        if trace_id is None:
+            return spans
+        return [span for span in spans if span.trace_id == trace_id]
+
+    def flush(self) -> int:
+        """
+        Export pending spans to the sink.
+
+        Returns:
+            Number of spans exported
+        """
+        if self.sink is None:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            self.sink.export(pending)
+        except Exception as e:
+            logger.warning("Failed to export %d spans: %s", len(pending), e)
+            return 0
+        return len(pending)
+
+    def clear(self) -> None:
+        """Drop buffered and pending spans."""
+        self._spans.clear()
+        with self._lock:
+            self._pending = []
+
+    def shutdown(self) -> None:
+        """Flush pending spans and close the sink."""
+        self.flush()
+        if self.sink is not None:
+            self.sink.close()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def tracer_from_env(environ: Optional[Dict[str, str]] = None) -> Tracer:
+    """
+    Build a tracer from environment variables.
+
+    - ARCHIFLOW_TRACE_SAMPLE_RATE: fraction of turns to trace (default 1.0)
+    - ARCHIFLOW_TRACE_BUFFER: spans kept in memory (default 4096)
+    - ARCHIFLOW_TRACE_FILE: file to export spans to (default: none)
+    - ARCHIFLOW_TRACE_FORMAT: "jsonl" (default) or "otlp"
+    """
+    from .sinks import create_sink
+
+    env = os.environ if environ is None else environ
+    try:
+        sample_rate = min(1.0, max(0.0, float(env.get("ARCHIFLOW_TRACE_SAMPLE_RATE", "1.0"))))
+    except ValueError:
+        logger.warning("Invalid ARCHIFLOW_TRACE_SAMPLE_RATE, tracing every turn")
+        sample_rate = 1.0
+    try:
+        capacity = max(1, int(env.get("ARCHIFLOW_TRACE_BUFFER", "4096")))
+    except ValueError:
+        capacity = 4096
+
+    sink = None
+    trace_file = env.get("ARCHIFLOW_TRACE_FILE")
+    if trace_file:
+        sink = create_sink(trace_file, env.get("ARCHIFLOW_TRACE_FORMAT", "jsonl"))
+
+    return Tracer(sample_rate=sample_rate, capacity=capacity, sink=sink)
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer, creating it from the environment."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = tracer_from_env()
+                atexit.register(_shutdown_tracer)
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Optional[Tracer]:
+    """
+    Replace the process-wide tracer.
+
+    Returns:
+        The previous tracer, if one was created
+    """
+    global _tracer
+    with _tracer_lock:
+        previous, _tracer = _tracer, tracer
+    if previous is None:
+        atexit.register(_shutdown_tracer)
+    return previous
+
+
+def _shutdown_tracer() -> None:
+    if _tracer is not None:
+        _tracer.shutdown()
@@ -26,6 +26,7 @@ from .exceptions import (
     MessageNotFoundError
 )
 from .storage import StorageBackend, InMemoryBackend
+from .propagation import get_trace_propagator
 
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
@@ -137,7 +138,7 @@ class MessageBroker:
         if not topic:
             raise ValueError("Topic name cannot be empty")
         
-        message = Message.create(topic=topic, payload=payload, metadata=metadata)
+        message = Message.create(topic=topic, payload=payload, metadata=get_trace_propagator().inject(metadata))
         self._metrics.increment_topic_published(topic)
         if self._running and topic in self._subscriptions:
             self._subscription_queues[topic].put(message)
@@ -184,18 +185,21 @@ class MessageBroker:
                     
                     with self._lock:
                         callbacks = self._subscriptions.get(topic, []).copy()
-                    for callback in callbacks:
-                        try:
-                            if asyncio.iscoroutinefunction(callback):
-                                if self._event_loop and self._event_loop.is_running():
-                                    asyncio.run_coroutine_threadsafe(callback(message), self._event_loop)
+                    propagator = get_trace_propagator()
+                    with propagator.delivery(message):
+                        for callback in callbacks:
+                            try:
+                                if asyncio.iscoroutinefunction(callback):
+                                    coro = propagator.bind(callback(message))
+                                    if self._event_loop and self._event_loop.is_running():
+                                        asyncio.run_coroutine_threadsafe(coro, self._event_loop)
+                                    else:
+                                        asyncio.run(coro)
                                 else:
-                                    asyncio.run(callback(message))
-                            else:
-                                callback(message)
-                        except Exception as e:
-                            logger.error(f"Error in subscriber for topic '{topic}': {e}")
-                            self._metrics.increment_topic_failed_delivery(topic)
+                                    callback(message)
+                            except Exception as e:
+                                logger.error(f"Error in subscriber for topic '{topic}': {e}")
+                                self._metrics.increment_topic_failed_delivery(topic)
                 
                 except Exception as e:
                     logger.error(f"Error in delivery worker for topic '{topic}': {e}")
@@ -239,7 +243,7 @@ class MessageBroker:
             topic=queue_name,
             payload=task,
             max_retries=config.max_retries,
-            metadata=metadata
+            metadata=get_trace_propagator().inject(metadata)
         )
         
         # Delegate to storage
@@ -309,12 +313,13 @@ class MessageBroker:
                         success = False
                         
                         try:
-                            if asyncio.iscoroutinefunction(worker_func):
-                                # Async worker - run in this thread's persistent loop
-                                loop.run_until_complete(worker_func(message.payload))
-                            else:
-                                # Sync worker
-                                worker_func(message.payload)
+                            with get_trace_propagator().delivery(message):
+                                if asyncio.iscoroutinefunction(worker_func):
+                                    # Async worker - run in this thread's persistent loop
+                                    loop.run_until_complete(worker_func(message.payload))
+                                else:
+                                    # Sync worker
+                                    worker_func(message.payload)
                             
                             success = True
                             
@@ -353,6 +358,7 @@ class MessageBroker:
                         logger.error(f"Error in worker thread for queue '{queue_name}': {e}")
             finally:
                 # Clean up the loop when thread exits
+                loop.run_until_complete(loop.shutdown_asyncgens())
                 loop.close()
         
         # Create and start worker threads
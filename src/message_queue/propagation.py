@@ -0,0 +1,63 @@
+"""
+Trace propagation hooks for the broker.
+
+The message queue has no tracing of its own. A tracing implementation
+installs a TracePropagator with set_trace_propagator(); the broker calls it
+to stamp published messages and to run subscribers and workers inside the
+propagated context. The default propagator does nothing.
+"""
+
+from contextlib import nullcontext
+from typing import Any, ContextManager, Coroutine, Dict, Optional
+
+from .message import Message
+
+
+class TracePropagator:
+    """
+    Hooks the broker calls around publishing and delivery.
+
+    The base class is the no-op propagator; tracing implementations
+    override the hooks they need.
+    """
+
+    def inject(self, metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the metadata for a message published in the current context."""
+        return metadata
+
+    def delivery(self, message: Message) -> ContextManager[Any]:
+        """Context manager wrapping the delivery of a message to its handlers."""
+        return nullcontext()
+
+    def bind(self, coro: Coroutine) -> Coroutine:
+        """
+        Bind a handler coroutine to the current delivery context.
+
+        Called inside delivery() for async subscribers, whose coroutines run
+        on another thread's event loop.
+        """
+        return coro
+
+
+_propagator = TracePropagator()
+
+
+def get_trace_propagator() -> TracePropagator:
+    """Return the installed trace propagator."""
+    return _propagator
+
+
+def set_trace_propagator(propagator: Optional[TracePropagator]) -> TracePropagator:
+    """
+    Install a trace propagator for all brokers.
+
+    Args:
+        propagator: Propagator to install (None restores the no-op one)
+
+    Returns:
+        The previously installed propagator
+    """
+    global _propagator
+    previous = _propagator
+    _propagator = propagator or TracePropagator()
+    return previous
@@ -150,18 +150,43 @@ class WebStorageQuota(StorageQuota):
         # Just check quota - actual reservation not supported
         return await self.check_quota(session_id, workspace_path, bytes_to_reserve)
 
+    def apply_delta(self, workspace_path: Path, delta_bytes: int) -> None:
+        """
+        Record a completed write in the session's usage ledger.
+
+        Args:
+            workspace_path: Path to workspace (ignored, uses self._workspace_path)
+            delta_bytes: Bytes added (positive) or freed (negative)
+        """
+        if self._workspace_path.exists():
+            self.storage_manager.workspace_manager.get_usage_ledger(
+                self.user_id, self.session_id
+            ).apply_delta(delta_bytes)
+
+    def mark_stale(self, workspace_path: Path) -> None:
+        """
+        Request a background rescan of the session's workspace.
+
+        Args:
+            workspace_path: Path to workspace (ignored, uses self._workspace_path)
+        """
+        if self._workspace_path.exists():
+            self.storage_manager.workspace_manager.get_usage_ledger(
+                self.user_id, self.session_id
+            ).mark_stale()
+
     def set_usage(self, workspace_path: Path, usage: int) -> None:
         """
         Set usage (no-op for web backend).
 
-        The web backend tracks usage via filesystem scanning, not manual tracking.
+        The web backend tracks usage in the workspace's usage ledger.
 
         Args:
             workspace_path: Path to workspace (ignored)
             usage: Usage in bytes (ignored)
 
         Note:
-            This is a no-op because StorageManager calculates usage from disk.
+            This is a no-op because usage is measured from disk, not set.
         """
         pass
 
@@ -170,7 +195,7 @@ class WebStorageQuota(StorageQuota):
         Reset all usage tracking (no-op for web backend).
 
         Note:
-            This is a no-op because StorageManager calculates usage from disk.
+            This is a no-op because usage is measured from disk, not set.
         """
         pass
 
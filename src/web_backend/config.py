@@ -53,6 +53,13 @@ class Settings(BaseSettings):
     MAX_SESSIONS_PER_USER: int = 20
     WORKSPACE_RETENTION_DAYS: int = 30
 
+    # Audit Logging
+    AUDIT_MAX_SEGMENT_MB: int = 10
+    AUDIT_COMPRESS_SEGMENTS: bool = False
+
+    # LLM Usage
+    USAGE_FLUSH_INTERVAL: float = 60.0
+
     # Agent Framework
     DEFAULT_LLM_PROVIDER: str = "openai"
 
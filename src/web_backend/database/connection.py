@@ -67,7 +67,7 @@ async def init_db() -> None:
 
     async with engine.begin() as conn:
         # Import all models to ensure they're registered with Base
-        from ..models import Session, Message  # noqa: F401
+        from ..models import Session, Message, UsageRollup  # noqa: F401
 
         await conn.run_sync(Base.metadata.create_all)
 
@@ -13,7 +13,7 @@ import sys
 
 from .config import settings
 from .database.connection import init_db, close_db
-from .routes import sessions, agents, artifacts, workflow, messages, agent_execution, workspace, comments
+from .routes import sessions, agents, artifacts, workflow, messages, agent_execution, workspace, comments, usage
 from .websocket.server import sio
 from .services import (
     get_workspace_manager,
@@ -21,6 +21,7 @@ from .services import (
     get_audit_logger,
     init_web_agent_factory,
     get_runner_pool,
+    get_usage_service,
     SandboxMode,
 )
 
@@ -87,6 +88,13 @@ async def lifespan(app: FastAPI):
     )
     logger.info(f"WebAgentFactory initialized with sandbox_mode={sandbox_mode.value}")
 
+    # Suspend agent runners that sit idle
+    get_runner_pool().start_eviction()
+
+    # Persist LLM usage rollups in the background
+    usage_service = get_usage_service()
+    usage_service.start()
+
     logger.info("Application startup complete")
 
     yield
@@ -99,6 +107,19 @@ async def lifespan(app: FastAPI):
     await runner_pool.stop_all()
     logger.info("All agent runners stopped")
 
+    # Stop the background workspace usage scanner
+    from agent_framework.storage.ledger import get_usage_reconciler
+    get_usage_reconciler().stop()
+
+    # Write queued audit events
+    audit_logger.close()
+
+    # Write pending usage rollups
+    try:
+        await usage_service.stop()
+    except Exception as e:
+        logger.warning(f"Final usage flush failed: {e}")
+
     await close_db()
     logger.info("Application shutdown complete")
 
@@ -204,6 +225,12 @@ app.include_router(
     tags=["comments"]
 )
 
+app.include_router(
+    usage.router,
+    prefix=f"{settings.API_PREFIX}",
+    tags=["usage"]
+)
+
 
 # Mount Socket.IO
 # The Socket.IO server is mounted at /socket.io by default
@@ -13,6 +13,7 @@ from .comment import (
     CommentSubmissionRequest,
     CommentSubmissionResponse,
 )
+from .usage import UsageRollup
 
 __all__ = [
     "Session",
@@ -26,4 +27,5 @@ __all__ = [
     "CommentStatus",
     "CommentSubmissionRequest",
     "CommentSubmissionResponse",
+    "UsageRollup",
 ]
@@ -0,0 +1,50 @@
+"""
+Usage rollup model for ArchiFlow Web Backend.
+
+Stores LLM token usage and cost aggregated per time bucket, session and model.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, Float, UniqueConstraint
+
+from ..database.connection import Base
+
+
+class UsageRollup(Base):
+    """
+    SQLAlchemy model for aggregated LLM usage.
+
+    One row per (bucket_start, session_id, model); flushing a bucket again
+    adds to the existing row. Calls without a session use an empty session_id.
+    """
+    __tablename__ = "usage_rollups"
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "session_id", "model", name="uq_usage_rollup_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Start of the time bucket (UTC)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    session_id = Column(String(64), nullable=False, default="", index=True)
+    model = Column(String(255), nullable=False)
+
+    # Totals
+    calls = Column(Integer, nullable=False, default=0)
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cost = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<UsageRollup(bucket={self.bucket_start}, session={self.session_id}, model={self.model})>"
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for API responses."""
+        return {
+            "bucket_start": self.bucket_start.isoformat() if self.bucket_start else None,
+            "session_id": self.session_id or None,
+            "model": self.model,
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": self.cost,
+        }
@@ -10,5 +10,6 @@ from . import messages
 from . import agent_execution
 from . import workspace
 from . import comments
+from . import usage
 
-__all__ = ["sessions", "agents", "artifacts", "workflow", "messages", "agent_execution", "workspace", "comments"]
+__all__ = ["sessions", "agents", "artifacts", "workflow", "messages", "agent_execution", "workspace", "comments", "usage"]
@@ -136,6 +136,28 @@ async def stop_session(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{session_id}/interrupt", response_model=MessageResponse)
+async def interrupt_session(
+    session_id: str,
+    manager: AgentSessionManager = Depends(get_manager),
+):
+    """
+    Interrupt the agent's current turn.
+
+    The in-flight LLM call and running tools are aborted; the session
+    stays running and waits for the next message.
+    """
+    try:
+        interrupted = await manager.interrupt_session(session_id)
+        return MessageResponse(
+            success=interrupted,
+            message="Turn interrupted" if interrupted else "No turn to interrupt",
+        )
+
+    except AgentExecutionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/{session_id}/pause", response_model=MessageResponse)
 async def pause_session(
     session_id: str,
@@ -295,6 +317,7 @@ async def websocket_endpoint(
 
     Receives:
     - {"type": "message", "content": "..."} - Send message to agent
+    - {"type": "interrupt"} - Abort the agent's current turn
     - {"type": "ping"} - Keep-alive ping
 
     Sends:
@@ -339,6 +362,9 @@ async def websocket_endpoint(
                     content = data.get("content", "")
                     if content and runner.is_running:
                         await runner.send_message(content)
+                    elif content and runner.is_suspended:
+                        # Suspended while idle; this resumes the agent
+                        await manager.send_message(session_id, content)
                     elif not runner.is_running:
                         await websocket.send_json({
                             "type": "error",
@@ -355,6 +381,10 @@ async def websocket_endpoint(
                     if runner.is_running:
                         await runner.stop()
 
+                elif msg_type == "interrupt":
+                    if runner.is_running:
+                        await runner.interrupt()
+
                 elif msg_type == "pause":
                     if runner.is_running:
                         await runner.pause()
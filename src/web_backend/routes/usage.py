@@ -0,0 +1,49 @@
+"""
+Usage API routes.
+
+Reports LLM token usage and cost over time windows, across sessions.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..services.usage_service import get_usage_service
+
+router = APIRouter()
+
+
+def _resolve_window(start: Optional[datetime], end: Optional[datetime]):
+    """Default to the last 24 hours and reject empty windows."""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return start, end
+
+
+@router.get("/usage")
+async def get_usage(
+    start: Optional[datetime] = Query(None, description="Window start (default: 24 hours before end)"),
+    end: Optional[datetime] = Query(None, description="Window end (default: now)"),
+    session_id: Optional[str] = Query(None, description="Only this session"),
+):
+    """Get token usage and cost for a time window."""
+    start, end = _resolve_window(start, end)
+    return await get_usage_service().get_usage_window(start, end, session_id=session_id)
+
+
+@router.get("/usage/timeseries")
+async def get_usage_timeseries(
+    start: Optional[datetime] = Query(None, description="Window start (default: 24 hours before end)"),
+    end: Optional[datetime] = Query(None, description="Window end (default: now)"),
+    bucket_seconds: int = Query(3600, ge=60, description="Interval width in seconds"),
+    session_id: Optional[str] = Query(None, description="Only this session"),
+):
+    """Get token usage and cost in fixed-width intervals."""
+    start, end = _resolve_window(start, end)
+    points = await get_usage_service().get_usage_timeseries(
+        start, end, bucket_seconds=bucket_seconds, session_id=session_id
+    )
+    return {"start": start.isoformat(), "end": end.isoformat(), "points": points}
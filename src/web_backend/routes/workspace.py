@@ -12,6 +12,8 @@ from fastapi import APIRouter, HTTPException, Query, Response, Request
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from agent_framework.storage.ledger import file_size, get_usage_ledger
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -316,7 +318,9 @@ async def write_workspace_file(
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write file content
+        old_size = file_size(file_path)
         file_path.write_text(request.content, encoding=request.encoding)
+        get_usage_ledger(session_path).record_file_change(file_path, old_size)
 
         logger.info(f"Wrote file {path} in workspace {session_id} ({len(request.content)} chars)")
 
@@ -93,6 +93,10 @@ from .comment_service import (
     CommentServiceError,
     get_comment_service,
 )
+from .usage_service import (
+    UsageService,
+    get_usage_service,
+)
 
 __all__ = [
     # Session
@@ -157,5 +161,8 @@ __all__ = [
     "CommentNotFoundError",
     "CommentServiceError",
     "get_comment_service",
+    # Usage
+    "UsageService",
+    "get_usage_service",
 ]
 
@@ -10,14 +10,19 @@ This module now supports two execution modes:
 Set USE_BROKER_ARCHITECTURE=false to use direct mode.
 """
 
-from typing import Optional, AsyncIterator, Dict, Any, Callable, Awaitable
+from typing import Optional, AsyncIterator, Dict, Any, Callable, Awaitable, List
 from pathlib import Path
 from datetime import datetime, timezone
 import asyncio
 import inspect
 import logging
 import os
+import time
 
+import psutil
+
+from agent_framework.agent_engine import get_execution_engine
+from agent_framework.cancellation import cancellation_scope, get_cancellation_registry
 from agent_framework.messages.types import BaseMessage, UserMessage, LLMRespondMessage
 
 from .web_context import WebExecutionContext, SandboxMode
@@ -36,6 +41,9 @@ logger = logging.getLogger(__name__)
 # Feature flag for broker architecture (default: True)
 USE_BROKER_ARCHITECTURE = os.getenv("USE_BROKER_ARCHITECTURE", "true").lower() == "true"
 
+# Broker events after which the agent waits for the next user message
+_TURN_END_EVENTS = frozenset({"waiting_for_input", "agent_finished"})
+
 
 class AgentExecutionError(Exception):
     """Raised when agent execution fails."""
@@ -117,8 +125,17 @@ class WebAgentRunner:
         # Execution state
         self._running = False
         self._paused = False
+        self._suspended = False
         self._task: Optional[asyncio.Task] = None
 
+        # Turn state: broker mode waits for the agent to ask for input or
+        # finish; direct mode counts the steps being run
+        self._turn_in_flight = False
+        self._steps_in_flight = 0
+
+        # Monotonic time of the last message or agent event
+        self.last_activity = time.monotonic()
+
         # Message queue for async message passing (used in direct mode)
         self._message_queue: asyncio.Queue = asyncio.Queue()
 
@@ -132,6 +149,31 @@ class WebAgentRunner:
         """Check if agent is paused."""
         return self._paused
 
+    @property
+    def is_suspended(self) -> bool:
+        """Check if the runner was suspended while idle (see suspend())."""
+        return self._suspended
+
+    @property
+    def is_busy(self) -> bool:
+        """Check if a turn is in flight (LLM call, tools, or queued steps)."""
+        if self._turn_in_flight or self._steps_in_flight:
+            return True
+        return get_execution_engine().pending(self._engine_session_id) > 0
+
+    @property
+    def _engine_session_id(self) -> str:
+        """Key the agent's steps are queued under on the execution engine."""
+        context = getattr(self._session_broker, "context", None)
+        if context is not None:
+            return context.agent_topic
+        return self.session.id
+
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since the last message to or event from the agent."""
+        return time.monotonic() - self.last_activity
+
     @property
     def context(self) -> Optional[WebExecutionContext]:
         """Get the execution context."""
@@ -162,8 +204,10 @@ class WebAgentRunner:
         if self._running:
             raise AgentExecutionError("Agent is already running")
 
+        self.last_activity = time.monotonic()
         try:
-            # Create agent with sandboxed tools
+            # Create agent with sandboxed tools, resuming its saved history
+            # if the session ran before
             self.agent = await self.factory.create_agent(
                 agent_type=self.session.agent_type,
                 session_id=self.session.id,
@@ -186,6 +230,7 @@ class WebAgentRunner:
                     }
                 )
 
+            self._suspended = False
             if self._use_broker:
                 # Broker mode: Create and start session broker
                 await self._start_with_broker(user_prompt)
@@ -254,6 +299,7 @@ class WebAgentRunner:
         logger.info(f"📤 [AgentRunner] Sending initial prompt to broker...")
 
         # Send initial prompt via broker
+        self._turn_in_flight = True
         await self._session_broker.send_message(user_prompt)
 
         logger.info(
@@ -292,6 +338,9 @@ class WebAgentRunner:
         Args:
             event: Event from session broker
         """
+        self.last_activity = time.monotonic()
+        if event.get("type") in _TURN_END_EVENTS:
+            self._turn_in_flight = False
         if self.message_callback:
             try:
                 # Add timestamp if not present
@@ -320,6 +369,8 @@ class WebAgentRunner:
         logger.info(f"   Broker mode: {self._use_broker}")
         logger.info("=" * 60)
 
+        self.last_activity = time.monotonic()
+
         if not self._running:
             error_msg = "Agent is not running"
             logger.error(f"❌ [AgentRunner] {error_msg}")
@@ -333,6 +384,7 @@ class WebAgentRunner:
         if self._use_broker and self._session_broker:
             # Broker mode: Send via broker
             logger.info(f"🔄 [AgentRunner] Sending via session broker...")
+            self._turn_in_flight = True
             await self._session_broker.send_message(content)
             logger.info(f"✅ [AgentRunner] Message sent to broker successfully")
         else:
@@ -341,11 +393,50 @@ class WebAgentRunner:
             await self._run_agent_step(content)
             logger.info(f"✅ [AgentRunner] Agent step completed")
 
+    async def interrupt(self, reason: str = "interrupted by user") -> bool:
+        """
+        Abort the agent's current turn without stopping the session.
+
+        The in-flight LLM call is closed and running tools are killed
+        instead of finishing (and billing) the turn. The agent then waits
+        for the next message.
+
+        Args:
+            reason: Why the turn was interrupted (shown to the client)
+
+        Returns:
+            True if a turn was interrupted
+        """
+        if not self._running:
+            return False
+
+        if self._session_broker:
+            # The controller reports the interrupt through the client topic
+            interrupted = self._session_broker.interrupt(reason)
+        else:
+            get_execution_engine().cancel_session(self.session.id)
+            interrupted = get_cancellation_registry().cancel(self.session.id, reason)
+            if interrupted:
+                await self._emit_event("agent_interrupted", {
+                    "session_id": self.session.id,
+                    "reason": reason,
+                })
+
+        if interrupted and self.factory.audit_logger:
+            self.factory.audit_logger.log_session_event(
+                session_id=self.session.id,
+                user_id=self.session.user_id,
+                event_type="session_interrupted",
+                details={"reason": reason}
+            )
+        return interrupted
+
     async def pause(self) -> None:
-        """Pause agent execution."""
+        """Pause agent execution, aborting the turn in flight."""
         if not self._running:
             return
 
+        await self.interrupt("paused")
         self._paused = True
 
         await self._emit_event("agent_paused", {
@@ -384,8 +475,39 @@ class WebAgentRunner:
         if not self._running:
             return
 
+        await self._shutdown("agent_stopped", "session_stopped")
+
+    async def suspend(self) -> None:
+        """
+        Release the agent of an idle session.
+
+        The agent's history is snapshotted to the session store first, so
+        the next start() - normally the session's next message - creates
+        the agent again where it left off.
+        """
+        if not self._running:
+            return
+
+        session_log = getattr(self.agent, "session_log", None)
+        if session_log is not None:
+            session_log.snapshot()
+
+        await self._shutdown("agent_suspended", "session_suspended")
+        self._suspended = True
+        self.agent = None
+        self._context = None
+
+    async def _shutdown(self, event_type: str, audit_event_type: str) -> None:
+        """Stop the broker and any pending step, then report the stop."""
         self._running = False
         self._paused = False
+        self._turn_in_flight = False
+
+        # Abort the turn in flight so its LLM call and tools stop now
+        registry = get_cancellation_registry()
+        registry.cancel(self.session.id, "session stopped")
+        registry.discard(self.session.id)
+        get_execution_engine().cancel_session(self.session.id)
 
         # Stop broker if using broker mode
         if self._session_broker:
@@ -404,7 +526,12 @@ class WebAgentRunner:
             except asyncio.CancelledError:
                 pass
 
-        await self._emit_event("agent_stopped", {
+        # Release the session log; the saved history lets a new runner resume
+        session_log = getattr(self.agent, "session_log", None)
+        if session_log is not None:
+            session_log.close()
+
+        await self._emit_event(event_type, {
             "session_id": self.session.id,
         })
 
@@ -412,7 +539,7 @@ class WebAgentRunner:
             self.factory.audit_logger.log_session_event(
                 session_id=self.session.id,
                 user_id=self.session.user_id,
-                event_type="session_stopped",
+                event_type=audit_event_type,
                 details={}
             )
 
@@ -441,7 +568,11 @@ class WebAgentRunner:
             })
 
             # Run agent step
-            response = await self._execute_agent_step(user_message)
+            self._steps_in_flight += 1
+            try:
+                response = await self._execute_agent_step(user_message)
+            finally:
+                self._steps_in_flight -= 1
 
             # Emit response event
             if response:
@@ -474,24 +605,34 @@ class WebAgentRunner:
             if inspect.iscoroutinefunction(self.agent.step):
                 return await self.agent.step(message)
             else:
-                # Run sync step in executor
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(None, self.agent.step, message)
+                # Run sync step on the execution engine (serialized per
+                # session, under the global LLM concurrency limit)
+                return await self._run_on_engine(self.agent.step, message)
 
         # Fallback: try run method
         if hasattr(self.agent, 'run'):
             if inspect.iscoroutinefunction(self.agent.run):
                 return await self.agent.run(message.content if hasattr(message, 'content') else str(message))
             else:
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(
-                    None,
+                return await self._run_on_engine(
                     self.agent.run,
                     message.content if hasattr(message, 'content') else str(message)
                 )
 
         raise AgentExecutionError("Agent has no step or run method")
 
+    async def _run_on_engine(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking agent call as a job of this session on the execution engine."""
+        engine = get_execution_engine()
+        # Each direct-mode step is a user turn that interrupt() can cancel
+        token = get_cancellation_registry().begin(self.session.id)
+
+        async def job() -> Any:
+            with cancellation_scope(token):
+                return await engine.run_blocking(fn, *args)
+
+        return await asyncio.wrap_future(engine.submit(self.session.id, job))
+
     async def _emit_event(self, event_type: str, data: Dict[str, Any]) -> None:
         """
         Emit an event via the callback.
@@ -500,6 +641,7 @@ class WebAgentRunner:
             event_type: Type of event
             data: Event data
         """
+        self.last_activity = time.monotonic()
         if self.message_callback:
             try:
                 await self.message_callback({
@@ -533,6 +675,8 @@ class WebAgentRunner:
             "agent_type": self.session.agent_type,
             "is_running": self._running,
             "is_paused": self._paused,
+            "is_suspended": self._suspended,
+            "idle_seconds": round(self.idle_seconds, 1),
             "mode": "broker" if self._use_broker else "direct",
         }
 
@@ -555,38 +699,143 @@ class AgentRunnerPool:
     Pool of active agent runners.
 
     Manages multiple concurrent agent sessions.
+
+    Runners that have been idle for ``idle_timeout`` seconds are suspended
+    (see WebAgentRunner.suspend()): their history is snapshotted and the
+    agent is released. The runner object stays in the pool's suspended
+    set, and the session's next message starts it again from the snapshot.
+    Paused runners are never suspended.
+
+    New runners are admitted while the host has memory and CPU headroom
+    and, if ``max_runners`` is set, fewer than that many are active. When
+    there is no room, the least recently used runners idle for at least
+    ``PRESSURE_IDLE_SECONDS`` are suspended first.
     """
 
-    def __init__(self, max_runners: int = 100):
+    # Minimum idle time before a runner may be suspended to admit another
+    PRESSURE_IDLE_SECONDS = 60.0
+
+    def __init__(
+        self,
+        max_runners: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        min_free_memory_mb: Optional[float] = None,
+        max_load_per_cpu: Optional[float] = None,
+        headroom: Optional[Callable[[], Optional[str]]] = None,
+    ):
         """
         Initialize the pool.
 
         Args:
-            max_runners: Maximum concurrent runners
+            max_runners: Hard cap on active runners (default ARCHIFLOW_MAX_RUNNERS; none if unset)
+            idle_timeout: Seconds of inactivity before a runner is suspended
+                (default ARCHIFLOW_RUNNER_IDLE_MINUTES, 15 minutes)
+            min_free_memory_mb: Available memory below which no runner is admitted
+                (default ARCHIFLOW_RUNNER_MIN_FREE_MB, 512)
+            max_load_per_cpu: 1-minute load average per CPU above which no runner
+                is admitted (default ARCHIFLOW_RUNNER_MAX_LOAD, 4.0)
+            headroom: Replaces the memory/CPU check; returns why there is no
+                room, or None if there is
         """
+        if max_runners is None and os.getenv("ARCHIFLOW_MAX_RUNNERS"):
+            max_runners = int(os.environ["ARCHIFLOW_MAX_RUNNERS"])
+        if idle_timeout is None:
+            idle_timeout = float(os.getenv("ARCHIFLOW_RUNNER_IDLE_MINUTES", "15")) * 60
+        if min_free_memory_mb is None:
+            min_free_memory_mb = float(os.getenv("ARCHIFLOW_RUNNER_MIN_FREE_MB", "512"))
+        if max_load_per_cpu is None:
+            max_load_per_cpu = float(os.getenv("ARCHIFLOW_RUNNER_MAX_LOAD", "4.0"))
+
         self.max_runners = max_runners
+        self.idle_timeout = idle_timeout
+        self.min_free_memory_mb = min_free_memory_mb
+        self.max_load_per_cpu = max_load_per_cpu
+        self._headroom = headroom or self._system_headroom
+
         self._runners: Dict[str, WebAgentRunner] = {}
+        self._suspended: Dict[str, WebAgentRunner] = {}
         self._lock = asyncio.Lock()
+        self._eviction_task: Optional[asyncio.Task] = None
+
+        self.suspensions = 0
+        self.rejections = 0
 
     async def get(self, session_id: str) -> Optional[WebAgentRunner]:
         """Get a runner by session ID."""
         async with self._lock:
             return self._runners.get(session_id)
 
+    async def get_suspended(self, session_id: str) -> Optional[WebAgentRunner]:
+        """Get the suspended runner of a session, if it was suspended while idle."""
+        async with self._lock:
+            return self._suspended.get(session_id)
+
     async def add(self, runner: WebAgentRunner) -> None:
-        """Add a runner to the pool."""
+        """
+        Add a runner to the pool.
+
+        Raises:
+            AgentExecutionError: If there is no room, even after suspending idle runners
+        """
         async with self._lock:
-            if len(self._runners) >= self.max_runners:
-                raise AgentExecutionError(f"Maximum runners ({self.max_runners}) reached")
-            self._runners[runner.session.id] = runner
+            session_id = runner.session.id
+            problem = self._admission_problem(session_id)
+            if problem:
+                for candidate in self._idle_runners(self.PRESSURE_IDLE_SECONDS):
+                    await self._suspend(candidate)
+                    problem = self._admission_problem(session_id)
+                    if not problem:
+                        break
+            if problem:
+                self.rejections += 1
+                raise AgentExecutionError(problem)
+
+            self._suspended.pop(session_id, None)
+            self._runners[session_id] = runner
 
     async def remove(self, session_id: str) -> Optional[WebAgentRunner]:
         """Remove a runner from the pool."""
         async with self._lock:
-            return self._runners.pop(session_id, None)
+            suspended = self._suspended.pop(session_id, None)
+            return self._runners.pop(session_id, None) or suspended
+
+    async def evict_idle(self, max_idle: Optional[float] = None) -> int:
+        """
+        Suspend runners idle for longer than ``max_idle`` seconds.
+
+        Args:
+            max_idle: Idle threshold (defaults to the pool's idle_timeout)
+
+        Returns:
+            Number of runners suspended
+        """
+        threshold = self.idle_timeout if max_idle is None else max_idle
+        async with self._lock:
+            idle = self._idle_runners(threshold)
+            for runner in idle:
+                await self._suspend(runner)
+        return len(idle)
+
+    def start_eviction(self, interval: float = 60.0) -> None:
+        """Start suspending idle runners in the background every ``interval`` seconds."""
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._eviction_loop(interval))
+
+    async def _eviction_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                count = await self.evict_idle()
+                if count:
+                    logger.info(f"Suspended {count} idle agent runner(s)")
+            except Exception as e:
+                logger.warning(f"Idle runner eviction failed: {e}")
 
     async def stop_all(self) -> None:
         """Stop all runners."""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
         async with self._lock:
             for runner in self._runners.values():
                 try:
@@ -594,15 +843,80 @@ class AgentRunnerPool:
                 except Exception as e:
                     logger.warning(f"Error stopping runner: {e}")
             self._runners.clear()
+            self._suspended.clear()
 
     def list_active(self) -> list:
         """List active session IDs."""
         return list(self._runners.keys())
 
+    def list_suspended(self) -> list:
+        """List session IDs whose runners are suspended."""
+        return list(self._suspended.keys())
+
     def count(self) -> int:
         """Get count of active runners."""
         return len(self._runners)
 
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters for monitoring."""
+        return {
+            "active": len(self._runners),
+            "suspended": len(self._suspended),
+            "suspensions": self.suspensions,
+            "rejections": self.rejections,
+            "max_runners": self.max_runners,
+            "idle_timeout": self.idle_timeout,
+        }
+
+    def _admission_problem(self, session_id: str) -> Optional[str]:
+        """Why a runner for this session cannot be added now (None if it can)."""
+        if session_id in self._runners:
+            # Replacing a runner does not take more room
+            return None
+        if self.max_runners is not None and len(self._runners) >= self.max_runners:
+            return f"Maximum runners ({self.max_runners}) reached"
+        return self._headroom()
+
+    def _system_headroom(self) -> Optional[str]:
+        available_mb = psutil.virtual_memory().available / (1024 * 1024)
+        if available_mb < self.min_free_memory_mb:
+            return (
+                f"Not enough memory for another agent session "
+                f"({available_mb:.0f} MB free, {self.min_free_memory_mb:.0f} MB required)"
+            )
+        load = psutil.getloadavg()[0] / (psutil.cpu_count() or 1)
+        if load > self.max_load_per_cpu:
+            return f"Server too busy for another agent session (load {load:.1f} per CPU)"
+        return None
+
+    def _idle_runners(self, min_idle: float) -> List[WebAgentRunner]:
+        """Runners idle for at least ``min_idle`` seconds, least recently used first."""
+        idle = []
+        for runner in self._runners.values():
+            seconds = getattr(runner, "idle_seconds", None)
+            if not isinstance(seconds, (int, float)) or seconds < min_idle:
+                continue
+            if runner.is_paused is True:
+                continue
+            if runner.is_busy is True:
+                # Never snapshot (or cancel) a turn that is still running
+                continue
+            idle.append((seconds, runner))
+        idle.sort(key=lambda item: item[0], reverse=True)
+        return [runner for _, runner in idle]
+
+    async def _suspend(self, runner: WebAgentRunner) -> None:
+        session_id = runner.session.id
+        self._runners.pop(session_id, None)
+        try:
+            await runner.suspend()
+        except Exception as e:
+            logger.warning(f"Error suspending runner for session {session_id}: {e}")
+            return
+        self._suspended[session_id] = runner
+        self.suspensions += 1
+        logger.info(f"Suspended idle runner for session {session_id}")
+
 
 # Global runner pool instance
 _runner_pool: Optional[AgentRunnerPool] = None
@@ -12,6 +12,8 @@ import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from agent_framework.memory.session_log import get_session_store
+
 from .web_agent_factory import WebAgentFactory, get_web_agent_factory
 from .agent_runner import WebAgentRunner, AgentRunnerPool, get_runner_pool, AgentExecutionError
 from .workspace_manager import WorkspaceManager, get_workspace_manager
@@ -218,6 +220,15 @@ class AgentSessionManager:
                 runner.message_callback = message_callback
             return runner
 
+        # A runner suspended while idle comes back (not started; its next
+        # start resumes the agent from the saved history)
+        runner = await self.runner_pool.get_suspended(session_id)
+        if runner:
+            if message_callback:
+                runner.message_callback = message_callback
+            await self.runner_pool.add(runner)
+            return runner
+
         # Get session from database
         session = await self.get_session(session_id)
         if not session:
@@ -246,6 +257,8 @@ class AgentSessionManager:
 
         If the runner exists but hasn't been started yet (no initial prompt),
         this will start the agent with the message as the first prompt.
+        A runner suspended while idle is started again the same way; the
+        agent resumes from its saved history.
 
         Args:
             session_id: Session ID
@@ -255,6 +268,10 @@ class AgentSessionManager:
             AgentExecutionError: If session not active
         """
         runner = await self.runner_pool.get(session_id)
+        if not runner:
+            runner = await self.runner_pool.get_suspended(session_id)
+            if runner:
+                await self.runner_pool.add(runner)
         if not runner:
             raise AgentExecutionError(f"Session {session_id} is not active")
 
@@ -268,6 +285,18 @@ class AgentSessionManager:
             # Runner already running - just send the message
             await runner.send_message(content)
 
+    async def interrupt_session(self, session_id: str) -> bool:
+        """
+        Abort the current turn of a running session.
+
+        Returns:
+            True if a turn was interrupted
+        """
+        runner = await self.runner_pool.get(session_id)
+        if not runner:
+            return False
+        return await runner.interrupt()
+
     async def pause_session(self, session_id: str) -> None:
         """Pause a running session."""
         runner = await self.runner_pool.get(session_id)
@@ -318,6 +347,14 @@ class AgentSessionManager:
                 session.user_id, session_id
             )
 
+        # Drop the agent's saved history so the ID cannot resume it
+        store = get_session_store()
+        if store is not None:
+            try:
+                store.delete(session_id)
+            except ValueError:
+                pass
+
         # Delete from database
         return await self.session_service.delete(session_id)
 
@@ -423,7 +460,9 @@ class AgentSessionManager:
         max_idle_minutes: int = 60,
     ) -> int:
         """
-        Clean up sessions that have been idle too long.
+        Suspend the runners of sessions that have been idle too long.
+
+        Their agents are released; the next message resumes them.
 
         Args:
             max_idle_minutes: Maximum idle time before cleanup
@@ -431,10 +470,7 @@ class AgentSessionManager:
         Returns:
             Number of sessions cleaned up
         """
-        count = 0
-        # This would scan for idle sessions and clean them up
-        # Implementation depends on tracking last activity time
-        return count
+        return await self.runner_pool.evict_idle(max_idle_minutes * 60)
 
 
 # Dependency injection helper
@@ -14,6 +14,8 @@ import aiofiles
 import aiofiles.os
 import logging
 
+from agent_framework.storage.ledger import UsageLedger, file_size
+
 from .workspace_manager import WorkspaceManager, WorkspaceSecurityError, get_workspace_manager
 from .storage_manager import StorageManager, StorageLimitError, get_storage_manager
 
@@ -79,6 +81,10 @@ class ArtifactService:
         """
         return self.workspace_manager.validate_path(self.workspace, path)
 
+    def _usage_ledger(self) -> UsageLedger:
+        """Usage ledger of this session's workspace."""
+        return self.workspace_manager.get_usage_ledger(self.user_id, self.session_id)
+
     def _detect_file_type(self, path: Path) -> str:
         """
         Detect the type category of a file.
@@ -260,8 +266,10 @@ class ArtifactService:
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write content
+        old_size = file_size(file_path)
         async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
             await f.write(content)
+        self._usage_ledger().record_file_change(file_path, old_size)
 
         logger.info(f"Saved artifact: {path} ({len(content_bytes)} bytes)")
 
@@ -298,8 +306,10 @@ class ArtifactService:
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write content
+        old_size = file_size(file_path)
         async with aiofiles.open(file_path, 'wb') as f:
             await f.write(content)
+        self._usage_ledger().record_file_change(file_path, old_size)
 
         logger.info(f"Saved binary artifact: {path} ({len(content)} bytes)")
 
@@ -323,8 +333,11 @@ class ArtifactService:
         if file_path.is_dir():
             import shutil
             shutil.rmtree(file_path)
+            self._usage_ledger().mark_stale()
         else:
+            old_size = file_size(file_path)
             file_path.unlink()
+            self._usage_ledger().apply_delta(-old_size)
 
         logger.info(f"Deleted artifact: {path}")
         return True
@@ -13,6 +13,8 @@ import json
 import logging
 import hashlib
 
+from agent_framework.audit.writer import AuditWriter, get_audit_writer, parse_timestamp
+from ..config import settings
 from .workspace_manager import get_workspace_manager
 
 logger = logging.getLogger(__name__)
@@ -82,6 +84,24 @@ class AuditEvent:
         """Convert to JSON line for log file."""
         return json.dumps(self.to_dict(), separators=(',', ':'))
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AuditEvent":
+        """Create an event from its to_dict() form."""
+        return cls(
+            event_id=data["event_id"],
+            timestamp=data["timestamp"],
+            event_type=AuditEventType(data["event_type"]),
+            severity=AuditSeverity(data["severity"]),
+            session_id=data["session_id"],
+            user_id=data["user_id"],
+            action=data["action"],
+            details=data.get("details", {}),
+            success=data.get("success", True),
+            error=data.get("error"),
+            ip_address=data.get("ip_address"),
+            user_agent=data.get("user_agent"),
+        )
+
 
 class AuditLogger:
     """
@@ -91,18 +111,23 @@ class AuditLogger:
     - Append-only log files (JSONL format)
     - Per-session audit logs
     - Global audit log for cross-session events
-    - Event filtering and querying
+    - Event filtering and querying through per-segment indexes
     - Tamper detection via checksums
 
+    Events are written by a background AuditWriter in batches, so logging
+    never blocks the event loop on disk I/O. Call flush() before reading
+    the files directly; get_session_events() flushes on its own.
+
     Audit logs are stored in:
     - Session: {workspace}/.archiflow/audit.jsonl
-    - Global: {base_path}/.audit/global.jsonl
+    - Global: {base_path}/.audit/audit-{date}.jsonl
     """
 
     def __init__(
         self,
         base_path: Optional[Path] = None,
         workspace_manager=None,
+        writer: Optional[AuditWriter] = None,
     ):
         """
         Initialize the audit logger.
@@ -110,9 +135,11 @@ class AuditLogger:
         Args:
             base_path: Base path for global audit logs
             workspace_manager: WorkspaceManager instance
+            writer: AuditWriter to queue events on (defaults to the shared one)
         """
         self.workspace_manager = workspace_manager or get_workspace_manager()
         self.base_path = base_path or self.workspace_manager.base_path
+        self.writer = writer or get_audit_writer()
 
         # Ensure global audit directory exists
         self._global_audit_dir = self.base_path / ".audit"
@@ -121,6 +148,9 @@ class AuditLogger:
         # Event counters for metrics
         self._event_counts: Dict[str, int] = {}
 
+        # Resolved session audit files, so logging does not resolve paths per event
+        self._session_files: Dict[tuple, Path] = {}
+
     def _generate_event_id(self) -> str:
         """Generate a unique event ID."""
         timestamp = datetime.now(timezone.utc).isoformat()
@@ -129,30 +159,36 @@ class AuditLogger:
 
     def _get_session_audit_file(self, user_id: str, session_id: str) -> Path:
         """Get the audit file path for a session."""
-        workspace = self.workspace_manager.get_workspace_path(user_id, session_id)
-        return workspace / ".archiflow" / "audit.jsonl"
+        key = (user_id, session_id)
+        path = self._session_files.get(key)
+        if path is None:
+            if len(self._session_files) >= 4096:
+                self._session_files.clear()
+            workspace = self.workspace_manager.get_workspace_path(user_id, session_id)
+            path = self._session_files[key] = workspace / ".archiflow" / "audit.jsonl"
+        return path
 
     def _get_global_audit_file(self) -> Path:
         """Get the global audit file path."""
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         return self._global_audit_dir / f"audit-{today}.jsonl"
 
-    def _write_event(self, event: AuditEvent, file_path: Path) -> None:
+    def _write_event(self, event: AuditEvent, file_path: Path, line: Optional[str] = None) -> None:
         """
-        Write an event to an audit file.
+        Queue an event for an audit file.
 
         Args:
             event: The audit event to write
             file_path: Path to the audit file
+            line: The event's JSON line, if already serialized
         """
         try:
-            # Ensure parent directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Append to file
-            with open(file_path, 'a', encoding='utf-8') as f:
-                f.write(event.to_json_line() + '\n')
-
+            self.writer.append(
+                file_path,
+                line or event.to_json_line(),
+                event_type=event.event_type.value,
+                timestamp=parse_timestamp(event.timestamp),
+            )
         except Exception as e:
             # Never fail silently on audit writes - log to Python logger
             logger.error(f"Failed to write audit event: {e}")
@@ -168,15 +204,17 @@ class AuditLogger:
         event_key = f"{event.event_type.value}:{event.severity.value}"
         self._event_counts[event_key] = self._event_counts.get(event_key, 0) + 1
 
+        line = event.to_json_line()
+
         # Write to session audit file
         if event.session_id:
             session_file = self._get_session_audit_file(event.user_id, event.session_id)
-            self._write_event(event, session_file)
+            self._write_event(event, session_file, line)
 
         # Write security events and errors to global audit
         if event.severity in (AuditSeverity.WARNING, AuditSeverity.ERROR, AuditSeverity.CRITICAL):
             global_file = self._get_global_audit_file()
-            self._write_event(event, global_file)
+            self._write_event(event, global_file, line)
 
         # Also log to Python logger for monitoring
         log_level = {
@@ -406,61 +444,62 @@ class AuditLogger:
         session_id: str,
         event_type: Optional[AuditEventType] = None,
         limit: int = 100,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
     ) -> List[AuditEvent]:
         """
-        Read audit events for a session.
+        Read audit events for a session, oldest first.
+
+        Filters are applied to the log's index, so only matching events
+        are read and parsed.
 
         Args:
             user_id: User ID
             session_id: Session ID
             event_type: Optional filter by event type
             limit: Maximum events to return
+            since: Only events at or after this time
+            until: Only events before this time
 
         Returns:
             List of audit events
         """
         audit_file = self._get_session_audit_file(user_id, session_id)
 
-        if not audit_file.exists():
-            return []
-
         events = []
         try:
-            with open(audit_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    # Filter by event type if specified
-                    if event_type and data.get("event_type") != event_type.value:
-                        continue
-
-                    events.append(AuditEvent(
-                        event_id=data["event_id"],
-                        timestamp=data["timestamp"],
-                        event_type=AuditEventType(data["event_type"]),
-                        severity=AuditSeverity(data["severity"]),
-                        session_id=data["session_id"],
-                        user_id=data["user_id"],
-                        action=data["action"],
-                        details=data.get("details", {}),
-                        success=data.get("success", True),
-                        error=data.get("error"),
-                        ip_address=data.get("ip_address"),
-                        user_agent=data.get("user_agent"),
-                    ))
-
-                    if len(events) >= limit:
-                        break
+            lines = self.writer.query(
+                audit_file,
+                event_type=event_type.value if event_type else None,
+                since=since.timestamp() if since else None,
+                until=until.timestamp() if until else None,
+                limit=limit,
+            )
+            for line in lines:
+                event = AuditEvent.from_dict(json.loads(line))
+                # The index matches types by checksum; confirm the real type
+                if event_type and event.event_type != event_type:
+                    continue
+                events.append(event)
 
         except Exception as e:
             logger.error(f"Error reading audit log: {e}")
 
         return events
 
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Wait until all logged events are on disk.
+
+        Returns:
+            False if the timeout expired first
+        """
+        return self.writer.flush(timeout)
+
+    def close(self) -> None:
+        """Write pending events and close the audit files."""
+        self.writer.close()
+
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get audit metrics.
@@ -471,6 +510,7 @@ class AuditLogger:
         return {
             "event_counts": self._event_counts.copy(),
             "total_events": sum(self._event_counts.values()),
+            "writer": self.writer.stats(),
         }
 
 
@@ -482,5 +522,10 @@ def get_audit_logger() -> AuditLogger:
     """Get the global AuditLogger instance."""
     global _audit_logger
     if _audit_logger is None:
-        _audit_logger = AuditLogger()
+        _audit_logger = AuditLogger(
+            writer=AuditWriter(
+                max_bytes=settings.AUDIT_MAX_SEGMENT_MB * 1024 * 1024,
+                compress_rotated=settings.AUDIT_COMPRESS_SEGMENTS,
+            )
+        )
     return _audit_logger
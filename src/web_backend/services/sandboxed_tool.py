@@ -9,6 +9,7 @@ from pathlib import Path
 import logging
 import re
 
+from agent_framework.runtime.sandbox import SandboxRuntime
 from agent_framework.tools.tool_base import BaseTool, ToolResult
 
 from .web_context import WebExecutionContext, SandboxMode
@@ -92,28 +93,26 @@ class SandboxedToolWrapper:
             return False
         return param_name.lower() in PATH_PARAMETERS
 
-    def _validate_path(self, path: str) -> str:
+    def _validate_paths(self, parameters: Dict[str, Any]) -> Optional[str]:
         """
-        Validate and potentially rewrite a path.
+        Validate every path parameter against the workspace.
 
         Args:
-            path: The path to validate
+            parameters: Tool parameters
 
         Returns:
-            The validated (possibly rewritten) path
-
-        Raises:
-            SandboxViolationError: If path escapes sandbox
+            Error message for the first violating parameter, or None
         """
         if self.context.sandbox_mode == SandboxMode.DISABLED:
-            return path
+            return None
 
-        try:
-            validated = self.context.validate_path(path)
-            # Return the path relative to workspace for consistency
-            return str(validated.relative_to(self.context.workspace_path))
-        except (WorkspaceSecurityError, ValueError) as e:
-            raise SandboxViolationError(f"Path security violation: {e}")
+        for param_name, param_value in parameters.items():
+            if self._is_path_parameter(param_name) and isinstance(param_value, str):
+                try:
+                    self.context.validate_path(param_value)
+                except (WorkspaceSecurityError, ValueError) as e:
+                    return f"Security violation in {param_name}: {e}"
+        return None
 
     def _sanitize_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -215,20 +214,15 @@ class SandboxedToolWrapper:
             kwargs = self._apply_overrides(kwargs)
 
             # Validate path parameters
-            for param_name, param_value in list(kwargs.items()):
-                if self._is_path_parameter(param_name) and isinstance(param_value, str):
-                    try:
-                        # Validate the path is within sandbox
-                        self.context.validate_path(param_value)
-                    except (WorkspaceSecurityError, ValueError) as e:
-                        error = f"Security violation in {param_name}: {e}"
-                        self.context.log_tool_execution(
-                            tool_name=tool_name,
-                            parameters=self._sanitize_parameters(kwargs),
-                            success=False,
-                            error=error,
-                        )
-                        return ToolResult(error=error)
+            error = self._validate_paths(kwargs)
+            if error is not None:
+                self.context.log_tool_execution(
+                    tool_name=tool_name,
+                    parameters=self._sanitize_parameters(kwargs),
+                    success=False,
+                    error=error,
+                )
+                return ToolResult(error=error)
 
             # Special handling for bash tool
             if tool_name in ("bash", "restricted_bash"):
@@ -245,7 +239,13 @@ class SandboxedToolWrapper:
                     return ToolResult(error=str(e))
 
             # Execute the tool
-            result = await self.tool.execute(**kwargs)
+            try:
+                result = await self.tool.execute(**kwargs)
+            finally:
+                # File tools only create regular files; anything else may
+                # have added symlinks the path cache doesn't know about
+                if tool_name not in SandboxRuntime.FILE_TOOLS:
+                    self.context.invalidate_path_cache()
 
             # Log execution
             self.context.log_tool_execution(
@@ -10,6 +10,8 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 import logging
 
+from agent_framework.llm.usage_tracker import get_usage_tracker
+
 from ..models.session import Session, SessionStatus
 from ..schemas.session import SessionCreate, SessionUpdate
 
@@ -194,6 +196,9 @@ class SessionService:
         await self.db.delete(session)
         await self.db.commit()
 
+        # Persisted usage rollups are kept; only the in-memory totals go
+        get_usage_tracker().forget_session(session_id)
+
         logger.info(f"Deleted session {session_id}")
         return True
 
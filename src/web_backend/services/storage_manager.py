@@ -160,26 +160,18 @@ class StorageManager:
         """
         Calculate total storage used by a user across all sessions.
 
+        Sums the sessions' usage ledgers rather than scanning every file.
+
         Args:
             user_id: User ID
 
         Returns:
             Total storage in bytes
         """
-        user_path = self.workspace_manager.base_path / user_id
-        if not user_path.exists():
-            return 0
-
-        total = 0
-        for session_dir in user_path.iterdir():
-            if session_dir.is_dir():
-                for path in session_dir.rglob("*"):
-                    if path.is_file():
-                        try:
-                            total += path.stat().st_size
-                        except OSError:
-                            pass
-        return total
+        return sum(
+            self.workspace_manager.get_workspace_size(user_id, session_id)
+            for session_id in self.workspace_manager.list_user_workspaces(user_id)
+        )
 
     def get_user_session_count(self, user_id: str) -> int:
         """
@@ -0,0 +1,273 @@
+"""
+Usage Service for ArchiFlow Web Backend.
+
+Persists the LLM usage rollups collected by the process-wide UsageTracker
+to the database and answers time-windowed cost and token queries across
+sessions.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from agent_framework.llm.usage_tracker import UsageTracker, get_usage_tracker
+
+from ..database.connection import async_session_factory
+from ..models.usage import UsageRollup
+
+logger = logging.getLogger(__name__)
+
+
+def _to_db_time(value: datetime) -> datetime:
+    """Convert a datetime to the naive UTC form stored in the database."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class UsageService:
+    """
+    Service for persisting and querying LLM usage.
+
+    The tracker keeps running totals per time bucket in memory; flush()
+    adds them to the ``usage_rollups`` table, so each flush is one upsert
+    per (bucket, session, model) touched since the previous one. A
+    background task flushes every ``interval`` seconds once started.
+    """
+
+    def __init__(
+        self,
+        tracker: Optional[UsageTracker] = None,
+        session_factory: Optional[async_sessionmaker] = None,
+        interval: float = 60.0,
+    ):
+        """
+        Initialize UsageService.
+
+        Args:
+            tracker: Usage tracker to drain. If None, uses the process-wide one.
+            session_factory: Database session factory. If None, uses default.
+            interval: Seconds between background flushes
+        """
+        self.tracker = tracker or get_usage_tracker()
+        self.tracker.collect_rollups = True
+        self.session_factory = session_factory or async_session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    async def flush(self) -> int:
+        """
+        Write pending rollups to the database.
+
+        Rollups are put back on the tracker if the write fails.
+
+        Returns:
+            Number of rollup rows written
+        """
+        async with self._flush_lock:
+            rollups = self.tracker.drain_rollups()
+            if not rollups:
+                return 0
+
+            rows = [
+                {
+                    "bucket_start": datetime.fromtimestamp(bucket, timezone.utc).replace(tzinfo=None),
+                    "session_id": session_id or "",
+                    "model": model,
+                    "calls": agg.calls,
+                    "input_tokens": agg.input_tokens,
+                    "output_tokens": agg.output_tokens,
+                    "cost": agg.cost,
+                }
+                for (bucket, session_id, model), agg in rollups.items()
+            ]
+            stmt = sqlite_insert(UsageRollup).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["bucket_start", "session_id", "model"],
+                set_={
+                    "calls": UsageRollup.calls + stmt.excluded.calls,
+                    "input_tokens": UsageRollup.input_tokens + stmt.excluded.input_tokens,
+                    "output_tokens": UsageRollup.output_tokens + stmt.excluded.output_tokens,
+                    "cost": UsageRollup.cost + stmt.excluded.cost,
+                },
+            )
+
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(stmt)
+                    await db.commit()
+            except Exception:
+                self.tracker.restore_rollups(rollups)
+                raise
+
+            logger.debug(f"Flushed {len(rows)} usage rollups")
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Usage flush failed, will retry: {e}")
+
+    def start(self) -> None:
+        """Start flushing in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def _window_filter(self, stmt, start: datetime, end: datetime, session_id: Optional[str]):
+        stmt = stmt.where(
+            UsageRollup.bucket_start >= _to_db_time(start),
+            UsageRollup.bucket_start < _to_db_time(end),
+        )
+        if session_id is not None:
+            stmt = stmt.where(UsageRollup.session_id == session_id)
+        return stmt
+
+    async def get_usage_window(
+        self,
+        start: datetime,
+        end: datetime,
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get token usage and cost for a time window.
+
+        Resolution is the tracker's bucket width: a bucket counts if it
+        starts inside [start, end).
+
+        Args:
+            start: Window start (inclusive)
+            end: Window end (exclusive)
+            session_id: Only this session (all sessions if None)
+
+        Returns:
+            Totals plus breakdowns by model and by session
+        """
+        await self.flush()
+
+        totals = (
+            func.sum(UsageRollup.calls),
+            func.sum(UsageRollup.input_tokens),
+            func.sum(UsageRollup.output_tokens),
+            func.sum(UsageRollup.cost),
+        )
+
+        def as_dict(row) -> Dict[str, Any]:
+            calls, input_tokens, output_tokens, cost = row
+            return {
+                "calls": calls or 0,
+                "input_tokens": input_tokens or 0,
+                "output_tokens": output_tokens or 0,
+                "total_tokens": (input_tokens or 0) + (output_tokens or 0),
+                "cost": cost or 0.0,
+            }
+
+        async with self.session_factory() as db:
+            overall = (await db.execute(
+                self._window_filter(select(*totals), start, end, session_id)
+            )).one()
+            by_model = (await db.execute(
+                self._window_filter(select(UsageRollup.model, *totals), start, end, session_id)
+                .group_by(UsageRollup.model)
+            )).all()
+            by_session = (await db.execute(
+                self._window_filter(select(UsageRollup.session_id, *totals), start, end, session_id)
+                .group_by(UsageRollup.session_id)
+            )).all()
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "session_id": session_id,
+            **as_dict(overall),
+            "by_model": {row[0]: as_dict(row[1:]) for row in by_model},
+            "by_session": {row[0]: as_dict(row[1:]) for row in by_session if row[0]},
+        }
+
+    async def get_usage_timeseries(
+        self,
+        start: datetime,
+        end: datetime,
+        bucket_seconds: int = 3600,
+        session_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get usage in fixed-width intervals across a time window.
+
+        Args:
+            start: Window start (inclusive)
+            end: Window end (exclusive)
+            bucket_seconds: Interval width (a multiple of the tracker's bucket width)
+            session_id: Only this session (all sessions if None)
+
+        Returns:
+            List of {"bucket_start", "calls", "input_tokens", "output_tokens", "cost"},
+            oldest first, for intervals with usage
+        """
+        if bucket_seconds <= 0:
+            raise ValueError(f"bucket_seconds must be positive, got {bucket_seconds}")
+
+        await self.flush()
+
+        stmt = self._window_filter(
+            select(
+                UsageRollup.bucket_start,
+                UsageRollup.calls,
+                UsageRollup.input_tokens,
+                UsageRollup.output_tokens,
+                UsageRollup.cost,
+            ),
+            start, end, session_id,
+        )
+        async with self.session_factory() as db:
+            rows = (await db.execute(stmt)).all()
+
+        series: Dict[int, Dict[str, Any]] = {}
+        for bucket_start, calls, input_tokens, output_tokens, cost in rows:
+            epoch = int(bucket_start.replace(tzinfo=timezone.utc).timestamp())
+            key = epoch // bucket_seconds * bucket_seconds
+            point = series.setdefault(key, {
+                "bucket_start": datetime.fromtimestamp(key, timezone.utc).isoformat(),
+                "calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost": 0.0,
+            })
+            point["calls"] += calls
+            point["input_tokens"] += input_tokens
+            point["output_tokens"] += output_tokens
+            point["cost"] += cost
+
+        return [series[key] for key in sorted(series)]
+
+
+# Singleton instance
+_usage_service: Optional[UsageService] = None
+
+
+def get_usage_service() -> UsageService:
+    """Get the singleton usage service instance."""
+    global _usage_service
+    if _usage_service is None:
+        from ..config import settings
+        _usage_service = UsageService(interval=settings.USAGE_FLUSH_INTERVAL)
+    return _usage_service
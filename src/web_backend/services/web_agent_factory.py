@@ -27,13 +27,19 @@ Usage:
     )
 """
 
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Callable, Tuple, TYPE_CHECKING
 from pathlib import Path
 import logging
+import os
+import threading
 
 from agent_framework.runtime.context import ExecutionContext
 from agent_framework.runtime.manager import RuntimeManager
 from agent_framework.runtime.local import LocalRuntime
+from agent_framework.runtime.process_pool import CPU_HEAVY_TOOLS, ProcessPoolRuntime
+from agent_framework.runtime.security import SecurityPolicy
+from agent_framework.llm.provider import LLMProvider
+from agent_framework.llm.usage_tracker import get_usage_tracker
 
 from .web_context import WebExecutionContext, SandboxMode
 from .workspace_manager import WorkspaceManager
@@ -96,9 +102,19 @@ class WebAgentFactory:
         self.audit_logger = audit_logger
         self.sandbox_mode = sandbox_mode
 
-        # Create global runtime manager
-        self._runtime_manager = RuntimeManager()
+        # Create global runtime manager. CPU-heavy tools run in worker
+        # processes so they don't hold the GIL against the web server.
+        policy = SecurityPolicy(
+            tool_runtime_map={name: "process_pool" for name in CPU_HEAVY_TOOLS}
+        )
+        self._runtime_manager = RuntimeManager(security_policy=policy)
         self._runtime_manager.register_runtime("local", LocalRuntime())
+        self._runtime_manager.register_runtime("process_pool", ProcessPoolRuntime())
+
+        # One warm LLM provider per configured (provider, model); sessions
+        # get copies that share its client
+        self._llm_providers: Dict[Tuple[str, str], LLMProvider] = {}
+        self._llm_providers_lock = threading.Lock()
 
         logger.info(
             f"WebAgentFactory initialized: sandbox_mode={sandbox_mode.value}, "
@@ -241,6 +257,41 @@ class WebAgentFactory:
             f"audit={audit_trail is not None})"
         )
 
+    def get_llm_provider(
+        self,
+        session_id: str,
+        create_provider: Optional[Callable[[], LLMProvider]] = None,
+    ) -> LLMProvider:
+        """
+        Get an LLM provider for a session.
+
+        The first session for the configured provider and model creates it;
+        later sessions get a copy that shares its client (see
+        LLMProvider.for_session), with usage attributed to their own session.
+
+        Args:
+            session_id: Session the provider is for
+            create_provider: Provider constructor (defaults to create_llm_provider)
+
+        Returns:
+            Provider for the session
+        """
+        if create_provider is None:
+            from agent_cli.agents.llm_provider_factory import create_llm_provider as create_provider
+
+        name = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
+        key = (name, os.getenv(f"DEFAULT_{name.upper()}_MODEL", ""))
+        with self._llm_providers_lock:
+            shared = self._llm_providers.get(key)
+            if shared is None:
+                shared = create_provider()
+                self._llm_providers[key] = shared
+                logger.info(f"Created shared LLM provider for {key[0]} {key[1] or '(default model)'}")
+
+        return shared.for_session(
+            session_id, usage_tracker=shared.usage_tracker or get_usage_tracker()
+        )
+
     async def create_agent(
         self,
         agent_type: str,
@@ -253,6 +304,11 @@ class WebAgentFactory:
         """
         Create an agent with sandboxed tools.
 
+        The agent's history is saved in the session store under
+        ``session_id`` (see agent_framework.memory.session_log), so an agent
+        created again for the same session - e.g. after a worker restart -
+        continues where it left off.
+
         Args:
             agent_type: Type of agent to create (coding, comic, ppt, etc.)
             session_id: Session identifier
@@ -303,10 +359,15 @@ class WebAgentFactory:
                 }
             )
 
-        # Create LLM provider if not provided
+        # Use the warm shared provider unless one was given
         llm_provider = kwargs.pop("llm_provider", None)
         if llm_provider is None:
-            llm_provider = create_llm_provider()
+            llm_provider = self.get_llm_provider(session_id, create_llm_provider)
+
+        # Attribute the agent's LLM usage to this session in the shared tracker
+        elif getattr(llm_provider, "usage_tracker", None) is None:
+            llm_provider.usage_tracker = get_usage_tracker()
+            llm_provider.usage_session_id = session_id
 
         # Create the base agent using CLI factory
         logger.info(f"📋 [WebAgentFactory] Calling CLI factory with project_directory={workspace_path}")
@@ -11,6 +11,9 @@ from enum import Enum
 import logging
 
 from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.validation import PathValidator, PathValidationError
+
+from .workspace_manager import WorkspaceSecurityError
 
 if TYPE_CHECKING:
     from .workspace_manager import WorkspaceManager
@@ -61,6 +64,10 @@ class WebExecutionContext(ExecutionContext):
     tool_overrides: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     """Per-tool parameter overrides (e.g., force working_dir for bash)."""
 
+    _path_validator: Optional[PathValidator] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validate context after initialization."""
         # Call parent validation
@@ -87,7 +94,7 @@ class WebExecutionContext(ExecutionContext):
             Absolute path within workspace
 
         Raises:
-            SecurityError: If path escapes workspace
+            WorkspaceSecurityError: If path escapes workspace
         """
         if self.sandbox_mode == SandboxMode.DISABLED:
             return Path(path).resolve()
@@ -95,7 +102,20 @@ class WebExecutionContext(ExecutionContext):
         if not self.workspace_manager or not self.workspace_path:
             raise ValueError("WorkspaceManager not configured")
 
-        return self.workspace_manager.validate_path(self.workspace_path, path)
+        if self._path_validator is None:
+            if not self.workspace_path.exists():
+                return self.workspace_manager.validate_path(self.workspace_path, path)
+            self._path_validator = PathValidator(self.workspace_path, mode=self.sandbox_mode.value)
+
+        try:
+            return self._path_validator.validate(path)
+        except PathValidationError as e:
+            raise WorkspaceSecurityError(str(e)) from e
+
+    def invalidate_path_cache(self) -> None:
+        """Forget cached path resolutions after the workspace changed."""
+        if self._path_validator is not None:
+            self._path_validator.invalidate()
 
     def check_file_upload(self, size: int) -> bool:
         """
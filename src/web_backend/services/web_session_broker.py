@@ -305,6 +305,15 @@ class WebSessionBroker:
                 "metadata": payload.get("metadata", {}),
             }
 
+        elif msg_type == "ToolProgress":
+            return {
+                **base_event,
+                "type": "tool_progress",
+                "tool_name": payload.get("tool_name", ""),
+                "call_id": payload.get("call_id", ""),
+                "content": payload.get("content", ""),
+            }
+
         elif msg_type == "AgentThought":
             return {
                 **base_event,
@@ -326,6 +335,13 @@ class WebSessionBroker:
                 "reason": payload.get("reason", ""),
             }
 
+        elif msg_type == "AgentInterrupted":
+            return {
+                **base_event,
+                "type": "agent_interrupted",
+                "reason": payload.get("content", ""),
+            }
+
         elif msg_type == "RefinementNotification":
             return {
                 **base_event,
@@ -376,6 +392,17 @@ class WebSessionBroker:
         )
         logger.debug(f"  Content: {content[:100]}{'...' if len(content) > 100 else ''}")
 
+    def interrupt(self, reason: str = "interrupted by user") -> bool:
+        """
+        Abort the agent's current turn (LLM call and running tools).
+
+        Returns:
+            True if a turn was interrupted
+        """
+        if not self._started or not self.controller:
+            return False
+        return self.controller.interrupt(reason)
+
     async def stop(self) -> None:
         """Stop the broker infrastructure and cleanup resources."""
         if not self._started:
@@ -398,6 +425,13 @@ class WebSessionBroker:
                 except Exception as e:
                     logger.warning(f"Error unsubscribing from client topic: {e}")
 
+            # Drop queued agent steps and abort the one in flight
+            if self.controller:
+                try:
+                    self.controller.close()
+                except Exception as e:
+                    logger.warning(f"Error closing controller: {e}")
+
             # Stop executor
             if self.executor:
                 try:
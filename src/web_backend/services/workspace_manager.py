@@ -12,6 +12,8 @@ import os
 import shutil
 import logging
 
+from agent_framework.storage.ledger import UsageLedger, forget_usage_ledger, get_usage_ledger
+
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -36,7 +38,8 @@ class WorkspaceManager:
             │   ├── session.json
             │   ├── workflow.json
             │   ├── messages.jsonl
-            │   └── audit.jsonl
+            │   ├── audit.jsonl
+            │   └── usage.json   (persisted storage usage ledger)
             ├── artifacts/       (agent-generated files)
             └── exports/         (final outputs: PDF, etc.)
     """
@@ -168,6 +171,7 @@ class WorkspaceManager:
             raise WorkspaceSecurityError("Attempted to delete path outside workspaces")
 
         shutil.rmtree(workspace)
+        forget_usage_ledger(workspace)
         logger.info(f"Deleted workspace: {workspace}")
 
         # Clean up empty user directory
@@ -179,7 +183,10 @@ class WorkspaceManager:
 
     def get_workspace_size(self, user_id: str, session_id: str) -> int:
         """
-        Calculate total size of workspace in bytes.
+        Get total size of workspace in bytes.
+
+        Reads the workspace's usage ledger, so this is O(1) once the
+        workspace has been scanned.
 
         Args:
             user_id: User ID
@@ -193,14 +200,20 @@ class WorkspaceManager:
         if not workspace.exists():
             return 0
 
-        total = 0
-        for path in workspace.rglob("*"):
-            if path.is_file():
-                try:
-                    total += path.stat().st_size
-                except OSError:
-                    pass
-        return total
+        return get_usage_ledger(workspace).usage
+
+    def get_usage_ledger(self, user_id: str, session_id: str) -> UsageLedger:
+        """
+        Get the usage ledger of a workspace, for recording size changes.
+
+        Args:
+            user_id: User ID
+            session_id: Session ID
+
+        Returns:
+            The workspace's UsageLedger
+        """
+        return get_usage_ledger(self.get_workspace_path(user_id, session_id))
 
     def workspace_exists(self, user_id: str, session_id: str) -> bool:
         """Check if a workspace exists."""
@@ -0,0 +1,122 @@
+"""
+Tests for the batched audit writer and FileAuditTrail.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agent_framework.audit.file import FileAuditTrail
+from agent_framework.audit.writer import AuditWriter, segments
+
+
+def line(i: int, event_type: str = "tool_call") -> str:
+    return json.dumps({"i": i, "event_type": event_type, "timestamp": "2024-01-01T00:00:00+00:00"})
+
+
+@pytest.fixture
+def writer():
+    writer = AuditWriter(max_bytes=4096)
+    yield writer
+    writer.close()
+
+
+class TestAuditWriter:
+    """Tests for AuditWriter."""
+
+    def test_flush_writes_everything_in_order(self, writer, tmp_path):
+        """Test that queued lines reach the file in append order."""
+        path = tmp_path / "logs" / "audit.jsonl"
+        for i in range(20):
+            writer.append(path, line(i), event_type="tool_call", timestamp=float(i))
+
+        assert writer.flush()
+
+        assert [json.loads(l)["i"] for l in path.read_text().splitlines()] == list(range(20))
+        assert writer.stats()["pending"] == 0
+        assert writer.stats()["open_files"] == 1
+
+    def test_query_filters_by_type_time_and_limit(self, writer, tmp_path):
+        """Test that queries use the index to select lines."""
+        path = tmp_path / "audit.jsonl"
+        for i in range(30):
+            kind = "file_write" if i % 3 == 0 else "tool_call"
+            writer.append(path, line(i, kind), event_type=kind, timestamp=1000.0 + i)
+
+        writes = writer.query(path, event_type="file_write")
+        assert [json.loads(l)["i"] for l in writes] == list(range(0, 30, 3))
+
+        window = writer.query(path, since=1010.0, until=1015.0)
+        assert [json.loads(l)["i"] for l in window] == [10, 11, 12, 13, 14]
+
+        assert len(writer.query(path, limit=4)) == 4
+
+    def test_rotation_keeps_everything_queryable(self, tmp_path):
+        """Test that rotated (and compressed) segments are still read."""
+        writer = AuditWriter(max_bytes=512, compress_rotated=True, linger=0)
+        path = tmp_path / "audit.jsonl"
+        try:
+            for i in range(40):
+                writer.append(path, line(i), event_type="tool_call", timestamp=float(i))
+                writer.flush()
+
+            names = [p.name for p in segments(path)]
+            assert names[0] == "audit.000001.jsonl.gz"
+            assert names[-1] == "audit.jsonl"
+            assert writer.rotations == len(names) - 1
+
+            assert [json.loads(l)["i"] for l in writer.query(path)] == list(range(40))
+            assert [json.loads(l)["i"] for l in writer.query(path, since=35.0)] == [35, 36, 37, 38, 39]
+        finally:
+            writer.close()
+
+    def test_index_rebuilt_for_existing_log(self, writer, tmp_path):
+        """Test that a log written without an index is indexed on first use."""
+        path = tmp_path / "audit.jsonl"
+        path.write_text("".join(line(i, "file_read") + "\n" for i in range(3)))
+
+        writer.append(path, line(3, "tool_call"), event_type="tool_call")
+
+        assert [json.loads(l)["i"] for l in writer.query(path, event_type="file_read")] == [0, 1, 2]
+        assert [json.loads(l)["i"] for l in writer.query(path, event_type="tool_call")] == [3]
+
+    def test_append_after_close_writes_directly(self, tmp_path):
+        """Test that late events are not lost once the writer is closed."""
+        writer = AuditWriter()
+        path = tmp_path / "audit.jsonl"
+        writer.close()
+
+        writer.append(path, line(0))
+
+        assert path.read_text().strip() == line(0)
+        writer.close()
+
+
+class TestFileAuditTrail:
+    """Tests for FileAuditTrail."""
+
+    @pytest.mark.asyncio
+    async def test_records_round_trip(self, writer, tmp_path):
+        """Test that logged events can be queried back."""
+        audit = FileAuditTrail(tmp_path / "audit.jsonl", writer=writer)
+
+        await audit.log_execution("read", {"file_path": "a.txt", "api_key": "sk-123"}, True)
+        await audit.log_security_event("path_violation", "warning", "Blocked", requested_path="../x")
+        await audit.log_session_event("s1", "started")
+
+        executions = audit.query(event_type="tool_execution")
+        assert executions[0]["params"] == {"file_path": "a.txt", "api_key": "[REDACTED]"}
+        assert audit.query(event_type="path_violation")[0]["requested_path"] == "../x"
+        assert audit.query(event_type="session_started")[0]["session_id"] == "s1"
+        assert len(audit.query()) == 3
+
+    @pytest.mark.asyncio
+    async def test_query_by_time(self, writer, tmp_path):
+        """Test the since/until filters."""
+        audit = FileAuditTrail(tmp_path / "audit.jsonl", writer=writer)
+        await audit.log_session_event("s1", "started")
+
+        now = datetime.now(timezone.utc)
+        assert len(audit.query(since=now - timedelta(minutes=1))) == 1
+        assert audit.query(since=now + timedelta(minutes=1)) == []
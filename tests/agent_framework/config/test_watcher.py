@@ -0,0 +1,195 @@
+"""
+Unit tests for config.watcher and the watched ConfigHierarchy cache.
+"""
+import dataclasses
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent_framework.config import hierarchy as hierarchy_module
+from agent_framework.config.hierarchy import ConfigHierarchy, ConfigSnapshot
+from agent_framework.config.watcher import ConfigWatcher, _load_libc_inotify
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestPollingWatcher(unittest.TestCase):
+    """Test the polling backend."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.watcher = ConfigWatcher(backend="polling", poll_interval=60)
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_detects_changes_to_watched_names_only(self):
+        """Test that only subscribed file names count as changes."""
+        sub_id = self.watcher.subscribe({self.temp_dir: ["settings.json"]}, lambda: None)
+
+        (self.temp_dir / "notes.txt").write_text("unrelated")
+        self.assertEqual(self.watcher.poll_once(), [])
+
+        (self.temp_dir / "settings.json").write_text("{}")
+        self.assertEqual(self.watcher.poll_once(), [sub_id])
+        self.assertEqual(self.watcher.poll_once(), [])
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed files are no longer checked."""
+        sub_id = self.watcher.subscribe({self.temp_dir: ["settings.json"]}, lambda: None)
+        self.watcher.unsubscribe(sub_id)
+
+        (self.temp_dir / "settings.json").write_text("{}")
+        self.assertEqual(self.watcher.poll_once(), [])
+        self.assertEqual(self.watcher.subscription_count, 0)
+
+
+@unittest.skipUnless(_load_libc_inotify(), "inotify not available")
+class TestInotifyWatcher(unittest.TestCase):
+    """Test the inotify backend."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.watcher = ConfigWatcher(backend="inotify", debounce=0.01)
+        self.calls = []
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_notifies_on_watched_file(self):
+        """Test that writing a watched file calls the subscriber back."""
+        self.watcher.subscribe({self.temp_dir: ["settings.json"]}, lambda: self.calls.append(1))
+
+        (self.temp_dir / "other.py").write_text("x = 1")
+        time.sleep(0.1)
+        self.assertEqual(self.calls, [])
+
+        (self.temp_dir / "settings.json").write_text("{}")
+        self.assertTrue(wait_for(lambda: self.calls))
+        self.assertEqual(self.watcher.backend, "inotify")
+
+    def test_picks_up_created_directory(self):
+        """Test that files in a directory created after subscribing are watched."""
+        archiflow_dir = self.temp_dir / ".archiflow"
+        self.watcher.subscribe(
+            {self.temp_dir: [".archiflow"], archiflow_dir: ["settings.json"]},
+            lambda: self.calls.append(1),
+        )
+
+        archiflow_dir.mkdir()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 1))
+
+        (archiflow_dir / "settings.json").write_text("{}")
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+
+
+class TestHierarchyCache(unittest.TestCase):
+    """Test source-set memoization and watch-based invalidation."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.archiflow_dir = self.temp_dir / ".archiflow"
+        self.archiflow_dir.mkdir()
+        self.settings_path = self.archiflow_dir / "settings.json"
+        self.settings_path.write_text(json.dumps({"agent": {"timeout": 1}}))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_snapshot_is_immutable(self):
+        """Test that snapshots cannot be modified."""
+        snapshot = ConfigHierarchy(working_dir=self.temp_dir).load()
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.context = "changed"
+
+    def test_context_change_invalidates_cache(self):
+        """Test that editing a context file (not only settings) reloads."""
+        hierarchy = ConfigHierarchy(working_dir=self.temp_dir)
+        self.assertFalse(hierarchy.load().has_context)
+
+        (self.archiflow_dir / "ARCHIFLOW.md").write_text("# Project rules")
+
+        self.assertIn("# Project rules", hierarchy.load().context)
+
+    def test_memo_shared_between_hierarchies(self):
+        """Test that a second hierarchy with the same sources does not re-parse."""
+        first = ConfigHierarchy(working_dir=self.temp_dir).load()
+
+        second = ConfigHierarchy(working_dir=self.temp_dir)
+        with patch.object(second, "load_settings") as load_settings:
+            snapshot = second.load()
+
+        load_settings.assert_not_called()
+        self.assertIs(snapshot, first)
+        self.assertIn("source_hash", snapshot.metadata)
+
+    def test_restored_file_reuses_memoized_snapshot(self):
+        """Test that reverting a file returns the snapshot from before the edit."""
+        hierarchy = ConfigHierarchy(working_dir=self.temp_dir)
+        original = hierarchy.load()
+        stat = self.settings_path.stat()
+
+        self.settings_path.write_text(json.dumps({"agent": {"timeout": 22}}))
+        self.assertEqual(hierarchy.load().settings["agent"]["timeout"], 22)
+
+        self.settings_path.write_text(json.dumps({"agent": {"timeout": 1}}))
+        os.utime(self.settings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertIs(hierarchy.load(), original)
+
+    def test_watched_load_does_not_touch_files(self):
+        """Test that a watched hierarchy serves loads from the cache."""
+        hierarchy = ConfigHierarchy(working_dir=self.temp_dir, watch=True)
+        self.assertTrue(hierarchy.is_watching)
+        snapshot = hierarchy.load()
+
+        with patch.object(hierarchy_module, "stat_file") as stat_file:
+            for _ in range(10):
+                self.assertIs(hierarchy.load(), snapshot)
+
+        stat_file.assert_not_called()
+        hierarchy.stop_watching()
+        self.assertFalse(hierarchy.is_watching)
+
+    def test_watcher_pushes_new_snapshot(self):
+        """Test that a file change swaps the snapshot and notifies listeners."""
+        hierarchy = ConfigHierarchy(working_dir=self.temp_dir, watch=True)
+        hierarchy.load()
+        pushed = []
+        hierarchy.subscribe(pushed.append)
+
+        self.settings_path.write_text(json.dumps({"agent": {"timeout": 333}}))
+
+        try:
+            self.assertTrue(wait_for(lambda: pushed))
+            self.assertEqual(pushed[-1].settings["agent"]["timeout"], 333)
+            self.assertIs(hierarchy.load(), pushed[-1])
+        finally:
+            hierarchy.stop_watching()
+
+    def test_watch_disabled_by_environment(self):
+        """Test that ARCHIFLOW_CONFIG_WATCHER=off falls back to checking files."""
+        with patch.dict("os.environ", {"ARCHIFLOW_CONFIG_WATCHER": "off"}):
+            hierarchy = ConfigHierarchy(working_dir=self.temp_dir, watch=True)
+
+        self.assertFalse(hierarchy.is_watching)
+        self.assertIsInstance(hierarchy.load(), ConfigSnapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
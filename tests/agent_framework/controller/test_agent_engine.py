@@ -0,0 +1,185 @@
+"""
+Tests for the agent execution engine and the controller running on it.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_framework.agent_controller import AgentController
+from agent_framework.agent_engine import AgentExecutionEngine
+from agent_framework.context import TopicContext
+from agent_framework.messages.types import WaitForUserInput
+
+
+@pytest.fixture
+def engine():
+    engine = AgentExecutionEngine(max_concurrent_llm_calls=2)
+    yield engine
+    engine.shutdown()
+
+
+def step_job(engine, fn):
+    async def job(*args):
+        return await engine.run_blocking(fn, *args)
+    return job
+
+
+class TestAgentExecutionEngine:
+    """Tests for AgentExecutionEngine."""
+
+    def test_session_jobs_run_in_order(self, engine):
+        order = []
+
+        def step(i):
+            time.sleep(0.01 if i % 2 else 0)
+            order.append(i)
+            return i
+
+        futures = [engine.submit("s1", step_job(engine, step), i) for i in range(6)]
+
+        assert [f.result(timeout=5) for f in futures] == list(range(6))
+        assert order == list(range(6))
+
+    def test_concurrent_calls_are_limited(self, engine):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def step():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        futures = [engine.submit(f"s{i}", step_job(engine, step)) for i in range(6)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert max(peak) == 2
+        stats = engine.stats()
+        assert stats["llm_time"]["count"] == 6
+        # Four of the six calls had to wait for a slot
+        assert stats["llm_wait"]["max_ms"] >= 40
+
+    def test_cancel_session_drops_queued_jobs(self, engine):
+        release = threading.Event()
+        ran = []
+
+        def step(i):
+            release.wait(5)
+            ran.append(i)
+
+        futures = [engine.submit("s1", step_job(engine, step), i) for i in range(3)]
+        other = engine.submit("s2", step_job(engine, lambda: "other"))
+        time.sleep(0.05)
+
+        assert engine.cancel_session("s1") == 2
+        release.set()
+
+        assert futures[0].result(timeout=5) is None
+        assert all(f.cancelled() for f in futures[1:])
+        assert other.result(timeout=5) == "other"
+        assert ran == [0]
+        assert engine.pending() == 0
+
+    def test_stats_split_queue_delay_from_llm_time(self, engine):
+        def step():
+            time.sleep(0.05)
+
+        futures = [engine.submit("s1", step_job(engine, step)) for _ in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+
+        stats = engine.stats()
+        assert stats["completed"] == 3
+        assert stats["queue_delay"]["count"] == 3
+        # The third job waited behind two 50ms steps of its session
+        assert stats["queue_delay"]["max_ms"] >= 90
+        assert stats["llm_time"]["mean_ms"] >= 45
+        assert stats["llm_wait"]["max_ms"] < 40
+
+    def test_job_errors_reach_the_future(self, engine):
+        def step():
+            raise RuntimeError("boom")
+
+        future = engine.submit("s1", step_job(engine, step))
+
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        assert engine.submit("s1", step_job(engine, lambda: 1)).result(timeout=5) == 1
+        assert engine.stats()["failed"] == 1
+
+    def test_extra_slots_share_the_limit(self, engine):
+        def step():
+            assert engine.holds_llm_slot()
+            # The step holds one of the two slots, so only one more is free
+            taken = [engine.acquire_llm_slot(blocking=False) for _ in range(2)]
+            in_flight = engine.in_flight
+            engine.release_llm_slot()
+            return taken, in_flight
+
+        taken, in_flight = engine.submit("s1", step_job(engine, step)).result(timeout=5)
+
+        assert taken == [True, False]
+        assert in_flight == 2
+        assert not engine.holds_llm_slot()
+        assert engine.acquire_llm_slot() is True
+        engine.release_llm_slot()
+
+
+class TestControllerOnEngine:
+    """Tests for AgentController stepping the agent on the engine."""
+
+    def test_on_event_does_not_block_delivery(self, engine, tmp_path):
+        release = threading.Event()
+        agent = MagicMock()
+        agent.step.side_effect = lambda message: release.wait(5) and WaitForUserInput(
+            session_id="s1", sequence=message.sequence + 1
+        )
+        broker = MagicMock()
+        context = TopicContext.default("s1")
+        controller = AgentController(agent, broker, context, working_dir=tmp_path, engine=engine)
+        message = MagicMock()
+        message.payload = {
+            "type": "ToolResultObservation", "session_id": "s1", "sequence": 1,
+            "call_id": "c1", "content": "ok",
+        }
+
+        started = time.monotonic()
+        future = controller.on_event(message)
+        assert time.monotonic() - started < 1.0
+        assert not future.done()
+
+        release.set()
+        future.result(timeout=5)
+
+        broker.publish.assert_called_with(context.client_topic, {
+            "type": "WAIT_FOR_USER_INPUT", "session_id": "s1", "sequence": 2,
+        })
+
+    def test_failed_step_hands_control_back(self, engine, tmp_path):
+        """Test that a step that raises still ends the turn for the client."""
+        agent = MagicMock()
+        agent.session_id = "s1"
+        agent.sequence_counter = 3
+        agent.step.side_effect = RuntimeError("provider exploded")
+        broker = MagicMock()
+        context = TopicContext.default("s1")
+        controller = AgentController(agent, broker, context, working_dir=tmp_path, engine=engine)
+        message = MagicMock()
+        message.payload = {
+            "type": "ToolResultObservation", "session_id": "s1", "sequence": 1,
+            "call_id": "c1", "content": "ok",
+        }
+
+        controller.on_event(message).result(timeout=5)
+
+        published = [call.args[1] for call in broker.publish.call_args_list]
+        assert published[-2]["type"] == "Error"
+        assert "provider exploded" in published[-2]["content"]
+        assert published[-1] == {"type": "WAIT_FOR_USER_INPUT", "session_id": "s1", "sequence": 3}
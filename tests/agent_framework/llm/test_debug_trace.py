@@ -0,0 +1,127 @@
+"""
+Tests for the delta-encoded LLM debug trace.
+"""
+
+import json
+import os
+
+import pytest
+
+from agent_framework.llm.debug_trace import DebugTrace, iter_requests, load_request, main
+from agent_framework.llm.provider import LLMResponse, ToolCallRequest
+
+TOOLS = [{"type": "function", "function": {"name": "read_file", "parameters": {}}}]
+
+
+def response(text="ok"):
+    return LLMResponse(content=text, tool_calls=[ToolCallRequest(id="c1", name="read_file", arguments="{}")])
+
+
+def conversation(steps, system=lambda i: "You are an agent."):
+    """Requests as an agent builds them: a (possibly changing) system prompt plus a growing history."""
+    history = []
+    for i in range(steps):
+        history.append({"role": "user" if i % 2 else "assistant", "content": f"message {i} " + "x" * 200})
+        yield i, [{"role": "system", "content": system(i)}] + [dict(m) for m in history]
+
+
+class TestDebugTrace:
+    """Tests for DebugTrace and the reader."""
+
+    def test_every_step_reconstructs_exactly(self, tmp_path):
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path))
+        sent = {}
+        for step, messages in conversation(30, system=lambda i: f"Step {i // 10}"):
+            sent[step] = messages
+            trace.record("s1", step, messages, TOOLS, response(f"reply {step}"))
+
+        requests = list(iter_requests(str(path)))
+
+        assert [r.step for r in requests] == list(range(30))
+        for request in requests:
+            assert request.messages == sent[request.step]
+            assert request.tools == TOOLS
+        assert requests[7].response["content"] == "reply 7"
+        assert requests[7].response["tool_calls"][0]["name"] == "read_file"
+
+    def test_log_grows_linearly(self, tmp_path):
+        """Test that each step writes its new messages, not the whole history."""
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path))
+        for step, messages in conversation(200):
+            trace.record("s1", step, messages, TOOLS, response())
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        last = json.loads(lines[-1])
+
+        assert last["count"] == 201
+        assert [m for m in last["messages"] if "message" in m] == [
+            {"hash": last["messages"][-1]["hash"], "tokens": last["messages"][-1]["tokens"],
+             "message": {"role": "user", "content": "message 199 " + "x" * 200}}
+        ]
+        assert "tool_schema" not in last
+        assert len(lines[-1]) < 1000
+
+    def test_inserted_message_copies_around_it(self, tmp_path):
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path))
+        first = [{"role": "system", "content": "sys"}, {"role": "user", "content": "a"}, {"role": "user", "content": "b"}]
+        second = first[:1] + [{"role": "user", "content": "context"}] + first[1:]
+        trace.record("s1", 0, first, TOOLS, response())
+        trace.record("s1", 1, second, TOOLS, response())
+
+        entry = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+
+        assert [item.get("copy") for item in entry["messages"]] == [[0, 1], None, [1, 2]]
+        assert load_request(str(path), 1).messages == second
+
+    def test_sessions_sharing_a_file_are_separate(self, tmp_path):
+        path = tmp_path / "agent.log"
+        a, b = DebugTrace(str(path)), DebugTrace(str(path))
+        a.record("a", 0, [{"role": "user", "content": "from a"}], TOOLS, response())
+        b.record("b", 0, [{"role": "user", "content": "from b"}], TOOLS, response())
+        a.record("a", 1, [{"role": "user", "content": "from a"}, {"role": "user", "content": "again"}], TOOLS, response())
+
+        assert load_request(str(path), 1, session_id="a").messages[0]["content"] == "from a"
+        assert load_request(str(path), 0, session_id="b").messages[0]["content"] == "from b"
+        assert load_request(str(path), 5) is None
+
+    def test_rotation_compresses_and_keeps_segments_readable(self, tmp_path):
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path), max_bytes=4000, keep_segments=2)
+        sent = {}
+        for step, messages in conversation(40):
+            sent[step] = messages
+            trace.record("s1", step, messages, TOOLS, response())
+
+        rotated = sorted(name for name in os.listdir(tmp_path) if name.endswith(".gz"))
+        assert len(rotated) == 2
+
+        requests = list(iter_requests(str(path)))
+        assert requests[-1].step == 39
+        for request in requests:
+            assert request.messages == sent[request.step]
+
+    def test_corrupted_run_is_reported(self, tmp_path):
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path))
+        for step, messages in conversation(3):
+            trace.record("s1", step, messages, TOOLS, response())
+        lines = path.read_text(encoding="utf-8").splitlines()
+        path.write_text("\n".join([lines[0], lines[2]]) + "\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            list(iter_requests(str(path)))
+
+    def test_command_line_prints_request(self, tmp_path, capsys):
+        path = tmp_path / "agent.log"
+        trace = DebugTrace(str(path))
+        for step, messages in conversation(3):
+            trace.record("s1", step, messages, TOOLS, response())
+
+        main([str(path), "--step", "2"])
+
+        printed = json.loads(capsys.readouterr().out)
+        assert len(printed["messages"]) == 4
+        assert printed["tools"] == TOOLS
@@ -0,0 +1,235 @@
+"""
+Tests for concurrent, rate-limited image generation.
+"""
+
+import asyncio
+import threading
+import time
+from functools import partial
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from agent_framework.llm import image_batch
+from agent_framework.llm.image_batch import (
+    ImageBatchRunner,
+    TokenBucket,
+    get_rate_limiter,
+    is_retryable,
+    reset_rate_limiters,
+    retry_delay,
+)
+from agent_framework.llm.image_provider_base import ImageProvider
+
+
+class SlowProvider(ImageProvider):
+    """Provider whose calls block, recording how many overlap."""
+
+    def __init__(self, delay: float = 0.05, failures: Optional[dict] = None):
+        super().__init__(api_key="test")
+        self.delay = delay
+        self.failures = failures or {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self) -> str:
+        return "slow"
+
+    @property
+    def model_name(self) -> str:
+        return "slow-model"
+
+    def generate_image(self, prompt, ref_images=None, aspect_ratio="1:1", resolution="1K"):
+        with self._lock:
+            self.calls.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            remaining = self.failures.get(prompt, 0)
+            if remaining:
+                self.failures[prompt] = remaining - 1
+        try:
+            time.sleep(self.delay)
+            if remaining:
+                raise Exception("Error: 429 RESOURCE_EXHAUSTED")
+            return Image.new("RGB", (8, 8), color=(int(prompt.split()[-1]), 0, 0))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def validate_connection(self) -> bool:
+        return True
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(headers=headers or {})
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test that the burst is free and later tokens wait for the refill."""
+        bucket = TokenBucket(rate=20.0, burst=2)
+
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() == 0
+        waited = await bucket.acquire()
+
+        assert 0.03 < waited <= 0.05
+
+    @pytest.mark.asyncio
+    async def test_penalize_holds_back_callers(self):
+        """Test that a penalty delays the next token."""
+        bucket = TokenBucket(rate=100.0, burst=5)
+
+        bucket.penalize(0.1)
+
+        assert await bucket.acquire() > 0.1
+
+
+class TestRetryClassification:
+    """Tests for is_retryable and retry_delay."""
+
+    def test_status_codes(self):
+        assert is_retryable(StatusError(429))
+        assert is_retryable(StatusError(503))
+        assert not is_retryable(StatusError(400))
+
+    def test_wrapped_errors(self):
+        """Test that provider-wrapped SDK errors are classified by their cause."""
+        try:
+            try:
+                raise StatusError(429)
+            except StatusError as e:
+                raise Exception("Google API Error: quota") from e
+        except Exception as wrapped:
+            assert is_retryable(wrapped)
+
+        assert is_retryable(Exception("Error: 429 RESOURCE_EXHAUSTED"))
+        assert not is_retryable(ValueError("Invalid aspect ratio"))
+
+    def test_status_in_message_needs_status_context(self):
+        """Test that only numbers presented as status codes count."""
+        assert is_retryable(Exception("Request failed with status 502"))
+        assert is_retryable(Exception("HTTP 500 from upstream"))
+        assert is_retryable(Exception("Error code: 503 - {'error': 'busy'}"))
+        assert not is_retryable(ValueError("512x512 not supported"))
+        assert not is_retryable(ValueError("Prompt exceeds 500 characters"))
+
+    def test_retry_after_header(self):
+        assert retry_delay(StatusError(429, {"retry-after": "7"}), 1, 2.0) == 7.0
+        assert 4.0 <= retry_delay(StatusError(503), 2, 2.0) <= 5.0
+
+
+class TestImageBatchRunner:
+    """Tests for ImageBatchRunner."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_bounded_concurrency(self):
+        """Test that jobs overlap up to the limit and results keep job order."""
+        provider = SlowProvider()
+        runner = ImageBatchRunner(provider, concurrency=3)
+        jobs = [partial(runner.generate, provider.generate_image, prompt=f"panel {i}") for i in range(8)]
+
+        results = await runner.run(jobs)
+
+        assert [image.getpixel((0, 0))[0] for image in results] == list(range(8))
+        assert provider.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self):
+        """Test that blocking provider calls run off the loop."""
+        provider = SlowProvider(delay=0.2)
+        runner = ImageBatchRunner(provider)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await runner.generate(provider.generate_image, prompt="slide 1")
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limited_calls(self):
+        """Test that 429s are retried and other failures are returned in place."""
+        provider = SlowProvider(delay=0, failures={"panel 1": 2, "panel 2": 5})
+        runner = ImageBatchRunner(provider, max_retries=2, base_delay=0.01)
+        jobs = [partial(runner.generate, provider.generate_image, prompt=f"panel {i}") for i in range(3)]
+        finished = []
+
+        results = await runner.run(jobs, on_done=lambda index, result: finished.append(index))
+
+        assert isinstance(results[0], Image.Image)
+        assert isinstance(results[1], Image.Image)
+        assert isinstance(results[2], Exception)
+        assert provider.calls.count("panel 1") == 3
+        assert provider.calls.count("panel 2") == 3
+        assert sorted(finished) == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raised_once(self):
+        provider = MagicMock(provider_name="mock", model_name="m", requests_per_minute=None)
+        fn = MagicMock(side_effect=ValueError("bad prompt"))
+        runner = ImageBatchRunner(provider, max_retries=3, base_delay=0.01)
+
+        with pytest.raises(ValueError):
+            await runner.generate(fn, prompt="x")
+        assert fn.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_generate_images_batch_uses_runner(self):
+        """Test that the provider batch API is concurrent, ordered and skips failures."""
+        provider = SlowProvider(failures={"image 2": 99})
+
+        with patch.object(image_batch, "DEFAULT_MAX_RETRIES", 0):
+            images = await provider.generate_images_batch(
+                [f"image {i}" for i in range(5)], concurrency=5
+            )
+
+        assert [image.getpixel((0, 0))[0] for image in images] == [0, 1, 3, 4]
+        assert provider.max_in_flight > 1
+
+
+class TestRateLimiterRegistry:
+    """Tests for get_rate_limiter."""
+
+    def test_shared_per_provider_and_model(self):
+        provider = SlowProvider()
+        provider.requests_per_minute = 30
+
+        limiter = get_rate_limiter(provider)
+
+        assert limiter is get_rate_limiter(SlowProvider())
+        assert limiter.rate == 0.5
+
+    def test_unlimited_without_quota(self):
+        assert get_rate_limiter(SlowProvider()) is None
+
+    def test_environment_overrides_provider(self):
+        provider = SlowProvider()
+        provider.requests_per_minute = 30
+
+        with patch.dict("os.environ", {"ARCHIFLOW_IMAGE_RPM": "120"}):
+            assert get_rate_limiter(provider).rate == 2.0
@@ -0,0 +1,241 @@
+"""
+Tests for the generated-image cache and the reference-image cache.
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from agent_framework.llm.image_cache import (
+    ImageCache,
+    ReferenceImageCache,
+    cache_key,
+    get_image_cache,
+    image_digest,
+)
+from agent_framework.llm.image_provider_base import ImageProvider
+from agent_framework.llm.openai_image_provider import OpenAIImageProvider
+from agent_framework.tools.comic import generate_comic_panel_tool
+from agent_framework.tools.comic.generate_comic_panel_tool import GenerateComicPanelTool
+from agent_framework.tools.ppt import generate_image_tool
+from agent_framework.tools.ppt.generate_image_tool import GenerateImageTool
+from agent_framework.runtime.context import ExecutionContext
+
+
+class CountingProvider(ImageProvider):
+    """Provider that counts calls and returns a new colour each time."""
+
+    def __init__(self):
+        super().__init__("test")
+        self.calls = 0
+
+    @property
+    def provider_name(self):
+        return "counting"
+
+    @property
+    def model_name(self):
+        return "counting-model"
+
+    def generate_image(self, prompt, ref_images=None, **kwargs):
+        self.calls += 1
+        return Image.new("RGB", (32, 24), color=(self.calls, 0, 0))
+
+    def validate_connection(self):
+        return True
+
+
+def noise(size=(64, 64)) -> Image.Image:
+    """An image that does not compress to nothing."""
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_every_input_changes_the_key(self):
+        provider = CountingProvider()
+        base = cache_key(provider, "a cat", ["r1"], "4:3", "2K")
+
+        assert cache_key(provider, "a cat", ["r1"], "4:3", "2K") == base
+        assert cache_key(provider, "a dog", ["r1"], "4:3", "2K") != base
+        assert cache_key(provider, "a cat", ["r2"], "4:3", "2K") != base
+        assert cache_key(provider, "a cat", ["r1"], "16:9", "2K") != base
+        assert cache_key(provider, "a cat", ["r1"], "4:3", "1K") != base
+        assert cache_key(provider, "a cat", ["r1"], "4:3", "2K", method="first_slide") != base
+
+    def test_digest_ignores_file_format(self, tmp_path):
+        image = noise()
+        image.save(tmp_path / "ref.png")
+
+        with Image.open(tmp_path / "ref.png") as reloaded:
+            assert image_digest(reloaded) == image_digest(image)
+
+
+class TestImageCache:
+    """Tests for ImageCache."""
+
+    def test_round_trip_and_stats(self, tmp_path):
+        cache = ImageCache(tmp_path)
+        image = noise()
+
+        assert cache.get("k1") is None
+        cache.put("k1", image)
+
+        assert "k1" in cache
+        assert image_digest(cache.get("k1")) == image_digest(image)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = ImageCache(tmp_path)
+        cache.put("probe", noise())
+        entry_size = cache.total_bytes
+        cache.clear()
+
+        cache = ImageCache(tmp_path, max_bytes=int(entry_size * 2.5))
+        cache.put("a", noise())
+        cache.put("b", noise())
+        cache.get("a")
+        cache.put("c", noise())
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert sorted(os.listdir(tmp_path)) == sorted(f"{key}.png" for key in ("a", "c"))
+
+    def test_index_survives_restart(self, tmp_path):
+        ImageCache(tmp_path).put("k1", noise())
+
+        reopened = ImageCache(tmp_path)
+
+        assert len(reopened) == 1
+        assert reopened.get("k1") is not None
+
+    def test_disabled_by_environment(self):
+        with patch.dict("os.environ", {"ARCHIFLOW_IMAGE_CACHE": "off"}):
+            assert get_image_cache() is None
+
+
+class TestReferenceImageCache:
+    """Tests for ReferenceImageCache."""
+
+    def test_index_follows_directory_changes(self, tmp_path):
+        references = ReferenceImageCache(tmp_path)
+        assert references.find("ARIA.png") is None
+
+        noise().save(tmp_path / "ARIA.png")
+
+        assert references.find("ARIA.png") == str(tmp_path / "ARIA.png")
+
+    def test_load_decodes_once_and_downscales(self, tmp_path):
+        path = str(tmp_path / "ARIA.png")
+        noise((400, 200)).save(path)
+        references = ReferenceImageCache(tmp_path, max_side=100)
+
+        first = references.load(path)
+        with patch.object(Image, "open") as image_open:
+            second = references.load(path)
+
+        image_open.assert_not_called()
+        assert second is first
+        assert first.image.size == (100, 50)
+
+    def test_changed_file_is_reloaded(self, tmp_path):
+        path = str(tmp_path / "ARIA.png")
+        Image.new("RGB", (10, 10), "red").save(path)
+        references = ReferenceImageCache(tmp_path)
+        first = references.load(path)
+
+        Image.new("RGB", (12, 10), "blue").save(path)
+
+        second = references.load(path)
+        assert second.digest != first.digest
+        assert second.image.size == (12, 10)
+
+
+class TestPanelToolCaching:
+    """Tests for cache use in GenerateComicPanelTool."""
+
+    @pytest.fixture
+    def tool(self, tmp_path):
+        tool = GenerateComicPanelTool(image_provider=CountingProvider())
+        tool.execution_context = ExecutionContext(session_id="s1", working_directory=str(tmp_path / "work"))
+        cache = ImageCache(tmp_path / "cache")
+        with patch.object(generate_comic_panel_tool, "get_image_cache", return_value=cache):
+            yield tool
+
+    async def run(self, tool, **overrides):
+        arguments = dict(prompt="Hero leaps", panel_type="action", session_id="s1",
+                         page_number=1, panel_number=1, character_names=["HERO"])
+        arguments.update(overrides)
+        result = await tool.execute(**arguments)
+        assert result.error is None
+        return json.loads(result.output)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_panel_served_from_cache(self, tool):
+        """Test that re-running a panel reuses the image and regenerate bypasses it."""
+        first = await self.run(tool)
+        second = await self.run(tool)
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert tool.image_provider.calls == 1
+
+        third = await self.run(tool, regenerate=True)
+        assert third["cached"] is False
+        assert tool.image_provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_reference_invalidates_panel(self, tool, tmp_path):
+        """Test that editing a character reference regenerates panels that use it."""
+        ref_dir = tmp_path / "work" / "character_refs"
+        ref_dir.mkdir(parents=True)
+        Image.new("RGB", (10, 10), "red").save(ref_dir / "HERO.png")
+
+        await self.run(tool)
+        await self.run(tool)
+        assert tool.image_provider.calls == 1
+
+        Image.new("RGB", (10, 10), "green").save(ref_dir / "HERO.png")
+        tool.clear_references()
+        result = await self.run(tool)
+
+        assert result["cached"] is False
+        assert tool.image_provider.calls == 2
+
+
+class TestSlideToolCaching:
+    """Tests for cache use in GenerateImageTool."""
+
+    @staticmethod
+    def provider():
+        provider = OpenAIImageProvider(api_key="test")
+        provider.generate_image = lambda prompt, ref_images=None, **kwargs: Image.new("RGB", (32, 18))
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_cached_first_slide_restores_reference_style(self, tmp_path):
+        """Test that a first slide from the cache keeps the style for later slides."""
+        cache = ImageCache(tmp_path / "cache")
+        with patch.object(generate_image_tool, "get_image_cache", return_value=cache):
+            await GenerateImageTool(image_provider=self.provider()).execute(
+                prompt="Title", slide_number=1, session_id="s1", output_dir=str(tmp_path / "a"))
+
+            provider = self.provider()
+            tool = GenerateImageTool(image_provider=provider)
+            result = await tool.execute(prompt="Title", slide_number=1, session_id="s1",
+                                        output_dir=str(tmp_path / "b"))
+            assert result.error is None
+            assert cache.stats()["hits"] == 1
+
+            provider.generate_first_slide = None  # Slide 2 must not start over
+            result = await tool.execute(prompt="Details", slide_number=2, session_id="s1",
+                                        output_dir=str(tmp_path / "b"))
+
+        assert result.error is None
+        assert provider.reference_image is not None
+        assert provider.reference_description
@@ -173,6 +173,61 @@ class TestUsageTracker(unittest.TestCase):
         except Exception as e:
             self.fail(f"print_summary raised {e}")
 
+    def test_records_are_bounded(self):
+        """Test that only the newest raw records are kept but totals cover all calls."""
+        tracker = UsageTracker(max_records=3)
+        for i in range(10):
+            tracker.record(self.model_config, 100 + i, 10)
+
+        self.assertEqual(len(tracker.records), 3)
+        self.assertEqual(tracker.records[0].input_tokens, 107)
+        summary = tracker.get_summary()
+        self.assertEqual(summary["total_calls"], 10)
+        self.assertEqual(summary["total_input_tokens"], sum(100 + i for i in range(10)))
+
+    def test_session_summary_by_model(self):
+        """Test that session summaries break totals down by model."""
+        other = ModelConfig(
+            model_name="other-model",
+            context_window=8192,
+            max_output_tokens=1024,
+            cost_per_1k_input=0.001,
+            cost_per_1k_output=0.002,
+        )
+        self.tracker.record(self.model_config, 1000, 500, session_id="s1")
+        self.tracker.record(other, 200, 100, session_id="s1")
+        self.tracker.record(other, 300, 100, session_id="s2")
+
+        summary = self.tracker.get_session_summary("s1")
+
+        self.assertEqual(summary["total_calls"], 2)
+        self.assertEqual(summary["total_tokens"], 1800)
+        self.assertEqual(summary["by_model"]["other-model"]["input_tokens"], 200)
+
+        self.tracker.forget_session("s1")
+        self.assertEqual(self.tracker.get_session_summary("s1")["total_calls"], 0)
+        self.assertEqual(self.tracker.get_summary()["total_calls"], 3)
+
+    def test_rollups_drain_and_restore(self):
+        """Test collecting, draining and restoring time-bucketed rollups."""
+        self.assertEqual(self.tracker.drain_rollups(), {})
+
+        tracker = UsageTracker(bucket_seconds=3600, collect_rollups=True)
+        tracker.record(self.model_config, 1000, 500, session_id="s1")
+        tracker.record(self.model_config, 1000, 500, session_id="s1")
+
+        rollups = tracker.drain_rollups()
+        self.assertEqual(len(rollups), 1)
+        (bucket, session_id, model), agg = next(iter(rollups.items()))
+        self.assertEqual(bucket % 3600, 0)
+        self.assertEqual((session_id, model), ("s1", "test-model"))
+        self.assertEqual((agg.calls, agg.total_tokens), (2, 3000))
+        self.assertEqual(tracker.drain_rollups(), {})
+
+        tracker.restore_rollups(rollups)
+        tracker.restore_rollups(rollups)
+        self.assertEqual(next(iter(tracker.drain_rollups().values())).calls, 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,213 @@
+"""
+Tests for durable agent sessions (SessionLog, SessionStore and resuming through the factory).
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agent_cli.agents import agent_factory_impl
+from agent_cli.agents.agent_factory_impl import AgentFactory
+from agent_cli.agents.exceptions import AgentFactoryError
+from agent_framework.llm.mock import MockProvider
+from agent_framework.memory import session_log
+from agent_framework.memory.history import HistoryManager
+from agent_framework.memory.session_log import (
+    RECORD_APPEND,
+    SessionLog,
+    SessionStore,
+    attach_session_log,
+)
+from agent_framework.memory.summarizer import SimpleSummarizer
+from agent_framework.messages.types import (
+    ToolCall,
+    ToolCallMessage,
+    ToolResultObservation,
+    UserMessage,
+)
+
+
+def user(text: str, sequence: int) -> UserMessage:
+    return UserMessage(session_id="s1", sequence=sequence, content=text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / "sessions")
+    with patch.object(agent_factory_impl, "get_session_store", return_value=store):
+        yield store
+
+
+@pytest.fixture
+def factory():
+    return AgentFactory()
+
+
+def create(factory, session_id="s1"):
+    return factory.create_agent("simple", session_id=session_id, llm_provider=MockProvider())
+
+
+class TestSessionLog:
+    """Tests for SessionLog records and snapshots."""
+
+    def test_records_replay_after_snapshot(self, tmp_path):
+        log = SessionLog(tmp_path, snapshot_every=1000)
+        log.snapshot({"messages": [user("hello", 0)], "sequence_counter": 1})
+        log.append(user("one", 1))
+        log.append(user("two", 2))
+
+        state = SessionLog(tmp_path).load()
+
+        assert [m.content for m in state.messages] == ["hello"]
+        assert [(kind, message.content) for kind, _, message in state.tail] == [
+            (RECORD_APPEND, "one"), (RECORD_APPEND, "two")
+        ]
+
+    def test_snapshot_drops_covered_segments(self, tmp_path):
+        """Test that loading only reads the latest snapshot and the records after it."""
+        messages = []
+        log = SessionLog(tmp_path, snapshot_every=5)
+        log.capture = lambda: {"messages": list(messages)}
+        for i in range(12):
+            messages.append(user(f"m{i}", i))
+            log.append(messages[-1])
+
+        state = SessionLog(tmp_path).load()
+
+        assert len(state.messages) == 10
+        assert [message.content for _, _, message in state.tail] == ["m10", "m11"]
+        assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".log")) == ["0002.log"]
+
+    def test_torn_record_is_dropped_and_overwritten(self, tmp_path):
+        """Test that a record cut short by a crash ends the replay and is replaced by the next write."""
+        log = SessionLog(tmp_path)
+        log.append(user("kept", 0))
+        log.append(user("torn", 1))
+        log.close()
+        segment = tmp_path / "0000.log"
+        segment.write_bytes(segment.read_bytes()[:-5])
+
+        reopened = SessionLog(tmp_path)
+        assert [m.content for _, _, m in reopened.load().tail] == ["kept"]
+        reopened.append(user("next", 2))
+
+        assert [m.content for _, _, m in SessionLog(tmp_path).load().tail] == ["kept", "next"]
+
+    def test_unreadable_record_is_skipped(self, tmp_path):
+        """Test that a whole record whose message cannot be decoded is skipped, not fatal."""
+        log = SessionLog(tmp_path)
+        log.append(user("before", 0))
+        log._write(RECORD_APPEND, {"message": {"type": "no_such_type"}})
+        log.append(user("after", 2))
+        log.close()
+
+        assert [m.content for _, _, m in SessionLog(tmp_path).load().tail] == ["before", "after"]
+
+
+class TestHistoryJournal:
+    """Tests for the HistoryManager journal hooks."""
+
+    def test_compaction_snapshots_summary(self, tmp_path):
+        history = HistoryManager(summarizer=SimpleSummarizer(), max_tokens=100000, retention_window=2)
+        log = SessionLog(tmp_path)
+        log.capture = lambda: {"messages": history.get_messages()}
+        history.journal = log
+        for i in range(8):
+            history.add(user(f"message {i}", i))
+
+        history.compact()
+
+        state = SessionLog(tmp_path).load()
+        assert [m.content for m in state.messages] == [m.content for m in history.get_messages()]
+        assert state.tail == []
+
+
+class TestResume:
+    """Tests for saving and resuming agents through the factory."""
+
+    def test_agent_resumes_history_tracker_and_sequence(self, store, factory):
+        agent = create(factory)
+        agent._update_memory(user("fix the bug", agent._next_sequence()))
+        agent._update_memory(ToolCallMessage(
+            session_id="s1", sequence=agent._next_sequence(),
+            tool_calls=[ToolCall(id="c1", tool_name="read_file", arguments={"path": "app.py"})],
+        ))
+        agent._update_memory(ToolResultObservation(
+            session_id="s1", sequence=agent._next_sequence(), call_id="c1", content="print()"
+        ))
+        agent.session_log.close()
+
+        resumed = create(factory)
+
+        assert [m.type for m in resumed.history.get_messages()] == [
+            m.type for m in agent.history.get_messages()
+        ]
+        assert resumed.history.get_messages()[1].content == "fix the bug"
+        assert resumed.tracker.recent_files == {"app.py"}
+        assert resumed.sequence_counter == agent.sequence_counter
+
+    def test_resume_costs_snapshot_plus_tail(self, store, factory):
+        """Test that resuming decodes the snapshot and only the records after it."""
+        with patch.dict(os.environ, {"ARCHIFLOW_SESSION_SNAPSHOT_EVERY": "10"}):
+            agent = create(factory)
+            for i in range(25):
+                agent._update_memory(user(f"step {i}", agent._next_sequence()))
+        agent.session_log.close()
+
+        with patch.object(session_log, "deserialize_message", wraps=session_log.deserialize_message) as decode:
+            resumed = create(factory)
+
+        assert len(resumed.history.get_messages()) == 26
+        # 21 messages in the last snapshot + 5 records after it
+        assert decode.call_count == 26
+
+    def test_resume_agent_uses_saved_type_and_options(self, store, factory, tmp_path):
+        agent = factory.create_agent(
+            "simplev2", session_id="s2", llm_provider=MockProvider(),
+            profile="analyst", google_api_key="secret",
+        )
+        agent._update_memory(user("analyse this", agent._next_sequence()))
+
+        metadata = store.open("s2").metadata()
+        assert metadata["agent_type"] == "simplev2"
+        assert metadata["options"] == {"profile": "analyst"}
+
+        resumed = factory.resume_agent("s2", llm_provider=MockProvider())
+        assert type(resumed) is type(agent)
+        assert resumed.history.get_messages()[-1].content == "analyse this"
+
+        with pytest.raises(AgentFactoryError):
+            factory.resume_agent("missing", llm_provider=MockProvider())
+
+    def test_attach_new_session_saves_constructor_messages(self, tmp_path, factory):
+        agent = factory.create_agent("simple", session_id="s3", llm_provider=MockProvider(), persist=False)
+
+        assert attach_session_log(agent, SessionLog(tmp_path)) is False
+        assert len(SessionLog(tmp_path).load().messages) == 1
+
+    def test_generated_session_ids_never_resume(self, store, factory):
+        """Test that agents created without a session ID get distinct, fresh sessions."""
+        first = factory.create_agent("simple", llm_provider=MockProvider())
+        first._update_memory(user("first agent", first._next_sequence()))
+
+        second = factory.create_agent("simple", llm_provider=MockProvider())
+
+        assert second.session_id != first.session_id
+        assert len(second.history.get_messages()) == 1
+        assert len(store.list_sessions()) == 2
+
+    def test_prune_removes_stale_sessions(self, store, factory):
+        create(factory, "old")
+        create(factory, "new")
+        stale = time.time() - 40 * 86400
+        for path in (store.root / "old").iterdir():
+            os.utime(path, (stale, stale))
+
+        assert store.prune(30) == 1
+        assert [session["session_id"] for session in store.list_sessions()] == ["new"]
+
+    def test_invalid_session_id_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            SessionStore(tmp_path).open("../escape")
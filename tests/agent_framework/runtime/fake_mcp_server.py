@@ -0,0 +1,101 @@
+"""
+Minimal MCP server over stdio for tests and benchmarks.
+
+Speaks newline-delimited JSON-RPC 2.0 and handles each tools/call on its
+own thread so concurrent requests overlap. Tools:
+
+- echo(text): returns the text
+- sleep(seconds): sleeps, then returns "slept"
+- fail(): returns an isError result
+- add_tool(name): adds an echo-like tool and sends tools/list_changed
+- crash(): exits the process without responding
+
+Run: python fake_mcp_server.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+_write_lock = threading.Lock()
+_tools = {
+    "echo": {"name": "echo", "description": "Echo text", "inputSchema": {
+        "type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}},
+    "sleep": {"name": "sleep", "description": "Sleep", "inputSchema": {
+        "type": "object", "properties": {"seconds": {"type": "number"}}}},
+    "fail": {"name": "fail", "description": "Always fails", "inputSchema": {"type": "object"}},
+    "add_tool": {"name": "add_tool", "description": "Add a tool", "inputSchema": {
+        "type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}},
+    "crash": {"name": "crash", "description": "Exit the server", "inputSchema": {"type": "object"}},
+}
+
+
+def _send(message):
+    data = json.dumps(message) + "\n"
+    with _write_lock:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+
+def _text(text, is_error=False):
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
+def _call_tool(request_id, name, arguments):
+    if name == "echo" or (name in _tools and name not in ("sleep", "fail", "add_tool", "crash")):
+        result = _text(str(arguments.get("text", "")))
+    elif name == "sleep":
+        time.sleep(float(arguments.get("seconds", 0)))
+        result = _text("slept")
+    elif name == "fail":
+        result = _text("tool failed", is_error=True)
+    elif name == "add_tool":
+        _tools[arguments["name"]] = {
+            "name": arguments["name"], "description": "Added tool", "inputSchema": {"type": "object"}}
+        _send({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+        result = _text("added")
+    elif name == "crash":
+        os._exit(1)
+    else:
+        _send({"jsonrpc": "2.0", "id": request_id,
+               "error": {"code": -32602, "message": f"Unknown tool: {name}"}})
+        return
+    _send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+
+def main():
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        message = json.loads(line)
+        method = message.get("method")
+        request_id = message.get("id")
+
+        if request_id is None:
+            continue  # notifications need no response
+
+        if method == "initialize":
+            _send({"jsonrpc": "2.0", "id": request_id, "result": {
+                "protocolVersion": message["params"]["protocolVersion"],
+                "capabilities": {"tools": {"listChanged": True}},
+                "serverInfo": {"name": "fake-mcp", "version": "1.0", "pid": os.getpid()},
+            }})
+        elif method == "tools/list":
+            _send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": list(_tools.values())}})
+        elif method == "tools/call":
+            params = message.get("params", {})
+            threading.Thread(
+                target=_call_tool,
+                args=(request_id, params.get("name"), params.get("arguments", {})),
+                daemon=True,
+            ).start()
+        else:
+            _send({"jsonrpc": "2.0", "id": request_id,
+                   "error": {"code": -32601, "message": f"Method not found: {method}"}})
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@
 Tests for MCP runtime components.
 """
 
+import asyncio
+import os
+import sys
+import time
+
 import pytest
 
 from agent_framework.runtime.context import ExecutionContext
@@ -17,6 +22,13 @@ from agent_framework.runtime.mcp.server_manager import (
     CallToolResult,
 )
 
+FAKE_SERVER = os.path.join(os.path.dirname(__file__), "fake_mcp_server.py")
+
+
+def _fake_server_config(name: str = "fake") -> MCPServerConfig:
+    """Config that launches the local fake MCP server."""
+    return MCPServerConfig(name=name, command=sys.executable, args=[FAKE_SERVER])
+
 
 class TestMCPServerConfig:
     """Tests for MCPServerConfig."""
@@ -107,20 +119,25 @@ class TestMCPToolAdapter:
             adapter._validate_params({})
     
     @pytest.mark.asyncio
-    async def test_execute(self, mock_session):
-        """Test executing a tool."""
-        adapter = MCPToolAdapter(
-            server_name="test-server",
-            tool_name="test_tool",
-            description="Test tool",
-            input_schema={"type": "object"},
-            session=mock_session
-        )
-        
-        result = await adapter.execute()
-        
-        assert result.success is True
-        assert "Mock result" in result.output
+    async def test_execute(self):
+        """Test executing a tool against a real stdio server."""
+        manager = MCPServerManager()
+        await manager.start_server(_fake_server_config())
+        try:
+            adapter = MCPToolAdapter(
+                server_name="fake",
+                tool_name="echo",
+                description="Echo text",
+                input_schema={"type": "object", "required": ["text"]},
+                session=manager.get_session("fake")
+            )
+            
+            result = await adapter.execute(text="hello")
+            
+            assert result.success is True
+            assert result.output == "hello"
+        finally:
+            await manager.stop_all_servers()
 
 
 class TestMCPToolRegistry:
@@ -280,3 +297,105 @@ class TestMCPRuntime:
         
         assert result.success is False
         assert "not an MCP tool" in result.error
+
+
+@pytest.mark.asyncio
+class TestMCPStdioClient:
+    """Tests for the stdio JSON-RPC client against the fake MCP server."""
+    
+    @pytest.fixture
+    async def runtime(self):
+        """Runtime connected to the fake server."""
+        runtime = MCPRuntime(server_configs=[_fake_server_config()], retry_delay=0.01)
+        await runtime.initialize()
+        yield runtime
+        await runtime.cleanup()
+    
+    async def test_handshake_and_discovery(self, runtime):
+        """Test initialize handshake and tool discovery."""
+        session = runtime.server_manager.get_session("fake")
+        
+        assert session.is_connected
+        assert session.client.server_info["name"] == "fake-mcp"
+        assert runtime.tool_registry.get("fake.echo") is not None
+    
+    async def test_tool_list_cached(self, runtime):
+        """Test that tools/list is not re-requested without a change."""
+        session = runtime.server_manager.get_session("fake")
+        first = await session.list_tools()
+        second = await session.list_tools()
+        
+        assert {t.name for t in first.tools} == {t.name for t in second.tools}
+        assert "echo" in session.tools
+    
+    async def test_error_result(self, runtime):
+        """Test that isError results become failed ToolResults."""
+        tool = runtime.tool_registry.get("fake.fail")
+        result = await runtime.execute(tool, {}, ExecutionContext(session_id="s"))
+        
+        assert result.success is False
+        assert result.error == "tool failed"
+    
+    async def test_concurrent_calls_are_pipelined(self, runtime):
+        """Test that many in-flight calls share one connection concurrently."""
+        tool = runtime.tool_registry.get("fake.sleep")
+        context = ExecutionContext(session_id="s")
+        calls = 20
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            runtime.execute(tool, {"seconds": 0.2}, context) for _ in range(calls)
+        ])
+        elapsed = time.perf_counter() - start
+        
+        assert all(r.success for r in results)
+        # Serial execution would take calls * 0.2s = 4s
+        assert elapsed < 2.0
+    
+    async def test_list_changed_refreshes_registry(self, runtime):
+        """Test that tools/list_changed re-discovers the server's tools."""
+        tool = runtime.tool_registry.get("fake.add_tool")
+        await runtime.execute(tool, {"name": "shout"}, ExecutionContext(session_id="s"))
+        
+        for _ in range(50):
+            if runtime.tool_registry.get("fake.shout") is not None:
+                break
+            await asyncio.sleep(0.05)
+        
+        assert runtime.tool_registry.get("fake.shout") is not None
+    
+    async def test_restart_after_crash(self, runtime):
+        """Test warm reconnection after the server process dies."""
+        session = runtime.server_manager.get_session("fake")
+        old_pid = session.process.pid
+        context = ExecutionContext(session_id="s")
+        
+        crashed = await runtime.execute(runtime.tool_registry.get("fake.crash"), {}, context)
+        assert crashed.success is False
+        # tools/call is not idempotent, so the crashed call is not re-sent
+        assert session.restarts == 0
+        
+        result = await runtime.execute(
+            runtime.tool_registry.get("fake.echo"), {"text": "back"}, context
+        )
+        
+        assert result.success is True
+        assert result.output == "back"
+        assert session.restarts == 1
+        assert session.process.pid != old_pid
+    
+    async def test_timeout_keeps_connection(self, runtime):
+        """Test that a timed-out call does not disturb the connection."""
+        context = ExecutionContext(session_id="s", timeout=1)
+        
+        slow = await runtime.execute(
+            runtime.tool_registry.get("fake.sleep"), {"seconds": 3}, context
+        )
+        fast = await runtime.execute(
+            runtime.tool_registry.get("fake.echo"), {"text": "ok"}, context
+        )
+        
+        assert slow.success is False
+        assert "timed out" in slow.error
+        assert fast.success is True
+        assert runtime.server_manager.get_session("fake").restarts == 0
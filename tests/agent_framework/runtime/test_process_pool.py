@@ -0,0 +1,299 @@
+"""
+Tests for ProcessPoolRuntime.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+from agent_framework.runtime.context import OUTPUT_CALLBACK_KEY, ExecutionContext
+from agent_framework.runtime.exceptions import (
+    ResourceLimitError,
+    TimeoutError as RuntimeTimeoutError,
+)
+from agent_framework.runtime.manager import RuntimeManager
+from agent_framework.runtime.process_pool import (
+    ProcessPoolConfig,
+    ProcessPoolRuntime,
+    SharedPayload,
+)
+from agent_framework.runtime.security import SecurityPolicy
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="rlimits are POSIX-only")
+
+
+# Tools must be importable by the worker process, so they live at module level
+
+class PidTool:
+    """Returns the PID of the process running it."""
+    name = "pid_tool"
+
+    def execute(self):
+        return os.getpid()
+
+
+class AsyncEchoTool:
+    """Async tool echoing its input."""
+    name = "async_echo"
+
+    async def execute(self, text: str):
+        await asyncio.sleep(0)
+        return f"echo: {text}"
+
+
+class BytesTool:
+    """Returns a bytes payload of the requested size."""
+    name = "bytes_tool"
+
+    def execute(self, size: int):
+        return bytes(range(256)) * (size // 256)
+
+
+class SleepTool:
+    """Blocks for a while."""
+    name = "sleep_tool"
+
+    def execute(self, seconds: float):
+        import time
+        time.sleep(seconds)
+        return "done"
+
+
+class MemoryHogTool:
+    """Allocates memory."""
+    name = "memory_hog"
+
+    def execute(self, size_mb: int):
+        data = bytearray(size_mb * 1024 * 1024)
+        return len(data)
+
+
+class BusyTool:
+    """Burns CPU."""
+    name = "busy_tool"
+
+    def execute(self):
+        while True:
+            pass
+
+
+class FailingTool:
+    """Always raises."""
+    name = "failing_tool"
+
+    def execute(self):
+        raise ValueError("boom")
+
+
+class ProgressTool:
+    """Reports progress from a thread before returning."""
+    name = "progress_tool"
+    execution_context = None
+
+    async def execute(self, steps: int):
+        from agent_framework.runtime.context import OUTPUT_CALLBACK_KEY
+
+        callback = self.execution_context.metadata[OUTPUT_CALLBACK_KEY]
+        await asyncio.to_thread(lambda: [callback(f"step {i}") for i in range(steps)])
+        return "done"
+
+
+class UnpicklableTool:
+    """Holds a lock, which cannot be pickled."""
+    name = "unpicklable"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def execute(self):
+        return "never"
+
+
+@pytest.fixture
+async def runtime():
+    """Process pool runtime with one warm worker."""
+    runtime = ProcessPoolRuntime(ProcessPoolConfig(
+        max_workers=2, warm_workers=1, shared_memory_threshold=64 * 1024,
+    ))
+    await runtime.start()
+    yield runtime
+    await runtime.cleanup()
+
+
+@pytest.fixture
+def context():
+    return ExecutionContext(session_id="test", timeout=10)
+
+
+@pytest.mark.asyncio
+class TestProcessPoolRuntime:
+    """Tests for ProcessPoolRuntime."""
+
+    async def test_runs_in_warm_worker(self, runtime, context):
+        """Test that calls run in a reused worker process."""
+        first = await runtime.execute(PidTool(), {}, context)
+        second = await runtime.execute(PidTool(), {}, context)
+
+        assert first.success is True
+        assert int(first.output) != os.getpid()
+        assert first.output == second.output
+        assert runtime.get_stats()["workers_started"] == 1
+
+    async def test_async_tool(self, runtime, context):
+        """Test executing a coroutine tool in the worker."""
+        result = await runtime.execute(AsyncEchoTool(), {"text": "hi"}, context)
+
+        assert result.success is True
+        assert result.output == "echo: hi"
+        assert result.metadata["runtime"] == "process_pool"
+
+    async def test_large_bytes_via_shared_memory(self, runtime, context):
+        """Test that large bytes results come back as a SharedPayload."""
+        size = 256 * 1024
+        result = await runtime.execute(BytesTool(), {"size": size}, context)
+
+        payload = result.metadata["payload"]
+        assert isinstance(payload, SharedPayload)
+        assert len(payload) == size
+        assert "shared memory" in result.output
+        with payload:
+            view = payload.view()
+            assert view[:256].tobytes() == bytes(range(256))
+            view.release()
+        with pytest.raises(ValueError):
+            payload.view()
+
+    async def test_small_bytes_inline(self, runtime, context):
+        """Test that small bytes results are returned through the pipe."""
+        result = await runtime.execute(BytesTool(), {"size": 512}, context)
+
+        assert result.metadata["payload"] == bytes(range(256)) * 2
+
+    async def test_progress_forwarded(self, runtime):
+        """Test that progress reported in the worker reaches the caller's callback."""
+        received = []
+        context = ExecutionContext(
+            session_id="test", timeout=10,
+            metadata={OUTPUT_CALLBACK_KEY: received.append},
+        )
+        tool = ProgressTool()
+        # A callback left on the tool by an earlier local call must not break pickling
+        tool.execution_context = context
+
+        result = await runtime.execute(tool, {"steps": 3}, context)
+
+        assert result.success is True
+        assert result.output == "done"
+        assert received == ["step 0", "step 1", "step 2"]
+
+    async def test_tool_error(self, runtime, context):
+        """Test that tool exceptions become error results."""
+        result = await runtime.execute(FailingTool(), {}, context)
+
+        assert result.success is False
+        assert "boom" in result.error
+        assert result.metadata["exception_type"] == "ValueError"
+
+    async def test_unpicklable_tool(self, runtime, context):
+        """Test that tools that cannot be sent to a worker fail cleanly."""
+        result = await runtime.execute(UnpicklableTool(), {}, context)
+
+        assert result.success is False
+        assert "cannot be sent" in result.error
+
+    async def test_timeout_replaces_worker(self, runtime):
+        """Test that a timed-out worker is killed and replaced."""
+        # Worker start-up is slow under load; only the sleeping call is timed
+        context = ExecutionContext(session_id="test", timeout=30)
+        before = await runtime.execute(PidTool(), {}, context)
+
+        with pytest.raises(RuntimeTimeoutError):
+            await runtime.execute(SleepTool(), {"seconds": 30}, ExecutionContext(session_id="test", timeout=2))
+
+        after = await runtime.execute(PidTool(), {}, context)
+        assert after.success is True
+        assert after.output != before.output
+
+    @posix_only
+    async def test_memory_limit(self, runtime):
+        """Test that RLIMIT_AS stops a call allocating past its budget."""
+        context = ExecutionContext(session_id="test", timeout=10, max_memory_mb=64)
+
+        with pytest.raises(ResourceLimitError) as exc_info:
+            await runtime.execute(MemoryHogTool(), {"size_mb": 512}, context)
+        assert exc_info.value.resource_type == "memory"
+
+        # Limits are per call: the next call gets a fresh budget
+        ok = await runtime.execute(MemoryHogTool(), {"size_mb": 16}, context)
+        assert ok.success is True
+
+    @posix_only
+    async def test_cpu_limit(self, runtime):
+        """Test that RLIMIT_CPU stops a call burning past its CPU budget."""
+        context = ExecutionContext(session_id="test", timeout=10, max_cpu_percent=10)
+
+        with pytest.raises(ResourceLimitError) as exc_info:
+            await runtime.execute(BusyTool(), {}, context)
+        assert exc_info.value.resource_type == "cpu"
+
+    async def test_concurrent_calls(self, context):
+        """Test that calls run in parallel up to max_workers."""
+        import time
+
+        runtime = ProcessPoolRuntime(ProcessPoolConfig(max_workers=2, warm_workers=2))
+        await runtime.start()
+        calls = lambda: asyncio.gather(*[
+            runtime.execute(SleepTool(), {"seconds": 0.5}, context) for _ in range(2)
+        ])
+        try:
+            await calls()  # first call per worker imports the tool's module
+            start = time.perf_counter()
+            results = await calls()
+            elapsed = time.perf_counter() - start
+        finally:
+            await runtime.cleanup()
+
+        assert all(r.success for r in results)
+        assert elapsed < 0.9
+
+    async def test_worker_recycled_after_max_tasks(self, context):
+        """Test that workers are replaced after max_tasks_per_worker calls."""
+        runtime = ProcessPoolRuntime(ProcessPoolConfig(max_workers=1, max_tasks_per_worker=2))
+        try:
+            pids = [(await runtime.execute(PidTool(), {}, context)).output for _ in range(3)]
+        finally:
+            await runtime.cleanup()
+
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[0]
+        assert runtime.get_stats()["workers_recycled"] == 1
+
+    async def test_routed_by_runtime_manager(self, runtime, context):
+        """Test selecting the pool via SecurityPolicy.tool_runtime_map."""
+        manager = RuntimeManager(SecurityPolicy(tool_runtime_map={"pid_tool": "process_pool"}))
+        manager.register_runtime("process_pool", runtime)
+
+        result = await manager.execute_tool(PidTool(), {}, context)
+
+        assert result.success is True
+        assert manager.last_runtime_used == "process_pool"
+
+    async def test_cleanup(self, context):
+        """Test that cleanup stops workers and rejects new calls."""
+        runtime = ProcessPoolRuntime(ProcessPoolConfig(max_workers=1))
+        await runtime.start()
+        await runtime.cleanup()
+
+        assert await runtime.health_check() is False
+        result = await runtime.execute(PidTool(), {}, context)
+        assert result.success is False
+
+
+def test_invalid_config():
+    with pytest.raises(ValueError):
+        ProcessPoolConfig(max_workers=0)
+    with pytest.raises(ValueError):
+        ProcessPoolConfig(max_workers=1, warm_workers=2)
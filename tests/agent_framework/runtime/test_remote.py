@@ -2,6 +2,9 @@
 Tests for remote execution components.
 """
 
+import asyncio
+import time
+
 import pytest
 
 from agent_framework.runtime.context import ExecutionContext
@@ -11,7 +14,10 @@ from agent_framework.runtime.remote.load_balancing import (
     CapabilityAwareStrategy,
     get_strategy,
 )
+from agent_framework.runtime.remote import protocol
 from agent_framework.runtime.remote.pool_manager import WorkerPoolManager
+from agent_framework.runtime.remote.runtime import RemoteRuntime
+from agent_framework.runtime.remote.server import WorkerServer
 from agent_framework.runtime.remote.worker import WorkerNode, WorkerStatus
 
 
@@ -121,6 +127,13 @@ class TestLoadBalancingStrategies:
         selected = strategy.select_worker(workers)
         assert selected.id == "w2"
     
+    def test_least_loaded_uses_reported_load(self, workers):
+        """Test that load reported by the worker counts toward selection."""
+        workers[1].reported_load = 5
+        
+        selected = LeastLoadedStrategy().select_worker(workers)
+        assert selected.id == "w1"
+    
     def test_capability_aware(self):
         """Test capability-aware strategy."""
         workers = [
@@ -260,6 +273,20 @@ class TestWorkerPoolManager:
         
         assert worker.last_heartbeat > initial_heartbeat
     
+    @pytest.mark.asyncio
+    async def test_update_heartbeat_with_load(self, pool, worker):
+        """Test that heartbeats carry the worker's real load and capacity."""
+        await pool.register_worker(worker)
+        
+        await pool.update_heartbeat("test-worker", reported_load=3, max_concurrent=4)
+        
+        assert worker.reported_load == 3
+        assert worker.max_concurrent == 4
+        assert worker.is_available is True
+        
+        await pool.update_heartbeat("test-worker", reported_load=4)
+        assert worker.is_available is False
+    
     @pytest.mark.asyncio
     async def test_has_available_workers(self, pool, worker):
         """Test checking for available workers."""
@@ -276,3 +303,221 @@ class TestWorkerPoolManager:
         assert 'total_workers' in stats
         assert 'available' in stats
         assert 'offline' in stats
+
+
+# Tools hosted by the in-process worker below
+
+class EchoTool:
+    name = "echo"
+    execution_context = None
+    
+    async def execute(self, text: str = ""):
+        return text
+
+
+class SleepTool:
+    name = "sleep"
+    execution_context = None
+    
+    async def execute(self, seconds: float = 0.1):
+        await asyncio.sleep(seconds)
+        return "slept"
+
+
+class StreamingTool:
+    name = "streaming"
+    execution_context = None
+    
+    async def execute(self, parts: int = 3):
+        emit = self.execution_context.metadata["on_output"]
+        for i in range(parts):
+            emit(f"part {i}\n")
+            await asyncio.sleep(0.01)
+        return "finished"
+
+
+class _ToolRef:
+    """Client-side handle; only the name travels to the worker."""
+    
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.mark.asyncio
+class TestWorkerServer:
+    """Tests for the worker daemon and the multiplexed protocol."""
+    
+    @pytest.fixture
+    async def cluster(self):
+        """One in-process worker and a RemoteRuntime pointed at it."""
+        server = WorkerServer(
+            worker_id="w1",
+            tools={t.name: t for t in (EchoTool(), SleepTool(), StreamingTool())},
+            max_concurrent=16,
+            heartbeat_interval=0.05,
+        )
+        port = await server.start("127.0.0.1", 0)
+        pool = WorkerPoolManager()
+        await pool.register_worker(WorkerNode(id="w1", host="127.0.0.1", port=port))
+        runtime = RemoteRuntime(pool, timeout=10)
+        yield server, pool, runtime
+        await runtime.cleanup()
+        await server.stop()
+    
+    async def test_execute(self, cluster):
+        """Test a round trip over the multiplexed connection."""
+        _, _, runtime = cluster
+        
+        result = await runtime.execute(_ToolRef("echo"), {"text": "hi"}, ExecutionContext(session_id="s"))
+        
+        assert result.success is True
+        assert result.output == "hi"
+        assert result.metadata["worker_id"] == "w1"
+    
+    async def test_concurrent_calls_share_connection(self, cluster):
+        """Test that many calls run concurrently on one connection."""
+        _, _, runtime = cluster
+        context = ExecutionContext(session_id="s")
+        await runtime.connect_workers()  # learn the worker's capacity
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            runtime.execute(_ToolRef("sleep"), {"seconds": 0.3}, context) for _ in range(10)
+        ])
+        elapsed = time.perf_counter() - start
+        
+        assert all(r.success for r in results)
+        assert elapsed < 1.5  # serial would be 3s
+        assert runtime.get_stats()["open_connections"] == 1
+    
+    async def test_large_output_streamed_in_chunks(self, cluster):
+        """Test that outputs larger than one frame are reassembled."""
+        _, _, runtime = cluster
+        text = "x" * (protocol.OUTPUT_CHUNK_SIZE * 2 + 10)
+        
+        result = await runtime.execute(_ToolRef("echo"), {"text": text}, ExecutionContext(session_id="s"))
+        
+        assert result.output == text
+    
+    async def test_live_output(self, cluster):
+        """Test that tool progress output is streamed to the caller."""
+        _, _, runtime = cluster
+        received = []
+        context = ExecutionContext(session_id="s", metadata={"on_output": received.append})
+        
+        result = await runtime.execute(_ToolRef("streaming"), {"parts": 3}, context)
+        
+        assert result.output == "finished"
+        assert received == ["part 0\n", "part 1\n", "part 2\n"]
+    
+    async def test_unknown_tool(self, cluster):
+        """Test that unknown tools return an error result."""
+        _, _, runtime = cluster
+        
+        result = await runtime.execute(_ToolRef("missing"), {}, ExecutionContext(session_id="s"))
+        
+        assert result.success is False
+        assert "not available" in result.error
+    
+    async def test_load_reported_to_pool(self, cluster):
+        """Test that worker load frames update the pool."""
+        server, pool, runtime = cluster
+        worker = pool.workers["w1"]
+        await runtime.connect_workers()
+        
+        calls = asyncio.gather(*[
+            runtime.execute(_ToolRef("sleep"), {"seconds": 0.5}, ExecutionContext(session_id="s"))
+            for _ in range(3)
+        ])
+        await asyncio.sleep(0.3)
+        
+        assert worker.max_concurrent == 16  # from the hello frame
+        assert worker.reported_load == 3
+        await calls
+        await asyncio.sleep(0.1)
+        assert worker.reported_load == 0
+    
+    async def test_http_execute_and_health(self, cluster):
+        """Test the single-request API and the health endpoint."""
+        server, pool, _ = cluster
+        runtime = RemoteRuntime(pool, timeout=10, multiplexed=False)
+        try:
+            result = await runtime.execute(_ToolRef("echo"), {"text": "http"}, ExecutionContext(session_id="s"))
+            session = await runtime._ensure_session()
+            async with session.get(f"{pool.workers['w1'].endpoint}/health") as response:
+                health = await response.json()
+        finally:
+            await runtime.cleanup()
+        
+        assert result.output == "http"
+        assert health["worker_id"] == "w1"
+        assert health["max_concurrent"] == 16
+        assert "echo" in health["tools"]
+    
+    async def test_failover_when_worker_unreachable(self, cluster):
+        """Test that an unreachable worker is marked failed and skipped."""
+        _, pool, runtime = cluster
+        await pool.register_worker(WorkerNode(id="dead", host="127.0.0.1", port=1))
+        pool.workers["w1"].reported_load = 1  # steer least-loaded selection to "dead"
+        
+        result = await runtime.execute(_ToolRef("echo"), {"text": "ok"}, ExecutionContext(session_id="s"))
+        
+        assert result.success is True
+        assert result.metadata["worker_id"] == "w1"
+        assert pool.workers["dead"].status == WorkerStatus.OFFLINE
+
+
+@pytest.mark.asyncio
+class TestWorkerAuth:
+    """Tests for the shared worker token."""
+    
+    @pytest.fixture
+    async def server(self, monkeypatch):
+        """Worker requiring a token."""
+        monkeypatch.delenv(protocol.TOKEN_ENV, raising=False)
+        server = WorkerServer(worker_id="w1", tools={"echo": EchoTool()}, token="secret")
+        port = await server.start("127.0.0.1", 0)
+        yield server, port
+        await server.stop()
+    
+    async def _runtime(self, port, **kwargs):
+        pool = WorkerPoolManager()
+        await pool.register_worker(WorkerNode(id="w1", host="127.0.0.1", port=port))
+        return RemoteRuntime(pool, timeout=10, retry_attempts=1, **kwargs)
+    
+    @pytest.mark.parametrize("multiplexed", [True, False])
+    async def test_token_accepted(self, server, multiplexed):
+        """Test that a client with the token can execute."""
+        _, port = server
+        runtime = await self._runtime(port, token="secret", multiplexed=multiplexed)
+        try:
+            result = await runtime.execute(_ToolRef("echo"), {"text": "hi"}, ExecutionContext(session_id="s"))
+        finally:
+            await runtime.cleanup()
+        
+        assert result.success is True
+        assert result.output == "hi"
+    
+    @pytest.mark.parametrize("multiplexed", [True, False])
+    async def test_missing_token_rejected(self, server, multiplexed):
+        """Test that clients without the right token are refused on every endpoint."""
+        _, port = server
+        runtime = await self._runtime(port, token="wrong", multiplexed=multiplexed)
+        try:
+            result = await runtime.execute(_ToolRef("echo"), {"text": "hi"}, ExecutionContext(session_id="s"))
+            session = await runtime._ensure_session()
+            async with session.get(f"http://127.0.0.1:{port}/health") as response:
+                status = response.status
+        finally:
+            await runtime.cleanup()
+        
+        assert result.success is False
+        assert status == 401
+    
+    async def test_non_loopback_requires_token(self, monkeypatch):
+        """Test that a worker without a token refuses to bind a public address."""
+        monkeypatch.delenv(protocol.TOKEN_ENV, raising=False)
+        server = WorkerServer(worker_id="w1")
+        
+        with pytest.raises(ValueError, match=protocol.TOKEN_ENV):
+            await server.start("0.0.0.0", 0)
@@ -0,0 +1,91 @@
+"""
+Tests for tool result post-processing (spill-to-artifact).
+"""
+
+import pytest
+
+from agent_framework.runtime.result_processor import (
+    ARTIFACT_SUBDIR,
+    ResultPostProcessor,
+    ResultProcessorConfig,
+)
+from agent_framework.tools.read_tool import ReadTool
+
+
+def _processor(**kwargs):
+    config = ResultProcessorConfig(max_result_tokens=100, chars_per_token=1, **kwargs)
+    return ResultPostProcessor(config)
+
+
+class TestResultPostProcessor:
+    """Tests for ResultPostProcessor."""
+
+    def test_small_output_unchanged(self, tmp_path):
+        processor = _processor()
+        content = "short output"
+
+        result = processor.process(content, "bash", "call_1", "s1", str(tmp_path))
+
+        assert result == content
+        assert not (tmp_path / ARTIFACT_SUBDIR).exists()
+
+    def test_none_output_unchanged(self):
+        assert _processor().process(None, "bash", "call_1", "s1") is None
+
+    def test_oversized_output_spilled_to_workspace(self, tmp_path):
+        processor = _processor(head_lines=3, tail_lines=2)
+        content = "\n".join(f"line {i}" for i in range(100))
+
+        result = processor.process(content, "grep", "call_42", "s1", str(tmp_path))
+
+        artifact = tmp_path / ARTIFACT_SUBDIR / "call_42_grep.txt"
+        assert artifact.read_text() == content
+        assert result.startswith("line 0\nline 1\nline 2\n... [95 lines omitted] ...")
+        assert "line 99" in result
+        assert "line 50" not in result
+        # Handle is workspace-relative so it passes sandbox validation
+        assert f"saved to: {ARTIFACT_SUBDIR}/call_42_grep.txt" in result
+        assert "100 lines" in result
+        # Suggested page of ~7-char lines (plus line numbers) fits the 100-char budget
+        assert "offset=1, limit=6)" in result
+
+    def test_spill_without_workspace_uses_artifact_dir(self, tmp_path):
+        processor = _processor(artifact_dir=str(tmp_path))
+        content = "x" * 500
+
+        result = processor.process(content, "bash", "call/1", "session 1", None)
+
+        artifact = tmp_path / "session_1" / "call_1_bash.txt"
+        assert artifact.read_text() == content
+        assert str(artifact) in result
+
+    def test_long_single_line_clamped_to_budget(self, tmp_path):
+        processor = _processor()
+        content = "y" * 10_000
+
+        result = processor.process(content, "web_fetch", "call_1", "s1", str(tmp_path))
+
+        excerpt = result.split("\n\n[Output truncated")[0]
+        assert len(excerpt) < 200
+
+    async def test_read_output_is_not_spilled(self, tmp_path):
+        path = tmp_path / "big.log"
+        path.write_text("".join(f"{i:05d} {'x' * 93}\n" for i in range(1000)))
+        assert path.stat().st_size == 100_000
+        output = (await ReadTool().execute(file_path=str(path))).output
+
+        result = ResultPostProcessor().process(output, "read", "call_1", "s1", str(tmp_path))
+
+        assert result == output
+        assert "00999 " in result
+        assert not (tmp_path / ARTIFACT_SUBDIR).exists()
+
+    def test_disabled(self, tmp_path):
+        processor = _processor(enabled=False)
+        content = "z" * 1000
+
+        assert processor.process(content, "bash", "call_1", "s1", str(tmp_path)) == content
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            ResultProcessorConfig(max_result_tokens=0)
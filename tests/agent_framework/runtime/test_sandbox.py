@@ -432,6 +432,39 @@ class TestSandboxRuntime:
             # working_directory is explicitly excluded
             assert runtime._is_path_param("working_directory") is False
 
+    def test_validate_batch(self):
+        """Test that a batch's paths are checked before execution."""
+        from agent_framework.runtime.messages import BatchToolCallRequest, ToolCallRequest
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runtime = SandboxRuntime(config=SandboxConfig(workspace_path=Path(tmpdir)))
+            calls = [
+                ToolCallRequest("c1", "s1", "read", {"file_path": "a.txt"}, {}),
+                ToolCallRequest("c2", "s1", "read", {"file_path": "../escape.txt"}, {}),
+                ToolCallRequest("c3", "s1", "write", {"file_path": "b.txt", "content": "x"}, {}),
+                ToolCallRequest("c4", "s1", "bash", {"command": "ls"}, {}),
+            ]
+            request = BatchToolCallRequest("b1", "s1", calls, {})
+
+            errors = runtime.validate_batch(request)
+
+            assert list(errors) == ["c2"]
+            assert "escapes workspace" in errors["c2"]
+            assert runtime._path_validator.fast_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_non_file_tool_invalidates_path_cache(self):
+        """Test that running a non-file tool drops cached resolutions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runtime = SandboxRuntime(config=SandboxConfig(workspace_path=Path(tmpdir)))
+            context = ExecutionContext(session_id="s1", timeout=30)
+
+            await runtime.execute(MockTool("read"), {"file_path": "a.txt"}, context)
+            assert runtime._path_validator._safe_dirs
+
+            await runtime.execute(MockTool("bash"), {"command": "ln -s / root"}, context)
+            assert not runtime._path_validator._safe_dirs
+
 
 class TestSessionRuntimeManager:
     """Tests for SessionRuntimeManager."""
@@ -242,6 +242,88 @@ class TestPathValidator:
             assert result.is_absolute()
 
 
+class TestPathValidatorCache:
+    """Tests for the PathValidator resolved-prefix cache."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("print()")
+        return tmp_path
+
+    def test_plain_paths_hit_cache(self, workspace):
+        """Test that siblings of a validated path are checked lexically."""
+        validator = PathValidator(workspace_path=workspace)
+
+        first = validator.validate("src/main.py")
+        second = validator.validate("src/other.py")
+
+        assert first == workspace.resolve() / "src" / "main.py"
+        assert second == workspace.resolve() / "src" / "other.py"
+        assert validator.slow_checks == 1
+        assert validator.fast_hits == 1
+
+    def test_traversal_never_uses_cache(self, workspace):
+        """Test that paths with .. always take the full check."""
+        validator = PathValidator(workspace_path=workspace)
+        validator.validate("src/main.py")
+
+        with pytest.raises(PathValidationError):
+            validator.validate("src/../../outside.txt")
+        assert validator.fast_hits == 0
+
+    def test_directory_with_symlink_not_cached(self, workspace, tmp_path_factory):
+        """Test that a directory containing symlinks keeps full checks."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret.txt").write_text("secret")
+        (workspace / "src" / "leak.txt").symlink_to(outside / "secret.txt")
+        validator = PathValidator(workspace_path=workspace)
+
+        validator.validate("src/main.py")
+        with pytest.raises(PathValidationError):
+            validator.validate("src/leak.txt")
+        assert validator.fast_hits == 0
+
+    def test_invalidate_after_mutation(self, workspace, tmp_path_factory):
+        """Test that invalidation catches symlinks created later."""
+        outside = tmp_path_factory.mktemp("outside")
+        validator = PathValidator(workspace_path=workspace)
+        validator.validate("src/main.py")
+
+        (workspace / "src" / "escape").symlink_to(outside)
+        validator.invalidate("src")
+
+        with pytest.raises(PathValidationError):
+            validator.validate("src/escape")
+
+    def test_invalidate_subtree(self, workspace):
+        """Test that invalidating a directory drops its subdirectories."""
+        (workspace / "src" / "pkg").mkdir()
+        (workspace / "docs").mkdir()
+        validator = PathValidator(workspace_path=workspace)
+        for path in ("src/a.py", "src/pkg/b.py", "docs/c.md"):
+            validator.validate(path)
+
+        validator.invalidate("src")
+        validator.validate("docs/d.md")
+        validator.validate("src/pkg/e.py")
+
+        assert validator.fast_hits == 1
+
+    def test_validate_many(self, workspace):
+        """Test batch validation with duplicates and failures."""
+        validator = PathValidator(workspace_path=workspace)
+
+        results = validator.validate_many(
+            ["src/main.py", "src/b.py", "src/main.py", "../escape.txt", "/etc/passwd"]
+        )
+
+        assert results["src/b.py"] == workspace.resolve() / "src" / "b.py"
+        assert isinstance(results["../escape.txt"], PathValidationError)
+        assert isinstance(results["/etc/passwd"], PathValidationError)
+        assert validator.fast_hits == 1
+
+
 class TestCommandValidator:
     """Tests for CommandValidator."""
 
@@ -0,0 +1,192 @@
+"""
+Tests for incremental workspace usage accounting.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.result import ToolResult
+from agent_framework.runtime.sandbox import SandboxConfig, SandboxMode, SandboxRuntime
+from agent_framework.storage.filesystem import FileSystemQuota
+from agent_framework.storage.ledger import (
+    UsageLedger,
+    UsageReconciler,
+    file_size,
+    forget_usage_ledger,
+    get_usage_ledger,
+    scan_usage,
+)
+
+
+class FileWriteTool:
+    """Write tool that really writes, relative to a workspace."""
+
+    def __init__(self, workspace: Path):
+        self.name = "write"
+        self.workspace = workspace
+
+    async def execute(self, file_path: str, content: str):
+        (self.workspace / file_path).write_text(content)
+        return ToolResult.success_result("written")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Workspace with two files (100 + 50 bytes)."""
+    (tmp_path / "a.txt").write_text("x" * 100)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("y" * 50)
+    yield tmp_path
+    forget_usage_ledger(tmp_path)
+
+
+class TestUsageLedger:
+    """Tests for UsageLedger."""
+
+    def test_first_read_scans_and_persists(self, workspace):
+        """Test that the first read scans and writes the ledger file."""
+        ledger = UsageLedger(workspace)
+
+        assert ledger.is_loaded is False
+        assert ledger.usage == 150
+        data = json.loads(ledger.ledger_path.read_text())
+        assert data["total_bytes"] == 150
+
+        # The ledger file itself is not counted
+        assert ledger.reconcile() == 150
+
+    def test_deltas_survive_restart(self, workspace):
+        """Test that applied deltas are persisted and reloaded."""
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+
+        target = workspace / "c.txt"
+        old = file_size(target)
+        target.write_text("z" * 30)
+        assert ledger.record_file_change(target, old) == 30
+
+        reloaded = UsageLedger(workspace)
+        assert reloaded.is_loaded is True
+        assert reloaded.usage == 180
+
+    def test_reads_do_not_scan(self, workspace):
+        """Test that a loaded ledger answers without looking at the disk."""
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+
+        (workspace / "a.txt").unlink()
+        assert ledger.usage == 150
+
+        assert ledger.reconcile() == 50
+        assert ledger.usage == 50
+
+    def test_delta_never_goes_negative(self, workspace):
+        """Test that the total is clamped at zero."""
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+        ledger.apply_delta(-10_000)
+
+        assert ledger.usage == 0
+
+    def test_corrupt_ledger_is_ignored(self, workspace):
+        """Test that an unreadable ledger falls back to a scan."""
+        ledger_path = workspace / ".archiflow" / "usage.json"
+        ledger_path.parent.mkdir()
+        ledger_path.write_text("{not json")
+
+        ledger = UsageLedger(workspace)
+
+        assert ledger.is_loaded is False
+        assert ledger.usage == 150
+
+    def test_scan_skips_symlinks(self, workspace, tmp_path_factory):
+        """Test that symlinked files and directories are not counted."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "big.bin").write_bytes(b"0" * 4096)
+        (workspace / "link").symlink_to(outside)
+        (workspace / "file_link").symlink_to(outside / "big.bin")
+
+        assert scan_usage(workspace) == 150
+
+    def test_shared_instance(self, workspace):
+        """Test that get_usage_ledger returns one ledger per workspace."""
+        assert get_usage_ledger(workspace) is get_usage_ledger(workspace / "sub" / "..")
+
+
+class TestUsageReconciler:
+    """Tests for UsageReconciler."""
+
+    def test_run_once_reconciles_requested(self, workspace):
+        """Test that requested ledgers are rescanned."""
+        reconciler = UsageReconciler(interval_seconds=3600)
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+        (workspace / "new.txt").write_text("n" * 25)
+
+        reconciler._requested[str(workspace)] = ledger
+        assert reconciler.run_once() == 1
+        assert ledger.usage == 175
+
+    def test_run_once_reconciles_expired(self, workspace):
+        """Test that tracked ledgers are rescanned once their scan is old."""
+        reconciler = UsageReconciler(interval_seconds=60)
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+        reconciler.track(ledger)
+
+        assert reconciler.run_once() == 0
+
+        ledger.scanned_at -= 120
+        assert reconciler.run_once() == 1
+
+    def test_background_thread(self, workspace):
+        """Test that mark_stale triggers a background rescan."""
+        reconciler = UsageReconciler(interval_seconds=3600)
+        ledger = UsageLedger(workspace)
+        assert ledger.usage == 150
+        (workspace / "a.txt").unlink()
+
+        try:
+            reconciler.request(ledger)
+            deadline = time.time() + 5
+            while ledger.usage != 50 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            reconciler.stop()
+
+        assert ledger.usage == 50
+        assert reconciler.is_running is False
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            UsageReconciler(interval_seconds=0)
+
+
+@pytest.mark.asyncio
+class TestSandboxUsageDeltas:
+    """Tests for the sandbox write path feeding the ledger."""
+
+    async def test_write_applies_measured_delta(self, workspace):
+        """Test that sandboxed writes update usage without rescanning."""
+        quota = FileSystemQuota(limit_bytes=1024 * 1024, cache_ttl_seconds=3600)
+        runtime = SandboxRuntime(
+            config=SandboxConfig(workspace_path=workspace, mode=SandboxMode.STRICT),
+            storage_quota=quota,
+        )
+        tool = FileWriteTool(workspace)
+        context = ExecutionContext(session_id="s1", timeout=30)
+
+        assert quota.get_usage(workspace) == 150
+
+        await runtime.execute(tool, {"file_path": "new.txt", "content": "n" * 40}, context)
+        assert quota.get_usage(workspace) == 190
+
+        # Overwriting a file counts only the difference
+        await runtime.execute(tool, {"file_path": "a.txt", "content": "x" * 10}, context)
+        assert quota.get_usage(workspace) == 100
+
+        assert get_usage_ledger(workspace).reconcile() == 100
@@ -0,0 +1,263 @@
+"""
+Tests for interrupting an agent turn with cancellation tokens.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import psutil
+import pytest
+
+from agent_framework.agent_controller import AgentController
+from agent_framework.agent_engine import AgentExecutionEngine
+from agent_framework.cancellation import (
+    CancellationRegistry,
+    CancellationToken,
+    OperationCancelledError,
+    cancellation_scope,
+    current_token,
+    get_cancellation_registry,
+)
+from agent_framework.context import TopicContext
+from agent_framework.llm.mock import MockProvider
+from agent_framework.llm.openai_provider import create_cancellable_completion
+from agent_framework.runtime.context import CANCEL_TOKEN_KEY, ExecutionContext
+from agent_framework.runtime.local import LocalRuntime
+from agent_framework.tools.bash_tool import BashTool
+
+
+def cancel_later(token, delay=0.2):
+    timer = threading.Timer(delay, token.cancel, args=("interrupted by user",))
+    timer.start()
+    return timer
+
+
+class TestCancellationToken:
+    """Tests for CancellationToken and CancellationRegistry."""
+
+    def test_callbacks_run_once(self):
+        token = CancellationToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("a"))
+        unregister = token.on_cancel(lambda: calls.append("b"))
+        unregister()
+
+        assert token.cancel("stop") is True
+        assert token.cancel("again") is False
+        token.on_cancel(lambda: calls.append("late"))
+
+        assert calls == ["a", "late"]
+        assert token.reason == "stop"
+        with pytest.raises(OperationCancelledError):
+            token.raise_if_cancelled()
+
+    def test_registry_turns(self):
+        registry = CancellationRegistry()
+        first = registry.begin("s1")
+        registry.cancel("s1")
+
+        # Late results of the interrupted turn still see the cancelled token
+        assert registry.token("s1") is first
+        second = registry.begin("s1")
+        assert second is not first and not second.cancelled
+        assert registry.begin("s1") is second
+
+
+class TestLLMCancellation:
+    """Tests for aborting LLM calls."""
+
+    def test_generate_in_cancelled_turn_is_refused(self):
+        provider = MockProvider()
+        token = CancellationToken()
+        token.cancel()
+
+        with cancellation_scope(token), pytest.raises(OperationCancelledError):
+            provider.generate([{"role": "user", "content": "hi"}])
+        assert provider.call_count == 0
+
+    def test_stream_is_closed_mid_reply(self):
+        closed = threading.Event()
+
+        def chunk(content=None, tool_call=None, finish_reason=None):
+            delta = SimpleNamespace(content=content, tool_calls=[tool_call] if tool_call else None)
+            return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=None)
+
+        class Stream:
+            def __iter__(self):
+                for i in range(100):
+                    if closed.is_set():
+                        raise ConnectionError("response closed")
+                    time.sleep(0.02)
+                    yield chunk(content=f"word{i} ")
+
+            def close(self):
+                closed.set()
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = Stream()
+        token = CancellationToken()
+        cancel_later(token, 0.1)
+
+        started = time.monotonic()
+        with pytest.raises(OperationCancelledError):
+            create_cancellable_completion(client, {"model": "m", "messages": []}, token)
+
+        assert closed.is_set()
+        assert time.monotonic() - started < 1.0
+        assert client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    def test_stream_collects_response(self):
+        def tool_delta(index, id=None, name=None, arguments=None):
+            return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content="Reading ", tool_calls=None), finish_reason=None)], usage=None),
+            SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=None, tool_calls=[tool_delta(0, "c1", "read_file", '{"pa')]),
+                finish_reason=None)], usage=None),
+            SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=None, tool_calls=[tool_delta(0, arguments='th": "a.py"}')]),
+                finish_reason="tool_calls")], usage=None),
+            SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5)),
+        ]
+        client = MagicMock()
+        client.chat.completions.create.return_value = MagicMock(__iter__=lambda self: iter(chunks))
+
+        response = create_cancellable_completion(client, {"model": "m", "messages": []}, CancellationToken())
+
+        choice = response.choices[0]
+        assert choice.message.content == "Reading "
+        assert choice.message.tool_calls[0].function.arguments == '{"path": "a.py"}'
+        assert choice.finish_reason == "tool_calls"
+        assert response.usage.prompt_tokens == 10
+
+
+class TestToolCancellation:
+    """Tests for aborting running tools."""
+
+    async def test_bash_kills_process_group(self, tmp_path):
+        token = CancellationToken()
+        tool = BashTool(execution_context=ExecutionContext(
+            session_id="s1", working_directory=str(tmp_path), metadata={CANCEL_TOKEN_KEY: token}
+        ))
+        cancel_later(token, 0.3)
+
+        started = time.monotonic()
+        result = await tool.execute(command="sleep 30 & echo $! > child.pid; wait", timeout=60)
+
+        assert time.monotonic() - started < 5
+        assert "cancelled" in result.error
+        child = int((tmp_path / "child.pid").read_text())
+        time.sleep(0.1)
+        assert not psutil.pid_exists(child) or psutil.Process(child).status() == psutil.STATUS_ZOMBIE
+
+    async def test_local_runtime_abandons_call(self):
+        class SlowTool:
+            name = "slow"
+
+            async def execute(self):
+                await asyncio.sleep(30)
+
+        token = CancellationToken()
+        context = ExecutionContext(session_id="s1", timeout=60, metadata={CANCEL_TOKEN_KEY: token})
+        runtime = LocalRuntime(enable_resource_monitoring=False)
+        cancel_later(token, 0.1)
+
+        result = await runtime.execute(SlowTool(), {}, context)
+
+        assert not result.success
+        assert "cancelled" in result.error
+
+
+class TestControllerInterrupt:
+    """Tests for AgentController.interrupt."""
+
+    def test_interrupt_aborts_step_and_records_late_results(self, tmp_path):
+        engine = AgentExecutionEngine(max_concurrent_llm_calls=2)
+        entered = threading.Event()
+
+        def step(message):
+            entered.set()
+            # Stands in for an LLM call that watches the token
+            current_token().wait(5)
+            current_token().raise_if_cancelled()
+
+        agent = MagicMock()
+        agent.session_id = "interrupt-test"
+        agent.step.side_effect = step
+        broker = MagicMock()
+        context = TopicContext.default("interrupt-test")
+        controller = AgentController(agent, broker, context, working_dir=tmp_path, engine=engine)
+        controller.prompt_preprocessor = MagicMock(process=MagicMock(side_effect=lambda m: _done(m)))
+        try:
+            user = MagicMock(payload={"type": "UserMessage", "session_id": "interrupt-test",
+                                      "sequence": 1, "content": "run forever"})
+            future = controller.on_event(user)
+            assert entered.wait(5)
+
+            started = time.monotonic()
+            assert controller.interrupt() is True
+            future.result(timeout=5)
+            assert time.monotonic() - started < 1.0
+
+            published = [call.args[1]["type"] for call in broker.publish.call_args_list]
+            assert published[-2:] == ["AgentInterrupted", "WAIT_FOR_USER_INPUT"]
+
+            # A tool result of the interrupted turn is kept but not acted on
+            late = MagicMock(payload={"type": "ToolResultObservation", "session_id": "interrupt-test",
+                                      "sequence": 2, "call_id": "c1", "content": "done"})
+            controller.on_event(late).result(timeout=5)
+            assert agent.step.call_count == 1
+            agent._update_memory.assert_called_once()
+
+            # The next user message starts a new turn
+            agent.step.side_effect = None
+            agent.step.return_value = None
+            controller.on_event(user).result(timeout=5)
+            assert agent.step.call_count == 2
+        finally:
+            controller.close()
+            engine.shutdown()
+        assert "interrupt-test" not in get_cancellation_registry()._tokens
+
+    def test_interrupt_records_queued_tool_result(self, tmp_path):
+        engine = AgentExecutionEngine(max_concurrent_llm_calls=2)
+        entered = threading.Event()
+
+        def step(message):
+            entered.set()
+            current_token().wait(5)
+            current_token().raise_if_cancelled()
+
+        agent = MagicMock()
+        agent.session_id = "queued-test"
+        agent.step.side_effect = step
+        context = TopicContext.default("queued-test")
+        controller = AgentController(agent, MagicMock(), context, working_dir=tmp_path, engine=engine)
+        controller.prompt_preprocessor = MagicMock(process=MagicMock(side_effect=lambda m: _done(m)))
+        try:
+            observation = MagicMock(payload={"type": "ToolResultObservation", "session_id": "queued-test",
+                                             "sequence": 2, "call_id": "c1", "content": "done"})
+            running = controller.on_event(observation)
+            assert entered.wait(5)
+            # Queued behind the running step when the interrupt arrives
+            queued = controller.on_event(observation)
+
+            assert controller.interrupt() is True
+            running.result(timeout=5)
+            queued.result(timeout=5)
+
+            assert not queued.cancelled()
+            assert agent.step.call_count == 1
+            agent._update_memory.assert_called_once()
+        finally:
+            controller.close()
+            engine.shutdown()
+
+
+async def _done(message):
+    return message
@@ -0,0 +1,294 @@
+"""
+Tests for chunked diff review.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from agent_framework.agent_engine import AgentExecutionEngine
+from agent_framework.agents.code_review_agent import CodeReviewAgent
+from agent_framework.cancellation import CancellationToken, OperationCancelledError
+from agent_framework.diff_review import (
+    DiffReviewer,
+    ReviewCache,
+    build_chunks,
+    parse_chunk_comments,
+    parse_diff,
+    rank_files,
+)
+from agent_framework.llm.provider import FinishReason, LLMProvider, LLMResponse
+
+
+def file_diff(path: str, added: List[str], old="1111111", new="2222222", start=10) -> str:
+    body = "\n".join(f"+{line}" for line in added)
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"index {old}..{new} 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -{start},2 +{start},{len(added) + 2} @@ def f():\n"
+        f" context\n"
+        f"{body}\n"
+        f"-- removed line that looks like a header\n"
+        f" context\n"
+    )
+
+
+DIFF = (
+    file_diff("README.md", ["docs"])
+    + file_diff("src/auth/login.py", ["query = 'SELECT * FROM users WHERE name=' + name", "cursor.execute(query)"])
+    + file_diff("src/utils.py", ["x = 1", "y = 2", "z = 3"])
+    + "diff --git a/logo.png b/logo.png\n"
+    "new file mode 100644\n"
+    "index 0000000..3333333\n"
+    "Binary files /dev/null and b/logo.png differ\n"
+    "diff --git a/old_name.py b/new_name.py\n"
+    "similarity index 90%\n"
+    "rename from old_name.py\n"
+    "rename to new_name.py\n"
+    "index 4444444..5555555 100644\n"
+    "--- a/old_name.py\n"
+    "+++ b/new_name.py\n"
+    "@@ -1 +1 @@\n"
+    "-a = 1\n"
+    "+a = 2\n"
+)
+
+
+class ReviewLLM(LLMProvider):
+    """Flags the first added line of every file in the chunk."""
+
+    def __init__(self, delay: float = 0.05, tokens: int = 100, fail_on: str = ""):
+        super().__init__("review")
+        self.delay = delay
+        self.tokens = tokens
+        self.fail_on = fail_on
+        self.calls: List[str] = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, messages, tools=None, **kwargs) -> LLMResponse:
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.calls.append(prompt)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("provider error")
+
+        comments = []
+        for section in prompt.split("\n### ")[1:]:
+            path = section.split(" ", 1)[0]
+            line = next(row for row in section.splitlines() if row[7:8] == "+")
+            comments.append({
+                "file": path, "line": int(line[:6]), "severity": "major",
+                "category": "correctness", "issue": f"Check {path}", "suggestion": "Fix it",
+            })
+        return LLMResponse(
+            content="```json\n" + json.dumps({"comments": comments}) + "\n```",
+            finish_reason=FinishReason.STOP, usage={"total_tokens": self.tokens},
+        )
+
+    def stream(self, messages, tools=None, **kwargs):
+        raise NotImplementedError
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return 10
+
+
+class TestParseAndRank:
+    """Tests for parse_diff, rank_files and build_chunks."""
+
+    def test_parses_files_hunks_and_blobs(self):
+        files = {f.path: f for f in parse_diff(DIFF)}
+
+        assert list(files) == ["README.md", "src/auth/login.py", "src/utils.py", "logo.png", "new_name.py"]
+        utils = files["src/utils.py"]
+        assert (utils.insertions, utils.deletions) == (3, 1)
+        assert (utils.old_blob, utils.new_blob) == ("1111111", "2222222")
+        assert files["logo.png"].binary and files["logo.png"].status == "added"
+        assert files["new_name.py"].status == "renamed"
+        assert files["new_name.py"].old_path == "old_name.py"
+
+    def test_render_numbers_new_file_lines(self):
+        hunk = parse_diff(DIFF)[2].hunks[0].render().splitlines()
+
+        assert hunk[1] == "    10  context"
+        assert hunk[2] == "    11 +x = 1"
+        assert hunk[5].strip() == "-- removed line that looks like a header"
+        assert hunk[6] == "    14  context"
+
+    def test_ranks_sensitive_files_first(self):
+        ranked = rank_files(parse_diff(DIFF))
+
+        assert ranked[0].path == "src/auth/login.py"
+        assert "security-sensitive path" in ranked[0].risk_reasons
+        assert "risky calls" in ranked[0].risk_reasons
+        assert ranked[-1].path == "logo.png"
+
+    def test_large_files_are_split_by_hunks(self):
+        hunks = "".join(
+            f"@@ -{i * 100},1 +{i * 100},2 @@\n context\n+{'x' * 400}\n" for i in range(1, 6)
+        )
+        big = "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n" + hunks
+        files = rank_files(parse_diff(big + file_diff("small.py", ["a"])))
+
+        chunks = build_chunks(files, chunk_tokens=300)
+
+        assert [c.paths for c in chunks] == [["big.py"], ["big.py"], ["big.py"], ["small.py"]]
+        assert sum(len(hunks) for c in chunks for _, hunks in c.parts if _.path == "big.py") == 5
+        assert all(c.tokens <= 300 for c in chunks)
+
+
+class TestDiffReviewer:
+    """Tests for DiffReviewer.review."""
+
+    def test_reviews_chunks_concurrently_and_merges_comments(self, tmp_path):
+        llm = ReviewLLM()
+        files = rank_files(parse_diff(DIFF))
+
+        result = DiffReviewer(llm, max_concurrent=4, chunk_tokens=60).review(files)
+
+        assert len(llm.calls) == 4
+        assert llm.peak > 1
+        assert result.files["logo.png"] == "binary"
+        assert [c["file"] for c in result.comments][0] == "src/auth/login.py"
+        assert {c["file"] for c in result.comments} == {"README.md", "src/auth/login.py", "src/utils.py", "new_name.py"}
+        login = next(c for c in result.comments if c["file"] == "src/auth/login.py")
+        assert (login["line"], login["severity"]) == (11, "MAJOR")
+        assert result.stats()["tokens_used"] == 400
+
+    def test_unchanged_files_come_from_cache(self, tmp_path):
+        files = rank_files(parse_diff(DIFF))
+        DiffReviewer(ReviewLLM(), chunk_tokens=60, cache=ReviewCache(tmp_path / "cache.json")).review(files)
+
+        # utils.py changed since the last review
+        changed = DIFF.replace("index 1111111..2222222 100644\n--- a/src/utils.py", "index 1111111..9999999 100644\n--- a/src/utils.py")
+        llm = ReviewLLM()
+        result = DiffReviewer(llm, chunk_tokens=60, cache=ReviewCache(tmp_path / "cache.json")).review(
+            rank_files(parse_diff(changed))
+        )
+
+        assert len(llm.calls) == 1 and "### src/utils.py" in llm.calls[0]
+        assert result.files["src/auth/login.py"] == "cached"
+        assert result.files["src/utils.py"] == "reviewed"
+        assert len(result.comments) == 4
+
+    def test_token_budget_skips_lowest_risk_chunks(self):
+        llm = ReviewLLM(tokens=3000)
+        files = rank_files(parse_diff(DIFF))
+
+        result = DiffReviewer(llm, max_concurrent=1, chunk_tokens=60, token_budget=6000).review(files)
+
+        assert len(llm.calls) == 2
+        assert result.files["src/auth/login.py"] == "reviewed"
+        assert result.files["README.md"] == "skipped"
+
+    def test_failed_chunk_does_not_stop_the_review(self):
+        result = DiffReviewer(ReviewLLM(fail_on="### src/utils.py"), chunk_tokens=60).review(
+            rank_files(parse_diff(DIFF))
+        )
+
+        assert result.files["src/utils.py"] == "failed"
+        assert result.files["src/auth/login.py"] == "reviewed"
+
+    def test_calls_count_against_engine_llm_limit(self):
+        engine = AgentExecutionEngine(max_concurrent_llm_calls=2)
+        llm = ReviewLLM(delay=0.1)
+        reviewer = DiffReviewer(llm, max_concurrent=4, chunk_tokens=60, engine=engine)
+
+        async def step():
+            # The review runs inside an agent step, which holds one slot
+            return await engine.run_blocking(reviewer.review, rank_files(parse_diff(DIFF)))
+
+        try:
+            result = engine.submit("s1", step).result(timeout=10)
+        finally:
+            engine.shutdown()
+
+        assert result.chunks_reviewed == 4
+        assert llm.peak == 2
+
+    def test_review_outside_engine_takes_a_slot(self):
+        engine = AgentExecutionEngine(max_concurrent_llm_calls=1)
+        llm = ReviewLLM()
+        try:
+            result = DiffReviewer(llm, max_concurrent=4, chunk_tokens=60, engine=engine).review(
+                rank_files(parse_diff(DIFF))
+            )
+        finally:
+            engine.shutdown()
+
+        assert result.chunks_reviewed == 4
+        assert llm.peak == 1
+
+    def test_cancel_stops_the_review(self):
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        with pytest.raises(OperationCancelledError):
+            DiffReviewer(ReviewLLM(delay=0.3), max_concurrent=1, chunk_tokens=60).review(
+                rank_files(parse_diff(DIFF)), cancel_token=token
+            )
+
+
+def test_parse_chunk_comments_keeps_only_chunk_files():
+    content = json.dumps({"comments": [
+        {"file": "b/a.py", "line": "7", "severity": "bogus", "category": "style", "issue": "x"},
+        {"file": "other.py", "line": 1, "severity": "NIT", "category": "testing", "issue": "y"},
+    ]})
+
+    comments = parse_chunk_comments(content, ["a.py", "b.py"])
+
+    assert comments == [{
+        "file": "a.py", "line": 7, "severity": "MINOR", "category": "code_quality", "issue": "x", "suggestion": "",
+    }]
+
+
+class TestCodeReviewAgentChunkedReview:
+    """Tests for the pre-review in CodeReviewAgent."""
+
+    def make_agent(self, tmp_path, **kwargs):
+        diff_file = tmp_path / "change.diff"
+        diff_file.write_text(DIFF, encoding="utf-8")
+        return CodeReviewAgent("review-session", ReviewLLM(), project_directory=str(tmp_path),
+                               diff_file=str(diff_file), **kwargs)
+
+    def test_findings_are_merged_into_exports(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ARCHIFLOW_REVIEW_CHUNK_TOKENS", "60")
+        agent = self.make_agent(tmp_path, chunked_review=True)
+        agent._maybe_run_chunked_review()
+
+        assert "## PRE-REVIEW FINDINGS" in agent._format_system_prompt()
+        assert (agent.review_dir / "results" / "chunks.json").exists()
+
+        latest = agent.review_dir / "results" / "latest.json"
+        latest.write_text(json.dumps({
+            "verdict": "APPROVE",
+            "summary": "Login changes look fine apart from the query building.",
+            "comments": [],
+            "dismissed_findings": [{"file": "README.md", "line": 11}],
+        }), encoding="utf-8")
+        agent._handle_finish_task([type("Call", (), {"name": "finish_task", "arguments": "{}", "id": "1"})()])
+
+        review = json.loads(latest.read_text(encoding="utf-8"))
+        assert review["verdict"] == "REQUEST_CHANGES"
+        assert {c["file"] for c in review["comments"]} == {"src/auth/login.py", "src/utils.py", "new_name.py"}
+        sarif = json.loads(agent.export_review(formats=["sarif"])["sarif"].read_text(encoding="utf-8"))
+        assert len(sarif["runs"][0]["results"]) == 3
+
+    def test_small_diffs_skip_the_pre_review(self, tmp_path):
+        agent = self.make_agent(tmp_path)
+
+        agent._maybe_run_chunked_review()
+
+        assert agent.chunk_review is None
+        assert agent.llm.calls == []
@@ -0,0 +1,211 @@
+"""
+Tests for sub-agent fan-out.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from agent_framework.cancellation import CancellationToken
+from agent_framework.llm.provider import FinishReason, LLMProvider, LLMResponse, ToolCallRequest
+from agent_framework.runtime.context import RUNTIME_EXECUTOR_KEY, ExecutionContext
+from agent_framework.runtime.executor import RuntimeExecutor
+from agent_framework.runtime.local import LocalRuntime
+from agent_framework.runtime.manager import RuntimeManager
+from agent_framework.runtime.security import SecurityPolicy
+from agent_framework.subagents import SubAgentPool, SubAgentTask, format_results
+from agent_framework.tools.finish_tool import FinishAction
+from agent_framework.tools.spawn_subagents_tool import SpawnSubAgentsTool
+from agent_framework.tools.tool_base import BaseTool, ToolResult
+from message_queue.broker import MessageBroker
+from message_queue.storage.memory import InMemoryBackend
+
+
+class SearchTool(BaseTool):
+    name: str = "search"
+    description: str = "Search"
+    parameters: Dict = {"type": "object", "properties": {"query": {"type": "string"}}}
+
+    async def execute(self, query: str) -> ToolResult:
+        return ToolResult(output=f"results for {query}")
+
+
+class WriteFileTool(BaseTool):
+    name: str = "write"
+    description: str = "Write"
+    parameters: Dict = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> ToolResult:
+        return ToolResult(output="written")
+
+
+class Tools:
+    """Minimal registry with a search tool the children may use."""
+
+    def __init__(self):
+        self.tools = {t.name: t for t in (SearchTool(), WriteFileTool(), FinishAction())}
+
+    def get(self, name):
+        return self.tools.get(name)
+
+    def list_tools(self):
+        return list(self.tools.values())
+
+    def to_llm_schema(self, tool_names=None):
+        return [self.tools[n].to_param() for n in (tool_names or self.tools) if n in self.tools]
+
+
+class ScriptedLLM(LLMProvider):
+    """Searches for the task, then finishes with what the search returned."""
+
+    def __init__(self, delay: float = 0.05, tokens: int = 100, never_finish: bool = False):
+        super().__init__("scripted")
+        self.delay = delay
+        self.tokens = tokens
+        self.never_finish = never_finish
+        self.running = 0
+        self.peak = 0
+        self.schemas: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def generate(self, messages, tools=None, **kwargs) -> LLMResponse:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.schemas.append([t["function"]["name"] for t in tools or []])
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+
+        last = messages[-1]
+        if last["role"] == "tool" and not self.never_finish:
+            call = ToolCallRequest(
+                id="finish", name="finish_task",
+                arguments=json.dumps({"reason": "done", "result": f"Found: {last['content']}"}),
+            )
+        else:
+            task = next(m["content"] for m in messages if m["role"] == "user")
+            call = ToolCallRequest(id=f"c{time.monotonic_ns()}", name="search", arguments=json.dumps({"query": task}))
+        return LLMResponse(
+            content="Searching", tool_calls=[call],
+            finish_reason=FinishReason.TOOL_CALLS, usage={"total_tokens": self.tokens},
+        )
+
+    def stream(self, messages, tools=None, **kwargs):
+        raise NotImplementedError
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return 10
+
+
+@pytest.fixture
+def executor():
+    broker = MessageBroker(storage_backend=InMemoryBackend())
+    broker.start()
+    manager = RuntimeManager(security_policy=SecurityPolicy(default_runtime="local"))
+    manager.register_runtime("local", LocalRuntime(enable_resource_monitoring=False))
+    executor = RuntimeExecutor(broker=broker, runtime_manager=manager, tool_registry=Tools())
+    yield executor
+    broker.stop()
+
+
+def make_pool(llm, tmp_path, **kwargs):
+    kwargs.setdefault("tools", ["search"])
+    return SubAgentPool("parent", llm, tmp_path, **kwargs)
+
+
+class TestFanOut:
+    """Tests for SubAgentPool.fan_out."""
+
+    async def test_children_run_concurrently_and_report(self, executor, tmp_path):
+        llm = ScriptedLLM()
+        pool = make_pool(llm, tmp_path, max_concurrent=4)
+        tasks = [SubAgentTask(task=f"topic {i}") for i in range(3)]
+
+        results = await pool.fan_out(tasks, executor, timeout=20)
+
+        assert [r.status for r in results] == ["completed"] * 3
+        assert results[1].summary == "Found: results for topic 1"
+        assert all(r.tokens_used == 200 and r.turns == 2 for r in results)
+        assert llm.peak > 1
+        # Children only see their scoped tools
+        assert all(sorted(names) == ["finish_task", "search"] for names in llm.schemas)
+        assert pool.stats()["tokens_used"] == 600
+
+    async def test_concurrency_is_capped_per_session(self, executor, tmp_path):
+        llm = ScriptedLLM(delay=0.1)
+        pool = make_pool(llm, tmp_path, max_concurrent=2)
+
+        results = await pool.fan_out([SubAgentTask(task=f"t{i}") for i in range(4)], executor, timeout=20)
+
+        assert all(r.status == "completed" for r in results)
+        assert llm.peak == 2
+        assert pool.stats()["running"] == 0
+
+    async def test_session_token_budget_stops_children(self, executor, tmp_path):
+        llm = ScriptedLLM(tokens=500)
+        pool = make_pool(llm, tmp_path, max_concurrent=1, token_budget=1200)
+
+        results = await pool.fan_out([SubAgentTask(task=f"t{i}") for i in range(3)], executor, timeout=20)
+
+        assert [r.status for r in results] == ["completed", "budget_exhausted", "skipped"]
+        assert pool.budget.tokens_used == 1500
+
+    async def test_parent_interrupt_cancels_children(self, executor, tmp_path):
+        llm = ScriptedLLM(never_finish=True)
+        pool = make_pool(llm, tmp_path)
+        token = CancellationToken()
+        threading.Timer(0.3, token.cancel).start()
+
+        started = time.monotonic()
+        results = await pool.fan_out([SubAgentTask(task="forever")], executor, cancel_token=token, timeout=20)
+
+        assert time.monotonic() - started < 5
+        assert results[0].status == "cancelled"
+        assert "Searching" in results[0].summary
+
+    async def test_deadline_returns_partial_results(self, executor, tmp_path):
+        pool = make_pool(ScriptedLLM(never_finish=True), tmp_path, child_max_turns=1000)
+
+        results = await pool.fan_out([SubAgentTask(task="forever")], executor, timeout=0.5)
+
+        assert results[0].status == "timeout"
+        assert "time limit reached" in results[0].summary
+
+
+class TestSpawnSubAgentsTool:
+    """Tests for the spawn_subagents tool."""
+
+    async def test_merges_condensed_reports(self, executor, tmp_path):
+        pool = make_pool(ScriptedLLM(), tmp_path)
+        tool = SpawnSubAgentsTool(execution_context=ExecutionContext(
+            session_id="parent", timeout=60, metadata={RUNTIME_EXECUTOR_KEY: executor},
+        ))
+
+        result = await tool.execute(tasks=[{"task": "alpha"}, "beta"])
+
+        assert result.error is None
+        assert "## 1. alpha [completed" in result.output
+        assert "Found: results for beta" in result.output
+        assert pool.stats()["spawned"] == 2
+
+    async def test_unavailable_without_pool(self, executor):
+        tool = SpawnSubAgentsTool(execution_context=ExecutionContext(
+            session_id="no-pool", metadata={RUNTIME_EXECUTOR_KEY: executor},
+        ))
+
+        result = await tool.execute(tasks=["x"])
+
+        assert "not available" in result.error
+
+
+def test_format_results_truncates_long_reports():
+    from agent_framework.subagents import SubAgentResult
+
+    text = format_results([SubAgentResult(SubAgentTask(task="long"), "completed", "x" * 10000, 10, 1)])
+
+    assert "(truncated)" in text
+    assert len(text) < 4000
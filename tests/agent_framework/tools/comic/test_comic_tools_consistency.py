@@ -61,41 +61,33 @@ def page_tool(mock_image_provider):
     return tool
 
 @pytest.mark.asyncio
-async def test_panel_tool_loads_reference_from_disk(panel_tool):
+async def test_panel_tool_loads_reference_from_disk(panel_tool, tmp_path):
     """Test that panel tool looks for reference on disk if not in memory."""
-    with patch("os.path.exists") as mock_exists, \
-         patch("PIL.Image.open") as mock_open:
-
-        # Setup mock behavior
-        mock_exists.return_value = True
-        mock_ref_img = Image.new('RGB', (10, 10), 'blue')
-        mock_open.return_value = mock_ref_img
-
-        # Execute tool
-        await panel_tool.execute(
-            prompt="test prompt",
-            panel_type="action",
-            session_id="test_session",
-            character_reference="Hero",
-            page_number=1,
-            panel_number=1
-        )
-
-        # Verify it looked for file
-        assert mock_exists.called
-
-        # Verify it loaded the image
-        assert mock_open.called
-
-        # Verify it passed the loaded image to provider
-        assert len(panel_tool.image_provider.generate_image_calls) >= 1
-        call = panel_tool.image_provider.generate_image_calls[-1]
-        ref_images = call['ref_images']
-        assert len(ref_images) == 1
-        assert ref_images[0] == mock_ref_img
-
-        # Verify it cached it
-        assert "Hero" in panel_tool.character_references
+    panel_tool.execution_context = ExecutionContext(session_id="test_session", working_directory=str(tmp_path))
+    ref_dir = tmp_path / "character_refs"
+    ref_dir.mkdir()
+    Image.new('RGB', (10, 10), 'blue').save(ref_dir / "HERO.png")
+
+    # Execute tool
+    await panel_tool.execute(
+        prompt="test prompt",
+        panel_type="action",
+        session_id="test_session",
+        character_reference="Hero",
+        page_number=1,
+        panel_number=1
+    )
+
+    # Verify it passed the loaded image to provider
+    assert len(panel_tool.image_provider.generate_image_calls) >= 1
+    call = panel_tool.image_provider.generate_image_calls[-1]
+    ref_images = call['ref_images']
+    assert len(ref_images) == 1
+    assert ref_images[0].size == (10, 10)
+    assert ref_images[0].getpixel((0, 0)) == (0, 0, 255)
+
+    # Verify it cached it
+    assert "Hero" in panel_tool.character_references
 
 
 @pytest.mark.asyncio
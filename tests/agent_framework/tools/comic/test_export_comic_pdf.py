@@ -251,6 +251,26 @@ class TestExportComicPDFTool(unittest.TestCase):
         self.assertIsNotNone(page_img)
         self.assertEqual(page_img.mode, 'RGB')
 
+    @unittest.skipIf(not PIL_AVAILABLE, "PIL not available")
+    def test_composite_page_too_many_panels(self):
+        """Test that panels beyond the layout's cells are rejected, not dropped."""
+        panels = [Image.new('RGB', (100, 100)) for _ in range(7)]
+
+        with self.assertRaises(ValueError):
+            self.tool._composite_page(panels, 6, "Letter", 300)
+
+    def test_build_page_jobs_overflows_extra_panels(self):
+        """Test that a story page with too many panels continues on a new page."""
+        files = [Path(f"page_01_panel_{i:02d}.png") for i in range(1, 8)]
+
+        jobs = self.tool._build_page_jobs({1: files}, False, 6, "Letter", 72, 85)
+
+        self.assertEqual([len(job.panels) for job in jobs], [6, 1])
+        self.assertEqual(
+            [p.path for job in jobs for p in job.panels],
+            [str(f) for f in files],
+        )
+
     # ===== Full Export Tests =====
 
     @unittest.skipIf(not PIL_AVAILABLE, "PIL not available")
@@ -428,6 +448,63 @@ class TestExportComicPDFTool(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    @unittest.skipIf(not PIL_AVAILABLE, "PIL not available")
+    def test_export_pdf_skips_unreadable_page(self):
+        """Test that a page whose panels are all unreadable is skipped, not fatal."""
+        async def run_test():
+            self._create_test_panel(1, 1)
+            (self.panels_dir / "page_02_panel_01.png").write_text("not an image")
+
+            result = await self.tool.execute(
+                session_id=self.session_id,
+                include_cover=False,
+                include_credits=False
+            )
+
+            output = self.parse_output(result)
+            self.assertEqual(output["page_count"], 1)
+            self.assertEqual(output["skipped_pages"], ["page_02_panel_01.png"])
+
+        asyncio.run(run_test())
+
+    @unittest.skipIf(not PIL_AVAILABLE, "PIL not available")
+    def test_preview_export_reuses_resized_panels(self):
+        """Test that previews render at low DPI and only re-render edited panels."""
+        async def run_test():
+            for panel in range(1, 3):
+                self._create_test_panel(1, panel, size=(800, 600))
+            cache_dir = self.exports_dir / ExportComicPDFTool.PREVIEW_CACHE_DIR
+
+            result = await self.tool.execute(session_id=self.session_id, preview=True)
+            output = self.parse_output(result)
+
+            self.assertTrue(output["preview"])
+            self.assertEqual(output["dpi"], ExportComicPDFTool.PREVIEW_DPI)
+            self.assertTrue(output["pdf_path"].endswith("_preview.pdf"))
+            cached = sorted(os.listdir(cache_dir))
+            self.assertEqual(len(cached), 2)
+
+            # Re-export: unchanged panels come from the cache
+            with patch.dict(os.environ, {"ARCHIFLOW_EXPORT_WORKERS": "1"}):
+                opened = []
+                original_open = Image.open
+                with patch.object(Image, "open", side_effect=lambda fp, *a, **k: opened.append(str(fp)) or original_open(fp, *a, **k)):
+                    result = await self.tool.execute(session_id=self.session_id, preview=True)
+            self.assertIsNone(result.error)
+            self.assertTrue(opened)
+            self.assertTrue(all(ExportComicPDFTool.PREVIEW_CACHE_DIR in path for path in opened))
+
+            # Editing a panel replaces its cache entry
+            Image.new('RGB', (640, 480), color=(0, 0, 255)).save(self.panels_dir / "page_01_panel_02.png")
+            result = await self.tool.execute(session_id=self.session_id, preview=True)
+            self.assertIsNone(result.error)
+            recached = sorted(os.listdir(cache_dir))
+            self.assertEqual(len(recached), 2)
+            self.assertEqual(recached[0], cached[0])
+            self.assertNotEqual(recached[1], cached[1])
+
+        asyncio.run(run_test())
+
     # ===== Error Handling Tests =====
 
     def test_export_pdf_session_not_found(self):
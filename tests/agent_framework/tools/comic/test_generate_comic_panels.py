@@ -0,0 +1,111 @@
+"""
+Tests for GenerateComicPanelsTool.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from agent_framework.tools.comic.generate_comic_panels_tool import GenerateComicPanelsTool
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.llm.image_provider_base import ImageProvider
+
+
+class RecordingProvider(ImageProvider):
+    """Provider that records prompts, reference use and overlap."""
+
+    def __init__(self):
+        super().__init__("test")
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self):
+        return "recording"
+
+    @property
+    def model_name(self):
+        return "recording-model"
+
+    def generate_image(self, prompt, ref_images=None, **kwargs):
+        with self._lock:
+            self.calls.append({"prompt": prompt, "ref_images": ref_images})
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.05)
+            return Image.new("RGB", (40, 30), color="white")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def validate_connection(self):
+        return True
+
+
+@pytest.fixture
+def provider():
+    return RecordingProvider()
+
+
+@pytest.fixture
+def tool(provider, tmp_path):
+    tool = GenerateComicPanelsTool(image_provider=provider)
+    tool.execution_context = ExecutionContext(session_id="comic", working_directory=str(tmp_path))
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_generates_page_concurrently_in_order(tool, provider, tmp_path):
+    """Test that all panels of a page are generated together and reported in order."""
+    panels = [
+        {"prompt": f"Panel {n}", "panel_type": "action", "page_number": 2, "panel_number": n}
+        for n in range(1, 5)
+    ]
+
+    result = await tool.execute(session_id="comic", panels=panels)
+
+    data = json.loads(result.output)
+    assert data["success"] is True
+    assert [p["panel_number"] for p in data["generated"]] == [1, 2, 3, 4]
+    assert provider.max_in_flight > 1
+    assert sorted(p.name for p in (tmp_path / "panels").iterdir()) == [
+        f"page_02_panel_{n:02d}.png" for n in range(1, 5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_references_generated_before_story_panels(tool, provider):
+    """Test that story panels in the batch use references made by the same batch."""
+    panels = [
+        {"prompt": "Hero fights", "panel_type": "action", "page_number": 1,
+         "panel_number": 1, "character_names": ["HERO"]},
+        {"prompt": "Hero sheet", "panel_type": "character_reference", "character_names": ["HERO"]},
+    ]
+
+    result = await tool.execute(session_id="comic", panels=panels)
+
+    data = json.loads(result.output)
+    assert [p["panel_type"] for p in data["generated"]] == ["action", "character_reference"]
+    assert provider.calls[0]["ref_images"] is None
+    assert len(provider.calls[1]["ref_images"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_panel_listed(tool):
+    """Test that a panel missing its numbers fails without failing the batch."""
+    panels = [
+        {"prompt": "Panel", "panel_type": "action", "page_number": 1, "panel_number": 1},
+        {"prompt": "Panel", "panel_type": "action"},
+    ]
+
+    result = await tool.execute(session_id="comic", panels=panels)
+
+    data = json.loads(result.output)
+    assert data["success"] is False
+    assert data["failed"][0]["index"] == 2
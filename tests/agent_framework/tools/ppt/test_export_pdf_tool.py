@@ -337,4 +337,27 @@ class TestExportPDFTool:
 
         assert result.error is None
         result_data = json.loads(result.output)
-        assert result_data["page_count"] == 1
\ No newline at end of file
+        assert result_data["page_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_export_reports_progress(self, export_tool, temp_dir, sample_slides):
+        """Test that each exported slide is reported through the output callback."""
+        from agent_framework.runtime.context import OUTPUT_CALLBACK_KEY, ExecutionContext
+
+        progress = []
+        export_tool.execution_context = ExecutionContext(
+            session_id="test", metadata={OUTPUT_CALLBACK_KEY: progress.append}
+        )
+
+        result = await export_tool.execute(
+            title="Progress Test",
+            input_dir=temp_dir,
+            output_dir=os.path.join(temp_dir, "exports")
+        )
+
+        assert result.error is None
+        assert progress == [
+            "[1/3] Exported slide_001.png",
+            "[2/3] Exported slide_002.png",
+            "[3/3] Exported slide_003.png",
+        ]
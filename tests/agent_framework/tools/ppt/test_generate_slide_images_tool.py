@@ -0,0 +1,112 @@
+"""
+Unit tests for GenerateSlideImagesTool.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from agent_framework.tools.ppt.generate_slide_images_tool import GenerateSlideImagesTool
+from agent_framework.llm.image_provider_base import ImageProvider
+
+
+class RecordingProvider(ImageProvider):
+    """Provider that records call order and overlap."""
+
+    def __init__(self):
+        super().__init__("test")
+        self.reference_image = None
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def provider_name(self) -> str:
+        return "recording"
+
+    @property
+    def model_name(self) -> str:
+        return "recording-model"
+
+    def generate_image(self, prompt, ref_images=None, aspect_ratio="1:1", resolution="1K"):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.05)
+            if "broken" in prompt:
+                raise ValueError("content policy")
+            return Image.new("RGB", (64, 36), color=(10, 20, 30))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def generate_first_slide(self, prompt, aspect_ratio="16:9", resolution="2K"):
+        image = self.generate_image(prompt)
+        self.events.append(("first", self.in_flight))
+        self.reference_image = image
+        return image
+
+    def generate_subsequent_slide(self, prompt, slide_number, aspect_ratio="16:9", resolution="2K"):
+        assert self.reference_image is not None
+        self.events.append(("subsequent", slide_number))
+        return self.generate_image(prompt)
+
+    def validate_connection(self):
+        return True
+
+
+@pytest.fixture
+def provider():
+    return RecordingProvider()
+
+
+@pytest.fixture
+def tool(provider):
+    return GenerateSlideImagesTool(image_provider=provider)
+
+
+class TestGenerateSlideImagesTool:
+    """Tests for the batch slide image tool."""
+
+    @pytest.mark.asyncio
+    async def test_reference_first_then_concurrent(self, tool, provider, tmp_path):
+        """Test that slide 1 is generated alone before the others run together."""
+        slides = [{"slide_number": n, "prompt": f"Slide {n}"} for n in (3, 1, 4, 2)]
+
+        result = await tool.execute(slides=slides, session_id="s1", output_dir=str(tmp_path))
+
+        data = json.loads(result.output)
+        assert data["success"] is True
+        assert [item["slide_number"] for item in data["generated"]] == [1, 2, 3, 4]
+        assert provider.events[0] == ("first", 0)
+        assert provider.max_in_flight > 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "slide_001.png", "slide_002.png", "slide_003.png", "slide_004.png"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_reported(self, tool, tmp_path):
+        """Test that one failed slide does not fail the batch."""
+        slides = [
+            {"slide_number": 1, "prompt": "Title"},
+            {"slide_number": 2, "prompt": "broken slide"},
+        ]
+
+        result = await tool.execute(slides=slides, session_id="s1", output_dir=str(tmp_path))
+
+        data = json.loads(result.output)
+        assert data["success"] is False
+        assert [item["slide_number"] for item in data["generated"]] == [1]
+        assert data["failed"][0]["slide_number"] == 2
+        assert "content policy" in data["failed"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_slide_entry(self, tool):
+        result = await tool.execute(slides=[{"prompt": "no number"}])
+
+        assert result.error
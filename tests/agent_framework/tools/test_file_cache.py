@@ -0,0 +1,189 @@
+"""Tests for the session-scoped file content cache."""
+
+import os
+
+import pytest
+
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.tools.edit_tool import EditTool
+from agent_framework.tools.file_cache import (
+    FileCache,
+    get_file_cache,
+    release_file_cache,
+)
+from agent_framework.tools.multi_edit_tool import MultiEditTool
+from agent_framework.tools.read_tool import ReadTool
+from agent_framework.tools.write_tool import WriteTool
+
+
+def _bump_mtime(path, content):
+    """Rewrite a file and force a distinct mtime."""
+    st = os.stat(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestFileCache:
+    """Tests for FileCache."""
+
+    def test_hit_when_unchanged(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one\ntwo\n")
+        cache = FileCache()
+
+        first = cache.get(str(path))
+        second = cache.get(str(path))
+
+        assert first is second
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_reload_when_modified_externally(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one\n")
+        cache = FileCache()
+        cache.get(str(path))
+
+        _bump_mtime(str(path), "changed content\n")
+
+        assert cache.get(str(path)).content == "changed content\n"
+
+    def test_line_index(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("l1\nl2\nl3")
+        cached = FileCache().get(str(path))
+
+        assert cached.line_count == 3
+        assert cached.get_lines(1, 5) == ["l2", "l3"]
+        assert cached.get_lines(3, 5) == []
+
+    def test_line_index_trailing_newline_and_empty(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("l1\nl2\n")
+        empty = tmp_path / "empty.txt"
+        empty.write_text("")
+        cache = FileCache()
+
+        assert cache.get(str(path)).line_count == 2
+        assert cache.get(str(empty)).line_count == 0
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        cache = FileCache(max_bytes=10)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / name
+            path.write_text("x" * 4)
+            paths.append(str(path))
+            cache.get(str(path))
+
+        assert len(cache) == 2
+        assert cache.total_bytes == 8
+        # "a" was least recently used and got evicted
+        cache.get(paths[0])
+        assert cache.misses == 4
+
+    def test_oversized_file_not_cached(self, tmp_path):
+        path = tmp_path / "big.txt"
+        path.write_text("x" * 100)
+        cache = FileCache(max_bytes=10)
+
+        assert cache.get(str(path)).content == "x" * 100
+        assert len(cache) == 0
+
+    def test_oversized_file_streams_requested_lines(self, tmp_path):
+        path = tmp_path / "big.log"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+        cache = FileCache(max_bytes=10)
+
+        assert cache.read_lines(str(path), 10, 3) == (["line 10", "line 11", "line 12"], None)
+        assert cache.read_lines(str(path), 98, 5) == (["line 98", "line 99"], 100)
+        assert cache.read_lines(str(path), 200, 5) == ([], 100)
+        assert len(cache) == 0
+        assert cache.misses == 0
+
+    def test_read_lines_uses_cache_when_it_fits(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one\ntwo\nthree\n")
+        cache = FileCache()
+
+        assert cache.read_lines(str(path), 1, 1) == (["two"], 3)
+        assert cache.read_lines(str(path), 0, 5) == (["one", "two", "three"], 3)
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_write_through(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("old")
+        cache = FileCache()
+        cache.get(str(path))
+
+        cache.write(str(path), "new")
+
+        assert path.read_text() == "new"
+        assert cache.get(str(path)).content == "new"
+        assert cache.was_read(str(path))
+
+    def test_session_isolation(self):
+        try:
+            get_file_cache("s1").mark_read("/tmp/file.txt")
+            assert get_file_cache("s1").was_read("/tmp/file.txt")
+            assert not get_file_cache("s2").was_read("/tmp/file.txt")
+        finally:
+            release_file_cache("s1")
+            release_file_cache("s2")
+
+
+@pytest.mark.asyncio
+class TestFileToolsWithCache:
+    """Tests for the file tools sharing a session cache."""
+
+    def _tools(self, tmp_path, session_id):
+        context = ExecutionContext(session_id=session_id, working_directory=str(tmp_path))
+        tools = (ReadTool(), WriteTool(), EditTool(), MultiEditTool())
+        for tool in tools:
+            tool.execution_context = context
+        return tools
+
+    async def test_read_before_write_is_per_session(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("content\n")
+        read_a, write_a, _, _ = self._tools(tmp_path, "session_a")
+        _, write_b, _, _ = self._tools(tmp_path, "session_b")
+        try:
+            assert not (await read_a.execute(file_path="a.txt")).error
+
+            assert not (await write_a.execute(file_path="a.txt", content="x")).error
+            result = await write_b.execute(file_path="a.txt", content="y")
+            assert "without reading it first" in result.error
+        finally:
+            release_file_cache("session_a")
+            release_file_cache("session_b")
+
+    async def test_read_sees_edits(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("alpha\nbeta\n")
+        read, _, edit, multi_edit = self._tools(tmp_path, "session_edit")
+        try:
+            await read.execute(file_path="a.txt")
+            await edit.execute(file_path="a.txt", old_string="alpha", new_string="gamma")
+            await multi_edit.execute(
+                file_path=str(path),
+                edits=[{"old_string": "beta", "new_string": "delta"}],
+            )
+
+            result = await read.execute(file_path="a.txt")
+            assert "gamma" in result.output
+            assert "delta" in result.output
+            assert path.read_text() == "gamma\ndelta\n"
+        finally:
+            release_file_cache("session_edit")
+
+    async def test_offset_beyond_eof(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one\ntwo\n")
+        read = self._tools(tmp_path, "session_eof")[0]
+        try:
+            result = await read.execute(file_path="a.txt", offset=10)
+            assert "beyond end of file (file has 2 lines)" in result.error
+        finally:
+            release_file_cache("session_eof")
@@ -0,0 +1,164 @@
+"""
+Tests for the streaming image-to-PDF export helpers.
+"""
+
+import io
+import re
+
+import pytest
+from PIL import Image
+
+from agent_framework.tools.image_export import (
+    CompositeJob,
+    PageJob,
+    PanelPlacement,
+    StreamingPDFWriter,
+    encode_composite,
+    encode_page,
+    fit_size,
+    iter_encoded_pages,
+    write_pdf,
+)
+
+
+def check_xref(data: bytes) -> int:
+    """Assert every xref entry points at its object; return the object count."""
+    start = int(data.rsplit(b"startxref\n", 1)[1].split()[0])
+    lines = data[start:].split(b"trailer")[0].split(b"\n")
+    count = int(lines[1].split()[1])
+    for obj_id, line in enumerate(lines[3:2 + count], start=1):
+        offset = int(line[:10])
+        assert data[offset:].startswith(b"%d 0 obj" % obj_id)
+    return count
+
+
+@pytest.fixture
+def slides(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"slide_{i + 1:03d}.png"
+        Image.new("RGB", (1600, 900), (40 * i, 100, 200)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_fit_size():
+    """Test aspect-preserving fits, optionally never enlarging."""
+    assert fit_size((1600, 900), (800, 800)) == (800, 450)
+    assert fit_size((900, 1600), (800, 800)) == (450, 800)
+    assert fit_size((100, 50), (800, 800)) == (800, 400)
+    assert fit_size((100, 50), (800, 800), shrink_only=True) == (100, 50)
+
+
+def test_encode_page_flattens_transparency(tmp_path):
+    """Test that transparent areas become white in the encoded JPEG."""
+    path = tmp_path / "alpha.png"
+    Image.new("RGBA", (200, 100), (0, 0, 0, 0)).save(path)
+
+    page = encode_page(PageJob(str(path), (100, 100)))
+
+    assert (page.width, page.height) == (100, 50)
+    with Image.open(io.BytesIO(page.data)) as img:
+        assert img.format == "JPEG"
+        assert all(channel > 245 for channel in img.getpixel((50, 25)))
+
+
+def test_writer_produces_valid_structure(tmp_path, slides):
+    """Test page sizes and the cross-reference table of a streamed PDF."""
+    path = tmp_path / "out.pdf"
+    with StreamingPDFWriter(path, resolution=150.0, title="Deck") as pdf:
+        for slide in slides[:2]:
+            pdf.add_page(encode_page(PageJob(slide, (300, 300))))
+
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-1.4")
+    assert data.rstrip().endswith(b"%%EOF")
+    assert check_xref(data) == 3 + 3 * 2 + 1
+    assert b"/Count 2" in data
+    # 300x168 px at 150 dpi
+    assert re.search(rb"/MediaBox \[0 0 144\.0+ 80\.64", data)
+
+
+def test_writer_abort_removes_file(tmp_path):
+    """Test that a failed export leaves no partial file."""
+    path = tmp_path / "out.pdf"
+    with pytest.raises(RuntimeError):
+        with StreamingPDFWriter(path):
+            raise RuntimeError("boom")
+    assert not path.exists()
+
+
+def test_write_pdf_skips_bad_pages(tmp_path, slides):
+    """Test that unreadable pages are reported and the rest are written in order."""
+    bad = tmp_path / "slide_999.png"
+    bad.write_text("not an image")
+    jobs = [PageJob(slides[0], (400, 400)), PageJob(str(bad), (400, 400)), PageJob(slides[1], (400, 400))]
+    progress = []
+
+    count, failures = write_pdf(
+        jobs, tmp_path / "out.pdf", max_workers=1,
+        on_progress=lambda done, total, job: progress.append((done, total)),
+    )
+
+    assert count == 2
+    assert [path for path, _ in failures] == [str(bad)]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    check_xref((tmp_path / "out.pdf").read_bytes())
+
+
+def test_write_pdf_without_pages_leaves_nothing(tmp_path):
+    """Test that an export with no readable pages removes the file."""
+    bad = tmp_path / "bad.png"
+    bad.write_text("not an image")
+
+    count, failures = write_pdf([PageJob(str(bad), (10, 10))], tmp_path / "out.pdf", max_workers=1)
+
+    assert count == 0
+    assert len(failures) == 1
+    assert not (tmp_path / "out.pdf").exists()
+
+
+def test_worker_pool_keeps_order(slides):
+    """Test that pages prepared in worker processes come back in job order."""
+    jobs = [PageJob(slide, (160 + i, 160)) for i, slide in enumerate(slides)]
+
+    results = list(iter_encoded_pages(jobs, max_workers=2))
+
+    assert [job for job, _ in results] == jobs
+    assert [page.width for _, page in results] == [160 + i for i in range(5)]
+
+
+def test_composite_job_places_panels_in_cells(tmp_path):
+    """Test that composited panels are shrunk into their cells and unreadable ones left blank."""
+    red = tmp_path / "red.png"
+    Image.new("RGB", (400, 200), (255, 0, 0)).save(red)
+    bad = tmp_path / "bad.png"
+    bad.write_text("not an image")
+    job = CompositeJob((200, 100), (
+        PanelPlacement(str(red), (0, 0, 100, 100)),
+        PanelPlacement(str(bad), (100, 0, 100, 100)),
+    ))
+
+    page = encode_composite(job)
+
+    assert (page.width, page.height) == (200, 100)
+    with Image.open(io.BytesIO(page.data)) as img:
+        # 400x200 fits its cell as 100x50, centred vertically
+        assert img.getpixel((50, 50))[0] > 240 and img.getpixel((50, 50))[1] < 20
+        assert all(channel > 245 for channel in img.getpixel((50, 10)))
+        assert all(channel > 245 for channel in img.getpixel((150, 50)))
+
+    with pytest.raises(ValueError):
+        encode_composite(CompositeJob((100, 100), (PanelPlacement(str(bad), (0, 0, 100, 100)),)))
+
+
+def test_worker_pool_runs_composite_jobs(slides):
+    """Test that composite and single-image jobs share the ordered worker pipeline."""
+    jobs = [
+        CompositeJob((120, 120), (PanelPlacement(slides[0], (10, 10, 100, 100)),)),
+        PageJob(slides[1], (90, 90)),
+    ]
+
+    results = list(iter_encoded_pages(jobs, max_workers=2))
+
+    assert [(page.width, page.height) for _, page in results] == [(120, 120), (90, 50)]
@@ -0,0 +1,159 @@
+"""Tests for the shared web response cache and pooled HTTP client."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from agent_framework.tools import web_fetch_tool
+from agent_framework.tools.http_pool import get_http_client, host_slot
+from agent_framework.tools.web_cache import WebCache, cached_search
+from agent_framework.tools.web_fetch_tool import WebFetchTool
+from agent_framework.tools.web_search_tool import SearchResult
+
+
+class TestWebCache:
+    """Tests for WebCache."""
+
+    def test_put_and_get(self):
+        cache = WebCache()
+        cache.put("k", "value", etag='"abc"')
+
+        entry = cache.get("k")
+        assert entry.value == "value"
+        assert entry.validation_headers() == {"If-None-Match": '"abc"'}
+
+    def test_expired_entry_only_returned_when_stale_allowed(self):
+        cache = WebCache(ttl=10)
+        cache.put("k", "value")
+        cache.get("k").stored_at = time.time() - 60
+
+        assert cache.get("k") is None
+        assert cache.get("k", allow_stale=True).value == "value"
+
+        cache.touch("k")
+        assert cache.get("k").value == "value"
+
+    def test_lru_eviction_by_bytes(self):
+        cache = WebCache(max_bytes=10)
+        cache.put("a", "x" * 4)
+        cache.put("b", "x" * 4)
+        cache.get("a")
+        cache.put("c", "x" * 4)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.total_bytes == 8
+
+    def test_persistence_across_instances(self, tmp_path):
+        WebCache(persist_dir=str(tmp_path)).put("k", {"a": 1}, last_modified="yesterday")
+
+        entry = WebCache(persist_dir=str(tmp_path)).get("k")
+        assert entry.value == {"a": 1}
+        assert entry.last_modified == "yesterday"
+
+    def test_disk_budget(self, tmp_path):
+        cache = WebCache(persist_dir=str(tmp_path), max_disk_bytes=300)
+        for i in range(10):
+            cache.put(f"k{i}", "x" * 50)
+
+        assert len(list(tmp_path.glob("*.json"))) < 10
+
+    def test_disk_eviction_is_lru(self, tmp_path):
+        cache = WebCache(persist_dir=str(tmp_path), max_disk_bytes=10_000)
+        for key in ("a", "b", "c"):
+            cache.put(key, "x" * 50)
+        entry_size = cache._disk_bytes // 3
+        cache.max_disk_bytes = entry_size * 3
+
+        cache._entries.clear()
+        assert cache.get("a") is not None
+        cache.put("d", "x" * 50)
+
+        cache._entries.clear()
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+
+@pytest.mark.asyncio
+class TestCachedSearch:
+    """Tests for search result caching keyed by (query, engine)."""
+
+    async def test_results_reused_for_same_engine_and_query(self, monkeypatch):
+        cache = WebCache()
+        monkeypatch.setattr("agent_framework.tools.web_cache.get_web_cache", lambda name: cache)
+        calls = []
+
+        async def backend(query, num_results):
+            calls.append(query)
+            return [SearchResult("t", "https://x", "s", "Test")] * num_results, None
+
+        first, _ = await cached_search("engine", "Some Query", 3, backend, SearchResult)
+        second, _ = await cached_search("engine", "some   query", 2, backend, SearchResult)
+        await cached_search("other", "some query", 2, backend, SearchResult)
+        await cached_search("engine", "some query", 5, backend, SearchResult)
+
+        assert len(first) == 3
+        assert len(second) == 2
+        assert second[0].url == "https://x"
+        assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+class TestPooledClient:
+    """Tests for the shared HTTP client."""
+
+    async def test_client_shared_within_loop(self):
+        assert get_http_client() is get_http_client()
+        async with host_slot("https://example.com/a") as client:
+            assert client is get_http_client()
+
+
+def test_client_closed_with_its_loop():
+    clients = []
+
+    async def fetch():
+        clients.append(get_http_client())
+
+    asyncio.run(fetch())
+
+    assert clients[0].is_closed
+
+
+@pytest.mark.asyncio
+class TestWebFetchRevalidation:
+    """Tests for ETag revalidation in WebFetchTool."""
+
+    async def test_not_modified_reuses_cached_body(self, monkeypatch):
+        cache = WebCache(ttl=10)
+        monkeypatch.setattr(WebFetchTool, "_get_cache", classmethod(lambda cls: cache))
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                text="hello",
+                headers={"content-type": "text/plain", "etag": '"v1"'},
+            )
+
+        @asynccontextmanager
+        async def fake_slot(url):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                yield client
+
+        monkeypatch.setattr(web_fetch_tool, "host_slot", fake_slot)
+        tool = WebFetchTool()
+        url = "https://example.com/page"
+
+        assert await tool._fetch_url(url) == ("hello", None)
+        cache.get(url).stored_at = time.time() - 60
+        assert tool._get_from_cache(url) is None
+
+        assert await tool._fetch_url(url) == ("hello", None)
+        assert seen_headers == [None, '"v1"']
+        assert tool._get_from_cache(url) == "hello"
@@ -0,0 +1,295 @@
+"""
+Tests for span tracing, propagation and export.
+"""
+
+import json
+import threading
+
+import pytest
+
+from agent_framework.llm.mock import MockProvider
+from agent_framework.runtime.context import ExecutionContext
+from agent_framework.runtime.local import LocalRuntime
+from agent_framework.runtime.manager import RuntimeManager
+from agent_framework.runtime.result import ToolResult
+from agent_framework.tracing import (
+    TRACE_METADATA_KEY,
+    JsonlSpanSink,
+    OtlpFileSpanSink,
+    SpanContext,
+    Tracer,
+    attach_context,
+    current_context,
+    extract_context,
+    find_trace,
+    get_tracer,
+    inject_context,
+    load_spans,
+    render_flame,
+    set_tracer,
+    summarize_traces,
+    tracer_from_env,
+)
+from message_queue.broker import MessageBroker
+
+
+@pytest.fixture
+def tracer():
+    """Install a fresh, always-sampling tracer for the test."""
+    tracer = Tracer(sample_rate=1.0)
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+
+class EchoTool:
+    name = "echo"
+
+    async def execute(self, text: str):
+        return ToolResult.success_result(text)
+
+
+class TestTracer:
+    """Tests for Tracer."""
+
+    def test_nested_spans_share_trace(self, tracer):
+        """Test that spans opened inside a span become its children."""
+        with tracer.span("outer") as outer:
+            assert current_context() == outer.context
+            with tracer.span("inner", tool="echo") as inner:
+                pass
+
+        assert current_context() is None
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert [s.name for s in tracer.spans()] == ["inner", "outer"]
+        assert inner.attributes == {"tool": "echo"}
+
+    def test_error_marks_span(self, tracer):
+        """Test that an exception marks the span failed and propagates."""
+        with pytest.raises(RuntimeError):
+            with tracer.span("boom"):
+                raise RuntimeError("bad")
+
+        span = tracer.spans()[0]
+        assert span.status == "error"
+        assert "RuntimeError: bad" in span.attributes["error"]
+
+    def test_unsampled_trace_records_nothing(self):
+        """Test that the sampling decision covers the whole trace."""
+        tracer = Tracer(sample_rate=0.0)
+        with tracer.span("root") as span:
+            assert span is None
+
+        parent = SpanContext("t" * 32, "s" * 16, sampled=False)
+        with tracer.span("child", parent=parent) as child:
+            assert child.sampled is False
+            assert current_context().sampled is False
+
+        assert tracer.spans() == []
+
+    def test_ring_buffer_keeps_latest(self):
+        """Test that the buffer holds only the most recent spans."""
+        tracer = Tracer(capacity=3)
+        for i in range(5):
+            with tracer.span(f"s{i}"):
+                pass
+
+        assert [s.name for s in tracer.spans()] == ["s2", "s3", "s4"]
+
+    def test_context_crosses_threads_via_metadata(self, tracer):
+        """Test inject/extract round trip through message metadata."""
+        with tracer.span("sender") as sender:
+            metadata = inject_context({"priority": "high"})
+
+        assert metadata["priority"] == "high"
+        assert extract_context(metadata) == sender.context
+        assert inject_context({"a": 1}) == {"a": 1}
+
+        children = []
+
+        def worker():
+            with attach_context(extract_context(metadata)):
+                with tracer.span("receiver") as span:
+                    children.append(span)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        assert children[0].parent_id == sender.span_id
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            Tracer(sample_rate=1.5)
+        with pytest.raises(ValueError):
+            Tracer(capacity=0)
+
+    def test_from_env(self, tmp_path):
+        """Test building a tracer from environment variables."""
+        tracer = tracer_from_env({
+            "ARCHIFLOW_TRACE_SAMPLE_RATE": "0.25",
+            "ARCHIFLOW_TRACE_FILE": str(tmp_path / "t.otlp"),
+            "ARCHIFLOW_TRACE_FORMAT": "otlp",
+        })
+
+        assert tracer.sample_rate == 0.25
+        assert isinstance(tracer.sink, OtlpFileSpanSink)
+
+
+class TestSinks:
+    """Tests for the file sinks."""
+
+    @pytest.mark.parametrize("sink_class", [JsonlSpanSink, OtlpFileSpanSink])
+    def test_round_trip(self, tmp_path, sink_class):
+        """Test that exported spans can be loaded back."""
+        path = tmp_path / "traces.out"
+        tracer = Tracer(sink=sink_class(path))
+        with tracer.span("agent.step"):
+            with tracer.span("llm.generate", input_tokens=10, cached=False):
+                pass
+
+        # The root span ending flushes the batch
+        loaded = load_spans(path)
+        assert [s.name for s in loaded] == ["llm.generate", "agent.step"]
+        assert loaded[0].attributes == {"input_tokens": 10, "cached": False}
+        assert loaded[0].parent_id == loaded[1].span_id
+
+    def test_otlp_layout(self, tmp_path):
+        """Test that the OTLP file holds ExportTraceServiceRequest lines."""
+        path = tmp_path / "traces.otlp"
+        tracer = Tracer(sink=OtlpFileSpanSink(path))
+        with tracer.span("root"):
+            pass
+
+        request = json.loads(path.read_text().splitlines()[0])
+        span = request["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert span["name"] == "root"
+        assert len(span["traceId"]) == 32
+        assert len(span["spanId"]) == 16
+        assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+
+    def test_batches_until_flush(self, tmp_path):
+        """Test that child spans are buffered until a flush is due."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(sink=JsonlSpanSink(path), flush_every=100)
+        parent = SpanContext("a" * 32, "b" * 16)
+        for _ in range(3):
+            with tracer.span("child", parent=parent):
+                pass
+
+        assert not path.exists()
+        assert tracer.flush() == 3
+        assert len(load_spans(path)) == 3
+
+
+class TestFlame:
+    """Tests for trace rendering."""
+
+    def test_render_flame(self, tracer):
+        """Test that the flame view shows the span tree with attributes."""
+        with tracer.span("agent.step"):
+            with tracer.span("llm.generate", model="gpt", output_tokens=7):
+                pass
+            with tracer.span("tool.execute", tool="bash", runtime="local"):
+                pass
+
+        spans = find_trace(tracer.spans())
+        lines = render_flame(spans, width=20)
+
+        assert lines[0].startswith("agent.step")
+        assert lines[1].startswith("  llm.generate")
+        assert "output_tokens=7" in lines[1]
+        assert "tool=bash runtime=local" in lines[2]
+        assert all("|" in line and "ms" in line for line in lines)
+
+    def test_summaries_and_lookup(self, tracer):
+        """Test listing traces and selecting one by ID prefix."""
+        for name in ("first", "second"):
+            with tracer.span(name):
+                pass
+
+        summaries = summarize_traces(tracer.spans())
+        assert [s["root"] for s in summaries] == ["first", "second"]
+        assert find_trace(tracer.spans())[0].name == "second"
+
+        prefix = summaries[0]["trace_id"][:10]
+        assert find_trace(tracer.spans(), prefix)[0].name == "first"
+        with pytest.raises(KeyError):
+            find_trace(tracer.spans(), "zzz")
+
+
+class TestInstrumentation:
+    """Tests for spans emitted by the broker, LLM and runtime."""
+
+    def test_broker_hop_propagates_trace(self, tracer):
+        """Test that delivery records a hop span and continues the trace."""
+        broker = MessageBroker()
+        received = []
+        done = threading.Event()
+
+        def subscriber(message):
+            with get_tracer().span("handler") as span:
+                received.append((message, span))
+            done.set()
+
+        broker.subscribe("topic", subscriber)
+        broker.start()
+        try:
+            with tracer.span("sender") as sender:
+                broker.publish("topic", {"x": 1})
+            assert done.wait(2)
+        finally:
+            broker.stop()
+
+        message, handler = received[0]
+        assert message.metadata[TRACE_METADATA_KEY]["trace_id"] == sender.trace_id
+        hop = next(s for s in tracer.spans() if s.name == "broker.deliver")
+        assert hop.parent_id == sender.span_id
+        assert hop.attributes["topic"] == "topic"
+        assert handler.parent_id == hop.span_id
+
+    def test_untraced_publish_leaves_metadata_alone(self, tracer):
+        """Test that messages outside a trace carry no trace metadata."""
+        broker = MessageBroker()
+        message = broker.publish("topic", {}, metadata={"k": "v"})
+
+        assert message.metadata == {"k": "v"}
+
+    def test_llm_generate_span(self, tracer):
+        """Test that provider generate() calls are traced with token counts."""
+        llm = MockProvider(model="gpt-4o")
+
+        with tracer.span("agent.step"):
+            llm.generate([{"role": "user", "content": "hi"}])
+
+        span = next(s for s in tracer.spans() if s.name == "llm.generate")
+        assert span.attributes["provider"] == "MockProvider"
+        assert span.attributes["messages"] == 1
+        assert "input_tokens" in span.attributes
+        assert "output_tokens" in span.attributes
+
+    async def test_generate_async_keeps_context(self, tracer):
+        """Test that the thread-pool generate_async stays in the trace."""
+        llm = MockProvider(model="gpt-4o")
+
+        with tracer.span("agent.step") as step:
+            await llm.generate_async([{"role": "user", "content": "hi"}])
+
+        span = next(s for s in tracer.spans() if s.name == "llm.generate")
+        assert span.parent_id == step.span_id
+
+    async def test_tool_span_records_runtime(self, tracer):
+        """Test that RuntimeManager records the tool and runtime chosen."""
+        manager = RuntimeManager()
+        manager.register_runtime("local", LocalRuntime())
+
+        result = await manager.execute_tool(
+            EchoTool(), {"text": "hi"}, ExecutionContext(session_id="s1")
+        )
+
+        assert result.success
+        span = next(s for s in tracer.spans() if s.name == "tool.execute")
+        assert span.attributes["tool"] == "echo"
+        assert span.attributes["runtime"] == "local"
+        assert span.attributes["success"] is True
@@ -4,9 +4,19 @@ Pytest configuration and fixtures for all tests.
 This conftest.py registers all tools globally before running any tests.
 """
 
+import os
+
 import pytest
 from agent_framework.tools import all_tools
 
+# Tests must not read or fill the user's generated-image cache; the cache
+# tests build their own ImageCache in a temp directory
+os.environ.setdefault("ARCHIFLOW_IMAGE_CACHE", "off")
+
+# Nor write agent sessions to ~/.archiflow; the session log tests use
+# their own SessionStore in a temp directory
+os.environ.setdefault("ARCHIFLOW_SESSION_STORE", "off")
+
 
 @pytest.fixture(scope="session", autouse=True)
 def register_all_tools():
@@ -24,3 +34,16 @@ def register_all_tools():
 
     # Cleanup: Clear the registry after tests
     # (Tools are singletons, so we don't actually need to clean up)
+
+
+@pytest.fixture(autouse=True)
+def restore_cwd():
+    """
+    Restore the working directory after each test.
+
+    Some tests chdir into temporary directories that are deleted afterwards,
+    which would break every later test that touches the cwd.
+    """
+    cwd = os.getcwd()
+    yield
+    os.chdir(cwd)
@@ -96,17 +96,20 @@ class TestOpenAIImageProvider:
         provider.reference_description = "Modern blue theme with minimal design"
         provider.reference_image = Mock(spec=Image.Image)  # Need this for the condition
 
-        # First call should include slide number 1
+        # The slide number is named as passed, however often the provider is called
         prompt = "A bar chart"
-        enhanced = provider._enhance_prompt_with_reference(prompt, ref_images=[provider.reference_image])
+        enhanced = provider._enhance_prompt_with_reference(prompt, [provider.reference_image], slide_number=4)
         assert "bar chart" in enhanced
         assert "Modern blue theme" in enhanced
-        assert "slide #1" in enhanced
+        assert "slide #4" in enhanced
 
-        # Second call should increment slide number
-        enhanced = provider._enhance_prompt_with_reference(prompt, ref_images=[provider.reference_image])
+        enhanced = provider._enhance_prompt_with_reference(prompt, [provider.reference_image], slide_number=2)
         assert "slide #2" in enhanced
 
+        enhanced = provider._enhance_prompt_with_reference(prompt, ref_images=[provider.reference_image])
+        assert "slide #" not in enhanced
+        assert "consistent presentation series" in enhanced
+
     def test_enhance_prompt_without_reference(self, provider):
         """Test prompt enhancement without reference style."""
         prompt = "A pie chart"
@@ -244,7 +247,6 @@ class TestOpenAIImageProvider:
         assert provider.reference_image == mock_image
         assert provider.reference_description is not None
         assert "VISUAL STYLE GUIDE" in provider.reference_description
-        assert provider._slide_counter == 1
 
         # Verify the prompt was enhanced
         call_args = mock_generate.call_args
@@ -286,14 +288,14 @@ class TestOpenAIImageProvider:
 
         # Verify
         assert result == mock_image
-        assert provider._slide_counter == 3
 
         # Verify the generate_image was called with correct parameters
         mock_generate.assert_called_once_with(
             prompt="Test content",
             ref_images=[provider.reference_image],
             aspect_ratio="16:9",
-            resolution="1792x1024"
+            resolution="1792x1024",
+            slide_number=3
         )
 
     def test_generate_image_download_failure(self, provider):
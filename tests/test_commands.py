@@ -214,3 +214,29 @@ async def test_repl_process_command() -> None:
 
     # Should have stopped
     assert repl.running is False
+
+
+@pytest.mark.asyncio
+async def test_trace_command(tmp_path) -> None:
+    """Test trace command listing and flame rendering."""
+    from agent_framework.tracing import JsonlSpanSink, Tracer, set_tracer
+
+    router = CommandRouter()
+    register_utility_commands(router)
+    trace_file = tmp_path / "traces.jsonl"
+    tracer = Tracer(sink=JsonlSpanSink(trace_file))
+    previous = set_tracer(tracer)
+    try:
+        # No spans yet
+        assert await router.execute("/trace") is True
+
+        with tracer.span("agent.step") as step:
+            with tracer.span("llm.generate"):
+                pass
+
+        assert await router.execute("/trace") is True
+        assert await router.execute("/trace last") is True
+        assert await router.execute(f"/trace {step.trace_id[:8]}") is True
+        assert await router.execute(f"/trace last --file {trace_file}") is True
+    finally:
+        set_tracer(previous)
@@ -0,0 +1,141 @@
+"""
+Import-time budget for CLI startup.
+
+Each check runs in a fresh interpreter with ``python -X importtime`` so
+the numbers are not skewed by modules this test process already imported.
+Agents, LLM providers and optional tools are registered by import path and
+must not be loaded before a session needs them.
+
+The time budgets can be raised on slow machines with
+ARCHIFLOW_VERSION_IMPORT_BUDGET_MS and ARCHIFLOW_REPL_IMPORT_BUDGET_MS.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Vendor SDKs and media libraries that only specific agents or tools need
+HEAVY_MODULES = ["openai", "anthropic", "google.genai", "PIL", "pptx", "tiktoken"]
+
+VERSION_BUDGET_MS = float(os.environ.get("ARCHIFLOW_VERSION_IMPORT_BUDGET_MS", "500"))
+REPL_BUDGET_MS = float(os.environ.get("ARCHIFLOW_REPL_IMPORT_BUDGET_MS", "1500"))
+
+VERSION_CODE = (
+    "import sys; sys.argv = ['archiflow', '--version']\n"
+    "from agent_cli.main import cli\n"
+    "cli()\n"
+)
+
+# Everything the REPL loads before showing its first prompt
+REPL_CODE = (
+    "from agent_cli.repl.engine import REPLEngine\n"
+    "REPLEngine()\n"
+)
+
+
+def import_profile(code: str, home: Path) -> dict:
+    """
+    Run ``code`` under ``-X importtime``.
+
+    Returns:
+        Mapping of module name to (cumulative microseconds, nesting depth)
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR), HOME=str(home))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=str(home), timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(cumulative), depth)
+    return modules
+
+
+def total_ms(modules: dict) -> float:
+    return sum(us for us, depth in modules.values() if depth == 0) / 1000
+
+
+@pytest.fixture(scope="module")
+def repl_modules(tmp_path_factory):
+    return import_profile(REPL_CODE, tmp_path_factory.mktemp("home"))
+
+
+class TestStartupImports:
+    """Tests for what CLI startup imports and how long it takes."""
+
+    def test_version_within_budget(self, tmp_path):
+        """Test that `archiflow --version` loads only the CLI shell."""
+        modules = import_profile(VERSION_CODE, tmp_path)
+
+        assert "agent_framework.agents.base" not in modules
+        assert total_ms(modules) < VERSION_BUDGET_MS
+
+    def test_repl_skips_heavy_modules(self, repl_modules):
+        """Test that no agent, provider SDK or media library loads before the first prompt."""
+        loaded = [name for name in HEAVY_MODULES if name in repl_modules]
+        agents = [name for name in repl_modules if name.endswith("_agent")]
+
+        assert loaded == []
+        assert agents == []
+
+    def test_repl_within_budget(self, repl_modules):
+        """Test that the REPL reaches its first prompt within the import budget."""
+        assert total_ms(repl_modules) < REPL_BUDGET_MS
+
+
+class TestLazyRegistries:
+    """Tests for registries that load classes by import path."""
+
+    def test_agent_registered_by_path(self):
+        from agent_cli.agents.agent_factory_impl import AgentConfig
+
+        config = AgentConfig("agent_framework.agents.mock_agent:MockAgent", session_prefix="mock")
+
+        assert config.class_name == "MockAgent"
+        from agent_framework.agents.mock_agent import MockAgent
+        assert config.agent_class is MockAgent
+
+    def test_provider_registered_by_path(self):
+        from agent_cli.agents.llm_provider_factory import LLMProviderFactory
+        from agent_framework.llm.mock import MockLLMProvider
+
+        factory = LLMProviderFactory()
+        provider = factory.create_provider(provider="mock")
+
+        assert isinstance(provider, MockLLMProvider)
+
+    def test_tool_registry_loads_on_first_use(self):
+        from agent_framework.tools.tool_base import ToolRegistry
+
+        registry = ToolRegistry()
+        saved = (registry.tools, registry._pending)
+        registry.clear()
+        try:
+            registry.register_lazy("grep", "agent_framework.tools.grep_tool:GrepTool")
+            registry.register_lazy("missing", "agent_framework.tools.no_such_tool:NoTool")
+
+            assert registry.tools == {}
+            assert registry.get("grep").name == "grep"
+            assert [s["function"]["name"] for s in registry.to_llm_schema(["grep", "missing"])] == ["grep"]
+            assert [t.name for t in registry.list_tools()] == ["grep"]
+        finally:
+            registry.tools, registry._pending = saved
+
+    def test_lazy_package_exports(self):
+        import agent_framework.llm as llm
+        from agent_framework.llm.mock import MockLLMProvider
+
+        assert llm.MockLLMProvider is MockLLMProvider
+        with pytest.raises(AttributeError):
+            _ = llm.NoSuchProvider
@@ -283,6 +283,89 @@ class TestAgentRunnerPool:
         assert "session_2" in active
 
 
+class TestRunnerPoolAdmission:
+    """Tests for idle suspension and admission control in AgentRunnerPool."""
+
+    @staticmethod
+    def runner(session_id, idle_seconds, paused=False, busy=False):
+        runner = Mock()
+        runner.session = MockSession(id=session_id)
+        runner.idle_seconds = idle_seconds
+        runner.is_paused = paused
+        runner.is_busy = busy
+        runner.suspend = AsyncMock()
+        return runner
+
+    @pytest.mark.asyncio
+    async def test_no_headroom_rejects_runner(self):
+        """Test that a runner is rejected when the host has no room."""
+        pool = AgentRunnerPool(headroom=lambda: "Not enough memory for another agent session")
+
+        with pytest.raises(AgentExecutionError, match="Not enough memory"):
+            await pool.add(self.runner("s1", 0))
+        assert pool.stats()["rejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pressure_suspends_least_recently_used(self):
+        """Test that a full pool suspends the longest-idle runner to admit a new one."""
+        pool = AgentRunnerPool(max_runners=2, headroom=lambda: None)
+        recent, oldest = self.runner("recent", 120), self.runner("oldest", 600)
+        await pool.add(recent)
+        await pool.add(oldest)
+
+        await pool.add(self.runner("new", 0))
+
+        oldest.suspend.assert_awaited_once()
+        recent.suspend.assert_not_awaited()
+        assert sorted(pool.list_active()) == ["new", "recent"]
+        assert pool.list_suspended() == ["oldest"]
+        assert await pool.get_suspended("oldest") is oldest
+
+    @pytest.mark.asyncio
+    async def test_evict_idle_skips_busy_and_paused(self):
+        pool = AgentRunnerPool(idle_timeout=300, headroom=lambda: None)
+        busy, paused, idle = self.runner("busy", 10), self.runner("paused", 900, paused=True), self.runner("idle", 900)
+        for runner in (busy, paused, idle):
+            await pool.add(runner)
+
+        assert await pool.evict_idle() == 1
+
+        assert pool.list_suspended() == ["idle"]
+        assert await pool.remove("idle") is idle
+        assert pool.list_suspended() == []
+
+    @pytest.mark.asyncio
+    async def test_pressure_never_suspends_turn_in_flight(self):
+        """Test that a runner in the middle of a long turn is not suspended."""
+        pool = AgentRunnerPool(max_runners=1, headroom=lambda: None)
+        working = self.runner("working", 900, busy=True)
+        await pool.add(working)
+
+        with pytest.raises(AgentExecutionError, match="Maximum runners"):
+            await pool.add(self.runner("new", 0))
+        assert await pool.evict_idle(0) == 0
+
+        working.suspend.assert_not_awaited()
+        assert pool.list_active() == ["working"]
+
+    @pytest.mark.asyncio
+    async def test_broker_turn_busy_until_agent_waits(self):
+        """Test that a broker-mode turn stays busy until the agent asks for input."""
+        runner = WebAgentRunner(session=MockSession(), factory=Mock(), use_broker=True)
+        runner._running = True
+        runner._session_broker = Mock()
+        runner._session_broker.send_message = AsyncMock()
+        assert runner.is_busy is False
+
+        await runner.send_message("Refactor the parser")
+        assert runner.is_busy is True
+        await runner._forward_to_callback({"type": "tool_call", "tool_name": "bash"})
+        assert runner.is_busy is True
+
+        await runner._forward_to_callback({"type": "waiting_for_input"})
+        assert runner.is_busy is False
+
+
 class TestGlobalRunnerPool:
     """Tests for global runner pool."""
 
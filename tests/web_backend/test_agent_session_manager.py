@@ -324,6 +324,35 @@ class TestAgentSessionManager:
         with pytest.raises(AgentExecutionError, match="not active"):
             await manager.send_message("nonexistent", "Hello")
 
+    @pytest.mark.asyncio
+    async def test_idle_session_suspended_and_resumed_by_next_message(self, manager):
+        """Test that an idle runner releases its agent and the next message brings it back."""
+        session = await manager.create_session(
+            agent_type="simple",
+            user_id="test_user",
+            user_prompt="Hello",
+        )
+
+        with patch.object(manager.factory, 'create_agent', new_callable=AsyncMock) as mock_create:
+            mock_agent = Mock()
+            mock_agent.step = AsyncMock(return_value=Mock(content="Hi"))
+            mock_agent.tools = []
+            mock_create.return_value = mock_agent
+
+            runner = await manager.start_session(session.id)
+            runner.last_activity -= 3600
+
+            assert await manager.cleanup_inactive_sessions(max_idle_minutes=30) == 1
+            assert await manager.runner_pool.get(session.id) is None
+            assert runner.is_suspended and runner.agent is None
+            mock_agent.session_log.snapshot.assert_called_once()
+
+            await manager.send_message(session.id, "Back again")
+
+            assert await manager.runner_pool.get(session.id) is runner
+            assert runner.is_running and not runner.is_suspended
+            assert mock_create.call_count == 2
+
     @pytest.mark.asyncio
     async def test_pause_session(self, manager):
         """Test pausing a session."""
@@ -198,6 +198,7 @@ class TestAuditLogger:
             parameters={},
             success=True,
         )
+        logger.flush()
 
         # Check session audit file
         workspace = workspace_manager.get_workspace_path("user1", "session1")
@@ -322,6 +323,7 @@ class TestAuditLogger:
             violation_type="test",
             details={},
         )
+        logger.flush()
 
         # Check global audit file exists
         global_dir = workspace_manager.base_path / ".audit"
@@ -337,3 +339,22 @@ class TestAuditLogger:
 
         events = logger.get_session_events("user2", "session2")
         assert events == []
+
+    def test_get_session_events_time_window(self, logger):
+        """Test retrieving events within a time range."""
+        from datetime import datetime, timedelta, timezone
+
+        logger.log_tool_call(
+            session_id="session1",
+            user_id="user1",
+            tool_name="read",
+            parameters={},
+            success=True,
+        )
+        now = datetime.now(timezone.utc)
+
+        recent = logger.get_session_events("user1", "session1", since=now - timedelta(minutes=1))
+        future = logger.get_session_events("user1", "session1", since=now + timedelta(minutes=1))
+
+        assert len(recent) == 1
+        assert future == []
@@ -0,0 +1,103 @@
+"""
+Tests for UsageService.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from agent_framework.llm.model_config import ModelConfig
+from agent_framework.llm.usage_tracker import UsageTracker
+from src.web_backend.services.usage_service import UsageService
+
+
+MODEL = ModelConfig(
+    model_name="test-model",
+    context_window=100_000,
+    max_output_tokens=4_096,
+    cost_per_1k_input=1.00,
+    cost_per_1k_output=2.00,
+)
+
+
+@pytest.fixture
+def tracker():
+    return UsageTracker(bucket_seconds=60)
+
+
+@pytest.fixture
+def service(test_engine, tracker):
+    factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    return UsageService(tracker=tracker, session_factory=factory)
+
+
+def window():
+    now = datetime.now(timezone.utc)
+    return now - timedelta(hours=1), now + timedelta(hours=1)
+
+
+class TestUsageService:
+    """Tests for UsageService."""
+
+    def test_enables_rollups(self, service, tracker):
+        """Test that the service turns on rollup collection."""
+        assert tracker.collect_rollups
+
+    @pytest.mark.asyncio
+    async def test_flush_accumulates_rows(self, service, tracker):
+        """Test that repeated flushes add to the same bucket row."""
+        tracker.record(MODEL, 1000, 500, session_id="s1")
+        assert await service.flush() == 1
+        tracker.record(MODEL, 1000, 500, session_id="s1")
+        assert await service.flush() == 1
+        assert await service.flush() == 0
+
+        usage = await service.get_usage_window(*window(), session_id="s1")
+
+        assert usage["calls"] == 2
+        assert usage["total_tokens"] == 3000
+        assert usage["cost"] == pytest.approx(4.0)
+
+    @pytest.mark.asyncio
+    async def test_window_breakdowns(self, service, tracker):
+        """Test totals by model and session, including unflushed usage."""
+        tracker.record(MODEL, 100, 0, session_id="s1")
+        tracker.record(MODEL, 200, 0, session_id="s2")
+        tracker.record(MODEL, 300, 0)
+
+        usage = await service.get_usage_window(*window())
+
+        assert usage["calls"] == 3
+        assert usage["by_model"]["test-model"]["input_tokens"] == 600
+        assert set(usage["by_session"]) == {"s1", "s2"}
+
+        start, end = window()
+        empty = await service.get_usage_window(end, end + timedelta(hours=1))
+        assert empty["calls"] == 0
+        assert empty["by_model"] == {}
+
+    @pytest.mark.asyncio
+    async def test_timeseries(self, service, tracker):
+        """Test that timeseries points merge buckets into wider intervals."""
+        tracker.record(MODEL, 100, 10, session_id="s1")
+        tracker.record(MODEL, 100, 10, session_id="s2")
+
+        points = await service.get_usage_timeseries(*window(), bucket_seconds=3600)
+
+        assert len(points) == 1
+        assert points[0]["calls"] == 2
+        assert points[0]["input_tokens"] == 200
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rollups(self, tracker):
+        """Test that rollups survive a database error."""
+        def broken_factory():
+            raise RuntimeError("database unavailable")
+
+        service = UsageService(tracker=tracker, session_factory=broken_factory)
+        tracker.record(MODEL, 100, 10, session_id="s1")
+
+        with pytest.raises(RuntimeError):
+            await service.flush()
+
+        assert len(tracker.drain_rollups()) == 1
@@ -17,6 +17,16 @@ from src.web_backend.services.workspace_manager import WorkspaceManager
 from src.web_backend.services.storage_manager import StorageManager, StorageLimits
 from src.web_backend.services.audit_logger import AuditLogger
 from src.web_backend.services.sandboxed_tool import SandboxedToolkit
+from agent_framework.runtime.context import ExecutionContext
+
+
+class ContextTool:
+    """Reports the type of context it ran with (module level for the worker)."""
+    name = "context_tool"
+    execution_context = None
+
+    def execute(self):
+        return type(self.execution_context).__name__
 
 
 class TestWebAgentFactory:
@@ -146,6 +156,32 @@ class TestWebAgentFactory:
         unknown_tools = factory.get_agent_tools("unknown")
         assert "read" in unknown_tools  # Default tools
 
+    def test_export_tools_run_locally(self, factory):
+        """Test that export tools stay out of daemonic workers, where they could not prepare pages in parallel."""
+        for name in ("export_pdf", "export_pptx", "export_comic_pdf"):
+            assert factory._runtime_manager.get_runtime(name) is factory._runtime_manager.runtimes["local"]
+
+    @pytest.mark.asyncio
+    async def test_process_pool_tool_with_web_context(self, factory):
+        """Test that a tool carrying a WebExecutionContext can run in the process pool."""
+        tool = ContextTool()
+        tool.execution_context = factory.create_execution_context(
+            session_id="test_session",
+            user_id="test_user",
+        )
+        runtime = factory._runtime_manager.runtimes["process_pool"]
+
+        try:
+            result = await runtime.execute(
+                tool, {}, ExecutionContext(session_id="test_session", timeout=30)
+            )
+        finally:
+            await runtime.cleanup()
+
+        assert result.success is True, result.error
+        assert result.output == "ExecutionContext"
+        assert isinstance(tool.execution_context, WebExecutionContext)
+
     def test_factory_with_permissive_mode(self, workspace_manager):
         """Test factory with permissive sandbox mode."""
         factory = WebAgentFactory(
@@ -322,3 +358,24 @@ class TestWebAgentFactoryCreateAgent:
         assert call_args.kwargs["session_id"] == "test_session"
         assert call_args.kwargs["user_id"] == "test_user"
         assert call_args.kwargs["event_type"] == "agent_created"
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_warm_llm_provider(self, factory):
+        """Test that sessions get per-session copies of one shared provider."""
+        from agent_framework.llm.mock import MockProvider
+
+        def create_provider():
+            provider = MockProvider()
+            provider.client = object()
+            return provider
+
+        create = Mock(side_effect=create_provider)
+        with patch.dict("os.environ", {"DEFAULT_LLM_PROVIDER": "mock"}):
+            first = factory.get_llm_provider("session_1", create)
+            second = factory.get_llm_provider("session_2", create)
+
+        create.assert_called_once()
+        assert first is not second
+        assert first.client is second.client
+        assert (first.usage_session_id, second.usage_session_id) == ("session_1", "session_2")
+        assert first.usage_tracker is not None
@@ -144,6 +144,23 @@ class TestWorkspaceManager:
         size = manager.get_workspace_size("user1", "nonexistent")
         assert size == 0
 
+    def test_get_workspace_size_uses_ledger(self, manager):
+        """Test that workspace size comes from the persisted usage ledger."""
+        workspace = manager.create_workspace("user1", "session1")
+        (workspace / "test.txt").write_text("x" * 100)
+        assert manager.get_workspace_size("user1", "session1") == 100
+
+        # Recorded changes are visible without a rescan
+        ledger = manager.get_usage_ledger("user1", "session1")
+        ledger.apply_delta(50)
+        assert manager.get_workspace_size("user1", "session1") == 150
+        assert (workspace / ".archiflow" / "usage.json").exists()
+
+        # Deleting the workspace drops its ledger
+        manager.delete_workspace("user1", "session1")
+        workspace = manager.create_workspace("user1", "session1")
+        assert manager.get_workspace_size("user1", "session1") == 0
+
     def test_list_user_workspaces(self, manager):
         """Test listing user workspaces."""
         manager.create_workspace("user1", "session1")